@@ -15,13 +15,17 @@ async def get_current_user(
     db: Session = Depends(get_db),
 ) -> User:
     """Dependency to get current authenticated user from JWT token."""
+    return authenticate_token(credentials.credentials, db)
+
+
+def authenticate_token(token: str, db: Session) -> User:
+    """User an access token belongs to; raises 401 if the token is invalid."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    token = credentials.credentials
     payload = decode_token(token)
 
     if payload is None:
@@ -18,6 +18,71 @@ class Settings(BaseSettings):
     api_prefix: str = "/study"
     cors_origins: str = "http://localhost:5173,https://study.junipr.io"
 
+    # Pre-generated question pools
+    question_pool_enabled: bool = True
+    question_pool_size: int = 50
+    question_pool_low_watermark: int = 10
+    # Refill arithmetic generators with NumPy-vectorized batches (no word problems)
+    question_pool_vectorized: bool = False
+    # Failed refills in a row before a pool backs off for good (batches: goes one at a time)
+    question_pool_max_failures: int = 3
+
+    # Import every question generator at startup instead of on first use
+    generator_warmup: bool = False
+
+    # Compiled question bank (see compile_question_bank.py); empty to disable
+    question_bank_path: str = ""
+
+    # Skip questions a user was recently shown (per-user Bloom filter)
+    question_dedup_enabled: bool = True
+    question_dedup_attempts: int = 4
+
+    # Served-but-unanswered practice questions kept in memory
+    active_question_capacity: int = 100_000
+    active_question_ttl_minutes: int = 120
+
+    # Serve HMAC-signed question tokens instead of storing active questions
+    question_tokens_enabled: bool = False
+    # Signing key for question tokens (defaults to jwt_secret_key)
+    question_token_secret: str = ""
+
+    # Answer feedback returns without next_question; the next question is
+    # selected in the background and served by GET /questions/next
+    next_question_prefetch: bool = False
+    # Seconds a prepared next question is kept before it counts as stale
+    next_question_prefetch_ttl_seconds: int = 300
+
+    # Most questions per GET /questions/batch or POST /questions/answers
+    question_batch_max: int = 20
+
+    # How long the quiz channel waits for the prefetched next question after
+    # an answer before selecting one inline
+    quiz_channel_next_wait_ms: int = 2000
+
+    # How answers are recorded: "sync" (one commit per answer), "group"
+    # (batched by a background writer, the answer waits for its batch to
+    # commit) or "async" (batched, the answer returns once queued)
+    history_write_mode: str = "sync"
+    # A batch is flushed at this many rows or this many ms after its first row
+    history_write_batch_size: int = 200
+    history_write_flush_ms: int = 20
+    # Answers waiting for the writer; beyond this they are recorded inline
+    history_write_queue_size: int = 10_000
+    # Longest a group-mode answer waits for its batch before failing
+    history_write_wait_seconds: int = 10
+
+    # Where active questions and evaluation sessions live: "memory" (one
+    # worker), "sqlite" (WAL file shared by workers on one host) or "redis"
+    state_backend: str = "memory"
+    state_sqlite_path: str = "state.db"
+    state_redis_url: str = "redis://localhost:6379/0"
+    # Pooled connections per namespace for the sqlite and redis backends
+    state_pool_size: int = 4
+
+    # How often each worker checks STATE_BACKEND for a content version
+    # published by an admin reload (skills, templates) in another worker
+    content_version_check_seconds: float = 5.0
+
     class Config:
         env_file = ".env"
 
@@ -1,112 +1,209 @@
-"""Question generator modules."""
-
-from typing import Dict, Callable, Any
-from app.generators.linear_equation import generate_linear_equation
-from app.generators.fraction_operations import generate_fraction_addition
-from app.generators.quadratic_equation import generate_quadratic_equation
-from app.generators.systems_equations import generate_system_of_equations
-from app.generators.polynomial_operations import generate_polynomial_operation
-from app.generators.order_of_operations import generate_order_of_operations
-from app.generators.distributive_property import generate_distributive_property
-from app.generators.combining_like_terms import generate_combining_like_terms
-from app.generators.evaluating_expressions import generate_evaluating_expressions
-from app.generators.inequalities import generate_inequality
-from app.generators.exponent_rules import generate_exponent_rules
-from app.generators.slope_intercept import generate_slope_intercept
-from app.generators.integers_operations import generate_integers_operations
-from app.generators.absolute_value import generate_absolute_value
-from app.generators.fractions_multiplication import generate_fractions_multiplication
-from app.generators.fractions_division import generate_fractions_division
-from app.generators.percentages import generate_percentages
-from app.generators.decimals_operations import generate_decimals_operations
-from app.generators.ratios_proportions import generate_ratios_proportions
-from app.generators.unit_conversions import generate_unit_conversions
-from app.generators.simple_interest import generate_simple_interest
-from app.generators.pythagorean_theorem import generate_pythagorean_theorem
-from app.generators.factoring_quadratics import generate_factoring_quadratics
-from app.generators.factoring_polynomials import generate_factoring_polynomials
-from app.generators.equations_variables_both_sides import generate_equations_variables_both_sides
-from app.generators.graphing_linear_equations import generate_graphing_linear_equations
-from app.generators.point_slope_form import generate_point_slope_form
-from app.generators.quadratic_formula import generate_quadratic_formula
-from app.generators.scientific_notation import generate_scientific_notation
-from app.generators.rational_expressions import generate_rational_expressions
-from app.generators.radical_expressions import generate_radical_expressions
-from app.generators.function_composition import generate_function_composition
-from app.generators.inverse_functions import generate_inverse_functions
-from app.generators.piecewise_functions import generate_piecewise_functions
-from app.generators.polynomial_long_division import generate_polynomial_long_division
-from app.generators.rational_functions import generate_rational_functions
-from app.generators.conic_sections import generate_conic_sections
-from app.generators.parametric_equations import generate_parametric_equations
-from app.generators.polar_coordinates import generate_polar_coordinates
-from app.generators.vectors import generate_vectors
-from app.generators.matrices import generate_matrices
-from app.generators.unit_circle_radians import generate_unit_circle_radians
-from app.generators.sine_cosine_tangent import generate_sine_cosine_tangent
-from app.generators.pythagorean_identities import generate_pythagorean_identities
-from app.generators.graphing_trig_functions import generate_graphing_trig_functions
-from app.generators.inverse_trig_functions import generate_inverse_trig_functions
-from app.generators.law_of_sines import generate_law_of_sines
-from app.generators.law_of_cosines import generate_law_of_cosines
-from app.generators.trigonometric_equations import generate_trigonometric_equations
+"""Question generator modules.
 
-# Registry of generator functions by template type
-GENERATORS: Dict[str, Callable[[int], Dict[str, Any]]] = {
-    "linear_equation": generate_linear_equation,
-    "fraction_addition": generate_fraction_addition,
-    "quadratic_equation": generate_quadratic_equation,
-    "system_of_equations": generate_system_of_equations,
-    "polynomial_operation": generate_polynomial_operation,
-    "order_of_operations": generate_order_of_operations,
-    "distributive_property": generate_distributive_property,
-    "combining_like_terms": generate_combining_like_terms,
-    "evaluating_expressions": generate_evaluating_expressions,
-    "inequality": generate_inequality,
-    "exponent_rules": generate_exponent_rules,
-    "slope_intercept": generate_slope_intercept,
-    "integers_operations": generate_integers_operations,
-    "absolute_value": generate_absolute_value,
-    "fractions_multiplication": generate_fractions_multiplication,
-    "fractions_division": generate_fractions_division,
-    "percentages": generate_percentages,
-    "decimals_operations": generate_decimals_operations,
-    "ratios_proportions": generate_ratios_proportions,
-    "unit_conversions": generate_unit_conversions,
-    "simple_interest": generate_simple_interest,
-    "pythagorean_theorem": generate_pythagorean_theorem,
-    "factoring_quadratics": generate_factoring_quadratics,
-    "factoring_polynomials": generate_factoring_polynomials,
-    "equations_variables_both_sides": generate_equations_variables_both_sides,
-    "graphing_linear_equations": generate_graphing_linear_equations,
-    "point_slope_form": generate_point_slope_form,
-    "quadratic_formula": generate_quadratic_formula,
-    "scientific_notation": generate_scientific_notation,
-    "rational_expressions": generate_rational_expressions,
-    "radical_expressions": generate_radical_expressions,
-    "function_composition": generate_function_composition,
-    "inverse_functions": generate_inverse_functions,
-    "piecewise_functions": generate_piecewise_functions,
-    "polynomial_long_division": generate_polynomial_long_division,
-    "rational_functions": generate_rational_functions,
-    "conic_sections": generate_conic_sections,
-    "parametric_equations": generate_parametric_equations,
-    "polar_coordinates": generate_polar_coordinates,
-    "vectors": generate_vectors,
-    "matrices": generate_matrices,
-    "unit_circle_radians": generate_unit_circle_radians,
-    "sine_cosine_tangent": generate_sine_cosine_tangent,
-    "pythagorean_identities": generate_pythagorean_identities,
-    "graphing_trig_functions": generate_graphing_trig_functions,
-    "inverse_trig_functions": generate_inverse_trig_functions,
-    "law_of_sines": generate_law_of_sines,
-    "law_of_cosines": generate_law_of_cosines,
-    "trigonometric_equations": generate_trigonometric_equations,
+Generator modules are imported on first use, so a process only pays the
+import cost (word-problem tables included) for the template types it
+actually serves. Call warm_up() to import them ahead of time.
+"""
+
+import random
+from importlib import import_module
+from typing import Dict, Callable, Iterable, Iterator, List, Mapping, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import SEED_BITS, new_seed
+
+Generator = Callable[..., GeneratedQuestion]
+
+# Template type -> "module:function" within app.generators
+GENERATOR_PATHS: Dict[str, str] = {
+    "linear_equation": "linear_equation:generate_linear_equation",
+    "fraction_addition": "fraction_operations:generate_fraction_addition",
+    "quadratic_equation": "quadratic_equation:generate_quadratic_equation",
+    "system_of_equations": "systems_equations:generate_system_of_equations",
+    "polynomial_operation": "polynomial_operations:generate_polynomial_operation",
+    "order_of_operations": "order_of_operations:generate_order_of_operations",
+    "distributive_property": "distributive_property:generate_distributive_property",
+    "combining_like_terms": "combining_like_terms:generate_combining_like_terms",
+    "evaluating_expressions": "evaluating_expressions:generate_evaluating_expressions",
+    "inequality": "inequalities:generate_inequality",
+    "exponent_rules": "exponent_rules:generate_exponent_rules",
+    "slope_intercept": "slope_intercept:generate_slope_intercept",
+    "integers_operations": "integers_operations:generate_integers_operations",
+    "absolute_value": "absolute_value:generate_absolute_value",
+    "fractions_multiplication": "fractions_multiplication:generate_fractions_multiplication",
+    "fractions_division": "fractions_division:generate_fractions_division",
+    "percentages": "percentages:generate_percentages",
+    "decimals_operations": "decimals_operations:generate_decimals_operations",
+    "ratios_proportions": "ratios_proportions:generate_ratios_proportions",
+    "unit_conversions": "unit_conversions:generate_unit_conversions",
+    "simple_interest": "simple_interest:generate_simple_interest",
+    "pythagorean_theorem": "pythagorean_theorem:generate_pythagorean_theorem",
+    "factoring_quadratics": "factoring_quadratics:generate_factoring_quadratics",
+    "factoring_polynomials": "factoring_polynomials:generate_factoring_polynomials",
+    "equations_variables_both_sides": "equations_variables_both_sides:generate_equations_variables_both_sides",
+    "graphing_linear_equations": "graphing_linear_equations:generate_graphing_linear_equations",
+    "point_slope_form": "point_slope_form:generate_point_slope_form",
+    "quadratic_formula": "quadratic_formula:generate_quadratic_formula",
+    "scientific_notation": "scientific_notation:generate_scientific_notation",
+    "rational_expressions": "rational_expressions:generate_rational_expressions",
+    "radical_expressions": "radical_expressions:generate_radical_expressions",
+    "function_composition": "function_composition:generate_function_composition",
+    "inverse_functions": "inverse_functions:generate_inverse_functions",
+    "piecewise_functions": "piecewise_functions:generate_piecewise_functions",
+    "polynomial_long_division": "polynomial_long_division:generate_polynomial_long_division",
+    "rational_functions": "rational_functions:generate_rational_functions",
+    "conic_sections": "conic_sections:generate_conic_sections",
+    "parametric_equations": "parametric_equations:generate_parametric_equations",
+    "polar_coordinates": "polar_coordinates:generate_polar_coordinates",
+    "vectors": "vectors:generate_vectors",
+    "matrices": "matrices:generate_matrices",
+    "unit_circle_radians": "unit_circle_radians:generate_unit_circle_radians",
+    "sine_cosine_tangent": "sine_cosine_tangent:generate_sine_cosine_tangent",
+    "pythagorean_identities": "pythagorean_identities:generate_pythagorean_identities",
+    "graphing_trig_functions": "graphing_trig_functions:generate_graphing_trig_functions",
+    "inverse_trig_functions": "inverse_trig_functions:generate_inverse_trig_functions",
+    "law_of_sines": "law_of_sines:generate_law_of_sines",
+    "law_of_cosines": "law_of_cosines:generate_law_of_cosines",
+    "trigonometric_equations": "trigonometric_equations:generate_trigonometric_equations",
 }
 
 
-def get_generator(template_type: str) -> Callable[[int], Dict[str, Any]]:
+class GeneratorRegistry(Mapping):
+    """
+    Read-only mapping of template type to generator function.
+
+    Looking up a template type imports its module the first time and
+    caches the function; iterating or checking membership never imports.
+    """
+
+    def __init__(self, paths: Dict[str, str]):
+        self._paths = paths
+        self._loaded: Dict[str, Generator] = {}
+
+    def __getitem__(self, template_type: str) -> Generator:
+        generator = self._loaded.get(template_type)
+        if generator is None:
+            module_name, function_name = self._paths[template_type].split(":")
+            module = import_module(f"{__name__}.{module_name}")
+            generator = getattr(module, function_name)
+            self._loaded[template_type] = generator
+        return generator
+
+    def __contains__(self, template_type: object) -> bool:
+        return template_type in self._paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def is_loaded(self, template_type: str) -> bool:
+        """Whether the generator's module has been imported yet."""
+        return template_type in self._loaded
+
+
+# Registry of generator functions by template type
+GENERATORS = GeneratorRegistry(GENERATOR_PATHS)
+
+
+def warm_up(template_types: Optional[Iterable[str]] = None) -> int:
+    """
+    Import generator modules ahead of the first request.
+
+    Args:
+        template_types: Template types to load (all registered types if omitted)
+
+    Returns:
+        Number of generators loaded
+    """
+    types = list(GENERATORS if template_types is None else template_types)
+    for template_type in types:
+        get_generator(template_type)
+    return len(types)
+
+
+def get_generator(template_type: str) -> Generator:
     """Get generator function for a template type."""
     if template_type not in GENERATORS:
         raise ValueError(f"Unknown template type: {template_type}")
     return GENERATORS[template_type]
+
+
+def generate_question(
+    template_type: str,
+    difficulty: int,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
+    """
+    Generate one reproducible question.
+
+    The same (template_type, difficulty, seed) always yields the same
+    question, answer and steps, so callers only need to keep those three
+    values to regenerate a question later.
+
+    Args:
+        template_type: Registered generator name (see GENERATORS)
+        difficulty: Difficulty level passed to the generator
+        seed: Question seed (a fresh one is drawn if omitted)
+
+    Returns:
+        GeneratedQuestion with its seed recorded
+    """
+    if seed is None:
+        seed = new_seed()
+    elif seed >= 1 << SEED_BITS:
+        # Packed seed from a vectorized batch
+        from app.generators import vectorized
+        return vectorized.regenerate(template_type, difficulty, seed)
+
+    question = get_generator(template_type)(difficulty, seed=seed)
+    question.seed = seed
+    return question
+
+
+def generate_batch(
+    template_type: str,
+    difficulty: int,
+    n: int,
+    seed: Optional[int] = None,
+    vectorized: bool = False,
+) -> List[GeneratedQuestion]:
+    """
+    Generate several questions of one template type in a single call.
+
+    The generator lookup and a batch random.Random instance are set up once.
+    The batch RNG only draws one seed per question, so each question can be
+    replayed on its own with generate_question(), and passing the same batch
+    seed reproduces the whole batch.
+
+    With vectorized=True, template types that define VECTORIZED_VARIANTS
+    are generated array-wise by app.generators.vectorized instead (their
+    word problem forms are left out); other types ignore the flag.
+
+    Args:
+        template_type: Registered generator name (see GENERATORS)
+        difficulty: Difficulty level passed to the generator
+        n: Number of questions to generate
+        seed: Optional seed for the batch RNG
+        vectorized: Use the vectorized backend where one exists
+
+    Returns:
+        List of n GeneratedQuestions in generation order, each with its seed
+    """
+    if n < 0:
+        raise ValueError(f"Batch size must be non-negative, got {n}")
+
+    if vectorized:
+        from app.generators import vectorized as backend
+        if backend.supports(template_type, difficulty):
+            return backend.generate_batch(template_type, difficulty, n, seed)
+
+    generator = get_generator(template_type)
+    rng = random.Random(seed)
+    batch = []
+    for _ in range(n):
+        question_seed = new_seed(rng)
+        question = generator(difficulty, seed=question_seed)
+        question.seed = question_seed
+        batch.append(question)
+    return batch
@@ -1,7 +1,10 @@
 """Absolute value question generator with word problems."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Word problem templates for absolute value
 ABSOLUTE_VALUE_WORD_PROBLEMS = {
@@ -18,7 +21,11 @@ ABSOLUTE_VALUE_WORD_PROBLEMS = {
 }
 
 
-def generate_absolute_value(difficulty: int = 1) -> Dict[str, Any]:
+def generate_absolute_value(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate an absolute value problem.
 
@@ -27,159 +34,167 @@ def generate_absolute_value(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - simple absolute value of a number)
             2 (medium - absolute value with operations)
             3 (hard - absolute value equations)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     # Use word problems 50% of the time
-    use_word_problem = random.random() < 0.5
+    use_word_problem = rng.random() < 0.5
 
     if difficulty == 1:
         # Easy: Simple absolute value
-        num = random.randint(-50, 50)
+        num = rng.randint(-50, 50)
         while num == 0:  # Avoid zero for more interesting problems
-            num = random.randint(-50, 50)
+            num = rng.randint(-50, 50)
 
         expression = f"|{num}|"
 
+        problem = identify = None
         if use_word_problem:
+            identify = f"Find $|{num}|$"
             if num < 0:
                 # Negative number contexts
                 contexts = ["debt", "elevator", "temperature"]
-                context = random.choice(contexts)
+                context = rng.choice(contexts)
                 if context == "debt":
-                    question = f"Your bank account shows ${num}. What is the absolute value of your balance?"
-                    steps.append(f"**Problem:** {question}")
-                    steps.append(f"**Identify:** Find $|{num}|$")
+                    problem = f"Your bank account shows ${num}. What is the absolute value of your balance?"
                 elif context == "elevator":
-                    question = f"An elevator is at floor {num} (basement level). How many floors from ground level?"
-                    steps.append(f"**Problem:** {question}")
-                    steps.append(f"**Identify:** Find the distance from 0: $|{num}|$")
+                    problem = f"An elevator is at floor {num} (basement level). How many floors from ground level?"
+                    identify = f"Find the distance from 0: $|{num}|$"
                 else:  # temperature
-                    question = f"The temperature is {num}°F. How far is this from 0°F?"
-                    steps.append(f"**Problem:** {question}")
-                    steps.append(f"**Identify:** Find $|{num}|$")
+                    problem = f"The temperature is {num}°F. How far is this from 0°F?"
             else:
                 # Positive number - distance interpretation
-                question = f"A target is {num} meters away. Express this distance as an absolute value."
-                steps.append(f"**Problem:** {question}")
-                steps.append(f"**Identify:** Find $|{num}|$")
-        else:
-            steps.append(f"Find the absolute value: ${expression}$")
-
-        steps.append("**Rule:** Absolute value is the distance from zero (always non-negative)")
+                problem = f"A target is {num} meters away. Express this distance as an absolute value."
 
-        if num >= 0:
-            steps.append(f"Since ${num}$ is positive, $|{num}| = {num}$")
-            answer = num
-        else:
-            steps.append(f"Since ${num}$ is negative, $|{num}| = {abs(num)}$")
-            steps.append(f"The absolute value removes the negative sign: ${abs(num)}$")
-            answer = abs(num)
+        answer = abs(num)
+        steps = LazySteps(_absolute_value_steps, expression, num, problem, identify)
 
     elif difficulty == 2:
         # Medium: Absolute value with operations inside
         # Format: |a + b| or |a - b| or |a * b|
-        operation = random.choice(['add', 'subtract', 'multiply'])
+        operation = rng.choice(['add', 'subtract', 'multiply'])
 
         if operation == 'add':
-            a = random.randint(-15, 15)
-            b = random.randint(-15, 15)
-            expression = f"|{a} + {b}|"
-
-            steps.append(f"Evaluate: ${expression}$")
-            steps.append("**Rule:** First calculate inside the absolute value, then take absolute value")
-            steps.append(f"**Step 1:** Calculate inside: ${a} + {b} = {a + b}$")
-
-            result = a + b
-            steps.append(f"**Step 2:** Take absolute value: $|{result}| = {abs(result)}$")
-            answer = abs(result)
+            a = rng.randint(-15, 15)
+            b = rng.randint(-15, 15)
+            inside, result = f"{a} + {b}", a + b
+            step = f"Calculate inside: ${inside} = {result}$"
 
         elif operation == 'subtract':
-            a = random.randint(-12, 12)
-            b = random.randint(-12, 12)
-            expression = f"|{a} - {b}|"
-
-            steps.append(f"Evaluate: ${expression}$")
-            steps.append("**Rule:** First calculate inside the absolute value, then take absolute value")
-            steps.append(f"**Step 1:** Calculate inside: ${a} - {b} = {a - b}$")
-
-            result = a - b
-            steps.append(f"**Step 2:** Take absolute value: $|{result}| = {abs(result)}$")
-            answer = abs(result)
+            a = rng.randint(-12, 12)
+            b = rng.randint(-12, 12)
+            inside, result = f"{a} - {b}", a - b
+            step = f"Calculate inside: ${inside} = {result}$"
 
         else:  # multiply
-            a = random.randint(-8, 8)
+            a = rng.randint(-8, 8)
             while a == 0:
-                a = random.randint(-8, 8)
-            b = random.randint(-6, 6)
+                a = rng.randint(-8, 8)
+            b = rng.randint(-6, 6)
             while b == 0:
-                b = random.randint(-6, 6)
-            expression = f"|{a} \\times {b}|"
+                b = rng.randint(-6, 6)
+            inside, result = f"{a} \\times {b}", a * b
+            step = f"Multiply inside: ${inside} = {result}$"
 
-            steps.append(f"Evaluate: ${expression}$")
-            steps.append("**Rule:** First calculate inside the absolute value, then take absolute value")
-            steps.append(f"**Step 1:** Multiply inside: ${a} \\times {b} = {a * b}$")
-
-            result = a * b
-            steps.append(f"**Step 2:** Take absolute value: $|{result}| = {abs(result)}$")
-            answer = abs(result)
+        expression = f"|{inside}|"
+        answer = abs(result)
+        steps = LazySteps(_operation_steps, expression, step, result)
 
     else:  # difficulty == 3
         # Hard: Absolute value equation |x + a| = b
-        a = random.randint(-10, 10)
-        b = random.randint(1, 15)  # Always positive for valid solutions
+        a = rng.randint(-10, 10)
+        b = rng.randint(1, 15)  # Always positive for valid solutions
 
         if a >= 0:
             expression = f"|x + {a}| = {b}"
         else:
             expression = f"|x - {abs(a)}| = {b}"
 
-        steps.append(f"Solve the equation: ${expression}$")
-        steps.append("**Rule:** Absolute value equation $|X| = b$ has two solutions: $X = b$ or $X = -b$")
-
-        if a >= 0:
-            steps.append(f"This means: $x + {a} = {b}$ or $x + {a} = -{b}$")
-
-            steps.append(f"**Case 1:** $x + {a} = {b}$")
-            sol1 = b - a
-            steps.append(f"$x = {b} - {a} = {sol1}$")
-
-            steps.append(f"**Case 2:** $x + {a} = -{b}$")
-            sol2 = -b - a
-            steps.append(f"$x = -{b} - {a} = {sol2}$")
-        else:
-            steps.append(f"This means: $x - {abs(a)} = {b}$ or $x - {abs(a)} = -{b}$")
-
-            steps.append(f"**Case 1:** $x - {abs(a)} = {b}$")
-            sol1 = b + abs(a)
-            steps.append(f"$x = {b} + {abs(a)} = {sol1}$")
-
-            steps.append(f"**Case 2:** $x - {abs(a)} = -{b}$")
-            sol2 = -b + abs(a)
-            steps.append(f"$x = -{b} + {abs(a)} = {sol2}$")
-
-        steps.append(f"**Verification:** Check both solutions in the original equation")
+        sol1 = b - a
+        sol2 = -b - a
         answer_str = f"{sol1}, {sol2}" if sol1 < sol2 else f"{sol2}, {sol1}"
-        steps.append(f"The solutions are: $x = {sol1}$ and $x = {sol2}$")
-
-        steps.append(f"**Final Answer:** $x = {answer_str}$")
-
-        return {
-            "question": f"Solve: ${expression}$",
-            "answer": answer_str,
-            "steps": steps,
-            "difficulty": difficulty,
-        }
-
-    steps.append(f"**Final Answer:** ${answer}$")
-
-    return {
-        "question": f"Evaluate: ${expression}$",
-        "answer": str(answer),
-        "answer_numeric": answer,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+
+        return GeneratedQuestion(
+            question=f"Solve: ${expression}$",
+            answer=answer_str,
+            steps=LazySteps(_equation_steps, expression, a, b, answer_str),
+            difficulty=difficulty,
+        )
+
+    return GeneratedQuestion(
+        question=f"Evaluate: ${expression}$",
+        answer=str(answer),
+        answer_numeric=answer,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _absolute_value_steps(expression: str, num: int, problem: Optional[str], identify: Optional[str]) -> List[str]:
+    """Steps for |num|, restating the word problem when there is one."""
+    if problem:
+        steps = [f"**Problem:** {problem}", f"**Identify:** {identify}"]
+    else:
+        steps = [f"Find the absolute value: ${expression}$"]
+
+    steps.append("**Rule:** Absolute value is the distance from zero (always non-negative)")
+
+    if num >= 0:
+        steps.append(f"Since ${num}$ is positive, $|{num}| = {num}$")
+    else:
+        steps.append(f"Since ${num}$ is negative, $|{num}| = {abs(num)}$")
+        steps.append(f"The absolute value removes the negative sign: ${abs(num)}$")
+
+    steps.append(f"**Final Answer:** ${abs(num)}$")
+    return steps
+
+
+def _operation_steps(expression: str, step: str, result: int) -> List[str]:
+    """Steps for the absolute value of a single operation."""
+    return [
+        f"Evaluate: ${expression}$",
+        "**Rule:** First calculate inside the absolute value, then take absolute value",
+        f"**Step 1:** {step}",
+        f"**Step 2:** Take absolute value: $|{result}| = {abs(result)}$",
+        f"**Final Answer:** ${abs(result)}$",
+    ]
+
+
+def _equation_steps(expression: str, a: int, b: int, answer_str: str) -> List[str]:
+    """Steps for solving |x + a| = b."""
+    steps = [
+        f"Solve the equation: ${expression}$",
+        "**Rule:** Absolute value equation $|X| = b$ has two solutions: $X = b$ or $X = -b$",
+    ]
+
+    if a >= 0:
+        steps.append(f"This means: $x + {a} = {b}$ or $x + {a} = -{b}$")
+
+        steps.append(f"**Case 1:** $x + {a} = {b}$")
+        sol1 = b - a
+        steps.append(f"$x = {b} - {a} = {sol1}$")
+
+        steps.append(f"**Case 2:** $x + {a} = -{b}$")
+        sol2 = -b - a
+        steps.append(f"$x = -{b} - {a} = {sol2}$")
+    else:
+        steps.append(f"This means: $x - {abs(a)} = {b}$ or $x - {abs(a)} = -{b}$")
+
+        steps.append(f"**Case 1:** $x - {abs(a)} = {b}$")
+        sol1 = b + abs(a)
+        steps.append(f"$x = {b} + {abs(a)} = {sol1}$")
+
+        steps.append(f"**Case 2:** $x - {abs(a)} = -{b}$")
+        sol2 = -b + abs(a)
+        steps.append(f"$x = -{b} + {abs(a)} = {sol2}$")
+
+    steps.append(f"**Verification:** Check both solutions in the original equation")
+    steps.append(f"The solutions are: $x = {sol1}$ and $x = {sol2}$")
+
+    steps.append(f"**Final Answer:** $x = {answer_str}$")
+    return steps
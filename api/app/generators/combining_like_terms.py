@@ -1,7 +1,11 @@
 """Combining like terms question generator with real-world contexts."""
 
 import random
-from typing import Dict, Any, List
+from typing import List, Optional
+from app.generators.latex import format_signed
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for combining like terms
 LIKE_TERMS_CONTEXTS = [
@@ -11,7 +15,11 @@ LIKE_TERMS_CONTEXTS = [
 ]
 
 
-def generate_combining_like_terms(difficulty: int = 1) -> Dict[str, Any]:
+def generate_combining_like_terms(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a combining like terms problem.
 
@@ -20,157 +28,85 @@ def generate_combining_like_terms(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - two or three like terms)
             2 (medium - mix of like and unlike terms)
             3 (hard - multiple variables and complex expressions)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     if difficulty == 1:
         # Easy: Simple like terms (e.g., 3x + 5x or 2y + 7y - 3y)
-        coef1 = random.randint(1, 8)
-        coef2 = random.randint(1, 8)
+        coef1 = rng.randint(1, 8)
+        coef2 = rng.randint(1, 8)
 
-        variable = random.choice(['x', 'y', 'a', 'b'])
+        variable = rng.choice(['x', 'y', 'a', 'b'])
 
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Two terms
+            coef3 = None
             expression = f"{coef1}{variable} + {coef2}{variable}"
-            steps.append(f"Start with the expression: ${coef1}{variable} + {coef2}{variable}$")
-            steps.append(f"**Rule:** Like terms have the same variable and can be combined")
-            steps.append(f"Both terms have the variable ${variable}$, so they are like terms")
-            steps.append(f"Add the coefficients: ${coef1} + {coef2} = {coef1 + coef2}$")
-
             answer_coef = coef1 + coef2
-            answer_str = f"{answer_coef}{variable}"
-            steps.append(f"Keep the variable: ${answer_str}$")
         else:
             # Three terms
-            coef3 = random.randint(1, 5)
+            coef3 = rng.randint(1, 5)
             expression = f"{coef1}{variable} + {coef2}{variable} - {coef3}{variable}"
-            steps.append(f"Start with the expression: ${coef1}{variable} + {coef2}{variable} - {coef3}{variable}$")
-            steps.append(f"**Rule:** Like terms have the same variable and can be combined")
-            steps.append(f"All terms have the variable ${variable}$, so they are like terms")
-            steps.append(f"Combine the coefficients: ${coef1} + {coef2} - {coef3} = {coef1 + coef2 - coef3}$")
-
             answer_coef = coef1 + coef2 - coef3
-            answer_str = f"{answer_coef}{variable}"
-            steps.append(f"Keep the variable: ${answer_str}$")
+
+        answer_str = f"{answer_coef}{variable}"
+        steps = LazySteps(_single_variable_steps, expression, variable, coef1, coef2, coef3, answer_str)
 
     elif difficulty == 2:
         # Medium: Mix of like and unlike terms
         # Format: ax + b + cx + d or ax + by + cx + dy
-        a = random.randint(1, 7)
-        b = random.randint(1, 10)
-        c = random.randint(1, 7)
-        d = random.randint(1, 10)
+        a = rng.randint(1, 7)
+        b = rng.randint(1, 10)
+        c = rng.randint(1, 7)
+        d = rng.randint(1, 10)
 
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Same variable with constants: ax + b + cx + d
             expression = f"{a}x + {b} + {c}x + {d}"
-            steps.append(f"Start with the expression: ${a}x + {b} + {c}x + {d}$")
-            steps.append("**Rule:** Group and combine like terms")
-            steps.append(f"Identify like terms:")
-            steps.append(f"- Terms with $x$: ${a}x$ and ${c}x$")
-            steps.append(f"- Constant terms: ${b}$ and ${d}$")
-
-            x_coef = a + c
-            const = b + d
-
-            steps.append(f"Combine $x$ terms: ${a}x + {c}x = {x_coef}x$")
-            steps.append(f"Combine constants: ${b} + {d} = {const}$")
-
-            answer_str = f"{x_coef}x + {const}"
-            steps.append(f"Write the simplified expression: ${answer_str}$")
+            answer_str = f"{a + c}x + {b + d}"
+            steps = LazySteps(_constant_terms_steps, expression, a, b, c, d, answer_str)
         else:
             # Two different variables: ax + by + cx - dy
-            b_sign = random.choice(['+', '-'])
-            d_val = random.randint(1, 6)
+            b_sign = rng.choice(['+', '-'])
+            d_val = rng.randint(1, 6)
 
             if b_sign == '+':
-                expression = f"{a}x + {b}y + {c}x + {d}y"
-                steps.append(f"Start with the expression: ${a}x + {b}y + {c}x + {d}y$")
-                steps.append("**Rule:** Group and combine like terms")
-                steps.append(f"Identify like terms:")
-                steps.append(f"- Terms with $x$: ${a}x$ and ${c}x$")
-                steps.append(f"- Terms with $y$: ${b}y$ and ${d}y$")
-
-                x_coef = a + c
-                y_coef = b + d
-
-                steps.append(f"Combine $x$ terms: ${a}x + {c}x = {x_coef}x$")
-                steps.append(f"Combine $y$ terms: ${b}y + {d}y = {y_coef}y$")
+                # ax + by + cx + dy
+                second_y = d
+            else:
+                # ax + by + cx - dy
+                second_y = -d_val
+            expression = f"{a}x + {b}y + {c}x {b_sign} {abs(second_y)}y"
 
+            x_coef = a + c
+            y_coef = b + second_y
+            if y_coef >= 0:
                 answer_str = f"{x_coef}x + {y_coef}y"
             else:
-                expression = f"{a}x + {b}y + {c}x - {d_val}y"
-                steps.append(f"Start with the expression: ${a}x + {b}y + {c}x - {d_val}y$")
-                steps.append("**Rule:** Group and combine like terms")
-                steps.append(f"Identify like terms:")
-                steps.append(f"- Terms with $x$: ${a}x$ and ${c}x$")
-                steps.append(f"- Terms with $y$: ${b}y$ and ${-d_val}y$")
-
-                x_coef = a + c
-                y_coef = b - d_val
-
-                steps.append(f"Combine $x$ terms: ${a}x + {c}x = {x_coef}x$")
-                steps.append(f"Combine $y$ terms: ${b}y - {d_val}y = {y_coef}y$")
-
-                if y_coef >= 0:
-                    answer_str = f"{x_coef}x + {y_coef}y"
-                else:
-                    answer_str = f"{x_coef}x - {abs(y_coef)}y"
-
-            steps.append(f"Write the simplified expression: ${answer_str}$")
+                answer_str = f"{x_coef}x - {abs(y_coef)}y"
+            steps = LazySteps(_two_variable_steps, expression, a, b, c, second_y, answer_str)
 
     else:  # difficulty == 3
         # Hard: Multiple variables with squared terms
         # Format: ax^2 + bx + cx^2 + dx + e
-        a = random.randint(1, 5)
-        b = random.randint(2, 8)
-        c = random.randint(1, 5)
-        d = random.randint(1, 8)
-        e = random.randint(1, 12)
+        a = rng.randint(1, 5)
+        b = rng.randint(2, 8)
+        c = rng.randint(1, 5)
+        d = rng.randint(1, 8)
+        e = rng.randint(1, 12)
 
         # Randomly add or subtract some terms
-        sign1 = random.choice(['+', '-'])
-        sign2 = random.choice(['+', '-'])
-
-        if sign1 == '+' and sign2 == '+':
-            expression = f"{a}x^2 + {b}x + {c}x^2 + {d}x + {e}"
-            x2_coef = a + c
-            x_coef = b + d
-        elif sign1 == '+' and sign2 == '-':
-            expression = f"{a}x^2 + {b}x + {c}x^2 - {d}x + {e}"
-            x2_coef = a + c
-            x_coef = b - d
-        elif sign1 == '-' and sign2 == '+':
-            expression = f"{a}x^2 + {b}x - {c}x^2 + {d}x + {e}"
-            x2_coef = a - c
-            x_coef = b + d
-        else:
-            expression = f"{a}x^2 + {b}x - {c}x^2 - {d}x + {e}"
-            x2_coef = a - c
-            x_coef = b - d
-
-        steps.append(f"Start with the expression: ${expression}$")
-        steps.append("**Rule:** Group and combine like terms")
-        steps.append(f"Identify like terms:")
-        steps.append(f"- Terms with $x^2$: ${a}x^2$ and {sign1} ${c}x^2$")
-        steps.append(f"- Terms with $x$: ${b}x$ and {sign2} ${d}x$")
-        steps.append(f"- Constant term: ${e}$")
-
-        if sign1 == '+':
-            steps.append(f"Combine $x^2$ terms: ${a}x^2 + {c}x^2 = {x2_coef}x^2$")
-        else:
-            steps.append(f"Combine $x^2$ terms: ${a}x^2 - {c}x^2 = {x2_coef}x^2$")
-
-        if sign2 == '+':
-            steps.append(f"Combine $x$ terms: ${b}x + {d}x = {x_coef}x$")
-        else:
-            steps.append(f"Combine $x$ terms: ${b}x - {d}x = {x_coef}x$")
+        sign1 = rng.choice(['+', '-'])
+        sign2 = rng.choice(['+', '-'])
 
-        steps.append(f"The constant term remains: ${e}$")
+        expression = f"{a}x^2 + {b}x {sign1} {c}x^2 {sign2} {d}x + {e}"
+        x2_coef = a + c if sign1 == '+' else a - c
+        x_coef = b + d if sign2 == '+' else b - d
 
         # Build answer string
         if x2_coef != 0 and x_coef >= 0:
@@ -182,13 +118,79 @@ def generate_combining_like_terms(difficulty: int = 1) -> Dict[str, Any]:
         else:
             answer_str = f"{abs(x_coef)}x + {e}"
 
-        steps.append(f"Write the simplified expression: ${answer_str}$")
-
+        steps = LazySteps(
+            _squared_terms_steps, expression, a, b, c, d, e, sign1, sign2, x2_coef, x_coef, answer_str
+        )
+
+    return GeneratedQuestion(
+        question=f"Simplify by combining like terms: ${expression}$",
+        answer=answer_str,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _single_variable_steps(expression: str, variable: str, coef1: int, coef2: int, coef3: Optional[int],
+                           answer_str: str) -> List[str]:
+    """Steps for two or three like terms in one variable (coef3 is subtracted when given)."""
+    steps = [
+        f"Start with the expression: ${expression}$",
+        f"**Rule:** Like terms have the same variable and can be combined",
+    ]
+    if coef3 is None:
+        steps.append(f"Both terms have the variable ${variable}$, so they are like terms")
+        steps.append(f"Add the coefficients: ${coef1} + {coef2} = {coef1 + coef2}$")
+    else:
+        steps.append(f"All terms have the variable ${variable}$, so they are like terms")
+        steps.append(f"Combine the coefficients: ${coef1} + {coef2} - {coef3} = {coef1 + coef2 - coef3}$")
+    steps.append(f"Keep the variable: ${answer_str}$")
     steps.append(f"**Final Answer:** ${answer_str}$")
-
-    return {
-        "question": f"Simplify by combining like terms: ${expression}$",
-        "answer": answer_str,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return steps
+
+
+def _constant_terms_steps(expression: str, a: int, b: int, c: int, d: int, answer_str: str) -> List[str]:
+    """Steps for ax + b + cx + d."""
+    return [
+        f"Start with the expression: ${expression}$",
+        "**Rule:** Group and combine like terms",
+        f"Identify like terms:",
+        f"- Terms with $x$: ${a}x$ and ${c}x$",
+        f"- Constant terms: ${b}$ and ${d}$",
+        f"Combine $x$ terms: ${a}x + {c}x = {a + c}x$",
+        f"Combine constants: ${b} + {d} = {b + d}$",
+        f"Write the simplified expression: ${answer_str}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
+
+
+def _two_variable_steps(expression: str, a: int, b: int, c: int, d: int, answer_str: str) -> List[str]:
+    """Steps for ax + by + cx + dy, where d may be negative."""
+    return [
+        f"Start with the expression: ${expression}$",
+        "**Rule:** Group and combine like terms",
+        f"Identify like terms:",
+        f"- Terms with $x$: ${a}x$ and ${c}x$",
+        f"- Terms with $y$: ${b}y$ and ${d}y$",
+        f"Combine $x$ terms: ${a}x + {c}x = {a + c}x$",
+        f"Combine $y$ terms: ${b}y {format_signed(d)}y = {b + d}y$",
+        f"Write the simplified expression: ${answer_str}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
+
+
+def _squared_terms_steps(expression: str, a: int, b: int, c: int, d: int, e: int, sign1: str, sign2: str,
+                         x2_coef: int, x_coef: int, answer_str: str) -> List[str]:
+    """Steps for ax^2 + bx ± cx^2 ± dx + e."""
+    return [
+        f"Start with the expression: ${expression}$",
+        "**Rule:** Group and combine like terms",
+        f"Identify like terms:",
+        f"- Terms with $x^2$: ${a}x^2$ and {sign1} ${c}x^2$",
+        f"- Terms with $x$: ${b}x$ and {sign2} ${d}x$",
+        f"- Constant term: ${e}$",
+        f"Combine $x^2$ terms: ${a}x^2 {sign1} {c}x^2 = {x2_coef}x^2$",
+        f"Combine $x$ terms: ${b}x {sign2} {d}x = {x_coef}x$",
+        f"The constant term remains: ${e}$",
+        f"Write the simplified expression: ${answer_str}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
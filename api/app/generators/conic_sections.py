@@ -2,7 +2,10 @@
 
 import random
 import math
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Word problem templates for engaging, real-world contexts
 CIRCLE_WORD_PROBLEMS = [
@@ -58,178 +61,212 @@ HYPERBOLA_WORD_PROBLEMS = [
 ]
 
 
-def generate_conic_sections(difficulty: int = 1) -> Dict[str, Any]:
+def generate_conic_sections(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a conic sections problem.
 
     Args:
         difficulty: 1 (circle center/radius), 2 (ellipse/parabola), 3 (hyperbola)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Find radius or center coordinate of a circle
-        h = random.randint(-5, 5)
-        k = random.randint(-5, 5)
-        r = random.randint(2, 6)
-        use_word_problem = random.random() < 0.4
+        h = rng.randint(-5, 5)
+        k = rng.randint(-5, 5)
+        r = rng.randint(2, 6)
+        use_word_problem = rng.random() < 0.4
 
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Find radius
             if use_word_problem:
-                context = random.choice(CIRCLE_WORD_PROBLEMS)
+                context = rng.choice(CIRCLE_WORD_PROBLEMS)
                 context_text = context["context"].format(h=h, k=k, r=r)
                 question = f"{context_text}\n\nThe equation of the circle is $(x {-h:+d})^2 + (y {-k:+d})^2 = {r**2}$.\n\n{context['question_template']}"
             else:
                 question = f"Find the radius of the circle with equation $(x {-h:+d})^2 + (y {-k:+d})^2 = {r**2}$."
 
-            steps = [
-                "The standard form of a circle is $(x - h)^2 + (y - k)^2 = r^2$",
-                "where $(h, k)$ is the center and $r$ is the radius.",
-                "",
-                f"From the equation $(x {-h:+d})^2 + (y {-k:+d})^2 = {r**2}$, we can identify $r^2 = {r**2}$.",
-                "",
-                f"Taking the square root of both sides: $r = \\sqrt{{{r**2}}} = {r}$",
-                "",
-                f"**Final Answer:** ${r}$ units"
-            ]
+            steps = LazySteps(_radius_steps, h, k, r)
 
             answer_numeric = r
         else:
             # Find x-coordinate of center
             if use_word_problem:
-                context = random.choice(CIRCLE_WORD_PROBLEMS)
+                context = rng.choice(CIRCLE_WORD_PROBLEMS)
                 context_text = context["context"].format(h=h, k=k, r=r)
                 question = f"{context_text}\n\nThe equation of the circle is $(x {-h:+d})^2 + (y {-k:+d})^2 = {r**2}$.\n\n{context['question_template']}"
             else:
                 question = f"Find the $x$-coordinate of the center of the circle with equation $(x {-h:+d})^2 + (y {-k:+d})^2 = {r**2}$."
 
-            steps = [
-                "The standard form of a circle is $(x - h)^2 + (y - k)^2 = r^2$",
-                "where $(h, k)$ is the center and $r$ is the radius.",
-                "",
-                f"In our equation $(x {-h:+d})^2 + (y {-k:+d})^2 = {r**2}$, we need to identify the center.",
-            ]
-
-            if h >= 0:
-                steps.append(f"The term $(x - {h})^2$ tells us the $x$-coordinate of the center is $h = {h}$")
-            else:
-                steps.append(f"The term $(x - ({h}))^2 = (x + {-h})^2$ tells us the $x$-coordinate of the center is $h = {h}$")
-
-            steps.extend([
-                "",
-                f"The center is located at $({h}, {k})$.",
-                f"Therefore, the $x$-coordinate is ${h}$.",
-                "",
-                f"**Final Answer:** ${h}$"
-            ])
+            steps = LazySteps(_center_steps, h, k, r)
 
             answer_numeric = h
 
     elif difficulty == 2:
         # Medium: Ellipse or Parabola
-        use_word_problem = random.random() < 0.4
+        use_word_problem = rng.random() < 0.4
 
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Ellipse: Find semi-major axis length
-            a = random.randint(4, 7)
-            b = random.randint(2, a - 1)
-            h = random.randint(-3, 3)
-            k = random.randint(-3, 3)
+            a = rng.randint(4, 7)
+            b = rng.randint(2, a - 1)
+            h = rng.randint(-3, 3)
+            k = rng.randint(-3, 3)
 
             # a > b, so a is semi-major axis
             if use_word_problem:
-                context = random.choice(ELLIPSE_WORD_PROBLEMS)
+                context = rng.choice(ELLIPSE_WORD_PROBLEMS)
                 context_text = context["context"].format(a=a, b=b, h=h, k=k)
                 question = f"{context_text}\n\nThe ellipse equation is $\\frac{{(x {-h:+d})^2}}{{{a**2}}} + \\frac{{(y {-k:+d})^2}}{{{b**2}}} = 1$.\n\n{context['question_template']}"
             else:
                 question = f"Find the length of the semi-major axis of the ellipse $\\frac{{(x {-h:+d})^2}}{{{a**2}}} + \\frac{{(y {-k:+d})^2}}{{{b**2}}} = 1$."
 
-            steps = [
-                "The standard form of an ellipse is $\\frac{{(x-h)^2}}{{a^2}} + \\frac{{(y-k)^2}}{{b^2}} = 1$",
-                "where $a$ is the semi-major axis and $b$ is the semi-minor axis.",
-                "",
-                f"From the equation: $a^2 = {a**2}$ and $b^2 = {b**2}$",
-                "",
-                f"Taking square roots: $a = {a}$ and $b = {b}$",
-                "",
-                f"Since ${a} > {b}$, the longer axis is the major axis.",
-                f"The semi-major axis has length $a = {a}$ units.",
-                "",
-                f"**Final Answer:** ${a}$ units"
-            ]
+            steps = LazySteps(_ellipse_steps, a, b)
 
             answer_numeric = a
         else:
             # Parabola: vertex form, find vertex coordinate
-            h = random.randint(-4, 4)
-            k = random.randint(-4, 4)
-            a = random.choice([1, 2, 3, 4, -1, -2, -3, -4])
+            h = rng.randint(-4, 4)
+            k = rng.randint(-4, 4)
+            a = rng.choice([1, 2, 3, 4, -1, -2, -3, -4])
 
             if use_word_problem:
-                context = random.choice(PARABOLA_WORD_PROBLEMS)
+                context = rng.choice(PARABOLA_WORD_PROBLEMS)
                 context_text = context["context"].format(h=h, k=k, a=abs(a))
                 question = f"{context_text}\n\nThe parabola equation is $y = {a}(x {-h:+d})^2 {k:+d}$.\n\n{context['question_template']}"
             else:
                 question = f"Find the $y$-coordinate of the vertex of the parabola $y = {a}(x {-h:+d})^2 {k:+d}$."
 
-            steps = [
-                "The vertex form of a parabola is $y = a(x - h)^2 + k$",
-                "where $(h, k)$ is the vertex (the turning point).",
-                "",
-                f"From the equation $y = {a}(x {-h:+d})^2 {k:+d}$:",
-                f"We can identify that the vertex is located at $({h}, {k})$.",
-                "",
-                f"The $y$-coordinate of the vertex is ${k}$.",
-                "",
-                f"**Final Answer:** ${k}$ units"
-            ]
+            steps = LazySteps(_parabola_steps, a, h, k)
 
             answer_numeric = k
 
     else:
         # Hard: Hyperbola
         # Standard form: (x-h)²/a² - (y-k)²/b² = 1
-        a = random.randint(2, 5)
-        b = random.randint(2, 5)
-        h = random.randint(-3, 3)
-        k = random.randint(-3, 3)
-        use_word_problem = random.random() < 0.4
+        a = rng.randint(2, 5)
+        b = rng.randint(2, 5)
+        h = rng.randint(-3, 3)
+        k = rng.randint(-3, 3)
+        use_word_problem = rng.random() < 0.4
 
         # For hyperbola, vertices are at (h±a, k)
         # Distance between vertices is 2a
         vertex_distance = 2 * a
 
         if use_word_problem:
-            context = random.choice(HYPERBOLA_WORD_PROBLEMS)
+            context = rng.choice(HYPERBOLA_WORD_PROBLEMS)
             context_text = context["context"].format(h=h, k=k, a=a)
             question = f"{context_text}\n\nThe hyperbola equation is $\\frac{{(x {-h:+d})^2}}{{{a**2}}} - \\frac{{(y {-k:+d})^2}}{{{b**2}}} = 1$.\n\n{context['question_template']}"
         else:
             question = f"Find the distance between the vertices of the hyperbola $\\frac{{(x {-h:+d})^2}}{{{a**2}}} - \\frac{{(y {-k:+d})^2}}{{{b**2}}} = 1$."
 
-        steps = [
-            "The standard form of a horizontal hyperbola is $\\frac{{(x-h)^2}}{{a^2}} - \\frac{{(y-k)^2}}{{b^2}} = 1$",
-            "The vertices are the closest points on each branch to the center.",
-            "",
-            f"From the equation: $a^2 = {a**2}$, so $a = {a}$",
-            "",
-            f"For a horizontal hyperbola, the vertices are at $(h \\pm a, k)$:",
-            f"- Left vertex: $({h} - {a}, {k}) = ({h - a}, {k})$",
-            f"- Right vertex: $({h} + {a}, {k}) = ({h + a}, {k})$",
-            "",
-            "The distance between the two vertices is:",
-            f"Distance $= 2a = 2 \\times {a} = {vertex_distance}$ units",
-            "",
-            f"**Final Answer:** ${vertex_distance}$ units"
-        ]
+        steps = LazySteps(_hyperbola_steps, a, h, k, vertex_distance)
 
         answer_numeric = vertex_distance
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _radius_steps(h: int, k: int, r: int) -> List[str]:
+    """Steps for reading the radius off a circle in standard form."""
+    return [
+        "The standard form of a circle is $(x - h)^2 + (y - k)^2 = r^2$",
+        "where $(h, k)$ is the center and $r$ is the radius.",
+        "",
+        f"From the equation $(x {-h:+d})^2 + (y {-k:+d})^2 = {r**2}$, we can identify $r^2 = {r**2}$.",
+        "",
+        f"Taking the square root of both sides: $r = \\sqrt{{{r**2}}} = {r}$",
+        "",
+        f"**Final Answer:** ${r}$ units"
+    ]
+
+
+def _center_steps(h: int, k: int, r: int) -> List[str]:
+    """Steps for reading the center's x-coordinate off a circle in standard form."""
+    steps = [
+        "The standard form of a circle is $(x - h)^2 + (y - k)^2 = r^2$",
+        "where $(h, k)$ is the center and $r$ is the radius.",
+        "",
+        f"In our equation $(x {-h:+d})^2 + (y {-k:+d})^2 = {r**2}$, we need to identify the center.",
+    ]
+
+    if h >= 0:
+        steps.append(f"The term $(x - {h})^2$ tells us the $x$-coordinate of the center is $h = {h}$")
+    else:
+        steps.append(f"The term $(x - ({h}))^2 = (x + {-h})^2$ tells us the $x$-coordinate of the center is $h = {h}$")
+
+    steps.extend([
+        "",
+        f"The center is located at $({h}, {k})$.",
+        f"Therefore, the $x$-coordinate is ${h}$.",
+        "",
+        f"**Final Answer:** ${h}$"
+    ])
+    return steps
+
+
+def _ellipse_steps(a: int, b: int) -> List[str]:
+    """Steps for finding the semi-major axis of an ellipse."""
+    return [
+        "The standard form of an ellipse is $\\frac{{(x-h)^2}}{{a^2}} + \\frac{{(y-k)^2}}{{b^2}} = 1$",
+        "where $a$ is the semi-major axis and $b$ is the semi-minor axis.",
+        "",
+        f"From the equation: $a^2 = {a**2}$ and $b^2 = {b**2}$",
+        "",
+        f"Taking square roots: $a = {a}$ and $b = {b}$",
+        "",
+        f"Since ${a} > {b}$, the longer axis is the major axis.",
+        f"The semi-major axis has length $a = {a}$ units.",
+        "",
+        f"**Final Answer:** ${a}$ units"
+    ]
+
+
+def _parabola_steps(a: int, h: int, k: int) -> List[str]:
+    """Steps for reading the vertex off a parabola in vertex form."""
+    return [
+        "The vertex form of a parabola is $y = a(x - h)^2 + k$",
+        "where $(h, k)$ is the vertex (the turning point).",
+        "",
+        f"From the equation $y = {a}(x {-h:+d})^2 {k:+d}$:",
+        f"We can identify that the vertex is located at $({h}, {k})$.",
+        "",
+        f"The $y$-coordinate of the vertex is ${k}$.",
+        "",
+        f"**Final Answer:** ${k}$ units"
+    ]
+
+
+def _hyperbola_steps(a: int, h: int, k: int, vertex_distance: int) -> List[str]:
+    """Steps for the distance between the vertices of a hyperbola."""
+    return [
+        "The standard form of a horizontal hyperbola is $\\frac{{(x-h)^2}}{{a^2}} - \\frac{{(y-k)^2}}{{b^2}} = 1$",
+        "The vertices are the closest points on each branch to the center.",
+        "",
+        f"From the equation: $a^2 = {a**2}$, so $a = {a}$",
+        "",
+        f"For a horizontal hyperbola, the vertices are at $(h \\pm a, k)$:",
+        f"- Left vertex: $({h} - {a}, {k}) = ({h - a}, {k})$",
+        f"- Right vertex: $({h} + {a}, {k}) = ({h + a}, {k})$",
+        "",
+        "The distance between the two vertices is:",
+        f"Distance $= 2a = 2 \\times {a} = {vertex_distance}$ units",
+        "",
+        f"**Final Answer:** ${vertex_distance}$ units"
+    ]
@@ -1,7 +1,11 @@
 """Decimals operations question generator with word problems."""
 
 import random
-from typing import Dict, Any, List
+from typing import Any, Callable, Dict, List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
+from app.generators.vectorized import Variant, maximum, minimum, tenths
 
 # Word problem templates for decimals
 DECIMAL_WORD_PROBLEMS = {
@@ -28,147 +32,230 @@ DECIMAL_WORD_PROBLEMS = {
 }
 
 
-def generate_decimals_operations(difficulty: int = 1) -> Dict[str, Any]:
+def generate_decimals_operations(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a decimals operations problem.
 
     Args:
         difficulty: 1 (addition/subtraction), 2 (multiplication/division), 3 (mixed operations)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps: List[str] = []
+    rng = get_rng(rng, seed)
 
     # Use word problems 50% of the time
-    use_word_problem = random.random() < 0.5
+    use_word_problem = rng.random() < 0.5
 
     if difficulty == 1:
         # Simple addition/subtraction
-        operation = random.choice(["+", "-"])
-        a = round(random.uniform(1, 10), 1)
-        b = round(random.uniform(1, 10), 1)
+        operation = rng.choice(["+", "-"])
+        a = round(rng.uniform(1, 10), 1)
+        b = round(rng.uniform(1, 10), 1)
 
         if operation == "+":
             answer = a + b
-
-            if use_word_problem:
-                wp = random.choice(DECIMAL_WORD_PROBLEMS["addition"])
-                word_question = wp["template"].format(a=a, b=b)
-                question = word_question
-                steps.append(f"**Problem:** {word_question}")
-                steps.append(f"**Identify:** Add ${a} + {b}$")
-            else:
-                question = f"${a} + {b}$"
-                steps.append(f"Calculate: ${a} + {b}$")
-
-            steps.append("**Method:** Line up the decimal points:")
-            steps.append(f"$\\begin{{align*}} {a:.1f} \\\\ + {b:.1f} \\\\ \\hline {answer:.1f} \\end{{align*}}$")
+            kind, identify = "addition", f"Add ${a} + {b}$"
         else:
             # Ensure non-negative result
             if a < b:
                 a, b = b, a
             answer = a - b
+            kind, identify = "subtraction", f"Subtract ${a} - {b}$"
 
-            if use_word_problem:
-                wp = random.choice(DECIMAL_WORD_PROBLEMS["subtraction"])
-                word_question = wp["template"].format(a=a, b=b)
-                question = word_question
-                steps.append(f"**Problem:** {word_question}")
-                steps.append(f"**Identify:** Subtract ${a} - {b}$")
-            else:
-                question = f"${a} - {b}$"
-                steps.append(f"Calculate: ${a} - {b}$")
-
-            steps.append("**Method:** Line up the decimal points:")
-            steps.append(f"$\\begin{{align*}} {a:.1f} \\\\ - {b:.1f} \\\\ \\hline {answer:.1f} \\end{{align*}}$")
+        question = f"${a} {operation} {b}$"
+        wp_values = {"a": a, "b": b}
+        step_builder = _vector_add_subtract_steps
+        row = {"a": a, "b": b, "sign": operation, "answer": answer}
 
     elif difficulty == 2:
         # Multiplication/division
-        operation = random.choice(["*", "/"])
+        operation = rng.choice(["*", "/"])
 
         if operation == "*":
-            a = round(random.uniform(1, 5), 1)
-            b = round(random.uniform(1, 5), 1)
+            a = round(rng.uniform(1, 5), 1)
+            b = round(rng.uniform(1, 5), 1)
             answer = a * b
 
-            if use_word_problem:
-                wp = random.choice(DECIMAL_WORD_PROBLEMS["multiplication"])
-                word_question = wp["template"].format(a=a, b=b)
-                question = word_question
-                steps.append(f"**Problem:** {word_question}")
-                steps.append(f"**Identify:** Multiply ${a} \\times {b}$")
-            else:
-                question = f"${a} \\times {b}$"
-                steps.append(f"Calculate: ${a} \\times {b}$")
-
-            steps.append("**Method:** Multiply as if they were whole numbers:")
-            a_no_decimal = int(a * 10)
-            b_no_decimal = int(b * 10)
-            product = a_no_decimal * b_no_decimal
-            steps.append(f"${a_no_decimal} \\times {b_no_decimal} = {product}$")
-            steps.append("Count decimal places: 1 in each number = 2 total")
-            steps.append(f"Place decimal point 2 places from the right: ${answer:.2f}$")
+            kind, identify = "multiplication", f"Multiply ${a} \\times {b}$"
+            question = f"${a} \\times {b}$"
+            wp_values = {"a": a, "b": b}
+            step_builder = _vector_multiply_steps
+            row = {"a": a, "b": b, "answer": answer}
         else:
             # Division - ensure clean result
-            divisor = round(random.uniform(1, 5), 1)
-            quotient = round(random.uniform(1, 10), 1)
-            a = divisor * quotient
+            divisor = round(rng.uniform(1, 5), 1)
+            quotient = round(rng.uniform(1, 10), 1)
+            # Up to two decimal places; shown in full so the quotient is exact
+            a = round(divisor * quotient, 2)
             answer = quotient
 
-            if use_word_problem:
-                wp = random.choice(DECIMAL_WORD_PROBLEMS["division"])
-                word_question = wp["template"].format(a=round(a, 1), b=divisor)
-                question = word_question
-                steps.append(f"**Problem:** {word_question}")
-                steps.append(f"**Identify:** Divide ${a:.1f} \\div {divisor}$")
-            else:
-                question = f"${a:.1f} \\div {divisor}$"
-                steps.append(f"Calculate: ${a:.1f} \\div {divisor}$")
-
-            steps.append(f"**Method:** Move decimal in both numbers one place right:")
-            steps.append(f"${int(a * 10)} \\div {int(divisor * 10)}$")
-            steps.append(f"Divide: ${int(a * 10)} \\div {int(divisor * 10)} = {answer:.1f}$")
+            # Word problems show a the way the plain question does
+            wp_values = {"a": f"{a:g}", "b": divisor}
+            kind, identify = "division", f"Divide ${a:g} \\div {divisor}$"
+            question = f"${a:g} \\div {divisor}$"
+            step_builder = _vector_divide_steps
+            row = {"a": a, "divisor": divisor, "answer": answer}
 
     else:
         # Mixed operations with parentheses
-        a = round(random.uniform(1, 5), 1)
-        b = round(random.uniform(1, 5), 1)
-        c = round(random.uniform(1, 3), 1)
+        a = round(rng.uniform(1, 5), 1)
+        b = round(rng.uniform(1, 5), 1)
+        c = round(rng.uniform(1, 3), 1)
 
-        operation_choice = random.choice(["add_mult", "sub_mult"])
+        operation_choice = rng.choice(["add_mult", "sub_mult"])
 
         if operation_choice == "add_mult":
             # (a + b) × c
-            sum_ab = a + b
-            answer = sum_ab * c
-            question = f"$({a} + {b}) \\times {c}$"
-
-            steps.append(f"Calculate: $({a} + {b}) \\times {c}$")
-            steps.append("Step 1: Solve inside parentheses first")
-            steps.append(f"${a} + {b} = {sum_ab:.1f}$")
-            steps.append(f"Step 2: Multiply the result by ${c}$")
-            steps.append(f"${sum_ab:.1f} \\times {c} = {answer:.2f}$")
+            sign, inner = "+", a + b
         else:
             # (a - b) × c
             if a < b:
                 a, b = b, a
-            diff_ab = a - b
-            answer = diff_ab * c
-            question = f"$({a} - {b}) \\times {c}$"
-
-            steps.append(f"Calculate: $({a} - {b}) \\times {c}$")
-            steps.append("Step 1: Solve inside parentheses first")
-            steps.append(f"${a} - {b} = {diff_ab:.1f}$")
-            steps.append(f"Step 2: Multiply the result by ${c}$")
-            steps.append(f"${diff_ab:.1f} \\times {c} = {answer:.2f}$")
-
-    steps.append(f"**Final Answer:** ${answer:.2f}$")
-
-    return {
-        "question": f"Calculate: {question}",
-        "answer": f"{answer:.2f}",
-        "answer_numeric": round(answer, 2),
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+            sign, inner = "-", a - b
+        answer = inner * c
+        question = f"$({a} {sign} {b}) \\times {c}$"
+        step_builder = _vector_mixed_steps
+        row = {"a": a, "b": b, "c": c, "sign": sign, "inner": inner, "answer": answer}
+
+    if difficulty <= 2 and use_word_problem:
+        wp = rng.choice(DECIMAL_WORD_PROBLEMS[kind])
+        question = wp["template"].format(**wp_values)
+        steps = LazySteps(_word_problem_steps, question, identify, step_builder, row)
+    else:
+        steps = LazySteps(step_builder, row)
+
+    return GeneratedQuestion(
+        question=f"Calculate: {question}",
+        answer=f"{answer:.2f}",
+        answer_numeric=round(answer, 2),
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _word_problem_steps(
+    question: str, identify: str, steps: Callable[[Dict[str, Any]], List[str]], row: Dict[str, Any]
+) -> List[str]:
+    """Steps for a word problem: restate it, then solve the plain calculation."""
+    return [f"**Problem:** {question}", f"**Identify:** {identify}"] + steps(row)[1:]
+
+
+# Step builders shared by generate_decimals_operations and the vectorized batches
+def _vector_add_subtract_steps(row: Dict[str, Any]) -> List[str]:
+    a, b, sign, answer = row["a"], row["b"], row["sign"], row["answer"]
+    return [
+        f"Calculate: ${a} {sign} {b}$",
+        "**Method:** Line up the decimal points:",
+        f"$\\begin{{align*}} {a:.1f} \\\\ {sign} {b:.1f} \\\\ \\hline {answer:.1f} \\end{{align*}}$",
+        f"**Final Answer:** ${answer:.2f}$",
+    ]
+
+
+def _vector_multiply_steps(row: Dict[str, Any]) -> List[str]:
+    a, b, answer = row["a"], row["b"], row["answer"]
+    a_no_decimal = int(a * 10)
+    b_no_decimal = int(b * 10)
+    return [
+        f"Calculate: ${a} \\times {b}$",
+        "**Method:** Multiply as if they were whole numbers:",
+        f"${a_no_decimal} \\times {b_no_decimal} = {a_no_decimal * b_no_decimal}$",
+        "Count decimal places: 1 in each number = 2 total",
+        f"Place decimal point 2 places from the right: ${answer:.2f}$",
+        f"**Final Answer:** ${answer:.2f}$",
+    ]
+
+
+def _vector_divide_steps(row: Dict[str, Any]) -> List[str]:
+    a, divisor, answer = row["a"], row["divisor"], row["answer"]
+    return [
+        f"Calculate: ${a:g} \\div {divisor}$",
+        "**Method:** Move the decimal point in both numbers until the divisor is whole:",
+        f"${round(a * 100)} \\div {round(divisor * 100)}$",
+        f"Divide: ${round(a * 100)} \\div {round(divisor * 100)} = {answer:.1f}$",
+        f"**Final Answer:** ${answer:.2f}$",
+    ]
+
+
+def _vector_mixed_steps(row: Dict[str, Any]) -> List[str]:
+    a, b, c, sign, answer = row["a"], row["b"], row["c"], row["sign"], row["answer"]
+    inner = row["inner"]
+    return [
+        f"Calculate: $({a} {sign} {b}) \\times {c}$",
+        "Step 1: Solve inside parentheses first",
+        f"${a} {sign} {b} = {inner:.1f}$",
+        f"Step 2: Multiply the result by ${c}$",
+        f"${inner:.1f} \\times {c} = {answer:.2f}$",
+        f"**Final Answer:** ${answer:.2f}$",
+    ]
+
+
+# Vectorized batches (see app.generators.vectorized) cover the expression
+# forms of each difficulty; word problems are only generated one at a time
+VECTORIZED_VARIANTS = {
+    1: (
+        Variant(
+            fields=[("a", tenths(1, 10)), ("b", tenths(1, 10))],
+            compute=lambda p: {"sign": "+", "answer": p["a"] + p["b"]},
+            question="Calculate: ${a} + {b}$",
+            answer="{answer:.2f}",
+            steps=_vector_add_subtract_steps,
+        ),
+        Variant(
+            fields=[("x", tenths(1, 10)), ("y", tenths(1, 10))],
+            compute=lambda p: {
+                "a": maximum(p["x"], p["y"]),
+                "b": minimum(p["x"], p["y"]),
+                "sign": "-",
+                "answer": maximum(p["x"], p["y"]) - minimum(p["x"], p["y"]),
+            },
+            question="Calculate: ${a} - {b}$",
+            answer="{answer:.2f}",
+            steps=_vector_add_subtract_steps,
+        ),
+    ),
+    2: (
+        Variant(
+            fields=[("a", tenths(1, 5)), ("b", tenths(1, 5))],
+            compute=lambda p: {"answer": p["a"] * p["b"]},
+            question="Calculate: ${a} \\times {b}$",
+            answer="{answer:.2f}",
+            steps=_vector_multiply_steps,
+        ),
+        Variant(
+            fields=[("divisor", tenths(1, 5)), ("quotient", tenths(1, 10))],
+            compute=lambda p: {"a": p["divisor"] * p["quotient"], "answer": p["quotient"]},
+            question="Calculate: ${a:g} \\div {divisor}$",
+            answer="{answer:.2f}",
+            steps=_vector_divide_steps,
+        ),
+    ),
+    3: (
+        Variant(
+            fields=[("a", tenths(1, 5)), ("b", tenths(1, 5)), ("c", tenths(1, 3))],
+            compute=lambda p: {"sign": "+", "inner": p["a"] + p["b"], "answer": (p["a"] + p["b"]) * p["c"]},
+            question="Calculate: $({a} + {b}) \\times {c}$",
+            answer="{answer:.2f}",
+            steps=_vector_mixed_steps,
+        ),
+        Variant(
+            fields=[("x", tenths(1, 5)), ("y", tenths(1, 5)), ("c", tenths(1, 3))],
+            compute=lambda p: {
+                "a": maximum(p["x"], p["y"]),
+                "b": minimum(p["x"], p["y"]),
+                "sign": "-",
+                "inner": maximum(p["x"], p["y"]) - minimum(p["x"], p["y"]),
+                "answer": (maximum(p["x"], p["y"]) - minimum(p["x"], p["y"])) * p["c"],
+            },
+            question="Calculate: $({a} - {b}) \\times {c}$",
+            answer="{answer:.2f}",
+            steps=_vector_mixed_steps,
+        ),
+    ),
+}
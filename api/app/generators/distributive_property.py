@@ -1,7 +1,10 @@
 """Distributive property question generator with real-world contexts."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for distributive property
 DISTRIBUTIVE_CONTEXTS = [
@@ -16,7 +19,11 @@ MENTAL_MATH_CONTEXTS = [
 ]
 
 
-def generate_distributive_property(difficulty: int = 1) -> Dict[str, Any]:
+def generate_distributive_property(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a distributive property problem: a(b + c) = ab + ac.
 
@@ -25,143 +32,148 @@ def generate_distributive_property(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - simple positive integers)
             2 (medium - includes negative numbers)
             3 (hard - variables and multiple terms)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
-    use_context = random.random() < 0.4
+    rng = get_rng(rng, seed)
+
+    use_context = rng.random() < 0.4
 
     if difficulty == 1:
         # Easy: a(b + c) with positive integers
-        a = random.randint(2, 9)
-        b = random.randint(1, 10)
-        c = random.randint(1, 10)
+        a = rng.randint(2, 9)
+        b = rng.randint(1, 10)
+        c = rng.randint(1, 10)
 
         expression = f"{a}({b} + {c})"
 
+        problem = None
         if use_context:
-            ctx = random.choice(DISTRIBUTIVE_CONTEXTS)
-            question = ctx["template"].format(a=a, b=b, c=c)
-            steps.append(f"**Problem:** {question}")
-            steps.append(f"**Expression:** ${expression}$")
-        else:
-            steps.append(f"Start with the expression: ${a}({b} + {c})$")
-
-        steps.append("**Rule:** Distribute the outside term to each term inside the parentheses")
-        steps.append(f"Multiply ${a}$ by each term inside: ${a} \\times {b}$ and ${a} \\times {c}$")
-
-        term1 = a * b
-        term2 = a * c
-        steps.append(f"${a} \\times {b} = {term1}$")
-        steps.append(f"${a} \\times {c} = {term2}$")
-        steps.append(f"Combine: ${term1} + {term2}$")
+            ctx = rng.choice(DISTRIBUTIVE_CONTEXTS)
+            problem = ctx["template"].format(a=a, b=b, c=c)
 
-        answer = term1 + term2
-        steps.append(f"Add the results: ${term1} + {term2} = {answer}$")
+        answer = a * b + a * c
+        steps = LazySteps(_positive_steps, problem, expression, a, b, c)
 
     elif difficulty == 2:
         # Medium: Include negative numbers and subtraction
-        a = random.randint(-8, -2) if random.choice([True, False]) else random.randint(2, 8)
-        b = random.randint(1, 12)
-        c = random.randint(1, 12)
+        a = rng.randint(-8, -2) if rng.choice([True, False]) else rng.randint(2, 8)
+        b = rng.randint(1, 12)
+        c = rng.randint(1, 12)
 
         # Randomly choose addition or subtraction inside
-        if random.choice([True, False]):
-            # Subtraction
-            expression = f"{a}({b} - {c})"
-            steps.append(f"Start with the expression: ${a}({b} - {c})$")
-            steps.append("**Rule:** Distribute the outside term to each term inside the parentheses")
-            steps.append(f"Distribute ${a}$ to both ${b}$ and ${-c}$ (note the negative sign)")
-
-            term1 = a * b
-            term2 = a * (-c)
-            steps.append(f"${a} \\times {b} = {term1}$")
-            steps.append(f"${a} \\times ({-c}) = {term2}$")
-
-            sign = "+" if term2 >= 0 else "-"
-            abs_term2 = abs(term2)
-            steps.append(f"Combine: ${term1} {sign} {abs_term2}$")
-
-            answer = term1 + term2
-            steps.append(f"Simplify: ${answer}$")
-        else:
-            # Addition with negative a
-            expression = f"{a}({b} + {c})"
-            steps.append(f"Start with the expression: ${a}({b} + {c})$")
-            steps.append("**Rule:** Distribute the outside term to each term inside")
-            steps.append(f"Distribute ${a}$ to both ${b}$ and ${c}$")
+        subtract = rng.choice([True, False])
+        expression = f"{a}({b} {'-' if subtract else '+'} {c})"
 
-            term1 = a * b
-            term2 = a * c
-            steps.append(f"${a} \\times {b} = {term1}$")
-            steps.append(f"${a} \\times {c} = {term2}$")
-
-            sign = "+" if term2 >= 0 else "-"
-            abs_term2 = abs(term2)
-            steps.append(f"Combine: ${term1} {sign} {abs_term2}$")
-
-            answer = term1 + term2
-            steps.append(f"Simplify: ${answer}$")
+        answer = a * b + a * (-c if subtract else c)
+        steps = LazySteps(_signed_steps, expression, a, b, c, subtract)
 
     else:  # difficulty == 3
         # Hard: Variables with coefficients
-        a = random.randint(2, 7)
-        b_coef = random.randint(1, 6)
-        c = random.randint(1, 10)
+        a = rng.randint(2, 7)
+        b_coef = rng.randint(1, 6)
+        c = rng.randint(1, 10)
 
         # Format: a(bx + c) or a(bx - c)
-        use_subtraction = random.choice([True, False])
+        use_subtraction = rng.choice([True, False])
 
+        term1_coef = a * b_coef
         if use_subtraction:
             expression = f"{a}({b_coef}x - {c})"
-            steps.append(f"Start with the expression: ${a}({b_coef}x - {c})$")
-            steps.append("**Rule:** Distribute the outside term to each term inside the parentheses")
-            steps.append(f"Distribute ${a}$ to both ${b_coef}x$ and ${-c}$")
-
-            term1_coef = a * b_coef
             term2 = a * (-c)
-
-            steps.append(f"${a} \\times {b_coef}x = {term1_coef}x$")
-            steps.append(f"${a} \\times ({-c}) = {term2}$")
-
-            if term2 >= 0:
-                answer_str = f"{term1_coef}x + {term2}"
-                steps.append(f"Combine: ${term1_coef}x + {term2}$")
-            else:
-                answer_str = f"{term1_coef}x - {abs(term2)}"
-                steps.append(f"Combine: ${term1_coef}x - {abs(term2)}$")
         else:
             expression = f"{a}({b_coef}x + {c})"
-            steps.append(f"Start with the expression: ${a}({b_coef}x + {c})$")
-            steps.append("**Rule:** Distribute the outside term to each term inside")
-            steps.append(f"Distribute ${a}$ to both ${b_coef}x$ and ${c}$")
-
-            term1_coef = a * b_coef
             term2 = a * c
 
-            steps.append(f"${a} \\times {b_coef}x = {term1_coef}x$")
-            steps.append(f"${a} \\times {c} = {term2}$")
-
+        if term2 >= 0:
             answer_str = f"{term1_coef}x + {term2}"
-            steps.append(f"Combine: ${term1_coef}x + {term2}$")
+        else:
+            answer_str = f"{term1_coef}x - {abs(term2)}"
+
+        return GeneratedQuestion(
+            question=f"Apply the distributive property: ${expression}$",
+            answer=answer_str,
+            steps=LazySteps(_variable_steps, expression, a, b_coef, c, use_subtraction, answer_str),
+            difficulty=difficulty,
+        )
+
+    return GeneratedQuestion(
+        question=f"Apply the distributive property: ${expression}$",
+        answer=str(answer),
+        answer_numeric=answer,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _positive_steps(problem: Optional[str], expression: str, a: int, b: int, c: int) -> List[str]:
+    """Steps for a(b + c), restating the problem when it has a context."""
+    if problem:
+        steps = [f"**Problem:** {problem}", f"**Expression:** ${expression}$"]
+    else:
+        steps = [f"Start with the expression: ${expression}$"]
+
+    steps.append("**Rule:** Distribute the outside term to each term inside the parentheses")
+    steps.append(f"Multiply ${a}$ by each term inside: ${a} \\times {b}$ and ${a} \\times {c}$")
+
+    term1 = a * b
+    term2 = a * c
+    steps.append(f"${a} \\times {b} = {term1}$")
+    steps.append(f"${a} \\times {c} = {term2}$")
+    steps.append(f"Combine: ${term1} + {term2}$")
+
+    answer = term1 + term2
+    steps.append(f"Add the results: ${term1} + {term2} = {answer}$")
+    steps.append(f"**Final Answer:** ${answer}$")
+    return steps
+
+
+def _signed_steps(expression: str, a: int, b: int, c: int, subtract: bool) -> List[str]:
+    """Steps for a(b + c) or a(b - c) where a may be negative."""
+    steps = [f"Start with the expression: ${expression}$"]
 
-        answer = answer_str
-        steps.append(f"**Final Answer:** ${answer_str}$")
+    term1 = a * b
+    if subtract:
+        steps.append("**Rule:** Distribute the outside term to each term inside the parentheses")
+        steps.append(f"Distribute ${a}$ to both ${b}$ and ${-c}$ (note the negative sign)")
+        term2 = a * (-c)
+        steps.append(f"${a} \\times {b} = {term1}$")
+        steps.append(f"${a} \\times ({-c}) = {term2}$")
+    else:
+        steps.append("**Rule:** Distribute the outside term to each term inside")
+        steps.append(f"Distribute ${a}$ to both ${b}$ and ${c}$")
+        term2 = a * c
+        steps.append(f"${a} \\times {b} = {term1}$")
+        steps.append(f"${a} \\times {c} = {term2}$")
 
-        return {
-            "question": f"Apply the distributive property: ${expression}$",
-            "answer": answer_str,
-            "steps": steps,
-            "difficulty": difficulty,
-        }
+    sign = "+" if term2 >= 0 else "-"
+    steps.append(f"Combine: ${term1} {sign} {abs(term2)}$")
 
+    answer = term1 + term2
+    steps.append(f"Simplify: ${answer}$")
     steps.append(f"**Final Answer:** ${answer}$")
+    return steps
+
 
-    return {
-        "question": f"Apply the distributive property: ${expression}$",
-        "answer": str(answer),
-        "answer_numeric": answer,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+def _variable_steps(expression: str, a: int, b_coef: int, c: int, subtract: bool, answer_str: str) -> List[str]:
+    """Steps for a(bx + c) or a(bx - c)."""
+    steps = [f"Start with the expression: ${expression}$"]
+
+    term1_coef = a * b_coef
+    if subtract:
+        steps.append("**Rule:** Distribute the outside term to each term inside the parentheses")
+        steps.append(f"Distribute ${a}$ to both ${b_coef}x$ and ${-c}$")
+        steps.append(f"${a} \\times {b_coef}x = {term1_coef}x$")
+        steps.append(f"${a} \\times ({-c}) = {a * (-c)}$")
+    else:
+        steps.append("**Rule:** Distribute the outside term to each term inside")
+        steps.append(f"Distribute ${a}$ to both ${b_coef}x$ and ${c}$")
+        steps.append(f"${a} \\times {b_coef}x = {term1_coef}x$")
+        steps.append(f"${a} \\times {c} = {a * c}$")
+
+    steps.append(f"Combine: ${answer_str}$")
+    steps.append(f"**Final Answer:** ${answer_str}$")
+    return steps
@@ -1,7 +1,10 @@
 """Evaluating algebraic expressions question generator with real-world contexts."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for evaluating expressions
 EXPRESSION_CONTEXTS = [
@@ -17,7 +20,11 @@ TWO_VAR_CONTEXTS = [
 ]
 
 
-def generate_evaluating_expressions(difficulty: int = 1) -> Dict[str, Any]:
+def generate_evaluating_expressions(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate an evaluating expressions problem.
 
@@ -26,138 +33,178 @@ def generate_evaluating_expressions(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - single variable, simple operations)
             2 (medium - two variables, more complex operations)
             3 (hard - multiple variables with exponents)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
-    use_context = random.random() < 0.5
+    rng = get_rng(rng, seed)
+
+    use_context = rng.random() < 0.5
 
     if difficulty == 1:
         # Easy: Single variable with simple operations
         # Format: ax + b where x = value
-        a = random.randint(2, 9)
-        b = random.randint(1, 15)
-        x_val = random.randint(1, 10)
+        a = rng.randint(2, 9)
+        b = rng.randint(1, 15)
+        x_val = rng.randint(1, 10)
 
         expression = f"{a}x + {b}"
 
+        problem = None
         if use_context:
-            ctx = random.choice(EXPRESSION_CONTEXTS)
-            question = ctx["question"].format(a=a, b=b, x=x_val)
-            steps.append(f"**Problem:** {question}")
-            steps.append(f"**Expression:** ${expression}$ where $x = {x_val}$")
-        else:
-            steps.append(f"Evaluate the expression: ${expression}$ when $x = {x_val}$")
-
-        steps.append("**Rule:** Substitute the given value for the variable, then simplify")
-        steps.append(f"Substitute $x = {x_val}$ into the expression:")
-        steps.append(f"${a}({x_val}) + {b}$")
-
-        term1 = a * x_val
-        steps.append(f"Multiply: ${a} \\times {x_val} = {term1}$")
-        steps.append(f"Expression becomes: ${term1} + {b}$")
+            ctx = rng.choice(EXPRESSION_CONTEXTS)
+            problem = ctx["question"].format(a=a, b=b, x=x_val)
 
-        answer = term1 + b
-        steps.append(f"Add: ${term1} + {b} = {answer}$")
+        answer = a * x_val + b
+        steps = LazySteps(_linear_steps, problem, expression, a, b, x_val)
 
     elif difficulty == 2:
         # Medium: Two variables or exponents
         # Format: ax + by or ax^2 + b
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Two variables: ax + by
-            a = random.randint(2, 8)
-            b = random.randint(2, 8)
-            x_val = random.randint(1, 8)
-            y_val = random.randint(1, 8)
+            a = rng.randint(2, 8)
+            b = rng.randint(2, 8)
+            x_val = rng.randint(1, 8)
+            y_val = rng.randint(1, 8)
 
             expression = f"{a}x + {b}y"
 
+            problem = None
             if use_context:
-                ctx = random.choice(TWO_VAR_CONTEXTS)
-                question = ctx["question"].format(a=a, b=b, x=x_val, y=y_val)
-                steps.append(f"**Problem:** {question}")
-                steps.append(f"**Expression:** ${expression}$ where $x = {x_val}$, $y = {y_val}$")
-            else:
-                steps.append(f"Evaluate the expression: ${expression}$ when $x = {x_val}$ and $y = {y_val}$")
-
-            steps.append("**Rule:** Substitute the given values for each variable, then simplify")
-            steps.append(f"Substitute $x = {x_val}$ and $y = {y_val}$:")
-            steps.append(f"${a}({x_val}) + {b}({y_val})$")
-
-            term1 = a * x_val
-            term2 = b * y_val
-            steps.append(f"Multiply each term:")
-            steps.append(f"${a} \\times {x_val} = {term1}$")
-            steps.append(f"${b} \\times {y_val} = {term2}$")
-            steps.append(f"Expression becomes: ${term1} + {term2}$")
-
-            answer = term1 + term2
-            steps.append(f"Add: ${term1} + {term2} = {answer}$")
+                ctx = rng.choice(TWO_VAR_CONTEXTS)
+                problem = ctx["question"].format(a=a, b=b, x=x_val, y=y_val)
+
+            answer = a * x_val + b * y_val
+            steps = LazySteps(_two_variable_steps, problem, expression, a, b, x_val, y_val)
         else:
             # Exponent: ax^2 + b
-            a = random.randint(1, 6)
-            b = random.randint(1, 12)
-            x_val = random.randint(2, 6)
+            a = rng.randint(1, 6)
+            b = rng.randint(1, 12)
+            x_val = rng.randint(2, 6)
 
             expression = f"{a}x^2 + {b}"
-            steps.append(f"Evaluate the expression: ${expression}$ when $x = {x_val}$")
-            steps.append("**Rule:** Substitute the value and follow order of operations (exponents before multiplication)")
-            steps.append(f"Substitute $x = {x_val}$:")
-            steps.append(f"${a}({x_val})^2 + {b}$")
-
-            x_squared = x_val ** 2
-            steps.append(f"Calculate the exponent: ${x_val}^2 = {x_squared}$")
-            steps.append(f"Expression becomes: ${a}({x_squared}) + {b}$")
-
-            term1 = a * x_squared
-            steps.append(f"Multiply: ${a} \\times {x_squared} = {term1}$")
-            steps.append(f"Expression becomes: ${term1} + {b}$")
-
-            answer = term1 + b
-            steps.append(f"Add: ${term1} + {b} = {answer}$")
+            answer = a * x_val ** 2 + b
+            steps = LazySteps(_squared_steps, expression, a, b, x_val)
 
     else:  # difficulty == 3
         # Hard: Multiple variables with exponents
         # Format: ax^2 + by - c or similar
-        a = random.randint(1, 5)
-        b = random.randint(2, 7)
-        c = random.randint(1, 10)
-        x_val = random.randint(2, 5)
-        y_val = random.randint(1, 6)
+        a = rng.randint(1, 5)
+        b = rng.randint(2, 7)
+        c = rng.randint(1, 10)
+        x_val = rng.randint(2, 5)
+        y_val = rng.randint(1, 6)
 
         expression = f"{a}x^2 + {b}y - {c}"
-        steps.append(f"Evaluate the expression: ${expression}$ when $x = {x_val}$ and $y = {y_val}$")
-        steps.append("**Rule:** Substitute values and follow order of operations (PEMDAS)")
-        steps.append(f"Substitute $x = {x_val}$ and $y = {y_val}$:")
-        steps.append(f"${a}({x_val})^2 + {b}({y_val}) - {c}$")
+        answer = a * x_val ** 2 + b * y_val - c
+        steps = LazySteps(_mixed_steps, expression, a, b, c, x_val, y_val)
 
-        x_squared = x_val ** 2
-        steps.append(f"**Step 1:** Calculate the exponent: ${x_val}^2 = {x_squared}$")
-        steps.append(f"Expression becomes: ${a}({x_squared}) + {b}({y_val}) - {c}$")
+    return GeneratedQuestion(
+        question=f"Evaluate ${expression}$ when " +
+                   (f"$x = {x_val}$" if difficulty == 1 else
+                    f"$x = {x_val}$ and $y = {y_val}$" if difficulty >= 2 else ""),
+        answer=str(answer),
+        answer_numeric=answer,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _linear_steps(problem: Optional[str], expression: str, a: int, b: int, x_val: int) -> List[str]:
+    """Steps for ax + b, restating the problem when it has a context."""
+    if problem:
+        steps = [f"**Problem:** {problem}", f"**Expression:** ${expression}$ where $x = {x_val}$"]
+    else:
+        steps = [f"Evaluate the expression: ${expression}$ when $x = {x_val}$"]
+
+    steps.append("**Rule:** Substitute the given value for the variable, then simplify")
+    steps.append(f"Substitute $x = {x_val}$ into the expression:")
+    steps.append(f"${a}({x_val}) + {b}$")
+
+    term1 = a * x_val
+    steps.append(f"Multiply: ${a} \\times {x_val} = {term1}$")
+    steps.append(f"Expression becomes: ${term1} + {b}$")
+
+    answer = term1 + b
+    steps.append(f"Add: ${term1} + {b} = {answer}$")
+    steps.append(f"**Final Answer:** ${answer}$")
+    return steps
+
+
+def _two_variable_steps(problem: Optional[str], expression: str, a: int, b: int, x_val: int,
+                        y_val: int) -> List[str]:
+    """Steps for ax + by, restating the problem when it has a context."""
+    if problem:
+        steps = [f"**Problem:** {problem}", f"**Expression:** ${expression}$ where $x = {x_val}$, $y = {y_val}$"]
+    else:
+        steps = [f"Evaluate the expression: ${expression}$ when $x = {x_val}$ and $y = {y_val}$"]
+
+    steps.append("**Rule:** Substitute the given values for each variable, then simplify")
+    steps.append(f"Substitute $x = {x_val}$ and $y = {y_val}$:")
+    steps.append(f"${a}({x_val}) + {b}({y_val})$")
+
+    term1 = a * x_val
+    term2 = b * y_val
+    steps.append(f"Multiply each term:")
+    steps.append(f"${a} \\times {x_val} = {term1}$")
+    steps.append(f"${b} \\times {y_val} = {term2}$")
+    steps.append(f"Expression becomes: ${term1} + {term2}$")
+
+    answer = term1 + term2
+    steps.append(f"Add: ${term1} + {term2} = {answer}$")
+    steps.append(f"**Final Answer:** ${answer}$")
+    return steps
 
-        term1 = a * x_squared
-        term2 = b * y_val
-        steps.append(f"**Step 2:** Multiply each term:")
-        steps.append(f"${a} \\times {x_squared} = {term1}$")
-        steps.append(f"${b} \\times {y_val} = {term2}$")
-        steps.append(f"Expression becomes: ${term1} + {term2} - {c}$")
 
-        steps.append(f"**Step 3:** Add and subtract left to right:")
-        intermediate = term1 + term2
-        steps.append(f"${term1} + {term2} = {intermediate}$")
-        steps.append(f"${intermediate} - {c} = {intermediate - c}$")
+def _squared_steps(expression: str, a: int, b: int, x_val: int) -> List[str]:
+    """Steps for ax^2 + b."""
+    steps = [
+        f"Evaluate the expression: ${expression}$ when $x = {x_val}$",
+        "**Rule:** Substitute the value and follow order of operations (exponents before multiplication)",
+        f"Substitute $x = {x_val}$:",
+        f"${a}({x_val})^2 + {b}$",
+    ]
 
-        answer = intermediate - c
+    x_squared = x_val ** 2
+    steps.append(f"Calculate the exponent: ${x_val}^2 = {x_squared}$")
+    steps.append(f"Expression becomes: ${a}({x_squared}) + {b}$")
 
-    steps.append(f"**Final Answer:** ${answer}$")
+    term1 = a * x_squared
+    steps.append(f"Multiply: ${a} \\times {x_squared} = {term1}$")
+    steps.append(f"Expression becomes: ${term1} + {b}$")
 
-    return {
-        "question": f"Evaluate ${expression}$ when " +
-                   (f"$x = {x_val}$" if difficulty == 1 else
-                    f"$x = {x_val}$ and $y = {y_val}$" if difficulty >= 2 else ""),
-        "answer": str(answer),
-        "answer_numeric": answer,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    answer = term1 + b
+    steps.append(f"Add: ${term1} + {b} = {answer}$")
+    steps.append(f"**Final Answer:** ${answer}$")
+    return steps
+
+
+def _mixed_steps(expression: str, a: int, b: int, c: int, x_val: int, y_val: int) -> List[str]:
+    """Steps for ax^2 + by - c."""
+    steps = [
+        f"Evaluate the expression: ${expression}$ when $x = {x_val}$ and $y = {y_val}$",
+        "**Rule:** Substitute values and follow order of operations (PEMDAS)",
+        f"Substitute $x = {x_val}$ and $y = {y_val}$:",
+        f"${a}({x_val})^2 + {b}({y_val}) - {c}$",
+    ]
+
+    x_squared = x_val ** 2
+    steps.append(f"**Step 1:** Calculate the exponent: ${x_val}^2 = {x_squared}$")
+    steps.append(f"Expression becomes: ${a}({x_squared}) + {b}({y_val}) - {c}$")
+
+    term1 = a * x_squared
+    term2 = b * y_val
+    steps.append(f"**Step 2:** Multiply each term:")
+    steps.append(f"${a} \\times {x_squared} = {term1}$")
+    steps.append(f"${b} \\times {y_val} = {term2}$")
+    steps.append(f"Expression becomes: ${term1} + {term2} - {c}$")
+
+    steps.append(f"**Step 3:** Add and subtract left to right:")
+    intermediate = term1 + term2
+    steps.append(f"${term1} + {term2} = {intermediate}$")
+    steps.append(f"${intermediate} - {c} = {intermediate - c}$")
+    steps.append(f"**Final Answer:** ${intermediate - c}$")
+    return steps
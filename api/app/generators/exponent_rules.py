@@ -1,8 +1,11 @@
 """Exponent rules question generator with scientific contexts."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
 from math import gcd
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Scientific/computing contexts for exponents
 EXPONENT_CONTEXTS = {
@@ -21,7 +24,11 @@ EXPONENT_CONTEXTS = {
 }
 
 
-def generate_exponent_rules(difficulty: int = 1) -> Dict[str, Any]:
+def generate_exponent_rules(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate an exponent rules problem.
 
@@ -30,137 +37,170 @@ def generate_exponent_rules(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - product rule: x^a * x^b)
             2 (medium - quotient rule: x^a / x^b or power rule: (x^a)^b)
             3 (hard - combinations of rules)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     if difficulty == 1:
         # Easy: Product rule x^a * x^b = x^(a+b)
-        a = random.randint(2, 8)
-        b = random.randint(2, 7)
-        base = random.choice(['x', 'y', 'a', 'b', 'm', 'n'])
+        a = rng.randint(2, 8)
+        b = rng.randint(2, 7)
+        base = rng.choice(['x', 'y', 'a', 'b', 'm', 'n'])
 
         expression = f"{base}^{a} \\cdot {base}^{b}"
-        steps.append(f"Simplify the expression: ${expression}$")
-        steps.append("**Rule:** Product Rule - When multiplying powers with the same base, add the exponents")
-        steps.append(f"${base}^a \\cdot {base}^b = {base}^{{a+b}}$")
-        steps.append(f"Add the exponents: ${a} + {b} = {a + b}$")
-
-        result_exp = a + b
-        answer_str = f"{base}^{result_exp}"
-        steps.append(f"Result: ${answer_str}$")
+        answer_str = f"{base}^{a + b}"
+        steps = LazySteps(_product_rule_steps, expression, base, a, b, answer_str)
 
     elif difficulty == 2:
         # Medium: Quotient rule or power rule
-        base = random.choice(['x', 'y', 'a', 'b'])
+        base = rng.choice(['x', 'y', 'a', 'b'])
 
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Quotient rule: x^a / x^b = x^(a-b)
-            a = random.randint(5, 12)
-            b = random.randint(2, min(a-1, 8))  # Ensure a > b for positive result
+            a = rng.randint(5, 12)
+            b = rng.randint(2, min(a-1, 8))  # Ensure a > b for positive result
 
             expression = f"\\frac{{{base}^{a}}}{{{base}^{b}}}"
-            steps.append(f"Simplify the expression: ${expression}$")
-            steps.append("**Rule:** Quotient Rule - When dividing powers with the same base, subtract the exponents")
-            steps.append(f"$\\frac{{{base}^a}}{{{base}^b}} = {base}^{{a-b}}$")
-            steps.append(f"Subtract the exponents: ${a} - {b} = {a - b}$")
-
-            result_exp = a - b
-            answer_str = f"{base}^{result_exp}"
-            steps.append(f"Result: ${answer_str}$")
+            answer_str = f"{base}^{a - b}"
+            steps = LazySteps(_quotient_rule_steps, expression, base, a, b, answer_str)
         else:
             # Power rule: (x^a)^b = x^(a*b)
-            a = random.randint(2, 6)
-            b = random.randint(2, 5)
+            a = rng.randint(2, 6)
+            b = rng.randint(2, 5)
 
             expression = f"({base}^{a})^{b}"
-            steps.append(f"Simplify the expression: ${expression}$")
-            steps.append("**Rule:** Power Rule - When raising a power to a power, multiply the exponents")
-            steps.append(f"$({base}^a)^b = {base}^{{a \\cdot b}}$")
-            steps.append(f"Multiply the exponents: ${a} \\times {b} = {a * b}$")
-
-            result_exp = a * b
-            answer_str = f"{base}^{result_exp}"
-            steps.append(f"Result: ${answer_str}$")
+            answer_str = f"{base}^{a * b}"
+            steps = LazySteps(_power_rule_steps, expression, base, a, b, answer_str)
 
     else:  # difficulty == 3
         # Hard: Combination of rules
-        base = random.choice(['x', 'y', 'a'])
+        base = rng.choice(['x', 'y', 'a'])
 
-        choice = random.randint(1, 3)
+        choice = rng.randint(1, 3)
 
         if choice == 1:
             # (x^a * x^b) / x^c
-            a = random.randint(3, 7)
-            b = random.randint(2, 6)
-            c = random.randint(2, 5)
+            a = rng.randint(3, 7)
+            b = rng.randint(2, 6)
+            c = rng.randint(2, 5)
 
             expression = f"\\frac{{{base}^{a} \\cdot {base}^{b}}}{{{base}^{c}}}"
-            steps.append(f"Simplify the expression: ${expression}$")
-            steps.append("**Step 1:** Apply the Product Rule to the numerator")
-            steps.append(f"${base}^{a} \\cdot {base}^{b} = {base}^{{a+b}} = {base}^{{{a+b}}}$")
-
-            numerator_exp = a + b
-            steps.append(f"Expression becomes: $\\frac{{{base}^{{{numerator_exp}}}}}{{{base}^{c}}}$")
-
-            steps.append("**Step 2:** Apply the Quotient Rule")
-            steps.append(f"$\\frac{{{base}^{{{numerator_exp}}}}}{{{base}^{c}}} = {base}^{{{numerator_exp}-{c}}}$")
-
-            result_exp = numerator_exp - c
-            steps.append(f"Subtract the exponents: ${numerator_exp} - {c} = {result_exp}$")
-            answer_str = f"{base}^{result_exp}"
+            answer_str = f"{base}^{a + b - c}"
+            step_builder = _product_quotient_steps
 
         elif choice == 2:
             # (x^a)^b * x^c
-            a = random.randint(2, 5)
-            b = random.randint(2, 4)
-            c = random.randint(2, 6)
+            a = rng.randint(2, 5)
+            b = rng.randint(2, 4)
+            c = rng.randint(2, 6)
 
             expression = f"({base}^{a})^{b} \\cdot {base}^{c}"
-            steps.append(f"Simplify the expression: ${expression}$")
-            steps.append("**Step 1:** Apply the Power Rule to the first term")
-            steps.append(f"$({base}^{a})^{b} = {base}^{{a \\cdot b}} = {base}^{{{a*b}}}$")
-
-            first_exp = a * b
-            steps.append(f"Expression becomes: ${base}^{{{first_exp}}} \\cdot {base}^{c}$")
-
-            steps.append("**Step 2:** Apply the Product Rule")
-            steps.append(f"${base}^{{{first_exp}}} \\cdot {base}^{c} = {base}^{{{first_exp}+{c}}}$")
-
-            result_exp = first_exp + c
-            steps.append(f"Add the exponents: ${first_exp} + {c} = {result_exp}$")
-            answer_str = f"{base}^{result_exp}"
+            answer_str = f"{base}^{a * b + c}"
+            step_builder = _power_product_steps
 
         else:
             # (x^a / x^b)^c
-            a = random.randint(6, 10)
-            b = random.randint(2, 5)
-            c = random.randint(2, 4)
+            a = rng.randint(6, 10)
+            b = rng.randint(2, 5)
+            c = rng.randint(2, 4)
 
             expression = f"\\left(\\frac{{{base}^{a}}}{{{base}^{b}}}\\right)^{c}"
-            steps.append(f"Simplify the expression: ${expression}$")
-            steps.append("**Step 1:** Apply the Quotient Rule inside the parentheses")
-            steps.append(f"$\\frac{{{base}^{a}}}{{{base}^{b}}} = {base}^{{a-b}} = {base}^{{{a-b}}}$")
-
-            inner_exp = a - b
-            steps.append(f"Expression becomes: $({base}^{{{inner_exp}}})^{c}$")
-
-            steps.append("**Step 2:** Apply the Power Rule")
-            steps.append(f"$({base}^{{{inner_exp}}})^{c} = {base}^{{{inner_exp} \\cdot {c}}}$")
-
-            result_exp = inner_exp * c
-            steps.append(f"Multiply the exponents: ${inner_exp} \\times {c} = {result_exp}$")
-            answer_str = f"{base}^{result_exp}"
-
-        steps.append(f"Result: ${answer_str}$")
-
-    steps.append(f"**Final Answer:** ${answer_str}$")
-
-    return {
-        "question": f"Simplify: ${expression}$",
-        "answer": answer_str,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+            answer_str = f"{base}^{(a - b) * c}"
+            step_builder = _quotient_power_steps
+
+        steps = LazySteps(step_builder, expression, base, a, b, c, answer_str)
+
+    return GeneratedQuestion(
+        question=f"Simplify: ${expression}$",
+        answer=answer_str,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _product_rule_steps(expression: str, base: str, a: int, b: int, answer_str: str) -> List[str]:
+    """Steps for x^a * x^b."""
+    return [
+        f"Simplify the expression: ${expression}$",
+        "**Rule:** Product Rule - When multiplying powers with the same base, add the exponents",
+        f"${base}^a \\cdot {base}^b = {base}^{{a+b}}$",
+        f"Add the exponents: ${a} + {b} = {a + b}$",
+        f"Result: ${answer_str}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
+
+
+def _quotient_rule_steps(expression: str, base: str, a: int, b: int, answer_str: str) -> List[str]:
+    """Steps for x^a / x^b."""
+    return [
+        f"Simplify the expression: ${expression}$",
+        "**Rule:** Quotient Rule - When dividing powers with the same base, subtract the exponents",
+        f"$\\frac{{{base}^a}}{{{base}^b}} = {base}^{{a-b}}$",
+        f"Subtract the exponents: ${a} - {b} = {a - b}$",
+        f"Result: ${answer_str}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
+
+
+def _power_rule_steps(expression: str, base: str, a: int, b: int, answer_str: str) -> List[str]:
+    """Steps for (x^a)^b."""
+    return [
+        f"Simplify the expression: ${expression}$",
+        "**Rule:** Power Rule - When raising a power to a power, multiply the exponents",
+        f"$({base}^a)^b = {base}^{{a \\cdot b}}$",
+        f"Multiply the exponents: ${a} \\times {b} = {a * b}$",
+        f"Result: ${answer_str}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
+
+
+def _product_quotient_steps(expression: str, base: str, a: int, b: int, c: int, answer_str: str) -> List[str]:
+    """Steps for (x^a * x^b) / x^c."""
+    numerator_exp = a + b
+    return [
+        f"Simplify the expression: ${expression}$",
+        "**Step 1:** Apply the Product Rule to the numerator",
+        f"${base}^{a} \\cdot {base}^{b} = {base}^{{a+b}} = {base}^{{{a+b}}}$",
+        f"Expression becomes: $\\frac{{{base}^{{{numerator_exp}}}}}{{{base}^{c}}}$",
+        "**Step 2:** Apply the Quotient Rule",
+        f"$\\frac{{{base}^{{{numerator_exp}}}}}{{{base}^{c}}} = {base}^{{{numerator_exp}-{c}}}$",
+        f"Subtract the exponents: ${numerator_exp} - {c} = {numerator_exp - c}$",
+        f"Result: ${answer_str}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
+
+
+def _power_product_steps(expression: str, base: str, a: int, b: int, c: int, answer_str: str) -> List[str]:
+    """Steps for (x^a)^b * x^c."""
+    first_exp = a * b
+    return [
+        f"Simplify the expression: ${expression}$",
+        "**Step 1:** Apply the Power Rule to the first term",
+        f"$({base}^{a})^{b} = {base}^{{a \\cdot b}} = {base}^{{{a*b}}}$",
+        f"Expression becomes: ${base}^{{{first_exp}}} \\cdot {base}^{c}$",
+        "**Step 2:** Apply the Product Rule",
+        f"${base}^{{{first_exp}}} \\cdot {base}^{c} = {base}^{{{first_exp}+{c}}}$",
+        f"Add the exponents: ${first_exp} + {c} = {first_exp + c}$",
+        f"Result: ${answer_str}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
+
+
+def _quotient_power_steps(expression: str, base: str, a: int, b: int, c: int, answer_str: str) -> List[str]:
+    """Steps for (x^a / x^b)^c."""
+    inner_exp = a - b
+    return [
+        f"Simplify the expression: ${expression}$",
+        "**Step 1:** Apply the Quotient Rule inside the parentheses",
+        f"$\\frac{{{base}^{a}}}{{{base}^{b}}} = {base}^{{a-b}} = {base}^{{{a-b}}}$",
+        f"Expression becomes: $({base}^{{{inner_exp}}})^{c}$",
+        "**Step 2:** Apply the Power Rule",
+        f"$({base}^{{{inner_exp}}})^{c} = {base}^{{{inner_exp} \\cdot {c}}}$",
+        f"Multiply the exponents: ${inner_exp} \\times {c} = {inner_exp * c}$",
+        f"Result: ${answer_str}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
@@ -1,8 +1,12 @@
 """Factoring polynomials question generator."""
 
 import random
-from typing import Dict, Any
-import math
+from typing import Any, Dict, List, Optional
+from app.generators.latex import format_term
+from app.generators.polynomial import Polynomial
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Word problems for polynomial factoring
 POLYNOMIAL_WORD_PROBLEMS = [
@@ -29,78 +33,74 @@ POLYNOMIAL_WORD_PROBLEMS = [
 ]
 
 
-def generate_factoring_polynomials(difficulty: int = 1) -> Dict[str, Any]:
+def generate_factoring_polynomials(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a factoring polynomials problem.
 
     Args:
         difficulty: 1 (GCF), 2 (grouping), 3 (complex)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
-        return _generate_gcf_factoring()
+        return _generate_gcf_factoring(rng)
     elif difficulty == 2:
-        return _generate_grouping_factoring()
+        return _generate_grouping_factoring(rng)
     else:
-        return _generate_complex_factoring()
+        return _generate_complex_factoring(rng)
 
 
-def _generate_gcf_factoring() -> Dict[str, Any]:
+def _generate_gcf_factoring(rng: random.Random) -> Dict[str, Any]:
     """Generate a GCF factoring problem (e.g., 6x² + 9x)."""
     # Choose GCF
-    gcf = random.choice([2, 3, 4, 5, 6])
+    gcf = rng.choice([2, 3, 4, 5, 6])
 
     # Generate two terms with the GCF
-    coeff1 = gcf * random.randint(1, 5)
-    coeff2 = gcf * random.randint(1, 5)
+    coeff1 = gcf * rng.randint(1, 5)
+    coeff2 = gcf * rng.randint(1, 5)
 
     # Powers (first term has higher power)
-    power1 = random.randint(2, 4)
-    power2 = random.randint(1, power1 - 1)
+    power1 = rng.randint(2, 4)
+    power2 = rng.randint(1, power1 - 1)
 
     # Build the polynomial
-    term1 = f"{coeff1}x^{{{power1}}}" if power1 > 1 else f"{coeff1}x"
-    term2 = f"{coeff2}x^{{{power2}}}" if power2 > 1 else f"{coeff2}x"
-
-    polynomial = f"{term1} + {term2}"
-
-    # Calculate factored form
-    factor1_coeff = coeff1 // gcf
-    factor2_coeff = coeff2 // gcf
-    factor_power = power2  # GCF includes x^(min power)
-
-    gcf_term = f"{gcf}x^{{{factor_power}}}" if factor_power > 1 else f"{gcf}x"
-
-    remaining_power1 = power1 - factor_power
-    remaining_power2 = power2 - factor_power
-
-    if remaining_power1 > 1:
-        remaining_term1 = f"{factor1_coeff}x^{{{remaining_power1}}}"
-    elif remaining_power1 == 1:
-        remaining_term1 = f"{factor1_coeff}x"
-    else:
-        remaining_term1 = str(factor1_coeff)
-
-    if remaining_power2 > 1:
-        remaining_term2 = f"{factor2_coeff}x^{{{remaining_power2}}}"
-    elif remaining_power2 == 1:
-        remaining_term2 = f"{factor2_coeff}x"
-    else:
-        remaining_term2 = str(factor2_coeff)
+    poly = Polynomial.from_terms({power1: coeff1, power2: coeff2})
+    polynomial = _braced_sum(poly)
 
-    if remaining_term1 == "1":
-        remaining_term1 = "1"
-    if remaining_term2 == "1":
-        remaining_expr = f"{remaining_term1} + 1"
-    else:
-        remaining_expr = f"{remaining_term1} + {remaining_term2}"
+    # Calculate factored form: the GCF includes x^(min power)
+    factor_power = power2
+    gcf_term = _braced_term(gcf, factor_power)
+    remaining_expr = _braced_sum(poly // Polynomial.monomial(gcf, factor_power))
 
     answer = f"{gcf_term}({remaining_expr})"
 
     # Generate solution steps
-    steps = [
+    steps = LazySteps(
+        _gcf_steps, polynomial, coeff1, coeff2, gcf, factor_power, gcf_term, remaining_expr, answer
+    )
+
+    return GeneratedQuestion(
+        question=f"Factor completely: ${polynomial}$",
+        answer=answer,
+        answer_numeric=None,
+        steps=steps,
+        difficulty=1,
+    )
+
+
+def _gcf_steps(polynomial: str, coeff1: int, coeff2: int, gcf: int, factor_power: int,
+               gcf_term: str, remaining_expr: str, answer: str) -> List[str]:
+    """Steps for factoring out the greatest common monomial."""
+    return [
         f"Start with the polynomial: ${polynomial}$",
         f"Find the GCF of the coefficients: $\\text{{GCF}}({coeff1}, {coeff2}) = {gcf}$",
         f"Find the GCF of the variable terms: $x^{{{factor_power}}}$ (lowest power)",
@@ -109,72 +109,49 @@ def _generate_gcf_factoring() -> Dict[str, Any]:
         f"**Final Answer:** ${answer}$"
     ]
 
-    return {
-        "question": f"Factor completely: ${polynomial}$",
-        "answer": answer,
-        "answer_numeric": None,  # No numeric answer for factoring
-        "steps": steps,
-        "difficulty": 1,
-    }
 
-
-def _generate_grouping_factoring() -> Dict[str, Any]:
+def _generate_grouping_factoring(rng: random.Random) -> Dict[str, Any]:
     """Generate a factor by grouping problem (e.g., x³ + 2x² + 3x + 6)."""
     # Choose common factor for first two terms
-    a = random.randint(1, 4)
-    b = random.randint(1, 4)
+    a = rng.randint(1, 4)
+    b = rng.randint(1, 4)
 
     # Build polynomial: ax³ + bax² + cx + bc
     # This factors to: ax²(x + b) + c(x + b) = (ax² + c)(x + b)
-    c = random.randint(2, 5)
-
-    coeff1 = a
-    coeff2 = a * b
-    coeff3 = c
-    coeff4 = b * c
+    c = rng.randint(2, 5)
 
-    # Build the polynomial string
-    terms = []
-    if coeff1 == 1:
-        terms.append("x^3")
-    else:
-        terms.append(f"{coeff1}x^3")
-
-    if coeff2 == 1:
-        terms.append("x^2")
-    else:
-        terms.append(f"{coeff2}x^2")
+    first = Polynomial((c, 0, a))
+    second = Polynomial.linear(1, b)
+    poly = first * second
+    polynomial = poly.latex()
 
-    if coeff3 == 1:
-        terms.append("x")
-    else:
-        terms.append(f"{coeff3}x")
+    # Build answer
+    answer = f"({first.latex()})({second.latex()})"
 
-    terms.append(str(coeff4))
+    # Generate solution steps
+    steps = LazySteps(_grouping_steps, poly, second, a, b, c, answer)
 
-    polynomial = " + ".join(terms)
+    return GeneratedQuestion(
+        question=f"Factor by grouping: ${polynomial}$",
+        answer=answer,
+        answer_numeric=None,
+        steps=steps,
+        difficulty=2,
+    )
 
-    # Build answer
-    if a == 1:
-        first_factor = f"x^2 + {c}"
-    else:
-        first_factor = f"{a}x^2 + {c}"
 
-    second_factor = f"x + {b}"
-    answer = f"({first_factor})({second_factor})"
+def _grouping_steps(poly: Polynomial, second: Polynomial, a: int, b: int, c: int, answer: str) -> List[str]:
+    """Steps for factoring a four-term cubic by grouping."""
+    terms = [format_term(coeff, degree) for degree, coeff in poly.terms()]
+    polynomial = poly.latex()
 
-    # Generate solution steps
     group1 = f"{terms[0]} + {terms[1]}"
     group2 = f"{terms[2]} + {terms[3]}"
 
-    if a == 1:
-        factor_group1 = f"x^2(x + {b})"
-    else:
-        factor_group1 = f"{a}x^2(x + {b})"
-
-    factor_group2 = f"{c}(x + {b})"
+    factor_group1 = f"{format_term(a, 2)}({second.latex()})"
+    factor_group2 = f"{c}({second.latex()})"
 
-    steps = [
+    return [
         f"Start with the polynomial: ${polynomial}$",
         f"Group terms in pairs: $({group1}) + ({group2})$",
         f"Factor out GCF from first group: ${factor_group1}$",
@@ -184,43 +161,42 @@ def _generate_grouping_factoring() -> Dict[str, Any]:
         f"**Final Answer:** ${answer}$"
     ]
 
-    return {
-        "question": f"Factor by grouping: ${polynomial}$",
-        "answer": answer,
-        "answer_numeric": None,
-        "steps": steps,
-        "difficulty": 2,
-    }
-
 
-def _generate_complex_factoring() -> Dict[str, Any]:
+def _generate_complex_factoring(rng: random.Random) -> Dict[str, Any]:
     """Generate a complex factoring problem (e.g., 4x³ - 16x)."""
     # GCF with complete factoring
-    gcf = random.choice([2, 3, 4])
+    gcf = rng.choice([2, 3, 4])
 
     # Generate polynomial of form: gcf·x(x² - k²) = gcf·x(x-k)(x+k)
-    k = random.randint(2, 5)
+    k = rng.randint(2, 5)
     k_squared = k * k
 
-    # Coefficients
-    coeff1 = gcf
-    coeff2 = gcf * k_squared
-
-    # Build polynomial: coeff1·x³ - coeff2·x
-    term1 = f"{coeff1}x^3" if coeff1 > 1 else "x^3"
-    term2 = f"{coeff2}x"
-
-    polynomial = f"{term1} - {term2}"
+    # Build polynomial: gcf·x³ - gcf·k²·x
+    polynomial = (Polynomial.monomial(gcf, 1) * Polynomial((-k_squared, 0, 1))).latex()
 
     # Build answer: gcf·x(x - k)(x + k)
-    gcf_term = f"{gcf}x" if gcf > 1 else "x"
+    gcf_term = format_term(gcf, 1)
     answer = f"{gcf_term}(x - {k})(x + {k})"
 
     # Alternative form for validation
     answer_alt = f"{gcf_term}(x + {k})(x - {k})"
 
     # Generate solution steps
-    steps = [
+    steps = LazySteps(_difference_of_squares_steps, polynomial, gcf_term, k_squared, k, answer)
+
+    return GeneratedQuestion(
+        question=f"Factor completely: ${polynomial}$",
+        answer=answer,
+        answer_numeric=None,
+        steps=steps,
+        difficulty=3,
+    )
+
+
+def _difference_of_squares_steps(polynomial: str, gcf_term: str, k_squared: int, k: int,
+                                 answer: str) -> List[str]:
+    """Steps for factoring out the GCF and then a difference of squares."""
+    return [
         f"Start with the polynomial: ${polynomial}$",
         f"Factor out the GCF: ${gcf_term}$",
         f"${polynomial} = {gcf_term}(x^2 - {k_squared})$",
@@ -230,10 +206,16 @@ def _generate_complex_factoring() -> Dict[str, Any]:
         f"**Final Answer:** ${answer}$"
     ]
 
-    return {
-        "question": f"Factor completely: ${polynomial}$",
-        "answer": answer,
-        "answer_numeric": None,
-        "steps": steps,
-        "difficulty": 3,
-    }
+
+def _braced_term(coeff: int, power: int) -> str:
+    """Format a term with a braced exponent, e.g. 6x^{3} (coefficient always shown)."""
+    if power > 1:
+        return f"{coeff}x^{{{power}}}"
+    if power == 1:
+        return f"{coeff}x"
+    return str(coeff)
+
+
+def _braced_sum(poly: Polynomial) -> str:
+    """Format a polynomial with positive coefficients as a sum of braced terms."""
+    return " + ".join(_braced_term(coeff, degree) for degree, coeff in poly.terms())
@@ -1,8 +1,12 @@
 """Factoring quadratics question generator."""
 
 import random
-from math import gcd
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_signed
+from app.generators.polynomial import Polynomial
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for factoring quadratics
 FACTORING_CONTEXTS = [
@@ -25,7 +29,11 @@ FACTORING_CONTEXTS = [
 ]
 
 
-def generate_factoring_quadratics(difficulty: int = 1) -> Dict[str, Any]:
+def generate_factoring_quadratics(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a quadratic factoring problem.
 
@@ -34,127 +42,80 @@ def generate_factoring_quadratics(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - simple factoring, a=1)
             2 (medium - leading coefficient ≠ 1)
             3 (hard - difference of squares or complex patterns)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     if difficulty == 1:
         # Easy: x² + bx + c = (x + p)(x + q)
         # Choose two integers p and q
-        p = random.randint(-8, 8)
-        q = random.randint(-8, 8)
+        p = rng.randint(-8, 8)
+        q = rng.randint(-8, 8)
 
-        # Expand to get coefficients
-        a = 1
-        b = p + q
-        c = p * q
+        # Expand (x + p)(x + q) to get coefficients
+        quadratic = Polynomial.linear(1, p) * Polynomial.linear(1, q)
+        b = quadratic[1]
+        c = quadratic[0]
 
         # Format the equation
-        equation = _format_quadratic(a, b, c)
+        equation = quadratic.latex()
         question = f"Factor completely: ${equation}$"
 
-        steps.append(f"Start with: ${equation}$")
-        steps.append(f"Find two numbers that multiply to ${c}$ and add to ${b}$")
-
-        # Show the numbers
-        steps.append(f"The numbers are ${p}$ and ${q}$ because:")
-        steps.append(f"${p} \\times {q} = {c}$ and ${p} + {q} = {b}$")
-
         # Show factored form
-        p_term = _format_binomial_term(p)
-        q_term = _format_binomial_term(q)
+        p_term = format_signed(p)
+        q_term = format_signed(q)
         answer = f"(x {p_term})(x {q_term})"
-
-        steps.append(f"Write in factored form: ${answer}$")
-        steps.append(f"**Final Answer:** ${answer}$")
+        steps = LazySteps(_simple_trinomial_steps, equation, p, q, b, c, answer)
 
         answer_str = answer.replace("+ -", "- ").replace("- -", "+ ")
 
     elif difficulty == 2:
         # Medium: ax² + bx + c with a ≠ 1
         # Use (mx + p)(nx + q) = mnx² + (mq + np)x + pq
-        m = random.choice([2, 3, 4])
-        n = random.choice([1, 2, 3])
-        p = random.randint(-6, 6)
-        q = random.randint(-6, 6)
+        m = rng.choice([2, 3, 4])
+        n = rng.choice([1, 2, 3])
+        p = rng.randint(-6, 6)
+        q = rng.randint(-6, 6)
 
         # Expand
-        a = m * n
-        b = m * q + n * p
-        c = p * q
+        quadratic = Polynomial.linear(m, p) * Polynomial.linear(n, q)
 
         # Simplify by GCD if possible
-        g = gcd(gcd(abs(a), abs(b)), abs(c))
+        g = quadratic.content()
         if g > 1:
-            a, b, c = a // g, b // g, c // g
+            quadratic = Polynomial(coeff // g for coeff in quadratic.coeffs)
+        c, b, a = quadratic.coeffs
 
-        equation = _format_quadratic(a, b, c)
+        equation = quadratic.latex()
         question = f"Factor completely: ${equation}$"
 
-        steps.append(f"Start with: ${equation}$")
-        steps.append(f"Find factors of $a \\cdot c = {a} \\times {c} = {a * c}$")
-        steps.append(f"that add up to $b = {b}$")
-
-        # Use AC method
-        ac = a * c
-        # Find two numbers that multiply to ac and add to b
-        found = False
-        for i in range(-abs(ac) - 1, abs(ac) + 2):
-            if i != 0 and ac % i == 0:
-                j = ac // i
-                if i + j == b:
-                    steps.append(f"The numbers are ${i}$ and ${j}$")
-                    steps.append(f"${i} \\times {j} = {ac}$ and ${i} + {j} = {b}$")
-
-                    # Rewrite middle term
-                    steps.append(f"Rewrite the middle term:")
-                    middle_term = _format_split_middle(a, i, j, c)
-                    steps.append(f"${middle_term}$")
-
-                    steps.append("Factor by grouping:")
-
-                    # For simplicity in the answer, use trial factoring
-                    # Reconstruct the original factors
-                    found = True
-                    break
-
-        if not found:
-            # Fallback to showing the factored form directly
-            steps.append("Using factoring techniques:")
-
         # Calculate the factored form
-        # Try to find the actual factors
-        m_term = _format_factor_term(m, p)
-        n_term = _format_factor_term(n, q)
+        m_term = Polynomial.linear(m, p).latex()
+        n_term = Polynomial.linear(n, q).latex()
         answer = f"({m_term})({n_term})"
-
-        steps.append(f"Factored form: ${answer}$")
-        steps.append(f"**Final Answer:** ${answer}$")
+        steps = LazySteps(_ac_method_steps, equation, a, b, c, answer)
 
         answer_str = answer.replace("+ -", "- ").replace("- -", "+ ")
 
     else:  # difficulty == 3
         # Hard: Special patterns (difference of squares, perfect square trinomials)
-        pattern = random.choice(["difference_of_squares", "perfect_square"])
+        pattern = rng.choice(["difference_of_squares", "perfect_square"])
 
         if pattern == "difference_of_squares":
             # a² - b² = (a + b)(a - b)
             # Choose coefficient for x² and constant
-            a_coef = random.choice([1, 4, 9, 16, 25])  # Perfect squares
-            c_coef = random.choice([1, 4, 9, 16, 25, 36, 49])
+            a_coef = rng.choice([1, 4, 9, 16, 25])  # Perfect squares
+            c_coef = rng.choice([1, 4, 9, 16, 25, 36, 49])
 
             a = a_coef
-            b = 0
-            c = -c_coef
 
-            equation = _format_quadratic(a, b, c)
+            equation = Polynomial((-c_coef, 0, a_coef)).latex()
             question = f"Factor completely: ${equation}$"
 
-            steps.append(f"Start with: ${equation}$")
-            steps.append("This is a difference of squares: $a^2 - b^2 = (a + b)(a - b)$")
-
             # Find square roots
             import math
             sqrt_a = int(math.sqrt(a_coef))
@@ -165,105 +126,108 @@ def generate_factoring_quadratics(difficulty: int = 1) -> Dict[str, Any]:
             else:
                 a_term = f"{sqrt_a}x"
 
-            steps.append(f"Identify: $a = {a_term}$ and $b = {sqrt_c}$")
-
             answer = f"({a_term} + {sqrt_c})({a_term} - {sqrt_c})"
-            steps.append(f"Apply the formula: ${answer}$")
-            steps.append(f"**Final Answer:** ${answer}$")
+            steps = LazySteps(_difference_of_squares_steps, equation, a_term, sqrt_c, answer)
 
             answer_str = answer
 
         else:  # perfect_square
             # (x + a)² = x² + 2ax + a²
-            p = random.randint(2, 10)
-            sign = random.choice([1, -1])
+            p = rng.randint(2, 10)
+            sign = rng.choice([1, -1])
             p = p * sign
 
-            a = 1
-            b = 2 * p
-            c = p * p
+            quadratic = Polynomial.linear(1, p) ** 2
+            b = quadratic[1]
+            c = quadratic[0]
 
-            equation = _format_quadratic(a, b, c)
+            equation = quadratic.latex()
             question = f"Factor completely: ${equation}$"
 
-            steps.append(f"Start with: ${equation}$")
-            steps.append("Check if this is a perfect square trinomial")
-            steps.append(f"Is ${c}$ a perfect square? Yes, $\\sqrt{{{c}}} = {abs(p)}$")
-            steps.append(f"Is ${b}$ equal to $2 \\times {abs(p)}$? Yes, ${b} = {2 * abs(p)}$")
-
-            p_term = _format_binomial_term(p)
+            p_term = format_signed(p)
             answer = f"(x {p_term})^2"
-
-            steps.append(f"This is a perfect square: ${answer}$")
-            steps.append(f"**Final Answer:** ${answer}$")
+            steps = LazySteps(_perfect_square_steps, equation, p, b, c, answer)
 
             answer_str = answer.replace("+ -", "- ")
 
-    return {
-        "question": question,
-        "answer": answer_str,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
-
-
-def _format_quadratic(a: int, b: int, c: int) -> str:
-    """Format quadratic expression as LaTeX string."""
-    terms = []
-
-    # x² term
-    if a == 1:
-        terms.append("x^2")
-    elif a == -1:
-        terms.append("-x^2")
-    else:
-        terms.append(f"{a}x^2")
-
-    # x term
-    if b != 0:
-        if b == 1:
-            terms.append("+ x")
-        elif b == -1:
-            terms.append("- x")
-        elif b > 0:
-            terms.append(f"+ {b}x")
-        else:
-            terms.append(f"- {abs(b)}x")
-
-    # constant term
-    if c != 0:
-        if c > 0:
-            terms.append(f"+ {c}")
-        else:
-            terms.append(f"- {abs(c)}")
-
-    equation = " ".join(terms)
-    return equation
-
-
-def _format_binomial_term(value: int) -> str:
-    """Format a term in a binomial (x + value)."""
-    if value >= 0:
-        return f"+ {value}"
-    else:
-        return f"- {abs(value)}"
-
-
-def _format_factor_term(coef: int, const: int) -> str:
-    """Format a factor term like 2x + 3."""
-    if coef == 1:
-        x_part = "x"
-    elif coef == -1:
-        x_part = "-x"
-    else:
-        x_part = f"{coef}x"
-
-    if const == 0:
-        return x_part
-    elif const > 0:
-        return f"{x_part} + {const}"
-    else:
-        return f"{x_part} - {abs(const)}"
+    return GeneratedQuestion(
+        question=question,
+        answer=answer_str,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _simple_trinomial_steps(equation: str, p: int, q: int, b: int, c: int, answer: str) -> List[str]:
+    """Steps for x² + bx + c = (x + p)(x + q)."""
+    return [
+        f"Start with: ${equation}$",
+        f"Find two numbers that multiply to ${c}$ and add to ${b}$",
+        f"The numbers are ${p}$ and ${q}$ because:",
+        f"${p} \\times {q} = {c}$ and ${p} + {q} = {b}$",
+        f"Write in factored form: ${answer}$",
+        f"**Final Answer:** ${answer}$",
+    ]
+
+
+def _ac_method_steps(equation: str, a: int, b: int, c: int, answer: str) -> List[str]:
+    """Steps for ax² + bx + c by the AC method, searching for the split of the middle term."""
+    steps = [
+        f"Start with: ${equation}$",
+        f"Find factors of $a \\cdot c = {a} \\times {c} = {a * c}$",
+        f"that add up to $b = {b}$",
+    ]
+
+    # Use AC method
+    ac = a * c
+    # Find two numbers that multiply to ac and add to b
+    found = False
+    for i in range(-abs(ac) - 1, abs(ac) + 2):
+        if i != 0 and ac % i == 0:
+            j = ac // i
+            if i + j == b:
+                steps.append(f"The numbers are ${i}$ and ${j}$")
+                steps.append(f"${i} \\times {j} = {ac}$ and ${i} + {j} = {b}$")
+
+                # Rewrite middle term
+                steps.append(f"Rewrite the middle term:")
+                middle_term = _format_split_middle(a, i, j, c)
+                steps.append(f"${middle_term}$")
+
+                steps.append("Factor by grouping:")
+                found = True
+                break
+
+    if not found:
+        # Fallback to showing the factored form directly
+        steps.append("Using factoring techniques:")
+
+    steps.append(f"Factored form: ${answer}$")
+    steps.append(f"**Final Answer:** ${answer}$")
+    return steps
+
+
+def _difference_of_squares_steps(equation: str, a_term: str, sqrt_c: int, answer: str) -> List[str]:
+    """Steps for a² - b² = (a + b)(a - b)."""
+    return [
+        f"Start with: ${equation}$",
+        "This is a difference of squares: $a^2 - b^2 = (a + b)(a - b)$",
+        f"Identify: $a = {a_term}$ and $b = {sqrt_c}$",
+        f"Apply the formula: ${answer}$",
+        f"**Final Answer:** ${answer}$",
+    ]
+
+
+def _perfect_square_steps(equation: str, p: int, b: int, c: int, answer: str) -> List[str]:
+    """Steps for recognising x² + 2px + p² as (x + p)²."""
+    return [
+        f"Start with: ${equation}$",
+        "Check if this is a perfect square trinomial",
+        f"Is ${c}$ a perfect square? Yes, $\\sqrt{{{c}}} = {abs(p)}$",
+        f"Is ${b}$ equal to $2 \\times {abs(p)}$? Yes, ${b} = {2 * abs(p)}$",
+        f"This is a perfect square: ${answer}$",
+        f"**Final Answer:** ${answer}$",
+    ]
 
 
 def _format_split_middle(a: int, m: int, n: int, c: int) -> str:
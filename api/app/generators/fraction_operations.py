@@ -3,7 +3,11 @@
 import random
 from fractions import Fraction
 from math import gcd
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Word problem templates for fractions
 FRACTION_WORD_PROBLEMS = {
@@ -17,84 +21,86 @@ FRACTION_WORD_PROBLEMS = {
 }
 
 
-def generate_fraction_addition(difficulty: int = 1) -> Dict[str, Any]:
+def generate_fraction_addition(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate fraction addition problem: a/b + c/d
 
     Args:
         difficulty: 1 (easy - same denominator), 2-3 (different denominators), 4-5 (mixed numbers)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     # Use word problems 50% of the time
-    use_word_problem = random.random() < 0.5
+    use_word_problem = rng.random() < 0.5
 
     if difficulty == 1:
         # Easy: Same denominator
-        denominator = random.choice([2, 3, 4, 5, 6, 8, 10])
-        num1 = random.randint(1, denominator - 1)
-        num2 = random.randint(1, denominator - 1)
-
-        frac1 = Fraction(num1, denominator)
-        frac2 = Fraction(num2, denominator)
-
-        # Format fractions for display
-        frac1_str = f"{num1}/{denominator}"
-        frac2_str = f"{num2}/{denominator}"
-        frac1_latex = f"$\\frac{{{num1}}}{{{denominator}}}$"
-        frac2_latex = f"$\\frac{{{num2}}}{{{denominator}}}$"
-
-        if use_word_problem:
-            wp = random.choice(FRACTION_WORD_PROBLEMS["addition"])
-            question = wp["template"].format(frac1=frac1_str, frac2=frac2_str)
-            steps.append(f"**Problem:** {question}")
-            steps.append(f"**Identify:** Add {frac1_latex} + {frac2_latex}")
-        else:
-            question = f"$\\frac{{{num1}}}{{{denominator}}} + \\frac{{{num2}}}{{{denominator}}}$"
-            steps.append(f"Start with the expression: {question}")
-
-        steps.append(f"Both fractions have the same denominator (${denominator}$), so we can add the numerators directly")
-        steps.append(f"$\\frac{{{num1} + {num2}}}{{{denominator}}} = \\frac{{{num1 + num2}}}{{{denominator}}}$")
-
+        denom1 = denom2 = rng.choice([2, 3, 4, 5, 6, 8, 10])
+        num1 = rng.randint(1, denom1 - 1)
+        num2 = rng.randint(1, denom1 - 1)
     else:
         # Medium/Hard: Different denominators
         if difficulty <= 3:
             # Medium: smaller numbers
-            denom1 = random.choice([2, 3, 4, 5, 6])
-            denom2 = random.choice([2, 3, 4, 5, 6])
+            denom1 = rng.choice([2, 3, 4, 5, 6])
+            denom2 = rng.choice([2, 3, 4, 5, 6])
         else:
             # Hard: larger numbers
-            denom1 = random.randint(3, 12)
-            denom2 = random.randint(3, 12)
+            denom1 = rng.randint(3, 12)
+            denom2 = rng.randint(3, 12)
 
         # Avoid same denominator for these difficulties
         while denom1 == denom2:
-            denom2 = random.randint(3, 12)
+            denom2 = rng.randint(3, 12)
 
-        num1 = random.randint(1, denom1 - 1)
-        num2 = random.randint(1, denom2 - 1)
+        num1 = rng.randint(1, denom1 - 1)
+        num2 = rng.randint(1, denom2 - 1)
 
-        frac1 = Fraction(num1, denom1)
-        frac2 = Fraction(num2, denom2)
+    if use_word_problem:
+        wp = rng.choice(FRACTION_WORD_PROBLEMS["addition"])
+        question = wp["template"].format(frac1=f"{num1}/{denom1}", frac2=f"{num2}/{denom2}")
+    else:
+        question = f"${format_frac(num1, denom1)} + {format_frac(num2, denom2)}$"
 
-        # Format fractions for display
-        frac1_str = f"{num1}/{denom1}"
-        frac2_str = f"{num2}/{denom2}"
-        frac1_latex = f"$\\frac{{{num1}}}{{{denom1}}}$"
-        frac2_latex = f"$\\frac{{{num2}}}{{{denom2}}}$"
+    result = Fraction(num1, denom1) + Fraction(num2, denom2)
+    if result.denominator == 1:
+        answer_str = str(result.numerator)
+    else:
+        answer_str = f"{result.numerator}/{result.denominator}"
 
-        if use_word_problem:
-            wp = random.choice(FRACTION_WORD_PROBLEMS["addition"])
-            question = wp["template"].format(frac1=frac1_str, frac2=frac2_str)
-            steps.append(f"**Problem:** {question}")
-            steps.append(f"**Identify:** Add {frac1_latex} + {frac2_latex}")
-        else:
-            question = f"$\\frac{{{num1}}}{{{denom1}}} + \\frac{{{num2}}}{{{denom2}}}$"
-            steps.append(f"Start with the expression: {question}")
+    return GeneratedQuestion(
+        question=f"Calculate: {question}",
+        answer=answer_str,
+        answer_numeric=float(result),
+        steps=LazySteps(_render_steps, question, use_word_problem, num1, denom1, num2, denom2),
+        difficulty=difficulty,
+    )
 
+
+def _render_steps(question: str, word_problem: bool, num1: int, denom1: int, num2: int, denom2: int) -> List[str]:
+    """Render the worked solution for a fraction addition."""
+    steps = []
+    if word_problem:
+        steps.append(f"**Problem:** {question}")
+        steps.append(f"**Identify:** Add ${format_frac(num1, denom1)}$ + ${format_frac(num2, denom2)}$")
+    else:
+        steps.append(f"Start with the expression: {question}")
+
+    if denom1 == denom2:
+        lcm = denom1
+        sum_numerator = num1 + num2
+        steps.append(f"Both fractions have the same denominator (${lcm}$), so we can add the numerators directly")
+        steps.append(f"$\\frac{{{num1} + {num2}}}{{{lcm}}} = {format_frac(sum_numerator, lcm)}$")
+    else:
         # Find LCD
         lcm = (denom1 * denom2) // gcd(denom1, denom2)
         steps.append(f"The denominators are different (${denom1}$ and ${denom2}$), so find the least common denominator (LCD)")
@@ -105,41 +111,25 @@ def generate_fraction_addition(difficulty: int = 1) -> Dict[str, Any]:
         mult2 = lcm // denom2
         new_num1 = num1 * mult1
         new_num2 = num2 * mult2
+        sum_numerator = new_num1 + new_num2
 
         steps.append(f"Convert each fraction to have denominator ${lcm}$:")
-        steps.append(f"$\\frac{{{num1}}}{{{denom1}}} \\times \\frac{{{mult1}}}{{{mult1}}} = \\frac{{{new_num1}}}{{{lcm}}}$")
-        steps.append(f"$\\frac{{{num2}}}{{{denom2}}} \\times \\frac{{{mult2}}}{{{mult2}}} = \\frac{{{new_num2}}}{{{lcm}}}$")
+        steps.append(f"${format_frac(num1, denom1)} \\times {format_frac(mult1, mult1)} = {format_frac(new_num1, lcm)}$")
+        steps.append(f"${format_frac(num2, denom2)} \\times {format_frac(mult2, mult2)} = {format_frac(new_num2, lcm)}$")
         steps.append(f"Now add the fractions with the same denominator:")
-        steps.append(f"$\\frac{{{new_num1}}}{{{lcm}}} + \\frac{{{new_num2}}}{{{lcm}}} = \\frac{{{new_num1 + new_num2}}}{{{lcm}}}$")
-
-    # Calculate result
-    result = frac1 + frac2
+        steps.append(f"${format_frac(new_num1, lcm)} + {format_frac(new_num2, lcm)} = {format_frac(sum_numerator, lcm)}$")
 
     # Simplify if needed
-    if difficulty == 1:
-        sum_numerator = num1 + num2
-    else:
-        sum_numerator = new_num1 + new_num2
-
-    if result.numerator != sum_numerator or result.denominator != (denominator if difficulty == 1 else lcm):
+    result = Fraction(num1, denom1) + Fraction(num2, denom2)
+    if result.numerator != sum_numerator or result.denominator != lcm:
         steps.append(f"Simplify the fraction by dividing both numerator and denominator by their GCD:")
-        steps.append(f"$\\frac{{{result.numerator}}}{{{result.denominator}}}$")
+        steps.append(f"${format_frac(result.numerator, result.denominator)}$")
 
-    # Format answer
     if result.denominator == 1:
-        answer_str = str(result.numerator)
         steps.append(f"**Final Answer:** ${result.numerator}$")
     else:
-        answer_str = f"{result.numerator}/{result.denominator}"
-        steps.append(f"**Final Answer:** $\\frac{{{result.numerator}}}{{{result.denominator}}}$")
-
-    return {
-        "question": f"Calculate: {question}",
-        "answer": answer_str,
-        "answer_numeric": float(result),
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+        steps.append(f"**Final Answer:** ${format_frac(result.numerator, result.denominator)}$")
+    return steps
 
 
 def validate_fraction_answer(user_answer: str, correct_answer: Fraction, tolerance: float = 0.01) -> bool:
@@ -3,7 +3,11 @@
 import random
 from fractions import Fraction
 from math import gcd
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac, format_mixed_number
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Word problem templates for fraction division
 FRACTION_DIV_WORD_PROBLEMS = [
@@ -19,7 +23,11 @@ FRACTION_DIV_WORD_PROBLEMS = [
 QUESTION_TYPES = ["standard", "word_problem", "verify", "compare"]
 
 
-def generate_fractions_division(difficulty: int = 1) -> Dict[str, Any]:
+def generate_fractions_division(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a fraction division problem: (a/b) ÷ (c/d).
 
@@ -28,81 +36,115 @@ def generate_fractions_division(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - simple fractions)
             2 (medium - requires simplification)
             3 (hard - mixed numbers or multiple operations)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     # Variety: use different question types
-    use_word_problem = random.random() < 0.4
-    use_verify = random.random() < 0.15  # "Is this correct?" style
+    use_word_problem = rng.random() < 0.4
+    use_verify = rng.random() < 0.15  # "Is this correct?" style
 
+    word_problem = None
+    whole = 0
     if difficulty == 1:
         # Easy: Simple fractions
-        num1 = random.randint(1, 8)
-        denom1 = random.randint(2, 8)
-        num2 = random.randint(1, 8)
-        denom2 = random.randint(2, 8)
+        num1 = rng.randint(1, 8)
+        denom1 = rng.randint(2, 8)
+        num2 = rng.randint(1, 8)
+        denom2 = rng.randint(2, 8)
 
-        frac1 = Fraction(num1, denom1)
-        frac2 = Fraction(num2, denom2)
-        result = frac1 / frac2
+        expression = f"{format_frac(num1, denom1)} \\div {format_frac(num2, denom2)}"
 
-        # Format fractions for display
-        frac1_str = f"{num1}/{denom1}"
-        frac2_str = f"{num2}/{denom2}"
+        if use_word_problem:
+            wp = rng.choice(FRACTION_DIV_WORD_PROBLEMS)
+            word_problem = wp["template"].format(frac1=f"{num1}/{denom1}", frac2=f"{num2}/{denom2}", whole=num2)
 
-        expression = f"\\frac{{{num1}}}{{{denom1}}} \\div \\frac{{{num2}}}{{{denom2}}}"
+    elif difficulty == 2:
+        # Medium: Larger numbers, needs simplification
+        num1 = rng.randint(2, 12)
+        denom1 = rng.randint(3, 12)
+        num2 = rng.randint(2, 12)
+        denom2 = rng.randint(3, 12)
 
-        if use_word_problem:
-            wp = random.choice(FRACTION_DIV_WORD_PROBLEMS)
-            question = wp["template"].format(frac1=frac1_str, frac2=frac2_str, whole=num2)
-            steps.append(f"**Problem:** {question}")
-            steps.append(f"**Identify:** Divide $\\frac{{{num1}}}{{{denom1}}} \\div \\frac{{{num2}}}{{{denom2}}}$")
+        expression = f"{format_frac(num1, denom1)} \\div {format_frac(num2, denom2)}"
+
+    else:  # difficulty == 3
+        # Hard: Mixed numbers
+        whole = rng.randint(1, 4)
+        num1 = rng.randint(1, 5)
+        denom1 = rng.randint(2, 6)
+        while num1 >= denom1:
+            num1 = rng.randint(1, 5)
+
+        num2 = rng.randint(1, 8)
+        denom2 = rng.randint(2, 8)
+
+        expression = f"{format_mixed_number(whole, num1, denom1)} \\div {format_frac(num2, denom2)}"
+
+    result = Fraction(whole * denom1 + num1, denom1) / Fraction(num2, denom2)
+
+    # Format answer
+    if result.denominator == 1:
+        answer_str = str(result.numerator)
+    else:
+        answer_str = f"{result.numerator}/{result.denominator}"
+
+    return GeneratedQuestion(
+        question=f"Divide: ${expression}$",
+        answer=answer_str,
+        answer_numeric=float(result),
+        steps=LazySteps(_render_steps, difficulty, expression, word_problem, whole, num1, denom1, num2, denom2),
+        difficulty=difficulty,
+    )
+
+
+def _render_steps(difficulty: int, expression: str, word_problem: Optional[str],
+                  whole: int, num1: int, denom1: int, num2: int, denom2: int) -> List[str]:
+    """Render the worked solution for a fraction division."""
+    steps = []
+
+    if difficulty == 1:
+        if word_problem is not None:
+            steps.append(f"**Problem:** {word_problem}")
+            steps.append(f"**Identify:** Divide ${format_frac(num1, denom1)} \\div {format_frac(num2, denom2)}$")
         else:
             steps.append(f"Divide the fractions: ${expression}$")
 
         steps.append("**Rule:** To divide fractions, multiply by the reciprocal (\"Keep, Change, Flip\")")
         steps.append(f"$\\frac{{a}}{{b}} \\div \\frac{{c}}{{d}} = \\frac{{a}}{{b}} \\times \\frac{{d}}{{c}}$")
 
-        steps.append(f"**Step 1:** Keep the first fraction: $\\frac{{{num1}}}{{{denom1}}}$")
+        steps.append(f"**Step 1:** Keep the first fraction: ${format_frac(num1, denom1)}$")
         steps.append(f"**Step 2:** Change ÷ to ×")
-        steps.append(f"**Step 3:** Flip the second fraction: $\\frac{{{denom2}}}{{{num2}}}$")
-        steps.append(f"Now multiply: $\\frac{{{num1}}}{{{denom1}}} \\times \\frac{{{denom2}}}{{{num2}}}$")
+        steps.append(f"**Step 3:** Flip the second fraction: ${format_frac(denom2, num2)}$")
+        steps.append(f"Now multiply: ${format_frac(num1, denom1)} \\times {format_frac(denom2, num2)}$")
 
         new_num = num1 * denom2
         new_denom = denom1 * num2
 
         steps.append(f"Multiply numerators: ${num1} \\times {denom2} = {new_num}$")
         steps.append(f"Multiply denominators: ${denom1} \\times {num2} = {new_denom}$")
-        steps.append(f"Result: $\\frac{{{new_num}}}{{{new_denom}}}$")
+        steps.append(f"Result: ${format_frac(new_num, new_denom)}$")
 
         # Simplify
+        result = Fraction(num1, denom1) / Fraction(num2, denom2)
         if result.numerator != new_num or result.denominator != new_denom:
             common = gcd(new_num, new_denom)
             steps.append(f"**Simplify:** Divide both by their GCD (${common}$):")
-            steps.append(f"$\\frac{{{result.numerator}}}{{{result.denominator}}}$")
+            steps.append(f"${format_frac(result.numerator, result.denominator)}$")
 
     elif difficulty == 2:
-        # Medium: Larger numbers, needs simplification
-        num1 = random.randint(2, 12)
-        denom1 = random.randint(3, 12)
-        num2 = random.randint(2, 12)
-        denom2 = random.randint(3, 12)
-
-        frac1 = Fraction(num1, denom1)
-        frac2 = Fraction(num2, denom2)
-
-        expression = f"\\frac{{{num1}}}{{{denom1}}} \\div \\frac{{{num2}}}{{{denom2}}}"
         steps.append(f"Divide the fractions: ${expression}$")
         steps.append("**Rule:** Multiply by the reciprocal of the divisor")
 
         steps.append(f"**Step 1:** Flip the second fraction (find its reciprocal):")
-        steps.append(f"Reciprocal of $\\frac{{{num2}}}{{{denom2}}}$ is $\\frac{{{denom2}}}{{{num2}}}$")
+        steps.append(f"Reciprocal of ${format_frac(num2, denom2)}$ is ${format_frac(denom2, num2)}$")
 
         steps.append(f"**Step 2:** Multiply:")
-        steps.append(f"$\\frac{{{num1}}}{{{denom1}}} \\times \\frac{{{denom2}}}{{{num2}}}$")
+        steps.append(f"${format_frac(num1, denom1)} \\times {format_frac(denom2, num2)}$")
 
         # Show cross-canceling if possible
         if gcd(num1, num2) > 1 or gcd(denom1, denom2) > 1:
@@ -119,72 +161,49 @@ def generate_fractions_division(difficulty: int = 1) -> Dict[str, Any]:
         new_num = num1 * denom2
         new_denom = denom1 * num2
 
-        steps.append(f"**Step 4:** Multiply: $\\frac{{{new_num}}}{{{new_denom}}}$")
+        steps.append(f"**Step 4:** Multiply: ${format_frac(new_num, new_denom)}$")
 
         # Simplify
-        result = frac1 / frac2
+        result = Fraction(num1, denom1) / Fraction(num2, denom2)
         if result.numerator != new_num or result.denominator != new_denom:
             common = gcd(new_num, new_denom)
             steps.append(f"**Step 5:** Simplify by GCD (${common}$):")
-            steps.append(f"$\\frac{{{result.numerator}}}{{{result.denominator}}}$")
+            steps.append(f"${format_frac(result.numerator, result.denominator)}$")
 
     else:  # difficulty == 3
-        # Hard: Mixed numbers
-        whole = random.randint(1, 4)
-        num1 = random.randint(1, 5)
-        denom1 = random.randint(2, 6)
-        while num1 >= denom1:
-            num1 = random.randint(1, 5)
-
-        num2 = random.randint(1, 8)
-        denom2 = random.randint(2, 8)
-
-        expression = f"{whole}\\frac{{{num1}}}{{{denom1}}} \\div \\frac{{{num2}}}{{{denom2}}}"
         steps.append(f"Divide the mixed number by a fraction: ${expression}$")
 
         steps.append("**Step 1:** Convert mixed number to improper fraction")
         improper_num = whole * denom1 + num1
-        steps.append(f"${whole}\\frac{{{num1}}}{{{denom1}}} = \\frac{{{whole} \\times {denom1} + {num1}}}{{{denom1}}} = \\frac{{{improper_num}}}{{{denom1}}}$")
+        steps.append(f"${format_mixed_number(whole, num1, denom1)} = \\frac{{{whole} \\times {denom1} + {num1}}}{{{denom1}}} = {format_frac(improper_num, denom1)}$")
 
         steps.append("**Step 2:** Rewrite the division:")
-        steps.append(f"$\\frac{{{improper_num}}}{{{denom1}}} \\div \\frac{{{num2}}}{{{denom2}}}$")
+        steps.append(f"${format_frac(improper_num, denom1)} \\div {format_frac(num2, denom2)}$")
 
         steps.append("**Step 3:** Multiply by the reciprocal:")
-        steps.append(f"$\\frac{{{improper_num}}}{{{denom1}}} \\times \\frac{{{denom2}}}{{{num2}}}$")
+        steps.append(f"${format_frac(improper_num, denom1)} \\times {format_frac(denom2, num2)}$")
 
         new_num = improper_num * denom2
         new_denom = denom1 * num2
 
         steps.append(f"**Step 4:** Multiply:")
-        steps.append(f"$\\frac{{{improper_num} \\times {denom2}}}{{{denom1} \\times {num2}}} = \\frac{{{new_num}}}{{{new_denom}}}$")
+        steps.append(f"$\\frac{{{improper_num} \\times {denom2}}}{{{denom1} \\times {num2}}} = {format_frac(new_num, new_denom)}$")
 
-        frac1 = Fraction(improper_num, denom1)
-        frac2 = Fraction(num2, denom2)
-        result = frac1 / frac2
+        result = Fraction(improper_num, denom1) / Fraction(num2, denom2)
 
         if result.numerator != new_num or result.denominator != new_denom:
             steps.append(f"**Step 5:** Simplify:")
-            steps.append(f"$\\frac{{{result.numerator}}}{{{result.denominator}}}$")
+            steps.append(f"${format_frac(result.numerator, result.denominator)}$")
 
         # Check if it can be converted back to mixed number
         if result.numerator > result.denominator:
             whole_part = result.numerator // result.denominator
             remainder = result.numerator % result.denominator
             if remainder > 0:
-                steps.append(f"Convert to mixed number: ${whole_part}\\frac{{{remainder}}}{{{result.denominator}}}$")
+                steps.append(f"Convert to mixed number: ${format_mixed_number(whole_part, remainder, result.denominator)}$")
 
-    # Format answer
     if result.denominator == 1:
-        answer_str = str(result.numerator)
         steps.append(f"**Final Answer:** ${result.numerator}$")
     else:
-        answer_str = f"{result.numerator}/{result.denominator}"
-        steps.append(f"**Final Answer:** $\\frac{{{result.numerator}}}{{{result.denominator}}}$")
-
-    return {
-        "question": f"Divide: ${expression}$",
-        "answer": answer_str,
-        "answer_numeric": float(result),
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+        steps.append(f"**Final Answer:** ${format_frac(result.numerator, result.denominator)}$")
+    return steps
@@ -3,7 +3,11 @@
 import random
 from fractions import Fraction
 from math import gcd
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac, format_mixed_number
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Word problem templates for fraction multiplication
 FRACTION_MULT_WORD_PROBLEMS = [
@@ -16,7 +20,11 @@ FRACTION_MULT_WORD_PROBLEMS = [
 ]
 
 
-def generate_fractions_multiplication(difficulty: int = 1) -> Dict[str, Any]:
+def generate_fractions_multiplication(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a fraction multiplication problem: (a/b) * (c/d).
 
@@ -25,174 +33,212 @@ def generate_fractions_multiplication(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - simple fractions)
             2 (medium - larger denominators, requires simplification)
             3 (hard - mixed numbers or three fractions)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     # Use word problems 50% of the time
-    use_word_problem = random.random() < 0.5
+    use_word_problem = rng.random() < 0.5
 
     if difficulty == 1:
         # Easy: Simple fractions
-        num1 = random.randint(1, 8)
-        denom1 = random.randint(2, 8)
-        num2 = random.randint(1, 8)
-        denom2 = random.randint(2, 8)
+        num1 = rng.randint(1, 8)
+        denom1 = rng.randint(2, 8)
+        num2 = rng.randint(1, 8)
+        denom2 = rng.randint(2, 8)
 
-        frac1 = Fraction(num1, denom1)
-        frac2 = Fraction(num2, denom2)
+        result = Fraction(num1, denom1) * Fraction(num2, denom2)
 
         # Format fractions for display
         frac1_str = f"{num1}/{denom1}"
         frac2_str = f"{num2}/{denom2}"
 
-        expression = f"\\frac{{{num1}}}{{{denom1}}} \\times \\frac{{{num2}}}{{{denom2}}}"
+        expression = f"{format_frac(num1, denom1)} \\times {format_frac(num2, denom2)}"
 
+        problem = None
         if use_word_problem:
-            wp = random.choice(FRACTION_MULT_WORD_PROBLEMS)
-            question = wp["template"].format(frac1=frac1_str, frac2=frac2_str)
-            steps.append(f"**Problem:** {question}")
-            steps.append(f"**Identify:** Multiply $\\frac{{{num1}}}{{{denom1}}} \\times \\frac{{{num2}}}{{{denom2}}}$")
+            wp = rng.choice(FRACTION_MULT_WORD_PROBLEMS)
+            problem = wp["template"].format(frac1=frac1_str, frac2=frac2_str)
+
+        steps = LazySteps(_two_fraction_steps, problem, expression, num1, denom1, num2, denom2, result)
+
+    elif difficulty == 2:
+        # Medium: Larger numbers, definitely needs simplification
+        num1 = rng.randint(2, 12)
+        denom1 = rng.randint(3, 12)
+        num2 = rng.randint(2, 12)
+        denom2 = rng.randint(3, 12)
+
+        result = Fraction(num1, denom1) * Fraction(num2, denom2)
+
+        expression = f"{format_frac(num1, denom1)} \\times {format_frac(num2, denom2)}"
+        steps = LazySteps(_cross_cancel_steps, expression, num1, denom1, num2, denom2, result)
+
+    else:  # difficulty == 3
+        # Hard: Three fractions or mixed numbers
+        if rng.choice([True, False]):
+            # Three fractions
+            num1 = rng.randint(1, 6)
+            denom1 = rng.randint(2, 6)
+            num2 = rng.randint(1, 6)
+            denom2 = rng.randint(2, 6)
+            num3 = rng.randint(1, 6)
+            denom3 = rng.randint(2, 6)
+
+            result = Fraction(num1, denom1) * Fraction(num2, denom2) * Fraction(num3, denom3)
+
+            expression = f"{format_frac(num1, denom1)} \\times {format_frac(num2, denom2)} \\times {format_frac(num3, denom3)}"
+            steps = LazySteps(
+                _three_fraction_steps, expression, num1, denom1, num2, denom2, num3, denom3, result
+            )
         else:
-            steps.append(f"Multiply the fractions: ${expression}$")
+            # Mixed number
+            whole = rng.randint(1, 4)
+            num1 = rng.randint(1, 5)
+            denom1 = rng.randint(2, 6)
+            while num1 >= denom1:
+                num1 = rng.randint(1, 5)
+
+            num2 = rng.randint(1, 8)
+            denom2 = rng.randint(2, 8)
+
+            result = Fraction(whole * denom1 + num1, denom1) * Fraction(num2, denom2)
 
-        steps.append("**Rule:** Multiply numerators together and denominators together")
-        steps.append(f"$\\frac{{a}}{{b}} \\times \\frac{{c}}{{d}} = \\frac{{a \\times c}}{{b \\times d}}$")
+            expression = f"{format_mixed_number(whole, num1, denom1)} \\times {format_frac(num2, denom2)}"
+            steps = LazySteps(_mixed_number_steps, expression, whole, num1, denom1, num2, denom2, result)
 
-        new_num = num1 * num2
-        new_denom = denom1 * denom2
+    # Format answer
+    if result.denominator == 1:
+        answer_str = str(result.numerator)
+    else:
+        answer_str = f"{result.numerator}/{result.denominator}"
 
-        steps.append(f"Multiply numerators: ${num1} \\times {num2} = {new_num}$")
-        steps.append(f"Multiply denominators: ${denom1} \\times {denom2} = {new_denom}$")
-        steps.append(f"Result: $\\frac{{{new_num}}}{{{new_denom}}}$")
+    return GeneratedQuestion(
+        question=f"Multiply: ${expression}$",
+        answer=answer_str,
+        answer_numeric=float(result),
+        steps=steps,
+        difficulty=difficulty,
+    )
 
-        # Simplify
-        result = frac1 * frac2
-        if result.numerator != new_num or result.denominator != new_denom:
-            common = gcd(new_num, new_denom)
-            steps.append(f"Simplify by dividing both by their GCD (${common}$):")
-            steps.append(f"$\\frac{{{new_num} \\div {common}}}{{{new_denom} \\div {common}}} = \\frac{{{result.numerator}}}{{{result.denominator}}}$")
 
-    elif difficulty == 2:
-        # Medium: Larger numbers, definitely needs simplification
-        num1 = random.randint(2, 12)
-        denom1 = random.randint(3, 12)
-        num2 = random.randint(2, 12)
-        denom2 = random.randint(3, 12)
+def _final_answer_step(result: Fraction) -> str:
+    """The closing step for a product, as a whole number when it is one."""
+    if result.denominator == 1:
+        return f"**Final Answer:** ${result.numerator}$"
+    return f"**Final Answer:** ${format_frac(result.numerator, result.denominator)}$"
 
-        frac1 = Fraction(num1, denom1)
-        frac2 = Fraction(num2, denom2)
 
-        expression = f"\\frac{{{num1}}}{{{denom1}}} \\times \\frac{{{num2}}}{{{denom2}}}"
-        steps.append(f"Multiply the fractions: ${expression}$")
-        steps.append("**Rule:** Multiply numerators together and denominators together")
+def _two_fraction_steps(problem: Optional[str], expression: str, num1: int, denom1: int, num2: int, denom2: int,
+                        result: Fraction) -> List[str]:
+    """Steps for (a/b) * (c/d), restating the word problem when there is one."""
+    if problem:
+        steps = [f"**Problem:** {problem}", f"**Identify:** Multiply ${expression}$"]
+    else:
+        steps = [f"Multiply the fractions: ${expression}$"]
 
-        # Option to show cross-canceling
-        if gcd(num1, denom2) > 1 or gcd(num2, denom1) > 1:
-            steps.append("**Tip:** We can simplify before multiplying by cross-canceling")
+    steps.append("**Rule:** Multiply numerators together and denominators together")
+    steps.append(f"$\\frac{{a}}{{b}} \\times \\frac{{c}}{{d}} = \\frac{{a \\times c}}{{b \\times d}}$")
 
-            gcd1 = gcd(num1, denom2)
-            gcd2 = gcd(num2, denom1)
+    new_num = num1 * num2
+    new_denom = denom1 * denom2
 
-            if gcd1 > 1:
-                steps.append(f"Cancel common factor ${gcd1}$ from ${num1}$ and ${denom2}$:")
-                steps.append(f"$\\frac{{{num1 // gcd1}}}{{{denom1}}} \\times \\frac{{{num2}}}{{{denom2 // gcd1}}}$")
+    steps.append(f"Multiply numerators: ${num1} \\times {num2} = {new_num}$")
+    steps.append(f"Multiply denominators: ${denom1} \\times {denom2} = {new_denom}$")
+    steps.append(f"Result: ${format_frac(new_num, new_denom)}$")
 
-            if gcd2 > 1:
-                new_num2 = num2
-                new_denom1 = denom1
-                steps.append(f"Cancel common factor ${gcd2}$ from ${new_num2}$ and ${new_denom1}$:")
+    # Simplify
+    if result.numerator != new_num or result.denominator != new_denom:
+        common = gcd(new_num, new_denom)
+        steps.append(f"Simplify by dividing both by their GCD (${common}$):")
+        steps.append(f"$\\frac{{{new_num} \\div {common}}}{{{new_denom} \\div {common}}} = {format_frac(result.numerator, result.denominator)}$")
 
-        new_num = num1 * num2
-        new_denom = denom1 * denom2
+    steps.append(_final_answer_step(result))
+    return steps
 
-        steps.append(f"Multiply: $\\frac{{{num1} \\times {num2}}}{{{denom1} \\times {denom2}}} = \\frac{{{new_num}}}{{{new_denom}}}$")
 
-        # Simplify
-        result = frac1 * frac2
-        if result.numerator != new_num or result.denominator != new_denom:
-            common = gcd(new_num, new_denom)
-            steps.append(f"Simplify by dividing both by GCD (${common}$):")
-            steps.append(f"$\\frac{{{result.numerator}}}{{{result.denominator}}}$")
+def _cross_cancel_steps(expression: str, num1: int, denom1: int, num2: int, denom2: int,
+                        result: Fraction) -> List[str]:
+    """Steps for (a/b) * (c/d), pointing out common factors that cancel."""
+    steps = [
+        f"Multiply the fractions: ${expression}$",
+        "**Rule:** Multiply numerators together and denominators together",
+    ]
 
-    else:  # difficulty == 3
-        # Hard: Three fractions or mixed numbers
-        if random.choice([True, False]):
-            # Three fractions
-            num1 = random.randint(1, 6)
-            denom1 = random.randint(2, 6)
-            num2 = random.randint(1, 6)
-            denom2 = random.randint(2, 6)
-            num3 = random.randint(1, 6)
-            denom3 = random.randint(2, 6)
-
-            frac1 = Fraction(num1, denom1)
-            frac2 = Fraction(num2, denom2)
-            frac3 = Fraction(num3, denom3)
-
-            expression = f"\\frac{{{num1}}}{{{denom1}}} \\times \\frac{{{num2}}}{{{denom2}}} \\times \\frac{{{num3}}}{{{denom3}}}"
-            steps.append(f"Multiply the fractions: ${expression}$")
-            steps.append("**Rule:** Multiply all numerators together and all denominators together")
-
-            new_num = num1 * num2 * num3
-            new_denom = denom1 * denom2 * denom3
-
-            steps.append(f"Multiply numerators: ${num1} \\times {num2} \\times {num3} = {new_num}$")
-            steps.append(f"Multiply denominators: ${denom1} \\times {denom2} \\times {denom3} = {new_denom}$")
-            steps.append(f"Result: $\\frac{{{new_num}}}{{{new_denom}}}$")
-
-            result = frac1 * frac2 * frac3
-            if result.numerator != new_num or result.denominator != new_denom:
-                common = gcd(new_num, new_denom)
-                steps.append(f"Simplify by GCD (${common}$):")
-                steps.append(f"$\\frac{{{result.numerator}}}{{{result.denominator}}}$")
-        else:
-            # Mixed number
-            whole = random.randint(1, 4)
-            num1 = random.randint(1, 5)
-            denom1 = random.randint(2, 6)
-            while num1 >= denom1:
-                num1 = random.randint(1, 5)
+    # Option to show cross-canceling
+    if gcd(num1, denom2) > 1 or gcd(num2, denom1) > 1:
+        steps.append("**Tip:** We can simplify before multiplying by cross-canceling")
 
-            num2 = random.randint(1, 8)
-            denom2 = random.randint(2, 8)
+        gcd1 = gcd(num1, denom2)
+        gcd2 = gcd(num2, denom1)
 
-            expression = f"{whole}\\frac{{{num1}}}{{{denom1}}} \\times \\frac{{{num2}}}{{{denom2}}}"
-            steps.append(f"Multiply the mixed number and fraction: ${expression}$")
-            steps.append("**Step 1:** Convert mixed number to improper fraction")
+        if gcd1 > 1:
+            steps.append(f"Cancel common factor ${gcd1}$ from ${num1}$ and ${denom2}$:")
+            steps.append(f"${format_frac(num1 // gcd1, denom1)} \\times {format_frac(num2, denom2 // gcd1)}$")
 
-            improper_num = whole * denom1 + num1
-            steps.append(f"${whole}\\frac{{{num1}}}{{{denom1}}} = \\frac{{{whole} \\times {denom1} + {num1}}}{{{denom1}}} = \\frac{{{improper_num}}}{{{denom1}}}$")
+        if gcd2 > 1:
+            steps.append(f"Cancel common factor ${gcd2}$ from ${num2}$ and ${denom1}$:")
 
-            steps.append("**Step 2:** Multiply the fractions")
-            steps.append(f"$\\frac{{{improper_num}}}{{{denom1}}} \\times \\frac{{{num2}}}{{{denom2}}}$")
+    new_num = num1 * num2
+    new_denom = denom1 * denom2
 
-            new_num = improper_num * num2
-            new_denom = denom1 * denom2
+    steps.append(f"Multiply: $\\frac{{{num1} \\times {num2}}}{{{denom1} \\times {denom2}}} = {format_frac(new_num, new_denom)}$")
 
-            steps.append(f"$= \\frac{{{new_num}}}{{{new_denom}}}$")
+    # Simplify
+    if result.numerator != new_num or result.denominator != new_denom:
+        common = gcd(new_num, new_denom)
+        steps.append(f"Simplify by dividing both by GCD (${common}$):")
+        steps.append(f"${format_frac(result.numerator, result.denominator)}$")
 
-            frac1 = Fraction(improper_num, denom1)
-            frac2 = Fraction(num2, denom2)
-            result = frac1 * frac2
+    steps.append(_final_answer_step(result))
+    return steps
 
-            if result.numerator != new_num or result.denominator != new_denom:
-                steps.append(f"Simplify: $\\frac{{{result.numerator}}}{{{result.denominator}}}$")
 
-    # Format answer
-    if result.denominator == 1:
-        answer_str = str(result.numerator)
-        steps.append(f"**Final Answer:** ${result.numerator}$")
-    else:
-        answer_str = f"{result.numerator}/{result.denominator}"
-        steps.append(f"**Final Answer:** $\\frac{{{result.numerator}}}{{{result.denominator}}}$")
-
-    return {
-        "question": f"Multiply: ${expression}$",
-        "answer": answer_str,
-        "answer_numeric": float(result),
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+def _three_fraction_steps(expression: str, num1: int, denom1: int, num2: int, denom2: int, num3: int,
+                          denom3: int, result: Fraction) -> List[str]:
+    """Steps for a product of three fractions."""
+    new_num = num1 * num2 * num3
+    new_denom = denom1 * denom2 * denom3
+
+    steps = [
+        f"Multiply the fractions: ${expression}$",
+        "**Rule:** Multiply all numerators together and all denominators together",
+        f"Multiply numerators: ${num1} \\times {num2} \\times {num3} = {new_num}$",
+        f"Multiply denominators: ${denom1} \\times {denom2} \\times {denom3} = {new_denom}$",
+        f"Result: ${format_frac(new_num, new_denom)}$",
+    ]
+
+    if result.numerator != new_num or result.denominator != new_denom:
+        common = gcd(new_num, new_denom)
+        steps.append(f"Simplify by GCD (${common}$):")
+        steps.append(f"${format_frac(result.numerator, result.denominator)}$")
+
+    steps.append(_final_answer_step(result))
+    return steps
+
+
+def _mixed_number_steps(expression: str, whole: int, num1: int, denom1: int, num2: int, denom2: int,
+                        result: Fraction) -> List[str]:
+    """Steps for a mixed number times a fraction."""
+    improper_num = whole * denom1 + num1
+    new_num = improper_num * num2
+    new_denom = denom1 * denom2
+
+    steps = [
+        f"Multiply the mixed number and fraction: ${expression}$",
+        "**Step 1:** Convert mixed number to improper fraction",
+        f"${format_mixed_number(whole, num1, denom1)} = \\frac{{{whole} \\times {denom1} + {num1}}}{{{denom1}}} = {format_frac(improper_num, denom1)}$",
+        "**Step 2:** Multiply the fractions",
+        f"${format_frac(improper_num, denom1)} \\times {format_frac(num2, denom2)}$",
+        f"$= {format_frac(new_num, new_denom)}$",
+    ]
+
+    if result.numerator != new_num or result.denominator != new_denom:
+        steps.append(f"Simplify: ${format_frac(result.numerator, result.denominator)}$")
+
+    steps.append(_final_answer_step(result))
+    return steps
@@ -1,7 +1,10 @@
 """Function composition question generator."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world applications of function composition
 COMPOSITION_CONTEXTS = [
@@ -28,24 +31,32 @@ COMPOSITION_CONTEXTS = [
 ]
 
 
-def generate_function_composition(difficulty: int = 1) -> Dict[str, Any]:
+def generate_function_composition(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a function composition problem.
 
     Args:
         difficulty: 1 (linear compositions), 2 (quadratic compositions), 3 (triple compositions)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Linear function compositions
         # f(x) = ax + b, g(x) = cx + d
-        a = random.randint(2, 5)
-        b = random.randint(-5, 5)
-        c = random.randint(2, 4)
-        d = random.randint(-5, 5)
-        x_val = random.randint(1, 5)
+        a = rng.randint(2, 5)
+        b = rng.randint(-5, 5)
+        c = rng.randint(2, 4)
+        d = rng.randint(-5, 5)
+        x_val = rng.randint(1, 5)
 
         # Calculate f(g(x_val))
         g_result = c * x_val + d
@@ -53,28 +64,16 @@ def generate_function_composition(difficulty: int = 1) -> Dict[str, Any]:
 
         question = f"Given $f(x) = {a}x {b:+d}$ and $g(x) = {c}x {d:+d}$, find $f(g({x_val}))$."
 
-        steps = [
-            f"First, find $g({x_val})$:",
-            f"$g({x_val}) = {c}({x_val}) {d:+d}$",
-            f"$g({x_val}) = {c * x_val} {d:+d}$",
-            f"$g({x_val}) = {g_result}$",
-            "",
-            f"Now, find $f(g({x_val})) = f({g_result})$:",
-            f"$f({g_result}) = {a}({g_result}) {b:+d}$",
-            f"$f({g_result}) = {a * g_result} {b:+d}$",
-            f"$f({g_result}) = {fg_result}$",
-            "",
-            f"**Final Answer:** $f(g({x_val})) = {fg_result}$"
-        ]
+        steps = LazySteps(_linear_composition_steps, x_val, c, d, g_result, a, b, fg_result)
 
         answer_numeric = fg_result
 
     elif difficulty == 2:
         # Medium: Quadratic and linear compositions
         # f(x) = x², g(x) = ax + b
-        a = random.randint(2, 4)
-        b = random.randint(-4, 4)
-        x_val = random.randint(1, 4)
+        a = rng.randint(2, 4)
+        b = rng.randint(-4, 4)
+        x_val = rng.randint(1, 4)
 
         # Calculate f(g(x_val)) where f(x) = x²
         g_result = a * x_val + b
@@ -82,28 +81,17 @@ def generate_function_composition(difficulty: int = 1) -> Dict[str, Any]:
 
         question = f"Given $f(x) = x^2$ and $g(x) = {a}x {b:+d}$, find $f(g({x_val}))$."
 
-        steps = [
-            f"First, find $g({x_val})$:",
-            f"$g({x_val}) = {a}({x_val}) {b:+d}$",
-            f"$g({x_val}) = {a * x_val} {b:+d}$",
-            f"$g({x_val}) = {g_result}$",
-            "",
-            f"Now, find $f(g({x_val})) = f({g_result})$:",
-            f"$f({g_result}) = ({g_result})^2$",
-            f"$f({g_result}) = {fg_result}$",
-            "",
-            f"**Final Answer:** $f(g({x_val})) = {fg_result}$"
-        ]
+        steps = LazySteps(_quadratic_composition_steps, x_val, a, b, g_result, fg_result)
 
         answer_numeric = fg_result
 
     else:
         # Hard: Triple composition or g(f(x))
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # g(f(x)) with f(x) = x², g(x) = ax + b
-            a = random.randint(2, 4)
-            b = random.randint(-4, 4)
-            x_val = random.randint(2, 4)
+            a = rng.randint(2, 4)
+            b = rng.randint(-4, 4)
+            x_val = rng.randint(2, 4)
 
             # Calculate g(f(x_val))
             f_result = x_val ** 2
@@ -111,26 +99,15 @@ def generate_function_composition(difficulty: int = 1) -> Dict[str, Any]:
 
             question = f"Given $f(x) = x^2$ and $g(x) = {a}x {b:+d}$, find $g(f({x_val}))$."
 
-            steps = [
-                f"First, find $f({x_val})$:",
-                f"$f({x_val}) = ({x_val})^2$",
-                f"$f({x_val}) = {f_result}$",
-                "",
-                f"Now, find $g(f({x_val})) = g({f_result})$:",
-                f"$g({f_result}) = {a}({f_result}) {b:+d}$",
-                f"$g({f_result}) = {a * f_result} {b:+d}$",
-                f"$g({f_result}) = {gf_result}$",
-                "",
-                f"**Final Answer:** $g(f({x_val})) = {gf_result}$"
-            ]
+            steps = LazySteps(_square_then_linear_steps, x_val, f_result, a, b, gf_result)
 
             answer_numeric = gf_result
         else:
             # Triple composition: f(g(h(x)))
             # f(x) = 2x, g(x) = x + a, h(x) = x + b
-            a = random.randint(1, 3)
-            b = random.randint(1, 3)
-            x_val = random.randint(1, 3)
+            a = rng.randint(1, 3)
+            b = rng.randint(1, 3)
+            x_val = rng.randint(1, 3)
 
             # Calculate f(g(h(x_val)))
             h_result = x_val + b
@@ -139,25 +116,83 @@ def generate_function_composition(difficulty: int = 1) -> Dict[str, Any]:
 
             question = f"Given $f(x) = 2x$, $g(x) = x + {a}$, and $h(x) = x + {b}$, find $f(g(h({x_val})))$."
 
-            steps = [
-                f"First, find $h({x_val})$:",
-                f"$h({x_val}) = {x_val} + {b} = {h_result}$",
-                "",
-                f"Next, find $g(h({x_val})) = g({h_result})$:",
-                f"$g({h_result}) = {h_result} + {a} = {g_result}$",
-                "",
-                f"Finally, find $f(g(h({x_val}))) = f({g_result})$:",
-                f"$f({g_result}) = 2({g_result}) = {fgh_result}$",
-                "",
-                f"**Final Answer:** $f(g(h({x_val}))) = {fgh_result}$"
-            ]
+            steps = LazySteps(_triple_composition_steps, x_val, b, h_result, a, g_result, fgh_result)
 
             answer_numeric = fgh_result
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _linear_composition_steps(x_val: int, c: int, d: int, g_result: int, a: int, b: int,
+                              fg_result: int) -> List[str]:
+    """Steps for f(g(x)) with two linear functions."""
+    return [
+        f"First, find $g({x_val})$:",
+        f"$g({x_val}) = {c}({x_val}) {d:+d}$",
+        f"$g({x_val}) = {c * x_val} {d:+d}$",
+        f"$g({x_val}) = {g_result}$",
+        "",
+        f"Now, find $f(g({x_val})) = f({g_result})$:",
+        f"$f({g_result}) = {a}({g_result}) {b:+d}$",
+        f"$f({g_result}) = {a * g_result} {b:+d}$",
+        f"$f({g_result}) = {fg_result}$",
+        "",
+        f"**Final Answer:** $f(g({x_val})) = {fg_result}$"
+    ]
+
+
+def _quadratic_composition_steps(x_val: int, a: int, b: int, g_result: int,
+                                 fg_result: int) -> List[str]:
+    """Steps for f(g(x)) with a quadratic outer function."""
+    return [
+        f"First, find $g({x_val})$:",
+        f"$g({x_val}) = {a}({x_val}) {b:+d}$",
+        f"$g({x_val}) = {a * x_val} {b:+d}$",
+        f"$g({x_val}) = {g_result}$",
+        "",
+        f"Now, find $f(g({x_val})) = f({g_result})$:",
+        f"$f({g_result}) = ({g_result})^2$",
+        f"$f({g_result}) = {fg_result}$",
+        "",
+        f"**Final Answer:** $f(g({x_val})) = {fg_result}$"
+    ]
+
+
+def _square_then_linear_steps(x_val: int, f_result: int, a: int, b: int,
+                              gf_result: int) -> List[str]:
+    """Steps for g(f(x)) with f(x) = x² and linear g."""
+    return [
+        f"First, find $f({x_val})$:",
+        f"$f({x_val}) = ({x_val})^2$",
+        f"$f({x_val}) = {f_result}$",
+        "",
+        f"Now, find $g(f({x_val})) = g({f_result})$:",
+        f"$g({f_result}) = {a}({f_result}) {b:+d}$",
+        f"$g({f_result}) = {a * f_result} {b:+d}$",
+        f"$g({f_result}) = {gf_result}$",
+        "",
+        f"**Final Answer:** $g(f({x_val})) = {gf_result}$"
+    ]
+
+
+def _triple_composition_steps(x_val: int, b: int, h_result: int, a: int, g_result: int,
+                              fgh_result: int) -> List[str]:
+    """Steps for f(g(h(x))) evaluated from the inside out."""
+    return [
+        f"First, find $h({x_val})$:",
+        f"$h({x_val}) = {x_val} + {b} = {h_result}$",
+        "",
+        f"Next, find $g(h({x_val})) = g({h_result})$:",
+        f"$g({h_result}) = {h_result} + {a} = {g_result}$",
+        "",
+        f"Finally, find $f(g(h({x_val}))) = f({g_result})$:",
+        f"$f({g_result}) = 2({g_result}) = {fgh_result}$",
+        "",
+        f"**Final Answer:** $f(g(h({x_val}))) = {fgh_result}$"
+    ]
@@ -1,7 +1,11 @@
 """Graphing linear equations generator with real-world contexts."""
 
 import random
-from typing import Dict, Any, List
+from typing import List, Optional
+from app.generators.latex import format_polynomial, format_signed
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for graphing linear equations
 GRAPHING_CONTEXTS = [
@@ -12,96 +16,68 @@ GRAPHING_CONTEXTS = [
 ]
 
 
-def generate_graphing_linear_equations(difficulty: int = 1) -> Dict[str, Any]:
+def generate_graphing_linear_equations(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate graphing linear equations problems.
 
     Args:
         difficulty: 1 (find y-intercept and slope), 2 (provide points), 3 (write equation from description)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Find y-intercept and slope from equation in slope-intercept form
-        m = random.randint(-5, 5)
+        m = rng.randint(-5, 5)
         if m == 0:
             m = 1
-        b = random.randint(-8, 8)
+        b = rng.randint(-8, 8)
 
         # Create equation
-        if m == 1:
-            equation = f"y = x {'+' if b >= 0 else '-'} {abs(b)}"
-        elif m == -1:
-            equation = f"y = -x {'+' if b >= 0 else '-'} {abs(b)}"
-        else:
-            equation = f"y = {m}x {'+' if b >= 0 else '-'} {abs(b)}"
-
-        if b == 0:
-            equation = equation.replace(" + 0", "").replace(" - 0", "")
-
-        question = f"y = {m}x {'+' if b >= 0 else '-'} {abs(b)}" if b != 0 else f"y = {m}x"
-
-        steps = [
-            f"Given equation: ${question}$",
-            f"This is in slope-intercept form: $y = mx + b$",
-            f"Where $m$ is the slope and $b$ is the y-intercept",
-            f"**Slope:** $m = {m}$",
-            f"**Y-intercept:** $b = {b}$ (point $(0, {b})$)",
-            f"To graph:",
-            f"1. Plot the y-intercept at $(0, {b})$",
-            f"2. From that point, use the slope: rise = ${m}$, run = $1$",
-            f"3. Draw a line through the points",
-            f"**Final Answer:** Slope = ${m}$, Y-intercept = ${b}$"
-        ]
+        equation = f"y = {format_polynomial((b, m))}"
+
+        question = f"y = {m}x {format_signed(b)}" if b != 0 else f"y = {m}x"
+
+        steps = LazySteps(_read_off_steps, question, m, b)
 
         answer = f"m={m}, b={b}"
 
     elif difficulty == 2:
         # Provide 2-3 points on the line
-        m = random.randint(-4, 4)
+        m = rng.randint(-4, 4)
         if m == 0:
             m = 2
-        b = random.randint(-6, 6)
+        b = rng.randint(-6, 6)
 
         # Generate 3 points
-        x1 = random.randint(-3, 0)
-        x2 = random.randint(1, 3)
-        x3 = random.randint(4, 6)
+        x1 = rng.randint(-3, 0)
+        x2 = rng.randint(1, 3)
+        x3 = rng.randint(4, 6)
 
         y1 = m * x1 + b
         y2 = m * x2 + b
         y3 = m * x3 + b
 
-        equation = f"y = {m}x {'+' if b >= 0 else '-'} {abs(b)}" if b != 0 else f"y = {m}x"
-        if m == 1:
-            equation = f"y = x {'+' if b >= 0 else '-'} {abs(b)}" if b != 0 else "y = x"
-        elif m == -1:
-            equation = f"y = -x {'+' if b >= 0 else '-'} {abs(b)}" if b != 0 else "y = -x"
-
-        steps = [
-            f"Given equation: ${equation}$",
-            f"To find points on this line, substitute x-values and solve for y",
-            f"**Point 1:** When $x = {x1}$",
-            f"$y = {m}({x1}) {'+' if b >= 0 else '-'} {abs(b)} = {m*x1} {'+' if b >= 0 else '-'} {abs(b)} = {y1}$",
-            f"Point: $({x1}, {y1})$",
-            f"**Point 2:** When $x = {x2}$",
-            f"$y = {m}({x2}) {'+' if b >= 0 else '-'} {abs(b)} = {m*x2} {'+' if b >= 0 else '-'} {abs(b)} = {y2}$",
-            f"Point: $({x2}, {y2})$",
-            f"**Point 3:** When $x = {x3}$",
-            f"$y = {m}({x3}) {'+' if b >= 0 else '-'} {abs(b)} = {m*x3} {'+' if b >= 0 else '-'} {abs(b)} = {y3}$",
-            f"Point: $({x3}, {y3})$",
-            f"**Final Answer:** Points on the line are $({x1}, {y1})$, $({x2}, {y2})$, $({x3}, {y3})$"
-        ]
+        equation = f"y = {format_polynomial((b, m))}"
+
+        steps = LazySteps(_points_steps, equation, m, b, x1, y1, x2, y2, x3, y3)
 
         answer = f"({x1},{y1}), ({x2},{y2}), ({x3},{y3})"
 
     else:  # difficulty == 3
         # Write equation from description
-        m = random.randint(-5, 5)
+        m = rng.randint(-5, 5)
         if m == 0:
             m = 3
-        b = random.randint(-8, 8)
+        b = rng.randint(-8, 8)
 
         # Create description
         descriptions = [
@@ -109,34 +85,70 @@ def generate_graphing_linear_equations(difficulty: int = 1) -> Dict[str, Any]:
             f"a line that crosses the y-axis at ${b}$ and has slope ${m}$",
             f"a line with slope ${m}$ passing through $(0, {b})$"
         ]
-        description = random.choice(descriptions)
-
-        equation = f"y = {m}x {'+' if b >= 0 else '-'} {abs(b)}" if b != 0 else f"y = {m}x"
-        if m == 1:
-            equation = f"y = x {'+' if b >= 0 else '-'} {abs(b)}" if b != 0 else "y = x"
-        elif m == -1:
-            equation = f"y = -x {'+' if b >= 0 else '-'} {abs(b)}" if b != 0 else "y = -x"
-
-        steps = [
-            f"We need to write an equation for {description}",
-            f"Use slope-intercept form: $y = mx + b$",
-            f"Where $m$ is the slope and $b$ is the y-intercept",
-            f"Given:",
-            f"- Slope: $m = {m}$",
-            f"- Y-intercept: $b = {b}$",
-            f"Substitute into the formula:",
-            f"${equation}$",
-            f"**Final Answer:** ${equation}$"
-        ]
+        description = rng.choice(descriptions)
+
+        equation = f"y = {format_polynomial((b, m))}"
+
+        steps = LazySteps(_from_description_steps, description, m, b, equation)
 
         answer = equation
 
-    return {
-        "question": f"Graph the linear equation: ${question}$" if difficulty == 1 else
+    return GeneratedQuestion(
+        question=f"Graph the linear equation: ${question}$" if difficulty == 1 else
                    (f"Find three points on the line: ${equation}$" if difficulty == 2 else
                     f"Write the equation for {description}"),
-        "answer": answer,
-        "answer_numeric": None,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+        answer=answer,
+        answer_numeric=None,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _read_off_steps(question: str, m: int, b: int) -> List[str]:
+    """Steps for reading the slope and y-intercept off y = mx + b."""
+    return [
+        f"Given equation: ${question}$",
+        f"This is in slope-intercept form: $y = mx + b$",
+        f"Where $m$ is the slope and $b$ is the y-intercept",
+        f"**Slope:** $m = {m}$",
+        f"**Y-intercept:** $b = {b}$ (point $(0, {b})$)",
+        f"To graph:",
+        f"1. Plot the y-intercept at $(0, {b})$",
+        f"2. From that point, use the slope: rise = ${m}$, run = $1$",
+        f"3. Draw a line through the points",
+        f"**Final Answer:** Slope = ${m}$, Y-intercept = ${b}$"
+    ]
+
+
+def _points_steps(equation: str, m: int, b: int, x1: int, y1: int, x2: int, y2: int, x3: int,
+                  y3: int) -> List[str]:
+    """Steps for finding three points on y = mx + b."""
+    return [
+        f"Given equation: ${equation}$",
+        f"To find points on this line, substitute x-values and solve for y",
+        f"**Point 1:** When $x = {x1}$",
+        f"$y = {m}({x1}) {format_signed(b)} = {m*x1} {format_signed(b)} = {y1}$",
+        f"Point: $({x1}, {y1})$",
+        f"**Point 2:** When $x = {x2}$",
+        f"$y = {m}({x2}) {format_signed(b)} = {m*x2} {format_signed(b)} = {y2}$",
+        f"Point: $({x2}, {y2})$",
+        f"**Point 3:** When $x = {x3}$",
+        f"$y = {m}({x3}) {format_signed(b)} = {m*x3} {format_signed(b)} = {y3}$",
+        f"Point: $({x3}, {y3})$",
+        f"**Final Answer:** Points on the line are $({x1}, {y1})$, $({x2}, {y2})$, $({x3}, {y3})$"
+    ]
+
+
+def _from_description_steps(description: str, m: int, b: int, equation: str) -> List[str]:
+    """Steps for writing y = mx + b from a described slope and intercept."""
+    return [
+        f"We need to write an equation for {description}",
+        f"Use slope-intercept form: $y = mx + b$",
+        f"Where $m$ is the slope and $b$ is the y-intercept",
+        f"Given:",
+        f"- Slope: $m = {m}$",
+        f"- Y-intercept: $b = {b}$",
+        f"Substitute into the formula:",
+        f"${equation}$",
+        f"**Final Answer:** ${equation}$"
+    ]
@@ -1,7 +1,11 @@
 """Linear inequalities question generator with real-world contexts."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac, format_signed, format_term
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for inequalities
 INEQUALITY_CONTEXTS = {
@@ -23,8 +27,28 @@ INEQUALITY_CONTEXTS = {
     ],
 }
 
+# Map LaTeX symbols to text for answer
+SYMBOL_TEXT = {
+    '<': '<',
+    '>': '>',
+    '\\leq': '≤',
+    '\\geq': '≥'
+}
+
+# The symbol after dividing both sides by a negative number
+FLIPPED_SYMBOL = {
+    '<': '>',
+    '>': '<',
+    '\\leq': '\\geq',
+    '\\geq': '\\leq'
+}
 
-def generate_inequality(difficulty: int = 1) -> Dict[str, Any]:
+
+def generate_inequality(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a linear inequality problem: ax + b < c (or >, ≤, ≥).
 
@@ -33,58 +57,34 @@ def generate_inequality(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - simple inequalities, positive coefficients)
             2 (medium - includes negative coefficients)
             3 (hard - requires flipping inequality sign)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     # Choose inequality symbol
     symbols = ['<', '>', '\\leq', '\\geq']
-    symbol = random.choice(symbols)
-
-    # Map LaTeX symbols to text for answer
-    symbol_text = {
-        '<': '<',
-        '>': '>',
-        '\\leq': '≤',
-        '\\geq': '≥'
-    }
+    symbol = rng.choice(symbols)
 
     if difficulty == 1:
         # Easy: Positive coefficients, simple operations
-        a = random.randint(2, 8)
-        b = random.randint(1, 15)
-        x_solution = random.randint(1, 12)
+        a = rng.randint(2, 8)
+        b = rng.randint(1, 15)
+        x_solution = rng.randint(1, 12)
         c = a * x_solution + b
 
         equation = f"{a}x + {b} {symbol} {c}"
-        steps.append(f"Solve the inequality: ${equation}$")
-        steps.append("**Rule:** Solve inequalities like equations, keeping the inequality sign")
-
-        # Subtract b from both sides
-        steps.append(f"Subtract ${b}$ from both sides:")
-        new_c = c - b
-        steps.append(f"${a}x {symbol} {new_c}$")
-
-        # Divide by a
-        steps.append(f"Divide both sides by ${a}$:")
-        steps.append(f"$x {symbol} \\frac{{{new_c}}}{{{a}}}$")
-
-        if new_c % a == 0:
-            solution = new_c // a
-            steps.append(f"Simplify: $x {symbol} {solution}$")
-            answer_str = f"x {symbol_text[symbol]} {solution}"
-        else:
-            solution = new_c / a
-            steps.append(f"Simplify: $x {symbol} {solution:.2f}$")
-            answer_str = f"x {symbol_text[symbol]} {solution:.2f}"
+        answer_str = f"x {SYMBOL_TEXT[symbol]} {_solution_str(c - b, a)}"
+        steps = LazySteps(_positive_steps, equation, symbol, a, b, c, answer_str)
 
     elif difficulty == 2:
         # Medium: May include negative b
-        a = random.randint(2, 10)
-        b = random.randint(-20, 20)
-        x_solution = random.randint(-10, 10)
+        a = rng.randint(2, 10)
+        b = rng.randint(-20, 20)
+        x_solution = rng.randint(-10, 10)
         c = a * x_solution + b
 
         # Format equation properly
@@ -93,93 +93,93 @@ def generate_inequality(difficulty: int = 1) -> Dict[str, Any]:
         else:
             equation = f"{a}x - {abs(b)} {symbol} {c}"
 
-        steps.append(f"Solve the inequality: ${equation}$")
-        steps.append("**Rule:** Solve inequalities like equations, maintaining the inequality sign")
-
-        # Isolate variable term
-        if b != 0:
-            operation = f"subtract ${abs(b)}$" if b > 0 else f"add ${abs(b)}$"
-            steps.append(f"To isolate the variable term, {operation} from both sides:")
-            new_c = c - b
-            steps.append(f"${a}x {symbol} {new_c}$")
-        else:
-            new_c = c
-
-        # Divide by a
-        steps.append(f"Divide both sides by ${a}$:")
-        steps.append(f"$x {symbol} \\frac{{{new_c}}}{{{a}}}$")
-
-        if new_c % a == 0:
-            solution = new_c // a
-            steps.append(f"Simplify: $x {symbol} {solution}$")
-            answer_str = f"x {symbol_text[symbol]} {solution}"
-        else:
-            solution = new_c / a
-            steps.append(f"Simplify: $x {symbol} {solution:.2f}$")
-            answer_str = f"x {symbol_text[symbol]} {solution:.2f}"
+        answer_str = f"x {SYMBOL_TEXT[symbol]} {_solution_str(c - b, a)}"
+        steps = LazySteps(_signed_steps, equation, symbol, a, b, c, answer_str)
 
     else:  # difficulty == 3
         # Hard: Negative coefficient requires flipping the inequality
-        a = random.randint(-10, -2)
-        b = random.randint(-15, 15)
-        x_solution = random.randint(-8, 8)
+        a = rng.randint(-10, -2)
+        b = rng.randint(-15, 15)
+        x_solution = rng.randint(-8, 8)
         c = a * x_solution + b
 
         # Format equation
-        if a == -1:
-            a_str = "-x"
-        else:
-            a_str = f"{a}x"
-
-        if b >= 0:
-            equation = f"{a_str} + {b} {symbol} {c}"
-        else:
-            equation = f"{a_str} - {abs(b)} {symbol} {c}"
-
-        steps.append(f"Solve the inequality: ${equation}$")
-        steps.append("**Rule:** When dividing by a negative number, flip the inequality sign")
-
-        # Isolate variable term
-        if b != 0:
-            operation = f"subtract ${abs(b)}$" if b > 0 else f"add ${abs(b)}$"
-            steps.append(f"First, {operation} from both sides:")
-            new_c = c - b
-            if a == -1:
-                steps.append(f"$-x {symbol} {new_c}$")
-            else:
-                steps.append(f"${a}x {symbol} {new_c}$")
-        else:
-            new_c = c
-
-        # Divide by negative a (flip inequality)
-        steps.append(f"Divide both sides by ${a}$ (negative number):")
-        steps.append("⚠️ **IMPORTANT:** Flip the inequality sign when dividing by a negative")
-
-        # Flip the symbol
-        flipped_symbol = {
-            '<': '>',
-            '>': '<',
-            '\\leq': '\\geq',
-            '\\geq': '\\leq'
-        }
-        new_symbol = flipped_symbol[symbol]
-
-        steps.append(f"$x {new_symbol} \\frac{{{new_c}}}{{{a}}}$")
-
-        if new_c % a == 0:
-            solution = new_c // a
-            steps.append(f"Simplify: $x {new_symbol} {solution}$")
-            answer_str = f"x {symbol_text[new_symbol]} {solution}"
-        else:
-            solution = new_c / a
-            steps.append(f"Simplify: $x {new_symbol} {solution:.2f}$")
-            answer_str = f"x {symbol_text[new_symbol]} {solution:.2f}"
+        equation = f"{format_term(a, 1)} {format_signed(b)} {symbol} {c}"
+
+        answer_str = f"x {SYMBOL_TEXT[FLIPPED_SYMBOL[symbol]]} {_solution_str(c - b, a)}"
+        steps = LazySteps(_flipped_steps, equation, symbol, a, b, c, answer_str)
+
+    return GeneratedQuestion(
+        question=f"Solve the inequality: ${equation}$",
+        answer=answer_str,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _solution_str(new_c: int, a: int) -> str:
+    """new_c / a, as a whole number when it divides evenly and to 2 places otherwise."""
+    if new_c % a == 0:
+        return str(new_c // a)
+    return f"{new_c / a:.2f}"
+
+
+def _positive_steps(equation: str, symbol: str, a: int, b: int, c: int, answer_str: str) -> List[str]:
+    """Steps for ax + b < c with positive a and b."""
+    new_c = c - b
+    return [
+        f"Solve the inequality: ${equation}$",
+        "**Rule:** Solve inequalities like equations, keeping the inequality sign",
+        f"Subtract ${b}$ from both sides:",
+        f"${a}x {symbol} {new_c}$",
+        f"Divide both sides by ${a}$:",
+        f"$x {symbol} {format_frac(new_c, a)}$",
+        f"Simplify: $x {symbol} {_solution_str(new_c, a)}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
+
+
+def _signed_steps(equation: str, symbol: str, a: int, b: int, c: int, answer_str: str) -> List[str]:
+    """Steps for ax + b < c where b may be negative or zero."""
+    steps = [
+        f"Solve the inequality: ${equation}$",
+        "**Rule:** Solve inequalities like equations, maintaining the inequality sign",
+    ]
+
+    # Isolate variable term
+    new_c = c - b
+    if b != 0:
+        operation = f"subtract ${abs(b)}$" if b > 0 else f"add ${abs(b)}$"
+        steps.append(f"To isolate the variable term, {operation} from both sides:")
+        steps.append(f"${a}x {symbol} {new_c}$")
 
+    # Divide by a
+    steps.append(f"Divide both sides by ${a}$:")
+    steps.append(f"$x {symbol} {format_frac(new_c, a)}$")
+    steps.append(f"Simplify: $x {symbol} {_solution_str(new_c, a)}$")
     steps.append(f"**Final Answer:** ${answer_str}$")
-
-    return {
-        "question": f"Solve the inequality: ${equation}$",
-        "answer": answer_str,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return steps
+
+
+def _flipped_steps(equation: str, symbol: str, a: int, b: int, c: int, answer_str: str) -> List[str]:
+    """Steps for ax + b < c with negative a, flipping the sign on the final division."""
+    steps = [
+        f"Solve the inequality: ${equation}$",
+        "**Rule:** When dividing by a negative number, flip the inequality sign",
+    ]
+
+    # Isolate variable term
+    new_c = c - b
+    if b != 0:
+        operation = f"subtract ${abs(b)}$" if b > 0 else f"add ${abs(b)}$"
+        steps.append(f"First, {operation} from both sides:")
+        steps.append(f"${format_term(a, 1)} {symbol} {new_c}$")
+
+    # Divide by negative a (flip inequality)
+    new_symbol = FLIPPED_SYMBOL[symbol]
+    steps.append(f"Divide both sides by ${a}$ (negative number):")
+    steps.append("⚠️ **IMPORTANT:** Flip the inequality sign when dividing by a negative")
+    steps.append(f"$x {new_symbol} {format_frac(new_c, a)}$")
+    steps.append(f"Simplify: $x {new_symbol} {_solution_str(new_c, a)}$")
+    steps.append(f"**Final Answer:** ${answer_str}$")
+    return steps
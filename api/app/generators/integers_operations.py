@@ -1,7 +1,12 @@
 """Integer operations question generator with word problems."""
 
 import random
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from app.generators.latex import format_operand
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
+from app.generators.vectorized import Variant, int_values
 
 # Word problem templates for more engaging questions
 WORD_PROBLEM_CONTEXTS = [
@@ -48,11 +53,10 @@ WORD_PROBLEM_CONTEXTS = [
 ]
 
 
-def generate_word_problem(a: int, b: int, operation: str) -> tuple[str, list]:
+def generate_word_problem(rng: random.Random, a: int, b: int, operation: str) -> str:
     """Generate a word problem for integer operations."""
-    context = random.choice(WORD_PROBLEM_CONTEXTS)
-    scenario = random.choice(context["scenarios"])
-    steps = []
+    context = rng.choice(WORD_PROBLEM_CONTEXTS)
+    scenario = rng.choice(context["scenarios"])
 
     # Build the word problem
     a_abs = abs(a)
@@ -76,13 +80,30 @@ def generate_word_problem(a: int, b: int, operation: str) -> tuple[str, list]:
         # Fallback
         question = f"Calculate: {a} + {b}"
 
-    steps.append(f"**Identify the numbers:** Starting value = {a}, Change = {'+' if b >= 0 else ''}{b}")
-    steps.append(f"**Set up the equation:** ${a} + ({b})$")
+    return question
 
-    return question, steps
+
+def _word_problem_steps(a: int, b: int, answer: int) -> List[str]:
+    """Steps for an integer addition word problem."""
+    steps = [
+        f"**Identify the numbers:** Starting value = {a}, Change = {'+' if b >= 0 else ''}{b}",
+        f"**Set up the equation:** ${a} + ({b})$",
+        "**Rule:** When adding integers:",
+    ]
+    if (a >= 0 and b >= 0) or (a < 0 and b < 0):
+        steps.append("- Same signs: add absolute values, keep the sign")
+    else:
+        steps.append("- Different signs: subtract absolute values, keep sign of larger absolute value")
+    steps.append(f"**Calculate:** ${a} + ({b}) = {answer}$")
+    steps.append(f"**Final Answer:** ${answer}$")
+    return steps
 
 
-def generate_integers_operations(difficulty: int = 1) -> Dict[str, Any]:
+def generate_integers_operations(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate an integer operations problem (addition, subtraction, multiplication, division).
 
@@ -91,194 +112,230 @@ def generate_integers_operations(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - simple addition/subtraction)
             2 (medium - multiplication and division)
             3 (hard - mixed operations with negatives)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     # Decide whether to use a word problem (40% chance for difficulty 1-2)
-    use_word_problem = difficulty <= 2 and random.random() < 0.4
+    use_word_problem = difficulty <= 2 and rng.random() < 0.4
 
     if difficulty == 1:
         # Easy: Simple addition or subtraction with positive and negative integers
-        operation = random.choice(['add', 'subtract'])
+        operation = rng.choice(['add', 'subtract'])
 
         if operation == 'add':
-            a = random.randint(-20, 20)
-            b = random.randint(-20, 20)
+            a = rng.randint(-20, 20)
+            b = rng.randint(-20, 20)
+            answer = a + b
 
             # Generate word problem version
             if use_word_problem:
-                question, word_steps = generate_word_problem(a, b, 'add')
-                steps.extend(word_steps)
-                answer = a + b
-                steps.append("**Rule:** When adding integers:")
-                if (a >= 0 and b >= 0) or (a < 0 and b < 0):
-                    steps.append("- Same signs: add absolute values, keep the sign")
-                else:
-                    steps.append("- Different signs: subtract absolute values, keep sign of larger absolute value")
-                steps.append(f"**Calculate:** ${a} + ({b}) = {answer}$")
-                steps.append(f"**Final Answer:** ${answer}$")
-
-                return {
-                    "question": question,
-                    "answer": str(answer),
-                    "answer_numeric": answer,
-                    "steps": steps,
-                    "difficulty": difficulty,
-                }
-
-            if a >= 0 and b >= 0:
-                expression = f"{a} + {b}"
-            elif a >= 0 and b < 0:
-                expression = f"{a} + ({b})"
-            elif a < 0 and b >= 0:
-                expression = f"({a}) + {b}"
-            else:
-                expression = f"({a}) + ({b})"
-
-            steps.append(f"Calculate: ${expression}$")
-            steps.append("**Rule:** When adding integers:")
-            if a >= 0 and b >= 0:
-                steps.append("- Both numbers are positive, so simply add them")
-                answer = a + b
-            elif (a < 0 and b < 0):
-                steps.append("- Both numbers are negative, so add their absolute values and keep the negative sign")
-                steps.append(f"$|{a}| + |{b}| = {abs(a)} + {abs(b)} = {abs(a) + abs(b)}$")
-                steps.append(f"Since both are negative: $-{abs(a) + abs(b)}$")
-                answer = a + b
-            else:
-                steps.append("- Numbers have different signs, so subtract the smaller absolute value from the larger")
-                steps.append(f"$|{a}| = {abs(a)}$ and $|{b}| = {abs(b)}$")
-                if abs(a) > abs(b):
-                    steps.append(f"Larger absolute value: $|{a}| = {abs(a)}$, so result has sign of {a}")
-                    steps.append(f"${abs(a)} - {abs(b)} = {abs(a) - abs(b)}$")
-                else:
-                    steps.append(f"Larger absolute value: $|{b}| = {abs(b)}$, so result has sign of {b}")
-                    steps.append(f"${abs(b)} - {abs(a)} = {abs(b) - abs(a)}$")
-                answer = a + b
+                question = generate_word_problem(rng, a, b, 'add')
+
+                return GeneratedQuestion(
+                    question=question,
+                    answer=str(answer),
+                    answer_numeric=answer,
+                    steps=LazySteps(_word_problem_steps, a, b, answer),
+                    difficulty=difficulty,
+                )
+
+            expression = f"{format_operand(a)} + {format_operand(b)}"
+            steps = LazySteps(_vector_add_steps, {"a": a, "b": b, "answer": answer})
         else:  # subtract
-            a = random.randint(-15, 15)
-            b = random.randint(-15, 15)
-
-            if a >= 0 and b >= 0:
-                expression = f"{a} - {b}"
-            elif a >= 0 and b < 0:
-                expression = f"{a} - ({b})"
-            elif a < 0 and b >= 0:
-                expression = f"({a}) - {b}"
-            else:
-                expression = f"({a}) - ({b})"
-
-            steps.append(f"Calculate: ${expression}$")
-            steps.append("**Rule:** Subtracting is the same as adding the opposite")
-            steps.append(f"Rewrite as: ${a} + ({-b})$")
-
+            a = rng.randint(-15, 15)
+            b = rng.randint(-15, 15)
             answer = a - b
-            if b < 0:
-                steps.append(f"Subtracting a negative means adding a positive: ${a} + {abs(b)}$")
-            steps.append(f"Calculate: ${answer}$")
+
+            expression = f"{format_operand(a)} - {format_operand(b)}"
+            steps = LazySteps(_vector_subtract_steps, {"a": a, "b": b, "answer": answer})
 
     elif difficulty == 2:
         # Medium: Multiplication and division
-        operation = random.choice(['multiply', 'divide'])
+        operation = rng.choice(['multiply', 'divide'])
 
         if operation == 'multiply':
-            a = random.randint(-12, 12)
+            a = rng.randint(-12, 12)
             while a == 0:
-                a = random.randint(-12, 12)
-            b = random.randint(-10, 10)
+                a = rng.randint(-12, 12)
+            b = rng.randint(-10, 10)
             while b == 0:
-                b = random.randint(-10, 10)
+                b = rng.randint(-10, 10)
+            answer = a * b
 
             expression = f"{a} \\times {b}"
-            steps.append(f"Calculate: ${expression}$")
-            steps.append("**Rule:** When multiplying integers:")
-            steps.append("- Same signs → positive result")
-            steps.append("- Different signs → negative result")
-
-            if (a > 0 and b > 0) or (a < 0 and b < 0):
-                steps.append(f"Both numbers have the same sign")
-                steps.append(f"Multiply absolute values: ${abs(a)} \\times {abs(b)} = {abs(a) * abs(b)}$")
-                steps.append(f"Result is positive: ${a * b}$")
-            else:
-                steps.append(f"Numbers have different signs")
-                steps.append(f"Multiply absolute values: ${abs(a)} \\times {abs(b)} = {abs(a) * abs(b)}$")
-                steps.append(f"Result is negative: ${a * b}$")
-
-            answer = a * b
+            steps = LazySteps(_vector_multiply_steps, {"a": a, "b": b, "answer": answer})
         else:  # divide
             # Ensure clean division
-            b = random.randint(-8, 8)
+            b = rng.randint(-8, 8)
             while b == 0:
-                b = random.randint(-8, 8)
-            quotient = random.randint(-10, 10)
+                b = rng.randint(-8, 8)
+            quotient = rng.randint(-10, 10)
             while quotient == 0:
-                quotient = random.randint(-10, 10)
+                quotient = rng.randint(-10, 10)
             a = b * quotient
+            answer = a // b
 
             expression = f"{a} \\div {b}"
-            steps.append(f"Calculate: ${expression}$")
-            steps.append("**Rule:** When dividing integers:")
-            steps.append("- Same signs → positive result")
-            steps.append("- Different signs → negative result")
-
-            if (a > 0 and b > 0) or (a < 0 and b < 0):
-                steps.append(f"Both numbers have the same sign")
-                steps.append(f"Divide absolute values: ${abs(a)} \\div {abs(b)} = {abs(a) // abs(b)}$")
-                steps.append(f"Result is positive: ${a // b}$")
-            else:
-                steps.append(f"Numbers have different signs")
-                steps.append(f"Divide absolute values: ${abs(a)} \\div {abs(b)} = {abs(a) // abs(b)}$")
-                steps.append(f"Result is negative: ${a // b}$")
-
-            answer = a // b
+            steps = LazySteps(_vector_divide_steps, {"a": a, "b": b, "answer": answer})
 
     else:  # difficulty == 3
         # Hard: Mixed operations with multiple steps
-        a = random.randint(-10, 10)
-        b = random.randint(-8, 8)
-        c = random.randint(-6, 6)
+        a = rng.randint(-10, 10)
+        b = rng.randint(-8, 8)
+        c = rng.randint(-6, 6)
 
         # Format: a * b + c or a + b * c
-        if random.choice([True, False]):
+        product_first = rng.choice([True, False])
+        if product_first:
             expression = f"{a} \\times {b} + {c}"
-            steps.append(f"Calculate: ${expression}$")
-            steps.append("**Rule:** Follow order of operations (multiplication before addition)")
-
-            mult_result = a * b
-            steps.append(f"**Step 1:** Multiply first: ${a} \\times {b}$")
-            if (a > 0 and b > 0) or (a < 0 and b < 0):
-                steps.append(f"Same signs → positive: ${mult_result}$")
-            else:
-                steps.append(f"Different signs → negative: ${mult_result}$")
-
-            steps.append(f"**Step 2:** Add: ${mult_result} + {c}$")
-            answer = mult_result + c
-            steps.append(f"Result: ${answer}$")
+            answer = a * b + c
         else:
             expression = f"{a} + {b} \\times {c}"
-            steps.append(f"Calculate: ${expression}$")
-            steps.append("**Rule:** Follow order of operations (multiplication before addition)")
+            answer = a + b * c
+        steps = LazySteps(
+            _vector_mixed_steps,
+            {"a": a, "b": b, "c": c, "product_first": product_first, "answer": answer},
+        )
+
+    return GeneratedQuestion(
+        question=f"Calculate: ${expression}$",
+        answer=str(answer),
+        answer_numeric=answer,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+# Step builders shared by generate_integers_operations and the vectorized batches
+def _vector_add_steps(row: Dict[str, Any]) -> List[str]:
+    a, b, answer = row["a"], row["b"], row["answer"]
+    steps = [f"Calculate: ${format_operand(a)} + {format_operand(b)}$", "**Rule:** When adding integers:"]
+    if a >= 0 and b >= 0:
+        steps.append("- Both numbers are positive, so simply add them")
+    elif a < 0 and b < 0:
+        steps.append("- Both numbers are negative, so add their absolute values and keep the negative sign")
+        steps.append(f"$|{a}| + |{b}| = {abs(a)} + {abs(b)} = {abs(a) + abs(b)}$")
+        steps.append(f"Since both are negative: $-{abs(a) + abs(b)}$")
+    else:
+        steps.append("- Numbers have different signs, so subtract the smaller absolute value from the larger")
+        steps.append(f"$|{a}| = {abs(a)}$ and $|{b}| = {abs(b)}$")
+        larger, smaller = (a, b) if abs(a) > abs(b) else (b, a)
+        steps.append(f"Larger absolute value: $|{larger}| = {abs(larger)}$, so result has sign of {larger}")
+        steps.append(f"${abs(larger)} - {abs(smaller)} = {abs(larger) - abs(smaller)}$")
+    steps.append(f"**Final Answer:** ${answer}$")
+    return steps
+
+
+def _vector_subtract_steps(row: Dict[str, Any]) -> List[str]:
+    a, b, answer = row["a"], row["b"], row["answer"]
+    steps = [
+        f"Calculate: ${format_operand(a)} - {format_operand(b)}$",
+        "**Rule:** Subtracting is the same as adding the opposite",
+        f"Rewrite as: ${a} + ({-b})$",
+    ]
+    if b < 0:
+        steps.append(f"Subtracting a negative means adding a positive: ${a} + {abs(b)}$")
+    steps.append(f"Calculate: ${answer}$")
+    steps.append(f"**Final Answer:** ${answer}$")
+    return steps
 
-            mult_result = b * c
-            steps.append(f"**Step 1:** Multiply first: ${b} \\times {c}$")
-            if (b > 0 and c > 0) or (b < 0 and c < 0):
-                steps.append(f"Same signs → positive: ${mult_result}$")
-            else:
-                steps.append(f"Different signs → negative: ${mult_result}$")
 
-            steps.append(f"**Step 2:** Add: ${a} + {mult_result}$")
-            answer = a + mult_result
-            steps.append(f"Result: ${answer}$")
+def _vector_sign_rule_steps(row: Dict[str, Any], gerund: str, verb: str, symbol: str, magnitude: int) -> List[str]:
+    a, b, answer = row["a"], row["b"], row["answer"]
+    same_sign = (a > 0) == (b > 0)
+    return [
+        f"Calculate: ${a} {symbol} {b}$",
+        f"**Rule:** When {gerund} integers:",
+        "- Same signs → positive result",
+        "- Different signs → negative result",
+        "Both numbers have the same sign" if same_sign else "Numbers have different signs",
+        f"{verb} absolute values: ${abs(a)} {symbol} {abs(b)} = {magnitude}$",
+        f"Result is {'positive' if same_sign else 'negative'}: ${answer}$",
+        f"**Final Answer:** ${answer}$",
+    ]
 
-    steps.append(f"**Final Answer:** ${answer}$")
 
-    return {
-        "question": f"Calculate: ${expression}$",
-        "answer": str(answer),
-        "answer_numeric": answer,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+def _vector_multiply_steps(row: Dict[str, Any]) -> List[str]:
+    return _vector_sign_rule_steps(row, "multiplying", "Multiply", "\\times", abs(row["a"]) * abs(row["b"]))
+
+
+def _vector_divide_steps(row: Dict[str, Any]) -> List[str]:
+    return _vector_sign_rule_steps(row, "dividing", "Divide", "\\div", abs(row["a"]) // abs(row["b"]))
+
+
+def _vector_mixed_steps(row: Dict[str, Any]) -> List[str]:
+    a, b, c, answer = row["a"], row["b"], row["c"], row["answer"]
+    if row["product_first"]:
+        expression, x, y = f"{a} \\times {b} + {c}", a, b
+        addition = f"{a * b} + {c}"
+    else:
+        expression, x, y = f"{a} + {b} \\times {c}", b, c
+        addition = f"{a} + {b * c}"
+    sign_rule = "Same signs → positive" if (x > 0 and y > 0) or (x < 0 and y < 0) else "Different signs → negative"
+    return [
+        f"Calculate: ${expression}$",
+        "**Rule:** Follow order of operations (multiplication before addition)",
+        f"**Step 1:** Multiply first: ${x} \\times {y}$",
+        f"{sign_rule}: ${x * y}$",
+        f"**Step 2:** Add: ${addition}$",
+        f"Result: ${answer}$",
+        f"**Final Answer:** ${answer}$",
+    ]
+
+
+# Display columns that wrap negative operands in parentheses
+SIGNED_LABELS = {"a_text": (("a",), format_operand), "b_text": (("b",), format_operand)}
+
+# Vectorized batches (see app.generators.vectorized) cover the expression
+# forms of each difficulty; word problems are only generated one at a time
+VECTORIZED_VARIANTS = {
+    1: (
+        Variant(
+            fields=[("a", int_values(-20, 20)), ("b", int_values(-20, 20))],
+            compute=lambda p: {"answer": p["a"] + p["b"]},
+            question="Calculate: ${a_text} + {b_text}$",
+            labels=SIGNED_LABELS,
+            steps=_vector_add_steps,
+        ),
+        Variant(
+            fields=[("a", int_values(-15, 15)), ("b", int_values(-15, 15))],
+            compute=lambda p: {"answer": p["a"] - p["b"]},
+            question="Calculate: ${a_text} - {b_text}$",
+            labels=SIGNED_LABELS,
+            steps=_vector_subtract_steps,
+        ),
+    ),
+    2: (
+        Variant(
+            fields=[("a", int_values(-12, 12, exclude=(0,))), ("b", int_values(-10, 10, exclude=(0,)))],
+            compute=lambda p: {"answer": p["a"] * p["b"]},
+            question="Calculate: ${a} \\times {b}$",
+            steps=_vector_multiply_steps,
+        ),
+        Variant(
+            fields=[("b", int_values(-8, 8, exclude=(0,))), ("quotient", int_values(-10, 10, exclude=(0,)))],
+            compute=lambda p: {"a": p["b"] * p["quotient"], "answer": p["quotient"]},
+            question="Calculate: ${a} \\div {b}$",
+            steps=_vector_divide_steps,
+        ),
+    ),
+    3: (
+        Variant(
+            fields=[("a", int_values(-10, 10)), ("b", int_values(-8, 8)), ("c", int_values(-6, 6))],
+            compute=lambda p: {"product_first": True, "answer": p["a"] * p["b"] + p["c"]},
+            question="Calculate: ${a} \\times {b} + {c}$",
+            steps=_vector_mixed_steps,
+        ),
+        Variant(
+            fields=[("a", int_values(-10, 10)), ("b", int_values(-8, 8)), ("c", int_values(-6, 6))],
+            compute=lambda p: {"product_first": False, "answer": p["a"] + p["b"] * p["c"]},
+            question="Calculate: ${a} + {b} \\times {c}$",
+            steps=_vector_mixed_steps,
+        ),
+    ),
+}
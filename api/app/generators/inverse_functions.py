@@ -1,7 +1,11 @@
 """Inverse functions question generator."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world applications of inverse functions
 INVERSE_FUNCTION_CONTEXTS = [
@@ -28,24 +32,32 @@ INVERSE_FUNCTION_CONTEXTS = [
 ]
 
 
-def generate_inverse_functions(difficulty: int = 1) -> Dict[str, Any]:
+def generate_inverse_functions(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate an inverse function problem.
 
     Args:
         difficulty: 1 (linear inverses), 2 (verify inverses), 3 (composition verification)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Find inverse of linear function f(x) = ax + b
-        a = random.choice([2, 3, 4, 5])
-        b = random.randint(-5, 5)
+        a = rng.choice([2, 3, 4, 5])
+        b = rng.randint(-5, 5)
 
         # Inverse: f^(-1)(x) = (x - b) / a
         # Evaluate at a specific point
-        x_val = random.randint(1, 10)
+        x_val = rng.randint(1, 10)
         inverse_result = (x_val - b) / a
 
         # Check if result is integer
@@ -57,31 +69,12 @@ def generate_inverse_functions(difficulty: int = 1) -> Dict[str, Any]:
 
         question = f"Given $f(x) = {a}x {b:+d}$, find the inverse function $f^{{-1}}(x)$ and evaluate $f^{{-1}}({x_val})$."
 
-        steps = [
-            "To find the inverse, replace $f(x)$ with $y$:",
-            f"$y = {a}x {b:+d}$",
-            "",
-            "Swap $x$ and $y$:",
-            f"$x = {a}y {b:+d}$",
-            "",
-            "Solve for $y$:",
-            f"$x {-b:+d} = {a}y$",
-            f"$y = \\frac{{x {-b:+d}}}{{{a}}}$",
-            "",
-            f"Therefore, $f^{{-1}}(x) = \\frac{{x {-b:+d}}}{{{a}}}$",
-            "",
-            f"Now evaluate $f^{{-1}}({x_val})$:",
-            f"$f^{{-1}}({x_val}) = \\frac{{{x_val} {-b:+d}}}{{{a}}}$",
-            f"$f^{{-1}}({x_val}) = \\frac{{{x_val - b}}}{{{a}}}$",
-            f"$f^{{-1}}({x_val}) = {answer_numeric}$",
-            "",
-            f"**Final Answer:** ${answer_numeric}$"
-        ]
+        steps = LazySteps(_linear_inverse_steps, a, b, x_val, answer_numeric)
 
     elif difficulty == 2:
         # Medium: Find inverse and verify with composition
-        a = random.choice([2, 3, 4])
-        b = random.randint(-4, 4)
+        a = rng.choice([2, 3, 4])
+        b = rng.randint(-4, 4)
 
         question = f"Find the inverse of $f(x) = {a}x {b:+d}$ and verify that $f(f^{{-1}}(x)) = x$ for $x = {a * 2 + b}$."
 
@@ -89,61 +82,95 @@ def generate_inverse_functions(difficulty: int = 1) -> Dict[str, Any]:
         x_val = a * 2 + b
         inverse_at_x = 2
 
-        steps = [
-            "**Step 1: Find the inverse function**",
-            f"Start with $y = {a}x {b:+d}$",
-            f"Swap $x$ and $y$: $x = {a}y {b:+d}$",
-            f"Solve for $y$: $y = \\frac{{x {-b:+d}}}{{{a}}}$",
-            f"So $f^{{-1}}(x) = \\frac{{x {-b:+d}}}{{{a}}}$",
-            "",
-            "**Step 2: Verify with composition**",
-            f"Calculate $f^{{-1}}({x_val})$:",
-            f"$f^{{-1}}({x_val}) = \\frac{{{x_val} {-b:+d}}}{{{a}}} = \\frac{{{x_val - b}}}{{{a}}} = {inverse_at_x}$",
-            "",
-            f"Now calculate $f(f^{{-1}}({x_val})) = f({inverse_at_x})$:",
-            f"$f({inverse_at_x}) = {a}({inverse_at_x}) {b:+d}$",
-            f"$f({inverse_at_x}) = {a * inverse_at_x} {b:+d}$",
-            f"$f({inverse_at_x}) = {x_val}$",
-            "",
-            f"Since $f(f^{{-1}}({x_val})) = {x_val}$, the functions are inverses.",
-            "",
-            f"**Final Answer:** ${x_val}$"
-        ]
+        steps = LazySteps(_verify_inverse_steps, a, b, x_val, inverse_at_x)
 
         answer_numeric = x_val
 
     else:
         # Hard: Inverse of simple quadratic (restricted domain)
         # f(x) = x² + a for x ≥ 0, find f^(-1)(b) where b > a
-        a = random.randint(1, 4)
-        x_val = random.randint(2, 4)
+        a = rng.randint(1, 4)
+        x_val = rng.randint(2, 4)
         b = x_val ** 2 + a  # This ensures the answer is x_val
 
         question = f"Given $f(x) = x^2 + {a}$ for $x \\geq 0$, find $f^{{-1}}({b})$."
 
-        steps = [
-            "To find the inverse:",
-            f"Start with $y = x^2 + {a}$",
-            f"Swap variables: $x = y^2 + {a}$",
-            f"Solve for $y$: $y^2 = x - {a}$",
-            f"$y = \\sqrt{{x - {a}}}$ (positive root since $x \\geq 0$)",
-            "",
-            f"So $f^{{-1}}(x) = \\sqrt{{x - {a}}}$",
-            "",
-            f"Evaluate $f^{{-1}}({b})$:",
-            f"$f^{{-1}}({b}) = \\sqrt{{{b} - {a}}}$",
-            f"$f^{{-1}}({b}) = \\sqrt{{{b - a}}}$",
-            f"$f^{{-1}}({b}) = {x_val}$",
-            "",
-            f"**Final Answer:** ${x_val}$"
-        ]
+        steps = LazySteps(_quadratic_inverse_steps, a, b, x_val)
 
         answer_numeric = x_val
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _linear_inverse_steps(a: int, b: int, x_val: int, answer_numeric: float) -> List[str]:
+    """Steps for inverting f(x) = ax + b and evaluating the inverse."""
+    return [
+        "To find the inverse, replace $f(x)$ with $y$:",
+        f"$y = {a}x {b:+d}$",
+        "",
+        "Swap $x$ and $y$:",
+        f"$x = {a}y {b:+d}$",
+        "",
+        "Solve for $y$:",
+        f"$x {-b:+d} = {a}y$",
+        f"$y = \\frac{{x {-b:+d}}}{{{a}}}$",
+        "",
+        f"Therefore, $f^{{-1}}(x) = \\frac{{x {-b:+d}}}{{{a}}}$",
+        "",
+        f"Now evaluate $f^{{-1}}({x_val})$:",
+        f"$f^{{-1}}({x_val}) = \\frac{{{x_val} {-b:+d}}}{{{a}}}$",
+        f"$f^{{-1}}({x_val}) = {format_frac(x_val - b, a)}$",
+        f"$f^{{-1}}({x_val}) = {answer_numeric}$",
+        "",
+        f"**Final Answer:** ${answer_numeric}$"
+    ]
+
+
+def _verify_inverse_steps(a: int, b: int, x_val: int, inverse_at_x: int) -> List[str]:
+    """Steps for finding an inverse and checking it by composition."""
+    return [
+        "**Step 1: Find the inverse function**",
+        f"Start with $y = {a}x {b:+d}$",
+        f"Swap $x$ and $y$: $x = {a}y {b:+d}$",
+        f"Solve for $y$: $y = \\frac{{x {-b:+d}}}{{{a}}}$",
+        f"So $f^{{-1}}(x) = \\frac{{x {-b:+d}}}{{{a}}}$",
+        "",
+        "**Step 2: Verify with composition**",
+        f"Calculate $f^{{-1}}({x_val})$:",
+        f"$f^{{-1}}({x_val}) = \\frac{{{x_val} {-b:+d}}}{{{a}}} = {format_frac(x_val - b, a)} = {inverse_at_x}$",
+        "",
+        f"Now calculate $f(f^{{-1}}({x_val})) = f({inverse_at_x})$:",
+        f"$f({inverse_at_x}) = {a}({inverse_at_x}) {b:+d}$",
+        f"$f({inverse_at_x}) = {a * inverse_at_x} {b:+d}$",
+        f"$f({inverse_at_x}) = {x_val}$",
+        "",
+        f"Since $f(f^{{-1}}({x_val})) = {x_val}$, the functions are inverses.",
+        "",
+        f"**Final Answer:** ${x_val}$"
+    ]
+
+
+def _quadratic_inverse_steps(a: int, b: int, x_val: int) -> List[str]:
+    """Steps for inverting a quadratic on a restricted domain."""
+    return [
+        "To find the inverse:",
+        f"Start with $y = x^2 + {a}$",
+        f"Swap variables: $x = y^2 + {a}$",
+        f"Solve for $y$: $y^2 = x - {a}$",
+        f"$y = \\sqrt{{x - {a}}}$ (positive root since $x \\geq 0$)",
+        "",
+        f"So $f^{{-1}}(x) = \\sqrt{{x - {a}}}$",
+        "",
+        f"Evaluate $f^{{-1}}({b})$:",
+        f"$f^{{-1}}({b}) = \\sqrt{{{b} - {a}}}$",
+        f"$f^{{-1}}({b}) = \\sqrt{{{b - a}}}$",
+        f"$f^{{-1}}({b}) = {x_val}$",
+        "",
+        f"**Final Answer:** ${x_val}$"
+    ]
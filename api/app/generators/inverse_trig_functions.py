@@ -2,7 +2,10 @@
 
 import random
 import math
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for inverse trigonometric functions
 WORD_PROBLEMS = [
@@ -29,19 +32,27 @@ WORD_PROBLEMS = [
 ]
 
 
-def generate_inverse_trig_functions(difficulty: int = 1) -> Dict[str, Any]:
+def generate_inverse_trig_functions(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate problems about inverse trigonometric functions.
 
     Args:
         difficulty: 1 (evaluate at standard values), 2 (compositions), 3 (solve equations)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Evaluate inverse trig functions at standard values
-        use_word_problem = random.random() < 0.4
+        use_word_problem = rng.random() < 0.4
         inv_values = [
             ("arcsin", 0, 0, "0"),
             ("arcsin", 0.5, 30, "\\frac{1}{2}"),
@@ -60,7 +71,7 @@ def generate_inverse_trig_functions(difficulty: int = 1) -> Dict[str, Any]:
             ("arctan", 1/math.sqrt(3), 30, "\\frac{1}{\\sqrt{3}}"),
         ]
 
-        func, value, degrees, value_str = random.choice(inv_values)
+        func, value, degrees, value_str = rng.choice(inv_values)
 
         func_name = func[3:]  # "sin", "cos", or "tan"
 
@@ -69,46 +80,7 @@ def generate_inverse_trig_functions(difficulty: int = 1) -> Dict[str, Any]:
         else:
             question = f"Evaluate $\\{func}({value_str})$ in degrees."
 
-        steps = [
-            f"**Understanding the inverse function:**",
-            f"$\\{func}(x)$ asks: 'What angle has a {func_name} of $x$?'",
-            f"In other words: $\\{func}({value_str})$ means: Find $\\theta$ where $\\{func_name}(\\theta) = {value_str}$",
-            "",
-        ]
-
-        if func == "arcsin":
-            steps.append(f"**Setting up the equation:**")
-            steps.append(f"We need: $\\sin(\\theta) = {value_str}$")
-            steps.append("")
-            steps.append(f"**Looking up the unit circle:**")
-            steps.append(f"From memory or the unit circle, $\\sin({degrees}°) = {value_str}$")
-            steps.append("")
-            steps.append(f"**Checking the range:**")
-            steps.append(f"Arcsin has a range of $[-90°, 90°]$ (also written as $[-\\frac{{\\pi}}{{2}}, \\frac{{\\pi}}{{2}}]$)")
-            steps.append(f"Since ${degrees}°$ is in this range, it's our answer.")
-        elif func == "arccos":
-            steps.append(f"**Setting up the equation:**")
-            steps.append(f"We need: $\\cos(\\theta) = {value_str}$")
-            steps.append("")
-            steps.append(f"**Looking up the unit circle:**")
-            steps.append(f"From memory or the unit circle, $\\cos({degrees}°) = {value_str}$")
-            steps.append("")
-            steps.append(f"**Checking the range:**")
-            steps.append(f"Arccos has a range of $[0°, 180°]$ (also written as $[0, \\pi]$)")
-            steps.append(f"Since ${degrees}°$ is in this range, it's our answer.")
-        else:  # arctan
-            steps.append(f"**Setting up the equation:**")
-            steps.append(f"We need: $\\tan(\\theta) = {value_str}$")
-            steps.append("")
-            steps.append(f"**Looking up the unit circle:**")
-            steps.append(f"From memory or the unit circle, $\\tan({degrees}°) = {value_str}$")
-            steps.append("")
-            steps.append(f"**Checking the range:**")
-            steps.append(f"Arctan has a range of $(-90°, 90°)$ (also written as $(-\\frac{{\\pi}}{{2}}, \\frac{{\\pi}}{{2}})$)")
-            steps.append(f"Since ${degrees}°$ is in this range, it's our answer.")
-
-        steps.append("")
-        steps.append(f"**Final Answer:** ${degrees}°$")
+        steps = LazySteps(_evaluate_steps, func_name, value_str, func, degrees)
 
         answer_numeric = degrees
 
@@ -121,10 +93,10 @@ def generate_inverse_trig_functions(difficulty: int = 1) -> Dict[str, Any]:
             "nested"
         ]
 
-        comp_type = random.choice(composition_types)
+        comp_type = rng.choice(composition_types)
 
         if comp_type == "sin_arcsin":
-            value = random.choice([0.5, math.sqrt(2)/2, math.sqrt(3)/2])
+            value = rng.choice([0.5, math.sqrt(2)/2, math.sqrt(3)/2])
 
             if value == 0.5:
                 value_str = "\\frac{1}{2}"
@@ -135,17 +107,12 @@ def generate_inverse_trig_functions(difficulty: int = 1) -> Dict[str, Any]:
 
             question = f"Evaluate $\\sin(\\arcsin({value_str}))$."
 
-            steps = [
-                "Recall the composition property: $\\sin(\\arcsin(x)) = x$ for $x \\in [-1, 1]$",
-                f"Since ${value_str}$ is in the domain of arcsin:",
-                f"$\\sin(\\arcsin({value_str})) = {value_str}$",
-                f"**Final Answer:** ${value_str}$"
-            ]
+            steps = LazySteps(_sin_arcsin_steps, value_str)
 
             answer_numeric = round(value, 4)
 
         elif comp_type == "arcsin_sin":
-            angle = random.choice([30, 45, 60])
+            angle = rng.choice([30, 45, 60])
 
             if angle == 30:
                 result_str = "30"
@@ -159,18 +126,12 @@ def generate_inverse_trig_functions(difficulty: int = 1) -> Dict[str, Any]:
 
             question = f"Evaluate $\\arcsin(\\sin({angle}°))$ in degrees."
 
-            steps = [
-                f"First, evaluate the inner function: $\\sin({angle}°)$",
-                f"Since ${angle}°$ is in the range of arcsin $[-90°, 90°]$:",
-                f"$\\arcsin(\\sin({angle}°)) = {angle}°$",
-                "This works because arcsin 'undoes' sin when the angle is in range",
-                f"**Final Answer:** ${angle}°$"
-            ]
+            steps = LazySteps(_arcsin_sin_steps, angle)
 
             answer_numeric = angle
 
         elif comp_type == "cos_arccos":
-            value = random.choice([0.5, math.sqrt(2)/2, math.sqrt(3)/2])
+            value = rng.choice([0.5, math.sqrt(2)/2, math.sqrt(3)/2])
 
             if value == 0.5:
                 value_str = "\\frac{1}{2}"
@@ -181,12 +142,7 @@ def generate_inverse_trig_functions(difficulty: int = 1) -> Dict[str, Any]:
 
             question = f"Evaluate $\\cos(\\arccos({value_str}))$."
 
-            steps = [
-                "Recall the composition property: $\\cos(\\arccos(x)) = x$ for $x \\in [-1, 1]$",
-                f"Since ${value_str}$ is in the domain of arccos:",
-                f"$\\cos(\\arccos({value_str})) = {value_str}$",
-                f"**Final Answer:** ${value_str}$"
-            ]
+            steps = LazySteps(_cos_arccos_steps, value_str)
 
             answer_numeric = round(value, 4)
 
@@ -219,10 +175,10 @@ def generate_inverse_trig_functions(difficulty: int = 1) -> Dict[str, Any]:
             "composition_equation"
         ]
 
-        eq_type = random.choice(equation_types)
+        eq_type = rng.choice(equation_types)
 
         if eq_type == "simple_arcsin":
-            angle = random.choice([30, 45, 60])
+            angle = rng.choice([30, 45, 60])
 
             if angle == 30:
                 answer_str = "\\frac{1}{2}"
@@ -236,14 +192,7 @@ def generate_inverse_trig_functions(difficulty: int = 1) -> Dict[str, Any]:
 
             question = f"Solve for $x$: $\\arcsin(x) = {angle}°$"
 
-            steps = [
-                "Take the sine of both sides:",
-                f"$\\sin(\\arcsin(x)) = \\sin({angle}°)$",
-                f"The left side simplifies to $x$:",
-                f"$x = \\sin({angle}°)$",
-                f"From the unit circle: $\\sin({angle}°) = {answer_str}$",
-                f"**Final Answer:** $x = {answer_str}$"
-            ]
+            steps = LazySteps(_solve_arcsin_steps, angle, answer_str)
 
             answer_numeric = round(answer_val, 4)
 
@@ -279,10 +228,98 @@ def generate_inverse_trig_functions(difficulty: int = 1) -> Dict[str, Any]:
 
             answer_numeric = round(math.sqrt(2)/2, 4)
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _evaluate_steps(func_name: str, value_str: str, func: str, degrees: int) -> List[str]:
+    """Steps for evaluating an inverse trig function at a standard value."""
+    steps = [
+        f"**Understanding the inverse function:**",
+        f"$\\{func}(x)$ asks: 'What angle has a {func_name} of $x$?'",
+        f"In other words: $\\{func}({value_str})$ means: Find $\\theta$ where $\\{func_name}(\\theta) = {value_str}$",
+        "",
+    ]
+
+    if func == "arcsin":
+        steps.append(f"**Setting up the equation:**")
+        steps.append(f"We need: $\\sin(\\theta) = {value_str}$")
+        steps.append("")
+        steps.append(f"**Looking up the unit circle:**")
+        steps.append(f"From memory or the unit circle, $\\sin({degrees}°) = {value_str}$")
+        steps.append("")
+        steps.append(f"**Checking the range:**")
+        steps.append(f"Arcsin has a range of $[-90°, 90°]$ (also written as $[-\\frac{{\\pi}}{{2}}, \\frac{{\\pi}}{{2}}]$)")
+        steps.append(f"Since ${degrees}°$ is in this range, it's our answer.")
+    elif func == "arccos":
+        steps.append(f"**Setting up the equation:**")
+        steps.append(f"We need: $\\cos(\\theta) = {value_str}$")
+        steps.append("")
+        steps.append(f"**Looking up the unit circle:**")
+        steps.append(f"From memory or the unit circle, $\\cos({degrees}°) = {value_str}$")
+        steps.append("")
+        steps.append(f"**Checking the range:**")
+        steps.append(f"Arccos has a range of $[0°, 180°]$ (also written as $[0, \\pi]$)")
+        steps.append(f"Since ${degrees}°$ is in this range, it's our answer.")
+    else:  # arctan
+        steps.append(f"**Setting up the equation:**")
+        steps.append(f"We need: $\\tan(\\theta) = {value_str}$")
+        steps.append("")
+        steps.append(f"**Looking up the unit circle:**")
+        steps.append(f"From memory or the unit circle, $\\tan({degrees}°) = {value_str}$")
+        steps.append("")
+        steps.append(f"**Checking the range:**")
+        steps.append(f"Arctan has a range of $(-90°, 90°)$ (also written as $(-\\frac{{\\pi}}{{2}}, \\frac{{\\pi}}{{2}})$)")
+        steps.append(f"Since ${degrees}°$ is in this range, it's our answer.")
+
+    steps.append("")
+    steps.append(f"**Final Answer:** ${degrees}°$")
+    return steps
+
+
+def _sin_arcsin_steps(value_str: str) -> List[str]:
+    """Steps for sin(arcsin(x))."""
+    return [
+        "Recall the composition property: $\\sin(\\arcsin(x)) = x$ for $x \\in [-1, 1]$",
+        f"Since ${value_str}$ is in the domain of arcsin:",
+        f"$\\sin(\\arcsin({value_str})) = {value_str}$",
+        f"**Final Answer:** ${value_str}$"
+    ]
+
+
+def _arcsin_sin_steps(angle: int) -> List[str]:
+    """Steps for arcsin(sin(angle))."""
+    return [
+        f"First, evaluate the inner function: $\\sin({angle}°)$",
+        f"Since ${angle}°$ is in the range of arcsin $[-90°, 90°]$:",
+        f"$\\arcsin(\\sin({angle}°)) = {angle}°$",
+        "This works because arcsin 'undoes' sin when the angle is in range",
+        f"**Final Answer:** ${angle}°$"
+    ]
+
+
+def _cos_arccos_steps(value_str: str) -> List[str]:
+    """Steps for cos(arccos(x))."""
+    return [
+        "Recall the composition property: $\\cos(\\arccos(x)) = x$ for $x \\in [-1, 1]$",
+        f"Since ${value_str}$ is in the domain of arccos:",
+        f"$\\cos(\\arccos({value_str})) = {value_str}$",
+        f"**Final Answer:** ${value_str}$"
+    ]
+
+
+def _solve_arcsin_steps(angle: int, answer_str: str) -> List[str]:
+    """Steps for solving arcsin(x) = angle."""
+    return [
+        "Take the sine of both sides:",
+        f"$\\sin(\\arcsin(x)) = \\sin({angle}°)$",
+        f"The left side simplifies to $x$:",
+        f"$x = \\sin({angle}°)$",
+        f"From the unit circle: $\\sin({angle}°) = {answer_str}$",
+        f"**Final Answer:** $x = {answer_str}$"
+    ]
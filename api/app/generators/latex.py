@@ -0,0 +1,169 @@
+"""
+Memoized LaTeX formatters shared by the question generators.
+
+Generators format the same small objects over and over: a term like 3x^2,
+a signed term or operand, a fraction, a mixed number or a radical, with
+values from narrow ranges.
+Those atoms are wrapped in a bounded LRU cache, so a repeated input costs
+one dict lookup instead of rebuilding the string. Composite objects
+(polynomials, equations, matrices) are assembled from the cached atoms but
+not cached themselves: they rarely repeat, and a cache miss costs more
+than building the string (run benchmarks/latex.py to compare).
+
+cache_stats() reports hits, misses and size per formatter; it is exposed
+to admins at GET /admin/latex-cache.
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Sequence, Union
+
+Number = Union[int, Fraction]
+
+# Default bound on the number of cached strings per formatter
+CACHE_SIZE = 4096
+
+_FORMATTERS: List[Callable[..., str]] = []
+
+
+def memoized(maxsize: int = CACHE_SIZE) -> Callable[[Callable[..., str]], Callable[..., str]]:
+    """Wrap a formatter in a bounded LRU cache and register it for cache_stats()."""
+    def decorator(func: Callable[..., str]) -> Callable[..., str]:
+        # typed, so 2 and 2.0 (which format differently) are cached separately
+        cached = lru_cache(maxsize=maxsize, typed=True)(func)
+        _FORMATTERS.append(cached)
+        return cached
+    return decorator
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss counts, hit rate and size of every formatter cache."""
+    formatters = {}
+    total_hits = total_misses = 0
+    for formatter in _FORMATTERS:
+        info = formatter.cache_info()
+        calls = info.hits + info.misses
+        formatters[formatter.__name__] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / calls, 4) if calls else 0.0,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+        total_hits += info.hits
+        total_misses += info.misses
+    calls = total_hits + total_misses
+    return {
+        "hits": total_hits,
+        "misses": total_misses,
+        "hit_rate": round(total_hits / calls, 4) if calls else 0.0,
+        "formatters": formatters,
+    }
+
+
+def clear_caches() -> None:
+    """Empty every formatter cache and reset its counters."""
+    for formatter in _FORMATTERS:
+        formatter.cache_clear()
+
+
+def _number(value: Number) -> str:
+    """An int, or a Fraction as \\frac{}{} with its sign in front."""
+    if type(value) is int or value.denominator == 1:
+        return str(int(value))
+    sign = "-" if value < 0 else ""
+    return f"{sign}\\frac{{{abs(value.numerator)}}}{{{value.denominator}}}"
+
+
+@memoized()
+def format_term(coeff: Number, degree: int, var: str = "x") -> str:
+    """A single term with its sign attached, e.g. "-3x^2", "x", "5"."""
+    number = _number(coeff)
+    if degree == 0:
+        return number
+    variable = var if degree == 1 else f"{var}^{degree}"
+    if number == "1":
+        return variable
+    if number == "-1":
+        return "-" + variable
+    return number + variable
+
+
+@memoized()
+def format_signed(coeff: Number, degree: int = 0, var: str = "x") -> str:
+    """A term with a spaced sign for joining onto an expression, e.g. "+ 3", "- 2x"."""
+    if coeff < 0:
+        return "- " + format_term(-coeff, degree, var)
+    return "+ " + format_term(coeff, degree, var)
+
+
+@memoized()
+def format_operand(value: Number) -> str:
+    """A number as an operand, parenthesized when negative, e.g. "(-3)" in 5 - (-3)."""
+    number = _number(value)
+    return f"({number})" if value < 0 else number
+
+
+def format_polynomial(coeffs: Sequence[Number], var: str = "x") -> str:
+    """
+    A polynomial from ascending coefficients (coeffs[i] for var^i).
+
+    Zero terms are skipped and signs are spaced, e.g. "2x^2 - x + 3"; all
+    zeros give "0".
+    """
+    parts = []
+    for degree in range(len(coeffs) - 1, -1, -1):
+        coeff = coeffs[degree]
+        if not coeff:
+            continue
+        parts.append(format_signed(coeff, degree, var) if parts else format_term(coeff, degree, var))
+    return " ".join(parts) if parts else "0"
+
+
+def format_quadratic(a: int, b: int, c: int, var: str = "x") -> str:
+    """ax^2 + bx + c with the x^2 term always shown, e.g. "x^2 - 5x + 6"."""
+    return format_polynomial((c, b, a), var)
+
+
+def format_linear_equation(a: int, b: int, c: int, var1: str = "x", var2: str = "y") -> str:
+    """a·var1 + b·var2 = c with the first term always shown, e.g. "2x - y = 7"."""
+    equation = format_term(a, 1, var1)
+    if b:
+        equation += " " + format_signed(b, 1, var2)
+    return f"{equation} = {c}"
+
+
+@memoized()
+def format_frac(numerator: Any, denominator: Any) -> str:
+    """\\frac{numerator}{denominator} for already formatted or plain parts."""
+    return f"\\frac{{{numerator}}}{{{denominator}}}"
+
+
+@memoized()
+def format_fraction(value: Number) -> str:
+    """A Fraction in lowest terms: "3" when whole, otherwise "\\frac{3}{4}" (sign in front)."""
+    return _number(Fraction(value))
+
+
+@memoized()
+def format_mixed_number(whole: int, numerator: int, denominator: int) -> str:
+    """A mixed number such as 2\\frac{1}{3}."""
+    return f"{whole}\\frac{{{numerator}}}{{{denominator}}}"
+
+
+@memoized()
+def format_radical(radicand: Any, coefficient: Any = 1, index: int = 2) -> str:
+    """coefficient·√radicand, e.g. "3\\sqrt{2}", "\\sqrt{5}", "\\sqrt[3]{4}"."""
+    root = f"\\sqrt{{{radicand}}}" if index == 2 else f"\\sqrt[{index}]{{{radicand}}}"
+    if coefficient == 1:
+        return root
+    if coefficient == -1:
+        return "-" + root
+    return f"{coefficient}{root}"
+
+
+def format_matrix(rows: Sequence[Sequence[Any]], env: str = "bmatrix") -> str:
+    """A matrix from its rows, e.g. \\begin{bmatrix} 1 & 2 \\\\ 3 & 4 \\end{bmatrix}."""
+    body = " \\\\ ".join(" & ".join(str(entry) for entry in row) for row in rows)
+    return f"\\begin{{{env}}} {body} \\end{{{env}}}"
+
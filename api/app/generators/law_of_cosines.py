@@ -2,7 +2,11 @@
 
 import random
 import math
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for Law of Cosines problems
 WORD_PROBLEMS = [
@@ -29,22 +33,30 @@ WORD_PROBLEMS = [
 ]
 
 
-def generate_law_of_cosines(difficulty: int = 1) -> Dict[str, Any]:
+def generate_law_of_cosines(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate Law of Cosines problems.
 
     Args:
         difficulty: 1 (find side, SAS case), 2 (find angle, SSS case), 3 (word problems)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Find the third side given two sides and included angle (SAS)
-        use_word_problem = random.random() < 0.4
-        side_a = random.choice([8, 10, 12, 15])
-        side_b = random.choice([10, 12, 15, 18])
-        angle_C = random.choice([60, 90, 120])
+        use_word_problem = rng.random() < 0.4
+        side_a = rng.choice([8, 10, 12, 15])
+        side_b = rng.choice([10, 12, 15, 18])
+        angle_C = rng.choice([60, 90, 120])
 
         # Calculate side c using Law of Cosines: c² = a² + b² - 2ab*cos(C)
         cos_C = math.cos(math.radians(angle_C))
@@ -56,33 +68,7 @@ def generate_law_of_cosines(difficulty: int = 1) -> Dict[str, Any]:
         else:
             question = f"In triangle $ABC$, side $a = {side_a}$, side $b = {side_b}$, and angle $C = {angle_C}°$. Find side $c$."
 
-        steps = [
-            f"**Step 1 - Recall the Law of Cosines:**",
-            f"This law is used when you know two sides and the included angle (SAS case).",
-            f"Formula: $c^2 = a^2 + b^2 - 2ab\\cos(C)$",
-            "",
-            f"**Step 2 - Identify the known values:**",
-            f"- Side $a = {side_a}$",
-            f"- Side $b = {side_b}$",
-            f"- Included angle $C = {angle_C}°$ (the angle between sides $a$ and $b$)",
-            f"- We need to find: Side $c$ (opposite to angle $C$)",
-            "",
-            f"**Step 3 - Substitute into the formula:**",
-            f"$c^2 = ({side_a})^2 + ({side_b})^2 - 2({side_a})({side_b})\\cos({angle_C}°)$",
-            "",
-            f"**Step 4 - Calculate the components:**",
-            f"$c^2 = {side_a**2} + {side_b**2} - {2*side_a*side_b} \\cdot \\cos({angle_C}°)$",
-            f"$\\cos({angle_C}°) = {round(cos_C, 4)}$",
-            "",
-            f"**Step 5 - Complete the arithmetic:**",
-            f"$c^2 = {side_a**2} + {side_b**2} - {round(2*side_a*side_b*cos_C, 2)}$",
-            f"$c^2 = {round(side_c_squared, 2)}$",
-            "",
-            f"**Step 6 - Take the square root:**",
-            f"$c = \\sqrt{{{round(side_c_squared, 2)}}} \\approx {round(side_c, 2)}$",
-            "",
-            f"**Final Answer:** $c \\approx {round(side_c, 2)}$ units"
-        ]
+        steps = LazySteps(_sas_steps, side_a, side_b, angle_C, cos_C, side_c_squared, side_c)
 
         answer_numeric = round(side_c, 2)
 
@@ -97,7 +83,7 @@ def generate_law_of_cosines(difficulty: int = 1) -> Dict[str, Any]:
             (9, 12, 15)
         ]
 
-        side_a, side_b, side_c = random.choice(triples)
+        side_a, side_b, side_c = rng.choice(triples)
 
         # Find angle C (opposite to side c) using Law of Cosines
         # cos(C) = (a² + b² - c²) / (2ab)
@@ -106,32 +92,20 @@ def generate_law_of_cosines(difficulty: int = 1) -> Dict[str, Any]:
 
         question = f"In triangle $ABC$, side $a = {side_a}$, side $b = {side_b}$, and side $c = {side_c}$. Find angle $C$ (opposite to side $c$)."
 
-        steps = [
-            "Use the Law of Cosines to find the angle:",
-            "$\\cos(C) = \\frac{a^2 + b^2 - c^2}{2ab}$",
-            f"Substitute the known values:",
-            f"$\\cos(C) = \\frac{{{side_a}^2 + {side_b}^2 - {side_c}^2}}{{2({side_a})({side_b})}}$",
-            f"Calculate:",
-            f"$\\cos(C) = \\frac{{{side_a**2} + {side_b**2} - {side_c**2}}}{{{2*side_a*side_b}}}$",
-            f"$\\cos(C) = \\frac{{{side_a**2 + side_b**2 - side_c**2}}}{{{2*side_a*side_b}}}$",
-            f"$\\cos(C) = {round(cos_C, 4)}$",
-            f"Take the inverse cosine: $C = \\arccos({round(cos_C, 4)})$",
-            f"$C \\approx {round(angle_C, 2)}°$",
-            f"**Final Answer:** $C \\approx {round(angle_C, 2)}°$"
-        ]
+        steps = LazySteps(_sss_steps, side_a, side_b, side_c, cos_C, angle_C)
 
         answer_numeric = round(angle_C, 2)
 
     else:
         # Hard: Word problems involving Law of Cosines
         problem_types = ["navigation", "distance", "surveying"]
-        problem_type = random.choice(problem_types)
+        problem_type = rng.choice(problem_types)
 
         if problem_type == "navigation":
             # Boat or plane navigation problem
-            dist1 = random.choice([100, 120, 150])
-            dist2 = random.choice([80, 100, 120])
-            angle = random.choice([60, 75, 90, 120])
+            dist1 = rng.choice([100, 120, 150])
+            dist2 = rng.choice([80, 100, 120])
+            angle = rng.choice([60, 75, 90, 120])
 
             # Calculate direct distance using Law of Cosines
             cos_angle = math.cos(math.radians(angle))
@@ -140,28 +114,15 @@ def generate_law_of_cosines(difficulty: int = 1) -> Dict[str, Any]:
 
             question = f"A plane flies ${dist1}$ km north, then turns and flies ${dist2}$ km in a direction ${angle}°$ from its original path. How far is the plane from its starting point?"
 
-            steps = [
-                "This forms a triangle where:",
-                f"- First leg: ${dist1}$ km",
-                f"- Second leg: ${dist2}$ km",
-                f"- Angle between the two legs: ${angle}°$",
-                "Use the Law of Cosines to find the direct distance $d$:",
-                f"$d^2 = {dist1}^2 + {dist2}^2 - 2({dist1})({dist2})\\cos({angle}°)$",
-                f"Calculate:",
-                f"$d^2 = {dist1**2} + {dist2**2} - {2*dist1*dist2} \\cdot {round(cos_angle, 4)}$",
-                f"$d^2 = {dist1**2} + {dist2**2} - {round(2*dist1*dist2*cos_angle, 2)}$",
-                f"$d^2 = {round(distance_squared, 2)}$",
-                f"$d = \\sqrt{{{round(distance_squared, 2)}}} \\approx {round(distance, 2)}$ km",
-                f"**Final Answer:** ${round(distance, 2)}$ km"
-            ]
+            steps = LazySteps(_navigation_steps, dist1, dist2, angle, cos_angle, distance_squared, distance)
 
             answer_numeric = round(distance, 2)
 
         elif problem_type == "distance":
             # Distance between two points problem
-            dist_A = random.choice([40, 50, 60])
-            dist_B = random.choice([30, 40, 50])
-            angle = random.choice([45, 60, 90])
+            dist_A = rng.choice([40, 50, 60])
+            dist_B = rng.choice([30, 40, 50])
+            angle = rng.choice([45, 60, 90])
 
             cos_angle = math.cos(math.radians(angle))
             distance_squared = dist_A**2 + dist_B**2 - 2*dist_A*dist_B*cos_angle
@@ -169,18 +130,7 @@ def generate_law_of_cosines(difficulty: int = 1) -> Dict[str, Any]:
 
             question = f"Two hikers start from the same point. One walks ${dist_A}$ meters in one direction, and the other walks ${dist_B}$ meters in a direction ${angle}°$ from the first. How far apart are they?"
 
-            steps = [
-                "This creates a triangle with:",
-                f"- Side 1: ${dist_A}$ meters",
-                f"- Side 2: ${dist_B}$ meters",
-                f"- Included angle: ${angle}°$",
-                "Use the Law of Cosines:",
-                f"$d^2 = {dist_A}^2 + {dist_B}^2 - 2({dist_A})({dist_B})\\cos({angle}°)$",
-                f"$d^2 = {dist_A**2} + {dist_B**2} - {2*dist_A*dist_B} \\cdot {round(cos_angle, 4)}$",
-                f"$d^2 \\approx {round(distance_squared, 2)}$",
-                f"$d \\approx {round(distance, 2)}$ meters",
-                f"**Final Answer:** ${round(distance, 2)}$ meters"
-            ]
+            steps = LazySteps(_hikers_steps, dist_A, dist_B, angle, cos_angle, distance_squared, distance)
 
             answer_numeric = round(distance, 2)
 
@@ -195,25 +145,115 @@ def generate_law_of_cosines(difficulty: int = 1) -> Dict[str, Any]:
 
             question = f"A baseball diamond is a square with sides of ${side1}$ feet. What is the distance from home plate to second base (diagonally across)?"
 
-            steps = [
-                "This forms a right triangle (actually, an isosceles right triangle)",
-                f"- Two sides: ${side1}$ feet each",
-                f"- Included angle: ${angle}°$",
-                "Use the Law of Cosines:",
-                f"$d^2 = {side1}^2 + {side2}^2 - 2({side1})({side2})\\cos({angle}°)$",
-                f"Since $\\cos(90°) = 0$:",
-                f"$d^2 = {side1**2} + {side2**2} - 0$",
-                f"$d^2 = {side1**2 + side2**2}$",
-                f"$d = \\sqrt{{{side1**2 + side2**2}}} = {side1}\\sqrt{{2}} \\approx {round(distance, 2)}$ feet",
-                f"**Final Answer:** ${round(distance, 2)}$ feet"
-            ]
+            steps = LazySteps(_diagonal_steps, side1, side2, angle, distance)
 
             answer_numeric = round(distance, 2)
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _sas_steps(side_a: int, side_b: int, angle_C: int, cos_C: float, side_c_squared: float,
+               side_c: float) -> List[str]:
+    """Steps for the third side of a triangle from two sides and the included angle."""
+    return [
+        f"**Step 1 - Recall the Law of Cosines:**",
+        f"This law is used when you know two sides and the included angle (SAS case).",
+        f"Formula: $c^2 = a^2 + b^2 - 2ab\\cos(C)$",
+        "",
+        f"**Step 2 - Identify the known values:**",
+        f"- Side $a = {side_a}$",
+        f"- Side $b = {side_b}$",
+        f"- Included angle $C = {angle_C}°$ (the angle between sides $a$ and $b$)",
+        f"- We need to find: Side $c$ (opposite to angle $C$)",
+        "",
+        f"**Step 3 - Substitute into the formula:**",
+        f"$c^2 = ({side_a})^2 + ({side_b})^2 - 2({side_a})({side_b})\\cos({angle_C}°)$",
+        "",
+        f"**Step 4 - Calculate the components:**",
+        f"$c^2 = {side_a**2} + {side_b**2} - {2*side_a*side_b} \\cdot \\cos({angle_C}°)$",
+        f"$\\cos({angle_C}°) = {round(cos_C, 4)}$",
+        "",
+        f"**Step 5 - Complete the arithmetic:**",
+        f"$c^2 = {side_a**2} + {side_b**2} - {round(2*side_a*side_b*cos_C, 2)}$",
+        f"$c^2 = {round(side_c_squared, 2)}$",
+        "",
+        f"**Step 6 - Take the square root:**",
+        f"$c = \\sqrt{{{round(side_c_squared, 2)}}} \\approx {round(side_c, 2)}$",
+        "",
+        f"**Final Answer:** $c \\approx {round(side_c, 2)}$ units"
+    ]
+
+
+def _sss_steps(side_a: int, side_b: int, side_c: int, cos_C: float, angle_C: float) -> List[str]:
+    """Steps for an angle of a triangle from its three sides."""
+    return [
+        "Use the Law of Cosines to find the angle:",
+        "$\\cos(C) = \\frac{a^2 + b^2 - c^2}{2ab}$",
+        f"Substitute the known values:",
+        f"$\\cos(C) = \\frac{{{side_a}^2 + {side_b}^2 - {side_c}^2}}{{2({side_a})({side_b})}}$",
+        f"Calculate:",
+        f"$\\cos(C) = \\frac{{{side_a**2} + {side_b**2} - {side_c**2}}}{{{2*side_a*side_b}}}$",
+        f"$\\cos(C) = {format_frac(side_a**2 + side_b**2 - side_c**2, 2*side_a*side_b)}$",
+        f"$\\cos(C) = {round(cos_C, 4)}$",
+        f"Take the inverse cosine: $C = \\arccos({round(cos_C, 4)})$",
+        f"$C \\approx {round(angle_C, 2)}°$",
+        f"**Final Answer:** $C \\approx {round(angle_C, 2)}°$"
+    ]
+
+
+def _navigation_steps(dist1: int, dist2: int, angle: int, cos_angle: float,
+                      distance_squared: float, distance: float) -> List[str]:
+    """Steps for the direct distance after a two-leg flight."""
+    return [
+        "This forms a triangle where:",
+        f"- First leg: ${dist1}$ km",
+        f"- Second leg: ${dist2}$ km",
+        f"- Angle between the two legs: ${angle}°$",
+        "Use the Law of Cosines to find the direct distance $d$:",
+        f"$d^2 = {dist1}^2 + {dist2}^2 - 2({dist1})({dist2})\\cos({angle}°)$",
+        f"Calculate:",
+        f"$d^2 = {dist1**2} + {dist2**2} - {2*dist1*dist2} \\cdot {round(cos_angle, 4)}$",
+        f"$d^2 = {dist1**2} + {dist2**2} - {round(2*dist1*dist2*cos_angle, 2)}$",
+        f"$d^2 = {round(distance_squared, 2)}$",
+        f"$d = \\sqrt{{{round(distance_squared, 2)}}} \\approx {round(distance, 2)}$ km",
+        f"**Final Answer:** ${round(distance, 2)}$ km"
+    ]
+
+
+def _hikers_steps(dist_A: int, dist_B: int, angle: int, cos_angle: float,
+                  distance_squared: float, distance: float) -> List[str]:
+    """Steps for the distance between two hikers who set off at an angle."""
+    return [
+        "This creates a triangle with:",
+        f"- Side 1: ${dist_A}$ meters",
+        f"- Side 2: ${dist_B}$ meters",
+        f"- Included angle: ${angle}°$",
+        "Use the Law of Cosines:",
+        f"$d^2 = {dist_A}^2 + {dist_B}^2 - 2({dist_A})({dist_B})\\cos({angle}°)$",
+        f"$d^2 = {dist_A**2} + {dist_B**2} - {2*dist_A*dist_B} \\cdot {round(cos_angle, 4)}$",
+        f"$d^2 \\approx {round(distance_squared, 2)}$",
+        f"$d \\approx {round(distance, 2)}$ meters",
+        f"**Final Answer:** ${round(distance, 2)}$ meters"
+    ]
+
+
+def _diagonal_steps(side1: int, side2: int, angle: int, distance: float) -> List[str]:
+    """Steps for the diagonal of a baseball diamond."""
+    return [
+        "This forms a right triangle (actually, an isosceles right triangle)",
+        f"- Two sides: ${side1}$ feet each",
+        f"- Included angle: ${angle}°$",
+        "Use the Law of Cosines:",
+        f"$d^2 = {side1}^2 + {side2}^2 - 2({side1})({side2})\\cos({angle}°)$",
+        f"Since $\\cos(90°) = 0$:",
+        f"$d^2 = {side1**2} + {side2**2} - 0$",
+        f"$d^2 = {side1**2 + side2**2}$",
+        f"$d = \\sqrt{{{side1**2 + side2**2}}} = {side1}\\sqrt{{2}} \\approx {round(distance, 2)}$ feet",
+        f"**Final Answer:** ${round(distance, 2)}$ feet"
+    ]
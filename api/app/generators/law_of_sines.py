@@ -2,7 +2,10 @@
 
 import random
 import math
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for Law of Sines problems
 WORD_PROBLEMS = [
@@ -29,31 +32,39 @@ WORD_PROBLEMS = [
 ]
 
 
-def generate_law_of_sines(difficulty: int = 1) -> Dict[str, Any]:
+def generate_law_of_sines(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate Law of Sines problems.
 
     Args:
         difficulty: 1 (find side, AAS case), 2 (find angle), 3 (ASA or ambiguous case)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Find a side using Law of Sines (AAS case)
         # Two angles and one side known
-        use_word_problem = random.random() < 0.4
-        angle_A = random.choice([30, 45, 60])
-        angle_B = random.choice([30, 45, 60, 75])
+        use_word_problem = rng.random() < 0.4
+        angle_A = rng.choice([30, 45, 60])
+        angle_B = rng.choice([30, 45, 60, 75])
 
         # Make sure angles sum to less than 180
         if angle_A + angle_B >= 180:
-            angle_B = random.choice([30, 45])
+            angle_B = rng.choice([30, 45])
 
         angle_C = 180 - angle_A - angle_B
 
         # Known side opposite to angle A
-        side_a = random.choice([10, 12, 15, 20])
+        side_a = rng.choice([10, 12, 15, 20])
 
         # Calculate side b using Law of Sines
         side_b = side_a * math.sin(math.radians(angle_B)) / math.sin(math.radians(angle_A))
@@ -63,38 +74,15 @@ def generate_law_of_sines(difficulty: int = 1) -> Dict[str, Any]:
         else:
             question = f"In triangle $ABC$, angle $A = {angle_A}°$, angle $B = {angle_B}°$, and side $a = {side_a}$. Find side $b$."
 
-        steps = [
-            f"**Step 1 - Recall the Law of Sines:**",
-            f"This law states: $\\frac{{a}}{{\\sin(A)}} = \\frac{{b}}{{\\sin(B)}} = \\frac{{c}}{{\\sin(C)}}$",
-            f"It relates sides and their opposite angles in ANY triangle.",
-            "",
-            f"**Step 2 - Identify what we know:**",
-            f"- Angle $A = {angle_A}°$ (opposite to side $a$)",
-            f"- Angle $B = {angle_B}°$ (opposite to side $b$, which we're finding)",
-            f"- Side $a = {side_a}$ units",
-            "",
-            f"**Step 3 - Set up the equation using Law of Sines:**",
-            f"$\\frac{{{side_a}}}{{\\sin({angle_A}°)}} = \\frac{{b}}{{\\sin({angle_B}°)}}$",
-            "",
-            f"**Step 4 - Solve for $b$ by multiplying both sides:**",
-            f"$b = \\frac{{{side_a} \\cdot \\sin({angle_B}°)}}{{\\sin({angle_A}°)}}$",
-            "",
-            f"**Step 5 - Calculate using angle values:**",
-            f"$\\sin({angle_A}°) \\approx {round(math.sin(math.radians(angle_A)), 4)}$",
-            f"$\\sin({angle_B}°) \\approx {round(math.sin(math.radians(angle_B)), 4)}$",
-            f"",
-            f"$b = \\frac{{{side_a} \\times {round(math.sin(math.radians(angle_B)), 4)}}}{{{round(math.sin(math.radians(angle_A)), 4)}}} \\approx {round(side_b, 2)}$",
-            "",
-            f"**Final Answer:** $b \\approx {round(side_b, 2)}$ units"
-        ]
+        steps = LazySteps(_find_side_steps, angle_A, angle_B, side_a, side_b)
 
         answer_numeric = round(side_b, 2)
 
     elif difficulty == 2:
         # Medium: Find an angle using Law of Sines
-        angle_A = random.choice([30, 45, 60])
-        side_a = random.choice([10, 12, 15])
-        side_b = random.choice([8, 10, 12])
+        angle_A = rng.choice([30, 45, 60])
+        side_a = rng.choice([10, 12, 15])
+        side_b = rng.choice([8, 10, 12])
 
         # Make sure side_b < side_a to avoid ambiguous case for simplicity
         if side_b >= side_a:
@@ -106,28 +94,18 @@ def generate_law_of_sines(difficulty: int = 1) -> Dict[str, Any]:
 
         question = f"In triangle $ABC$, angle $A = {angle_A}°$, side $a = {side_a}$, and side $b = {side_b}$. Find angle $B$."
 
-        steps = [
-            "Use the Law of Sines: $\\frac{a}{\\sin(A)} = \\frac{b}{\\sin(B)}$",
-            f"We have: $A = {angle_A}°$, $a = {side_a}$, $b = {side_b}$",
-            f"Set up the equation: $\\frac{{{side_a}}}{{\\sin({angle_A}°)}} = \\frac{{{side_b}}}{{\\sin(B)}}$",
-            f"Solve for $\\sin(B)$: $\\sin(B) = \\frac{{{side_b} \\cdot \\sin({angle_A}°)}}{{{side_a}}}$",
-            f"Calculate: $\\sin(B) = \\frac{{{side_b} \\cdot {round(math.sin(math.radians(angle_A)), 4)}}}{{{side_a}}}$",
-            f"$\\sin(B) \\approx {round(sin_B, 4)}$",
-            f"Take the inverse sine: $B = \\arcsin({round(sin_B, 4)})$",
-            f"$B \\approx {round(angle_B, 2)}°$",
-            f"**Final Answer:** $B \\approx {round(angle_B, 2)}°$"
-        ]
+        steps = LazySteps(_find_angle_steps, angle_A, side_a, side_b, sin_B, angle_B)
 
         answer_numeric = round(angle_B, 2)
 
     else:
         # Hard: ASA case or word problem
-        problem_type = random.choice(["ASA", "word_problem"])
+        problem_type = rng.choice(["ASA", "word_problem"])
 
         if problem_type == "ASA":
             # Two angles and the included side
-            angle_A = random.choice([40, 50, 60])
-            angle_C = random.choice([50, 60, 70])
+            angle_A = rng.choice([40, 50, 60])
+            angle_C = rng.choice([50, 60, 70])
 
             # Make sure angles sum to less than 180
             if angle_A + angle_C >= 150:
@@ -136,22 +114,14 @@ def generate_law_of_sines(difficulty: int = 1) -> Dict[str, Any]:
             angle_B = 180 - angle_A - angle_C
 
             # Side between angles A and C (this is side b)
-            side_b = random.choice([15, 18, 20, 25])
+            side_b = rng.choice([15, 18, 20, 25])
 
             # Find side a using Law of Sines
             side_a = side_b * math.sin(math.radians(angle_A)) / math.sin(math.radians(angle_B))
 
             question = f"In triangle $ABC$, angle $A = {angle_A}°$, angle $C = {angle_C}°$, and side $b = {side_b}$ (the side opposite to angle $B$). Find side $a$."
 
-            steps = [
-                f"First, find angle $B$: $B = 180° - A - C = 180° - {angle_A}° - {angle_C}° = {angle_B}°$",
-                "Use the Law of Sines: $\\frac{a}{\\sin(A)} = \\frac{b}{\\sin(B)}$",
-                f"Set up the equation: $\\frac{{a}}{{\\sin({angle_A}°)}} = \\frac{{{side_b}}}{{\\sin({angle_B}°)}}$",
-                f"Solve for $a$: $a = \\frac{{{side_b} \\cdot \\sin({angle_A}°)}}{{\\sin({angle_B}°)}}$",
-                f"Calculate: $a = \\frac{{{side_b} \\cdot {round(math.sin(math.radians(angle_A)), 4)}}}{{{round(math.sin(math.radians(angle_B)), 4)}}}$",
-                f"$a \\approx {round(side_a, 2)}$",
-                f"**Final Answer:** $a \\approx {round(side_a, 2)}$"
-            ]
+            steps = LazySteps(_asa_steps, angle_A, angle_C, angle_B, side_b, side_a)
 
             answer_numeric = round(side_a, 2)
 
@@ -167,24 +137,87 @@ def generate_law_of_sines(difficulty: int = 1) -> Dict[str, Any]:
 
             question = f"A surveyor stands at point $C$ and measures angles to two landmarks $A$ and $B$. The angle at $A$ is ${angle_A}°$, the angle at $B$ is ${angle_B}°$, and the distance from $A$ to $B$ is ${distance}$ meters. How far is point $C$ from point $A$?"
 
-            steps = [
-                "First, find the angle at $C$:",
-                f"$C = 180° - {angle_A}° - {angle_B}° = {angle_C}°$",
-                f"The distance from $A$ to $B$ (side $c$) is ${distance}$ meters",
-                "We need to find the distance from $C$ to $A$ (side $b$)",
-                "Use the Law of Sines: $\\frac{b}{\\sin(B)} = \\frac{c}{\\sin(C)}$",
-                f"Set up: $\\frac{{b}}{{\\sin({angle_B}°)}} = \\frac{{{distance}}}{{\\sin({angle_C}°)}}$",
-                f"Solve for $b$: $b = \\frac{{{distance} \\cdot \\sin({angle_B}°)}}{{\\sin({angle_C}°)}}$",
-                f"Calculate: $b \\approx {round(side_a, 2)}$ meters",
-                f"**Final Answer:** ${round(side_a, 2)}$ meters"
-            ]
+            steps = LazySteps(_surveying_steps, angle_A, angle_B, angle_C, distance, side_a)
 
             answer_numeric = round(side_a, 2)
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _find_side_steps(angle_A: int, angle_B: int, side_a: int, side_b: float) -> List[str]:
+    """Steps for finding side b from two angles and side a (AAS)."""
+    return [
+        f"**Step 1 - Recall the Law of Sines:**",
+        f"This law states: $\\frac{{a}}{{\\sin(A)}} = \\frac{{b}}{{\\sin(B)}} = \\frac{{c}}{{\\sin(C)}}$",
+        f"It relates sides and their opposite angles in ANY triangle.",
+        "",
+        f"**Step 2 - Identify what we know:**",
+        f"- Angle $A = {angle_A}°$ (opposite to side $a$)",
+        f"- Angle $B = {angle_B}°$ (opposite to side $b$, which we're finding)",
+        f"- Side $a = {side_a}$ units",
+        "",
+        f"**Step 3 - Set up the equation using Law of Sines:**",
+        f"$\\frac{{{side_a}}}{{\\sin({angle_A}°)}} = \\frac{{b}}{{\\sin({angle_B}°)}}$",
+        "",
+        f"**Step 4 - Solve for $b$ by multiplying both sides:**",
+        f"$b = \\frac{{{side_a} \\cdot \\sin({angle_B}°)}}{{\\sin({angle_A}°)}}$",
+        "",
+        f"**Step 5 - Calculate using angle values:**",
+        f"$\\sin({angle_A}°) \\approx {round(math.sin(math.radians(angle_A)), 4)}$",
+        f"$\\sin({angle_B}°) \\approx {round(math.sin(math.radians(angle_B)), 4)}$",
+        f"",
+        f"$b = \\frac{{{side_a} \\times {round(math.sin(math.radians(angle_B)), 4)}}}{{{round(math.sin(math.radians(angle_A)), 4)}}} \\approx {round(side_b, 2)}$",
+        "",
+        f"**Final Answer:** $b \\approx {round(side_b, 2)}$ units"
+    ]
+
+
+def _find_angle_steps(angle_A: int, side_a: int, side_b: int, sin_B: float,
+                      angle_B: float) -> List[str]:
+    """Steps for finding angle B from angle A and sides a, b."""
+    return [
+        "Use the Law of Sines: $\\frac{a}{\\sin(A)} = \\frac{b}{\\sin(B)}$",
+        f"We have: $A = {angle_A}°$, $a = {side_a}$, $b = {side_b}$",
+        f"Set up the equation: $\\frac{{{side_a}}}{{\\sin({angle_A}°)}} = \\frac{{{side_b}}}{{\\sin(B)}}$",
+        f"Solve for $\\sin(B)$: $\\sin(B) = \\frac{{{side_b} \\cdot \\sin({angle_A}°)}}{{{side_a}}}$",
+        f"Calculate: $\\sin(B) = \\frac{{{side_b} \\cdot {round(math.sin(math.radians(angle_A)), 4)}}}{{{side_a}}}$",
+        f"$\\sin(B) \\approx {round(sin_B, 4)}$",
+        f"Take the inverse sine: $B = \\arcsin({round(sin_B, 4)})$",
+        f"$B \\approx {round(angle_B, 2)}°$",
+        f"**Final Answer:** $B \\approx {round(angle_B, 2)}°$"
+    ]
+
+
+def _asa_steps(angle_A: int, angle_C: int, angle_B: int, side_b: int, side_a: float) -> List[str]:
+    """Steps for finding side a from two angles and the included side (ASA)."""
+    return [
+        f"First, find angle $B$: $B = 180° - A - C = 180° - {angle_A}° - {angle_C}° = {angle_B}°$",
+        "Use the Law of Sines: $\\frac{a}{\\sin(A)} = \\frac{b}{\\sin(B)}$",
+        f"Set up the equation: $\\frac{{a}}{{\\sin({angle_A}°)}} = \\frac{{{side_b}}}{{\\sin({angle_B}°)}}$",
+        f"Solve for $a$: $a = \\frac{{{side_b} \\cdot \\sin({angle_A}°)}}{{\\sin({angle_B}°)}}$",
+        f"Calculate: $a = \\frac{{{side_b} \\cdot {round(math.sin(math.radians(angle_A)), 4)}}}{{{round(math.sin(math.radians(angle_B)), 4)}}}$",
+        f"$a \\approx {round(side_a, 2)}$",
+        f"**Final Answer:** $a \\approx {round(side_a, 2)}$"
+    ]
+
+
+def _surveying_steps(angle_A: int, angle_B: int, angle_C: int, distance: int,
+                     side_a: float) -> List[str]:
+    """Steps for the surveying word problem."""
+    return [
+        "First, find the angle at $C$:",
+        f"$C = 180° - {angle_A}° - {angle_B}° = {angle_C}°$",
+        f"The distance from $A$ to $B$ (side $c$) is ${distance}$ meters",
+        "We need to find the distance from $C$ to $A$ (side $b$)",
+        "Use the Law of Sines: $\\frac{b}{\\sin(B)} = \\frac{c}{\\sin(C)}$",
+        f"Set up: $\\frac{{b}}{{\\sin({angle_B}°)}} = \\frac{{{distance}}}{{\\sin({angle_C}°)}}$",
+        f"Solve for $b$: $b = \\frac{{{distance} \\cdot \\sin({angle_B}°)}}{{\\sin({angle_C}°)}}$",
+        f"Calculate: $b \\approx {round(side_a, 2)}$ meters",
+        f"**Final Answer:** ${round(side_a, 2)}$ meters"
+    ]
@@ -1,7 +1,11 @@
 """Linear equation question generator (ax + b = c) with word problems."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac, format_polynomial, format_term
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Word problem templates for linear equations
 LINEAR_EQUATION_WORD_PROBLEMS = [
@@ -36,84 +40,96 @@ LINEAR_EQUATION_WORD_PROBLEMS = [
 ]
 
 
-def generate_linear_equation(difficulty: int = 1) -> Dict[str, Any]:
+def generate_linear_equation(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a linear equation problem: ax + b = c
 
     Args:
         difficulty: 1 (easy), 2 (medium), 3-5 (hard)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     # Use word problems 40% of the time for easier difficulties
-    use_word_problem = difficulty <= 2 and random.random() < 0.4
+    use_word_problem = difficulty <= 2 and rng.random() < 0.4
 
     # Adjust ranges based on difficulty
     if difficulty == 1:
         # Easy: small coefficients, integer solutions
-        a = random.randint(2, 5)
-        x_solution = random.randint(1, 10)
-        b = random.randint(-10, 10)
+        a = rng.randint(2, 5)
+        x_solution = rng.randint(1, 10)
+        b = rng.randint(-10, 10)
     elif difficulty == 2:
         # Medium: larger coefficients, still integer solutions
-        a = random.randint(2, 10)
-        x_solution = random.randint(-10, 10)
-        b = random.randint(-20, 20)
+        a = rng.randint(2, 10)
+        x_solution = rng.randint(-10, 10)
+        b = rng.randint(-20, 20)
     else:
         # Hard: larger coefficients, may have decimal solutions
-        a = random.randint(5, 20)
-        x_solution = random.choice([i for i in range(-20, 20) if i != 0])
-        b = random.randint(-50, 50)
+        a = rng.randint(5, 20)
+        x_solution = rng.choice([i for i in range(-20, 20) if i != 0])
+        b = rng.randint(-50, 50)
 
     # Calculate c to ensure known solution
     c = a * x_solution + b
 
     # Format question with LaTeX
-    # Handle signs properly
-    sign_b = "+" if b >= 0 else "-"
     abs_b = abs(b)
-
-    if a == 1:
-        equation = f"x {sign_b} {abs_b} = {c}"
-    elif a == -1:
-        equation = f"-x {sign_b} {abs_b} = {c}"
-    else:
-        equation = f"{a}x {sign_b} {abs_b} = {c}"
-
-    equation = equation.replace("+ 0", "").replace("- 0", "").strip()
-
-    # Generate solution steps with LaTeX
-    steps = []
+    equation = f"{format_polynomial((b, a))} = {c}"
 
     # Word problem version or standard equation
+    unknown = None
     if use_word_problem and b != 0:
         # Pick a suitable word problem
         if a == 1 and b > 0:
             # Age problem: x + b = c
             question = f"In {b} years, Alex will be {c} years old. How old is Alex now?"
-            steps.append(f"**Problem:** {question}")
-            steps.append(f"**Set up equation:** Let $x$ = Alex's current age")
-            steps.append(f"${equation}$")
+            unknown = "Alex's current age"
         elif b > 0:
             # Temperature problem: ax + b = c
             question = f"The temperature rose {a} degrees per hour. After starting at {b}°F, it reached {c}°F. How many hours passed?"
-            steps.append(f"**Problem:** {question}")
-            steps.append(f"**Set up equation:** Let $x$ = hours passed")
-            steps.append(f"${equation}$")
+            unknown = "hours passed"
         else:
             # Ticket problem with discount: ax - b = c
             question = f"Movie tickets cost ${a} each. After a ${abs_b} discount, the total was ${c}. How many tickets were bought?"
-            steps.append(f"**Problem:** {question}")
-            steps.append(f"**Set up equation:** Let $x$ = number of tickets")
-            steps.append(f"${equation}$")
+            unknown = "number of tickets"
     else:
         question = equation
-        steps.append(f"Start with the equation: ${equation}$")
 
     # Wrap in LaTeX for display
     latex_question = f"${equation}$"
 
+    steps = LazySteps(_linear_steps, question, unknown, equation, a, b, c, x_solution)
+
+    return GeneratedQuestion(
+        question=f"Solve for $x$: {latex_question}",
+        answer=str(x_solution),
+        answer_numeric=x_solution,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _linear_steps(question: str, unknown: Optional[str], equation: str, a: int, b: int, c: int,
+                  x_solution: int) -> List[str]:
+    """Steps for ax + b = c, set up from the word problem when unknown is given."""
+    steps = []
+
+    if unknown:
+        steps.append(f"**Problem:** {question}")
+        steps.append(f"**Set up equation:** Let $x$ = {unknown}")
+        steps.append(f"${equation}$")
+    else:
+        steps.append(f"Start with the equation: ${equation}$")
+
     # Step 1: Isolate ax
     if b != 0:
         new_c = c - b
@@ -121,13 +137,7 @@ def generate_linear_equation(difficulty: int = 1) -> Dict[str, Any]:
         steps.append(f"To isolate the variable term, {operation} from both sides")
 
         # Show the new equation
-        if a == 1:
-            new_eq = f"x = {new_c}"
-        elif a == -1:
-            new_eq = f"-x = {new_c}"
-        else:
-            new_eq = f"{a}x = {new_c}"
-        steps.append(f"${new_eq}$")
+        steps.append(f"${format_term(a, 1)} = {new_c}$")
     else:
         new_c = c
 
@@ -138,9 +148,9 @@ def generate_linear_equation(difficulty: int = 1) -> Dict[str, Any]:
         # Show division
         if new_c < 0 and a < 0:
             # Both negative
-            steps.append(f"$x = \\frac{{{new_c}}}{{{a}}} = \\frac{{{abs(new_c)}}}{{{abs(a)}}}$")
+            steps.append(f"$x = {format_frac(new_c, a)} = {format_frac(abs(new_c), abs(a))}$")
         else:
-            steps.append(f"$x = \\frac{{{new_c}}}{{{a}}}$")
+            steps.append(f"$x = {format_frac(new_c, a)}$")
 
         # Simplify if needed
         if new_c % a == 0:
@@ -156,13 +166,7 @@ def generate_linear_equation(difficulty: int = 1) -> Dict[str, Any]:
     # Final answer
     steps.append(f"**Final Answer:** $x = {x_solution}$")
 
-    return {
-        "question": f"Solve for $x$: {latex_question}",
-        "answer": str(x_solution),
-        "answer_numeric": x_solution,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return steps
 
 
 def validate_answer(user_answer: str, correct_answer: float, tolerance: float = 0.01) -> bool:
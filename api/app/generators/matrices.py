@@ -1,7 +1,13 @@
 """Matrices question generator."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional, Tuple
+from app.generators.latex import format_matrix
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
+
+Matrix = Tuple[Tuple[int, int], Tuple[int, int]]
 
 # Word problem templates for engaging, real-world contexts
 ADDITION_WORD_PROBLEMS = [
@@ -54,26 +60,34 @@ DETERMINANT_WORD_PROBLEMS = [
 ]
 
 
-def generate_matrices(difficulty: int = 1) -> Dict[str, Any]:
+def generate_matrices(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a matrices problem.
 
     Args:
         difficulty: 1 (matrix addition/subtraction), 2 (matrix multiplication), 3 (determinant)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Matrix addition or subtraction - find one element
         # 2x2 matrices
-        a11, a12 = random.randint(-5, 5), random.randint(-5, 5)
-        a21, a22 = random.randint(-5, 5), random.randint(-5, 5)
-        b11, b12 = random.randint(-5, 5), random.randint(-5, 5)
-        b21, b22 = random.randint(-5, 5), random.randint(-5, 5)
-        use_word_problem = random.random() < 0.4
+        a11, a12 = rng.randint(-5, 5), rng.randint(-5, 5)
+        a21, a22 = rng.randint(-5, 5), rng.randint(-5, 5)
+        b11, b12 = rng.randint(-5, 5), rng.randint(-5, 5)
+        b21, b22 = rng.randint(-5, 5), rng.randint(-5, 5)
+        use_word_problem = rng.random() < 0.4
 
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Addition
             operation = "+"
             r11, r12 = a11 + b11, a12 + b12
@@ -81,30 +95,20 @@ def generate_matrices(difficulty: int = 1) -> Dict[str, Any]:
 
             # Choose which element to ask for
             positions = [("(1,1)", r11), ("(1,2)", r12), ("(2,1)", r21), ("(2,2)", r22)]
-            pos_str, answer = random.choice(positions)
+            pos_str, answer = rng.choice(positions)
 
             if use_word_problem:
-                context = random.choice(ADDITION_WORD_PROBLEMS)
+                context = rng.choice(ADDITION_WORD_PROBLEMS)
                 question = f"{context['context']}\n\n"
-                question += f"$A = \\begin{{bmatrix}} {a11} & {a12} \\\\ {a21} & {a22} \\end{{bmatrix}}$, "
-                question += f"$B = \\begin{{bmatrix}} {b11} & {b12} \\\\ {b21} & {b22} \\end{{bmatrix}}$\n\n"
+                question += f"$A = {format_matrix(((a11, a12), (a21, a22)))}$, "
+                question += f"$B = {format_matrix(((b11, b12), (b21, b22)))}$\n\n"
                 question += context['element_ask'].format(pos_str=pos_str)
             else:
                 question = f"Calculate $A + B$ and find the element at position {pos_str}:\n\n"
-                question += f"$A = \\begin{{bmatrix}} {a11} & {a12} \\\\ {a21} & {a22} \\end{{bmatrix}}$, "
-                question += f"$B = \\begin{{bmatrix}} {b11} & {b12} \\\\ {b21} & {b22} \\end{{bmatrix}}$"
-
-            steps = [
-                "To add matrices, we add corresponding elements (element-by-element):",
-                "",
-                f"$A + B = \\begin{{bmatrix}} {a11} + ({b11}) & {a12} + ({b12}) \\\\ {a21} + ({b21}) & {a22} + ({b22}) \\end{{bmatrix}}$",
-                "",
-                f"$A + B = \\begin{{bmatrix}} {r11} & {r12} \\\\ {r21} & {r22} \\end{{bmatrix}}$",
-                "",
-                f"The element at position {pos_str} is ${answer}$.",
-                "",
-                f"**Final Answer:** ${answer}$"
-            ]
+                question += f"$A = {format_matrix(((a11, a12), (a21, a22)))}$, "
+                question += f"$B = {format_matrix(((b11, b12), (b21, b22)))}$"
+
+            steps = LazySteps(_elementwise_steps, "+", ((a11, a12), (a21, a22)), ((b11, b12), (b21, b22)), pos_str, answer)
         else:
             # Subtraction
             operation = "-"
@@ -113,40 +117,30 @@ def generate_matrices(difficulty: int = 1) -> Dict[str, Any]:
 
             # Choose which element to ask for
             positions = [("(1,1)", r11), ("(1,2)", r12), ("(2,1)", r21), ("(2,2)", r22)]
-            pos_str, answer = random.choice(positions)
+            pos_str, answer = rng.choice(positions)
 
             if use_word_problem:
-                context = random.choice(ADDITION_WORD_PROBLEMS)
+                context = rng.choice(ADDITION_WORD_PROBLEMS)
                 question = f"{context['context']} (Now we're looking at differences.)\n\n"
-                question += f"$A = \\begin{{bmatrix}} {a11} & {a12} \\\\ {a21} & {a22} \\end{{bmatrix}}$, "
-                question += f"$B = \\begin{{bmatrix}} {b11} & {b12} \\\\ {b21} & {b22} \\end{{bmatrix}}$\n\n"
+                question += f"$A = {format_matrix(((a11, a12), (a21, a22)))}$, "
+                question += f"$B = {format_matrix(((b11, b12), (b21, b22)))}$\n\n"
                 question += f"Calculate $A - B$ and find the element at position {pos_str}."
             else:
                 question = f"Calculate $A - B$ and find the element at position {pos_str}:\n\n"
-                question += f"$A = \\begin{{bmatrix}} {a11} & {a12} \\\\ {a21} & {a22} \\end{{bmatrix}}$, "
-                question += f"$B = \\begin{{bmatrix}} {b11} & {b12} \\\\ {b21} & {b22} \\end{{bmatrix}}$"
-
-            steps = [
-                "To subtract matrices, we subtract corresponding elements (element-by-element):",
-                "",
-                f"$A - B = \\begin{{bmatrix}} {a11} - ({b11}) & {a12} - ({b12}) \\\\ {a21} - ({b21}) & {a22} - ({b22}) \\end{{bmatrix}}$",
-                "",
-                f"$A - B = \\begin{{bmatrix}} {r11} & {r12} \\\\ {r21} & {r22} \\end{{bmatrix}}$",
-                "",
-                f"The element at position {pos_str} is ${answer}$.",
-                "",
-                f"**Final Answer:** ${answer}$"
-            ]
+                question += f"$A = {format_matrix(((a11, a12), (a21, a22)))}$, "
+                question += f"$B = {format_matrix(((b11, b12), (b21, b22)))}$"
+
+            steps = LazySteps(_elementwise_steps, "-", ((a11, a12), (a21, a22)), ((b11, b12), (b21, b22)), pos_str, answer)
 
         answer_numeric = answer
 
     elif difficulty == 2:
         # Medium: Matrix multiplication (2x2)
-        a11, a12 = random.randint(-3, 3), random.randint(-3, 3)
-        a21, a22 = random.randint(-3, 3), random.randint(-3, 3)
-        b11, b12 = random.randint(-3, 3), random.randint(-3, 3)
-        b21, b22 = random.randint(-3, 3), random.randint(-3, 3)
-        use_word_problem = random.random() < 0.4
+        a11, a12 = rng.randint(-3, 3), rng.randint(-3, 3)
+        a21, a22 = rng.randint(-3, 3), rng.randint(-3, 3)
+        b11, b12 = rng.randint(-3, 3), rng.randint(-3, 3)
+        b21, b22 = rng.randint(-3, 3), rng.randint(-3, 3)
+        use_word_problem = rng.random() < 0.4
 
         # Calculate product
         r11 = a11 * b11 + a12 * b21
@@ -156,77 +150,118 @@ def generate_matrices(difficulty: int = 1) -> Dict[str, Any]:
 
         # Choose which element to ask for
         positions = [("(1,1)", r11), ("(1,2)", r12), ("(2,1)", r21), ("(2,2)", r22)]
-        pos_str, answer = random.choice(positions)
+        pos_str, answer = rng.choice(positions)
 
         if use_word_problem:
-            context = random.choice(MULTIPLICATION_WORD_PROBLEMS)
+            context = rng.choice(MULTIPLICATION_WORD_PROBLEMS)
             question = f"{context['context']}\n\n"
-            question += f"$A = \\begin{{bmatrix}} {a11} & {a12} \\\\ {a21} & {a22} \\end{{bmatrix}}$, "
-            question += f"$B = \\begin{{bmatrix}} {b11} & {b12} \\\\ {b21} & {b22} \\end{{bmatrix}}$\n\n"
+            question += f"$A = {format_matrix(((a11, a12), (a21, a22)))}$, "
+            question += f"$B = {format_matrix(((b11, b12), (b21, b22)))}$\n\n"
             question += context['element_ask'].format(pos_str=pos_str)
         else:
             question = f"Calculate $AB$ and find the element at position {pos_str}:\n\n"
-            question += f"$A = \\begin{{bmatrix}} {a11} & {a12} \\\\ {a21} & {a22} \\end{{bmatrix}}$, "
-            question += f"$B = \\begin{{bmatrix}} {b11} & {b12} \\\\ {b21} & {b22} \\end{{bmatrix}}$"
-
-        steps = [
-            "To multiply 2×2 matrices, each element is the dot product of the corresponding row and column:",
-            "",
-            "$AB = \\begin{bmatrix} a_{11}b_{11}+a_{12}b_{21} & a_{11}b_{12}+a_{12}b_{22} \\\\ a_{21}b_{11}+a_{22}b_{21} & a_{21}b_{12}+a_{22}b_{22} \\end{bmatrix}$",
-            "",
-            "Calculate each element:",
-            f"- $(1,1)$: $({a11})({b11}) + ({a12})({b21}) = {a11*b11} + {a12*b21} = {r11}$",
-            f"- $(1,2)$: $({a11})({b12}) + ({a12})({b22}) = {a11*b12} + {a12*b22} = {r12}$",
-            f"- $(2,1)$: $({a21})({b11}) + ({a22})({b21}) = {a21*b11} + {a22*b21} = {r21}$",
-            f"- $(2,2)$: $({a21})({b12}) + ({a22})({b22}) = {a21*b12} + {a22*b22} = {r22}$",
-            "",
-            f"$AB = \\begin{{bmatrix}} {r11} & {r12} \\\\ {r21} & {r22} \\end{{bmatrix}}$",
-            "",
-            f"The element at position {pos_str} is ${answer}$.",
-            "",
-            f"**Final Answer:** ${answer}$"
-        ]
+            question += f"$A = {format_matrix(((a11, a12), (a21, a22)))}$, "
+            question += f"$B = {format_matrix(((b11, b12), (b21, b22)))}$"
+
+        steps = LazySteps(_product_steps, ((a11, a12), (a21, a22)), ((b11, b12), (b21, b22)), pos_str, answer)
 
         answer_numeric = answer
 
     else:
         # Hard: Determinant of 2x2 matrix
-        a = random.randint(-5, 5)
-        b = random.randint(-5, 5)
-        c = random.randint(-5, 5)
-        d = random.randint(-5, 5)
-        use_word_problem = random.random() < 0.4
+        a = rng.randint(-5, 5)
+        b = rng.randint(-5, 5)
+        c = rng.randint(-5, 5)
+        d = rng.randint(-5, 5)
+        use_word_problem = rng.random() < 0.4
 
         determinant = a * d - b * c
 
         if use_word_problem:
-            context = random.choice(DETERMINANT_WORD_PROBLEMS)
+            context = rng.choice(DETERMINANT_WORD_PROBLEMS)
             question = f"{context['context']}\n\n"
-            question += f"$A = \\begin{{bmatrix}} {a} & {b} \\\\ {c} & {d} \\end{{bmatrix}}$\n\n"
+            question += f"$A = {format_matrix(((a, b), (c, d)))}$\n\n"
             question += context['calculation']
         else:
-            question = f"Find the determinant of the matrix:\n\n$A = \\begin{{bmatrix}} {a} & {b} \\\\ {c} & {d} \\end{{bmatrix}}$"
-
-        steps = [
-            "The determinant of a 2×2 matrix $\\begin{bmatrix} a & b \\\\ c & d \\end{bmatrix}$ is:",
-            "$\\det(A) = ad - bc$",
-            "",
-            "The determinant tells us about the transformation: whether it flips the orientation, scales area, or inverses the matrix.",
-            "",
-            f"Substitute the values:",
-            f"$\\det(A) = ({a})({d}) - ({b})({c})$",
-            f"$\\det(A) = {a * d} - {b * c}$",
-            f"$\\det(A) = {determinant}$",
-            "",
-            f"**Final Answer:** ${determinant}$"
-        ]
+            question = f"Find the determinant of the matrix:\n\n$A = {format_matrix(((a, b), (c, d)))}$"
+
+        steps = LazySteps(_determinant_steps, a, b, c, d, determinant)
 
         answer_numeric = determinant
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _elementwise_steps(op: str, a: Matrix, b: Matrix, pos_str: str, answer: int) -> List[str]:
+    """Steps for A + B or A - B, element by element."""
+    (a11, a12), (a21, a22) = a
+    (b11, b12), (b21, b22) = b
+    if op == "+":
+        verb = "add"
+        result = ((a11 + b11, a12 + b12), (a21 + b21, a22 + b22))
+    else:
+        verb = "subtract"
+        result = ((a11 - b11, a12 - b12), (a21 - b21, a22 - b22))
+
+    return [
+        f"To {verb} matrices, we {verb} corresponding elements (element-by-element):",
+        "",
+        f"$A {op} B = \\begin{{bmatrix}} {a11} {op} ({b11}) & {a12} {op} ({b12}) \\\\ {a21} {op} ({b21}) & {a22} {op} ({b22}) \\end{{bmatrix}}$",
+        "",
+        f"$A {op} B = {format_matrix(result)}$",
+        "",
+        f"The element at position {pos_str} is ${answer}$.",
+        "",
+        f"**Final Answer:** ${answer}$"
+    ]
+
+
+def _product_steps(a: Matrix, b: Matrix, pos_str: str, answer: int) -> List[str]:
+    """Steps for AB, each element as a row-column dot product."""
+    (a11, a12), (a21, a22) = a
+    (b11, b12), (b21, b22) = b
+    r11 = a11 * b11 + a12 * b21
+    r12 = a11 * b12 + a12 * b22
+    r21 = a21 * b11 + a22 * b21
+    r22 = a21 * b12 + a22 * b22
+
+    return [
+        "To multiply 2×2 matrices, each element is the dot product of the corresponding row and column:",
+        "",
+        "$AB = \\begin{bmatrix} a_{11}b_{11}+a_{12}b_{21} & a_{11}b_{12}+a_{12}b_{22} \\\\ a_{21}b_{11}+a_{22}b_{21} & a_{21}b_{12}+a_{22}b_{22} \\end{bmatrix}$",
+        "",
+        "Calculate each element:",
+        f"- $(1,1)$: $({a11})({b11}) + ({a12})({b21}) = {a11*b11} + {a12*b21} = {r11}$",
+        f"- $(1,2)$: $({a11})({b12}) + ({a12})({b22}) = {a11*b12} + {a12*b22} = {r12}$",
+        f"- $(2,1)$: $({a21})({b11}) + ({a22})({b21}) = {a21*b11} + {a22*b21} = {r21}$",
+        f"- $(2,2)$: $({a21})({b12}) + ({a22})({b22}) = {a21*b12} + {a22*b22} = {r22}$",
+        "",
+        f"$AB = {format_matrix(((r11, r12), (r21, r22)))}$",
+        "",
+        f"The element at position {pos_str} is ${answer}$.",
+        "",
+        f"**Final Answer:** ${answer}$"
+    ]
+
+
+def _determinant_steps(a: int, b: int, c: int, d: int, determinant: int) -> List[str]:
+    """Steps for the determinant ad - bc of a 2×2 matrix."""
+    return [
+        "The determinant of a 2×2 matrix $\\begin{bmatrix} a & b \\\\ c & d \\end{bmatrix}$ is:",
+        "$\\det(A) = ad - bc$",
+        "",
+        "The determinant tells us about the transformation: whether it flips the orientation, scales area, or inverses the matrix.",
+        "",
+        f"Substitute the values:",
+        f"$\\det(A) = ({a})({d}) - ({b})({c})$",
+        f"$\\det(A) = {a * d} - {b * c}$",
+        f"$\\det(A) = {determinant}$",
+        "",
+        f"**Final Answer:** ${determinant}$"
+    ]
@@ -1,7 +1,10 @@
 """Order of operations question generator (PEMDAS/BODMAS) with word problems."""
 
 import random
-from typing import Dict, Any, List
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Word problem templates for order of operations
 ORDER_OF_OPS_WORD_PROBLEMS = {
@@ -17,7 +20,11 @@ ORDER_OF_OPS_WORD_PROBLEMS = {
 }
 
 
-def generate_order_of_operations(difficulty: int = 1) -> Dict[str, Any]:
+def generate_order_of_operations(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate an order of operations problem (PEMDAS/BODMAS).
 
@@ -26,143 +33,164 @@ def generate_order_of_operations(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - simple operations with parentheses)
             2 (medium - multiple operations including exponents)
             3 (hard - complex expressions with all operations)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     # Use word problems 40% of the time for easier difficulties
-    use_word_problem = difficulty <= 2 and random.random() < 0.4
+    use_word_problem = difficulty <= 2 and rng.random() < 0.4
 
     if difficulty == 1:
         # Easy: Simple operations with parentheses
         # Format: (a + b) * c or a + b * c
-        a = random.randint(1, 10)
-        b = random.randint(1, 10)
-        c = random.randint(2, 5)
+        a = rng.randint(1, 10)
+        b = rng.randint(1, 10)
+        c = rng.randint(2, 5)
 
-        use_parentheses = random.choice([True, False])
+        use_parentheses = rng.choice([True, False])
 
         if use_parentheses:
             # With parentheses
             expression = f"({a} + {b}) \\times {c}"
-
-            if use_word_problem:
-                wp = ORDER_OF_OPS_WORD_PROBLEMS["difficulty_1"][0]  # Cards problem
-                question = wp["template"].format(a=a, b=b, c=c)
-                steps.append(f"**Problem:** {question}")
-                steps.append(f"**Identify:** Calculate $({a} + {b}) \\times {c}$")
-            else:
-                steps.append(f"Start with the expression: $({a} + {b}) \\times {c}$")
-
-            steps.append("**Rule:** Evaluate operations inside **parentheses** first (P in PEMDAS)")
-            steps.append(f"Calculate inside parentheses: ${a} + {b} = {a + b}$")
-            result = a + b
-            steps.append(f"Now multiply: ${result} \\times {c} = {result * c}$")
-            answer = result * c
+            wp = ORDER_OF_OPS_WORD_PROBLEMS["difficulty_1"][0]  # Cards problem
+            answer = (a + b) * c
+            step_builder = _parentheses_first_steps
         else:
             # Without parentheses (multiplication first)
             expression = f"{a} + {b} \\times {c}"
+            wp = ORDER_OF_OPS_WORD_PROBLEMS["difficulty_1"][1]  # Money problem
+            answer = a + b * c
+            step_builder = _multiplication_first_steps
 
-            if use_word_problem:
-                wp = ORDER_OF_OPS_WORD_PROBLEMS["difficulty_1"][1]  # Money problem
-                question = wp["template"].format(a=a, b=b, c=c)
-                steps.append(f"**Problem:** {question}")
-                steps.append(f"**Identify:** Calculate ${a} + {b} \\times {c}$")
-            else:
-                steps.append(f"Start with the expression: ${a} + {b} \\times {c}$")
-
-            steps.append("**Rule:** Multiplication comes before addition (MD before AS in PEMDAS)")
-            steps.append(f"First multiply: ${b} \\times {c} = {b * c}$")
-            result = b * c
-            steps.append(f"Then add: ${a} + {result} = {a + result}$")
-            answer = a + result
+        problem = wp["template"].format(a=a, b=b, c=c) if use_word_problem else None
+        steps = LazySteps(step_builder, problem, expression, a, b, c)
 
     elif difficulty == 2:
         # Medium: Include exponents and multiple operations
         # Format: a + b^2 * c or (a + b)^2 - c
-        a = random.randint(1, 5)
-        b = random.randint(2, 4)
-        c = random.randint(1, 3)
+        a = rng.randint(1, 5)
+        b = rng.randint(2, 4)
+        c = rng.randint(1, 3)
 
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # a + b^2 * c
             expression = f"{a} + {b}^2 \\times {c}"
-            steps.append(f"Start with the expression: ${a} + {b}^2 \\times {c}$")
-            steps.append("**Rule:** Follow PEMDAS order - Exponents before Multiplication before Addition")
-
-            b_squared = b ** 2
-            steps.append(f"First calculate the exponent: ${b}^2 = {b_squared}$")
-            steps.append(f"Expression becomes: ${a} + {b_squared} \\times {c}$")
-
-            mult_result = b_squared * c
-            steps.append(f"Next multiply: ${b_squared} \\times {c} = {mult_result}$")
-            steps.append(f"Expression becomes: ${a} + {mult_result}$")
-
-            answer = a + mult_result
-            steps.append(f"Finally add: ${a} + {mult_result} = {answer}$")
+            answer = a + b ** 2 * c
+            steps = LazySteps(_exponent_first_steps, expression, a, b, c)
         else:
             # (a + b)^2 - c
             expression = f"({a} + {b})^2 - {c}"
-            steps.append(f"Start with the expression: $({a} + {b})^2 - {c}$")
-            steps.append("**Rule:** Parentheses first, then Exponents, then Subtraction")
-
-            paren_result = a + b
-            steps.append(f"Calculate inside parentheses: ${a} + {b} = {paren_result}$")
-            steps.append(f"Expression becomes: ${paren_result}^2 - {c}$")
-
-            squared_result = paren_result ** 2
-            steps.append(f"Calculate the exponent: ${paren_result}^2 = {squared_result}$")
-            steps.append(f"Expression becomes: ${squared_result} - {c}$")
-
-            answer = squared_result - c
-            steps.append(f"Finally subtract: ${squared_result} - {c} = {answer}$")
+            answer = (a + b) ** 2 - c
+            steps = LazySteps(_squared_parentheses_steps, expression, a, b, c)
 
     else:  # difficulty == 3
         # Hard: Complex expression with all operations
         # Format: a^2 + (b - c) * d / e
-        a = random.randint(2, 4)
-        b = random.randint(10, 20)
-        c = random.randint(1, 9)
-        d = random.randint(2, 6)
+        a = rng.randint(2, 4)
+        b = rng.randint(10, 20)
+        c = rng.randint(1, 9)
+        d = rng.randint(2, 6)
         # Choose e so that division is clean
         paren_val = b - c
-        e = random.choice([i for i in range(2, 5) if (paren_val * d) % i == 0])
+        e = rng.choice([i for i in range(2, 5) if (paren_val * d) % i == 0])
 
         expression = f"{a}^2 + ({b} - {c}) \\times {d} \\div {e}"
-        steps.append(f"Start with the expression: ${a}^2 + ({b} - {c}) \\times {d} \\div {e}$")
-        steps.append("**Rule:** PEMDAS - Parentheses, Exponents, Multiplication/Division (left to right), Addition")
-
-        # Exponents
-        a_squared = a ** 2
-        steps.append(f"**Step 1:** Calculate exponent: ${a}^2 = {a_squared}$")
-
-        # Parentheses
-        paren_result = b - c
-        steps.append(f"**Step 2:** Calculate inside parentheses: ${b} - {c} = {paren_result}$")
-        steps.append(f"Expression becomes: ${a_squared} + {paren_result} \\times {d} \\div {e}$")
-
-        # Multiplication (left to right)
-        mult_result = paren_result * d
-        steps.append(f"**Step 3:** Multiply (left to right): ${paren_result} \\times {d} = {mult_result}$")
-        steps.append(f"Expression becomes: ${a_squared} + {mult_result} \\div {e}$")
-
-        # Division
-        div_result = mult_result // e
-        steps.append(f"**Step 4:** Divide: ${mult_result} \\div {e} = {div_result}$")
-        steps.append(f"Expression becomes: ${a_squared} + {div_result}$")
-
-        # Addition
-        answer = a_squared + div_result
-        steps.append(f"**Step 5:** Add: ${a_squared} + {div_result} = {answer}$")
-
-    steps.append(f"**Final Answer:** ${answer}$")
-
-    return {
-        "question": f"Evaluate: ${expression}$",
-        "answer": str(answer),
-        "answer_numeric": answer,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+        answer = a ** 2 + (b - c) * d // e
+        steps = LazySteps(_all_operations_steps, expression, a, b, c, d, e)
+
+    return GeneratedQuestion(
+        question=f"Evaluate: ${expression}$",
+        answer=str(answer),
+        answer_numeric=answer,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _opening_steps(problem: Optional[str], expression: str) -> List[str]:
+    """The word problem and what to calculate, or just the expression."""
+    if problem:
+        return [f"**Problem:** {problem}", f"**Identify:** Calculate ${expression}$"]
+    return [f"Start with the expression: ${expression}$"]
+
+
+def _parentheses_first_steps(problem: Optional[str], expression: str, a: int, b: int, c: int) -> List[str]:
+    """Steps for (a + b) * c."""
+    result = a + b
+    return _opening_steps(problem, expression) + [
+        "**Rule:** Evaluate operations inside **parentheses** first (P in PEMDAS)",
+        f"Calculate inside parentheses: ${a} + {b} = {a + b}$",
+        f"Now multiply: ${result} \\times {c} = {result * c}$",
+        f"**Final Answer:** ${result * c}$",
+    ]
+
+
+def _multiplication_first_steps(problem: Optional[str], expression: str, a: int, b: int, c: int) -> List[str]:
+    """Steps for a + b * c."""
+    result = b * c
+    return _opening_steps(problem, expression) + [
+        "**Rule:** Multiplication comes before addition (MD before AS in PEMDAS)",
+        f"First multiply: ${b} \\times {c} = {b * c}$",
+        f"Then add: ${a} + {result} = {a + result}$",
+        f"**Final Answer:** ${a + result}$",
+    ]
+
+
+def _exponent_first_steps(expression: str, a: int, b: int, c: int) -> List[str]:
+    """Steps for a + b^2 * c."""
+    b_squared = b ** 2
+    mult_result = b_squared * c
+    answer = a + mult_result
+    return [
+        f"Start with the expression: ${expression}$",
+        "**Rule:** Follow PEMDAS order - Exponents before Multiplication before Addition",
+        f"First calculate the exponent: ${b}^2 = {b_squared}$",
+        f"Expression becomes: ${a} + {b_squared} \\times {c}$",
+        f"Next multiply: ${b_squared} \\times {c} = {mult_result}$",
+        f"Expression becomes: ${a} + {mult_result}$",
+        f"Finally add: ${a} + {mult_result} = {answer}$",
+        f"**Final Answer:** ${answer}$",
+    ]
+
+
+def _squared_parentheses_steps(expression: str, a: int, b: int, c: int) -> List[str]:
+    """Steps for (a + b)^2 - c."""
+    paren_result = a + b
+    squared_result = paren_result ** 2
+    answer = squared_result - c
+    return [
+        f"Start with the expression: ${expression}$",
+        "**Rule:** Parentheses first, then Exponents, then Subtraction",
+        f"Calculate inside parentheses: ${a} + {b} = {paren_result}$",
+        f"Expression becomes: ${paren_result}^2 - {c}$",
+        f"Calculate the exponent: ${paren_result}^2 = {squared_result}$",
+        f"Expression becomes: ${squared_result} - {c}$",
+        f"Finally subtract: ${squared_result} - {c} = {answer}$",
+        f"**Final Answer:** ${answer}$",
+    ]
+
+
+def _all_operations_steps(expression: str, a: int, b: int, c: int, d: int, e: int) -> List[str]:
+    """Steps for a^2 + (b - c) * d / e."""
+    a_squared = a ** 2
+    paren_result = b - c
+    mult_result = paren_result * d
+    div_result = mult_result // e
+    answer = a_squared + div_result
+    return [
+        f"Start with the expression: ${expression}$",
+        "**Rule:** PEMDAS - Parentheses, Exponents, Multiplication/Division (left to right), Addition",
+        f"**Step 1:** Calculate exponent: ${a}^2 = {a_squared}$",
+        f"**Step 2:** Calculate inside parentheses: ${b} - {c} = {paren_result}$",
+        f"Expression becomes: ${a_squared} + {paren_result} \\times {d} \\div {e}$",
+        f"**Step 3:** Multiply (left to right): ${paren_result} \\times {d} = {mult_result}$",
+        f"Expression becomes: ${a_squared} + {mult_result} \\div {e}$",
+        f"**Step 4:** Divide: ${mult_result} \\div {e} = {div_result}$",
+        f"Expression becomes: ${a_squared} + {div_result}$",
+        f"**Step 5:** Add: ${a_squared} + {div_result} = {answer}$",
+        f"**Final Answer:** ${answer}$",
+    ]
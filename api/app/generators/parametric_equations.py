@@ -1,7 +1,11 @@
 """Parametric equations question generator."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Word problem templates for engaging, real-world contexts
 PARAMETRIC_WORD_PROBLEMS = [
@@ -43,48 +47,47 @@ PARAMETRIC_WORD_PROBLEMS = [
 ]
 
 
-def generate_parametric_equations(difficulty: int = 1) -> Dict[str, Any]:
+def generate_parametric_equations(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a parametric equations problem.
 
     Args:
         difficulty: 1 (evaluate at t), 2 (eliminate parameter), 3 (find t for given point)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Evaluate x or y at a specific t value
-        a = random.randint(2, 5)
-        b = random.randint(-5, 5)
-        c = random.randint(2, 5)
-        d = random.randint(-5, 5)
-        t_val = random.randint(1, 4)
-        use_word_problem = random.random() < 0.4
+        a = rng.randint(2, 5)
+        b = rng.randint(-5, 5)
+        c = rng.randint(2, 5)
+        d = rng.randint(-5, 5)
+        t_val = rng.randint(1, 4)
+        use_word_problem = rng.random() < 0.4
 
         # Choose whether to ask for x or y
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Ask for x
             x_result = a * t_val + b
 
             if use_word_problem:
-                context = random.choice([p for p in PARAMETRIC_WORD_PROBLEMS if p["difficulty"] == 1])
+                context = rng.choice([p for p in PARAMETRIC_WORD_PROBLEMS if p["difficulty"] == 1])
                 question = f"{context['context']}\n\n"
                 question += f"The parametric equations are $x = {a}t {b:+d}$ and $y = {c}t {d:+d}$.\n\n"
                 question += f"Find the value of $x$ when $t = {t_val}$."
             else:
                 question = f"Given the parametric equations $x = {a}t {b:+d}$ and $y = {c}t {d:+d}$, find the value of $x$ when $t = {t_val}$."
 
-            steps = [
-                f"We have the equation $x = {a}t {b:+d}$",
-                "",
-                f"To find the position at $t = {t_val}$, substitute this value:",
-                f"$x = {a}({t_val}) {b:+d}$",
-                f"$x = {a * t_val} {b:+d}$",
-                f"$x = {x_result}$",
-                "",
-                f"**Final Answer:** ${x_result}$ units"
-            ]
+            steps = LazySteps(_x_value_steps, a, b, t_val, x_result)
 
             answer_numeric = x_result
         else:
@@ -92,23 +95,14 @@ def generate_parametric_equations(difficulty: int = 1) -> Dict[str, Any]:
             y_result = c * t_val + d
 
             if use_word_problem:
-                context = random.choice([p for p in PARAMETRIC_WORD_PROBLEMS if p["difficulty"] == 1])
+                context = rng.choice([p for p in PARAMETRIC_WORD_PROBLEMS if p["difficulty"] == 1])
                 question = f"{context['context']}\n\n"
                 question += f"The parametric equations are $x = {a}t {b:+d}$ and $y = {c}t {d:+d}$.\n\n"
                 question += f"Find the value of $y$ when $t = {t_val}$."
             else:
                 question = f"Given the parametric equations $x = {a}t {b:+d}$ and $y = {c}t {d:+d}$, find the value of $y$ when $t = {t_val}$."
 
-            steps = [
-                f"We have the equation $y = {c}t {d:+d}$",
-                "",
-                f"To find the position at $t = {t_val}$, substitute this value:",
-                f"$y = {c}({t_val}) {d:+d}$",
-                f"$y = {c * t_val} {d:+d}$",
-                f"$y = {y_result}$",
-                "",
-                f"**Final Answer:** ${y_result}$ units"
-            ]
+            steps = LazySteps(_y_value_steps, c, d, t_val, y_result)
 
             answer_numeric = y_result
 
@@ -118,11 +112,11 @@ def generate_parametric_equations(difficulty: int = 1) -> Dict[str, Any]:
         # Solving for t from x: t = (x - b)/a
         # Substituting: y = c((x-b)/a) + d = (c/a)x - (bc/a) + d
         # Slope is c/a
-        a = random.randint(2, 4)
-        b = random.randint(-3, 3)
-        c = random.randint(2, 6)
-        d = random.randint(-3, 3)
-        use_word_problem = random.random() < 0.4
+        a = rng.randint(2, 4)
+        b = rng.randint(-3, 3)
+        c = rng.randint(2, 6)
+        d = rng.randint(-3, 3)
+        use_word_problem = rng.random() < 0.4
 
         slope = c / a
         if slope == int(slope):
@@ -132,79 +126,118 @@ def generate_parametric_equations(difficulty: int = 1) -> Dict[str, Any]:
             answer_numeric = round(slope, 2)
 
         if use_word_problem:
-            context = random.choice([p for p in PARAMETRIC_WORD_PROBLEMS if p["difficulty"] == 2])
+            context = rng.choice([p for p in PARAMETRIC_WORD_PROBLEMS if p["difficulty"] == 2])
             question = f"{context['context']}\n\n"
             question += f"The parametric equations are $x = {a}t {b:+d}$ and $y = {c}t {d:+d}$.\n\n"
             question += "Eliminate the parameter $t$ to find the slope of the path."
         else:
             question = f"Eliminate the parameter $t$ from the parametric equations $x = {a}t {b:+d}$ and $y = {c}t {d:+d}$ to find the slope of the resulting line."
 
-        steps = [
-            "**Step 1:** Solve for $t$ from the $x$ equation:",
-            f"$x = {a}t {b:+d}$",
-            f"$x {-b:+d} = {a}t$",
-            f"$t = \\frac{{x {-b:+d}}}{{{a}}}$",
-            "",
-            "**Step 2:** Substitute this expression for $t$ into the $y$ equation:",
-            f"$y = {c}t {d:+d}$",
-            f"$y = {c} \\cdot \\frac{{x {-b:+d}}}{{{a}}} {d:+d}$",
-            f"$y = \\frac{{{c}}}{{{a}}}x - \\frac{{{c * b}}}{{{a}}} {d:+d}$",
-            "",
-            "**Step 3:** Identify the slope from the equation $y = mx + b$:",
-            f"The slope is $m = \\frac{{{c}}}{{{a}}}$",
-        ]
-
-        if slope == int(slope):
-            steps.append(f"$m = {int(slope)}$")
-            steps.append("")
-            steps.append(f"**Final Answer:** ${int(slope)}$")
-        else:
-            steps.append(f"$m = {answer_numeric}$")
-            steps.append("")
-            steps.append(f"**Final Answer:** ${answer_numeric}$")
+        steps = LazySteps(_slope_steps, a, b, c, d, slope, answer_numeric)
 
     else:
         # Hard: Find t value for a given point
         # Use simple parametric equations and compute a point on the curve
-        a = random.randint(2, 4)
-        b = random.randint(1, 3)
-        t_val = random.randint(2, 4)
-        use_word_problem = random.random() < 0.4
+        a = rng.randint(2, 4)
+        b = rng.randint(1, 3)
+        t_val = rng.randint(2, 4)
+        use_word_problem = rng.random() < 0.4
 
         # x = at, y = t²
         x_point = a * t_val
         y_point = t_val ** 2
 
         if use_word_problem:
-            context = random.choice([p for p in PARAMETRIC_WORD_PROBLEMS if p["difficulty"] == 3])
+            context = rng.choice([p for p in PARAMETRIC_WORD_PROBLEMS if p["difficulty"] == 3])
             question = f"{context['context']}\n\n"
             question += f"The parametric equations are $x = {a}t$ and $y = t^2$.\n\n"
             question += f"At what value of $t$ is the object at point $({x_point}, {y_point})$?"
         else:
             question = f"Given the parametric equations $x = {a}t$ and $y = t^2$, find the value of $t$ when the point is $({x_point}, {y_point})$."
 
-        steps = [
-            f"We need to find $t$ such that both coordinates match: $x = {x_point}$ and $y = {y_point}$.",
-            "",
-            "**Method: Use the $x$ equation to solve for $t$**",
-            f"$x = {a}t = {x_point}$",
-            f"$t = \\frac{{{x_point}}}{{{a}}}$",
-            f"$t = {t_val}$",
-            "",
-            "**Verify with the $y$ equation:**",
-            f"$y = t^2 = ({t_val})^2 = {y_point}$ ✓",
-            "",
-            f"Both equations check out, so the parameter value is correct.",
-            "",
-            f"**Final Answer:** ${t_val}$"
-        ]
+        steps = LazySteps(_parameter_steps, x_point, y_point, a, t_val)
 
         answer_numeric = t_val
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _x_value_steps(a: int, b: int, t_val: int, x_result: int) -> List[str]:
+    """Steps for evaluating x(t) at a given t."""
+    return [
+        f"We have the equation $x = {a}t {b:+d}$",
+        "",
+        f"To find the position at $t = {t_val}$, substitute this value:",
+        f"$x = {a}({t_val}) {b:+d}$",
+        f"$x = {a * t_val} {b:+d}$",
+        f"$x = {x_result}$",
+        "",
+        f"**Final Answer:** ${x_result}$ units"
+    ]
+
+
+def _y_value_steps(c: int, d: int, t_val: int, y_result: int) -> List[str]:
+    """Steps for evaluating y(t) at a given t."""
+    return [
+        f"We have the equation $y = {c}t {d:+d}$",
+        "",
+        f"To find the position at $t = {t_val}$, substitute this value:",
+        f"$y = {c}({t_val}) {d:+d}$",
+        f"$y = {c * t_val} {d:+d}$",
+        f"$y = {y_result}$",
+        "",
+        f"**Final Answer:** ${y_result}$ units"
+    ]
+
+
+def _slope_steps(a: int, b: int, c: int, d: int, slope: float, answer_numeric: float) -> List[str]:
+    """Steps for eliminating t to find the slope of a linear path."""
+    steps = [
+        "**Step 1:** Solve for $t$ from the $x$ equation:",
+        f"$x = {a}t {b:+d}$",
+        f"$x {-b:+d} = {a}t$",
+        f"$t = \\frac{{x {-b:+d}}}{{{a}}}$",
+        "",
+        "**Step 2:** Substitute this expression for $t$ into the $y$ equation:",
+        f"$y = {c}t {d:+d}$",
+        f"$y = {c} \\cdot \\frac{{x {-b:+d}}}{{{a}}} {d:+d}$",
+        f"$y = {format_frac(c, a)}x - {format_frac(c * b, a)} {d:+d}$",
+        "",
+        "**Step 3:** Identify the slope from the equation $y = mx + b$:",
+        f"The slope is $m = {format_frac(c, a)}$",
+    ]
+
+    if slope == int(slope):
+        steps.append(f"$m = {int(slope)}$")
+        steps.append("")
+        steps.append(f"**Final Answer:** ${int(slope)}$")
+    else:
+        steps.append(f"$m = {answer_numeric}$")
+        steps.append("")
+        steps.append(f"**Final Answer:** ${answer_numeric}$")
+    return steps
+
+
+def _parameter_steps(x_point: int, y_point: int, a: int, t_val: int) -> List[str]:
+    """Steps for recovering t from a point on the curve."""
+    return [
+        f"We need to find $t$ such that both coordinates match: $x = {x_point}$ and $y = {y_point}$.",
+        "",
+        "**Method: Use the $x$ equation to solve for $t$**",
+        f"$x = {a}t = {x_point}$",
+        f"$t = {format_frac(x_point, a)}$",
+        f"$t = {t_val}$",
+        "",
+        "**Verify with the $y$ equation:**",
+        f"$y = t^2 = ({t_val})^2 = {y_point}$ ✓",
+        "",
+        f"Both equations check out, so the parameter value is correct.",
+        "",
+        f"**Final Answer:** ${t_val}$"
+    ]
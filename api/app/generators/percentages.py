@@ -1,7 +1,12 @@
 """Percentages question generator with engaging word problems."""
 
 import random
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
+from app.generators.vectorized import Variant, int_values, whole_or_decimal
 
 # Word problem templates for percentages
 PERCENTAGE_WORD_PROBLEMS = {
@@ -27,7 +32,11 @@ PERCENTAGE_WORD_PROBLEMS = {
 }
 
 
-def generate_percentages(difficulty: int = 1) -> Dict[str, Any]:
+def generate_percentages(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a percentages problem.
 
@@ -36,169 +45,235 @@ def generate_percentages(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - find percentage of a number)
             2 (medium - percentage increase/decrease)
             3 (hard - reverse percentage problems)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     # Use word problems 50% of the time
-    use_word_problem = random.random() < 0.5
+    use_word_problem = rng.random() < 0.5
 
     if difficulty == 1:
         # Easy: What is X% of Y?
-        percent = random.choice([10, 20, 25, 30, 40, 50, 60, 75, 80, 90])
-        number = random.randint(20, 200)
+        percent = rng.choice([10, 20, 25, 30, 40, 50, 60, 75, 80, 90])
+        number = rng.randint(20, 200)
 
         # Make sure result is reasonable
         if percent == 25:
-            number = random.choice([20, 40, 60, 80, 100, 120, 140, 160, 180, 200])
+            number = rng.choice([20, 40, 60, 80, 100, 120, 140, 160, 180, 200])
         elif percent == 75:
-            number = random.choice([20, 40, 60, 80, 100, 120, 140, 160, 180, 200])
+            number = rng.choice([20, 40, 60, 80, 100, 120, 140, 160, 180, 200])
 
         # Calculate answer
-        decimal = percent / 100
         answer = (percent * number) / 100
+        row = {"percent": percent, "number": number, "answer": answer}
 
         # Generate word problem
         if use_word_problem:
-            wp = random.choice(PERCENTAGE_WORD_PROBLEMS["find_percent"])
+            wp = rng.choice(PERCENTAGE_WORD_PROBLEMS["find_percent"])
             question = wp["template"].format(number=number, percent=percent)
-            steps.append(f"**Problem:** {question}")
-            steps.append(f"**Identify:** Find ${percent}\\%$ of ${number}$")
+            steps = LazySteps(
+                _word_problem_steps, question, f"Find ${percent}\\%$ of ${number}$", _vector_percent_of_steps, row
+            )
         else:
             question = f"What is ${percent}\\%$ of ${number}$?"
-            steps.append(f"What is ${percent}\\%$ of ${number}$?")
-
-        steps.append("**Rule:** To find a percentage of a number, convert the percentage to a decimal and multiply")
-        steps.append(f"**Step 1:** Convert ${percent}\\%$ to a decimal:")
-        steps.append(f"${percent}\\% = {percent} \\div 100 = {decimal}$")
-
-        steps.append(f"**Step 2:** Multiply by ${number}$:")
-        steps.append(f"${decimal} \\times {number} = {answer}$")
+            steps = LazySteps(_vector_percent_of_steps, row)
 
     elif difficulty == 2:
         # Medium: Percentage increase or decrease
-        operation = random.choice(['increase', 'decrease'])
-        original = random.randint(50, 500)
-        percent = random.choice([10, 15, 20, 25, 30, 40, 50])
-
-        if operation == 'increase':
-            # Generate word problem
-            if use_word_problem:
-                wp = random.choice(PERCENTAGE_WORD_PROBLEMS["increase"])
-                question = wp["template"].format(original=original, percent=percent)
-                steps.append(f"**Problem:** {question}")
-                steps.append(f"**Identify:** Increase ${original}$ by ${percent}\\%$")
-            else:
-                question = f"Increase ${original}$ by ${percent}\\%$"
-                steps.append(f"Increase ${original}$ by ${percent}\\%$")
-
-            steps.append("**Rule:** For percentage increase, find the percentage amount and add it to the original")
-
-            steps.append(f"**Step 1:** Find ${percent}\\%$ of ${original}$:")
-            decimal = percent / 100
-            steps.append(f"${percent}\\% = {decimal}$")
-            increase_amount = (percent * original) / 100
-            steps.append(f"${decimal} \\times {original} = {increase_amount}$")
-
-            steps.append(f"**Step 2:** Add the increase to the original:")
-            answer = original + increase_amount
-            steps.append(f"${original} + {increase_amount} = {answer}$")
-
-            # Alternative method
-            steps.append("**Alternative method:** Multiply by $(1 + {percent}\\%)$:")
-            multiplier = 1 + (percent / 100)
-            steps.append(f"${original} \\times {multiplier} = {answer}$")
+        operation = rng.choice(['increase', 'decrease'])
+        original = rng.randint(50, 500)
+        percent = rng.choice([10, 15, 20, 25, 30, 40, 50])
+
+        amount = (percent * original) / 100
+        direction = "Increase" if operation == 'increase' else "Decrease"
+        answer = original + amount if operation == 'increase' else original - amount
+        row = {"direction": direction, "original": original, "percent": percent, "amount": amount, "answer": answer}
+
+        # Generate word problem
+        if use_word_problem:
+            wp = rng.choice(PERCENTAGE_WORD_PROBLEMS[operation])
+            question = wp["template"].format(original=original, percent=percent)
+            steps = LazySteps(
+                _word_problem_steps, question, f"{direction} ${original}$ by ${percent}\\%$", _vector_change_steps, row
+            )
         else:
-            # Generate word problem
-            if use_word_problem:
-                wp = random.choice(PERCENTAGE_WORD_PROBLEMS["decrease"])
-                question = wp["template"].format(original=original, percent=percent)
-                steps.append(f"**Problem:** {question}")
-                steps.append(f"**Identify:** Decrease ${original}$ by ${percent}\\%$")
-            else:
-                question = f"Decrease ${original}$ by ${percent}\\%$"
-                steps.append(f"Decrease ${original}$ by ${percent}\\%$")
-
-            steps.append("**Rule:** For percentage decrease, find the percentage amount and subtract it from the original")
-
-            steps.append(f"**Step 1:** Find ${percent}\\%$ of ${original}$:")
-            decimal = percent / 100
-            steps.append(f"${percent}\\% = {decimal}$")
-            decrease_amount = (percent * original) / 100
-            steps.append(f"${decimal} \\times {original} = {decrease_amount}$")
-
-            steps.append(f"**Step 2:** Subtract the decrease from the original:")
-            answer = original - decrease_amount
-            steps.append(f"${original} - {decrease_amount} = {answer}$")
-
-            # Alternative method
-            steps.append("**Alternative method:** Multiply by $(1 - {percent}\\%)$:")
-            multiplier = 1 - (percent / 100)
-            steps.append(f"${original} \\times {multiplier} = {answer}$")
+            question = f"{direction} ${original}$ by ${percent}\\%$"
+            steps = LazySteps(_vector_change_steps, row)
 
     else:  # difficulty == 3
         # Hard: Reverse percentage problems
-        problem_type = random.choice(['what_percent', 'find_original'])
+        problem_type = rng.choice(['what_percent', 'find_original'])
 
         if problem_type == 'what_percent':
             # What percent of X is Y?
-            whole = random.randint(20, 100)
-            percent = random.choice([10, 15, 20, 25, 30, 40, 50, 60, 75, 80])
+            whole = rng.randint(20, 100)
+            percent = rng.choice([10, 15, 20, 25, 30, 40, 50, 60, 75, 80])
             part = (percent * whole) / 100
-
-            steps.append(f"What percent of ${whole}$ is ${part}$?")
-            steps.append("**Rule:** To find what percent, divide the part by the whole and multiply by 100")
-
-            steps.append(f"**Step 1:** Divide the part by the whole:")
-            ratio = part / whole
-            steps.append(f"$\\frac{{{part}}}{{{whole}}} = {ratio}$")
-
-            steps.append(f"**Step 2:** Convert to percentage by multiplying by 100:")
-            answer = ratio * 100
-            steps.append(f"${ratio} \\times 100 = {answer}\\%$")
-
-            answer_str = f"{int(answer)}%"
-            steps.append(f"**Final Answer:** ${int(answer)}\\%$")
-
-            return {
-                "question": f"What percent of ${whole}$ is ${part}$?",
-                "answer": answer_str,
-                "steps": steps,
-                "difficulty": difficulty,
-            }
+            answer = int(part / whole * 100)
+
+            return GeneratedQuestion(
+                question=f"What percent of ${whole}$ is ${part}$?",
+                answer=f"{answer}%",
+                steps=LazySteps(_vector_what_percent_steps, {"whole": whole, "part": part, "answer": answer}),
+                difficulty=difficulty,
+            )
         else:
             # X is Y% of what number?
-            percent = random.choice([10, 20, 25, 40, 50, 80])
-            original = random.randint(50, 200)
+            percent = rng.choice([10, 20, 25, 40, 50, 80])
+            original = rng.randint(50, 200)
             part = (percent * original) / 100
 
-            steps.append(f"${part}$ is ${percent}\\%$ of what number?")
-            steps.append("**Rule:** To find the whole when given a part and percentage, divide the part by the percentage (as a decimal)")
-
-            steps.append(f"**Step 1:** Convert ${percent}\\%$ to a decimal:")
-            decimal = percent / 100
-            steps.append(f"${percent}\\% = {decimal}$")
-
-            steps.append(f"**Step 2:** Divide the part by the decimal:")
-            answer = part / decimal
-            steps.append(f"$\\frac{{{part}}}{{{decimal}}} = {answer}$")
-
-            # Verification
-            steps.append(f"**Verification:** Check that ${percent}\\%$ of ${answer}$ equals ${part}$:")
-            steps.append(f"${decimal} \\times {answer} = {part}$ ✓")
+            question = f"${part}$ is ${percent}\\%$ of what number?"
+            # part / decimal, without its floating-point error (5.7 / 0.1 = 56.99...)
+            answer = original
+            steps = LazySteps(_vector_find_original_steps, {"part": part, "percent": percent, "original": original})
 
     # Convert answer to int if it's a whole number
     if answer == int(answer):
         answer = int(answer)
 
-    steps.append(f"**Final Answer:** ${answer}$")
-
-    return {
-        "question": f"Calculate the percentage" if difficulty > 1 else f"What is ${percent}\\%$ of ${number}$?",
-        "answer": str(answer),
-        "answer_numeric": float(answer) if isinstance(answer, (int, float)) else answer,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer),
+        answer_numeric=float(answer) if isinstance(answer, (int, float)) else answer,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _word_problem_steps(
+    question: str, identify: str, steps: Callable[[Dict[str, Any]], List[str]], row: Dict[str, Any]
+) -> List[str]:
+    """Steps for a word problem: restate it, then solve the plain form."""
+    return [f"**Problem:** {question}", f"**Identify:** {identify}"] + steps(row)[1:]
+
+
+# Step builders shared by generate_percentages and the vectorized batches
+def _vector_percent_of_steps(row: Dict[str, Any]) -> List[str]:
+    percent, number, answer = row["percent"], row["number"], row["answer"]
+    decimal = percent / 100
+    return [
+        f"What is ${percent}\\%$ of ${number}$?",
+        "**Rule:** To find a percentage of a number, convert the percentage to a decimal and multiply",
+        f"**Step 1:** Convert ${percent}\\%$ to a decimal:",
+        f"${percent}\\% = {percent} \\div 100 = {decimal}$",
+        f"**Step 2:** Multiply by ${number}$:",
+        f"${decimal} \\times {number} = {answer}$",
+        f"**Final Answer:** ${whole_or_decimal(answer)}$",
+    ]
+
+
+def _vector_change_steps(row: Dict[str, Any]) -> List[str]:
+    original, percent, answer = row["original"], row["percent"], row["answer"]
+    increase = row["direction"] == "Increase"
+    word, step_word, sign = ("increase", "Add the increase to", "+") if increase else ("decrease", "Subtract the decrease from", "-")
+    decimal = percent / 100
+    amount = row["amount"]
+    return [
+        f"{row['direction']} ${original}$ by ${percent}\\%$",
+        f"**Rule:** For percentage {word}, find the percentage amount and "
+        f"{'add it to' if increase else 'subtract it from'} the original",
+        f"**Step 1:** Find ${percent}\\%$ of ${original}$:",
+        f"${percent}\\% = {decimal}$",
+        f"${decimal} \\times {original} = {amount}$",
+        f"**Step 2:** {step_word} the original:",
+        f"${original} {sign} {amount} = {answer}$",
+        f"**Alternative method:** Multiply by $(1 {sign} {percent}\\%)$:",
+        f"${original} \\times {1 + decimal if increase else 1 - decimal} = {answer}$",
+        f"**Final Answer:** ${whole_or_decimal(answer)}$",
+    ]
+
+
+def _vector_what_percent_steps(row: Dict[str, Any]) -> List[str]:
+    whole, part = row["whole"], row["part"]
+    ratio = part / whole
+    return [
+        f"What percent of ${whole}$ is ${part}$?",
+        "**Rule:** To find what percent, divide the part by the whole and multiply by 100",
+        "**Step 1:** Divide the part by the whole:",
+        f"${format_frac(part, whole)} = {ratio}$",
+        "**Step 2:** Convert to percentage by multiplying by 100:",
+        f"${ratio} \\times 100 = {ratio * 100}\\%$",
+        f"**Final Answer:** ${row['answer']}\\%$",
+    ]
+
+
+def _vector_find_original_steps(row: Dict[str, Any]) -> List[str]:
+    part, percent, original = row["part"], row["percent"], row["original"]
+    decimal = percent / 100
+    return [
+        f"${part}$ is ${percent}\\%$ of what number?",
+        "**Rule:** To find the whole when given a part and percentage, divide the part by the percentage (as a decimal)",
+        f"**Step 1:** Convert ${percent}\\%$ to a decimal:",
+        f"${percent}\\% = {decimal}$",
+        "**Step 2:** Divide the part by the decimal:",
+        f"${format_frac(part, decimal)} = {original}$",
+        f"**Verification:** Check that ${percent}\\%$ of ${original}$ equals ${part}$:",
+        f"${decimal} \\times {original} = {part}$ ✓",
+        f"**Final Answer:** ${original}$",
+    ]
+
+
+def _vector_change_variant(direction: str, sign: int) -> Variant:
+    return Variant(
+        fields=[("original", int_values(50, 500)), ("percent", (10, 15, 20, 25, 30, 40, 50))],
+        compute=lambda p: {
+            "direction": direction,
+            "amount": p["percent"] * p["original"] / 100,
+            "answer": p["original"] + sign * (p["percent"] * p["original"] / 100),
+        },
+        question="{direction} ${original}$ by ${percent}\\%$",
+        answer="{answer_text}",
+        labels={"answer_text": (("answer",), whole_or_decimal)},
+        steps=_vector_change_steps,
+    )
+
+
+# Vectorized batches (see app.generators.vectorized) cover the plain forms of
+# each difficulty; word problems are only generated one at a time. 25% and
+# 75% keep their round-number bases, weighted like the single-question draw.
+VECTORIZED_VARIANTS = {
+    1: (
+        Variant(
+            fields=[("percent", (10, 20, 30, 40, 50, 60, 80, 90)), ("number", int_values(20, 200))],
+            compute=lambda p: {"answer": p["percent"] * p["number"] / 100},
+            question="What is ${percent}\\%$ of ${number}$?",
+            answer="{answer_text}",
+            labels={"answer_text": (("answer",), whole_or_decimal)},
+            steps=_vector_percent_of_steps,
+            weight=8,
+        ),
+        Variant(
+            fields=[("percent", (25, 75)), ("number", int_values(20, 200, step=20))],
+            compute=lambda p: {"answer": p["percent"] * p["number"] / 100},
+            question="What is ${percent}\\%$ of ${number}$?",
+            answer="{answer_text}",
+            labels={"answer_text": (("answer",), whole_or_decimal)},
+            steps=_vector_percent_of_steps,
+            weight=2,
+        ),
+    ),
+    2: (
+        _vector_change_variant("Increase", 1),
+        _vector_change_variant("Decrease", -1),
+    ),
+    3: (
+        Variant(
+            fields=[("whole", int_values(20, 100)), ("percent", (10, 15, 20, 25, 30, 40, 50, 60, 75, 80))],
+            compute=lambda p: {"part": p["percent"] * p["whole"] / 100, "answer": p["percent"]},
+            question="What percent of ${whole}$ is ${part}$?",
+            answer="{answer}%",
+            steps=_vector_what_percent_steps,
+        ),
+        Variant(
+            fields=[("percent", (10, 20, 25, 40, 50, 80)), ("original", int_values(50, 200))],
+            compute=lambda p: {"part": p["percent"] * p["original"] / 100, "answer": p["original"]},
+            question="${part}$ is ${percent}\\%$ of what number?",
+            steps=_vector_find_original_steps,
+        ),
+    ),
+}
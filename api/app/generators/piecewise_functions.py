@@ -1,7 +1,10 @@
 """Piecewise functions question generator."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world applications of piecewise functions
 PIECEWISE_CONTEXTS = [
@@ -32,34 +35,42 @@ PIECEWISE_CONTEXTS = [
 ]
 
 
-def generate_piecewise_functions(difficulty: int = 1) -> Dict[str, Any]:
+def generate_piecewise_functions(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a piecewise function evaluation problem.
 
     Args:
         difficulty: 1 (simple two-piece), 2 (three-piece), 3 (boundary values)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Two-piece linear function
-        a1 = random.randint(2, 5)
-        b1 = random.randint(-5, 5)
-        a2 = random.randint(2, 5)
-        b2 = random.randint(-5, 5)
-        cutoff = random.randint(0, 3)
+        a1 = rng.randint(2, 5)
+        b1 = rng.randint(-5, 5)
+        a2 = rng.randint(2, 5)
+        b2 = rng.randint(-5, 5)
+        cutoff = rng.randint(0, 3)
 
         # Choose evaluation point
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Evaluate in first piece
-            x_val = cutoff - random.randint(1, 3)
+            x_val = cutoff - rng.randint(1, 3)
             result = a1 * x_val + b1
             piece_used = "first"
             condition = f"x < {cutoff}"
         else:
             # Evaluate in second piece
-            x_val = cutoff + random.randint(1, 3)
+            x_val = cutoff + rng.randint(1, 3)
             result = a2 * x_val + b2
             piece_used = "second"
             condition = f"x \\geq {cutoff}"
@@ -70,39 +81,25 @@ def generate_piecewise_functions(difficulty: int = 1) -> Dict[str, Any]:
         question += f"{a2}x {b2:+d} & \\text{{if }} x \\geq {cutoff}\n"
         question += "\\end{cases}$"
 
-        steps = [
-            f"We need to evaluate $f({x_val})$.",
-            "",
-            f"First, determine which piece to use:",
-            f"Since ${x_val}$ satisfies ${condition}$, we use the {piece_used} piece.",
-            "",
-            f"The {piece_used} piece is: $f(x) = {a1 if piece_used == 'first' else a2}x {(b1 if piece_used == 'first' else b2):+d}$",
-            "",
-            f"Substitute $x = {x_val}$:",
-            f"$f({x_val}) = {a1 if piece_used == 'first' else a2}({x_val}) {(b1 if piece_used == 'first' else b2):+d}$",
-            f"$f({x_val}) = {(a1 if piece_used == 'first' else a2) * x_val} {(b1 if piece_used == 'first' else b2):+d}$",
-            f"$f({x_val}) = {result}$",
-            "",
-            f"**Final Answer:** ${result}$"
-        ]
+        steps = LazySteps(_two_piece_steps, x_val, condition, piece_used, a1, b1, a2, b2, result)
 
         answer_numeric = result
 
     elif difficulty == 2:
         # Medium: Three-piece function
-        c1 = random.randint(-3, -1)
-        c2 = random.randint(1, 3)
+        c1 = rng.randint(-3, -1)
+        c2 = rng.randint(1, 3)
 
         # Define three pieces
         pieces = [
             (f"x^2", lambda x: x**2, f"x < {c1}"),
-            (f"{random.randint(2, 4)}x", lambda x: random.randint(2, 4) * x, f"{c1} \\leq x < {c2}"),
-            (f"{random.randint(1, 3)}", lambda x: random.randint(1, 3), f"x \\geq {c2}")
+            (f"{rng.randint(2, 4)}x", lambda x: rng.randint(2, 4) * x, f"{c1} \\leq x < {c2}"),
+            (f"{rng.randint(1, 3)}", lambda x: rng.randint(1, 3), f"x \\geq {c2}")
         ]
 
         # Store the constant and coefficient for middle piece
-        middle_coef = random.randint(2, 4)
-        constant_val = random.randint(1, 3)
+        middle_coef = rng.randint(2, 4)
+        constant_val = rng.randint(1, 3)
         pieces = [
             (f"x^2", lambda x: x**2, f"x < {c1}"),
             (f"{middle_coef}x", lambda x: middle_coef * x, f"{c1} \\leq x < {c2}"),
@@ -110,15 +107,15 @@ def generate_piecewise_functions(difficulty: int = 1) -> Dict[str, Any]:
         ]
 
         # Choose which piece to evaluate
-        piece_choice = random.randint(0, 2)
+        piece_choice = rng.randint(0, 2)
         if piece_choice == 0:
-            x_val = c1 - random.randint(1, 2)
+            x_val = c1 - rng.randint(1, 2)
             result = x_val ** 2
         elif piece_choice == 1:
-            x_val = random.randint(c1, c2 - 1)
+            x_val = rng.randint(c1, c2 - 1)
             result = middle_coef * x_val
         else:
-            x_val = c2 + random.randint(0, 2)
+            x_val = c2 + rng.randint(0, 2)
             result = constant_val
 
         question = f"Evaluate the piecewise function at $x = {x_val}$:\n\n"
@@ -128,45 +125,15 @@ def generate_piecewise_functions(difficulty: int = 1) -> Dict[str, Any]:
         question += f"{constant_val} & \\text{{if }} x \\geq {c2}\n"
         question += "\\end{cases}$"
 
-        steps = [
-            f"We need to evaluate $f({x_val})$.",
-            "",
-            "Determine which piece to use:",
-        ]
-
-        if piece_choice == 0:
-            steps.extend([
-                f"Since ${x_val} < {c1}$, we use the first piece: $f(x) = x^2$",
-                "",
-                f"Substitute $x = {x_val}$:",
-                f"$f({x_val}) = ({x_val})^2 = {result}$",
-            ])
-        elif piece_choice == 1:
-            steps.extend([
-                f"Since ${c1} \\leq {x_val} < {c2}$, we use the second piece: $f(x) = {middle_coef}x$",
-                "",
-                f"Substitute $x = {x_val}$:",
-                f"$f({x_val}) = {middle_coef}({x_val}) = {result}$",
-            ])
-        else:
-            steps.extend([
-                f"Since ${x_val} \\geq {c2}$, we use the third piece: $f(x) = {constant_val}$",
-                "",
-                f"This piece is constant, so $f({x_val}) = {constant_val}$",
-            ])
-
-        steps.extend([
-            "",
-            f"**Final Answer:** ${result}$"
-        ])
+        steps = LazySteps(_three_piece_steps, x_val, piece_choice, c1, c2, middle_coef, constant_val, result)
 
         answer_numeric = result
 
     else:
         # Hard: Boundary value evaluation
-        cutoff = random.randint(0, 3)
-        a = random.randint(2, 4)
-        b = random.randint(1, 5)
+        cutoff = rng.randint(0, 3)
+        a = rng.randint(2, 4)
+        b = rng.randint(1, 5)
 
         # Evaluate exactly at the boundary
         x_val = cutoff
@@ -178,33 +145,95 @@ def generate_piecewise_functions(difficulty: int = 1) -> Dict[str, Any]:
         question += f"{a}x + {b} & \\text{{if }} x \\geq {cutoff}\n"
         question += "\\end{cases}$"
 
-        steps = [
-            f"We need to evaluate $f({x_val})$.",
-            "",
-            f"Notice that $x = {x_val}$ is exactly at the boundary between the two pieces.",
-            "",
-            f"Check the conditions:",
-            f"- First piece applies when $x < {cutoff}$",
-            f"- Second piece applies when $x \\geq {cutoff}$",
-            "",
-            f"Since ${x_val} \\geq {cutoff}$ (equality holds), we use the second piece.",
+        steps = LazySteps(_boundary_steps, x_val, cutoff, a, b, result)
+
+        answer_numeric = result
+
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _two_piece_steps(x_val: int, condition: str, piece_used: str, a1: int, b1: int, a2: int,
+                     b2: int, result: int) -> List[str]:
+    """Steps for evaluating a two-piece linear function."""
+    return [
+        f"We need to evaluate $f({x_val})$.",
+        "",
+        f"First, determine which piece to use:",
+        f"Since ${x_val}$ satisfies ${condition}$, we use the {piece_used} piece.",
+        "",
+        f"The {piece_used} piece is: $f(x) = {a1 if piece_used == 'first' else a2}x {(b1 if piece_used == 'first' else b2):+d}$",
+        "",
+        f"Substitute $x = {x_val}$:",
+        f"$f({x_val}) = {a1 if piece_used == 'first' else a2}({x_val}) {(b1 if piece_used == 'first' else b2):+d}$",
+        f"$f({x_val}) = {(a1 if piece_used == 'first' else a2) * x_val} {(b1 if piece_used == 'first' else b2):+d}$",
+        f"$f({x_val}) = {result}$",
+        "",
+        f"**Final Answer:** ${result}$"
+    ]
+
+
+def _three_piece_steps(x_val: int, piece_choice: int, c1: int, c2: int, middle_coef: int,
+                       constant_val: int, result: int) -> List[str]:
+    """Steps for evaluating a three-piece function."""
+    steps = [
+        f"We need to evaluate $f({x_val})$.",
+        "",
+        "Determine which piece to use:",
+    ]
+
+    if piece_choice == 0:
+        steps.extend([
+            f"Since ${x_val} < {c1}$, we use the first piece: $f(x) = x^2$",
             "",
-            f"The second piece is: $f(x) = {a}x + {b}$",
+            f"Substitute $x = {x_val}$:",
+            f"$f({x_val}) = ({x_val})^2 = {result}$",
+        ])
+    elif piece_choice == 1:
+        steps.extend([
+            f"Since ${c1} \\leq {x_val} < {c2}$, we use the second piece: $f(x) = {middle_coef}x$",
             "",
             f"Substitute $x = {x_val}$:",
-            f"$f({x_val}) = {a}({x_val}) + {b}$",
-            f"$f({x_val}) = {a * x_val} + {b}$",
-            f"$f({x_val}) = {result}$",
+            f"$f({x_val}) = {middle_coef}({x_val}) = {result}$",
+        ])
+    else:
+        steps.extend([
+            f"Since ${x_val} \\geq {c2}$, we use the third piece: $f(x) = {constant_val}$",
             "",
-            f"**Final Answer:** ${result}$"
-        ]
-
-        answer_numeric = result
+            f"This piece is constant, so $f({x_val}) = {constant_val}$",
+        ])
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    steps.extend([
+        "",
+        f"**Final Answer:** ${result}$"
+    ])
+    return steps
+
+
+def _boundary_steps(x_val: int, cutoff: int, a: int, b: int, result: int) -> List[str]:
+    """Steps for evaluating a piecewise function exactly at its cutoff."""
+    return [
+        f"We need to evaluate $f({x_val})$.",
+        "",
+        f"Notice that $x = {x_val}$ is exactly at the boundary between the two pieces.",
+        "",
+        f"Check the conditions:",
+        f"- First piece applies when $x < {cutoff}$",
+        f"- Second piece applies when $x \\geq {cutoff}$",
+        "",
+        f"Since ${x_val} \\geq {cutoff}$ (equality holds), we use the second piece.",
+        "",
+        f"The second piece is: $f(x) = {a}x + {b}$",
+        "",
+        f"Substitute $x = {x_val}$:",
+        f"$f({x_val}) = {a}({x_val}) + {b}$",
+        f"$f({x_val}) = {a * x_val} + {b}$",
+        f"$f({x_val}) = {result}$",
+        "",
+        f"**Final Answer:** ${result}$"
+    ]
@@ -2,7 +2,11 @@
 
 import random
 import math
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Word problem templates for engaging, real-world contexts
 POLAR_WORD_PROBLEMS = [
@@ -39,24 +43,32 @@ POLAR_WORD_PROBLEMS = [
 ]
 
 
-def generate_polar_coordinates(difficulty: int = 1) -> Dict[str, Any]:
+def generate_polar_coordinates(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a polar coordinates conversion problem.
 
     Args:
         difficulty: 1 (polar to rectangular), 2 (rectangular to polar - r), 3 (rectangular to polar - θ)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Convert polar to rectangular (find x or y)
         # Use special angles for clean answers
         angles_deg = [0, 30, 45, 60, 90, 120, 135, 150, 180]
-        angle_deg = random.choice(angles_deg)
+        angle_deg = rng.choice(angles_deg)
         angle_rad = math.radians(angle_deg)
-        r = random.randint(2, 6)
-        use_word_problem = random.random() < 0.4
+        r = rng.randint(2, 6)
+        use_word_problem = rng.random() < 0.4
 
         x = r * math.cos(angle_rad)
         y = r * math.sin(angle_rad)
@@ -66,56 +78,26 @@ def generate_polar_coordinates(difficulty: int = 1) -> Dict[str, Any]:
         y = round(y, 2)
 
         # Choose whether to ask for x or y
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             if use_word_problem:
-                context = random.choice([p for p in POLAR_WORD_PROBLEMS if p["difficulty"] == 1])
+                context = rng.choice([p for p in POLAR_WORD_PROBLEMS if p["difficulty"] == 1])
                 context_text = context["context"].format(angle_deg=angle_deg, r=r, x=x, y=y)
                 question = f"{context_text}\n\nConvert to rectangular coordinates and find the $x$-coordinate."
             else:
                 question = f"Convert the polar coordinates $(r, \\theta) = ({r}, {angle_deg}°)$ to rectangular coordinates and find the $x$-coordinate."
 
-            cos_val_str = {
-                0: "1", 30: "\\frac{\\sqrt{3}}{2}", 45: "\\frac{\\sqrt{2}}{2}",
-                60: "\\frac{1}{2}", 90: "0", 120: "-\\frac{1}{2}",
-                135: "-\\frac{\\sqrt{2}}{2}", 150: "-\\frac{\\sqrt{3}}{2}", 180: "-1"
-            }.get(angle_deg, f"\\cos({angle_deg}°)")
-
-            steps = [
-                "Use the conversion formula: $x = r\\cos(\\theta)$",
-                "",
-                f"Calculate the $x$-coordinate:",
-                f"$x = r\\cos(\\theta) = {r} \\cdot \\cos({angle_deg}°)$",
-                f"$x = {r} \\cdot {cos_val_str}$",
-                f"$x \\approx {x}$",
-                "",
-                f"**Final Answer:** ${x}$"
-            ]
+            steps = LazySteps(_x_coordinate_steps, angle_deg, r, x)
 
             answer_numeric = x
         else:
             if use_word_problem:
-                context = random.choice([p for p in POLAR_WORD_PROBLEMS if p["difficulty"] == 1])
+                context = rng.choice([p for p in POLAR_WORD_PROBLEMS if p["difficulty"] == 1])
                 context_text = context["context"].format(angle_deg=angle_deg, r=r, x=x, y=y)
                 question = f"{context_text}\n\nConvert to rectangular coordinates and find the $y$-coordinate."
             else:
                 question = f"Convert the polar coordinates $(r, \\theta) = ({r}, {angle_deg}°)$ to rectangular coordinates and find the $y$-coordinate."
 
-            sin_val_str = {
-                0: "0", 30: "\\frac{1}{2}", 45: "\\frac{\\sqrt{2}}{2}",
-                60: "\\frac{\\sqrt{3}}{2}", 90: "1", 120: "\\frac{\\sqrt{3}}{2}",
-                135: "\\frac{\\sqrt{2}}{2}", 150: "\\frac{1}{2}", 180: "0"
-            }.get(angle_deg, f"\\sin({angle_deg}°)")
-
-            steps = [
-                "Use the conversion formula: $y = r\\sin(\\theta)$",
-                "",
-                f"Calculate the $y$-coordinate:",
-                f"$y = r\\sin(\\theta) = {r} \\cdot \\sin({angle_deg}°)$",
-                f"$y = {r} \\cdot {sin_val_str}$",
-                f"$y \\approx {y}$",
-                "",
-                f"**Final Answer:** ${y}$"
-            ]
+            steps = LazySteps(_y_coordinate_steps, angle_deg, r, y)
 
             answer_numeric = y
 
@@ -123,34 +105,23 @@ def generate_polar_coordinates(difficulty: int = 1) -> Dict[str, Any]:
         # Medium: Convert rectangular to polar (find r)
         # Use Pythagorean triples scaled
         triples = [(3, 4, 5), (5, 12, 13), (8, 15, 17), (6, 8, 10)]
-        x, y, r = random.choice(triples)
-        use_word_problem = random.random() < 0.4
+        x, y, r = rng.choice(triples)
+        use_word_problem = rng.random() < 0.4
 
         # Randomly negate coordinates
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             x = -x
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             y = -y
 
         if use_word_problem:
-            context = random.choice([p for p in POLAR_WORD_PROBLEMS if p["difficulty"] == 2])
+            context = rng.choice([p for p in POLAR_WORD_PROBLEMS if p["difficulty"] == 2])
             context_text = context["context"].format(x=x, y=y, r=r)
             question = f"{context_text}\n\nConvert to polar coordinates and find $r$ (the distance from the origin)."
         else:
             question = f"Convert the rectangular coordinates $({x}, {y})$ to polar coordinates and find $r$ (the distance from the origin)."
 
-        steps = [
-            "To convert from rectangular to polar coordinates, use the distance formula:",
-            "$r = \\sqrt{x^2 + y^2}$",
-            "",
-            f"Substitute the values:",
-            f"$r = \\sqrt{{({x})^2 + ({y})^2}}$",
-            f"$r = \\sqrt{{{x**2} + {y**2}}}$",
-            f"$r = \\sqrt{{{x**2 + y**2}}}$",
-            f"$r = {r}$ units",
-            "",
-            f"**Final Answer:** ${r}$ units"
-        ]
+        steps = LazySteps(_radius_steps, x, y, r)
 
         answer_numeric = r
 
@@ -165,51 +136,113 @@ def generate_polar_coordinates(difficulty: int = 1) -> Dict[str, Any]:
             90: (0, 1),
         }
 
-        angle_deg = random.choice([30, 45, 60])
+        angle_deg = rng.choice([30, 45, 60])
         base_x, base_y = angle_points[angle_deg]
-        use_word_problem = random.random() < 0.4
+        use_word_problem = rng.random() < 0.4
 
         # Scale the point
-        scale = random.randint(2, 4)
+        scale = rng.randint(2, 4)
         x = round(base_x * scale, 2)
         y = round(base_y * scale, 2)
 
         if use_word_problem:
-            context = random.choice([p for p in POLAR_WORD_PROBLEMS if p["difficulty"] == 3])
+            context = rng.choice([p for p in POLAR_WORD_PROBLEMS if p["difficulty"] == 3])
             context_text = context["context"].format(x=x, y=y, angle_deg=angle_deg)
             question = f"{context_text}\n\nConvert to polar coordinates and find $\\theta$ in degrees (in the range $[0°, 360°)$). Round to the nearest whole degree."
         else:
             question = f"Convert the rectangular coordinates $({x}, {y})$ to polar coordinates (in the range $[0°, 360°)$) and find $\\theta$ in degrees. Round to the nearest whole degree."
 
-        steps = [
-            "To find the angle from rectangular coordinates, use:",
-            "$\\theta = \\arctan\\left(\\frac{y}{x}\\right)$",
-            "",
-            f"Substitute the values:",
-            f"$\\theta = \\arctan\\left(\\frac{{{y}}}{{{x}}}\\right)$",
-        ]
-
-        # Simplify the fraction if possible
-        if y == x:
-            steps.append(f"$\\theta = \\arctan(1) = 45°$")
-        else:
-            ratio = round(y / x, 2)
-            steps.append(f"$\\theta = \\arctan({ratio})$")
-
-        steps.extend([
-            "",
-            f"Since both $x > 0$ and $y > 0$, the point is in Quadrant I (northeast direction).",
-            f"$\\theta \\approx {angle_deg}°$",
-            "",
-            f"**Final Answer:** ${angle_deg}°$"
-        ])
+        steps = LazySteps(_angle_steps, x, y, angle_deg)
 
         answer_numeric = angle_deg
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _x_coordinate_steps(angle_deg: int, r: int, x: float) -> List[str]:
+    """Steps for x = r cos(θ) at a special angle."""
+    cos_val_str = {
+        0: "1", 30: "\\frac{\\sqrt{3}}{2}", 45: "\\frac{\\sqrt{2}}{2}",
+        60: "\\frac{1}{2}", 90: "0", 120: "-\\frac{1}{2}",
+        135: "-\\frac{\\sqrt{2}}{2}", 150: "-\\frac{\\sqrt{3}}{2}", 180: "-1"
+    }.get(angle_deg, f"\\cos({angle_deg}°)")
+
+    return [
+        "Use the conversion formula: $x = r\\cos(\\theta)$",
+        "",
+        f"Calculate the $x$-coordinate:",
+        f"$x = r\\cos(\\theta) = {r} \\cdot \\cos({angle_deg}°)$",
+        f"$x = {r} \\cdot {cos_val_str}$",
+        f"$x \\approx {x}$",
+        "",
+        f"**Final Answer:** ${x}$"
+    ]
+
+
+def _y_coordinate_steps(angle_deg: int, r: int, y: float) -> List[str]:
+    """Steps for y = r sin(θ) at a special angle."""
+    sin_val_str = {
+        0: "0", 30: "\\frac{1}{2}", 45: "\\frac{\\sqrt{2}}{2}",
+        60: "\\frac{\\sqrt{3}}{2}", 90: "1", 120: "\\frac{\\sqrt{3}}{2}",
+        135: "\\frac{\\sqrt{2}}{2}", 150: "\\frac{1}{2}", 180: "0"
+    }.get(angle_deg, f"\\sin({angle_deg}°)")
+
+    return [
+        "Use the conversion formula: $y = r\\sin(\\theta)$",
+        "",
+        f"Calculate the $y$-coordinate:",
+        f"$y = r\\sin(\\theta) = {r} \\cdot \\sin({angle_deg}°)$",
+        f"$y = {r} \\cdot {sin_val_str}$",
+        f"$y \\approx {y}$",
+        "",
+        f"**Final Answer:** ${y}$"
+    ]
+
+
+def _radius_steps(x: int, y: int, r: int) -> List[str]:
+    """Steps for r = sqrt(x² + y²)."""
+    return [
+        "To convert from rectangular to polar coordinates, use the distance formula:",
+        "$r = \\sqrt{x^2 + y^2}$",
+        "",
+        f"Substitute the values:",
+        f"$r = \\sqrt{{({x})^2 + ({y})^2}}$",
+        f"$r = \\sqrt{{{x**2} + {y**2}}}$",
+        f"$r = \\sqrt{{{x**2 + y**2}}}$",
+        f"$r = {r}$ units",
+        "",
+        f"**Final Answer:** ${r}$ units"
+    ]
+
+
+def _angle_steps(x: float, y: float, angle_deg: int) -> List[str]:
+    """Steps for θ = arctan(y/x) in Quadrant I."""
+    steps = [
+        "To find the angle from rectangular coordinates, use:",
+        "$\\theta = \\arctan\\left(\\frac{y}{x}\\right)$",
+        "",
+        f"Substitute the values:",
+        f"$\\theta = \\arctan\\left({format_frac(y, x)}\\right)$",
+    ]
+
+    # Simplify the fraction if possible
+    if y == x:
+        steps.append(f"$\\theta = \\arctan(1) = 45°$")
+    else:
+        ratio = round(y / x, 2)
+        steps.append(f"$\\theta = \\arctan({ratio})$")
+
+    steps.extend([
+        "",
+        f"Since both $x > 0$ and $y > 0$, the point is in Quadrant I (northeast direction).",
+        f"$\\theta \\approx {angle_deg}°$",
+        "",
+        f"**Final Answer:** ${angle_deg}°$"
+    ])
+    return steps
@@ -0,0 +1,241 @@
+"""
+Dense single-variable polynomials with exact coefficients.
+
+Shared by the polynomial generators: a Polynomial stores its coefficients
+as a tuple indexed by degree, so adding and multiplying are plain loops
+over arrays (multiplication is a convolution of the two coefficient
+tuples), and division is exact, with int coefficients kept as ints and
+Fractions used only when a division does not come out even.
+"""
+
+from fractions import Fraction
+from math import gcd
+from typing import Iterable, List, Mapping, NamedTuple, Tuple, Union
+
+from app.generators.latex import format_polynomial
+
+Number = Union[int, Fraction]
+
+
+class Polynomial:
+    """
+    Immutable polynomial in x.
+
+    coeffs[i] is the coefficient of x^i; trailing zeros are dropped, so the
+    zero polynomial has no coefficients and degree -1. LaTeX comes from the
+    memoized app.generators.latex formatters and is kept per instance.
+    """
+
+    __slots__ = ("coeffs", "_latex")
+
+    def __init__(self, coeffs: Iterable[Number] = ()):
+        coeffs = tuple(coeffs)
+        end = len(coeffs)
+        while end and coeffs[end - 1] == 0:
+            end -= 1
+        self.coeffs: Tuple[Number, ...] = coeffs if end == len(coeffs) else coeffs[:end]
+        self._latex = None
+
+    @classmethod
+    def from_terms(cls, terms: Mapping[int, Number]) -> "Polynomial":
+        """Build from a degree -> coefficient mapping."""
+        if not terms:
+            return cls()
+        coeffs = [0] * (max(terms) + 1)
+        for degree in terms:
+            coeffs[degree] = terms[degree]
+        return cls(coeffs)
+
+    @classmethod
+    def monomial(cls, coeff: Number, degree: int) -> "Polynomial":
+        """coeff·x^degree."""
+        return cls([0] * degree + [coeff])
+
+    @classmethod
+    def linear(cls, a: Number, b: Number) -> "Polynomial":
+        """ax + b."""
+        return cls((b, a))
+
+    @property
+    def degree(self) -> int:
+        return len(self.coeffs) - 1
+
+    @property
+    def leading(self) -> Number:
+        """Leading coefficient (0 for the zero polynomial)."""
+        return self.coeffs[-1] if self.coeffs else 0
+
+    def __getitem__(self, degree: int) -> Number:
+        """Coefficient of x^degree (0 beyond the degree)."""
+        return self.coeffs[degree] if 0 <= degree < len(self.coeffs) else 0
+
+    def terms(self) -> List[Tuple[int, Number]]:
+        """(degree, coefficient) pairs of the nonzero terms, highest degree first."""
+        coeffs = self.coeffs
+        return [(degree, coeffs[degree]) for degree in range(len(coeffs) - 1, -1, -1) if coeffs[degree]]
+
+    def content(self) -> int:
+        """GCD of the (integer) coefficients."""
+        result = 0
+        for coeff in self.coeffs:
+            result = gcd(result, coeff)
+        return result
+
+    def __bool__(self) -> bool:
+        return bool(self.coeffs)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Polynomial):
+            return self.coeffs == other.coeffs
+        if isinstance(other, (int, Fraction)):
+            return self.coeffs == Polynomial((other,)).coeffs
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.coeffs)
+
+    def __repr__(self) -> str:
+        return f"Polynomial({list(self.coeffs)})"
+
+    def __neg__(self) -> "Polynomial":
+        return Polynomial(-coeff for coeff in self.coeffs)
+
+    def __add__(self, other: Union["Polynomial", Number]) -> "Polynomial":
+        other = _coerce(other)
+        if other is NotImplemented:
+            return other
+        longer, shorter = (self.coeffs, other.coeffs) if len(self.coeffs) >= len(other.coeffs) else (other.coeffs, self.coeffs)
+        coeffs = list(longer)
+        for degree, coeff in enumerate(shorter):
+            coeffs[degree] += coeff
+        return Polynomial(coeffs)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Union["Polynomial", Number]) -> "Polynomial":
+        other = _coerce(other)
+        if other is NotImplemented:
+            return other
+        return self + -other
+
+    def __rsub__(self, other: Number) -> "Polynomial":
+        return -self + other
+
+    def __mul__(self, other: Union["Polynomial", Number]) -> "Polynomial":
+        if not isinstance(other, Polynomial):
+            if isinstance(other, (int, Fraction)):
+                return Polynomial(coeff * other for coeff in self.coeffs)
+            return NotImplemented
+        if not self.coeffs or not other.coeffs:
+            return Polynomial()
+
+        # Convolution of the coefficient arrays
+        result = [0] * (len(self.coeffs) + len(other.coeffs) - 1)
+        for i, a in enumerate(self.coeffs):
+            if a:
+                for j, b in enumerate(other.coeffs):
+                    result[i + j] += a * b
+        return Polynomial(result)
+
+    __rmul__ = __mul__
+
+    def __pow__(self, exponent: int) -> "Polynomial":
+        if exponent < 0:
+            raise ValueError("Polynomial exponent must be non-negative")
+        result = Polynomial((1,))
+        for _ in range(exponent):
+            result = result * self
+        return result
+
+    def __call__(self, x: Number) -> Number:
+        """Evaluate at x (Horner's method)."""
+        result = 0
+        for coeff in reversed(self.coeffs):
+            result = result * x + coeff
+        return result
+
+    def __divmod__(self, divisor: "Polynomial") -> Tuple["Polynomial", "Polynomial"]:
+        if divisor.degree == 1 and divisor.leading == 1:
+            quotient, remainder = self.synthetic_division(-divisor[0])
+            return quotient, Polynomial((remainder,))
+        quotient, remainder, _ = self.long_division(divisor)
+        return quotient, remainder
+
+    def __floordiv__(self, divisor: "Polynomial") -> "Polynomial":
+        return divmod(self, divisor)[0]
+
+    def __mod__(self, divisor: "Polynomial") -> "Polynomial":
+        return divmod(self, divisor)[1]
+
+    def synthetic_division(self, root: Number) -> Tuple["Polynomial", Number]:
+        """
+        Divide by (x - root).
+
+        Returns:
+            (quotient, remainder), where the remainder equals self(root)
+        """
+        if not self.coeffs:
+            return Polynomial(), 0
+        carried = []
+        value = 0
+        for coeff in reversed(self.coeffs):
+            value = value * root + coeff
+            carried.append(value)
+        remainder = carried.pop()
+        return Polynomial(reversed(carried)), remainder
+
+    def long_division(self, divisor: "Polynomial") -> Tuple["Polynomial", "Polynomial", List["DivisionStage"]]:
+        """
+        Divide by another polynomial, recording each step.
+
+        Returns:
+            (quotient, remainder, stages), one DivisionStage per quotient term
+
+        Raises:
+            ZeroDivisionError: If divisor is the zero polynomial
+        """
+        if not divisor:
+            raise ZeroDivisionError("Polynomial division by zero")
+
+        quotient: List[Number] = [0] * max(self.degree - divisor.degree + 1, 0)
+        remainder = self
+        stages = []
+        while remainder and remainder.degree >= divisor.degree:
+            shift = remainder.degree - divisor.degree
+            term = Polynomial.monomial(_exact_div(remainder.leading, divisor.leading), shift)
+            product = term * divisor
+            stages.append(DivisionStage(remainder, term, product, remainder - product))
+            quotient[shift] = term.leading
+            remainder = remainder - product
+        return Polynomial(quotient), remainder, stages
+
+    def latex(self) -> str:
+        """LaTeX for the polynomial, e.g. "2x^2 - x + 3"."""
+        if self._latex is None:
+            self._latex = format_polynomial(self.coeffs)
+        return self._latex
+
+
+class DivisionStage(NamedTuple):
+    """One step of long division: dividend ÷ divisor's leading term gives term."""
+
+    dividend: Polynomial
+    term: Polynomial
+    product: Polynomial
+    remainder: Polynomial
+
+
+def _coerce(value: Union[Polynomial, Number]) -> Polynomial:
+    if isinstance(value, Polynomial):
+        return value
+    if isinstance(value, (int, Fraction)):
+        return Polynomial((value,))
+    return NotImplemented
+
+
+def _exact_div(a: Number, b: Number) -> Number:
+    """a / b, staying an int when it divides evenly."""
+    if isinstance(a, int) and isinstance(b, int) and a % b == 0:
+        return a // b
+    result = Fraction(a) / b
+    return result.numerator if result.denominator == 1 else result
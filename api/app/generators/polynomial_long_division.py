@@ -1,7 +1,12 @@
 """Polynomial long division question generator."""
 
 import random
-from typing import Dict, Any, List, Tuple
+from typing import List, Optional
+from app.generators.latex import format_frac
+from app.generators.polynomial import Polynomial
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Contextual word problems for polynomial division
 POLYNOMIAL_DIVISION_CONTEXTS = [
@@ -24,149 +29,99 @@ POLYNOMIAL_DIVISION_CONTEXTS = [
 ]
 
 
-def generate_polynomial_long_division(difficulty: int = 1) -> Dict[str, Any]:
+def generate_polynomial_long_division(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a polynomial long division problem.
 
     Args:
-        difficulty: 1 (divide by linear), 2 (with remainder), 3 (divide by quadratic)
+        difficulty: 1 (divide by linear), 2 (with remainder), 3 (cubic or quartic by linear)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Divide quadratic by linear, no remainder
         # (x + a)(x + b) = x² + (a+b)x + ab
-        a = random.randint(1, 4)
-        b = random.randint(1, 4)
-
-        # Dividend: x² + (a+b)x + ab
-        # Divisor: x + a
-        # Quotient: x + b
-
-        coef_x = a + b
-        constant = a * b
-
-        dividend_str = f"x^2 {coef_x:+d}x {constant:+d}"
-        divisor_str = f"x {a:+d}"
-        quotient_str = f"x {b:+d}"
-
-        question = f"Divide using polynomial long division: $\\frac{{{dividend_str}}}{{{divisor_str}}}$. What is the coefficient of the constant term in the quotient?"
-
-        steps = [
-            f"Divide ${dividend_str}$ by ${divisor_str}$ using long division.",
-            "",
-            "**Step 1:** Divide the leading terms:",
-            f"$\\frac{{x^2}}{{x}} = x$",
-            "",
-            f"**Step 2:** Multiply $x$ by ${divisor_str}$:",
-            f"$x \\cdot ({divisor_str}) = x^2 {a:+d}x$",
-            "",
-            "**Step 3:** Subtract from the dividend:",
-            f"$(x^2 {coef_x:+d}x {constant:+d}) - (x^2 {a:+d}x) = {b}x {constant:+d}$",
-            "",
-            "**Step 4:** Divide the new leading terms:",
-            f"$\\frac{{{b}x}}{{x}} = {b}$",
-            "",
-            f"**Step 5:** Multiply ${b}$ by ${divisor_str}$:",
-            f"${b} \\cdot ({divisor_str}) = {b}x {a*b:+d}$",
-            "",
-            "**Step 6:** Subtract:",
-            f"$({b}x {constant:+d}) - ({b}x {a*b:+d}) = 0$",
-            "",
-            f"The quotient is ${quotient_str}$ with remainder $0$.",
-            "",
-            f"**Final Answer:** ${b}$"
-        ]
-
+        a = rng.randint(1, 4)
+        b = rng.randint(1, 4)
+
+        divisor = Polynomial.linear(1, a)
+        quotient = Polynomial.linear(1, b)
+        remainder = 0
+        ask = "What is the coefficient of the constant term in the quotient?"
+        conclusion = f"The constant term of the quotient is ${b}$."
         answer_numeric = b
 
     elif difficulty == 2:
         # Medium: Division with remainder
-        # Create (x + a)(x + b) + r where r is a small remainder
-        a = random.randint(1, 3)
-        b = random.randint(1, 4)
-        r = random.randint(1, 5)
-
-        # Dividend: x² + (a+b)x + ab + r
-        coef_x = a + b
-        constant = a * b + r
-
-        dividend_str = f"x^2 {coef_x:+d}x {constant:+d}"
-        divisor_str = f"x {a:+d}"
-        quotient_str = f"x {b:+d}"
-
-        question = f"Divide using polynomial long division: $\\frac{{{dividend_str}}}{{{divisor_str}}}$. What is the remainder?"
-
-        steps = [
-            f"Divide ${dividend_str}$ by ${divisor_str}$ using long division.",
-            "",
-            "**Step 1:** Divide the leading terms:",
-            f"$\\frac{{x^2}}{{x}} = x$",
-            "",
-            f"**Step 2:** Multiply and subtract:",
-            f"$x \\cdot ({divisor_str}) = x^2 {a:+d}x$",
-            f"$(x^2 {coef_x:+d}x {constant:+d}) - (x^2 {a:+d}x) = {b}x {constant:+d}$",
-            "",
-            "**Step 3:** Divide the new leading terms:",
-            f"$\\frac{{{b}x}}{{x}} = {b}$",
-            "",
-            f"**Step 4:** Multiply and subtract:",
-            f"${b} \\cdot ({divisor_str}) = {b}x {a*b:+d}$",
-            f"$({b}x {constant:+d}) - ({b}x {a*b:+d}) = {r}$",
-            "",
-            f"The quotient is ${quotient_str}$ with remainder ${r}$.",
-            "",
-            f"**Final Answer:** ${r}$"
-        ]
-
+        # (x + a)(x + b) + r where r is a small remainder
+        a = rng.randint(1, 3)
+        b = rng.randint(1, 4)
+        r = rng.randint(1, 5)
+
+        divisor = Polynomial.linear(1, a)
+        quotient = Polynomial.linear(1, b)
+        remainder = r
+        ask = "What is the remainder?"
+        conclusion = None
         answer_numeric = r
 
     else:
-        # Hard: Divide cubic by linear
-        # (x² + bx + c)(x + a) = x³ + ax² + bx² + abx + cx + ac
-        #                      = x³ + (a+b)x² + (ab+c)x + ac
-        a = random.randint(1, 3)
-        b = random.randint(1, 3)
-        c = random.randint(1, 4)
-
-        coef_x2 = a + b
-        coef_x = a * b + c
-        constant = a * c
-
-        dividend_str = f"x^3 {coef_x2:+d}x^2 {coef_x:+d}x {constant:+d}"
-        divisor_str = f"x {a:+d}"
-        quotient_str = f"x^2 {b:+d}x {c:+d}"
-
-        question = f"Divide using polynomial long division: $\\frac{{{dividend_str}}}{{{divisor_str}}}$. What is the coefficient of $x$ in the quotient?"
-
-        steps = [
-            f"Divide ${dividend_str}$ by ${divisor_str}$ using long division.",
-            "",
-            "**Step 1:** Divide leading terms: $\\frac{{x^3}}{{x}} = x^2$",
-            f"Multiply and subtract: $x^2 \\cdot ({divisor_str}) = x^3 {a:+d}x^2$",
-            f"Remainder: ${b}x^2 {coef_x:+d}x {constant:+d}$",
-            "",
-            "**Step 2:** Divide leading terms: $\\frac{{{b}x^2}}{{x}} = {b}x$",
-            f"Multiply and subtract: ${b}x \\cdot ({divisor_str}) = {b}x^2 {a*b:+d}x$",
-            f"Remainder: ${c}x {constant:+d}$",
-            "",
-            "**Step 3:** Divide leading terms: $\\frac{{{c}x}}{{x}} = {c}$",
-            f"Multiply and subtract: ${c} \\cdot ({divisor_str}) = {c}x {a*c:+d}$",
-            f"Remainder: $0$",
-            "",
-            f"The quotient is ${quotient_str}$.",
-            f"The coefficient of $x$ is ${b}$.",
-            "",
-            f"**Final Answer:** ${b}$"
-        ]
-
-        answer_numeric = b
-
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+        # Hard: Divide a cubic or quartic by linear
+        # (x^n + ... + bx + c)(x + a), asking for b
+        a = rng.randint(1, 3)
+        quotient_degree = rng.choice([2, 3])
+        middle = [rng.randint(1, 3) for _ in range(quotient_degree - 1)]
+        c = rng.randint(1, 4)
+
+        divisor = Polynomial.linear(1, a)
+        quotient = Polynomial([c] + middle + [1])
+        remainder = 0
+        ask = "What is the coefficient of $x$ in the quotient?"
+        conclusion = f"The coefficient of $x$ is ${quotient[1]}$."
+        answer_numeric = quotient[1]
+
+    dividend = divisor * quotient + remainder
+    question = (
+        f"Divide using polynomial long division: "
+        f"${format_frac(dividend.latex(), divisor.latex())}$. {ask}"
+    )
+
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=LazySteps(_render_steps, dividend, divisor, conclusion, answer_numeric),
+        difficulty=difficulty,
+    )
+
+
+def _render_steps(dividend: Polynomial, divisor: Polynomial, conclusion: Optional[str], answer: int) -> List[str]:
+    """Render the long division one quotient term at a time."""
+    quotient, remainder, stages = dividend.long_division(divisor)
+    divisor_str = divisor.latex()
+    divisor_lead = Polynomial.monomial(divisor.leading, divisor.degree).latex()
+
+    steps = [f"Divide ${dividend.latex()}$ by ${divisor_str}$ using long division.", ""]
+    for number, stage in enumerate(stages, 1):
+        lead = Polynomial.monomial(stage.dividend.leading, stage.dividend.degree).latex()
+        term = stage.term.latex()
+        steps.append(f"**Step {number}:** Divide the leading terms: ${format_frac(lead, divisor_lead)} = {term}$")
+        steps.append(f"Multiply and subtract: ${term} \\cdot ({divisor_str}) = {stage.product.latex()}$")
+        steps.append(f"Remainder: ${stage.remainder.latex()}$")
+        steps.append("")
+
+    steps.append(f"The quotient is ${quotient.latex()}$ with remainder ${remainder.latex()}$.")
+    if conclusion:
+        steps.append(conclusion)
+    steps.append("")
+    steps.append(f"**Final Answer:** ${answer}$")
+    return steps
@@ -1,7 +1,12 @@
 """Polynomial operations question generator."""
 
 import random
-from typing import Dict, Any, List, Tuple
+from typing import List, Tuple, Optional
+from app.generators.latex import format_term
+from app.generators.polynomial import Polynomial
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for polynomial operations
 POLYNOMIAL_OPERATION_CONTEXTS = [
@@ -28,7 +33,11 @@ POLYNOMIAL_OPERATION_CONTEXTS = [
 ]
 
 
-def generate_polynomial_operation(difficulty: int = 1) -> Dict[str, Any]:
+def generate_polynomial_operation(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate polynomial addition, subtraction, or multiplication problems.
 
@@ -39,200 +48,126 @@ def generate_polynomial_operation(difficulty: int = 1) -> Dict[str, Any]:
             3 (medium-hard - multiply binomials)
             4 (hard - multiply polynomial by binomial)
             5 (very hard - multiply two polynomials)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     if difficulty <= 2:
         # Addition or subtraction
-        operation = random.choice(["add", "subtract"])
-        poly1, poly1_str = _generate_polynomial(difficulty, max_degree=2)
-        poly2, poly2_str = _generate_polynomial(difficulty, max_degree=2)
+        operation = rng.choice(["add", "subtract"])
+        poly1, poly1_str = _generate_polynomial(rng, difficulty, max_degree=2)
+        poly2, poly2_str = _generate_polynomial(rng, difficulty, max_degree=2)
 
         if operation == "add":
             question = f"Add: $({poly1_str}) + ({poly2_str})$"
-            steps.append(f"Add the polynomials: $({poly1_str}) + ({poly2_str})$")
-            steps.append("Combine like terms by adding coefficients of the same power:")
-            result = _add_polynomials(poly1, poly2)
+            result = poly1 + poly2
         else:
             question = f"Subtract: $({poly1_str}) - ({poly2_str})$"
-            steps.append(f"Subtract the polynomials: $({poly1_str}) - ({poly2_str})$")
-            steps.append("Combine like terms by subtracting coefficients of the same power:")
-            result = _subtract_polynomials(poly1, poly2)
-
-        answer_str = _polynomial_to_string(result)
-
-        # Show combining like terms
-        _show_combining_steps(poly1, poly2, result, steps, operation)
-
-        steps.append(f"**Final Answer:** ${answer_str}$")
+            result = poly1 - poly2
 
     else:
         # Multiplication
         if difficulty == 3:
             # Multiply two binomials (ax + b)(cx + d)
-            poly1, poly1_str = _generate_polynomial(1, max_degree=1, min_terms=2, max_terms=2)
-            poly2, poly2_str = _generate_polynomial(1, max_degree=1, min_terms=2, max_terms=2)
-            method = "FOIL"
+            poly1, poly1_str = _generate_polynomial(rng, 1, max_degree=1, min_terms=2, max_terms=2)
+            poly2, poly2_str = _generate_polynomial(rng, 1, max_degree=1, min_terms=2, max_terms=2)
+            operation = "FOIL"
         elif difficulty == 4:
             # Multiply binomial by trinomial
-            poly1, poly1_str = _generate_polynomial(1, max_degree=1, min_terms=2, max_terms=2)
-            poly2, poly2_str = _generate_polynomial(2, max_degree=2)
-            method = "distributive"
+            poly1, poly1_str = _generate_polynomial(rng, 1, max_degree=1, min_terms=2, max_terms=2)
+            poly2, poly2_str = _generate_polynomial(rng, 2, max_degree=2)
+            operation = "distributive"
         else:
             # Multiply two larger polynomials
-            poly1, poly1_str = _generate_polynomial(2, max_degree=2)
-            poly2, poly2_str = _generate_polynomial(2, max_degree=2)
-            method = "distributive"
+            poly1, poly1_str = _generate_polynomial(rng, 2, max_degree=2)
+            poly2, poly2_str = _generate_polynomial(rng, 2, max_degree=2)
+            operation = "distributive"
 
         question = f"Multiply: $({poly1_str})({poly2_str})$"
-        steps.append(f"Multiply the polynomials: $({poly1_str})({poly2_str})$")
+        result = poly1 * poly2
 
-        if method == "FOIL":
+    answer_str = result.latex()
+
+    return GeneratedQuestion(
+        question=question,
+        answer=answer_str,
+        steps=LazySteps(_render_steps, operation, poly1, poly2, poly1_str, poly2_str, result, answer_str),
+        difficulty=difficulty,
+    )
+
+
+def _render_steps(operation: str, poly1: Polynomial, poly2: Polynomial,
+                  poly1_str: str, poly2_str: str, result: Polynomial, answer_str: str) -> List[str]:
+    """Render the worked solution for a polynomial operation."""
+    steps = []
+
+    if operation == "add":
+        steps.append(f"Add the polynomials: $({poly1_str}) + ({poly2_str})$")
+        steps.append("Combine like terms by adding coefficients of the same power:")
+        _show_combining_steps(poly1, poly2, result, steps, operation)
+    elif operation == "subtract":
+        steps.append(f"Subtract the polynomials: $({poly1_str}) - ({poly2_str})$")
+        steps.append("Combine like terms by subtracting coefficients of the same power:")
+        _show_combining_steps(poly1, poly2, result, steps, operation)
+    else:
+        steps.append(f"Multiply the polynomials: $({poly1_str})({poly2_str})$")
+        if operation == "FOIL":
             steps.append("Use FOIL (First, Outer, Inner, Last):")
-            result, foil_steps = _multiply_polynomials_foil(poly1, poly2)
-            steps.extend(foil_steps)
+            steps.extend(_foil_steps(poly1, poly2))
         else:
             steps.append("Use the distributive property:")
-            result, dist_steps = _multiply_polynomials(poly1, poly2)
-            steps.extend(dist_steps)
+            steps.extend(_distributive_steps(poly1, poly2))
 
-        answer_str = _polynomial_to_string(result)
-        steps.append(f"**Final Answer:** ${answer_str}$")
+    steps.append(f"**Final Answer:** ${answer_str}$")
+    return steps
 
-    return {
-        "question": question,
-        "answer": answer_str,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
 
-
-def _generate_polynomial(difficulty: int, max_degree: int = 2,
-                        min_terms: int = 2, max_terms: int = 3) -> Tuple[Dict[int, int], str]:
+def _generate_polynomial(rng: random.Random, difficulty: int, max_degree: int = 2,
+                        min_terms: int = 2, max_terms: int = 3) -> Tuple[Polynomial, str]:
     """
     Generate a random polynomial.
 
     Returns:
-        (coefficients_dict, latex_string)
-        coefficients_dict maps degree -> coefficient
+        (polynomial, latex_string)
     """
-    poly = {}
-
     if difficulty == 1:
         coeff_range = (-5, 5)
     else:
         coeff_range = (-10, 10)
 
     # Decide number of terms
-    num_terms = random.randint(min_terms, min(max_terms, max_degree + 1))
+    num_terms = rng.randint(min_terms, min(max_terms, max_degree + 1))
 
     # Generate terms
-    degrees = random.sample(range(0, max_degree + 1), num_terms)
+    degrees = rng.sample(range(0, max_degree + 1), num_terms)
 
+    terms = {}
     for degree in degrees:
-        coeff = random.randint(coeff_range[0], coeff_range[1])
+        coeff = rng.randint(coeff_range[0], coeff_range[1])
         while coeff == 0:
-            coeff = random.randint(coeff_range[0], coeff_range[1])
-        poly[degree] = coeff
-
-    poly_str = _polynomial_to_string(poly)
-    return poly, poly_str
+            coeff = rng.randint(coeff_range[0], coeff_range[1])
+        terms[degree] = coeff
 
+    poly = Polynomial.from_terms(terms)
+    return poly, poly.latex()
 
-def _polynomial_to_string(poly: Dict[int, int]) -> str:
-    """Convert polynomial dict to LaTeX string."""
-    if not poly:
-        return "0"
-
-    # Sort by degree (descending)
-    terms = []
-    for degree in sorted(poly.keys(), reverse=True):
-        coeff = poly[degree]
-
-        if coeff == 0:
-            continue
-
-        # Format term
-        if degree == 0:
-            # Constant term
-            term = str(abs(coeff))
-        elif degree == 1:
-            # Linear term
-            if abs(coeff) == 1:
-                term = "x"
-            else:
-                term = f"{abs(coeff)}x"
-        else:
-            # Higher degree term
-            if abs(coeff) == 1:
-                term = f"x^{degree}"
-            else:
-                term = f"{abs(coeff)}x^{degree}"
 
-        # Add sign
-        if not terms:  # First term
-            if coeff < 0:
-                term = "-" + term
-        else:  # Subsequent terms
-            if coeff > 0:
-                term = "+ " + term
-            else:
-                term = "- " + term
-
-        terms.append(term)
-
-    return " ".join(terms) if terms else "0"
-
-
-def _add_polynomials(poly1: Dict[int, int], poly2: Dict[int, int]) -> Dict[int, int]:
-    """Add two polynomials."""
-    result = poly1.copy()
-
-    for degree, coeff in poly2.items():
-        result[degree] = result.get(degree, 0) + coeff
-
-    # Remove zero coefficients
-    result = {d: c for d, c in result.items() if c != 0}
-
-    return result
-
-
-def _subtract_polynomials(poly1: Dict[int, int], poly2: Dict[int, int]) -> Dict[int, int]:
-    """Subtract poly2 from poly1."""
-    result = poly1.copy()
-
-    for degree, coeff in poly2.items():
-        result[degree] = result.get(degree, 0) - coeff
-
-    # Remove zero coefficients
-    result = {d: c for d, c in result.items() if c != 0}
-
-    return result
-
-
-def _multiply_polynomials(poly1: Dict[int, int], poly2: Dict[int, int]) -> Tuple[Dict[int, int], List[str]]:
-    """Multiply two polynomials using distributive property."""
+def _distributive_steps(poly1: Polynomial, poly2: Polynomial) -> List[str]:
+    """Show each term-by-term product of a distributive multiplication."""
     steps = []
-    result = {}
 
-    # Multiply each term in poly1 by each term in poly2
+    # Track each product for showing work
     products = []
 
-    for deg1, coeff1 in sorted(poly1.items(), reverse=True):
-        for deg2, coeff2 in sorted(poly2.items(), reverse=True):
-            new_degree = deg1 + deg2
-            new_coeff = coeff1 * coeff2
-
-            # Add to result
-            result[new_degree] = result.get(new_degree, 0) + new_coeff
-
-            # Track for showing work
-            term1 = _format_single_term(coeff1, deg1)
-            term2 = _format_single_term(coeff2, deg2)
-            product_term = _format_single_term(new_coeff, new_degree)
+    for deg1, coeff1 in poly1.terms():
+        for deg2, coeff2 in poly2.terms():
+            term1 = format_term(coeff1, deg1)
+            term2 = format_term(coeff2, deg2)
+            product_term = format_term(coeff1 * coeff2, deg1 + deg2)
             products.append(f"{term1} \\cdot {term2} = {product_term}")
 
     # Show multiplication steps
@@ -243,102 +178,65 @@ def _multiply_polynomials(poly1: Dict[int, int], poly2: Dict[int, int]) -> Tuple
     # Combine like terms
     steps.append("Combine like terms:")
 
-    # Remove zero coefficients
-    result = {d: c for d, c in result.items() if c != 0}
-
-    return result, steps
+    return steps
 
 
-def _multiply_polynomials_foil(poly1: Dict[int, int], poly2: Dict[int, int]) -> Tuple[Dict[int, int], List[str]]:
-    """Multiply two binomials using FOIL method."""
+def _foil_steps(poly1: Polynomial, poly2: Polynomial) -> List[str]:
+    """Show the First/Outer/Inner/Last products of two binomials."""
     steps = []
 
     # Extract terms (assuming binomials)
-    terms1 = sorted(poly1.items(), reverse=True)
-    terms2 = sorted(poly2.items(), reverse=True)
+    terms1 = poly1.terms()
+    terms2 = poly2.terms()
 
     if len(terms1) != 2 or len(terms2) != 2:
         # Fall back to regular multiplication
-        return _multiply_polynomials(poly1, poly2)
+        return _distributive_steps(poly1, poly2)
 
     (deg1_1, coeff1_1), (deg1_2, coeff1_2) = terms1
     (deg2_1, coeff2_1), (deg2_2, coeff2_2) = terms2
 
     # First
-    first_deg = deg1_1 + deg2_1
-    first_coeff = coeff1_1 * coeff2_1
-    first_term = _format_single_term(first_coeff, first_deg)
-    steps.append(f"**First:** {_format_single_term(coeff1_1, deg1_1)} \\cdot {_format_single_term(coeff2_1, deg2_1)} = {first_term}")
+    first_term = format_term(coeff1_1 * coeff2_1, deg1_1 + deg2_1)
+    steps.append(f"**First:** {format_term(coeff1_1, deg1_1)} \\cdot {format_term(coeff2_1, deg2_1)} = {first_term}")
 
     # Outer
     outer_deg = deg1_1 + deg2_2
     outer_coeff = coeff1_1 * coeff2_2
-    outer_term = _format_single_term(outer_coeff, outer_deg)
-    steps.append(f"**Outer:** {_format_single_term(coeff1_1, deg1_1)} \\cdot {_format_single_term(coeff2_2, deg2_2)} = {outer_term}")
+    outer_term = format_term(outer_coeff, outer_deg)
+    steps.append(f"**Outer:** {format_term(coeff1_1, deg1_1)} \\cdot {format_term(coeff2_2, deg2_2)} = {outer_term}")
 
     # Inner
     inner_deg = deg1_2 + deg2_1
     inner_coeff = coeff1_2 * coeff2_1
-    inner_term = _format_single_term(inner_coeff, inner_deg)
-    steps.append(f"**Inner:** {_format_single_term(coeff1_2, deg1_2)} \\cdot {_format_single_term(coeff2_1, deg2_1)} = {inner_term}")
+    inner_term = format_term(inner_coeff, inner_deg)
+    steps.append(f"**Inner:** {format_term(coeff1_2, deg1_2)} \\cdot {format_term(coeff2_1, deg2_1)} = {inner_term}")
 
     # Last
-    last_deg = deg1_2 + deg2_2
-    last_coeff = coeff1_2 * coeff2_2
-    last_term = _format_single_term(last_coeff, last_deg)
-    steps.append(f"**Last:** {_format_single_term(coeff1_2, deg1_2)} \\cdot {_format_single_term(coeff2_2, deg2_2)} = {last_term}")
-
-    # Combine
-    result = {}
-    result[first_deg] = result.get(first_deg, 0) + first_coeff
-    result[outer_deg] = result.get(outer_deg, 0) + outer_coeff
-    result[inner_deg] = result.get(inner_deg, 0) + inner_coeff
-    result[last_deg] = result.get(last_deg, 0) + last_coeff
+    last_term = format_term(coeff1_2 * coeff2_2, deg1_2 + deg2_2)
+    steps.append(f"**Last:** {format_term(coeff1_2, deg1_2)} \\cdot {format_term(coeff2_2, deg2_2)} = {last_term}")
 
     steps.append(f"Add the terms: ${first_term} + {outer_term} + {inner_term} + {last_term}$")
 
     # Simplify if needed
     if outer_deg == inner_deg and (outer_coeff + inner_coeff) != 0:
         combined = outer_coeff + inner_coeff
-        steps.append(f"Combine middle terms: ${outer_term} + {inner_term} = {_format_single_term(combined, outer_deg)}$")
-
-    # Remove zero coefficients
-    result = {d: c for d, c in result.items() if c != 0}
+        steps.append(f"Combine middle terms: ${outer_term} + {inner_term} = {format_term(combined, outer_deg)}$")
 
-    return result, steps
-
-
-def _format_single_term(coeff: int, degree: int) -> str:
-    """Format a single term for display."""
-    if degree == 0:
-        return str(coeff)
-    elif degree == 1:
-        if coeff == 1:
-            return "x"
-        elif coeff == -1:
-            return "-x"
-        else:
-            return f"{coeff}x"
-    else:
-        if coeff == 1:
-            return f"x^{degree}"
-        elif coeff == -1:
-            return f"-x^{degree}"
-        else:
-            return f"{coeff}x^{degree}"
+    return steps
 
 
-def _show_combining_steps(poly1: Dict[int, int], poly2: Dict[int, int],
-                          result: Dict[int, int], steps: List[str], operation: str) -> None:
+def _show_combining_steps(poly1: Polynomial, poly2: Polynomial,
+                          result: Polynomial, steps: List[str], operation: str) -> None:
     """Show step-by-step combining of like terms."""
 
     # Get all unique degrees
-    all_degrees = sorted(set(poly1.keys()) | set(poly2.keys()), reverse=True)
+    all_degrees = sorted({degree for degree, _ in poly1.terms()} | {degree for degree, _ in poly2.terms()}, reverse=True)
 
     for degree in all_degrees:
-        coeff1 = poly1.get(degree, 0)
-        coeff2 = poly2.get(degree, 0)
-        result_coeff = result.get(degree, 0)
+        coeff1 = poly1[degree]
+        coeff2 = poly2[degree]
+        result_coeff = result[degree]
 
         if degree == 0:
             var_str = ""
@@ -2,7 +2,11 @@
 
 import random
 import math
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for Pythagorean identities
 WORD_PROBLEMS = [
@@ -25,55 +29,48 @@ WORD_PROBLEMS = [
 ]
 
 
-def generate_pythagorean_identities(difficulty: int = 1) -> Dict[str, Any]:
+def generate_pythagorean_identities(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate problems using Pythagorean trigonometric identities.
 
     Args:
         difficulty: 1 (verify identity), 2 (find unknown trig value), 3 (simplify expressions)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Verify basic Pythagorean identity at standard angle
-        use_word_problem = random.random() < 0.4
+        use_word_problem = rng.random() < 0.4
         angles = [
             (30, "\\frac{\\pi}{6}", 0.5, math.sqrt(3)/2, "\\frac{1}{2}", "\\frac{\\sqrt{3}}{2}"),
             (45, "\\frac{\\pi}{4}", math.sqrt(2)/2, math.sqrt(2)/2, "\\frac{\\sqrt{2}}{2}", "\\frac{\\sqrt{2}}{2}"),
             (60, "\\frac{\\pi}{3}", math.sqrt(3)/2, 0.5, "\\frac{\\sqrt{3}}{2}", "\\frac{1}{2}"),
         ]
 
-        degrees, radian_str, sin_val, cos_val, sin_str, cos_str = random.choice(angles)
+        degrees, radian_str, sin_val, cos_val, sin_str, cos_str = rng.choice(angles)
 
         if use_word_problem:
             question = f"**Physics Application:** In oscillatory motion at angle ${degrees}°$, the vertical and horizontal components must conserve energy. Verify that $\\sin^2({degrees}°) + \\cos^2({degrees}°) = 1$ using exact values. This fundamental identity ensures energy is neither created nor destroyed."
         else:
             question = f"Verify that $\\sin^2({degrees}°) + \\cos^2({degrees}°) = 1$ using exact values."
 
-        steps = [
-            f"**Step 1 - Recall the exact values:**",
-            f"$\\sin({degrees}°) = {sin_str}$ and $\\cos({degrees}°) = {cos_str}$",
-            "",
-            f"**Step 2 - Square the sine value:**",
-            f"$\\sin^2({degrees}°) = ({sin_str})^2 = {round(sin_val**2, 4)}$",
-            "",
-            f"**Step 3 - Square the cosine value:**",
-            f"$\\cos^2({degrees}°) = ({cos_str})^2 = {round(cos_val**2, 4)}$",
-            "",
-            f"**Step 4 - Add the squared components together:**",
-            f"$\\sin^2({degrees}°) + \\cos^2({degrees}°) = {round(sin_val**2, 4)} + {round(cos_val**2, 4)} = 1$",
-            "",
-            "This demonstrates that the identity holds perfectly at this angle, confirming the fundamental relationship between sine and cosine.",
-            "**Final Answer:** Identity verified: $1$"
-        ]
+        steps = LazySteps(_verify_steps, degrees, sin_str, cos_str, sin_val, cos_val)
 
         answer_numeric = 1
 
     elif difficulty == 2:
         # Medium: Given sin, find cos (or vice versa) using Pythagorean identity
         # Use fractions for exact values
-        use_word_problem = random.random() < 0.4
+        use_word_problem = rng.random() < 0.4
         trig_values = [
             ("sin", 3, 5, 4, 5, "\\frac{3}{5}", "\\frac{4}{5}"),  # sin=3/5, cos=4/5
             ("sin", 5, 13, 12, 13, "\\frac{5}{13}", "\\frac{12}{13}"),  # sin=5/13, cos=12/13
@@ -82,7 +79,7 @@ def generate_pythagorean_identities(difficulty: int = 1) -> Dict[str, Any]:
             ("cos", 12, 13, 5, 13, "\\frac{5}{13}", "\\frac{12}{13}"),  # cos=12/13, sin=5/13
         ]
 
-        given_func, num, den, other_num, other_den, sin_str, cos_str = random.choice(trig_values)
+        given_func, num, den, other_num, other_den, sin_str, cos_str = rng.choice(trig_values)
 
         if given_func == "sin":
             given_str = sin_str
@@ -102,45 +99,9 @@ def generate_pythagorean_identities(difficulty: int = 1) -> Dict[str, Any]:
         else:
             question = f"If $\\{given_func}(\\theta) = {given_str}$ and $\\theta$ is in Quadrant I, find $\\{find_func}(\\theta)$."
 
-        steps = [
-            f"**Step 1 - Apply the Pythagorean identity:**",
-            f"The fundamental identity is: $\\sin^2(\\theta) + \\cos^2(\\theta) = 1$",
-            "",
-        ]
-
-        if given_func == "sin":
-            steps.append(f"**Step 2 - Substitute the known sine value:**")
-            steps.append(f"$({given_str})^2 + \\cos^2(\\theta) = 1$")
-            steps.append(f"$\\frac{{{num**2}}}{{{den**2}}} + \\cos^2(\\theta) = 1$")
-            steps.append("")
-            steps.append(f"**Step 3 - Isolate the cosine squared term:**")
-            steps.append(f"$\\cos^2(\\theta) = 1 - \\frac{{{num**2}}}{{{den**2}}}$")
-            steps.append(f"$\\cos^2(\\theta) = \\frac{{{den**2}}}{{{den**2}}} - \\frac{{{num**2}}}{{{den**2}}}$")
-            steps.append(f"$\\cos^2(\\theta) = \\frac{{{den**2 - num**2}}}{{{den**2}}}$")
-            steps.append("")
-            steps.append(f"**Step 4 - Take the square root of both sides:**")
-            steps.append(f"$\\cos(\\theta) = \\pm\\sqrt{{\\frac{{{den**2 - num**2}}}{{{den**2}}}}} = \\pm\\frac{{\\sqrt{{{den**2 - num**2}}}}}{{{den}}}$")
-            steps.append("")
-            steps.append(f"**Step 5 - Determine the sign based on quadrant:**")
-            steps.append(f"Since $\\theta$ is in Quadrant I, both sine and cosine are positive")
-            steps.append(f"$\\cos(\\theta) = \\frac{{{other_num}}}{{{other_den}}}$ (taking the positive root)")
-        else:
-            steps.append(f"**Step 2 - Substitute the known cosine value:**")
-            steps.append(f"$\\sin^2(\\theta) + ({given_str})^2 = 1$")
-            steps.append(f"$\\sin^2(\\theta) + \\frac{{{other_num**2}}}{{{other_den**2}}} = 1$")
-            steps.append("")
-            steps.append(f"**Step 3 - Isolate the sine squared term:**")
-            steps.append(f"$\\sin^2(\\theta) = 1 - \\frac{{{other_num**2}}}{{{other_den**2}}}$")
-            steps.append(f"$\\sin^2(\\theta) = \\frac{{{other_den**2 - other_num**2}}}{{{other_den**2}}}$")
-            steps.append("")
-            steps.append(f"**Step 4 - Take the square root:**")
-            steps.append(f"$\\sin(\\theta) = \\pm\\frac{{\\sqrt{{{other_den**2 - other_num**2}}}}}{{{other_den}}}$")
-            steps.append("")
-            steps.append(f"**Step 5 - Determine the sign (Quadrant I is positive):**")
-            steps.append(f"$\\sin(\\theta) = \\frac{{{num}}}{{{den}}}$")
-
-        steps.append("")
-        steps.append(f"**Final Answer:** $\\{find_func}(\\theta) = {find_str}$")
+        steps = LazySteps(
+            _find_other_steps, given_func, given_str, den, other_num, other_den, num, find_func, find_str
+        )
 
         answer_numeric = round(find_val, 4)
 
@@ -152,7 +113,7 @@ def generate_pythagorean_identities(difficulty: int = 1) -> Dict[str, Any]:
             "reciprocal"
         ]
 
-        expr_type = random.choice(expression_types)
+        expr_type = rng.choice(expression_types)
 
         if expr_type == "substitute":
             # Simplify using sin^2 + cos^2 = 1
@@ -202,10 +163,76 @@ def generate_pythagorean_identities(difficulty: int = 1) -> Dict[str, Any]:
 
             answer_numeric = 1
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _verify_steps(degrees: int, sin_str: str, cos_str: str, sin_val: float,
+                  cos_val: float) -> List[str]:
+    """Steps for checking sin² + cos² = 1 at a standard angle."""
+    return [
+        f"**Step 1 - Recall the exact values:**",
+        f"$\\sin({degrees}°) = {sin_str}$ and $\\cos({degrees}°) = {cos_str}$",
+        "",
+        f"**Step 2 - Square the sine value:**",
+        f"$\\sin^2({degrees}°) = ({sin_str})^2 = {round(sin_val**2, 4)}$",
+        "",
+        f"**Step 3 - Square the cosine value:**",
+        f"$\\cos^2({degrees}°) = ({cos_str})^2 = {round(cos_val**2, 4)}$",
+        "",
+        f"**Step 4 - Add the squared components together:**",
+        f"$\\sin^2({degrees}°) + \\cos^2({degrees}°) = {round(sin_val**2, 4)} + {round(cos_val**2, 4)} = 1$",
+        "",
+        "This demonstrates that the identity holds perfectly at this angle, confirming the fundamental relationship between sine and cosine.",
+        "**Final Answer:** Identity verified: $1$"
+    ]
+
+
+def _find_other_steps(given_func: str, given_str: str, den: int, other_num: int, other_den: int,
+                      num: int, find_func: str, find_str: str) -> List[str]:
+    """Steps for finding cos from sin (or sin from cos) in Quadrant I."""
+    steps = [
+        f"**Step 1 - Apply the Pythagorean identity:**",
+        f"The fundamental identity is: $\\sin^2(\\theta) + \\cos^2(\\theta) = 1$",
+        "",
+    ]
+
+    if given_func == "sin":
+        steps.append(f"**Step 2 - Substitute the known sine value:**")
+        steps.append(f"$({given_str})^2 + \\cos^2(\\theta) = 1$")
+        steps.append(f"${format_frac(num**2, den**2)} + \\cos^2(\\theta) = 1$")
+        steps.append("")
+        steps.append(f"**Step 3 - Isolate the cosine squared term:**")
+        steps.append(f"$\\cos^2(\\theta) = 1 - {format_frac(num**2, den**2)}$")
+        steps.append(f"$\\cos^2(\\theta) = {format_frac(den**2, den**2)} - {format_frac(num**2, den**2)}$")
+        steps.append(f"$\\cos^2(\\theta) = {format_frac(den**2 - num**2, den**2)}$")
+        steps.append("")
+        steps.append(f"**Step 4 - Take the square root of both sides:**")
+        steps.append(f"$\\cos(\\theta) = \\pm\\sqrt{{{format_frac(den**2 - num**2, den**2)}}} = \\pm\\frac{{\\sqrt{{{den**2 - num**2}}}}}{{{den}}}$")
+        steps.append("")
+        steps.append(f"**Step 5 - Determine the sign based on quadrant:**")
+        steps.append(f"Since $\\theta$ is in Quadrant I, both sine and cosine are positive")
+        steps.append(f"$\\cos(\\theta) = {format_frac(other_num, other_den)}$ (taking the positive root)")
+    else:
+        steps.append(f"**Step 2 - Substitute the known cosine value:**")
+        steps.append(f"$\\sin^2(\\theta) + ({given_str})^2 = 1$")
+        steps.append(f"$\\sin^2(\\theta) + {format_frac(other_num**2, other_den**2)} = 1$")
+        steps.append("")
+        steps.append(f"**Step 3 - Isolate the sine squared term:**")
+        steps.append(f"$\\sin^2(\\theta) = 1 - {format_frac(other_num**2, other_den**2)}$")
+        steps.append(f"$\\sin^2(\\theta) = {format_frac(other_den**2 - other_num**2, other_den**2)}$")
+        steps.append("")
+        steps.append(f"**Step 4 - Take the square root:**")
+        steps.append(f"$\\sin(\\theta) = \\pm\\frac{{\\sqrt{{{other_den**2 - other_num**2}}}}}{{{other_den}}}$")
+        steps.append("")
+        steps.append(f"**Step 5 - Determine the sign (Quadrant I is positive):**")
+        steps.append(f"$\\sin(\\theta) = {format_frac(num, den)}$")
+
+    steps.append("")
+    steps.append(f"**Final Answer:** $\\{find_func}(\\theta) = {find_str}$")
+    return steps
@@ -2,45 +2,48 @@
 
 import random
 import math
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 
-def generate_pythagorean_theorem(difficulty: int = 1) -> Dict[str, Any]:
+def generate_pythagorean_theorem(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a Pythagorean theorem problem: a² + b² = c²
 
     Args:
         difficulty: 1 (find hypotenuse), 2 (find leg), 3 (word problems)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Find hypotenuse with Pythagorean triples
         triples = [(3, 4, 5), (5, 12, 13), (8, 15, 17), (7, 24, 25), (6, 8, 10)]
-        a, b, c = random.choice(triples)
+        a, b, c = rng.choice(triples)
 
         question = f"A right triangle has legs of length $a = {a}$ and $b = {b}$. Find the length of the hypotenuse $c$."
 
-        steps = [
-            "We're using the Pythagorean theorem, which relates the sides of any right triangle: $a^2 + b^2 = c^2$",
-            f"Let's plug in our known values: ${a}^2 + {b}^2 = c^2$",
-            f"Now calculate the squares: ${a**2} + {b**2} = c^2$",
-            f"Add the left side together: ${a**2 + b**2} = c^2$",
-            f"To find $c$, take the square root of both sides: $c = \\sqrt{{{a**2 + b**2}}}$",
-            f"Simplify to get: $c = {c}$",
-            f"**Final Answer:** The hypotenuse measures $c = {c}$ units"
-        ]
+        steps = LazySteps(_hypotenuse_steps, a, b, c)
 
         answer_numeric = c
 
     elif difficulty == 2:
         # Medium: Find a leg with Pythagorean triples
         triples = [(3, 4, 5), (5, 12, 13), (8, 15, 17), (7, 24, 25), (6, 8, 10)]
-        a, b, c = random.choice(triples)
+        a, b, c = rng.choice(triples)
 
         # Randomly choose which leg to find
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             known_leg, unknown_leg = b, a
             unknown_var = "a"
             known_var = "b"
@@ -51,21 +54,13 @@ def generate_pythagorean_theorem(difficulty: int = 1) -> Dict[str, Any]:
 
         question = f"A right triangle has hypotenuse $c = {c}$ and one leg ${known_var} = {known_leg}$. Find the length of the other leg ${unknown_var}$."
 
-        steps = [
-            "We have the hypotenuse and one leg, so we need to find the missing leg using the Pythagorean theorem: $a^2 + b^2 = c^2$",
-            f"Substitute what we know: ${unknown_var}^2 + {known_leg}^2 = {c}^2$",
-            f"Calculate the squares: ${unknown_var}^2 + {known_leg**2} = {c**2}$",
-            f"To isolate ${unknown_var}^2$, subtract ${known_leg**2}$ from both sides: ${unknown_var}^2 = {c**2 - known_leg**2}$",
-            f"Now take the square root of both sides: ${unknown_var} = \\sqrt{{{c**2 - known_leg**2}}}$",
-            f"Simplify to get: ${unknown_var} = {unknown_leg}$",
-            f"**Final Answer:** The missing leg is ${unknown_var} = {unknown_leg}$ units"
-        ]
+        steps = LazySteps(_leg_steps, unknown_var, known_leg, c, unknown_leg)
 
         answer_numeric = unknown_leg
 
     else:
         # Hard: Word problems with diverse real-world contexts
-        use_word_problem = random.random() < 0.5
+        use_word_problem = rng.random() < 0.5
 
         if use_word_problem:
             # Real-world word problems with engaging contexts
@@ -182,7 +177,7 @@ def generate_pythagorean_theorem(difficulty: int = 1) -> Dict[str, Any]:
                 },
             ]
 
-            problem = random.choice(word_problems)
+            problem = rng.choice(word_problems)
             context = problem["context"]
 
             # Scale the values if specified
@@ -194,107 +189,151 @@ def generate_pythagorean_theorem(difficulty: int = 1) -> Dict[str, Any]:
 
             question = problem["scenario"]
 
-            # Build context-specific steps
-            steps = [
-                f"This is a real-world Pythagorean theorem problem. Let's identify the right triangle:\n{problem['setup']}",
-                "We'll use the Pythagorean theorem: $a^2 + b^2 = c^2$",
-            ]
-
             # Determine which value we're solving for based on context
-            if "leg" in problem["setup"] and "?" in problem["setup"].split('\n')[-1]:
-                # Solving for a leg
-                if "height" in problem["setup"].split('\n')[-1].lower() or "?" in problem["setup"].split('\n')[-1]:
-                    # Find the missing leg
-                    steps.extend([
-                        f"Substitute the known values: ${a}^2 + {problem['answer_var']}^2 = {c}^2$",
-                        f"Calculate: ${a**2} + {problem['answer_var']}^2 = {c**2}$",
-                        f"Subtract ${a**2}$ from both sides: ${problem['answer_var']}^2 = {c**2 - a**2}$",
-                        f"Take the square root: ${problem['answer_var']} = \\sqrt{{{c**2 - a**2}}}$",
-                        f"Simplify: ${problem['answer_var']} = {b}$",
-                        f"**Final Answer:** The {problem['solving_var']} is {b} units"
-                    ])
-                    answer_numeric = b
-            else:
-                # Solving for hypotenuse
-                steps.extend([
-                    f"Substitute the known values: ${a}^2 + {b}^2 = {problem['answer_var']}^2$",
-                    f"Calculate the squares: ${a**2} + {b**2} = {problem['answer_var']}^2$",
-                    f"Add them up: ${a**2 + b**2} = {problem['answer_var']}^2$",
-                    f"Take the square root: ${problem['answer_var']} = \\sqrt{{{a**2 + b**2}}}$",
-                    f"Simplify: ${problem['answer_var']} = {c}$",
-                    f"**Final Answer:** The {problem['solving_var']} is {c} units"
-                ])
-                answer_numeric = c
+            solve_leg = "leg" in problem["setup"] and "?" in problem["setup"].split('\n')[-1]
+            answer_numeric = b if solve_leg else c
+            steps = LazySteps(_word_problem_steps, problem, a, b, c, solve_leg)
 
         else:
             # Traditional abstract problems (still 50% of the time)
             problem_types = ["ladder", "diagonal", "distance"]
-            problem_type = random.choice(problem_types)
+            problem_type = rng.choice(problem_types)
 
             triples = [(3, 4, 5), (5, 12, 13), (8, 15, 17), (6, 8, 10)]
-            a, b, c = random.choice(triples)
+            a, b, c = rng.choice(triples)
 
             if problem_type == "ladder":
                 question = f"A {c}-foot ladder is leaning against a wall. The base of the ladder is {a} feet from the wall. How high up the wall does the ladder reach?"
 
-                steps = [
-                    "This forms a right triangle where:",
-                    f"- The ladder itself is the hypotenuse: $c = {c}$ feet",
-                    f"- The distance from the wall is one leg: $a = {a}$ feet",
-                    "- The height up the wall is the other leg: $b = ?$",
-                    "Using the Pythagorean theorem: $a^2 + b^2 = c^2$",
-                    f"Substitute: ${a}^2 + b^2 = {c}^2$",
-                    f"Calculate: ${a**2} + b^2 = {c**2}$",
-                    f"Subtract ${a**2}$ from both sides: $b^2 = {c**2 - a**2}$",
-                    f"Take the square root: $b = \\sqrt{{{c**2 - a**2}}}$",
-                    f"Simplify: $b = {b}$",
-                    f"**Final Answer:** The ladder reaches ${b}$ feet up the wall"
-                ]
+                steps = LazySteps(_ladder_steps, c, a, b)
                 answer_numeric = b
 
             elif problem_type == "diagonal":
                 question = f"A rectangular park is {a} meters wide and {b} meters long. What is the diagonal distance across the park?"
 
-                steps = [
-                    "The diagonal of a rectangle creates a right triangle where:",
-                    f"- The width is one leg: $a = {a}$ meters",
-                    f"- The length is the other leg: $b = {b}$ meters",
-                    "- The diagonal is the hypotenuse: $c = ?$",
-                    "Using the Pythagorean theorem: $a^2 + b^2 = c^2$",
-                    f"Substitute: ${a}^2 + {b}^2 = c^2$",
-                    f"Calculate: ${a**2} + {b**2} = c^2$",
-                    f"Add them up: ${a**2 + b**2} = c^2$",
-                    f"Take the square root: $c = \\sqrt{{{a**2 + b**2}}}$",
-                    f"Simplify: $c = {c}$",
-                    f"**Final Answer:** The diagonal distance is ${c}$ meters"
-                ]
+                steps = LazySteps(_diagonal_steps, a, b, c)
                 answer_numeric = c
 
             else:  # distance
                 question = f"A boat travels {a} miles east, then {b} miles north. How far is the boat from its starting point?"
 
-                steps = [
-                    "The boat's path forms a right triangle where:",
-                    f"- The eastward distance is one leg: $a = {a}$ miles",
-                    f"- The northward distance is the other leg: $b = {b}$ miles",
-                    "- The straight-line distance is the hypotenuse: $c = ?$",
-                    "Using the Pythagorean theorem: $a^2 + b^2 = c^2$",
-                    f"Substitute: ${a}^2 + {b}^2 = c^2$",
-                    f"Calculate: ${a**2} + {b**2} = c^2$",
-                    f"Add them up: ${a**2 + b**2} = c^2$",
-                    f"Take the square root: $c = \\sqrt{{{a**2 + b**2}}}$",
-                    f"Simplify: $c = {c}$",
-                    f"**Final Answer:** The boat is ${c}$ miles from the starting point"
-                ]
+                steps = LazySteps(_distance_steps, a, b, c)
                 answer_numeric = c
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _hypotenuse_steps(a: int, b: int, c: int) -> List[str]:
+    """Steps for finding the hypotenuse from both legs."""
+    return [
+        "We're using the Pythagorean theorem, which relates the sides of any right triangle: $a^2 + b^2 = c^2$",
+        f"Let's plug in our known values: ${a}^2 + {b}^2 = c^2$",
+        f"Now calculate the squares: ${a**2} + {b**2} = c^2$",
+        f"Add the left side together: ${a**2 + b**2} = c^2$",
+        f"To find $c$, take the square root of both sides: $c = \\sqrt{{{a**2 + b**2}}}$",
+        f"Simplify to get: $c = {c}$",
+        f"**Final Answer:** The hypotenuse measures $c = {c}$ units"
+    ]
+
+
+def _leg_steps(unknown_var: str, known_leg: int, c: int, unknown_leg: int) -> List[str]:
+    """Steps for finding a leg from the hypotenuse and the other leg."""
+    return [
+        "We have the hypotenuse and one leg, so we need to find the missing leg using the Pythagorean theorem: $a^2 + b^2 = c^2$",
+        f"Substitute what we know: ${unknown_var}^2 + {known_leg}^2 = {c}^2$",
+        f"Calculate the squares: ${unknown_var}^2 + {known_leg**2} = {c**2}$",
+        f"To isolate ${unknown_var}^2$, subtract ${known_leg**2}$ from both sides: ${unknown_var}^2 = {c**2 - known_leg**2}$",
+        f"Now take the square root of both sides: ${unknown_var} = \\sqrt{{{c**2 - known_leg**2}}}$",
+        f"Simplify to get: ${unknown_var} = {unknown_leg}$",
+        f"**Final Answer:** The missing leg is ${unknown_var} = {unknown_leg}$ units"
+    ]
+
+
+def _word_problem_steps(problem: Dict[str, Any], a: int, b: int, c: int, solve_leg: bool) -> List[str]:
+    """Steps for a real-world word problem, solving for a leg or the hypotenuse."""
+    steps = [
+        f"This is a real-world Pythagorean theorem problem. Let's identify the right triangle:\n{problem['setup']}",
+        "We'll use the Pythagorean theorem: $a^2 + b^2 = c^2$",
+    ]
+
+    if solve_leg:
+        # Find the missing leg
+        steps.extend([
+            f"Substitute the known values: ${a}^2 + {problem['answer_var']}^2 = {c}^2$",
+            f"Calculate: ${a**2} + {problem['answer_var']}^2 = {c**2}$",
+            f"Subtract ${a**2}$ from both sides: ${problem['answer_var']}^2 = {c**2 - a**2}$",
+            f"Take the square root: ${problem['answer_var']} = \\sqrt{{{c**2 - a**2}}}$",
+            f"Simplify: ${problem['answer_var']} = {b}$",
+            f"**Final Answer:** The {problem['solving_var']} is {b} units"
+        ])
+    else:
+        # Solving for hypotenuse
+        steps.extend([
+            f"Substitute the known values: ${a}^2 + {b}^2 = {problem['answer_var']}^2$",
+            f"Calculate the squares: ${a**2} + {b**2} = {problem['answer_var']}^2$",
+            f"Add them up: ${a**2 + b**2} = {problem['answer_var']}^2$",
+            f"Take the square root: ${problem['answer_var']} = \\sqrt{{{a**2 + b**2}}}$",
+            f"Simplify: ${problem['answer_var']} = {c}$",
+            f"**Final Answer:** The {problem['solving_var']} is {c} units"
+        ])
+    return steps
+
+
+def _ladder_steps(c: int, a: int, b: int) -> List[str]:
+    """Steps for the ladder problem (a leg from hypotenuse and leg)."""
+    return [
+        "This forms a right triangle where:",
+        f"- The ladder itself is the hypotenuse: $c = {c}$ feet",
+        f"- The distance from the wall is one leg: $a = {a}$ feet",
+        "- The height up the wall is the other leg: $b = ?$",
+        "Using the Pythagorean theorem: $a^2 + b^2 = c^2$",
+        f"Substitute: ${a}^2 + b^2 = {c}^2$",
+        f"Calculate: ${a**2} + b^2 = {c**2}$",
+        f"Subtract ${a**2}$ from both sides: $b^2 = {c**2 - a**2}$",
+        f"Take the square root: $b = \\sqrt{{{c**2 - a**2}}}$",
+        f"Simplify: $b = {b}$",
+        f"**Final Answer:** The ladder reaches ${b}$ feet up the wall"
+    ]
+
+
+def _diagonal_steps(a: int, b: int, c: int) -> List[str]:
+    """Steps for the park diagonal problem (the hypotenuse)."""
+    return [
+        "The diagonal of a rectangle creates a right triangle where:",
+        f"- The width is one leg: $a = {a}$ meters",
+        f"- The length is the other leg: $b = {b}$ meters",
+        "- The diagonal is the hypotenuse: $c = ?$",
+        "Using the Pythagorean theorem: $a^2 + b^2 = c^2$",
+        f"Substitute: ${a}^2 + {b}^2 = c^2$",
+        f"Calculate: ${a**2} + {b**2} = c^2$",
+        f"Add them up: ${a**2 + b**2} = c^2$",
+        f"Take the square root: $c = \\sqrt{{{a**2 + b**2}}}$",
+        f"Simplify: $c = {c}$",
+        f"**Final Answer:** The diagonal distance is ${c}$ meters"
+    ]
+
+
+def _distance_steps(a: int, b: int, c: int) -> List[str]:
+    """Steps for the boat distance problem (the hypotenuse)."""
+    return [
+        "The boat's path forms a right triangle where:",
+        f"- The eastward distance is one leg: $a = {a}$ miles",
+        f"- The northward distance is the other leg: $b = {b}$ miles",
+        "- The straight-line distance is the hypotenuse: $c = ?$",
+        "Using the Pythagorean theorem: $a^2 + b^2 = c^2$",
+        f"Substitute: ${a}^2 + {b}^2 = c^2$",
+        f"Calculate: ${a**2} + {b**2} = c^2$",
+        f"Add them up: ${a**2 + b**2} = c^2$",
+        f"Take the square root: $c = \\sqrt{{{a**2 + b**2}}}$",
+        f"Simplify: $c = {c}$",
+        f"**Final Answer:** The boat is ${c}$ miles from the starting point"
+    ]
 
 
 def validate_answer(user_answer: str, correct_answer: float, tolerance: float = 0.01) -> bool:
@@ -2,7 +2,11 @@
 
 import random
 from math import sqrt, gcd
-from typing import Dict, Any, Tuple
+from typing import List, Optional, Tuple
+from app.generators.latex import format_quadratic
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world word problems for quadratic equations
 QUADRATIC_WORD_PROBLEMS = [
@@ -55,7 +59,11 @@ def _gcd_triple(a: int, b: int, c: int) -> int:
     return gcd(_gcd_pair(a, b), abs(c))
 
 
-def generate_quadratic_equation(difficulty: int = 1) -> Dict[str, Any]:
+def generate_quadratic_equation(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a quadratic equation problem: ax² + bx + c = 0
 
@@ -66,20 +74,22 @@ def generate_quadratic_equation(difficulty: int = 1) -> Dict[str, Any]:
             3 (medium-hard - quadratic formula, two solutions)
             4 (hard - quadratic formula, may have irrational roots)
             5 (very hard - complex/imaginary solutions)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     # Use word problem 40% of the time
-    use_word_problem = random.random() < 0.4 and difficulty <= 3
+    use_word_problem = rng.random() < 0.4 and difficulty <= 3
 
     if difficulty == 1:
         # Easy: Simple factoring (x + p)(x + q) = 0
         # Choose small integer roots
-        root1 = random.randint(-5, 5)
-        root2 = random.randint(-5, 5)
+        root1 = rng.randint(-5, 5)
+        root2 = rng.randint(-5, 5)
 
         # Expand to get coefficients
         # (x - root1)(x - root2) = x² - (root1+root2)x + root1*root2
@@ -92,9 +102,9 @@ def generate_quadratic_equation(difficulty: int = 1) -> Dict[str, Any]:
     elif difficulty == 2:
         # Medium: Factoring with leading coefficient
         # (ax + p)(x + q) = 0
-        a = random.choice([2, 3, 4])
-        root1 = random.randint(-4, 4)
-        root2 = random.randint(-4, 4)
+        a = rng.choice([2, 3, 4])
+        root1 = rng.randint(-4, 4)
+        root2 = rng.randint(-4, 4)
 
         # Expand (x - root1)(ax - a*root2)
         # = ax² - a*root2*x - root1*ax + a*root1*root2
@@ -106,12 +116,12 @@ def generate_quadratic_equation(difficulty: int = 1) -> Dict[str, Any]:
 
     elif difficulty == 3:
         # Medium-hard: Quadratic formula, rational roots
-        a = random.choice([1, 2, 3])
+        a = rng.choice([1, 2, 3])
         # Choose b² - 4ac to be a perfect square for rational roots
         perfect_squares = [0, 1, 4, 9, 16, 25, 36, 49, 64]
-        discriminant = random.choice(perfect_squares)
+        discriminant = rng.choice(perfect_squares)
 
-        b = random.randint(-10, 10)
+        b = rng.randint(-10, 10)
         # c = (b² - discriminant) / (4a)
         # Ensure c is an integer
         numerator = b * b - discriminant
@@ -119,7 +129,7 @@ def generate_quadratic_equation(difficulty: int = 1) -> Dict[str, Any]:
             c = numerator // (4 * a)
         else:
             # Adjust b to make it work
-            b = random.choice([-6, -4, -2, 2, 4, 6, 8, 10])
+            b = rng.choice([-6, -4, -2, 2, 4, 6, 8, 10])
             c = (b * b - discriminant) // (4 * a)
 
         # Calculate actual roots
@@ -131,15 +141,12 @@ def generate_quadratic_equation(difficulty: int = 1) -> Dict[str, Any]:
 
     elif difficulty == 4:
         # Hard: Quadratic formula, may have irrational roots
-        a = random.randint(1, 5)
-        b = random.randint(-15, 15)
-        c = random.randint(-20, 20)
+        a = rng.randint(1, 5)
+        b = rng.randint(-15, 15)
 
-        # Ensure positive discriminant (real roots)
+        # Real roots need b² - 4ac >= 0, i.e. c <= b² / 4a
+        c = rng.randint(-20, min(20, b * b // (4 * a)))
         discriminant = b * b - 4 * a * c
-        while discriminant < 0:
-            c = random.randint(-20, 20)
-            discriminant = b * b - 4 * a * c
 
         sqrt_discriminant = sqrt(discriminant)
         root1 = (-b + sqrt_discriminant) / (2 * a)
@@ -149,15 +156,13 @@ def generate_quadratic_equation(difficulty: int = 1) -> Dict[str, Any]:
 
     else:  # difficulty == 5
         # Very hard: Complex/imaginary solutions
-        a = random.randint(1, 4)
-        b = random.randint(-10, 10)
-        c = random.randint(1, 20)
+        a = rng.randint(1, 4)
+        b = rng.randint(-10, 10)
 
-        # Ensure negative discriminant (complex roots)
+        # Complex roots need b² - 4ac < 0, i.e. c > b² / 4a
+        c_min = b * b // (4 * a) + 1
+        c = rng.randint(c_min, max(20, c_min + 5))
         discriminant = b * b - 4 * a * c
-        while discriminant >= 0:
-            c = random.randint(5, 25)
-            discriminant = b * b - 4 * a * c
 
         # Complex roots: (-b ± i√|discriminant|) / 2a
         sqrt_neg_discriminant = sqrt(abs(discriminant))
@@ -167,87 +172,94 @@ def generate_quadratic_equation(difficulty: int = 1) -> Dict[str, Any]:
         method = "quadratic_formula_complex"
 
     # Format the equation
-    equation = _format_quadratic(a, b, c)
+    equation = format_quadratic(a, b, c)
     question = f"Solve for $x$: ${equation} = 0$"
 
-    steps.append(f"Start with the equation: ${equation} = 0$")
-
     # Generate solution steps based on method
     if method == "factoring" and difficulty <= 2:
-        answer_str = _solve_by_factoring(a, b, c, steps, difficulty)
+        root1, root2 = _factoring_roots(a, b, c, difficulty)
+        answer_str = _factoring_answer(root1, root2)
+        steps = LazySteps(_solve_by_factoring, equation, a, b, c, root1, root2, difficulty)
     elif method == "quadratic_formula_complex":
-        answer_str = _solve_complex(a, b, c, discriminant, real_part, imag_part, steps)
+        answer_str = _complex_answer(real_part, imag_part)
+        steps = LazySteps(_solve_complex, equation, a, b, c, discriminant, real_part, imag_part)
     else:
-        answer_str = _solve_by_formula(a, b, c, steps, difficulty)
+        answer_str = _formula_answer(a, b, c)
+        steps = LazySteps(_solve_by_formula, equation, a, b, c)
 
-    return {
-        "question": question,
-        "answer": answer_str,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=answer_str,
+        steps=steps,
+        difficulty=difficulty,
+    )
 
 
-def _format_quadratic(a: int, b: int, c: int) -> str:
-    """Format quadratic equation as LaTeX string."""
-    terms = []
+def _factoring_roots(a: int, b: int, c: int, difficulty: int) -> Tuple[float, float]:
+    """Roots found by factoring (difficulty 1) or, with a leading coefficient, by the formula."""
+    if difficulty == 1:
+        # Find p and q such that p + q = b and p * q = c
+        for p in range(-20, 21):
+            q = c // p if p != 0 and c % p == 0 else None
+            if q is not None and p + q == b:
+                break
+        return -p, -q
 
-    # x² term
-    if a == 1:
-        terms.append("x^2")
-    elif a == -1:
-        terms.append("-x^2")
-    else:
-        terms.append(f"{a}x^2")
-
-    # x term
-    if b != 0:
-        if b == 1:
-            terms.append("+ x")
-        elif b == -1:
-            terms.append("- x")
-        elif b > 0:
-            terms.append(f"+ {b}x")
-        else:
-            terms.append(f"- {abs(b)}x")
+    # For simplicity, calculate roots using quadratic formula
+    discriminant = b * b - 4 * a * c
+    sqrt_disc = sqrt(discriminant)
+    return (-b + sqrt_disc) / (2 * a), (-b - sqrt_disc) / (2 * a)
 
-    # constant term
-    if c != 0:
-        if c > 0:
-            terms.append(f"+ {c}")
-        else:
-            terms.append(f"- {abs(c)}")
 
-    equation = " ".join(terms)
-    equation = equation.replace("+ -", "- ")
+def _factoring_answer(root1: float, root2: float) -> str:
+    """Answer for roots found by factoring."""
+    if root1 == int(root1):
+        return f"{int(root1)}, {int(root2)}" if root1 != root2 else str(int(root1))
+    return f"{root1:.2f}, {root2:.2f}" if abs(root1 - root2) > 0.01 else f"{root1:.2f}"
 
-    return equation
 
+def _formula_answer(a: int, b: int, c: int) -> str:
+    """Answer for real roots found with the quadratic formula."""
+    discriminant = b * b - 4 * a * c
+    if discriminant == 0:
+        root = -b / (2 * a)
+        return str(int(root)) if root == int(root) else f"{root:.2f}"
 
-def _solve_by_factoring(a: int, b: int, c: int, steps: list, difficulty: int) -> str:
-    """Add factoring solution steps."""
+    sqrt_disc = sqrt(discriminant)
+    root1 = (-b + sqrt_disc) / (2 * a)
+    root2 = (-b - sqrt_disc) / (2 * a)
+    if sqrt_disc == int(sqrt_disc) and root1 == int(root1) and root2 == int(root2):
+        return f"{int(root1)}, {int(root2)}"
+    return f"{root1:.2f}, {root2:.2f}"
+
+
+def _complex_answer(real_part: float, imag_part: float) -> str:
+    """Answer for complex roots real_part ± imag_part·i."""
+    if real_part == 0:
+        if imag_part == int(imag_part):
+            return f"±{int(imag_part)}i"
+        return f"±{imag_part:.2f}i"
+    if real_part == int(real_part) and imag_part == int(imag_part):
+        return f"{int(real_part)}±{int(imag_part)}i"
+    return f"{real_part:.2f}±{imag_part:.2f}i"
+
+
+def _solve_by_factoring(equation: str, a: int, b: int, c: int, root1: float, root2: float,
+                        difficulty: int) -> List[str]:
+    """Factoring solution steps."""
+    steps = [f"Start with the equation: ${equation} = 0$"]
 
     if difficulty == 1:
         # Simple factoring: x² + bx + c = (x + p)(x + q)
-        # Find p and q such that p + q = b and p * q = c
         steps.append("Factor the quadratic expression")
         steps.append("Find two numbers that multiply to $c$ and add to $b$")
 
-        # Find the factors
-        for p in range(-20, 21):
-            q = c // p if p != 0 and c % p == 0 else None
-            if q is not None and p + q == b:
-                break
-
         # Format factors
+        p, q = -root1, -root2
         p_sign = "+" if p >= 0 else "-"
         q_sign = "+" if q >= 0 else "-"
         steps.append(f"$(x {p_sign} {abs(p)})(x {q_sign} {abs(q)}) = 0$")
 
-        # Solutions
-        root1 = -p
-        root2 = -q
-
     else:  # difficulty == 2
         # Factoring with leading coefficient
         steps.append("Factor the quadratic expression")
@@ -257,28 +269,21 @@ def _solve_by_factoring(a: int, b: int, c: int, steps: list, difficulty: int) ->
         # In practice, we'd reverse-engineer from our chosen roots
         steps.append("After factoring (using grouping or trial methods):")
 
-        # For simplicity, calculate roots using quadratic formula
-        discriminant = b * b - 4 * a * c
-        sqrt_disc = sqrt(discriminant)
-        root1 = (-b + sqrt_disc) / (2 * a)
-        root2 = (-b - sqrt_disc) / (2 * a)
-
     steps.append("Set each factor equal to zero and solve:")
 
     if root1 == int(root1):
         steps.append(f"$x = {int(root1)}$ or $x = {int(root2)}$")
-        answer_str = f"{int(root1)}, {int(root2)}" if root1 != root2 else str(int(root1))
         steps.append(f"**Final Answer:** $x = {int(root1)}$ and $x = {int(root2)}$" if root1 != root2 else f"**Final Answer:** $x = {int(root1)}$")
     else:
         steps.append(f"$x = {root1:.2f}$ or $x = {root2:.2f}$")
-        answer_str = f"{root1:.2f}, {root2:.2f}" if abs(root1 - root2) > 0.01 else f"{root1:.2f}"
         steps.append(f"**Final Answer:** $x = {root1:.2f}$ and $x = {root2:.2f}$")
 
-    return answer_str
+    return steps
 
 
-def _solve_by_formula(a: int, b: int, c: int, steps: list, difficulty: int) -> str:
-    """Add quadratic formula solution steps."""
+def _solve_by_formula(equation: str, a: int, b: int, c: int) -> List[str]:
+    """Quadratic formula solution steps."""
+    steps = [f"Start with the equation: ${equation} = 0$"]
 
     steps.append("Use the quadratic formula: $x = \\frac{-b \\pm \\sqrt{b^2 - 4ac}}{2a}$")
     steps.append(f"Identify coefficients: $a = {a}$, $b = {b}$, $c = {c}$")
@@ -293,11 +298,10 @@ def _solve_by_formula(a: int, b: int, c: int, steps: list, difficulty: int) -> s
         if root == int(root):
             steps.append(f"$x = \\frac{{-{b}}}{{2({a})}} = {int(root)}$")
             steps.append(f"**Final Answer:** $x = {int(root)}$")
-            return str(int(root))
         else:
             steps.append(f"$x = \\frac{{-{b}}}{{2({a})}} = {root:.2f}$")
             steps.append(f"**Final Answer:** $x = {root:.2f}$")
-            return f"{root:.2f}"
+        return steps
 
     # Calculate square root of discriminant
     sqrt_disc = sqrt(discriminant)
@@ -315,11 +319,9 @@ def _solve_by_formula(a: int, b: int, c: int, steps: list, difficulty: int) -> s
         if root1 == int(root1) and root2 == int(root2):
             steps.append(f"$x = \\frac{{-{b} + {int(sqrt_disc)}}}{{{2 * a}}} = {int(root1)}$ or $x = \\frac{{-{b} - {int(sqrt_disc)}}}{{{2 * a}}} = {int(root2)}$")
             steps.append(f"**Final Answer:** $x = {int(root1)}$ and $x = {int(root2)}$")
-            return f"{int(root1)}, {int(root2)}"
         else:
             steps.append(f"$x = {root1:.2f}$ or $x = {root2:.2f}$")
             steps.append(f"**Final Answer:** $x = {root1:.2f}$ and $x = {root2:.2f}$")
-            return f"{root1:.2f}, {root2:.2f}"
     else:
         # Irrational roots
         steps.append(f"$\\sqrt{{{discriminant}}} \\approx {sqrt_disc:.2f}$")
@@ -331,11 +333,13 @@ def _solve_by_formula(a: int, b: int, c: int, steps: list, difficulty: int) -> s
         steps.append(f"$x = \\frac{{-{b} - {sqrt_disc:.2f}}}{{{2 * a}}} \\approx {root2:.2f}$")
         steps.append(f"**Final Answer:** $x \\approx {root1:.2f}$ and $x \\approx {root2:.2f}$")
 
-        return f"{root1:.2f}, {root2:.2f}"
+    return steps
 
 
-def _solve_complex(a: int, b: int, c: int, discriminant: int, real_part: float, imag_part: float, steps: list) -> str:
-    """Add complex solution steps."""
+def _solve_complex(equation: str, a: int, b: int, c: int, discriminant: int, real_part: float,
+                   imag_part: float) -> List[str]:
+    """Complex solution steps."""
+    steps = [f"Start with the equation: ${equation} = 0$"]
 
     steps.append("Use the quadratic formula: $x = \\frac{-b \\pm \\sqrt{b^2 - 4ac}}{2a}$")
     steps.append(f"Identify coefficients: $a = {a}$, $b = {b}$, $c = {c}$")
@@ -354,17 +358,13 @@ def _solve_complex(a: int, b: int, c: int, discriminant: int, real_part: float,
     # Format complex answer
     if real_part == 0:
         if imag_part == int(imag_part):
-            answer_str = f"±{int(imag_part)}i"
             steps.append(f"**Final Answer:** $x = \\pm {int(imag_part)}i$")
         else:
-            answer_str = f"±{imag_part:.2f}i"
             steps.append(f"**Final Answer:** $x = \\pm {imag_part:.2f}i$")
     else:
         if real_part == int(real_part) and imag_part == int(imag_part):
             steps.append(f"**Final Answer:** $x = {int(real_part)} \\pm {int(imag_part)}i$")
-            answer_str = f"{int(real_part)}±{int(imag_part)}i"
         else:
             steps.append(f"**Final Answer:** $x = {real_part:.2f} \\pm {imag_part:.2f}i$")
-            answer_str = f"{real_part:.2f}±{imag_part:.2f}i"
 
-    return answer_str
+    return steps
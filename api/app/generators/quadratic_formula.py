@@ -1,8 +1,13 @@
 """Quadratic formula generator."""
 
 import random
-from typing import Dict, Any, List
+from typing import List, Optional
 from math import sqrt, gcd
+from app.generators.latex import format_frac, format_signed
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.sampling import choice_from_table, int_range, nonzero_randint
+from app.generators.steps import LazySteps
 
 # Engaging word problems for quadratic formula
 QUADRATIC_FORMULA_PROBLEMS = [
@@ -29,21 +34,44 @@ QUADRATIC_FORMULA_PROBLEMS = [
 ]
 
 
-def generate_quadratic_formula(difficulty: int = 1) -> Dict[str, Any]:
+def _has_irrational_roots(a: int, b: int, c: int) -> bool:
+    """Whether the discriminant is positive but not a perfect square."""
+    discriminant = b * b - 4 * a * c
+    return discriminant > 0 and int(sqrt(discriminant)) ** 2 != discriminant
+
+
+# Difficulty 3: valid c values for each (a, b), so c is drawn once
+IRRATIONAL_C_VALUES = {
+    (a, b): tuple(c for c in int_range(-6, 6) if _has_irrational_roots(a, b, c))
+    for a in int_range(1, 3)
+    for b in int_range(-8, 8)
+    if b != 0
+}
+
+
+def generate_quadratic_formula(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate quadratic formula problems: ax² + bx + c = 0.
 
     Args:
         difficulty: 1 (integer solutions), 2 (requires simplification), 3 (irrational solutions)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Integer solutions - create from factored form
         # (x - p)(x - q) = 0 where p, q are integers
-        p = random.randint(-6, 6)
-        q = random.randint(-6, 6)
+        p = rng.randint(-6, 6)
+        q = rng.randint(-6, 6)
 
         # Expand: x² - (p+q)x + pq = 0
         a = 1
@@ -53,36 +81,24 @@ def generate_quadratic_formula(difficulty: int = 1) -> Dict[str, Any]:
         # Format equation
         equation = f"x^2"
         if b != 0:
-            equation += f" {'+' if b >= 0 else '-'} {abs(b)}x"
+            equation += f" {format_signed(b)}x"
         if c != 0:
-            equation += f" {'+' if c >= 0 else '-'} {abs(c)}"
+            equation += f" {format_signed(c)}"
         equation += " = 0"
 
         # Discriminant
         discriminant = b * b - 4 * a * c
 
-        steps = [
-            f"Given: ${equation}$",
-            f"Use the quadratic formula: $x = \\frac{{-b \\pm \\sqrt{{b^2 - 4ac}}}}{{2a}}$",
-            f"Identify: $a = {a}$, $b = {b}$, $c = {c}$",
-            f"Calculate the discriminant: $b^2 - 4ac$",
-            f"$({b})^2 - 4({a})({c}) = {b*b} - {4*a*c} = {discriminant}$",
-            f"Substitute into the formula:",
-            f"$x = \\frac{{-({b}) \\pm \\sqrt{{{discriminant}}}}}{{2({a})}}$",
-            f"$x = \\frac{{{-b} \\pm {int(sqrt(discriminant))}}}{{2}}$",
-            f"**Solution 1:** $x = \\frac{{{-b} + {int(sqrt(discriminant))}}}{{2}} = \\frac{{{-b + int(sqrt(discriminant))}}}{{2}} = {(-b + int(sqrt(discriminant))) // 2}$",
-            f"**Solution 2:** $x = \\frac{{{-b} - {int(sqrt(discriminant))}}}{{2}} = \\frac{{{-b - int(sqrt(discriminant))}}}{{2}} = {(-b - int(sqrt(discriminant))) // 2}$",
-            f"**Final Answer:** $x = {min(p, q)}$ or $x = {max(p, q)}$"
-        ]
+        steps = LazySteps(_integer_roots_steps, equation, a, b, c, discriminant, p, q)
 
         answer = f"x = {min(p, q)}, {max(p, q)}"
 
     elif difficulty == 2:
         # Requires simplification - discriminant is a perfect square but needs reduction
-        a = random.randint(2, 4)
+        a = rng.randint(2, 4)
         # Choose b and c such that discriminant is a perfect square
-        p = random.randint(-4, 4)
-        q = random.randint(-4, 4)
+        p = rng.randint(-4, 4)
+        q = rng.randint(-4, 4)
 
         # From (x - p)(x - q) = 0, multiply by a
         b = -a * (p + q)
@@ -90,9 +106,9 @@ def generate_quadratic_formula(difficulty: int = 1) -> Dict[str, Any]:
 
         equation = f"{a}x^2"
         if b != 0:
-            equation += f" {'+' if b >= 0 else '-'} {abs(b)}x"
+            equation += f" {format_signed(b)}x"
         if c != 0:
-            equation += f" {'+' if c >= 0 else '-'} {abs(c)}"
+            equation += f" {format_signed(c)}"
         equation += " = 0"
 
         discriminant = b * b - 4 * a * c
@@ -101,59 +117,27 @@ def generate_quadratic_formula(difficulty: int = 1) -> Dict[str, Any]:
         # Calculate solutions
         g = gcd(gcd(abs(-b + sqrt_disc), abs(-b - sqrt_disc)), 2 * a)
 
-        steps = [
-            f"Given: ${equation}$",
-            f"Use the quadratic formula: $x = \\frac{{-b \\pm \\sqrt{{b^2 - 4ac}}}}{{2a}}$",
-            f"Identify: $a = {a}$, $b = {b}$, $c = {c}$",
-            f"Calculate the discriminant: $b^2 - 4ac$",
-            f"$({b})^2 - 4({a})({c}) = {b*b} - {4*a*c} = {discriminant}$",
-            f"$\\sqrt{{{discriminant}}} = {sqrt_disc}$",
-            f"Substitute into the formula:",
-            f"$x = \\frac{{-({b}) \\pm {sqrt_disc}}}{{2({a})}}$",
-            f"$x = \\frac{{{-b} \\pm {sqrt_disc}}}{{{2*a}}}$",
-            f"**Solution 1:** $x = \\frac{{{-b} + {sqrt_disc}}}{{{2*a}}} = \\frac{{{-b + sqrt_disc}}}{{{2*a}}}$",
-        ]
-
-        if (-b + sqrt_disc) % (2 * a) == 0:
-            steps.append(f"$x = {(-b + sqrt_disc) // (2*a)}$")
-        else:
-            # Simplify fraction
-            num1 = (-b + sqrt_disc) // g
-            den1 = (2 * a) // g
-            steps.append(f"Simplify: $x = \\frac{{{num1}}}{{{den1}}}$")
-
-        steps.append(f"**Solution 2:** $x = \\frac{{{-b} - {sqrt_disc}}}{{{2*a}}} = \\frac{{{-b - sqrt_disc}}}{{{2*a}}}$")
-
         if (-b - sqrt_disc) % (2 * a) == 0:
-            steps.append(f"$x = {(-b - sqrt_disc) // (2*a)}$")
             answer = f"x = {(-b - sqrt_disc) // (2*a)}, {(-b + sqrt_disc) // (2*a)}"
         else:
-            num2 = (-b - sqrt_disc) // g
-            den2 = (2 * a) // g
-            steps.append(f"Simplify: $x = \\frac{{{num2}}}{{{den2}}}$")
-            answer = f"x = {num2}/{den2}, {num1}/{den1}"
+            answer = f"x = {(-b - sqrt_disc) // g}/{(2 * a) // g}, {(-b + sqrt_disc) // g}/{(2 * a) // g}"
 
-        steps.append(f"**Final Answer:** ${answer}$")
+        steps = LazySteps(_rational_roots_steps, equation, a, b, c, discriminant, sqrt_disc, g, answer)
 
     else:  # difficulty == 3
         # Irrational solutions with radicals
-        a = random.randint(1, 3)
-        b = random.randint(-8, 8)
-        if b == 0:
-            b = 5
-        c = random.randint(-6, 6)
+        a = rng.randint(1, 3)
+        b = nonzero_randint(rng, -8, 8)
 
-        # Ensure discriminant is positive but not a perfect square
+        # Discriminant must be positive but not a perfect square
+        c = choice_from_table(rng, IRRATIONAL_C_VALUES[(a, b)], "constant terms")
         discriminant = b * b - 4 * a * c
-        while discriminant <= 0 or int(sqrt(discriminant)) ** 2 == discriminant:
-            c = random.randint(-6, 6)
-            discriminant = b * b - 4 * a * c
 
         equation = f"{a}x^2" if a != 1 else "x^2"
         if b != 0:
-            equation += f" {'+' if b >= 0 else '-'} {abs(b)}x"
+            equation += f" {format_signed(b)}x"
         if c != 0:
-            equation += f" {'+' if c >= 0 else '-'} {abs(c)}"
+            equation += f" {format_signed(c)}"
         equation += " = 0"
 
         # Simplify the radical
@@ -166,41 +150,109 @@ def generate_quadratic_formula(difficulty: int = 1) -> Dict[str, Any]:
                 radical = discriminant // (i * i)
                 break
 
-        steps = [
-            f"Given: ${equation}$",
-            f"Use the quadratic formula: $x = \\frac{{-b \\pm \\sqrt{{b^2 - 4ac}}}}{{2a}}$",
-            f"Identify: $a = {a}$, $b = {b}$, $c = {c}$",
-            f"Calculate the discriminant: $b^2 - 4ac$",
-            f"$({b})^2 - 4({a})({c}) = {b*b} - {4*a*c} = {discriminant}$",
-        ]
-
         if factor > 1:
-            steps.append(f"Simplify $\\sqrt{{{discriminant}}}$:")
-            steps.append(f"$\\sqrt{{{discriminant}}} = \\sqrt{{{factor*factor} \\cdot {radical}}} = {factor}\\sqrt{{{radical}}}$")
-            steps.append(f"Substitute into the formula:")
-            steps.append(f"$x = \\frac{{-({b}) \\pm {factor}\\sqrt{{{radical}}}}}{{2({a})}}$")
-            steps.append(f"$x = \\frac{{{-b} \\pm {factor}\\sqrt{{{radical}}}}}{{{2*a}}}$")
-
             # Check if we can simplify further
             g = gcd(gcd(abs(-b), factor), 2*a)
             if g > 1:
-                steps.append(f"Factor out ${g}$:")
-                steps.append(f"$x = \\frac{{{-b//g} \\pm {factor//g}\\sqrt{{{radical}}}}}{{{2*a//g}}}$")
                 answer = f"x = ({-b//g} ± {factor//g}√{radical})/{2*a//g}"
             else:
                 answer = f"x = ({-b} ± {factor}√{radical})/{2*a}"
         else:
-            steps.append(f"Substitute into the formula:")
-            steps.append(f"$x = \\frac{{-({b}) \\pm \\sqrt{{{discriminant}}}}}{{2({a})}}$")
-            steps.append(f"$x = \\frac{{{-b} \\pm \\sqrt{{{discriminant}}}}}{{{2*a}}}$")
             answer = f"x = ({-b} ± √{discriminant})/{2*a}"
 
-        steps.append(f"**Final Answer:** ${answer.replace('±', '\\pm').replace('√', '\\sqrt')}$")
+        steps = LazySteps(_irrational_roots_steps, equation, a, b, c, discriminant, factor, radical, answer)
+
+    return GeneratedQuestion(
+        question=f"Solve using the quadratic formula: ${equation}$",
+        answer=answer,
+        answer_numeric=None,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _integer_roots_steps(equation: str, a: int, b: int, c: int, discriminant: int, p: int,
+                         q: int) -> List[str]:
+    """Steps for a monic quadratic with integer roots."""
+    return [
+        f"Given: ${equation}$",
+        f"Use the quadratic formula: $x = \\frac{{-b \\pm \\sqrt{{b^2 - 4ac}}}}{{2a}}$",
+        f"Identify: $a = {a}$, $b = {b}$, $c = {c}$",
+        f"Calculate the discriminant: $b^2 - 4ac$",
+        f"$({b})^2 - 4({a})({c}) = {b*b} - {4*a*c} = {discriminant}$",
+        f"Substitute into the formula:",
+        f"$x = \\frac{{-({b}) \\pm \\sqrt{{{discriminant}}}}}{{2({a})}}$",
+        f"$x = \\frac{{{-b} \\pm {int(sqrt(discriminant))}}}{{2}}$",
+        f"**Solution 1:** $x = \\frac{{{-b} + {int(sqrt(discriminant))}}}{{2}} = \\frac{{{-b + int(sqrt(discriminant))}}}{{2}} = {(-b + int(sqrt(discriminant))) // 2}$",
+        f"**Solution 2:** $x = \\frac{{{-b} - {int(sqrt(discriminant))}}}{{2}} = \\frac{{{-b - int(sqrt(discriminant))}}}{{2}} = {(-b - int(sqrt(discriminant))) // 2}$",
+        f"**Final Answer:** $x = {min(p, q)}$ or $x = {max(p, q)}$"
+    ]
+
+
+def _rational_roots_steps(equation: str, a: int, b: int, c: int, discriminant: int,
+                          sqrt_disc: int, g: int, answer: str) -> List[str]:
+    """Steps for a quadratic whose roots are rational."""
+    steps = [
+        f"Given: ${equation}$",
+        f"Use the quadratic formula: $x = \\frac{{-b \\pm \\sqrt{{b^2 - 4ac}}}}{{2a}}$",
+        f"Identify: $a = {a}$, $b = {b}$, $c = {c}$",
+        f"Calculate the discriminant: $b^2 - 4ac$",
+        f"$({b})^2 - 4({a})({c}) = {b*b} - {4*a*c} = {discriminant}$",
+        f"$\\sqrt{{{discriminant}}} = {sqrt_disc}$",
+        f"Substitute into the formula:",
+        f"$x = \\frac{{-({b}) \\pm {sqrt_disc}}}{{2({a})}}$",
+        f"$x = \\frac{{{-b} \\pm {sqrt_disc}}}{{{2*a}}}$",
+        f"**Solution 1:** $x = \\frac{{{-b} + {sqrt_disc}}}{{{2*a}}} = {format_frac(-b + sqrt_disc, 2*a)}$",
+    ]
+
+    if (-b + sqrt_disc) % (2 * a) == 0:
+        steps.append(f"$x = {(-b + sqrt_disc) // (2*a)}$")
+    else:
+        # Simplify fraction
+        num1 = (-b + sqrt_disc) // g
+        den1 = (2 * a) // g
+        steps.append(f"Simplify: $x = {format_frac(num1, den1)}$")
+
+    steps.append(f"**Solution 2:** $x = \\frac{{{-b} - {sqrt_disc}}}{{{2*a}}} = {format_frac(-b - sqrt_disc, 2*a)}$")
+
+    if (-b - sqrt_disc) % (2 * a) == 0:
+        steps.append(f"$x = {(-b - sqrt_disc) // (2*a)}$")
+    else:
+        num2 = (-b - sqrt_disc) // g
+        den2 = (2 * a) // g
+        steps.append(f"Simplify: $x = {format_frac(num2, den2)}$")
+
+    steps.append(f"**Final Answer:** ${answer}$")
+    return steps
+
+
+def _irrational_roots_steps(equation: str, a: int, b: int, c: int, discriminant: int,
+                           factor: int, radical: int, answer: str) -> List[str]:
+    """Steps for a quadratic whose roots need a simplified radical."""
+    steps = [
+        f"Given: ${equation}$",
+        f"Use the quadratic formula: $x = \\frac{{-b \\pm \\sqrt{{b^2 - 4ac}}}}{{2a}}$",
+        f"Identify: $a = {a}$, $b = {b}$, $c = {c}$",
+        f"Calculate the discriminant: $b^2 - 4ac$",
+        f"$({b})^2 - 4({a})({c}) = {b*b} - {4*a*c} = {discriminant}$",
+    ]
+
+    if factor > 1:
+        steps.append(f"Simplify $\\sqrt{{{discriminant}}}$:")
+        steps.append(f"$\\sqrt{{{discriminant}}} = \\sqrt{{{factor*factor} \\cdot {radical}}} = {factor}\\sqrt{{{radical}}}$")
+        steps.append(f"Substitute into the formula:")
+        steps.append(f"$x = \\frac{{-({b}) \\pm {factor}\\sqrt{{{radical}}}}}{{2({a})}}$")
+        steps.append(f"$x = \\frac{{{-b} \\pm {factor}\\sqrt{{{radical}}}}}{{{2*a}}}$")
+
+        # Check if we can simplify further
+        g = gcd(gcd(abs(-b), factor), 2*a)
+        if g > 1:
+            steps.append(f"Factor out ${g}$:")
+            steps.append(f"$x = \\frac{{{-b//g} \\pm {factor//g}\\sqrt{{{radical}}}}}{{{2*a//g}}}$")
+    else:
+        steps.append(f"Substitute into the formula:")
+        steps.append(f"$x = \\frac{{-({b}) \\pm \\sqrt{{{discriminant}}}}}{{2({a})}}$")
+        steps.append(f"$x = \\frac{{{-b} \\pm \\sqrt{{{discriminant}}}}}{{{2*a}}}$")
 
-    return {
-        "question": f"Solve using the quadratic formula: ${equation}$",
-        "answer": answer,
-        "answer_numeric": None,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    steps.append(f"**Final Answer:** ${answer.replace('±', '\\pm').replace('√', '\\sqrt')}$")
+    return steps
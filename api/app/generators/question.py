@@ -0,0 +1,97 @@
+"""Typed containers for generated questions and the questions users are answering."""
+
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Union
+
+Answer = Union[int, float, str]
+
+_MISSING = object()
+
+
+class GeneratedQuestion:
+    """
+    One generated question.
+
+    Every generator returns one of these. It uses __slots__ instead of a
+    per-instance dict, so pools and caches holding thousands of questions
+    stay small. For callers written against the old dict output it also
+    supports read-only item access (question["answer"], .get(), "in");
+    optional fields that are None read as missing.
+    """
+
+    __slots__ = ("question", "answer", "steps", "difficulty", "seed", "answer_numeric", "bank_index")
+
+    def __init__(
+        self,
+        question: str,
+        answer: Any = None,
+        steps: Optional[Sequence[str]] = None,
+        difficulty: Optional[int] = None,
+        seed: Optional[int] = None,
+        answer_numeric: Optional[Answer] = None,
+        bank_index: Optional[int] = None,
+    ):
+        self.question = question
+        self.answer = answer
+        self.steps = steps
+        self.difficulty = difficulty
+        self.seed = seed
+        self.answer_numeric = answer_numeric
+        self.bank_index = bank_index
+
+    def compact(self) -> "GeneratedQuestion":
+        """
+        Copy holding only what serving the question needs.
+
+        Steps are looked up again from the seed (or bank record) when the
+        answer is submitted, so pooled questions do not hold on to them.
+        The canonical answer is a short string and is kept for signing
+        question tokens.
+        """
+        return GeneratedQuestion(
+            self.question, str(self.answer), difficulty=self.difficulty, seed=self.seed, bank_index=self.bank_index
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the fields that are set."""
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, _MISSING) if key in self.__slots__ else _MISSING
+        return default if value is _MISSING or value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key, _MISSING) is not _MISSING
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, GeneratedQuestion):
+            return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"GeneratedQuestion({self.question!r}, seed={self.seed!r})"
+
+
+class QuestionMeta(NamedTuple):
+    """
+    Immutable record of a question handed to a user.
+
+    Holds just enough to look the question up again when the answer comes
+    in: the generator, difficulty and seed (plus the bank index when it was
+    served from the question bank).
+    """
+
+    question_id: str
+    skill_id: int
+    template_type: str
+    difficulty: int
+    seed: int
+    bank_index: Optional[int] = None
+    template_id: Optional[int] = None
+    created_at: Optional[datetime] = None
@@ -1,8 +1,12 @@
 """Radical expressions generator."""
 
 import random
-from typing import Dict, Any, List
+from typing import List, Optional, Tuple
 from math import sqrt, gcd
+from app.generators.latex import format_frac, format_radical
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world applications of radicals
 RADICAL_WORD_PROBLEMS = [
@@ -29,58 +33,57 @@ RADICAL_WORD_PROBLEMS = [
 ]
 
 
-def generate_radical_expressions(difficulty: int = 1) -> Dict[str, Any]:
+def generate_radical_expressions(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate radical expressions problems.
 
     Args:
         difficulty: 1 (simplify), 2 (add/subtract), 3 (multiply/rationalize)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Simplify radicals
         # Choose a number with perfect square factors
         perfect_squares = [4, 9, 16, 25, 36, 49]
-        perfect_square = random.choice(perfect_squares)
-        other_factor = random.randint(2, 6)
+        perfect_square = rng.choice(perfect_squares)
+        other_factor = rng.randint(2, 6)
 
         # Avoid making another perfect square
         while other_factor in [4, 9, 16, 25, 36, 49]:
-            other_factor = random.randint(2, 6)
+            other_factor = rng.randint(2, 6)
 
         radicand = perfect_square * other_factor
 
-        question = f"\\sqrt{{{radicand}}}"
+        question = f"{format_radical(radicand)}"
 
         # Simplify
         outside = int(sqrt(perfect_square))
         inside = other_factor
 
-        steps = [
-            f"Simplify: ${question}$",
-            f"Factor the radicand into perfect square factors:",
-            f"${radicand} = {perfect_square} \\times {other_factor}$",
-            f"$\\sqrt{{{radicand}}} = \\sqrt{{{perfect_square} \\times {other_factor}}}$",
-            f"Use the property: $\\sqrt{{ab}} = \\sqrt{{a}} \\cdot \\sqrt{{b}}$",
-            f"$= \\sqrt{{{perfect_square}}} \\cdot \\sqrt{{{other_factor}}}$",
-            f"$= {outside}\\sqrt{{{inside}}}$",
-            f"**Final Answer:** ${outside}\\sqrt{{{inside}}}$"
-        ]
+        steps = LazySteps(_simplify_steps, question, radicand, perfect_square, other_factor, outside, inside)
 
         answer = f"{outside}√{inside}"
 
     elif difficulty == 2:
         # Add or subtract radicals
-        operation = random.choice(["+", "-"])
+        operation = rng.choice(["+", "-"])
 
         # Create like radicals: a√n ± b√n
-        radicand = random.choice([2, 3, 5, 6, 7])
-        coef1 = random.randint(2, 8)
-        coef2 = random.randint(2, 8)
+        radicand = rng.choice([2, 3, 5, 6, 7])
+        coef1 = rng.randint(2, 8)
+        coef2 = rng.randint(2, 8)
 
-        question = f"{coef1}\\sqrt{{{radicand}}} {operation} {coef2}\\sqrt{{{radicand}}}"
+        question = f"{coef1}{format_radical(radicand)} {operation} {coef2}{format_radical(radicand)}"
 
         if operation == "+":
             result = coef1 + coef2
@@ -89,89 +92,132 @@ def generate_radical_expressions(difficulty: int = 1) -> Dict[str, Any]:
             result = coef1 - coef2
             op_word = "subtract"
 
-        steps = [
-            f"${question}$",
-            f"These are like radicals (same radicand), so we can {op_word} the coefficients",
-            f"${coef1}\\sqrt{{{radicand}}} {operation} {coef2}\\sqrt{{{radicand}}} = ({coef1} {operation} {coef2})\\sqrt{{{radicand}}}$",
-            f"$= {result}\\sqrt{{{radicand}}}$",
-            f"**Final Answer:** ${result}\\sqrt{{{radicand}}}$"
-        ]
+        steps = LazySteps(_like_radicals_steps, question, operation, op_word, coef1, coef2, radicand, result)
 
         answer = f"{result}√{radicand}"
 
     else:  # difficulty == 3
         # Multiply radicals or rationalize denominator
-        problem_type = random.choice(["multiply", "rationalize"])
+        problem_type = rng.choice(["multiply", "rationalize"])
 
         if problem_type == "multiply":
             # √a × √b
-            a = random.randint(2, 6)
-            b = random.randint(2, 6)
+            a = rng.randint(2, 6)
+            b = rng.randint(2, 6)
 
-            question = f"\\sqrt{{{a}}} \\times \\sqrt{{{b}}}"
+            question = f"{format_radical(a)} \\times {format_radical(b)}"
 
             product = a * b
 
-            steps = [
-                f"Multiply: ${question}$",
-                f"Use the property: $\\sqrt{{a}} \\cdot \\sqrt{{b}} = \\sqrt{{ab}}$",
-                f"$\\sqrt{{{a}}} \\times \\sqrt{{{b}}} = \\sqrt{{{a} \\times {b}}}$",
-                f"$= \\sqrt{{{product}}}$",
-            ]
-
             # Simplify if possible
-            simplified = False
-            for i in range(int(sqrt(product)), 1, -1):
-                if product % (i * i) == 0:
-                    outside = i
-                    inside = product // (i * i)
-                    steps.append(f"Simplify $\\sqrt{{{product}}}$:")
-                    steps.append(f"${product} = {i*i} \\times {inside}$")
-                    steps.append(f"$\\sqrt{{{product}}} = \\sqrt{{{i*i} \\times {inside}}} = {outside}\\sqrt{{{inside}}}$")
-                    steps.append(f"**Final Answer:** ${outside}\\sqrt{{{inside}}}$")
-                    answer = f"{outside}√{inside}"
-                    simplified = True
-                    break
-
-            if not simplified:
-                steps.append(f"$\\sqrt{{{product}}}$ is already in simplest form")
-                steps.append(f"**Final Answer:** $\\sqrt{{{product}}}$")
+            outside, inside = _split_square(product)
+            if outside > 1:
+                answer = f"{outside}√{inside}"
+            else:
                 answer = f"√{product}"
 
+            steps = LazySteps(_multiply_steps, question, a, b, product)
+
         else:  # rationalize
             # Rationalize: 1/√n
-            numerator = random.randint(1, 5)
-            radicand = random.choice([2, 3, 5, 6, 7])
-
-            question = f"\\frac{{{numerator}}}{{\\sqrt{{{radicand}}}}}"
+            numerator = rng.randint(1, 5)
+            radicand = rng.choice([2, 3, 5, 6, 7])
 
-            steps = [
-                f"Rationalize the denominator: ${question}$",
-                f"Multiply numerator and denominator by $\\sqrt{{{radicand}}}$:",
-                f"$\\frac{{{numerator}}}{{\\sqrt{{{radicand}}}}} \\times \\frac{{\\sqrt{{{radicand}}}}}{{\\sqrt{{{radicand}}}}}$",
-                f"$= \\frac{{{numerator}\\sqrt{{{radicand}}}}}{{\\sqrt{{{radicand}}} \\times \\sqrt{{{radicand}}}}}$",
-                f"$= \\frac{{{numerator}\\sqrt{{{radicand}}}}}{{{radicand}}}$",
-            ]
+            question = f"{format_frac(numerator, format_radical(radicand))}"
 
             # Simplify if possible
             g = gcd(numerator, radicand)
             if g > 1:
-                steps.append(f"Simplify by dividing by ${g}$:")
-                steps.append(f"$\\frac{{{numerator // g}\\sqrt{{{radicand}}}}}{{{radicand // g}}}$")
                 answer = f"{numerator // g}√{radicand}/{radicand // g}"
-                steps.append(f"**Final Answer:** $\\frac{{{numerator // g}\\sqrt{{{radicand}}}}}{{{radicand // g}}}$")
+            elif numerator == 1:
+                answer = f"√{radicand}/{radicand}"
             else:
-                if numerator == 1:
-                    answer = f"√{radicand}/{radicand}"
-                    steps.append(f"**Final Answer:** $\\frac{{\\sqrt{{{radicand}}}}}{{{radicand}}}$")
-                else:
-                    answer = f"{numerator}√{radicand}/{radicand}"
-                    steps.append(f"**Final Answer:** $\\frac{{{numerator}\\sqrt{{{radicand}}}}}{{{radicand}}}$")
-
-    return {
-        "question": f"Simplify: ${question}$",
-        "answer": answer,
-        "answer_numeric": None,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+                answer = f"{numerator}√{radicand}/{radicand}"
+
+            steps = LazySteps(_rationalize_steps, question, numerator, radicand)
+
+    return GeneratedQuestion(
+        question=f"Simplify: ${question}$",
+        answer=answer,
+        answer_numeric=None,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _simplify_steps(question: str, radicand: int, perfect_square: int, other_factor: int,
+                    outside: int, inside: int) -> List[str]:
+    """Steps for pulling the perfect-square factor out of a radical."""
+    return [
+        f"Simplify: ${question}$",
+        f"Factor the radicand into perfect square factors:",
+        f"${radicand} = {perfect_square} \\times {other_factor}$",
+        f"${format_radical(radicand)} = \\sqrt{{{perfect_square} \\times {other_factor}}}$",
+        f"Use the property: $\\sqrt{{ab}} = \\sqrt{{a}} \\cdot \\sqrt{{b}}$",
+        f"$= {format_radical(perfect_square)} \\cdot {format_radical(other_factor)}$",
+        f"$= {outside}{format_radical(inside)}$",
+        f"**Final Answer:** ${outside}{format_radical(inside)}$"
+    ]
+
+
+def _like_radicals_steps(question: str, operation: str, op_word: str, coef1: int, coef2: int, radicand: int,
+                         result: int) -> List[str]:
+    """Steps for adding or subtracting like radicals."""
+    return [
+        f"${question}$",
+        f"These are like radicals (same radicand), so we can {op_word} the coefficients",
+        f"${coef1}{format_radical(radicand)} {operation} {coef2}{format_radical(radicand)} = ({coef1} {operation} {coef2}){format_radical(radicand)}$",
+        f"$= {result}{format_radical(radicand)}$",
+        f"**Final Answer:** ${result}{format_radical(radicand)}$"
+    ]
+
+
+def _split_square(n: int) -> Tuple[int, int]:
+    """Write n as outside² · inside with the largest possible outside (1 when n is square-free)."""
+    for i in range(int(sqrt(n)), 1, -1):
+        if n % (i * i) == 0:
+            return i, n // (i * i)
+    return 1, n
+
+
+def _multiply_steps(question: str, a: int, b: int, product: int) -> List[str]:
+    """Steps for √a × √b = √(ab), simplified when ab has a square factor."""
+    steps = [
+        f"Multiply: ${question}$",
+        f"Use the property: $\\sqrt{{a}} \\cdot \\sqrt{{b}} = \\sqrt{{ab}}$",
+        f"${format_radical(a)} \\times {format_radical(b)} = \\sqrt{{{a} \\times {b}}}$",
+        f"$= {format_radical(product)}$",
+    ]
+
+    outside, inside = _split_square(product)
+    if outside > 1:
+        steps.append(f"Simplify ${format_radical(product)}$:")
+        steps.append(f"${product} = {outside * outside} \\times {inside}$")
+        steps.append(f"${format_radical(product)} = \\sqrt{{{outside * outside} \\times {inside}}} = {outside}{format_radical(inside)}$")
+        steps.append(f"**Final Answer:** ${outside}{format_radical(inside)}$")
+    else:
+        steps.append(f"${format_radical(product)}$ is already in simplest form")
+        steps.append(f"**Final Answer:** ${format_radical(product)}$")
+    return steps
+
+
+def _rationalize_steps(question: str, numerator: int, radicand: int) -> List[str]:
+    """Steps for rationalizing numerator/√radicand."""
+    steps = [
+        f"Rationalize the denominator: ${question}$",
+        f"Multiply numerator and denominator by ${format_radical(radicand)}$:",
+        f"${format_frac(numerator, format_radical(radicand))} \\times {format_frac(format_radical(radicand), format_radical(radicand))}$",
+        f"$= \\frac{{{numerator}{format_radical(radicand)}}}{{{format_radical(radicand)} \\times {format_radical(radicand)}}}$",
+        f"$= \\frac{{{numerator}{format_radical(radicand)}}}{{{radicand}}}$",
+    ]
+
+    g = gcd(numerator, radicand)
+    if g > 1:
+        steps.append(f"Simplify by dividing by ${g}$:")
+        steps.append(f"$\\frac{{{numerator // g}{format_radical(radicand)}}}{{{radicand // g}}}$")
+        steps.append(f"**Final Answer:** $\\frac{{{numerator // g}{format_radical(radicand)}}}{{{radicand // g}}}$")
+    elif numerator == 1:
+        steps.append(f"**Final Answer:** ${format_frac(format_radical(radicand), radicand)}$")
+    else:
+        steps.append(f"**Final Answer:** $\\frac{{{numerator}{format_radical(radicand)}}}{{{radicand}}}$")
+    return steps
@@ -1,8 +1,14 @@
 """Rational expressions generator."""
 
 import random
-from typing import Dict, Any, List
-from math import gcd
+from typing import List, Optional
+from math import gcd, lcm
+from app.generators.latex import format_frac
+from app.generators.polynomial import Polynomial
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.sampling import randint_excluding
+from app.generators.steps import LazySteps
 
 # Real-world word problems for rational expressions
 RATIONAL_EXPRESSION_PROBLEMS = [
@@ -29,76 +35,77 @@ RATIONAL_EXPRESSION_PROBLEMS = [
 ]
 
 
-def generate_rational_expressions(difficulty: int = 1) -> Dict[str, Any]:
+def generate_rational_expressions(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate rational expressions problems.
 
     Args:
         difficulty: 1 (simplify), 2 (add/subtract), 3 (multiply/divide)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Simplify rational expressions
         # Create expression with common factors
-        common = random.randint(2, 5)
-        a = random.randint(2, 6)
-        b = random.randint(2, 6)
+        common = rng.randint(2, 5)
+        a = rng.randint(2, 6)
+        b = rng.randint(2, 6)
 
-        numerator_coef = common * a
-        denominator_coef = common * b
+        numerator = Polynomial.monomial(common * a, 1)
+        denominator = Polynomial.monomial(common * b, 1)
+        numerator_coef = numerator.leading
+        denominator_coef = denominator.leading
 
         # Format: (common*a)x / (common*b)x
-        question = f"\\frac{{{numerator_coef}x}}{{{denominator_coef}x}}"
-
-        # Simplify
-        g = gcd(numerator_coef, denominator_coef)
-        simplified_num = numerator_coef // g
-        simplified_den = denominator_coef // g
-
-        steps = [
-            f"Simplify: ${question}$",
-            f"Factor out the greatest common factor from numerator and denominator",
-            f"Numerator: ${numerator_coef}x = {g} \\cdot {simplified_num}x$",
-            f"Denominator: ${denominator_coef}x = {g} \\cdot {simplified_den}x$",
-            f"$\\frac{{{g} \\cdot {simplified_num}x}}{{{g} \\cdot {simplified_den}x}}$",
-            f"Cancel the common factor ${g}x$:",
-            f"$\\frac{{{simplified_num}}}{{{simplified_den}}}$",
-        ]
+        question = f"{format_frac(numerator.latex(), denominator.latex())}"
+
+        # Simplify by cancelling the common monomial gx
+        g = gcd(numerator.content(), denominator.content())
+        common_factor = Polynomial.monomial(g, 1)
+        simplified_num = (numerator // common_factor)[0]
+        simplified_den = (denominator // common_factor)[0]
 
         if simplified_den == 1:
-            steps.append(f"**Final Answer:** ${simplified_num}$")
             answer = str(simplified_num)
         else:
-            steps.append(f"**Final Answer:** $\\frac{{{simplified_num}}}{{{simplified_den}}}$")
             answer = f"{simplified_num}/{simplified_den}"
 
+        steps = LazySteps(
+            _simplify_steps, question, numerator_coef, denominator_coef, g, simplified_num, simplified_den
+        )
+
     elif difficulty == 2:
         # Add or subtract with different denominators
-        operation = random.choice(["+", "-"])
+        operation = rng.choice(["+", "-"])
 
         # Create two fractions with different denominators
         # a/bx ± c/dx
-        a = random.randint(1, 5)
-        b = random.randint(2, 5)
-        c = random.randint(1, 5)
-        d = random.randint(2, 5)
+        a = rng.randint(1, 5)
+        b = rng.randint(2, 5)
+        c = rng.randint(1, 5)
+        d = randint_excluding(rng, 2, 5, (b,))
 
-        # Make sure b != d
-        while b == d:
-            d = random.randint(2, 5)
-
-        question = f"\\frac{{{a}}}{{{b}x}} {operation} \\frac{{{c}}}{{{d}x}}"
+        denominator1 = Polynomial.monomial(b, 1)
+        denominator2 = Polynomial.monomial(d, 1)
+        question = f"{format_frac(a, denominator1.latex())} {operation} {format_frac(c, denominator2.latex())}"
 
         # Find LCD (least common denominator)
         # LCD of bx and dx is lcm(b,d) * x
-        from math import lcm
-        lcd_coef = lcm(b, d)
+        lcd = Polynomial.monomial(lcm(denominator1.content(), denominator2.content()), 1)
+        lcd_coef = lcd.leading
 
         # Convert fractions
-        mult1 = lcd_coef // b
-        mult2 = lcd_coef // d
+        mult1 = (lcd // denominator1)[0]
+        mult2 = (lcd // denominator2)[0]
 
         new_num1 = a * mult1
         new_num2 = c * mult2
@@ -110,101 +117,163 @@ def generate_rational_expressions(difficulty: int = 1) -> Dict[str, Any]:
             result_num = new_num1 - new_num2
             op_word = "subtract"
 
-        steps = [
-            f"${question}$",
-            f"Find the LCD (Least Common Denominator) of ${b}x$ and ${d}x$",
-            f"LCD = ${lcd_coef}x$",
-            f"Convert each fraction to have denominator ${lcd_coef}x$:",
-            f"$\\frac{{{a}}}{{{b}x}} = \\frac{{{a} \\cdot {mult1}}}{{{b}x \\cdot {mult1}}} = \\frac{{{new_num1}}}{{{lcd_coef}x}}$",
-            f"$\\frac{{{c}}}{{{d}x}} = \\frac{{{c} \\cdot {mult2}}}{{{d}x \\cdot {mult2}}} = \\frac{{{new_num2}}}{{{lcd_coef}x}}$",
-            f"Now {op_word}:",
-            f"$\\frac{{{new_num1}}}{{{lcd_coef}x}} {operation} \\frac{{{new_num2}}}{{{lcd_coef}x}} = \\frac{{{new_num1} {operation} {new_num2}}}{{{lcd_coef}x}}$",
-            f"$= \\frac{{{result_num}}}{{{lcd_coef}x}}$",
-        ]
-
         # Simplify if possible
         if result_num != 0:
             g = gcd(abs(result_num), lcd_coef)
-            if g > 1:
-                steps.append(f"Simplify by dividing both numerator and denominator by ${g}$:")
-                steps.append(f"$\\frac{{{result_num // g}}}{{{lcd_coef // g}x}}$")
-                answer = f"{result_num // g}/{lcd_coef // g}x"
-            else:
-                answer = f"{result_num}/{lcd_coef}x"
-            steps.append(f"**Final Answer:** ${answer.replace('/', '}{').replace('x', 'x}}').replace('{', '{', 1).replace('}', '', 1)}$".replace('}{', '}{'))
             answer = f"{result_num // g}/{lcd_coef // g}x" if g > 1 else f"{result_num}/{lcd_coef}x"
         else:
-            steps.append(f"**Final Answer:** $0$")
             answer = "0"
 
+        steps = LazySteps(
+            _add_subtract_steps, question, operation, op_word, a, b, c, d, lcd_coef, mult1, mult2, answer
+        )
+
     else:  # difficulty == 3
         # Multiply or divide rational expressions
-        operation = random.choice(["multiply", "divide"])
+        operation = rng.choice(["multiply", "divide"])
 
         # Create fractions (ax/b) and (c/dx)
-        a = random.randint(2, 6)
-        b = random.randint(2, 6)
-        c = random.randint(2, 6)
-        d = random.randint(2, 6)
+        a = rng.randint(2, 6)
+        b = rng.randint(2, 6)
+        c = rng.randint(2, 6)
+        d = rng.randint(2, 6)
 
         if operation == "multiply":
             question = f"\\frac{{{a}x}}{{{b}}} \\cdot \\frac{{{c}}}{{{d}x}}"
 
             # Multiply: (ax/b) * (c/dx) = (acx)/(bdx) = ac/bd
-            result_num = a * c
-            result_den = b * d
-
-            steps = [
-                f"Multiply: ${question}$",
-                f"Multiply numerators and denominators:",
-                f"$\\frac{{{a}x \\cdot {c}}}{{{b} \\cdot {d}x}}$",
-                f"$= \\frac{{{a * c}x}}{{{b * d}x}}$",
-                f"Cancel $x$ from numerator and denominator:",
-                f"$= \\frac{{{a * c}}}{{{b * d}}}$",
-            ]
+            numerator = Polynomial.monomial(a, 1) * c
+            denominator = Polynomial.monomial(d, 1) * b
+            x = Polynomial.monomial(1, 1)
+            result_num = (numerator // x)[0]
+            result_den = (denominator // x)[0]
 
             # Simplify
             g = gcd(result_num, result_den)
             if g > 1:
-                steps.append(f"Simplify by dividing by ${g}$:")
-                steps.append(f"$\\frac{{{result_num // g}}}{{{result_den // g}}}$")
                 answer = f"{result_num // g}/{result_den // g}"
             else:
                 answer = f"{result_num}/{result_den}"
 
-            steps.append(f"**Final Answer:** ${answer.replace('/', '}}{').replace('{', '\\frac{' + '{', 1)}$")
+            steps = LazySteps(
+                _multiply_steps, question, a, b, c, d, numerator, denominator, result_num, result_den, answer
+            )
 
         else:  # divide
             question = f"\\frac{{{a}x}}{{{b}}} \\div \\frac{{{c}}}{{{d}x}}"
 
             # Divide: (ax/b) ÷ (c/dx) = (ax/b) * (dx/c) = (adx²)/(bc)
-            steps = [
-                f"Divide: ${question}$",
-                f"Multiply by the reciprocal:",
-                f"$\\frac{{{a}x}}{{{b}}} \\cdot \\frac{{{d}x}}{{{c}}}$",
-                f"Multiply numerators and denominators:",
-                f"$\\frac{{{a}x \\cdot {d}x}}{{{b} \\cdot {c}}}$",
-                f"$= \\frac{{{a * d}x^2}}{{{b * c}}}$",
-            ]
-
-            result_num = a * d
+            numerator = Polynomial.monomial(a, 1) * Polynomial.monomial(d, 1)
+            result_num = numerator.leading
             result_den = b * c
 
             # Simplify
             g = gcd(result_num, result_den)
             if g > 1:
-                steps.append(f"Simplify by dividing by ${g}$:")
-                steps.append(f"$\\frac{{{result_num // g}x^2}}{{{result_den // g}}}$")
                 answer = f"{result_num // g}x²/{result_den // g}"
             else:
                 answer = f"{result_num}x²/{result_den}"
 
-            steps.append(f"**Final Answer:** $\\frac{{{result_num // g if g > 1 else result_num}x^2}}{{{result_den // g if g > 1 else result_den}}}$")
-
-    return {
-        "question": f"Simplify: ${question}$",
-        "answer": answer,
-        "answer_numeric": None,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+            steps = LazySteps(_divide_steps, question, a, b, c, d, numerator)
+
+    return GeneratedQuestion(
+        question=f"Simplify: ${question}$",
+        answer=answer,
+        answer_numeric=None,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _simplify_steps(question: str, numerator_coef: int, denominator_coef: int, g: int, simplified_num: int,
+                    simplified_den: int) -> List[str]:
+    """Steps for cancelling the common monomial from a single rational expression."""
+    steps = [
+        f"Simplify: ${question}$",
+        f"Factor out the greatest common factor from numerator and denominator",
+        f"Numerator: ${numerator_coef}x = {g} \\cdot {simplified_num}x$",
+        f"Denominator: ${denominator_coef}x = {g} \\cdot {simplified_den}x$",
+        f"$\\frac{{{g} \\cdot {simplified_num}x}}{{{g} \\cdot {simplified_den}x}}$",
+        f"Cancel the common factor ${g}x$:",
+        f"${format_frac(simplified_num, simplified_den)}$",
+    ]
+
+    if simplified_den == 1:
+        steps.append(f"**Final Answer:** ${simplified_num}$")
+    else:
+        steps.append(f"**Final Answer:** ${format_frac(simplified_num, simplified_den)}$")
+    return steps
+
+
+def _add_subtract_steps(question: str, operation: str, op_word: str, a: int, b: int, c: int, d: int,
+                        lcd_coef: int, mult1: int, mult2: int, answer: str) -> List[str]:
+    """Steps for adding or subtracting two fractions over different monomial denominators."""
+    new_num1 = a * mult1
+    new_num2 = c * mult2
+    result_num = new_num1 + new_num2 if operation == "+" else new_num1 - new_num2
+
+    steps = [
+        f"${question}$",
+        f"Find the LCD (Least Common Denominator) of ${b}x$ and ${d}x$",
+        f"LCD = ${lcd_coef}x$",
+        f"Convert each fraction to have denominator ${lcd_coef}x$:",
+        f"$\\frac{{{a}}}{{{b}x}} = \\frac{{{a} \\cdot {mult1}}}{{{b}x \\cdot {mult1}}} = \\frac{{{new_num1}}}{{{lcd_coef}x}}$",
+        f"$\\frac{{{c}}}{{{d}x}} = \\frac{{{c} \\cdot {mult2}}}{{{d}x \\cdot {mult2}}} = \\frac{{{new_num2}}}{{{lcd_coef}x}}$",
+        f"Now {op_word}:",
+        f"$\\frac{{{new_num1}}}{{{lcd_coef}x}} {operation} \\frac{{{new_num2}}}{{{lcd_coef}x}} = \\frac{{{new_num1} {operation} {new_num2}}}{{{lcd_coef}x}}$",
+        f"$= \\frac{{{result_num}}}{{{lcd_coef}x}}$",
+    ]
+
+    if result_num != 0:
+        g = gcd(abs(result_num), lcd_coef)
+        if g > 1:
+            steps.append(f"Simplify by dividing both numerator and denominator by ${g}$:")
+            steps.append(f"$\\frac{{{result_num // g}}}{{{lcd_coef // g}x}}$")
+        steps.append(f"**Final Answer:** ${answer.replace('/', '}{').replace('x', 'x}}').replace('{', '{', 1).replace('}', '', 1)}$".replace('}{', '}{'))
+    else:
+        steps.append(f"**Final Answer:** $0$")
+    return steps
+
+
+def _multiply_steps(question: str, a: int, b: int, c: int, d: int, numerator: Polynomial,
+                    denominator: Polynomial, result_num: int, result_den: int, answer: str) -> List[str]:
+    """Steps for (ax/b) * (c/dx), cancelling x before simplifying."""
+    steps = [
+        f"Multiply: ${question}$",
+        f"Multiply numerators and denominators:",
+        f"$\\frac{{{a}x \\cdot {c}}}{{{b} \\cdot {d}x}}$",
+        f"$= {format_frac(numerator.latex(), denominator.latex())}$",
+        f"Cancel $x$ from numerator and denominator:",
+        f"$= {format_frac(a * c, b * d)}$",
+    ]
+
+    g = gcd(result_num, result_den)
+    if g > 1:
+        steps.append(f"Simplify by dividing by ${g}$:")
+        steps.append(f"${format_frac(result_num // g, result_den // g)}$")
+
+    steps.append(f"**Final Answer:** ${answer.replace('/', '}}{').replace('{', '\\frac{' + '{', 1)}$")
+    return steps
+
+
+def _divide_steps(question: str, a: int, b: int, c: int, d: int, numerator: Polynomial) -> List[str]:
+    """Steps for (ax/b) ÷ (c/dx), multiplying by the reciprocal."""
+    steps = [
+        f"Divide: ${question}$",
+        f"Multiply by the reciprocal:",
+        f"$\\frac{{{a}x}}{{{b}}} \\cdot \\frac{{{d}x}}{{{c}}}$",
+        f"Multiply numerators and denominators:",
+        f"$\\frac{{{a}x \\cdot {d}x}}{{{b} \\cdot {c}}}$",
+        f"$= {format_frac(numerator.latex(), b * c)}$",
+    ]
+
+    result_num = numerator.leading
+    result_den = b * c
+
+    g = gcd(result_num, result_den)
+    if g > 1:
+        steps.append(f"Simplify by dividing by ${g}$:")
+        steps.append(f"$\\frac{{{result_num // g}x^2}}{{{result_den // g}}}$")
+
+    steps.append(f"**Final Answer:** $\\frac{{{result_num // g if g > 1 else result_num}x^2}}{{{result_den // g if g > 1 else result_den}}}$")
+    return steps
@@ -1,7 +1,11 @@
 """Rational functions question generator."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world applications of rational functions
 RATIONAL_FUNCTION_CONTEXTS = [
@@ -28,45 +32,43 @@ RATIONAL_FUNCTION_CONTEXTS = [
 ]
 
 
-def generate_rational_functions(difficulty: int = 1) -> Dict[str, Any]:
+def generate_rational_functions(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a rational function analysis problem.
 
     Args:
         difficulty: 1 (vertical asymptote), 2 (horizontal asymptote), 3 (both asymptotes)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Find vertical asymptote of f(x) = 1/(x - a)
-        a = random.randint(-5, 5)
+        a = rng.randint(-5, 5)
         if a == 0:
             a = 1
 
         question = f"Find the vertical asymptote of $f(x) = \\frac{{1}}{{x {-a:+d}}}$."
 
-        steps = [
-            "A vertical asymptote occurs where the denominator equals zero.",
-            "",
-            f"Set the denominator equal to zero: $x {-a:+d} = 0$",
-            "",
-            f"Solve for $x$: $x = {a}$",
-            "",
-            f"The vertical asymptote is at $x = {a}$.",
-            "",
-            f"**Final Answer:** ${a}$"
-        ]
+        steps = LazySteps(_vertical_asymptote_steps, a)
 
         answer_numeric = a
 
     elif difficulty == 2:
         # Medium: Find horizontal asymptote
         # For f(x) = (ax + b)/(cx + d), horizontal asymptote is a/c
-        a = random.randint(2, 6)
-        b = random.randint(-5, 5)
-        c = random.randint(2, 5)
-        d = random.randint(-5, 5)
+        a = rng.randint(2, 6)
+        b = rng.randint(-5, 5)
+        c = rng.randint(2, 5)
+        d = rng.randint(-5, 5)
 
         h_asymptote = a / c
         # Round to 2 decimal places if not an integer
@@ -78,35 +80,18 @@ def generate_rational_functions(difficulty: int = 1) -> Dict[str, Any]:
 
         question = f"Find the horizontal asymptote of $f(x) = \\frac{{{a}x {b:+d}}}{{{c}x {d:+d}}}$."
 
-        steps = [
-            "For a rational function $\\frac{{ax + b}}{{cx + d}}$, the horizontal asymptote is found by comparing the degrees of numerator and denominator.",
-            "",
-            "Both numerator and denominator have degree 1.",
-            "",
-            "When degrees are equal, the horizontal asymptote is the ratio of leading coefficients:",
-            f"$y = \\frac{{a}}{{c}} = \\frac{{{a}}}{{{c}}}$",
-            "",
-        ]
-
-        if h_asymptote == int(h_asymptote):
-            steps.append(f"$y = {int(h_asymptote)}$")
-            steps.append("")
-            steps.append(f"**Final Answer:** ${int(h_asymptote)}$")
-        else:
-            steps.append(f"$y = {answer_numeric}$")
-            steps.append("")
-            steps.append(f"**Final Answer:** ${answer_numeric}$")
+        steps = LazySteps(_horizontal_asymptote_steps, a, c, h_asymptote, answer_numeric)
 
     else:
         # Hard: Find both vertical and horizontal asymptotes
         # Ask for the sum of the asymptotes
-        a = random.randint(-4, 4)
+        a = rng.randint(-4, 4)
         if a == 0:
             a = 1
 
-        num_coef = random.randint(2, 5)
-        num_const = random.randint(-5, 5)
-        denom_coef = random.randint(2, 4)
+        num_coef = rng.randint(2, 5)
+        num_const = rng.randint(-5, 5)
+        denom_coef = rng.randint(2, 4)
 
         v_asymptote = a
         h_asymptote = num_coef / denom_coef
@@ -120,39 +105,87 @@ def generate_rational_functions(difficulty: int = 1) -> Dict[str, Any]:
 
         question = f"Find the vertical and horizontal asymptotes of $f(x) = \\frac{{{num_coef}x {num_const:+d}}}{{{denom_coef}(x {-a:+d})}}$. What is the sum of the vertical asymptote and horizontal asymptote values?"
 
-        steps = [
-            "**Step 1: Find the vertical asymptote**",
-            "Set the denominator equal to zero:",
-            f"${denom_coef}(x {-a:+d}) = 0$",
-            f"$x {-a:+d} = 0$",
-            f"$x = {a}$",
-            f"Vertical asymptote: $x = {a}$",
-            "",
-            "**Step 2: Find the horizontal asymptote**",
-            f"Rewrite as: $f(x) = \\frac{{{num_coef}x {num_const:+d}}}{{{denom_coef}x {-denom_coef*a:+d}}}$",
-            "Both numerator and denominator have degree 1.",
-            f"Horizontal asymptote: $y = \\frac{{{num_coef}}}{{{denom_coef}}}$",
-        ]
-
-        if h_asymptote == int(h_asymptote):
-            h_asymptote = int(h_asymptote)
-            steps.append(f"$y = {h_asymptote}$")
-        else:
-            h_asymptote = round(h_asymptote, 2)
-            steps.append(f"$y = {h_asymptote}$")
-
-        steps.extend([
-            "",
-            "**Step 3: Find the sum**",
-            f"Sum $= {v_asymptote} + {h_asymptote} = {answer_numeric}$",
-            "",
-            f"**Final Answer:** ${answer_numeric}$"
-        ])
-
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+        steps = LazySteps(
+            _both_asymptotes_steps, num_coef, num_const, denom_coef, a, v_asymptote, h_asymptote, answer_numeric
+        )
+
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _vertical_asymptote_steps(a: int) -> List[str]:
+    """Steps for the vertical asymptote of 1/(x - a)."""
+    return [
+        "A vertical asymptote occurs where the denominator equals zero.",
+        "",
+        f"Set the denominator equal to zero: $x {-a:+d} = 0$",
+        "",
+        f"Solve for $x$: $x = {a}$",
+        "",
+        f"The vertical asymptote is at $x = {a}$.",
+        "",
+        f"**Final Answer:** ${a}$"
+    ]
+
+
+def _horizontal_asymptote_steps(a: int, c: int, h_asymptote: float,
+                                answer_numeric: float) -> List[str]:
+    """Steps for the horizontal asymptote of a ratio of linear functions."""
+    steps = [
+        "For a rational function $\\frac{{ax + b}}{{cx + d}}$, the horizontal asymptote is found by comparing the degrees of numerator and denominator.",
+        "",
+        "Both numerator and denominator have degree 1.",
+        "",
+        "When degrees are equal, the horizontal asymptote is the ratio of leading coefficients:",
+        f"$y = \\frac{{a}}{{c}} = {format_frac(a, c)}$",
+        "",
+    ]
+
+    if h_asymptote == int(h_asymptote):
+        steps.append(f"$y = {int(h_asymptote)}$")
+        steps.append("")
+        steps.append(f"**Final Answer:** ${int(h_asymptote)}$")
+    else:
+        steps.append(f"$y = {answer_numeric}$")
+        steps.append("")
+        steps.append(f"**Final Answer:** ${answer_numeric}$")
+    return steps
+
+
+def _both_asymptotes_steps(num_coef: int, num_const: int, denom_coef: int, a: int, v_asymptote: int,
+                           h_asymptote: float, answer_numeric: float) -> List[str]:
+    """Steps for both asymptotes and their sum."""
+    steps = [
+        "**Step 1: Find the vertical asymptote**",
+        "Set the denominator equal to zero:",
+        f"${denom_coef}(x {-a:+d}) = 0$",
+        f"$x {-a:+d} = 0$",
+        f"$x = {a}$",
+        f"Vertical asymptote: $x = {a}$",
+        "",
+        "**Step 2: Find the horizontal asymptote**",
+        f"Rewrite as: $f(x) = \\frac{{{num_coef}x {num_const:+d}}}{{{denom_coef}x {-denom_coef*a:+d}}}$",
+        "Both numerator and denominator have degree 1.",
+        f"Horizontal asymptote: $y = {format_frac(num_coef, denom_coef)}$",
+    ]
+
+    if h_asymptote == int(h_asymptote):
+        h_asymptote = int(h_asymptote)
+        steps.append(f"$y = {h_asymptote}$")
+    else:
+        h_asymptote = round(h_asymptote, 2)
+        steps.append(f"$y = {h_asymptote}$")
+
+    steps.extend([
+        "",
+        "**Step 3: Find the sum**",
+        f"Sum $= {v_asymptote} + {h_asymptote} = {answer_numeric}$",
+        "",
+        f"**Final Answer:** ${answer_numeric}$"
+    ])
+    return steps
@@ -1,7 +1,12 @@
 """Ratios and proportions question generator with engaging contexts."""
 
 import random
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
+from app.generators.vectorized import Variant, int_values, maximum
 
 # Engaging word problem contexts for proportions
 PROPORTION_CONTEXTS = {
@@ -35,45 +40,46 @@ THREE_RATIO_CONTEXTS = [
 ]
 
 
-def generate_ratios_proportions(difficulty: int = 1) -> Dict[str, Any]:
+def generate_ratios_proportions(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a ratios and proportions problem.
 
     Args:
         difficulty: 1 (simple ratios), 2 (word problems), 3 (complex proportions)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps: List[str] = []
+    rng = get_rng(rng, seed)
 
     if difficulty == 1:
         # Simple ratio: a:b = x:d, find x
-        a = random.randint(2, 8)
-        b = random.randint(2, 8)
-        multiplier = random.randint(2, 5)
+        a = rng.randint(2, 8)
+        b = rng.randint(2, 8)
+        multiplier = rng.randint(2, 5)
         d = b * multiplier
         x = a * multiplier
 
         question = f"If ${a}:{b} = x:{d}$, find $x$"
 
-        steps.append(f"Set up the proportion: $\\frac{{{a}}}{{{b}}} = \\frac{{x}}{{{d}}}$")
-        steps.append("Cross multiply:")
-        steps.append(f"${a} \\times {d} = {b} \\times x$")
-        steps.append(f"${a * d} = {b}x$")
-        steps.append(f"Divide both sides by ${b}$:")
-        steps.append(f"$x = \\frac{{{a * d}}}{{{b}}} = {x}$")
+        steps = LazySteps(_vector_proportion_steps, {"a": a, "b": b, "d": d, "answer": x})
 
         answer = x
 
     elif difficulty == 2:
         # Word problem with engaging context
-        category = random.choice(list(PROPORTION_CONTEXTS.keys()))
-        context = random.choice(PROPORTION_CONTEXTS[category])
+        category = rng.choice(list(PROPORTION_CONTEXTS.keys()))
+        context = rng.choice(PROPORTION_CONTEXTS[category])
 
-        a = random.randint(2, 6)
-        b = random.randint(2, 6)
-        multiplier = random.randint(2, 5)
+        a = rng.randint(2, 6)
+        b = rng.randint(2, 6)
+        multiplier = rng.randint(2, 5)
         new_a = a * multiplier
         answer = b * multiplier
 
@@ -81,53 +87,142 @@ def generate_ratios_proportions(difficulty: int = 1) -> Dict[str, Any]:
         ask = context["ask"].format(new_a=new_a)
         question = f"{setup} {ask}"
 
-        steps.append(f"**Problem:** {question}")
-        steps.append(f"**Set up a proportion:**")
-        steps.append(f"$\\frac{{{a}}}{{{b}}} = \\frac{{{new_a}}}{{x}}$")
-        steps.append("**Cross multiply:**")
-        steps.append(f"${a} \\times x = {b} \\times {new_a}$")
-        steps.append(f"${a}x = {b * new_a}$")
-        steps.append(f"**Divide both sides by ${a}$:**")
-        steps.append(f"$x = \\frac{{{b * new_a}}}{{{a}}} = {answer}$")
+        steps = LazySteps(
+            _vector_word_problem_steps, {"question": question, "a": a, "b": b, "new_a": new_a, "answer": answer}
+        )
 
     else:
         # Complex proportion with 3 quantities and engaging context
         # a:b:c ratio, given total, find each part
-        a = random.randint(1, 4)
-        b = random.randint(2, 5)
-        c = random.randint(2, 6)
+        a = rng.randint(1, 4)
+        b = rng.randint(2, 5)
+        c = rng.randint(2, 6)
         sum_parts = a + b + c
-        total = sum_parts * random.randint(3, 8)
+        total = sum_parts * rng.randint(3, 8)
 
         part_a = (total * a) // sum_parts
         part_b = (total * b) // sum_parts
         part_c = (total * c) // sum_parts
 
         # Use engaging context
-        context = random.choice(THREE_RATIO_CONTEXTS)
+        context = rng.choice(THREE_RATIO_CONTEXTS)
         question = context["template"].format(a=a, b=b, c=c, total=total)
 
-        steps.append(f"**Problem:** {question}")
-        steps.append(f"**The ratio is** ${a}:{b}:{c}$")
-        steps.append(f"**Let the parts be** ${a}x$, ${b}x$, and ${c}x$")
-        steps.append(f"**Their sum equals** ${total}$:")
-        steps.append(f"${a}x + {b}x + {c}x = {total}$")
-        steps.append(f"${sum_parts}x = {total}$")
-        steps.append(f"$x = \\frac{{{total}}}{{{sum_parts}}} = {total // sum_parts}$")
-        steps.append(f"**Calculate each part:**")
-        steps.append(f"First part: ${a} \\times {total // sum_parts} = {part_a}$")
-        steps.append(f"Second part: ${b} \\times {total // sum_parts} = {part_b}$")
-        steps.append(f"Third part: ${c} \\times {total // sum_parts} = {part_c}$")
-        steps.append(f"**The largest is** ${max(part_a, part_b, part_c)}$")
-
         answer = max(part_a, part_b, part_c)
-
-    steps.append(f"**Final Answer:** ${answer}$")
-
-    return {
-        "question": question,
-        "answer": str(answer),
-        "answer_numeric": answer,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+        steps = LazySteps(
+            _vector_three_ratio_steps, {"question": question, "a": a, "b": b, "c": c, "total": total, "answer": answer}
+        )
+
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer),
+        answer_numeric=answer,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+# Every proportion context in one list, for vectorized draws (each category
+# has the same number of contexts, so this keeps the scalar distribution)
+PROPORTION_CONTEXT_LIST = [context for contexts in PROPORTION_CONTEXTS.values() for context in contexts]
+
+
+# Step builders shared by generate_ratios_proportions and the vectorized batches
+def _vector_proportion_steps(row: Dict[str, Any]) -> List[str]:
+    a, b, d, x = row["a"], row["b"], row["d"], row["answer"]
+    return [
+        f"Set up the proportion: ${format_frac(a, b)} = \\frac{{x}}{{{d}}}$",
+        "Cross multiply:",
+        f"${a} \\times {d} = {b} \\times x$",
+        f"${a * d} = {b}x$",
+        f"Divide both sides by ${b}$:",
+        f"$x = {format_frac(a * d, b)} = {x}$",
+        f"**Final Answer:** ${x}$",
+    ]
+
+
+def _vector_context_question(context: int, a: int, b: int, new_a: int) -> str:
+    template = PROPORTION_CONTEXT_LIST[context]
+    return f"{template['setup'].format(a=a, b=b)} {template['ask'].format(new_a=new_a)}"
+
+
+def _vector_word_problem_steps(row: Dict[str, Any]) -> List[str]:
+    a, b, new_a, answer = row["a"], row["b"], row["new_a"], row["answer"]
+    return [
+        f"**Problem:** {row['question']}",
+        "**Set up a proportion:**",
+        f"${format_frac(a, b)} = \\frac{{{new_a}}}{{x}}$",
+        "**Cross multiply:**",
+        f"${a} \\times x = {b} \\times {new_a}$",
+        f"${a}x = {b * new_a}$",
+        f"**Divide both sides by ${a}$:**",
+        f"$x = {format_frac(b * new_a, a)} = {answer}$",
+        f"**Final Answer:** ${answer}$",
+    ]
+
+
+def _vector_three_ratio_question(context: int, a: int, b: int, c: int, total: int) -> str:
+    return THREE_RATIO_CONTEXTS[context]["template"].format(a=a, b=b, c=c, total=total)
+
+
+def _vector_three_ratio_steps(row: Dict[str, Any]) -> List[str]:
+    a, b, c, total = row["a"], row["b"], row["c"], row["total"]
+    sum_parts = a + b + c
+    unit = total // sum_parts
+    return [
+        f"**Problem:** {row['question']}",
+        f"**The ratio is** ${a}:{b}:{c}$",
+        f"**Let the parts be** ${a}x$, ${b}x$, and ${c}x$",
+        f"**Their sum equals** ${total}$:",
+        f"${a}x + {b}x + {c}x = {total}$",
+        f"${sum_parts}x = {total}$",
+        f"$x = {format_frac(total, sum_parts)} = {unit}$",
+        "**Calculate each part:**",
+        f"First part: ${a} \\times {unit} = {(total * a) // sum_parts}$",
+        f"Second part: ${b} \\times {unit} = {(total * b) // sum_parts}$",
+        f"Third part: ${c} \\times {unit} = {(total * c) // sum_parts}$",
+        f"**The largest is** ${row['answer']}$",
+        f"**Final Answer:** ${row['answer']}$",
+    ]
+
+
+# Vectorized batches (see app.generators.vectorized); word problem texts are
+# chosen by a context index field and filled in per question
+VECTORIZED_VARIANTS = {
+    1: (
+        Variant(
+            fields=[("a", int_values(2, 8)), ("b", int_values(2, 8)), ("multiplier", int_values(2, 5))],
+            compute=lambda p: {"d": p["b"] * p["multiplier"], "answer": p["a"] * p["multiplier"]},
+            question="If ${a}:{b} = x:{d}$, find $x$",
+            steps=_vector_proportion_steps,
+        ),
+    ),
+    2: (
+        Variant(
+            fields=[
+                ("context", range(len(PROPORTION_CONTEXT_LIST))),
+                ("a", int_values(2, 6)), ("b", int_values(2, 6)), ("multiplier", int_values(2, 5)),
+            ],
+            compute=lambda p: {"new_a": p["a"] * p["multiplier"], "answer": p["b"] * p["multiplier"]},
+            question="{question}",
+            labels={"question": (("context", "a", "b", "new_a"), _vector_context_question)},
+            steps=_vector_word_problem_steps,
+        ),
+    ),
+    3: (
+        Variant(
+            fields=[
+                ("context", range(len(THREE_RATIO_CONTEXTS))),
+                ("a", int_values(1, 4)), ("b", int_values(2, 5)), ("c", int_values(2, 6)), ("multiplier", int_values(3, 8)),
+            ],
+            # total is a multiple of a + b + c, so every part is exact
+            compute=lambda p: {
+                "total": (p["a"] + p["b"] + p["c"]) * p["multiplier"],
+                "answer": maximum(maximum(p["a"], p["b"]), p["c"]) * p["multiplier"],
+            },
+            question="{question}",
+            labels={"question": (("context", "a", "b", "c", "total"), _vector_three_ratio_question)},
+            steps=_vector_three_ratio_steps,
+        ),
+    ),
+}
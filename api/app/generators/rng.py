@@ -0,0 +1,33 @@
+"""Random number source shared by the question generators."""
+
+import random
+from typing import Optional
+
+# Fallback source used when a caller injects neither an RNG nor a seed
+_shared_rng = random.Random()
+
+# Seeds are kept to 32 bits so they stay cheap to store and transmit
+SEED_BITS = 32
+
+
+def get_rng(rng: Optional[random.Random] = None, seed: Optional[int] = None) -> random.Random:
+    """
+    Resolve the random source a generator should draw from.
+
+    Args:
+        rng: Caller-supplied random.Random instance, or None
+        seed: Seed for a private RNG, used when rng is None
+
+    Returns:
+        The injected RNG, a fresh RNG seeded with seed, or the shared instance
+    """
+    if rng is not None:
+        return rng
+    if seed is not None:
+        return random.Random(seed)
+    return _shared_rng
+
+
+def new_seed(rng: Optional[random.Random] = None) -> int:
+    """Draw a fresh question seed."""
+    return get_rng(rng).getrandbits(SEED_BITS)
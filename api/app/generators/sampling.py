@@ -0,0 +1,60 @@
+"""Constructive samplers that draw only from valid parameter values."""
+
+import random
+from typing import Iterable, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def randint_excluding(rng: random.Random, low: int, high: int, excluded: Iterable[int]) -> int:
+    """
+    Uniform integer in [low, high] that is not one of the excluded values.
+
+    Uses a single draw from the reduced range and shifts it past the excluded
+    values, instead of redrawing until a valid value comes up.
+
+    Args:
+        rng: Random source
+        low: Smallest allowed value
+        high: Largest allowed value
+        excluded: Values to skip (values outside [low, high] are ignored)
+
+    Returns:
+        Random integer in [low, high] not in excluded
+    """
+    skipped = sorted({value for value in excluded if low <= value <= high})
+    if high - low + 1 <= len(skipped):
+        raise ValueError(f"No values left in [{low}, {high}] after excluding {skipped}")
+
+    value = rng.randint(low, high - len(skipped))
+    for skip in skipped:
+        if value >= skip:
+            value += 1
+    return value
+
+
+def nonzero_randint(rng: random.Random, low: int, high: int) -> int:
+    """Uniform non-zero integer in [low, high]."""
+    return randint_excluding(rng, low, high, (0,))
+
+
+def choice_from_table(rng: random.Random, table: Sequence[T], what: str = "parameters") -> T:
+    """
+    Pick uniformly from a precomputed table of valid values.
+
+    Args:
+        rng: Random source
+        table: Non-empty sequence of valid values
+        what: Description used in the error if the table is empty
+
+    Returns:
+        One entry of table
+    """
+    if not table:
+        raise ValueError(f"No valid {what} to choose from")
+    return rng.choice(table)
+
+
+def int_range(low: int, high: int) -> Tuple[int, ...]:
+    """Inclusive integer range as a tuple, for building valid-value tables."""
+    return tuple(range(low, high + 1))
@@ -1,7 +1,12 @@
 """Scientific notation generator."""
 
 import random
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
+from app.generators.vectorized import Variant, int_values, lookup, tenths, where
 
 # Real-world contexts for scientific notation
 SCIENTIFIC_NOTATION_CONTEXTS = [
@@ -32,83 +37,67 @@ SCIENTIFIC_NOTATION_CONTEXTS = [
 ]
 
 
-def generate_scientific_notation(difficulty: int = 1) -> Dict[str, Any]:
+def generate_scientific_notation(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate scientific notation problems.
 
     Args:
         difficulty: 1 (convert to/from), 2 (multiply/divide), 3 (mixed operations)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Convert to/from scientific notation
-        conversion_type = random.choice(["to_scientific", "from_scientific"])
+        conversion_type = rng.choice(["to_scientific", "from_scientific"])
 
         if conversion_type == "to_scientific":
             # Generate a large or small number
-            if random.choice([True, False]):
+            if rng.choice([True, False]):
                 # Large number
-                exponent = random.randint(3, 8)
-                coefficient = random.randint(1, 9) + random.randint(0, 99) / 100
+                exponent = rng.randint(3, 8)
+                coefficient = rng.randint(1, 9) + rng.randint(0, 99) / 100
                 number = coefficient * (10 ** exponent)
-
-                # Adjust coefficient to be between 1 and 10
-                adjusted_coef = coefficient
-                adjusted_exp = exponent
-
-                steps = [
-                    f"Convert ${number:,.0f}$ to scientific notation",
-                    f"Move the decimal point left until we have a number between 1 and 10",
-                    f"Count how many places we moved: ${adjusted_exp}$ places",
-                    f"The coefficient is ${adjusted_coef:.2f}$",
-                    f"**Final Answer:** ${adjusted_coef:.2f} \\times 10^{{{adjusted_exp}}}$"
-                ]
-
-                answer = f"{adjusted_coef:.2f}×10^{adjusted_exp}"
+                step_builder = _vector_large_steps
             else:
                 # Small number
-                exponent = random.randint(-6, -2)
-                coefficient = random.randint(1, 9) + random.randint(0, 99) / 100
+                exponent = rng.randint(-6, -2)
+                coefficient = rng.randint(1, 9) + rng.randint(0, 99) / 100
                 number = coefficient * (10 ** exponent)
+                step_builder = _vector_small_steps
 
-                steps = [
-                    f"Convert ${number}$ to scientific notation",
-                    f"Move the decimal point right until we have a number between 1 and 10",
-                    f"Count how many places we moved: ${abs(exponent)}$ places",
-                    f"Since we moved right, the exponent is negative: ${exponent}$",
-                    f"The coefficient is ${coefficient:.2f}$",
-                    f"**Final Answer:** ${coefficient:.2f} \\times 10^{{{exponent}}}$"
-                ]
-
-                answer = f"{coefficient:.2f}×10^{exponent}"
+            steps = LazySteps(step_builder, {"number": number, "coefficient": coefficient, "exponent": exponent})
+            answer = f"{coefficient:.2f}×10^{exponent}"
         else:
             # From scientific notation
-            exponent = random.randint(-4, 6)
-            coefficient = random.randint(10, 99) / 10
+            exponent = rng.randint(-4, 6)
+            coefficient = rng.randint(10, 99) / 10
 
             result = coefficient * (10 ** exponent)
 
-            steps = [
-                f"Convert ${coefficient} \\times 10^{{{exponent}}}$ to standard form",
-                f"Multiply ${coefficient}$ by $10^{{{exponent}}}$",
-                f"Move the decimal point ${abs(exponent)}$ places {'right' if exponent > 0 else 'left'}",
-                f"**Final Answer:** ${result:,.10g}$"
-            ]
-
+            steps = LazySteps(
+                _vector_standard_form_steps, {"coefficient": coefficient, "exponent": exponent, "result": result}
+            )
             answer = f"{result:,.10g}"
 
         question = f"Convert ${number:,.10g}$ to scientific notation" if conversion_type == "to_scientific" else f"Convert ${coefficient} \\times 10^{{{exponent}}}$ to standard form"
 
     elif difficulty == 2:
         # Multiply or divide in scientific notation
-        operation = random.choice(["multiply", "divide"])
+        operation = rng.choice(["multiply", "divide"])
 
-        coef1 = random.randint(10, 99) / 10
-        exp1 = random.randint(-3, 5)
-        coef2 = random.randint(10, 99) / 10
-        exp2 = random.randint(-3, 5)
+        coef1 = rng.randint(10, 99) / 10
+        exp1 = rng.randint(-3, 5)
+        coef2 = rng.randint(10, 99) / 10
+        exp2 = rng.randint(-3, 5)
 
         if operation == "multiply":
             result_coef = coef1 * coef2
@@ -119,22 +108,9 @@ def generate_scientific_notation(difficulty: int = 1) -> Dict[str, Any]:
                 result_coef /= 10
                 result_exp += 1
 
-            steps = [
-                f"Multiply: $({coef1} \\times 10^{{{exp1}}}) \\times ({coef2} \\times 10^{{{exp2}}})$",
-                f"Multiply the coefficients: ${coef1} \\times {coef2} = {coef1 * coef2}$",
-                f"Add the exponents: ${exp1} + {exp2} = {exp1 + exp2}$",
-                f"Result: ${coef1 * coef2} \\times 10^{{{exp1 + exp2}}}$",
-            ]
-
-            if coef1 * coef2 >= 10:
-                steps.append(f"Adjust coefficient to be between 1 and 10:")
-                steps.append(f"${coef1 * coef2} = {result_coef:.1f} \\times 10^1$")
-                steps.append(f"So: ${result_coef:.1f} \\times 10^1 \\times 10^{{{exp1 + exp2}}} = {result_coef:.1f} \\times 10^{{{result_exp}}}$")
-
-            steps.append(f"**Final Answer:** ${result_coef:.1f} \\times 10^{{{result_exp}}}$")
-
             answer = f"{result_coef:.1f}×10^{result_exp}"
             question = f"Multiply: $({coef1} \\times 10^{{{exp1}}}) \\times ({coef2} \\times 10^{{{exp2}}})$"
+            step_builder = _vector_multiply_steps
 
         else:  # divide
             result_coef = coef1 / coef2
@@ -145,31 +121,23 @@ def generate_scientific_notation(difficulty: int = 1) -> Dict[str, Any]:
                 result_coef *= 10
                 result_exp -= 1
 
-            steps = [
-                f"Divide: $\\frac{{{coef1} \\times 10^{{{exp1}}}}}{{{coef2} \\times 10^{{{exp2}}}}}$",
-                f"Divide the coefficients: $\\frac{{{coef1}}}{{{coef2}}} = {coef1 / coef2:.2f}$",
-                f"Subtract the exponents: ${exp1} - ({exp2}) = {exp1 - exp2}$",
-                f"Result: ${coef1 / coef2:.2f} \\times 10^{{{exp1 - exp2}}}$",
-            ]
-
-            if coef1 / coef2 < 1:
-                steps.append(f"Adjust coefficient to be between 1 and 10:")
-                steps.append(f"${coef1 / coef2:.2f} = {result_coef:.2f} \\times 10^{{-1}}$")
-                steps.append(f"So: ${result_coef:.2f} \\times 10^{{-1}} \\times 10^{{{exp1 - exp2}}} = {result_coef:.2f} \\times 10^{{{result_exp}}}$")
-
-            steps.append(f"**Final Answer:** ${result_coef:.2f} \\times 10^{{{result_exp}}}$")
-
             answer = f"{result_coef:.2f}×10^{result_exp}"
             question = f"Divide: $\\frac{{{coef1} \\times 10^{{{exp1}}}}}{{{coef2} \\times 10^{{{exp2}}}}}$"
+            step_builder = _vector_divide_steps
+
+        steps = LazySteps(step_builder, {
+            "coef1": coef1, "exp1": exp1, "coef2": coef2, "exp2": exp2,
+            "result_coef": result_coef, "result_exp": result_exp,
+        })
 
     else:  # difficulty == 3
         # Mixed operations
-        coef1 = random.randint(10, 99) / 10
-        exp1 = random.randint(-2, 4)
-        coef2 = random.randint(10, 99) / 10
-        exp2 = random.randint(-2, 4)
-        coef3 = random.randint(10, 99) / 10
-        exp3 = random.randint(-2, 4)
+        coef1 = rng.randint(10, 99) / 10
+        exp1 = rng.randint(-2, 4)
+        coef2 = rng.randint(10, 99) / 10
+        exp2 = rng.randint(-2, 4)
+        coef3 = rng.randint(10, 99) / 10
+        exp3 = rng.randint(-2, 4)
 
         # (a × 10^n)(b × 10^m) / (c × 10^p)
         question = f"$\\frac{{({coef1} \\times 10^{{{exp1}}}) \\times ({coef2} \\times 10^{{{exp2}}})}}{{({coef3} \\times 10^{{{exp3}}})}}$"
@@ -190,32 +158,199 @@ def generate_scientific_notation(difficulty: int = 1) -> Dict[str, Any]:
             result_coef *= 10
             result_exp -= 1
 
-        steps = [
-            f"Simplify: {question}",
-            f"**Step 1:** Multiply the numerator",
-            f"$({coef1} \\times 10^{{{exp1}}}) \\times ({coef2} \\times 10^{{{exp2}}})$",
-            f"Coefficients: ${coef1} \\times {coef2} = {num_coef}$",
-            f"Exponents: ${exp1} + {exp2} = {num_exp}$",
-            f"Numerator: ${num_coef} \\times 10^{{{num_exp}}}$",
-            f"**Step 2:** Divide by the denominator",
-            f"$\\frac{{{num_coef} \\times 10^{{{num_exp}}}}}{{{coef3} \\times 10^{{{exp3}}}}}$",
-            f"Coefficients: $\\frac{{{num_coef}}}{{{coef3}}} = {num_coef/coef3:.2f}$",
-            f"Exponents: ${num_exp} - {exp3} = {num_exp - exp3}$",
-            f"Result: ${num_coef/coef3:.2f} \\times 10^{{{num_exp - exp3}}}$",
-        ]
-
-        if abs(result_coef - num_coef/coef3) > 0.01 or result_exp != num_exp - exp3:
-            steps.append(f"Adjust to proper scientific notation:")
-            steps.append(f"${result_coef:.2f} \\times 10^{{{result_exp}}}$")
-
-        steps.append(f"**Final Answer:** ${result_coef:.2f} \\times 10^{{{result_exp}}}$")
+        steps = LazySteps(_vector_mixed_steps, {
+            "coef1": coef1, "exp1": exp1, "coef2": coef2, "exp2": exp2, "coef3": coef3, "exp3": exp3,
+            "result_coef": result_coef, "result_exp": result_exp,
+        })
 
         answer = f"{result_coef:.2f}×10^{result_exp}"
 
+    return GeneratedQuestion(
+        question=question,
+        answer=answer,
+        answer_numeric=None,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+# Powers of ten for vectorized exponents, indexed by exponent - POW10_MIN;
+# the values match Python's 10 ** exponent
+POW10_MIN = -6
+POW10 = tuple(10 ** exponent for exponent in range(POW10_MIN, 9))
+
+MULTIPLY_QUESTION = "Multiply: $({coef1} \\times 10^{{{exp1}}}) \\times ({coef2} \\times 10^{{{exp2}}})$"
+DIVIDE_QUESTION = "Divide: $\\frac{{{coef1} \\times 10^{{{exp1}}}}}{{{coef2} \\times 10^{{{exp2}}}}}$"
+MIXED_QUESTION = (
+    "$\\frac{{({coef1} \\times 10^{{{exp1}}}) \\times ({coef2} \\times 10^{{{exp2}}})}}"
+    "{{({coef3} \\times 10^{{{exp3}}})}}$"
+)
+
+
+# Step builders shared by generate_scientific_notation and the vectorized batches
+def _vector_large_steps(row: Dict[str, Any]) -> List[str]:
+    coefficient, exponent = row["coefficient"], row["exponent"]
+    return [
+        f"Convert ${row['number']:,.0f}$ to scientific notation",
+        "Move the decimal point left until we have a number between 1 and 10",
+        f"Count how many places we moved: ${exponent}$ places",
+        f"The coefficient is ${coefficient:.2f}$",
+        f"**Final Answer:** ${coefficient:.2f} \\times 10^{{{exponent}}}$",
+    ]
+
+
+def _vector_small_steps(row: Dict[str, Any]) -> List[str]:
+    coefficient, exponent = row["coefficient"], row["exponent"]
+    return [
+        f"Convert ${row['number']}$ to scientific notation",
+        "Move the decimal point right until we have a number between 1 and 10",
+        f"Count how many places we moved: ${abs(exponent)}$ places",
+        f"Since we moved right, the exponent is negative: ${exponent}$",
+        f"The coefficient is ${coefficient:.2f}$",
+        f"**Final Answer:** ${coefficient:.2f} \\times 10^{{{exponent}}}$",
+    ]
+
+
+def _vector_standard_form_steps(row: Dict[str, Any]) -> List[str]:
+    coefficient, exponent = row["coefficient"], row["exponent"]
+    return [
+        f"Convert ${coefficient} \\times 10^{{{exponent}}}$ to standard form",
+        f"Multiply ${coefficient}$ by $10^{{{exponent}}}$",
+        f"Move the decimal point ${abs(exponent)}$ places {'right' if exponent > 0 else 'left'}",
+        f"**Final Answer:** ${row['result']:,.10g}$",
+    ]
+
+
+def _vector_multiply_steps(row: Dict[str, Any]) -> List[str]:
+    coef1, exp1, coef2, exp2 = row["coef1"], row["exp1"], row["coef2"], row["exp2"]
+    result_coef, result_exp = row["result_coef"], row["result_exp"]
+    steps = [
+        MULTIPLY_QUESTION.format(**row),
+        f"Multiply the coefficients: ${coef1} \\times {coef2} = {coef1 * coef2}$",
+        f"Add the exponents: ${exp1} + {exp2} = {exp1 + exp2}$",
+        f"Result: ${coef1 * coef2} \\times 10^{{{exp1 + exp2}}}$",
+    ]
+    if coef1 * coef2 >= 10:
+        steps.append("Adjust coefficient to be between 1 and 10:")
+        steps.append(f"${coef1 * coef2} = {result_coef:.1f} \\times 10^1$")
+        steps.append(f"So: ${result_coef:.1f} \\times 10^1 \\times 10^{{{exp1 + exp2}}} = {result_coef:.1f} \\times 10^{{{result_exp}}}$")
+    steps.append(f"**Final Answer:** ${result_coef:.1f} \\times 10^{{{result_exp}}}$")
+    return steps
+
+
+def _vector_divide_steps(row: Dict[str, Any]) -> List[str]:
+    coef1, exp1, coef2, exp2 = row["coef1"], row["exp1"], row["coef2"], row["exp2"]
+    result_coef, result_exp = row["result_coef"], row["result_exp"]
+    steps = [
+        DIVIDE_QUESTION.format(**row),
+        f"Divide the coefficients: ${format_frac(coef1, coef2)} = {coef1 / coef2:.2f}$",
+        f"Subtract the exponents: ${exp1} - ({exp2}) = {exp1 - exp2}$",
+        f"Result: ${coef1 / coef2:.2f} \\times 10^{{{exp1 - exp2}}}$",
+    ]
+    if coef1 / coef2 < 1:
+        steps.append("Adjust coefficient to be between 1 and 10:")
+        steps.append(f"${coef1 / coef2:.2f} = {result_coef:.2f} \\times 10^{{-1}}$")
+        steps.append(f"So: ${result_coef:.2f} \\times 10^{{-1}} \\times 10^{{{exp1 - exp2}}} = {result_coef:.2f} \\times 10^{{{result_exp}}}$")
+    steps.append(f"**Final Answer:** ${result_coef:.2f} \\times 10^{{{result_exp}}}$")
+    return steps
+
+
+def _vector_mixed_steps(row: Dict[str, Any]) -> List[str]:
+    coef1, exp1, coef2, exp2, coef3, exp3 = (row[name] for name in ("coef1", "exp1", "coef2", "exp2", "coef3", "exp3"))
+    num_coef, num_exp = coef1 * coef2, exp1 + exp2
+    result_coef, result_exp = row["result_coef"], row["result_exp"]
+    steps = [
+        f"Simplify: {MIXED_QUESTION.format(**row)}",
+        "**Step 1:** Multiply the numerator",
+        f"$({coef1} \\times 10^{{{exp1}}}) \\times ({coef2} \\times 10^{{{exp2}}})$",
+        f"Coefficients: ${coef1} \\times {coef2} = {num_coef}$",
+        f"Exponents: ${exp1} + {exp2} = {num_exp}$",
+        f"Numerator: ${num_coef} \\times 10^{{{num_exp}}}$",
+        "**Step 2:** Divide by the denominator",
+        f"$\\frac{{{num_coef} \\times 10^{{{num_exp}}}}}{{{coef3} \\times 10^{{{exp3}}}}}$",
+        f"Coefficients: ${format_frac(num_coef, coef3)} = {num_coef/coef3:.2f}$",
+        f"Exponents: ${num_exp} - {exp3} = {num_exp - exp3}$",
+        f"Result: ${num_coef/coef3:.2f} \\times 10^{{{num_exp - exp3}}}$",
+    ]
+    if abs(result_coef - num_coef/coef3) > 0.01 or result_exp != num_exp - exp3:
+        steps.append("Adjust to proper scientific notation:")
+        steps.append(f"${result_coef:.2f} \\times 10^{{{result_exp}}}$")
+    steps.append(f"**Final Answer:** ${result_coef:.2f} \\times 10^{{{result_exp}}}$")
+    return steps
+
+
+def _vector_to_scientific(exponents: List[int], steps) -> Variant:
+    return Variant(
+        fields=[("whole", int_values(1, 9)), ("hundredths", int_values(0, 99)), ("exponent", exponents)],
+        compute=lambda p: {
+            "coefficient": p["whole"] + p["hundredths"] / 100,
+            "number": (p["whole"] + p["hundredths"] / 100) * lookup(POW10, p["exponent"] - POW10_MIN),
+        },
+        question="Convert ${number:,.10g}$ to scientific notation",
+        answer="{coefficient:.2f}×10^{exponent}",
+        steps=steps,
+    )
+
+
+def _vector_mixed(p: Dict[str, Any]) -> Dict[str, Any]:
+    quotient = p["coef1"] * p["coef2"] / p["coef3"]
+    high = quotient >= 10
+    low = quotient < 1
     return {
-        "question": question,
-        "answer": answer,
-        "answer_numeric": None,
-        "steps": steps,
-        "difficulty": difficulty,
+        "result_coef": where(high, quotient / 10, where(low, quotient * 10, quotient)),
+        "result_exp": p["exp1"] + p["exp2"] - p["exp3"] + high - low,
     }
+
+
+# Vectorized batches (see app.generators.vectorized). The coefficient
+# adjustments are at most one power of ten either way, so they are a single
+# where() instead of the loops above.
+VECTORIZED_VARIANTS = {
+    1: (
+        _vector_to_scientific(int_values(3, 8), _vector_large_steps),
+        _vector_to_scientific(int_values(-6, -2), _vector_small_steps),
+        Variant(
+            fields=[("coefficient", tenths(1, 9.9)), ("exponent", int_values(-4, 6))],
+            compute=lambda p: {"result": p["coefficient"] * lookup(POW10, p["exponent"] - POW10_MIN)},
+            question="Convert ${coefficient} \\times 10^{{{exponent}}}$ to standard form",
+            answer="{result:,.10g}",
+            steps=_vector_standard_form_steps,
+            weight=2,
+        ),
+    ),
+    2: (
+        Variant(
+            fields=[("coef1", tenths(1, 9.9)), ("exp1", int_values(-3, 5)), ("coef2", tenths(1, 9.9)), ("exp2", int_values(-3, 5))],
+            compute=lambda p: {
+                "result_coef": where(p["coef1"] * p["coef2"] >= 10, p["coef1"] * p["coef2"] / 10, p["coef1"] * p["coef2"]),
+                "result_exp": p["exp1"] + p["exp2"] + (p["coef1"] * p["coef2"] >= 10),
+            },
+            question=MULTIPLY_QUESTION,
+            answer="{result_coef:.1f}×10^{result_exp}",
+            steps=_vector_multiply_steps,
+        ),
+        Variant(
+            fields=[("coef1", tenths(1, 9.9)), ("exp1", int_values(-3, 5)), ("coef2", tenths(1, 9.9)), ("exp2", int_values(-3, 5))],
+            compute=lambda p: {
+                "result_coef": where(p["coef1"] / p["coef2"] < 1, p["coef1"] / p["coef2"] * 10, p["coef1"] / p["coef2"]),
+                "result_exp": p["exp1"] - p["exp2"] - (p["coef1"] / p["coef2"] < 1),
+            },
+            question=DIVIDE_QUESTION,
+            answer="{result_coef:.2f}×10^{result_exp}",
+            steps=_vector_divide_steps,
+        ),
+    ),
+    3: (
+        Variant(
+            fields=[
+                ("coef1", tenths(1, 9.9)), ("exp1", int_values(-2, 4)),
+                ("coef2", tenths(1, 9.9)), ("exp2", int_values(-2, 4)),
+                ("coef3", tenths(1, 9.9)), ("exp3", int_values(-2, 4)),
+            ],
+            compute=_vector_mixed,
+            question=MIXED_QUESTION,
+            answer="{result_coef:.2f}×10^{result_exp}",
+            steps=_vector_mixed_steps,
+        ),
+    ),
+}
@@ -1,7 +1,12 @@
 """Simple interest question generator (I = PRT) with engaging scenarios."""
 
 import random
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
+from app.generators.vectorized import Variant, int_values
 
 # Engaging financial scenarios
 INVESTMENT_SCENARIOS = [
@@ -16,65 +21,63 @@ INVESTMENT_SCENARIOS = [
 BANK_NAMES = ["First National Bank", "Credit Union", "Online Savings", "Community Bank"]
 
 
-def generate_simple_interest(difficulty: int = 1) -> Dict[str, Any]:
+def generate_simple_interest(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a simple interest problem using I = PRT.
 
     Args:
         difficulty: 1 (find interest), 2 (find P or R), 3 (find T or word problems)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps: List[str] = []
+    rng = get_rng(rng, seed)
 
     # Use engaging scenario 50% of the time
-    use_scenario = random.random() < 0.5
+    use_scenario = rng.random() < 0.5
 
     if difficulty == 1:
         # Find interest: I = PRT
-        principal = random.randint(5, 50) * 100  # 500-5000 in increments of 100
-        rate = random.choice([3, 4, 5, 6, 7, 8])  # percentage
-        time = random.randint(2, 10)  # years
+        principal = rng.randint(5, 50) * 100  # 500-5000 in increments of 100
+        rate = rng.choice([3, 4, 5, 6, 7, 8])  # percentage
+        time = rng.randint(2, 10)  # years
 
         interest = (principal * rate * time) / 100
+        row = {"principal": principal, "rate": rate, "time": time, "answer": interest}
 
         if use_scenario:
-            scenario = random.choice(INVESTMENT_SCENARIOS)
-            bank = random.choice(BANK_NAMES)
+            scenario = rng.choice(INVESTMENT_SCENARIOS)
+            bank = rng.choice(BANK_NAMES)
             question = (
                 f"You deposit ${principal} in your {scenario['name']} at {bank}, "
                 f"earning {rate}% simple interest per year. "
                 f"How much interest will you earn after {time} years?"
             )
-            steps.append(f"**Problem:** {question}")
+            steps = LazySteps(_scenario_steps, question, row)
         else:
             question = (
                 f"Calculate the simple interest on ${principal} "
                 f"at {rate}% per year for {time} years."
             )
-
-        steps.append("**Use the simple interest formula:** $I = PRT$")
-        steps.append("**Where:**")
-        steps.append(f"- P = ${principal} (principal - amount deposited)")
-        steps.append(f"- R = {rate}% = {rate/100} (rate as decimal)")
-        steps.append(f"- T = {time} years (time period)")
-        steps.append("**Substitute and calculate:**")
-        steps.append(f"$I = {principal} \\times {rate/100} \\times {time}$")
-        steps.append(f"$I = {principal * rate * time / 100}$")
-        steps.append(f"**Final Answer:** ${interest:.2f}")
+            steps = LazySteps(_vector_interest_steps, row)
 
         answer = interest
 
     elif difficulty == 2:
         # Find principal or rate
-        find_what = random.choice(["principal", "rate"])
+        find_what = rng.choice(["principal", "rate"])
 
         if find_what == "principal":
             # Find P: P = I / (RT)
-            interest = random.randint(1, 8) * 100  # 100-800 in increments of 100
-            rate = random.choice([4, 5, 6, 8, 10])
-            time = random.randint(2, 5)
+            interest = rng.randint(1, 8) * 100  # 100-800 in increments of 100
+            rate = rng.choice([4, 5, 6, 8, 10])
+            time = rng.randint(2, 5)
 
             principal = (interest * 100) / (rate * time)
 
@@ -83,21 +86,17 @@ def generate_simple_interest(difficulty: int = 1) -> Dict[str, Any]:
                 f"at {rate}% per year for {time} years?"
             )
 
-            steps.append("Use the simple interest formula: $I = PRT$")
-            steps.append("Solve for P: $P = \\frac{I}{RT}$")
-            steps.append(f"Given: I = ${interest}, R = {rate}% = {rate/100}, T = {time} years")
-            steps.append("Substitute values:")
-            steps.append(f"$P = \\frac{{{interest}}}{{{rate/100} \\times {time}}}$")
-            steps.append(f"$P = \\frac{{{interest}}}{{{rate * time / 100}}}$")
-            steps.append(f"**Final Answer:** ${principal:.2f}")
+            steps = LazySteps(
+                _vector_principal_steps, {"interest": interest, "rate": rate, "time": time, "answer": principal}
+            )
 
             answer = principal
 
         else:
             # Find R: R = I / (PT)
-            principal = random.randint(5, 30) * 100  # 500-3000 in increments of 100
-            time = random.randint(2, 6)
-            rate = random.choice([4, 5, 6, 8])
+            principal = rng.randint(5, 30) * 100  # 500-3000 in increments of 100
+            time = rng.randint(2, 6)
+            rate = rng.choice([4, 5, 6, 8])
 
             interest = (principal * rate * time) / 100
 
@@ -106,27 +105,21 @@ def generate_simple_interest(difficulty: int = 1) -> Dict[str, Any]:
                 f"simple interest in {time} years?"
             )
 
-            steps.append("Use the simple interest formula: $I = PRT$")
-            steps.append("Solve for R: $R = \\frac{I}{PT}$")
-            steps.append(f"Given: I = ${interest:.0f}, P = ${principal}, T = {time} years")
-            steps.append("Substitute values:")
-            steps.append(f"$R = \\frac{{{interest:.0f}}}{{{principal} \\times {time}}}$")
-            steps.append(f"$R = \\frac{{{interest:.0f}}}{{{principal * time}}}$")
-            steps.append(f"$R = {rate/100}$")
-            steps.append(f"Convert to percentage: R = {rate/100} × 100% = {rate}%")
-            steps.append(f"**Final Answer:** {rate}%")
+            steps = LazySteps(
+                _vector_rate_steps, {"principal": principal, "rate": rate, "time": time, "interest": interest}
+            )
 
             answer = rate
 
     else:
         # Find time or word problem
-        problem_type = random.choice(["time", "word"])
+        problem_type = rng.choice(["time", "word"])
 
         if problem_type == "time":
             # Find T: T = I / (PR)
-            principal = random.randint(8, 40) * 100  # 800-4000 in increments of 100
-            rate = random.choice([4, 5, 6, 8, 10])
-            time = random.randint(3, 8)
+            principal = rng.randint(8, 40) * 100  # 800-4000 in increments of 100
+            rate = rng.choice([4, 5, 6, 8, 10])
+            time = rng.randint(3, 8)
 
             interest = (principal * rate * time) / 100
 
@@ -135,21 +128,17 @@ def generate_simple_interest(difficulty: int = 1) -> Dict[str, Any]:
                 f"simple interest at {rate}% per year?"
             )
 
-            steps.append("Use the simple interest formula: $I = PRT$")
-            steps.append("Solve for T: $T = \\frac{I}{PR}$")
-            steps.append(f"Given: I = ${interest:.0f}, P = ${principal}, R = {rate}% = {rate/100}")
-            steps.append("Substitute values:")
-            steps.append(f"$T = \\frac{{{interest:.0f}}}{{{principal} \\times {rate/100}}}$")
-            steps.append(f"$T = \\frac{{{interest:.0f}}}{{{principal * rate / 100}}}$")
-            steps.append(f"**Final Answer:** {time} years")
+            steps = LazySteps(
+                _vector_time_steps, {"principal": principal, "rate": rate, "time": time, "interest": interest}
+            )
 
             answer = time
 
         else:
             # Word problem: find total amount (Principal + Interest)
-            principal = random.randint(10, 50) * 100  # 1000-5000 in increments of 100
-            rate = random.choice([4, 5, 6, 7, 8])
-            time = random.randint(3, 10)
+            principal = rng.randint(10, 50) * 100  # 1000-5000 in increments of 100
+            rate = rng.choice([4, 5, 6, 7, 8])
+            time = rng.randint(3, 10)
 
             interest = (principal * rate * time) / 100
             total = principal + interest
@@ -160,13 +149,10 @@ def generate_simple_interest(difficulty: int = 1) -> Dict[str, Any]:
                 f"amount in the account after {time} years?"
             )
 
-            steps.append("First, calculate the simple interest using $I = PRT$")
-            steps.append(f"P = ${principal}, R = {rate}% = {rate/100}, T = {time} years")
-            steps.append(f"$I = {principal} \\times {rate/100} \\times {time}$")
-            steps.append(f"$I = {interest:.0f}$")
-            steps.append("Total amount = Principal + Interest")
-            steps.append(f"Total = ${principal} + ${interest:.0f}")
-            steps.append(f"**Final Answer:** ${total:.2f}")
+            steps = LazySteps(
+                _vector_total_steps,
+                {"principal": principal, "rate": rate, "time": time, "interest": interest, "answer": total},
+            )
 
             answer = total
 
@@ -178,10 +164,136 @@ def generate_simple_interest(difficulty: int = 1) -> Dict[str, Any]:
     else:
         answer_str = f"{answer:.2f}"
 
-    return {
-        "question": question,
-        "answer": answer_str,
-        "answer_numeric": round(answer, 2),
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=answer_str,
+        answer_numeric=round(answer, 2),
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _scenario_steps(question: str, row: Dict[str, Any]) -> List[str]:
+    """Steps for a savings scenario: restate it, then find the interest."""
+    return [f"**Problem:** {question}"] + _vector_interest_steps(row)
+
+
+# Step builders shared by generate_simple_interest and the vectorized batches
+def _vector_interest_steps(row: Dict[str, Any]) -> List[str]:
+    principal, rate, time = row["principal"], row["rate"], row["time"]
+    return [
+        "**Use the simple interest formula:** $I = PRT$",
+        "**Where:**",
+        f"- P = ${principal} (principal - amount deposited)",
+        f"- R = {rate}% = {rate/100} (rate as decimal)",
+        f"- T = {time} years (time period)",
+        "**Substitute and calculate:**",
+        f"$I = {principal} \\times {rate/100} \\times {time}$",
+        f"$I = {principal * rate * time / 100}$",
+        f"**Final Answer:** ${row['answer']:.2f}",
+    ]
+
+
+def _vector_principal_steps(row: Dict[str, Any]) -> List[str]:
+    interest, rate, time = row["interest"], row["rate"], row["time"]
+    return [
+        "Use the simple interest formula: $I = PRT$",
+        "Solve for P: $P = \\frac{I}{RT}$",
+        f"Given: I = ${interest}, R = {rate}% = {rate/100}, T = {time} years",
+        "Substitute values:",
+        f"$P = \\frac{{{interest}}}{{{rate/100} \\times {time}}}$",
+        f"$P = {format_frac(interest, rate * time / 100)}$",
+        f"**Final Answer:** ${row['answer']:.2f}",
+    ]
+
+
+def _vector_rate_steps(row: Dict[str, Any]) -> List[str]:
+    principal, rate, time, interest = row["principal"], row["rate"], row["time"], row["interest"]
+    return [
+        "Use the simple interest formula: $I = PRT$",
+        "Solve for R: $R = \\frac{I}{PT}$",
+        f"Given: I = ${interest:.0f}, P = ${principal}, T = {time} years",
+        "Substitute values:",
+        f"$R = \\frac{{{interest:.0f}}}{{{principal} \\times {time}}}$",
+        f"$R = \\frac{{{interest:.0f}}}{{{principal * time}}}$",
+        f"$R = {rate/100}$",
+        f"Convert to percentage: R = {rate/100} × 100% = {rate}%",
+        f"**Final Answer:** {rate}%",
+    ]
+
+
+def _vector_time_steps(row: Dict[str, Any]) -> List[str]:
+    principal, rate, time, interest = row["principal"], row["rate"], row["time"], row["interest"]
+    return [
+        "Use the simple interest formula: $I = PRT$",
+        "Solve for T: $T = \\frac{I}{PR}$",
+        f"Given: I = ${interest:.0f}, P = ${principal}, R = {rate}% = {rate/100}",
+        "Substitute values:",
+        f"$T = \\frac{{{interest:.0f}}}{{{principal} \\times {rate/100}}}$",
+        f"$T = \\frac{{{interest:.0f}}}{{{principal * rate / 100}}}$",
+        f"**Final Answer:** {time} years",
+    ]
+
+
+def _vector_total_steps(row: Dict[str, Any]) -> List[str]:
+    principal, rate, time, interest = row["principal"], row["rate"], row["time"], row["interest"]
+    return [
+        "First, calculate the simple interest using $I = PRT$",
+        f"P = ${principal}, R = {rate}% = {rate/100}, T = {time} years",
+        f"$I = {principal} \\times {rate/100} \\times {time}$",
+        f"$I = {interest:.0f}$",
+        "Total amount = Principal + Interest",
+        f"Total = ${principal} + ${interest:.0f}",
+        f"**Final Answer:** ${row['answer']:.2f}",
+    ]
+
+
+# Vectorized batches (see app.generators.vectorized) cover the plain question
+# forms; savings-scenario wording is only generated one at a time.
+VECTORIZED_VARIANTS = {
+    1: (
+        Variant(
+            fields=[("principal", int_values(500, 5000, step=100)), ("rate", (3, 4, 5, 6, 7, 8)), ("time", int_values(2, 10))],
+            compute=lambda p: {"answer": (p["principal"] * p["rate"] * p["time"]) / 100},
+            question="Calculate the simple interest on ${principal} at {rate}% per year for {time} years.",
+            answer="{answer:.2f}",
+            steps=_vector_interest_steps,
+        ),
+    ),
+    2: (
+        Variant(
+            fields=[("interest", int_values(100, 800, step=100)), ("rate", (4, 5, 6, 8, 10)), ("time", int_values(2, 5))],
+            compute=lambda p: {"answer": (p["interest"] * 100) / (p["rate"] * p["time"])},
+            question="What principal will earn ${interest} simple interest at {rate}% per year for {time} years?",
+            answer="{answer:.2f}",
+            steps=_vector_principal_steps,
+        ),
+        Variant(
+            fields=[("principal", int_values(500, 3000, step=100)), ("time", int_values(2, 6)), ("rate", (4, 5, 6, 8))],
+            compute=lambda p: {"interest": (p["principal"] * p["rate"] * p["time"]) / 100, "answer": p["rate"]},
+            question="At what annual interest rate will ${principal} earn ${interest:.0f} simple interest in {time} years?",
+            steps=_vector_rate_steps,
+        ),
+    ),
+    3: (
+        Variant(
+            fields=[("principal", int_values(800, 4000, step=100)), ("rate", (4, 5, 6, 8, 10)), ("time", int_values(3, 8))],
+            compute=lambda p: {"interest": (p["principal"] * p["rate"] * p["time"]) / 100, "answer": p["time"]},
+            question="How many years will it take for ${principal} to earn ${interest:.0f} simple interest at {rate}% per year?",
+            steps=_vector_time_steps,
+        ),
+        Variant(
+            fields=[("principal", int_values(1000, 5000, step=100)), ("rate", (4, 5, 6, 7, 8)), ("time", int_values(3, 10))],
+            compute=lambda p: {
+                "interest": (p["principal"] * p["rate"] * p["time"]) / 100,
+                "answer": p["principal"] + (p["principal"] * p["rate"] * p["time"]) / 100,
+            },
+            question=(
+                "You deposit ${principal} in a savings account that earns {rate}% simple interest per year. "
+                "What will be the total amount in the account after {time} years?"
+            ),
+            answer="{answer:.2f}",
+            steps=_vector_total_steps,
+        ),
+    ),
+}
@@ -2,7 +2,10 @@
 
 import random
 import math
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world word problem contexts for trigonometric ratios
 WORD_PROBLEMS = [
@@ -44,16 +47,24 @@ WORD_PROBLEMS = [
 ]
 
 
-def generate_sine_cosine_tangent(difficulty: int = 1) -> Dict[str, Any]:
+def generate_sine_cosine_tangent(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate basic trigonometric ratio problems.
 
     Args:
         difficulty: 1 (evaluate at standard angles), 2 (solve for angle), 3 (word problems)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Evaluate trig functions at standard angles
         # (degrees, radians_str, sin, cos, tan)
@@ -65,8 +76,8 @@ def generate_sine_cosine_tangent(difficulty: int = 1) -> Dict[str, Any]:
             (90, "\\frac{\\pi}{2}", 1, 0, None),  # tan undefined
         ]
 
-        degrees, radian_str, sin_val, cos_val, tan_val = random.choice(standard_angles)
-        trig_func = random.choice(['sin', 'cos'] if tan_val is None else ['sin', 'cos', 'tan'])
+        degrees, radian_str, sin_val, cos_val, tan_val = rng.choice(standard_angles)
+        trig_func = rng.choice(['sin', 'cos'] if tan_val is None else ['sin', 'cos', 'tan'])
 
         if trig_func == 'sin':
             value = sin_val
@@ -105,22 +116,7 @@ def generate_sine_cosine_tangent(difficulty: int = 1) -> Dict[str, Any]:
 
         question = f"Evaluate $\\{trig_func}({degrees}°)$."
 
-        steps = [
-            f"${degrees}°$ is equivalent to ${radian_str}$ radians",
-            f"This is a standard angle on the unit circle",
-        ]
-
-        if trig_func == 'sin':
-            steps.append(f"$\\sin({degrees}°)$ is the $y$-coordinate on the unit circle")
-            steps.append(f"At ${degrees}°$, the $y$-coordinate is ${value_str}$")
-        elif trig_func == 'cos':
-            steps.append(f"$\\cos({degrees}°)$ is the $x$-coordinate on the unit circle")
-            steps.append(f"At ${degrees}°$, the $x$-coordinate is ${value_str}$")
-        else:
-            steps.append(f"$\\tan({degrees}°) = \\frac{{\\sin({degrees}°)}}{{\\cos({degrees}°)}}$")
-            steps.append(f"$\\tan({degrees}°) = {value_str}$")
-
-        steps.append(f"**Final Answer:** ${value_str}$")
+        steps = LazySteps(_evaluate_steps, degrees, radian_str, trig_func, value_str)
         answer_numeric = round(value, 4)
 
     elif difficulty == 2:
@@ -138,35 +134,24 @@ def generate_sine_cosine_tangent(difficulty: int = 1) -> Dict[str, Any]:
             (0, "0", "cos", 1, "1"),
         ]
 
-        degrees, radian_str, func, value, value_str = random.choice(angle_values)
+        degrees, radian_str, func, value, value_str = rng.choice(angle_values)
 
         question = f"Find the angle $\\theta$ (in degrees, where $0° \\leq \\theta \\leq 90°$) such that $\\{func}(\\theta) = {value_str}$."
 
-        steps = [
-            f"We need to find $\\theta$ where $\\{func}(\\theta) = {value_str}$",
-            "Recall the standard angle values:",
-        ]
-
-        if func == "sin":
-            steps.append("$\\sin(0°) = 0$, $\\sin(30°) = \\frac{1}{2}$, $\\sin(45°) = \\frac{\\sqrt{2}}{2}$, $\\sin(60°) = \\frac{\\sqrt{3}}{2}$, $\\sin(90°) = 1$")
-        else:
-            steps.append("$\\cos(0°) = 1$, $\\cos(30°) = \\frac{\\sqrt{3}}{2}$, $\\cos(45°) = \\frac{\\sqrt{2}}{2}$, $\\cos(60°) = \\frac{1}{2}$, $\\cos(90°) = 0$")
-
-        steps.append(f"Comparing with ${value_str}$, we find:")
-        steps.append(f"**Final Answer:** $\\theta = {degrees}°$")
+        steps = LazySteps(_find_angle_steps, value_str, func, degrees)
 
         answer_numeric = degrees
 
     else:
         # Hard: Right triangle word problems
-        use_word_problem = random.random() < 0.4  # 40% of time use engaging contexts
+        use_word_problem = rng.random() < 0.4  # 40% of time use engaging contexts
         problem_types = ["ladder", "ramp", "height"]
-        problem_type = random.choice(problem_types)
+        problem_type = rng.choice(problem_types)
 
         if problem_type == "ladder":
             # Ladder against wall - find height or angle
-            length = random.choice([10, 12, 15, 20])
-            angle = random.choice([30, 45, 60])
+            length = rng.choice([10, 12, 15, 20])
+            angle = rng.choice([30, 45, 60])
 
             if angle == 30:
                 height = length * 0.5
@@ -183,33 +168,14 @@ def generate_sine_cosine_tangent(difficulty: int = 1) -> Dict[str, Any]:
             else:
                 question = f"A {length}-foot ladder leans against a wall at an angle of ${angle}°$ from the ground. How high up the wall does the ladder reach?"
 
-            steps = [
-                f"**Setup:** Draw a right triangle with the {length}-foot beam as the hypotenuse.",
-                "The angle of ${angle}°$ is measured from the ground.",
-                f"The height we're solving for is the **opposite** side to this angle.",
-                "",
-                f"**Identify the right trigonometric ratio:**",
-                f"We have the hypotenuse ({length} ft) and need the opposite side (height).",
-                f"Use sine: $\\sin(\\theta) = \\frac{{\\text{{opposite}}}}{{\\text{{hypotenuse}}}}$",
-                "",
-                f"**Apply the formula:**",
-                f"$\\sin({angle}°) = \\frac{{h}}{{{length}}}$",
-                "",
-                f"**Solve for the unknown:**",
-                f"Multiply both sides by ${length}$: $h = {length} \\cdot \\sin({angle}°)$",
-                "",
-                f"**Calculate the result:**",
-                f"$h = {height_str}$ feet",
-                "",
-                f"**Final Answer:** ${round(height, 2)}$ feet"
-            ]
+            steps = LazySteps(_ladder_steps, length, angle, height_str, height)
 
             answer_numeric = round(height, 2)
 
         elif problem_type == "ramp":
             # Wheelchair ramp - find length or angle
-            height = random.choice([2, 3, 4])
-            angle = random.choice([5, 10, 15])  # ADA compliant angles
+            height = rng.choice([2, 3, 4])
+            angle = rng.choice([5, 10, 15])  # ADA compliant angles
 
             # Using sin(angle) = height/length
             length = height / math.sin(math.radians(angle))
@@ -219,34 +185,14 @@ def generate_sine_cosine_tangent(difficulty: int = 1) -> Dict[str, Any]:
             else:
                 question = f"A wheelchair ramp must rise ${height}$ feet at an angle of ${angle}°$. How long must the ramp be?"
 
-            steps = [
-                f"**Setup:** The ramp forms a right triangle where:",
-                f"- Vertical rise (opposite) = ${height}$ feet",
-                f"- Ramp angle from horizontal = ${angle}°$",
-                "- Ramp length = hypotenuse (what we're finding)",
-                "",
-                f"**Identify the right trigonometric ratio:**",
-                f"We have the opposite side and need the hypotenuse.",
-                f"Use sine: $\\sin(\\theta) = \\frac{{\\text{{opposite}}}}{{\\text{{hypotenuse}}}}$",
-                "",
-                f"**Apply the formula:**",
-                f"$\\sin({angle}°) = \\frac{{{height}}}{{L}}$",
-                "",
-                f"**Solve for the unknown:**",
-                f"Rearrange: $L = \\frac{{{height}}}{{\\sin({angle}°)}}$",
-                "",
-                f"**Calculate the result:**",
-                f"$L = \\frac{{{height}}}{{\\sin({angle}°)}} \\approx {round(length, 2)}$ feet",
-                "",
-                f"**Final Answer:** ${round(length, 2)}$ feet"
-            ]
+            steps = LazySteps(_ramp_steps, height, angle, length)
 
             answer_numeric = round(length, 2)
 
         else:  # height
             # Tree height from distance and angle (or building, flagpole, etc.)
-            distance = random.choice([30, 40, 50, 60])
-            angle = random.choice([30, 45, 60])
+            distance = rng.choice([30, 40, 50, 60])
+            angle = rng.choice([30, 45, 60])
 
             if angle == 30:
                 height = distance / math.sqrt(3)
@@ -263,34 +209,126 @@ def generate_sine_cosine_tangent(difficulty: int = 1) -> Dict[str, Any]:
             else:
                 question = f"From a point ${distance}$ feet from the base of a tree, the angle of elevation to the top is ${angle}°$. How tall is the tree?"
 
-            steps = [
-                f"**Setup:** The observer, tree base, and tree top form a right triangle where:",
-                f"- Distance from tree (adjacent) = ${distance}$ feet",
-                "- Tree height (opposite) = unknown",
-                f"- Angle of elevation = ${angle}°$ (angle looking up from horizontal)",
-                "",
-                f"**Identify the right trigonometric ratio:**",
-                f"We have the adjacent side and need the opposite side.",
-                f"Use tangent: $\\tan(\\theta) = \\frac{{\\text{{opposite}}}}{{\\text{{adjacent}}}}$",
-                "",
-                f"**Apply the formula:**",
-                f"$\\tan({angle}°) = \\frac{{h}}{{{distance}}}$",
-                "",
-                f"**Solve for the unknown:**",
-                f"Multiply both sides by ${distance}$: $h = {distance} \\cdot \\tan({angle}°)$",
-                "",
-                f"**Calculate the result:**",
-                f"$h = {height_str}$ feet",
-                "",
-                f"**Final Answer:** ${round(height, 2)}$ feet"
-            ]
+            steps = LazySteps(_height_steps, distance, angle, height_str, height)
 
             answer_numeric = round(height, 2)
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _evaluate_steps(degrees: int, radian_str: str, trig_func: str, value_str: str) -> List[str]:
+    """Steps for evaluating sin, cos or tan at a standard angle."""
+    steps = [
+        f"${degrees}°$ is equivalent to ${radian_str}$ radians",
+        f"This is a standard angle on the unit circle",
+    ]
+
+    if trig_func == 'sin':
+        steps.append(f"$\\sin({degrees}°)$ is the $y$-coordinate on the unit circle")
+        steps.append(f"At ${degrees}°$, the $y$-coordinate is ${value_str}$")
+    elif trig_func == 'cos':
+        steps.append(f"$\\cos({degrees}°)$ is the $x$-coordinate on the unit circle")
+        steps.append(f"At ${degrees}°$, the $x$-coordinate is ${value_str}$")
+    else:
+        steps.append(f"$\\tan({degrees}°) = \\frac{{\\sin({degrees}°)}}{{\\cos({degrees}°)}}$")
+        steps.append(f"$\\tan({degrees}°) = {value_str}$")
+
+    steps.append(f"**Final Answer:** ${value_str}$")
+    return steps
+
+
+def _find_angle_steps(value_str: str, func: str, degrees: int) -> List[str]:
+    """Steps for finding the standard angle with a given sin or cos."""
+    steps = [
+        f"We need to find $\\theta$ where $\\{func}(\\theta) = {value_str}$",
+        "Recall the standard angle values:",
+    ]
+
+    if func == "sin":
+        steps.append("$\\sin(0°) = 0$, $\\sin(30°) = \\frac{1}{2}$, $\\sin(45°) = \\frac{\\sqrt{2}}{2}$, $\\sin(60°) = \\frac{\\sqrt{3}}{2}$, $\\sin(90°) = 1$")
+    else:
+        steps.append("$\\cos(0°) = 1$, $\\cos(30°) = \\frac{\\sqrt{3}}{2}$, $\\cos(45°) = \\frac{\\sqrt{2}}{2}$, $\\cos(60°) = \\frac{1}{2}$, $\\cos(90°) = 0$")
+
+    steps.append(f"Comparing with ${value_str}$, we find:")
+    steps.append(f"**Final Answer:** $\\theta = {degrees}°$")
+    return steps
+
+
+def _ladder_steps(length: int, angle: int, height_str: str, height: float) -> List[str]:
+    """Steps for the ladder (height from hypotenuse and angle) problem."""
+    return [
+        f"**Setup:** Draw a right triangle with the {length}-foot beam as the hypotenuse.",
+        "The angle of ${angle}°$ is measured from the ground.",
+        f"The height we're solving for is the **opposite** side to this angle.",
+        "",
+        f"**Identify the right trigonometric ratio:**",
+        f"We have the hypotenuse ({length} ft) and need the opposite side (height).",
+        f"Use sine: $\\sin(\\theta) = \\frac{{\\text{{opposite}}}}{{\\text{{hypotenuse}}}}$",
+        "",
+        f"**Apply the formula:**",
+        f"$\\sin({angle}°) = \\frac{{h}}{{{length}}}$",
+        "",
+        f"**Solve for the unknown:**",
+        f"Multiply both sides by ${length}$: $h = {length} \\cdot \\sin({angle}°)$",
+        "",
+        f"**Calculate the result:**",
+        f"$h = {height_str}$ feet",
+        "",
+        f"**Final Answer:** ${round(height, 2)}$ feet"
+    ]
+
+
+def _ramp_steps(height: int, angle: int, length: float) -> List[str]:
+    """Steps for the ramp (hypotenuse from height and angle) problem."""
+    return [
+        f"**Setup:** The ramp forms a right triangle where:",
+        f"- Vertical rise (opposite) = ${height}$ feet",
+        f"- Ramp angle from horizontal = ${angle}°$",
+        "- Ramp length = hypotenuse (what we're finding)",
+        "",
+        f"**Identify the right trigonometric ratio:**",
+        f"We have the opposite side and need the hypotenuse.",
+        f"Use sine: $\\sin(\\theta) = \\frac{{\\text{{opposite}}}}{{\\text{{hypotenuse}}}}$",
+        "",
+        f"**Apply the formula:**",
+        f"$\\sin({angle}°) = \\frac{{{height}}}{{L}}$",
+        "",
+        f"**Solve for the unknown:**",
+        f"Rearrange: $L = \\frac{{{height}}}{{\\sin({angle}°)}}$",
+        "",
+        f"**Calculate the result:**",
+        f"$L = \\frac{{{height}}}{{\\sin({angle}°)}} \\approx {round(length, 2)}$ feet",
+        "",
+        f"**Final Answer:** ${round(length, 2)}$ feet"
+    ]
+
+
+def _height_steps(distance: int, angle: int, height_str: str, height: float) -> List[str]:
+    """Steps for the angle of elevation (height from distance) problem."""
+    return [
+        f"**Setup:** The observer, tree base, and tree top form a right triangle where:",
+        f"- Distance from tree (adjacent) = ${distance}$ feet",
+        "- Tree height (opposite) = unknown",
+        f"- Angle of elevation = ${angle}°$ (angle looking up from horizontal)",
+        "",
+        f"**Identify the right trigonometric ratio:**",
+        f"We have the adjacent side and need the opposite side.",
+        f"Use tangent: $\\tan(\\theta) = \\frac{{\\text{{opposite}}}}{{\\text{{adjacent}}}}$",
+        "",
+        f"**Apply the formula:**",
+        f"$\\tan({angle}°) = \\frac{{h}}{{{distance}}}$",
+        "",
+        f"**Solve for the unknown:**",
+        f"Multiply both sides by ${distance}$: $h = {distance} \\cdot \\tan({angle}°)$",
+        "",
+        f"**Calculate the result:**",
+        f"$h = {height_str}$ feet",
+        "",
+        f"**Final Answer:** ${round(height, 2)}$ feet"
+    ]
@@ -1,8 +1,13 @@
 """Slope-intercept form question generator with real-world contexts."""
 
 import random
-from typing import Dict, Any
+from typing import List, Optional
 from fractions import Fraction
+from app.generators.latex import format_frac, format_signed, format_term
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.sampling import nonzero_randint, randint_excluding
+from app.generators.steps import LazySteps
 
 # Real-world contexts for slope-intercept form
 SLOPE_INTERCEPT_CONTEXTS = [
@@ -13,7 +18,11 @@ SLOPE_INTERCEPT_CONTEXTS = [
 ]
 
 
-def generate_slope_intercept(difficulty: int = 1) -> Dict[str, Any]:
+def generate_slope_intercept(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a slope-intercept form problem (y = mx + b).
 
@@ -22,67 +31,42 @@ def generate_slope_intercept(difficulty: int = 1) -> Dict[str, Any]:
             1 (easy - identify slope and y-intercept from equation)
             2 (medium - write equation from slope and y-intercept)
             3 (hard - write equation from two points)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     if difficulty == 1:
         # Easy: Identify slope and y-intercept from equation
-        m = random.randint(-8, 8)
-        while m == 0:
-            m = random.randint(-8, 8)
-        b = random.randint(-12, 12)
+        m = nonzero_randint(rng, -8, 8)
+        b = rng.randint(-12, 12)
 
         # Format equation
-        if m == 1:
-            m_str = ""
-        elif m == -1:
-            m_str = "-"
-        else:
-            m_str = str(m)
-
-        if b >= 0:
-            equation = f"y = {m_str}x + {b}"
-        else:
-            equation = f"y = {m_str}x - {abs(b)}"
-
-        steps.append(f"Given the equation: ${equation}$")
-        steps.append("**Rule:** Slope-intercept form is $y = mx + b$ where:")
-        steps.append("- $m$ = slope (coefficient of $x$)")
-        steps.append("- $b$ = y-intercept (constant term)")
-        steps.append(f"From the equation ${equation}$:")
-        steps.append(f"- Slope $m = {m}$")
-        steps.append(f"- Y-intercept $b = {b}$")
+        equation = f"y = {format_term(m, 1)} {format_signed(b)}"
 
         answer_str = f"m={m}, b={b}"
+        steps = LazySteps(_identify_steps, equation, m, b, answer_str)
 
     elif difficulty == 2:
         # Medium: Write equation from slope and y-intercept
         # Use fractions for slope sometimes
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Integer slope
-            m = random.randint(-6, 6)
-            while m == 0:
-                m = random.randint(-6, 6)
+            m = nonzero_randint(rng, -6, 6)
             m_str = str(m)
             m_latex = str(m)
         else:
             # Fraction slope
-            numerator = random.randint(-5, 5)
-            while numerator == 0:
-                numerator = random.randint(-5, 5)
-            denominator = random.randint(2, 5)
+            numerator = nonzero_randint(rng, -5, 5)
+            denominator = rng.randint(2, 5)
             m = Fraction(numerator, denominator)
             m_str = f"{m.numerator}/{m.denominator}"
-            m_latex = f"\\frac{{{m.numerator}}}{{{m.denominator}}}"
-
-        b = random.randint(-10, 10)
+            m_latex = f"{format_frac(m.numerator, m.denominator)}"
 
-        steps.append(f"Write the equation of a line with slope $m = {m_latex}$ and y-intercept $b = {b}$")
-        steps.append("**Rule:** Use slope-intercept form: $y = mx + b$")
-        steps.append(f"Substitute $m = {m_latex}$ and $b = {b}$:")
+        b = rng.randint(-10, 10)
 
         # Build equation string
         if isinstance(m, Fraction):
@@ -91,79 +75,39 @@ def generate_slope_intercept(difficulty: int = 1) -> Dict[str, Any]:
             elif m == -1:
                 eq_m = "-x"
             else:
-                eq_m = f"\\frac{{{m.numerator}}}{{{m.denominator}}}x"
+                eq_m = f"{format_frac(m.numerator, m.denominator)}x"
         else:
-            if m == 1:
-                eq_m = "x"
-            elif m == -1:
-                eq_m = "-x"
-            else:
-                eq_m = f"{m}x"
+            eq_m = format_term(m, 1)
 
-        if b >= 0:
-            answer_str = f"y = {eq_m} + {b}"
-        else:
-            answer_str = f"y = {eq_m} - {abs(b)}"
+        answer_str = f"y = {eq_m} {format_signed(b)}"
 
-        steps.append(f"${answer_str}$")
+        steps = LazySteps(_slope_and_intercept_steps, m_latex, b, answer_str)
 
     else:  # difficulty == 3
         # Hard: Write equation from two points
-        x1 = random.randint(-8, 8)
-        y1 = random.randint(-10, 10)
-        x2 = random.randint(-8, 8)
-        while x2 == x1:
-            x2 = random.randint(-8, 8)
-        y2 = random.randint(-10, 10)
-
-        steps.append(f"Write the equation of the line passing through $({x1}, {y1})$ and $({x2}, {y2})$")
-        steps.append("**Step 1:** Find the slope using the formula $m = \\frac{{y_2 - y_1}}{{x_2 - x_1}}$")
-
-        delta_y = y2 - y1
-        delta_x = x2 - x1
-        steps.append(f"$m = \\frac{{{y2} - ({y1})}}{{{x2} - ({x1})}} = \\frac{{{delta_y}}}{{{delta_x}}}$")
+        x1 = rng.randint(-8, 8)
+        y1 = rng.randint(-10, 10)
+        x2 = randint_excluding(rng, -8, 8, (x1,))
+        y2 = rng.randint(-10, 10)
 
         # Simplify slope
-        m = Fraction(delta_y, delta_x)
-        if m.denominator == 1:
-            steps.append(f"Slope: $m = {m.numerator}$")
-            m_latex = str(m.numerator)
-            m_val = m.numerator
-        else:
-            steps.append(f"Slope: $m = \\frac{{{m.numerator}}}{{{m.denominator}}}$")
-            m_latex = f"\\frac{{{m.numerator}}}{{{m.denominator}}}"
-            m_val = m
-
-        steps.append("**Step 2:** Use slope-intercept form $y = mx + b$ with one point to find $b$")
-        steps.append(f"Using point $({x1}, {y1})$, substitute $x = {x1}$ and $y = {y1}$:")
-
+        m = Fraction(y2 - y1, x2 - x1)
         if m.denominator == 1:
-            steps.append(f"${y1} = {m.numerator}({x1}) + b$")
             mx_val = m.numerator * x1
         else:
-            steps.append(f"${y1} = \\frac{{{m.numerator}}}{{{m.denominator}}}({x1}) + b$")
             mx_val = float(m) * x1
 
-        steps.append(f"${y1} = {mx_val} + b$")
         b = y1 - mx_val
-        steps.append(f"$b = {y1} - {mx_val} = {b}$")
 
         # Check if b is integer
         if b == int(b):
             b = int(b)
 
-        steps.append("**Step 3:** Write the final equation")
-
         # Build equation
         if m.denominator == 1:
-            if m.numerator == 1:
-                eq_m = "x"
-            elif m.numerator == -1:
-                eq_m = "-x"
-            else:
-                eq_m = f"{m.numerator}x"
+            eq_m = format_term(m.numerator, 1)
         else:
-            eq_m = f"\\frac{{{m.numerator}}}{{{m.denominator}}}x"
+            eq_m = f"{format_frac(m.numerator, m.denominator)}x"
 
         if b >= 0:
             if b == int(b):
@@ -176,13 +120,71 @@ def generate_slope_intercept(difficulty: int = 1) -> Dict[str, Any]:
             else:
                 answer_str = f"y = {eq_m} - {abs(b):.2f}"
 
-        steps.append(f"${answer_str}$")
-
+        steps = LazySteps(_two_point_steps, x1, y1, x2, y2, answer_str)
+
+    return GeneratedQuestion(
+        question=f"Find the slope-intercept form equation" if difficulty > 1 else f"Identify the slope and y-intercept of ${equation}$",
+        answer=answer_str,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _identify_steps(equation: str, m: int, b: int, answer_str: str) -> List[str]:
+    """Steps for reading m and b off an equation already in slope-intercept form."""
+    return [
+        f"Given the equation: ${equation}$",
+        "**Rule:** Slope-intercept form is $y = mx + b$ where:",
+        "- $m$ = slope (coefficient of $x$)",
+        "- $b$ = y-intercept (constant term)",
+        f"From the equation ${equation}$:",
+        f"- Slope $m = {m}$",
+        f"- Y-intercept $b = {b}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
+
+
+def _slope_and_intercept_steps(m_latex: str, b: int, answer_str: str) -> List[str]:
+    """Steps for writing y = mx + b from a given slope and y-intercept."""
+    return [
+        f"Write the equation of a line with slope $m = {m_latex}$ and y-intercept $b = {b}$",
+        "**Rule:** Use slope-intercept form: $y = mx + b$",
+        f"Substitute $m = {m_latex}$ and $b = {b}$:",
+        f"${answer_str}$",
+        f"**Final Answer:** ${answer_str}$",
+    ]
+
+
+def _two_point_steps(x1: int, y1: int, x2: int, y2: int, answer_str: str) -> List[str]:
+    """Steps for writing y = mx + b through two points."""
+    steps = [
+        f"Write the equation of the line passing through $({x1}, {y1})$ and $({x2}, {y2})$",
+        "**Step 1:** Find the slope using the formula $m = \\frac{{y_2 - y_1}}{{x_2 - x_1}}$",
+    ]
+
+    delta_y = y2 - y1
+    delta_x = x2 - x1
+    steps.append(f"$m = \\frac{{{y2} - ({y1})}}{{{x2} - ({x1})}} = {format_frac(delta_y, delta_x)}$")
+
+    m = Fraction(delta_y, delta_x)
+    if m.denominator == 1:
+        steps.append(f"Slope: $m = {m.numerator}$")
+    else:
+        steps.append(f"Slope: $m = {format_frac(m.numerator, m.denominator)}$")
+
+    steps.append("**Step 2:** Use slope-intercept form $y = mx + b$ with one point to find $b$")
+    steps.append(f"Using point $({x1}, {y1})$, substitute $x = {x1}$ and $y = {y1}$:")
+
+    if m.denominator == 1:
+        steps.append(f"${y1} = {m.numerator}({x1}) + b$")
+        mx_val = m.numerator * x1
+    else:
+        steps.append(f"${y1} = {format_frac(m.numerator, m.denominator)}({x1}) + b$")
+        mx_val = float(m) * x1
+
+    steps.append(f"${y1} = {mx_val} + b$")
+    steps.append(f"$b = {y1} - {mx_val} = {y1 - mx_val}$")
+    steps.append("**Step 3:** Write the final equation")
+    steps.append(f"${answer_str}$")
     steps.append(f"**Final Answer:** ${answer_str}$")
-
-    return {
-        "question": f"Find the slope-intercept form equation" if difficulty > 1 else f"Identify the slope and y-intercept of ${equation}$",
-        "answer": answer_str,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return steps
@@ -0,0 +1,63 @@
+"""Deferred rendering of solution steps."""
+
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+from app.generators.question import GeneratedQuestion
+
+
+class LazySteps(Sequence):
+    """
+    Solution steps that are only rendered when first read.
+
+    A generator stores the render function plus the handful of parameters it
+    needs, instead of building every LaTeX string up front. The strings are
+    produced once, on first access, and cached.
+    """
+
+    __slots__ = ("_render", "_args", "_steps")
+
+    def __init__(self, render: Callable[..., List[str]], *args: Any):
+        self._render: Optional[Callable[..., List[str]]] = render
+        self._args = args
+        self._steps: Optional[List[str]] = None
+
+    @property
+    def rendered(self) -> bool:
+        """Whether the steps have been built yet."""
+        return self._steps is not None
+
+    def render(self) -> List[str]:
+        """Build (once) and return the steps as a plain list."""
+        if self._steps is None:
+            self._steps = self._render(*self._args)
+            # Drop the parameters once they are no longer needed
+            self._render = None
+            self._args = ()
+        return self._steps
+
+    def __getitem__(self, index):
+        return self.render()[index]
+
+    def __len__(self) -> int:
+        return len(self.render())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.render())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (LazySteps, list)):
+            return self.render() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.render())
+
+
+def render_steps(question: GeneratedQuestion) -> List[str]:
+    """Return a question's steps as a list, rendering them if deferred."""
+    steps = question.steps
+    if steps is None:
+        return []
+    if isinstance(steps, LazySteps):
+        return steps.render()
+    return list(steps)
@@ -2,7 +2,13 @@
 
 import random
 from fractions import Fraction
-from typing import Dict, Any, Tuple
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, Optional
+from app.generators.latex import format_linear_equation
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.sampling import choice_from_table, int_range, randint_excluding
+from app.generators.steps import LazySteps
 
 # Real-world contexts for systems of equations
 SYSTEMS_CONTEXTS = [
@@ -13,7 +19,11 @@ SYSTEMS_CONTEXTS = [
 ]
 
 
-def generate_system_of_equations(difficulty: int = 1) -> Dict[str, Any]:
+def generate_system_of_equations(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a system of two linear equations in two variables.
 
@@ -24,65 +34,55 @@ def generate_system_of_equations(difficulty: int = 1) -> Dict[str, Any]:
             3 (medium-hard - requires multiplication before elimination)
             4 (hard - larger coefficients, fraction solutions likely)
             5 (very hard - no solution or infinite solutions)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps = []
+    rng = get_rng(rng, seed)
 
     # Special case: inconsistent or dependent systems
-    if difficulty == 5 and random.random() < 0.3:
-        return _generate_special_system(steps)
+    if difficulty == 5 and rng.random() < 0.3:
+        return _generate_special_system(rng)
 
     # Choose solution first (working backwards)
     if difficulty == 1:
-        x_sol = random.randint(-5, 5)
-        y_sol = random.randint(-5, 5)
+        x_sol = rng.randint(-5, 5)
+        y_sol = rng.randint(-5, 5)
         coeff_range = (1, 5)
     elif difficulty == 2:
-        x_sol = random.randint(-8, 8)
-        y_sol = random.randint(-8, 8)
+        x_sol = rng.randint(-8, 8)
+        y_sol = rng.randint(-8, 8)
         coeff_range = (1, 6)
     elif difficulty == 3:
-        x_sol = random.randint(-10, 10)
-        y_sol = random.randint(-10, 10)
+        x_sol = rng.randint(-10, 10)
+        y_sol = rng.randint(-10, 10)
         coeff_range = (2, 8)
     else:  # difficulty >= 4
-        x_sol = random.randint(-15, 15)
-        y_sol = random.randint(-15, 15)
+        x_sol = rng.randint(-15, 15)
+        y_sol = rng.randint(-15, 15)
         coeff_range = (2, 12)
 
     # Generate two equations that have this solution
     # Equation 1: a₁x + b₁y = c₁
-    a1 = random.randint(coeff_range[0], coeff_range[1])
-    b1 = random.randint(coeff_range[0], coeff_range[1])
+    a1 = rng.randint(coeff_range[0], coeff_range[1])
+    b1 = rng.randint(coeff_range[0], coeff_range[1])
     c1 = a1 * x_sol + b1 * y_sol
 
     # Equation 2: a₂x + b₂y = c₂
-    # Make sure not parallel (avoid a₂/a₁ = b₂/b₁)
-    a2 = random.randint(coeff_range[0], coeff_range[1])
-    b2 = random.randint(coeff_range[0], coeff_range[1])
-
-    # Ensure not parallel
-    max_attempts = 10
-    attempts = 0
-    while attempts < max_attempts and a1 * b2 == a2 * b1:
-        a2 = random.randint(coeff_range[0], coeff_range[1])
-        b2 = random.randint(coeff_range[0], coeff_range[1])
-        attempts += 1
-
+    # Drawn only from pairs that are not parallel (a₂/a₁ ≠ b₂/b₁)
+    a2, b2 = choice_from_table(
+        rng, _independent_pairs(a1, b1, *coeff_range), "independent coefficients"
+    )
     c2 = a2 * x_sol + b2 * y_sol
 
     # Format equations
-    eq1 = _format_linear_equation(a1, b1, c1, "x", "y")
-    eq2 = _format_linear_equation(a2, b2, c2, "x", "y")
+    eq1 = format_linear_equation(a1, b1, c1, "x", "y")
+    eq2 = format_linear_equation(a2, b2, c2, "x", "y")
 
     question = f"Solve the system:\n\n${eq1}$\n\n${eq2}$"
 
-    steps.append(f"Given system of equations:")
-    steps.append(f"${eq1}$")
-    steps.append(f"${eq2}$")
-
     # Choose solution method based on difficulty and coefficients
     if difficulty <= 2:
         method = "substitution"
@@ -90,111 +90,117 @@ def generate_system_of_equations(difficulty: int = 1) -> Dict[str, Any]:
         # For higher difficulties, prefer elimination
         method = "elimination"
 
+    return GeneratedQuestion(
+        question=question,
+        answer=_format_solution(x_sol, y_sol),
+        steps=LazySteps(_render_steps, method, eq1, eq2, a1, b1, c1, a2, b2, c2, x_sol, y_sol),
+        difficulty=difficulty,
+    )
+
+
+def _render_steps(method: str, eq1: str, eq2: str, a1: int, b1: int, c1: int,
+                  a2: int, b2: int, c2: int, x_sol: int, y_sol: int) -> List[str]:
+    """Render the worked solution for a system with a unique solution."""
+    steps = [
+        f"Given system of equations:",
+        f"${eq1}$",
+        f"${eq2}$",
+    ]
+
     if method == "substitution":
-        answer_str = _solve_by_substitution(a1, b1, c1, a2, b2, c2, x_sol, y_sol, steps)
+        _solve_by_substitution(a1, b1, c1, a2, b2, c2, x_sol, y_sol, steps)
     else:
-        answer_str = _solve_by_elimination(a1, b1, c1, a2, b2, c2, x_sol, y_sol, steps)
+        _solve_by_elimination(a1, b1, c1, a2, b2, c2, x_sol, y_sol, steps)
+
+    return steps
 
-    return {
-        "question": question,
-        "answer": answer_str,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+
+def _format_solution(x_sol: int, y_sol: int) -> str:
+    """Format the (x, y) answer string."""
+    if x_sol == int(x_sol) and y_sol == int(y_sol):
+        return f"({int(x_sol)}, {int(y_sol)})"
+    return f"({x_sol:.2f}, {y_sol:.2f})"
 
 
-def _generate_special_system(steps: list) -> Dict[str, Any]:
+def _generate_special_system(rng: random.Random) -> Dict[str, Any]:
     """Generate a system with no solution or infinite solutions."""
 
-    if random.random() < 0.5:
+    if rng.random() < 0.5:
         # No solution (parallel lines)
-        a = random.randint(2, 6)
-        b = random.randint(2, 6)
-        c1 = random.randint(-10, 10)
-        c2 = random.randint(-10, 10)
-
-        # Make sure c1 ≠ c2
-        while c1 == c2:
-            c2 = random.randint(-10, 10)
+        a = rng.randint(2, 6)
+        b = rng.randint(2, 6)
+        c1 = rng.randint(-10, 10)
+        c2 = randint_excluding(rng, -10, 10, (c1,))
 
         # Both equations have same coefficients but different constants
-        eq1 = _format_linear_equation(a, b, c1, "x", "y")
-        eq2 = _format_linear_equation(a, b, c2, "x", "y")
-
-        question = f"Solve the system:\n\n${eq1}$\n\n${eq2}$"
-
-        steps.append(f"Given system of equations:")
-        steps.append(f"${eq1}$")
-        steps.append(f"${eq2}$")
-        steps.append("Notice that both equations have the same coefficients for $x$ and $y$")
-        steps.append(f"The left sides are identical, but ${c1} \\neq {c2}$")
-        steps.append("This means the lines are parallel and never intersect")
-        steps.append("**Final Answer:** No solution (inconsistent system)")
+        eq1 = format_linear_equation(a, b, c1, "x", "y")
+        eq2 = format_linear_equation(a, b, c2, "x", "y")
 
-        answer_str = "no solution"
+        kind, detail = "no solution", (c1, c2)
 
     else:
         # Infinite solutions (same line)
-        a = random.randint(2, 6)
-        b = random.randint(2, 6)
-        c = random.randint(-10, 10)
+        a = rng.randint(2, 6)
+        b = rng.randint(2, 6)
+        c = rng.randint(-10, 10)
 
         # Second equation is just a multiple of the first
-        multiplier = random.choice([2, 3, -1, -2])
+        multiplier = rng.choice([2, 3, -1, -2])
 
-        eq1 = _format_linear_equation(a, b, c, "x", "y")
-        eq2 = _format_linear_equation(multiplier * a, multiplier * b, multiplier * c, "x", "y")
+        eq1 = format_linear_equation(a, b, c, "x", "y")
+        eq2 = format_linear_equation(multiplier * a, multiplier * b, multiplier * c, "x", "y")
 
-        question = f"Solve the system:\n\n${eq1}$\n\n${eq2}$"
+        kind, detail = "infinite solutions", (multiplier,)
 
-        steps.append(f"Given system of equations:")
-        steps.append(f"${eq1}$")
-        steps.append(f"${eq2}$")
+    question = f"Solve the system:\n\n${eq1}$\n\n${eq2}$"
+
+    return GeneratedQuestion(
+        question=question,
+        answer=kind,
+        steps=LazySteps(_render_special_steps, kind, eq1, eq2, detail),
+        difficulty=5,
+    )
+
+
+def _render_special_steps(kind: str, eq1: str, eq2: str, detail: Tuple[int, ...]) -> List[str]:
+    """Render the explanation for an inconsistent or dependent system."""
+    steps = [
+        f"Given system of equations:",
+        f"${eq1}$",
+        f"${eq2}$",
+    ]
+
+    if kind == "no solution":
+        c1, c2 = detail
+        steps.append("Notice that both equations have the same coefficients for $x$ and $y$")
+        steps.append(f"The left sides are identical, but ${c1} \\neq {c2}$")
+        steps.append("This means the lines are parallel and never intersect")
+        steps.append("**Final Answer:** No solution (inconsistent system)")
+    else:
+        (multiplier,) = detail
         steps.append(f"Notice that the second equation is just {multiplier} times the first equation")
         steps.append("Both equations represent the same line")
         steps.append("Every point on the line is a solution")
         steps.append("**Final Answer:** Infinite solutions (dependent system)")
 
-        answer_str = "infinite solutions"
-
-    return {
-        "question": question,
-        "answer": answer_str,
-        "steps": steps,
-        "difficulty": 5,
-    }
+    return steps
 
 
-def _format_linear_equation(a: int, b: int, c: int, var1: str, var2: str) -> str:
-    """Format a linear equation as LaTeX."""
-    terms = []
+@lru_cache(maxsize=None)
+def _independent_pairs(a1: int, b1: int, low: int, high: int) -> Tuple[Tuple[int, int], ...]:
+    """All (a₂, b₂) in [low, high]² whose line is not parallel to a₁x + b₁y."""
+    return tuple(
+        (a2, b2)
+        for a2 in int_range(low, high)
+        for b2 in int_range(low, high)
+        if a1 * b2 != a2 * b1
+    )
 
-    # First term
-    if a == 1:
-        terms.append(var1)
-    elif a == -1:
-        terms.append(f"-{var1}")
-    else:
-        terms.append(f"{a}{var1}")
-
-    # Second term
-    if b != 0:
-        if b == 1:
-            terms.append(f"+ {var2}")
-        elif b == -1:
-            terms.append(f"- {var2}")
-        elif b > 0:
-            terms.append(f"+ {b}{var2}")
-        else:
-            terms.append(f"- {abs(b)}{var2}")
-
-    equation = " ".join(terms) + f" = {c}"
-    return equation
 
 
 def _solve_by_substitution(a1: int, b1: int, c1: int, a2: int, b2: int, c2: int,
-                           x_sol: int, y_sol: int, steps: list) -> str:
-    """Solve system using substitution method."""
+                           x_sol: int, y_sol: int, steps: list) -> None:
+    """Append the steps for solving a system by substitution."""
 
     steps.append("**Method: Substitution**")
     steps.append(f"Solve the first equation for $x$:")
@@ -233,20 +239,16 @@ def _solve_by_substitution(a1: int, b1: int, c1: int, a2: int, b2: int, c2: int,
     else:
         steps.append(f"$x = {x_sol:.2f}$")
 
-    # Format answer
+    # Final answer
     if x_sol == int(x_sol) and y_sol == int(y_sol):
         steps.append(f"**Final Answer:** $x = {int(x_sol)}, y = {int(y_sol)}$")
-        answer_str = f"({int(x_sol)}, {int(y_sol)})"
     else:
         steps.append(f"**Final Answer:** $x = {x_sol:.2f}, y = {y_sol:.2f}$")
-        answer_str = f"({x_sol:.2f}, {y_sol:.2f})"
-
-    return answer_str
 
 
 def _solve_by_elimination(a1: int, b1: int, c1: int, a2: int, b2: int, c2: int,
-                          x_sol: int, y_sol: int, steps: list) -> str:
-    """Solve system using elimination method."""
+                          x_sol: int, y_sol: int, steps: list) -> None:
+    """Append the steps for solving a system by elimination."""
 
     steps.append("**Method: Elimination**")
 
@@ -285,8 +287,8 @@ def _solve_by_elimination(a1: int, b1: int, c1: int, a2: int, b2: int, c2: int,
         new_a1, new_b1, new_c1 = mult1 * a1, mult1 * b1, mult1 * c1
         new_a2, new_b2, new_c2 = mult2 * a2, mult2 * b2, mult2 * c2
 
-        eq1_mult = _format_linear_equation(new_a1, new_b1, new_c1, "x", "y")
-        eq2_mult = _format_linear_equation(new_a2, new_b2, new_c2, "x", "y")
+        eq1_mult = format_linear_equation(new_a1, new_b1, new_c1, "x", "y")
+        eq2_mult = format_linear_equation(new_a2, new_b2, new_c2, "x", "y")
 
         steps.append(f"${eq1_mult}$")
         steps.append(f"${eq2_mult}$")
@@ -327,12 +329,8 @@ def _solve_by_elimination(a1: int, b1: int, c1: int, a2: int, b2: int, c2: int,
         else:
             steps.append(f"$y = {y_sol:.2f}$")
 
-    # Format answer
+    # Final answer
     if x_sol == int(x_sol) and y_sol == int(y_sol):
         steps.append(f"**Final Answer:** $x = {int(x_sol)}, y = {int(y_sol)}$")
-        answer_str = f"({int(x_sol)}, {int(y_sol)})"
     else:
         steps.append(f"**Final Answer:** $x = {x_sol:.2f}, y = {y_sol:.2f}$")
-        answer_str = f"({x_sol:.2f}, {y_sol:.2f})"
-
-    return answer_str
@@ -2,7 +2,10 @@
 
 import random
 import math
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for trigonometric equations
 WORD_PROBLEMS = [
@@ -29,19 +32,27 @@ WORD_PROBLEMS = [
 ]
 
 
-def generate_trigonometric_equations(difficulty: int = 1) -> Dict[str, Any]:
+def generate_trigonometric_equations(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate problems solving trigonometric equations.
 
     Args:
         difficulty: 1 (basic equations), 2 (quadratic-type equations), 3 (multiple angle equations)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Basic trigonometric equations like sin(x) = value
-        use_word_problem = random.random() < 0.4
+        use_word_problem = rng.random() < 0.4
         equation_types = [
             ("sin", 0.5, 30, "\\frac{1}{2}"),
             ("sin", math.sqrt(2)/2, 45, "\\frac{\\sqrt{2}}{2}"),
@@ -53,7 +64,7 @@ def generate_trigonometric_equations(difficulty: int = 1) -> Dict[str, Any]:
             ("tan", math.sqrt(3), 60, "\\sqrt{3}"),
         ]
 
-        func, value, angle, value_str = random.choice(equation_types)
+        func, value, angle, value_str = rng.choice(equation_types)
 
         # Also find the second solution in [0, 360)
         if func == "sin":
@@ -68,44 +79,13 @@ def generate_trigonometric_equations(difficulty: int = 1) -> Dict[str, Any]:
         else:
             question = f"Solve for $x$ in the interval $[0°, 360°)$: $\\{func}(x) = {value_str}$"
 
-        steps = [
-            f"**Step 1 - Understand what we're solving:**",
-            f"We need to find all angles $x$ where $\\{func}(x) = {value_str}$ in the range $[0°, 360°)$.",
-            "",
-            f"**Step 2 - Find the primary solution using the unit circle:**",
-            f"From the unit circle, we know that $\\{func}({angle}°) = {value_str}$",
-            f"So one solution is: $x = {angle}°$",
-            "",
-            f"**Step 3 - Find additional solutions based on function properties:**",
-        ]
-
-        if func == "sin":
-            steps.append(f"Sine is positive in both Quadrant I and Quadrant II.")
-            steps.append(f"In Quadrant II, if the reference angle is ${angle}°$, then:")
-            steps.append(f"$x = 180° - {angle}° = {angle2}°$")
-            steps.append("")
-            steps.append(f"We can verify: $\\sin({angle2}°) = {value_str}$ ✓")
-        elif func == "cos":
-            steps.append(f"Cosine is positive in both Quadrant I and Quadrant IV.")
-            steps.append(f"In Quadrant IV, if the reference angle is ${angle}°$, then:")
-            steps.append(f"$x = 360° - {angle}° = {angle2}°$")
-            steps.append("")
-            steps.append(f"We can verify: $\\cos({angle2}°) = {value_str}$ ✓")
-        else:  # tan
-            steps.append(f"Tangent has a period of $180°$ (it repeats every 180°).")
-            steps.append(f"If $\\tan({angle}°) = {value_str}$, then the next solution is:")
-            steps.append(f"$x = {angle}° + 180° = {angle2}°$")
-            steps.append("")
-            steps.append(f"We can verify: $\\tan({angle2}°) = {value_str}$ ✓")
-
-        steps.append("")
-        steps.append(f"**Final Answer:** $x = {angle}°$ or $x = {angle2}°$")
+        steps = LazySteps(_basic_equation_steps, func, value_str, angle, angle2)
 
         answer_numeric = angle  # Return the first solution
 
     elif difficulty == 2:
         # Medium: Quadratic-type equations like 2sin²(x) - sin(x) = 0
-        equation_type = random.choice(["factor", "quadratic_formula", "double_angle"])
+        equation_type = rng.choice(["factor", "quadratic_formula", "double_angle"])
 
         if equation_type == "factor":
             # 2sin(x)cos(x) = 0 type
@@ -172,7 +152,7 @@ def generate_trigonometric_equations(difficulty: int = 1) -> Dict[str, Any]:
         # Hard: More complex equations with multiple angles or identities
         complex_types = ["multiple_angle", "identity_substitution", "sum_formula"]
 
-        comp_type = random.choice(complex_types)
+        comp_type = rng.choice(complex_types)
 
         if comp_type == "multiple_angle":
             # sin(2x) = 1/2
@@ -233,10 +213,48 @@ def generate_trigonometric_equations(difficulty: int = 1) -> Dict[str, Any]:
 
             answer_numeric = 135
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _basic_equation_steps(func: str, value_str: str, angle: int, angle2: int) -> List[str]:
+    """Steps for a basic equation like sin(x) = value, solved on the unit circle."""
+    steps = [
+        f"**Step 1 - Understand what we're solving:**",
+        f"We need to find all angles $x$ where $\\{func}(x) = {value_str}$ in the range $[0°, 360°)$.",
+        "",
+        f"**Step 2 - Find the primary solution using the unit circle:**",
+        f"From the unit circle, we know that $\\{func}({angle}°) = {value_str}$",
+        f"So one solution is: $x = {angle}°$",
+        "",
+        f"**Step 3 - Find additional solutions based on function properties:**",
+    ]
+
+    if func == "sin":
+        steps.append(f"Sine is positive in both Quadrant I and Quadrant II.")
+        steps.append(f"In Quadrant II, if the reference angle is ${angle}°$, then:")
+        steps.append(f"$x = 180° - {angle}° = {angle2}°$")
+        steps.append("")
+        steps.append(f"We can verify: $\\sin({angle2}°) = {value_str}$ ✓")
+    elif func == "cos":
+        steps.append(f"Cosine is positive in both Quadrant I and Quadrant IV.")
+        steps.append(f"In Quadrant IV, if the reference angle is ${angle}°$, then:")
+        steps.append(f"$x = 360° - {angle}° = {angle2}°$")
+        steps.append("")
+        steps.append(f"We can verify: $\\cos({angle2}°) = {value_str}$ ✓")
+    else:  # tan
+        steps.append(f"Tangent has a period of $180°$ (it repeats every 180°).")
+        steps.append(f"If $\\tan({angle}°) = {value_str}$, then the next solution is:")
+        steps.append(f"$x = {angle}° + 180° = {angle2}°$")
+        steps.append("")
+        steps.append(f"We can verify: $\\tan({angle2}°) = {value_str}$ ✓")
+
+    steps.append("")
+    steps.append(f"**Final Answer:** $x = {angle}°$ or $x = {angle2}°$")
+
+    return steps
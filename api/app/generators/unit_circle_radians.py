@@ -2,7 +2,11 @@
 
 import random
 import math
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.latex import format_frac
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Real-world contexts for unit circle and radians
 WORD_PROBLEMS = [
@@ -29,21 +33,29 @@ WORD_PROBLEMS = [
 ]
 
 
-def generate_unit_circle_radians(difficulty: int = 1) -> Dict[str, Any]:
+def generate_unit_circle_radians(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate unit circle and radian conversion problems.
 
     Args:
         difficulty: 1 (degrees to radians), 2 (radians to degrees), 3 (unit circle coordinates)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Convert degrees to radians (common angles)
-        use_word_problem = random.random() < 0.4
+        use_word_problem = rng.random() < 0.4
         common_angles = [0, 30, 45, 60, 90, 120, 135, 150, 180, 210, 225, 240, 270, 300, 315, 330, 360]
-        degrees = random.choice(common_angles)
+        degrees = rng.choice(common_angles)
 
         # Calculate radians in terms of pi
         radians_num = degrees
@@ -77,35 +89,7 @@ def generate_unit_circle_radians(difficulty: int = 1) -> Dict[str, Any]:
         else:
             question = f"Convert ${degrees}°$ to radians in terms of $\\pi$."
 
-        steps = [
-            f"**Understanding radians:**",
-            f"Radians are an alternative way to measure angles, based on arc length.",
-            f"The conversion formula is: radians = degrees $\\times \\frac{{\\pi}}{{180°}}$",
-            "",
-            f"**Why this formula?**",
-            f"There are exactly $360°$ in a full circle, which equals $2\\pi$ radians.",
-            f"So: $360° = 2\\pi$ radians, which gives us our conversion factor.",
-            "",
-            f"**Apply the conversion formula:**",
-            f"radians = ${degrees}° \\times \\frac{{\\pi}}{{180°}}$",
-            f"radians = $\\frac{{{degrees}\\pi}}{{180}}$",
-            "",
-        ]
-
-        if radians_num != 0:
-            g = gcd(radians_num, radians_den)
-            if g > 1:
-                steps.append(f"**Simplify the fraction:**")
-                steps.append(f"Find the GCD of ${degrees}$ and $180$: GCD = ${g}$")
-                steps.append(f"Divide both numerator and denominator by ${g}$:")
-                steps.append(f"radians = $\\frac{{{num}\\pi}}{{{den}}}$")
-            else:
-                steps.append(f"**Check if simplified:**")
-                steps.append(f"The fraction $\\frac{{{degrees}}}{{180}}$ is already in simplest form.")
-                steps.append(f"radians = ${radian_str}$")
-
-        steps.append("")
-        steps.append(f"**Final Answer:** ${radian_str}$ radians")
+        steps = LazySteps(_degrees_to_radians_steps, degrees, radian_str)
 
     elif difficulty == 2:
         # Medium: Convert radians to degrees
@@ -114,7 +98,7 @@ def generate_unit_circle_radians(difficulty: int = 1) -> Dict[str, Any]:
             (0, 1), (1, 6), (1, 4), (1, 3), (1, 2), (2, 3), (3, 4), (5, 6),
             (1, 1), (7, 6), (5, 4), (4, 3), (3, 2), (5, 3), (7, 4), (11, 6), (2, 1)
         ]
-        num, den = random.choice(radian_fractions)
+        num, den = rng.choice(radian_fractions)
 
         if num == 0:
             radian_str = "0"
@@ -134,20 +118,7 @@ def generate_unit_circle_radians(difficulty: int = 1) -> Dict[str, Any]:
 
         question = f"Convert ${radian_str}$ radians to degrees."
 
-        steps = [
-            "Use the conversion formula: degrees = radians $\\times \\frac{180}{\\pi}$",
-            f"Substitute: degrees = ${radian_str} \\times \\frac{{180}}{{\\pi}}$",
-        ]
-
-        if num == 0:
-            steps.append("Calculate: degrees = $0$")
-        elif den == 1:
-            steps.append(f"Simplify: degrees = ${num} \\times 180 = {degrees}°$")
-        else:
-            steps.append(f"Simplify: degrees = $\\frac{{{num} \\times 180}}{{{den}}}$")
-            steps.append(f"Calculate: degrees = $\\frac{{{num * 180}}}{{{den}}} = {degrees}°$")
-
-        steps.append(f"**Final Answer:** ${degrees}°$")
+        steps = LazySteps(_radians_to_degrees_steps, radian_str, num, den, degrees)
         answer_numeric = degrees
 
     else:
@@ -172,7 +143,7 @@ def generate_unit_circle_radians(difficulty: int = 1) -> Dict[str, Any]:
             (330, "\\frac{11\\pi}{6}", math.sqrt(3)/2, -0.5),
         ]
 
-        degrees, radian_str, cos_val, sin_val = random.choice(unit_circle_values)
+        degrees, radian_str, cos_val, sin_val = rng.choice(unit_circle_values)
 
         # Format the exact values as strings
         if cos_val == 0:
@@ -203,20 +174,78 @@ def generate_unit_circle_radians(difficulty: int = 1) -> Dict[str, Any]:
 
         question = f"Find the coordinates $(x, y)$ on the unit circle at angle ${radian_str}$ radians."
 
-        steps = [
-            "On the unit circle, coordinates are $(\\cos\\theta, \\sin\\theta)$",
-            f"For $\\theta = {radian_str}$ (which is ${degrees}°$):",
-            f"$x = \\cos({radian_str}) = {cos_str}$",
-            f"$y = \\sin({radian_str}) = {sin_str}$",
-            f"**Final Answer:** $({cos_str}, {sin_str})$"
-        ]
+        steps = LazySteps(_unit_circle_point_steps, radian_str, degrees, cos_str, sin_str)
 
         answer_numeric = round(cos_val, 4)  # Using cos_val as the numeric answer
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _degrees_to_radians_steps(degrees: int, radian_str: str) -> List[str]:
+    """Steps for converting a common angle from degrees to a multiple of pi."""
+    steps = [
+        f"**Understanding radians:**",
+        f"Radians are an alternative way to measure angles, based on arc length.",
+        f"The conversion formula is: radians = degrees $\\times \\frac{{\\pi}}{{180°}}$",
+        "",
+        f"**Why this formula?**",
+        f"There are exactly $360°$ in a full circle, which equals $2\\pi$ radians.",
+        f"So: $360° = 2\\pi$ radians, which gives us our conversion factor.",
+        "",
+        f"**Apply the conversion formula:**",
+        f"radians = ${degrees}° \\times \\frac{{\\pi}}{{180°}}$",
+        f"radians = $\\frac{{{degrees}\\pi}}{{180}}$",
+        "",
+    ]
+
+    if degrees != 0:
+        g = math.gcd(degrees, 180)
+        if g > 1:
+            steps.append(f"**Simplify the fraction:**")
+            steps.append(f"Find the GCD of ${degrees}$ and $180$: GCD = ${g}$")
+            steps.append(f"Divide both numerator and denominator by ${g}$:")
+            steps.append(f"radians = $\\frac{{{degrees // g}\\pi}}{{{180 // g}}}$")
+        else:
+            steps.append(f"**Check if simplified:**")
+            steps.append(f"The fraction $\\frac{{{degrees}}}{{180}}$ is already in simplest form.")
+            steps.append(f"radians = ${radian_str}$")
+
+    steps.append("")
+    steps.append(f"**Final Answer:** ${radian_str}$ radians")
+    return steps
+
+
+def _radians_to_degrees_steps(radian_str: str, num: int, den: int, degrees: int) -> List[str]:
+    """Steps for converting num*pi/den radians to degrees."""
+    steps = [
+        "Use the conversion formula: degrees = radians $\\times \\frac{180}{\\pi}$",
+        f"Substitute: degrees = ${radian_str} \\times \\frac{{180}}{{\\pi}}$",
+    ]
+
+    if num == 0:
+        steps.append("Calculate: degrees = $0$")
+    elif den == 1:
+        steps.append(f"Simplify: degrees = ${num} \\times 180 = {degrees}°$")
+    else:
+        steps.append(f"Simplify: degrees = $\\frac{{{num} \\times 180}}{{{den}}}$")
+        steps.append(f"Calculate: degrees = ${format_frac(num * 180, den)} = {degrees}°$")
+
+    steps.append(f"**Final Answer:** ${degrees}°$")
+    return steps
+
+
+def _unit_circle_point_steps(radian_str: str, degrees: int, cos_str: str, sin_str: str) -> List[str]:
+    """Steps for reading (cos θ, sin θ) off the unit circle."""
+    return [
+        "On the unit circle, coordinates are $(\\cos\\theta, \\sin\\theta)$",
+        f"For $\\theta = {radian_str}$ (which is ${degrees}°$):",
+        f"$x = \\cos({radian_str}) = {cos_str}$",
+        f"$y = \\sin({radian_str}) = {sin_str}$",
+        f"**Final Answer:** $({cos_str}, {sin_str})$"
+    ]
@@ -1,7 +1,11 @@
 """Unit conversions question generator with real-world contexts."""
 
 import random
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
+from app.generators.vectorized import Variant, int_values, lookup
 
 # Engaging real-world contexts for conversions
 CONVERSION_CONTEXTS = {
@@ -31,20 +35,26 @@ CONVERSION_CONTEXTS = {
 FAMOUS_HEIGHTS = ["LeBron James", "Shaq", "Michael Jordan", "Kevin Durant", "Yao Ming"]
 
 
-def generate_unit_conversions(difficulty: int = 1) -> Dict[str, Any]:
+def generate_unit_conversions(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a unit conversion problem.
 
     Args:
         difficulty: 1 (basic), 2 (multi-step), 3 (rate conversions)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
-    steps: List[str] = []
+    rng = get_rng(rng, seed)
 
     # Use engaging context 50% of the time
-    use_context = random.random() < 0.5
+    use_context = rng.random() < 0.5
 
     if difficulty == 1:
         # Basic conversions with categories for context matching
@@ -58,40 +68,26 @@ def generate_unit_conversions(difficulty: int = 1) -> Dict[str, Any]:
             ("grams", "kilograms", 1000, "g to kg", "weight"),
         ]
 
-        from_unit, to_unit, factor, name, category = random.choice(conversions)
+        from_unit, to_unit, factor, name, category = rng.choice(conversions)
 
-        if from_unit in ["inches", "ounces", "cups", "pints", "centimeters", "grams"]:
-            # Convert from smaller to larger
-            value = random.randint(2, 10) * int(factor)
+        # Convert from smaller to larger, or from larger to smaller
+        smaller_to_larger = from_unit in ["inches", "feet", "ounces", "cups", "pints", "centimeters", "grams"]
+        if smaller_to_larger:
+            value = rng.randint(2, 10) * int(factor)
             answer = value / factor
-
-            if use_context and category in CONVERSION_CONTEXTS:
-                template = random.choice(CONVERSION_CONTEXTS[category])
-                name = random.choice(FAMOUS_HEIGHTS) if category == "height" else ""
-                question = template.format(value=value, from_unit=from_unit, to_unit=to_unit, name=name)
-                steps.append(f"**Problem:** {question}")
-            else:
-                question = f"Convert ${value}$ {from_unit} to {to_unit}"
-
-            steps.append(f"**Conversion factor:** $1$ {to_unit} $= {int(factor)}$ {from_unit}")
-            steps.append(f"**Method:** Since we're going from smaller to larger units, divide")
-            steps.append(f"${value} \\div {int(factor)} = {answer:.2f}$ {to_unit}")
         else:
-            # Convert from larger to smaller
-            value = random.randint(2, 10)
+            value = rng.randint(2, 10)
             answer = value * factor
 
-            if use_context and category in CONVERSION_CONTEXTS:
-                template = random.choice(CONVERSION_CONTEXTS[category])
-                name = random.choice(FAMOUS_HEIGHTS) if category == "height" else ""
-                question = template.format(value=value, from_unit=from_unit, to_unit=to_unit, name=name)
-                steps.append(f"**Problem:** {question}")
-            else:
-                question = f"Convert ${value}$ {from_unit} to {to_unit}"
+        problem = None
+        if use_context and category in CONVERSION_CONTEXTS:
+            template = rng.choice(CONVERSION_CONTEXTS[category])
+            name = rng.choice(FAMOUS_HEIGHTS) if category == "height" else ""
+            question = problem = template.format(value=value, from_unit=from_unit, to_unit=to_unit, name=name)
+        else:
+            question = f"Convert ${value}$ {from_unit} to {to_unit}"
 
-            steps.append(f"**Conversion factor:** $1$ {from_unit} $= {int(factor)}$ {to_unit}")
-            steps.append(f"**Method:** Since we're going from larger to smaller units, multiply")
-            steps.append(f"${value} \\times {int(factor)} = {int(answer)}$ {to_unit}")
+        steps = LazySteps(_basic_steps, problem, from_unit, to_unit, factor, value, answer, smaller_to_larger)
 
     elif difficulty == 2:
         # Multi-step conversions
@@ -102,20 +98,16 @@ def generate_unit_conversions(difficulty: int = 1) -> Dict[str, Any]:
             ("meters", "centimeters", [("meters", "centimeters", 100)]),
         ]
 
-        from_unit, to_unit, conversion_steps = random.choice(conversions)
-        value = random.randint(2, 8)
+        from_unit, to_unit, conversion_steps = rng.choice(conversions)
+        value = rng.randint(2, 8)
 
         question = f"Convert ${value}$ {from_unit} to {to_unit}"
 
-        steps.append(f"Convert ${value}$ {from_unit} to {to_unit}")
+        answer = value
+        for _, _, factor in conversion_steps:
+            answer = answer * factor
 
-        current_value = value
-        for step_from, step_to, factor in conversion_steps:
-            steps.append(f"$1$ {step_from} $= {factor}$ {step_to}")
-            current_value = current_value * factor
-            steps.append(f"${value}$ {from_unit} $= {value} \\times {factor} = {current_value}$ {step_to}")
-
-        answer = current_value
+        steps = LazySteps(_multi_step_steps, from_unit, to_unit, conversion_steps, value, answer)
 
     else:
         # Rate conversions
@@ -142,39 +134,201 @@ def generate_unit_conversions(difficulty: int = 1) -> Dict[str, Any]:
             },
         ]
 
-        conversion = random.choice(rate_conversions)
+        conversion = rng.choice(rate_conversions)
         from_val = conversion["from_val"]
         from_display = conversion["from"]
         to_unit = conversion["to"]
 
         question = f"Convert ${from_display}$ to {to_unit}"
 
-        steps.append(f"Convert ${from_display}$ to {to_unit}")
-
         if "mph" in from_display:
             # mph to ft/s
-            steps.append(f"Convert miles to feet: $1$ mile $= 5280$ feet")
-            feet_per_hour = from_val * 5280
-            steps.append(f"${from_val}$ miles/hour $= {feet_per_hour}$ feet/hour")
-            steps.append(f"Convert hours to seconds: $1$ hour $= 3600$ seconds")
-            steps.append(f"$\\frac{{{feet_per_hour} \\text{{ ft}}}}{{1 \\text{{ hr}}}} \\times \\frac{{1 \\text{{ hr}}}}{{3600 \\text{{ sec}}}} = \\frac{{{feet_per_hour}}}{{3600}}$ ft/sec")
-            answer = feet_per_hour / 3600
-            steps.append(f"$= {answer:.2f}$ feet per second")
+            answer = from_val * 5280 / 3600
         else:
             # m/s to km/h
-            steps.append(f"Convert meters to kilometers: $1$ km $= 1000$ m")
-            km_per_second = from_val / 1000
-            steps.append(f"${from_val}$ m/s $= {km_per_second}$ km/s")
-            steps.append(f"Convert seconds to hours: $1$ hour $= 3600$ seconds")
-            steps.append(f"${km_per_second}$ km/s $\\times 3600$ s/hr $= {km_per_second * 3600}$ km/hr")
-            answer = km_per_second * 3600
+            answer = from_val / 1000 * 3600
+
+        steps = LazySteps(_rate_steps, from_display, to_unit, from_val, answer)
+
+    return GeneratedQuestion(
+        question=question,
+        answer=f"{answer:.2f}",
+        answer_numeric=round(answer, 2),
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _basic_steps(problem: Optional[str], from_unit: str, to_unit: str, factor: float, value: int,
+                 answer: float, smaller_to_larger: bool) -> List[str]:
+    """Steps for a single-factor conversion, restating the problem when it has a context."""
+    steps = [f"**Problem:** {problem}"] if problem else []
+    if smaller_to_larger:
+        steps.append(f"**Conversion factor:** $1$ {to_unit} $= {int(factor)}$ {from_unit}")
+        steps.append(f"**Method:** Since we're going from smaller to larger units, divide")
+        steps.append(f"${value} \\div {int(factor)} = {answer:.2f}$ {to_unit}")
+    else:
+        steps.append(f"**Conversion factor:** $1$ {from_unit} $= {int(factor)}$ {to_unit}")
+        steps.append(f"**Method:** Since we're going from larger to smaller units, multiply")
+        steps.append(f"${value} \\times {int(factor)} = {int(answer)}$ {to_unit}")
+    steps.append(f"**Final Answer:** ${answer:.2f}$ ")
+    return steps
+
+
+def _multi_step_steps(from_unit: str, to_unit: str, conversion_steps: List[Tuple[str, str, int]],
+                      value: int, answer: int) -> List[str]:
+    """Steps for a conversion chained through one or more factors."""
+    steps = [f"Convert ${value}$ {from_unit} to {to_unit}"]
+
+    current_value = value
+    for step_from, step_to, factor in conversion_steps:
+        steps.append(f"$1$ {step_from} $= {factor}$ {step_to}")
+        current_value = current_value * factor
+        steps.append(f"${value}$ {from_unit} $= {value} \\times {factor} = {current_value}$ {step_to}")
+
+    steps.append(f"**Final Answer:** ${answer:.2f}$ {to_unit}")
+    return steps
+
+
+def _rate_steps(from_display: str, to_unit: str, from_val: int, answer: float) -> List[str]:
+    """Steps for converting a rate one unit at a time."""
+    steps = [f"Convert ${from_display}$ to {to_unit}"]
+
+    if "mph" in from_display:
+        # mph to ft/s
+        steps.append(f"Convert miles to feet: $1$ mile $= 5280$ feet")
+        feet_per_hour = from_val * 5280
+        steps.append(f"${from_val}$ miles/hour $= {feet_per_hour}$ feet/hour")
+        steps.append(f"Convert hours to seconds: $1$ hour $= 3600$ seconds")
+        steps.append(f"$\\frac{{{feet_per_hour} \\text{{ ft}}}}{{1 \\text{{ hr}}}} \\times \\frac{{1 \\text{{ hr}}}}{{3600 \\text{{ sec}}}} = \\frac{{{feet_per_hour}}}{{3600}}$ ft/sec")
+        steps.append(f"$= {answer:.2f}$ feet per second")
+    else:
+        # m/s to km/h
+        steps.append(f"Convert meters to kilometers: $1$ km $= 1000$ m")
+        km_per_second = from_val / 1000
+        steps.append(f"${from_val}$ m/s $= {km_per_second}$ km/s")
+        steps.append(f"Convert seconds to hours: $1$ hour $= 3600$ seconds")
+        steps.append(f"${km_per_second}$ km/s $\\times 3600$ s/hr $= {km_per_second * 3600}$ km/hr")
+
+    steps.append(f"**Final Answer:** ${answer:.2f}$ {to_unit}")
+    return steps
+
+
+# Vectorized conversion tables: (from_unit, to_unit, factor), smaller to
+# larger units for difficulty 1 and larger to smaller (as conversion steps)
+# for difficulty 2
+VECTOR_BASIC_CONVERSIONS = [
+    ("inches", "feet", 12),
+    ("feet", "yards", 3),
+    ("ounces", "pounds", 16),
+    ("cups", "pints", 2),
+    ("pints", "quarts", 2),
+    ("centimeters", "meters", 100),
+    ("grams", "kilograms", 1000),
+]
+VECTOR_BASIC_FACTORS = [factor for _, _, factor in VECTOR_BASIC_CONVERSIONS]
+VECTOR_MULTI_STEP_CONVERSIONS = [
+    ("yards", "inches", [("yards", "feet", 3), ("feet", "inches", 12)]),
+    ("miles", "feet", [("miles", "feet", 5280)]),
+    ("kilograms", "grams", [("kilograms", "grams", 1000)]),
+    ("meters", "centimeters", [("meters", "centimeters", 100)]),
+]
+VECTOR_MULTI_STEP_FACTORS = [3 * 12, 5280, 1000, 100]
+# (question, to_unit, answer) for the two rate conversions of difficulty 3
+VECTOR_RATE_CONVERSIONS = [
+    ("60 mph", "feet per second", 60 * 5280 / 3600),
+    ("30 meters per second", "kilometers per hour", 30 / 1000 * 3600),
+]
+VECTOR_RATE_ANSWERS = [answer for _, _, answer in VECTOR_RATE_CONVERSIONS]
+
+
+def _vector_basic_steps(row: Dict[str, Any]) -> List[str]:
+    from_unit, to_unit, factor = VECTOR_BASIC_CONVERSIONS[row["conversion"]]
+    return [
+        f"**Conversion factor:** $1$ {to_unit} $= {factor}$ {from_unit}",
+        "**Method:** Since we're going from smaller to larger units, divide",
+        f"${row['value']} \\div {factor} = {row['answer']:.2f}$ {to_unit}",
+        f"**Final Answer:** ${row['answer']:.2f}$ ",
+    ]
+
+
+def _vector_multi_step_steps(row: Dict[str, Any]) -> List[str]:
+    from_unit, to_unit, conversion_steps = VECTOR_MULTI_STEP_CONVERSIONS[row["conversion"]]
+    value = row["value"]
+    steps = [f"Convert ${value}$ {from_unit} to {to_unit}"]
+    current_value = value
+    for step_from, step_to, factor in conversion_steps:
+        steps.append(f"$1$ {step_from} $= {factor}$ {step_to}")
+        current_value = current_value * factor
+        steps.append(f"${value}$ {from_unit} $= {value} \\times {factor} = {current_value}$ {step_to}")
+    steps.append(f"**Final Answer:** ${row['answer']:.2f}$ {to_unit}")
+    return steps
 
-    steps.append(f"**Final Answer:** ${answer:.2f}$ {to_unit if difficulty != 1 else ''}")
 
+def _vector_rate_steps(row: Dict[str, Any]) -> List[str]:
+    from_display, to_unit, answer = VECTOR_RATE_CONVERSIONS[row["conversion"]]
+    steps = [f"Convert ${from_display}$ to {to_unit}"]
+    if row["conversion"] == 0:
+        feet_per_hour = 60 * 5280
+        steps.append("Convert miles to feet: $1$ mile $= 5280$ feet")
+        steps.append(f"$60$ miles/hour $= {feet_per_hour}$ feet/hour")
+        steps.append("Convert hours to seconds: $1$ hour $= 3600$ seconds")
+        steps.append(f"$\\frac{{{feet_per_hour} \\text{{ ft}}}}{{1 \\text{{ hr}}}} \\times \\frac{{1 \\text{{ hr}}}}{{3600 \\text{{ sec}}}} = \\frac{{{feet_per_hour}}}{{3600}}$ ft/sec")
+        steps.append(f"$= {answer:.2f}$ feet per second")
+    else:
+        km_per_second = 30 / 1000
+        steps.append("Convert meters to kilometers: $1$ km $= 1000$ m")
+        steps.append(f"$30$ m/s $= {km_per_second}$ km/s")
+        steps.append("Convert seconds to hours: $1$ hour $= 3600$ seconds")
+        steps.append(f"${km_per_second}$ km/s $\\times 3600$ s/hr $= {answer}$ km/hr")
+    steps.append(f"**Final Answer:** ${answer:.2f}$ {to_unit}")
+    return steps
+
+
+def _vector_labels(table: List[Tuple[Any, ...]]) -> Dict[str, Any]:
     return {
-        "question": question,
-        "answer": f"{answer:.2f}",
-        "answer_numeric": round(answer, 2),
-        "steps": steps,
-        "difficulty": difficulty,
+        "from_unit": (("conversion",), lambda conversion: table[conversion][0]),
+        "to_unit": (("conversion",), lambda conversion: table[conversion][1]),
     }
+
+
+# Vectorized batches (see app.generators.vectorized) cover the plain
+# questions; context wording is only generated one at a time.
+VECTORIZED_VARIANTS = {
+    1: (
+        Variant(
+            fields=[("conversion", range(len(VECTOR_BASIC_CONVERSIONS))), ("units", int_values(2, 10))],
+            compute=lambda p: {
+                "value": p["units"] * lookup(VECTOR_BASIC_FACTORS, p["conversion"]),
+                "answer": p["units"] * 1.0,
+            },
+            question="Convert ${value}$ {from_unit} to {to_unit}",
+            answer="{answer:.2f}",
+            labels=_vector_labels(VECTOR_BASIC_CONVERSIONS),
+            steps=_vector_basic_steps,
+        ),
+    ),
+    2: (
+        Variant(
+            fields=[("conversion", range(len(VECTOR_MULTI_STEP_CONVERSIONS))), ("value", int_values(2, 8))],
+            compute=lambda p: {"answer": p["value"] * lookup(VECTOR_MULTI_STEP_FACTORS, p["conversion"])},
+            question="Convert ${value}$ {from_unit} to {to_unit}",
+            answer="{answer:.2f}",
+            labels=_vector_labels(VECTOR_MULTI_STEP_CONVERSIONS),
+            steps=_vector_multi_step_steps,
+        ),
+    ),
+    3: (
+        Variant(
+            fields=[("conversion", range(len(VECTOR_RATE_CONVERSIONS)))],
+            compute=lambda p: {"answer": lookup(VECTOR_RATE_ANSWERS, p["conversion"])},
+            question="Convert ${from_display}$ to {to_unit}",
+            answer="{answer:.2f}",
+            labels={
+                "from_display": (("conversion",), lambda conversion: VECTOR_RATE_CONVERSIONS[conversion][0]),
+                "to_unit": (("conversion",), lambda conversion: VECTOR_RATE_CONVERSIONS[conversion][1]),
+            },
+            steps=_vector_rate_steps,
+        ),
+    ),
+}
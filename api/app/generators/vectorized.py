@@ -0,0 +1,325 @@
+"""
+Vectorized batch generation for the arithmetic generators.
+
+A generator module opts in by defining VECTORIZED_VARIANTS: for each
+difficulty, the question variants it can produce, each with its parameter
+domains, the arithmetic for its answer and its text templates. A batch
+draws every parameter as an array, computes answers array-wise with NumPy
+and only formats strings per question. Steps stay lazy.
+
+Each question's parameters are packed into its seed (at or above
+PACKED_SEED_BASE), so regenerate() rebuilds the exact question from
+(template_type, difficulty, seed) without NumPy, just like any other seed.
+Without NumPy installed, batches fall back to drawing one question at a time.
+"""
+
+import gc
+import random
+from contextlib import contextmanager
+from importlib import import_module
+from string import Formatter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import SEED_BITS
+from app.generators.steps import LazySteps
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batches fall back to pure Python
+    np = None
+
+# Seeds at or above this value hold packed parameters instead of an RNG seed
+PACKED_SEED_BASE = 1 << SEED_BITS
+
+Row = Dict[str, Any]
+
+
+class Variant:
+    """
+    One question shape of a vectorized generator.
+
+    Args:
+        fields: (name, values) pairs; each parameter is drawn uniformly from values
+        compute: Derives further columns (including "answer") from the drawn
+            ones, using only arithmetic and the helpers below so it works on
+            NumPy arrays and plain numbers alike
+        question: Format template over the columns for the question text
+        steps: Renders the solution steps from one row (a dict of columns)
+        answer: Format template over the columns for the answer string
+        labels: Extra display columns, name -> (source columns, function),
+            computed per question before formatting
+        weight: Relative probability of this variant within its difficulty
+    """
+
+    __slots__ = (
+        "fields", "compute", "question", "steps", "answer", "labels", "weight",
+        "size", "_question_format", "_question_columns", "_answer_format", "_answer_columns", "_arrays",
+    )
+
+    def __init__(
+        self,
+        fields: Sequence[Tuple[str, Sequence[Any]]],
+        compute: Callable[[Row], Row],
+        question: str,
+        steps: Callable[[Row], List[str]],
+        answer: str = "{answer}",
+        labels: Optional[Dict[str, Tuple[Tuple[str, ...], Callable[..., str]]]] = None,
+        weight: float = 1.0,
+    ):
+        self.fields = tuple((name, tuple(values)) for name, values in fields)
+        self.compute = compute
+        self.question = question
+        self.steps = steps
+        self.answer = answer
+        self.labels = labels or {}
+        self.weight = weight
+        self.size = 1
+        for _, values in self.fields:
+            self.size *= len(values)
+        self._question_format, self._question_columns = _positional(question)
+        self._answer_format, self._answer_columns = _positional(answer)
+        self._arrays: Optional[Dict[str, Any]] = None
+
+    def arrays(self) -> Dict[str, Any]:
+        """Field domains as NumPy arrays (built once)."""
+        if self._arrays is None:
+            self._arrays = {name: np.array(values) for name, values in self.fields}
+        return self._arrays
+
+    def build(self, columns: Dict[str, List[Any]], codes: List[int], difficulty: int) -> List[GeneratedQuestion]:
+        """
+        Questions for fully computed columns (one list entry per question).
+
+        Text is formatted column-wise; steps keep a tuple of the row values
+        and are only rendered when read.
+        """
+        for label, (sources, function) in self.labels.items():
+            columns[label] = list(map(function, *(columns[source] for source in sources)))
+
+        questions = map(self._question_format.format, *(columns[name] for name in self._question_columns))
+        answers = map(self._answer_format.format, *(columns[name] for name in self._answer_columns))
+        names = tuple(columns)
+        rows = zip(*(columns[name] for name in names))
+        return [
+            GeneratedQuestion(
+                question=question,
+                answer=answer,
+                steps=LazySteps(self._render_steps, names, row),
+                difficulty=difficulty,
+                seed=PACKED_SEED_BASE + code,
+            )
+            for question, answer, row, code in zip(questions, answers, rows, codes)
+        ]
+
+    def _render_steps(self, names: Tuple[str, ...], row: Tuple[Any, ...]) -> List[str]:
+        return self.steps(dict(zip(names, row)))
+
+
+def _positional(template: str) -> Tuple[str, Tuple[str, ...]]:
+    """Rewrite a named format template to positional fields, for map(str.format, *columns)."""
+    parts = []
+    columns: List[str] = []
+    for literal, name, spec, conversion in Formatter().parse(template):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if name is None:
+            continue
+        if name not in columns:
+            columns.append(name)
+        parts.append("{" + str(columns.index(name)))
+        if conversion:
+            parts.append("!" + conversion)
+        if spec:
+            parts.append(":" + spec)
+        parts.append("}")
+    return "".join(parts), tuple(columns)
+
+
+# Helpers usable from Variant.compute on arrays and plain numbers
+
+def where(condition, if_true, if_false):
+    """Elementwise conditional."""
+    if np is not None and isinstance(condition, np.ndarray):
+        return np.where(condition, if_true, if_false)
+    return if_true if condition else if_false
+
+
+def maximum(a, b):
+    """Elementwise maximum."""
+    return where(a >= b, a, b)
+
+
+def minimum(a, b):
+    """Elementwise minimum."""
+    return where(a <= b, a, b)
+
+
+def lookup(table: Sequence[Any], index):
+    """Elementwise table[index]."""
+    if np is not None and isinstance(index, np.ndarray):
+        return np.asarray(table)[index]
+    return table[index]
+
+
+def int_values(low: int, high: int, step: int = 1, exclude: Sequence[int] = ()) -> Tuple[int, ...]:
+    """Inclusive integer domain for a field."""
+    return tuple(value for value in range(low, high + 1, step) if value not in exclude)
+
+
+def tenths(low: float, high: float) -> Tuple[float, ...]:
+    """One-decimal values from low to high, like round(uniform(low, high), 1)."""
+    return tuple(i / 10 for i in range(round(low * 10), round(high * 10) + 1))
+
+
+def whole_or_decimal(value: float) -> str:
+    """Format a number without a trailing .0 when it is whole."""
+    return str(int(value)) if value == int(value) else str(value)
+
+
+def supports(template_type: str, difficulty: int) -> bool:
+    """Whether a vectorized backend exists for this template type and difficulty."""
+    return _variants(template_type, difficulty) is not None
+
+
+def is_packed_seed(seed: int) -> bool:
+    """Whether a seed holds packed vectorized parameters."""
+    return seed >= PACKED_SEED_BASE
+
+
+def regenerate(template_type: str, difficulty: int, seed: int) -> GeneratedQuestion:
+    """
+    Rebuild a vectorized question from its packed seed.
+
+    Raises:
+        ValueError: If the seed does not decode for this template type and difficulty
+    """
+    variants = _variants(template_type, difficulty)
+    if variants is None or not is_packed_seed(seed):
+        raise ValueError(f"Seed {seed} is not a vectorized {template_type} question")
+
+    code = seed - PACKED_SEED_BASE
+    variant = variants[code % len(variants)]
+    code //= len(variants)
+    row = {}
+    for name, values in variant.fields:
+        row[name] = values[code % len(values)]
+        code //= len(values)
+    if code:
+        raise ValueError(f"Seed {seed} is not a vectorized {template_type} question")
+
+    row.update(variant.compute(row))
+    columns = {name: [value] for name, value in row.items()}
+    return variant.build(columns, [seed - PACKED_SEED_BASE], difficulty)[0]
+
+
+def generate_batch(
+    template_type: str,
+    difficulty: int,
+    n: int,
+    seed: Optional[int] = None,
+) -> List[GeneratedQuestion]:
+    """
+    Generate n questions with array-wise parameter draws and arithmetic.
+
+    Args:
+        template_type: Template type with VECTORIZED_VARIANTS for difficulty
+        difficulty: Difficulty level
+        n: Number of questions
+        seed: Optional seed for the batch RNG
+
+    Returns:
+        List of n GeneratedQuestions, each with its packed seed
+    """
+    variants = _variants(template_type, difficulty)
+    if variants is None:
+        raise ValueError(f"No vectorized generator for {template_type} difficulty {difficulty}")
+    if n < 0:
+        raise ValueError(f"Batch size must be non-negative, got {n}")
+
+    if np is None:
+        rng = random.Random(seed)
+        weights = [variant.weight for variant in variants]
+        batch = []
+        for _ in range(n):
+            index = rng.choices(range(len(variants)), weights)[0]
+            code = index
+            radix = len(variants)
+            for _, values in variants[index].fields:
+                code += rng.randrange(len(values)) * radix
+                radix *= len(values)
+            batch.append(regenerate(template_type, difficulty, PACKED_SEED_BASE + code))
+        return batch
+
+    with _gc_paused():
+        return _generate_arrays(variants, difficulty, n, seed)
+
+
+def _generate_arrays(variants: Tuple[Variant, ...], difficulty: int, n: int, seed: Optional[int]) -> List[GeneratedQuestion]:
+    """NumPy implementation of generate_batch()."""
+    rng = np.random.default_rng(seed)
+    weights = np.array([variant.weight for variant in variants], dtype=float)
+    chosen = rng.choice(len(variants), size=n, p=weights / weights.sum())
+    batch: List[Optional[GeneratedQuestion]] = [None] * n
+
+    for index, variant in enumerate(variants):
+        positions = np.flatnonzero(chosen == index)
+        m = len(positions)
+        if not m:
+            continue
+
+        code = np.full(m, index, dtype=np.int64)
+        radix = len(variants)
+        arrays = variant.arrays()
+        columns = {}
+        for name, values in variant.fields:
+            drawn = rng.integers(0, len(values), m)
+            code += drawn * radix
+            radix *= len(values)
+            columns[name] = arrays[name][drawn]
+        columns.update(variant.compute(columns))
+
+        lists = {name: np.broadcast_to(column, (m,)).tolist() for name, column in columns.items()}
+        questions = variant.build(lists, code.tolist(), difficulty)
+        if len(variants) == 1:
+            return questions
+        for position, question in zip(positions.tolist(), questions):
+            batch[position] = question
+
+    return batch
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pause the cyclic garbage collector while building a large batch.
+
+    A batch allocates several small containers per question and creates no
+    reference cycles, so collections triggered along the way only rescan
+    live objects; pausing them roughly halves batch time.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+_VARIANT_CACHE: Dict[str, Optional[Dict[int, Tuple[Variant, ...]]]] = {}
+
+
+def _variants(template_type: str, difficulty: int) -> Optional[Tuple[Variant, ...]]:
+    """VECTORIZED_VARIANTS of a generator's module for one difficulty, if any."""
+    if template_type not in _VARIANT_CACHE:
+        from app.generators import GENERATOR_PATHS
+
+        path = GENERATOR_PATHS.get(template_type)
+        module = import_module(f"app.generators.{path.split(':')[0]}") if path else None
+        variants = getattr(module, "VECTORIZED_VARIANTS", None)
+        for level, options in (variants or {}).items():
+            if len(options) * max(variant.size for variant in options) > PACKED_SEED_BASE:
+                raise ValueError(f"{template_type} difficulty {level} has too many parameters to pack into a seed")
+        _VARIANT_CACHE[template_type] = variants
+    variants = _VARIANT_CACHE[template_type]
+    return variants.get(difficulty) if variants else None
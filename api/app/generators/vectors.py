@@ -2,7 +2,10 @@
 
 import random
 import math
-from typing import Dict, Any
+from typing import List, Optional
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng
+from app.generators.steps import LazySteps
 
 # Word problem templates for engaging, real-world contexts
 MAGNITUDE_WORD_PROBLEMS = [
@@ -59,84 +62,70 @@ DOTPRODUCT_WORD_PROBLEMS = [
 ]
 
 
-def generate_vectors(difficulty: int = 1) -> Dict[str, Any]:
+def generate_vectors(
+    difficulty: int = 1,
+    rng: Optional[random.Random] = None,
+    seed: Optional[int] = None,
+) -> GeneratedQuestion:
     """
     Generate a vectors problem.
 
     Args:
         difficulty: 1 (magnitude), 2 (vector addition), 3 (dot product)
+        rng: Random source to draw from (defaults to the shared generator RNG)
+        seed: Seed for a private RNG when rng is not given (same seed, same question)
 
     Returns:
         Dict with question, answer, and solution steps
     """
+    rng = get_rng(rng, seed)
+
     if difficulty == 1:
         # Easy: Find magnitude of a vector
         # Use Pythagorean triples for 2D vectors
         triples = [(3, 4, 5), (5, 12, 13), (8, 15, 17), (6, 8, 10)]
-        x, y, magnitude = random.choice(triples)
-        use_word_problem = random.random() < 0.4
+        x, y, magnitude = rng.choice(triples)
+        use_word_problem = rng.random() < 0.4
 
         # Randomly negate components
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             x = -x
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             y = -y
 
         if use_word_problem:
-            context = random.choice(MAGNITUDE_WORD_PROBLEMS)
+            context = rng.choice(MAGNITUDE_WORD_PROBLEMS)
             context_text = context["context"].format(x=x, y=y)
             question = f"{context_text}\n\n{context['question']}"
         else:
             question = f"Find the magnitude of the vector $\\vec{{v}} = \\langle {x}, {y} \\rangle$."
 
-        steps = [
-            "The magnitude (or length) of a vector $\\vec{v} = \\langle x, y \\rangle$ is:",
-            "$||\\vec{v}|| = \\sqrt{x^2 + y^2}$",
-            "",
-            f"Substitute the values:",
-            f"$||\\vec{{v}}|| = \\sqrt{{({x})^2 + ({y})^2}}$",
-            f"$||\\vec{{v}}|| = \\sqrt{{{x**2} + {y**2}}}$",
-            f"$||\\vec{{v}}|| = \\sqrt{{{x**2 + y**2}}}$",
-            f"$||\\vec{{v}}|| = {magnitude}$ units",
-            "",
-            f"**Final Answer:** ${magnitude}$ units"
-        ]
+        steps = LazySteps(_magnitude_steps, x, y, magnitude)
 
         answer_numeric = magnitude
 
     elif difficulty == 2:
         # Medium: Vector addition/subtraction - find component
-        x1 = random.randint(-5, 5)
-        y1 = random.randint(-5, 5)
-        x2 = random.randint(-5, 5)
-        y2 = random.randint(-5, 5)
-        use_word_problem = random.random() < 0.4
+        x1 = rng.randint(-5, 5)
+        y1 = rng.randint(-5, 5)
+        x2 = rng.randint(-5, 5)
+        y2 = rng.randint(-5, 5)
+        use_word_problem = rng.random() < 0.4
 
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Addition
             result_x = x1 + x2
             result_y = y1 + y2
             operation = "+"
 
             if use_word_problem:
-                context = random.choice([p for p in ADDITION_WORD_PROBLEMS if p["operation"] == "+"])
+                context = rng.choice([p for p in ADDITION_WORD_PROBLEMS if p["operation"] == "+"])
                 context_text = context["context"].format(x1=x1, y1=y1, x2=x2, y2=y2)
                 question = f"{context_text}\n\n$\\vec{{u}} = \\langle {x1}, {y1} \\rangle$, $\\vec{{v}} = \\langle {x2}, {y2} \\rangle$\n\n{context['question']} (Find the $x$-component.)"
             else:
                 question = f"If $\\vec{{u}} = \\langle {x1}, {y1} \\rangle$ and $\\vec{{v}} = \\langle {x2}, {y2} \\rangle$, find the $x$-component of $\\vec{{u}} + \\vec{{v}}$."
 
-            steps = [
-                "To add vectors, we add corresponding components (component-wise addition):",
-                "$\\vec{u} + \\vec{v} = \\langle x_1 + x_2, y_1 + y_2 \\rangle$",
-                "",
-                f"Calculate each component:",
-                f"$\\vec{{u}} + \\vec{{v}} = \\langle {x1} + ({x2}), {y1} + ({y2}) \\rangle$",
-                f"$\\vec{{u}} + \\vec{{v}} = \\langle {result_x}, {result_y} \\rangle$",
-                "",
-                f"The $x$-component of the sum is ${result_x}$.",
-                "",
-                f"**Final Answer:** ${result_x}$"
-            ]
+            steps = LazySteps(_sum_steps, x1, y1, x2, y2, result_x, result_y)
 
             answer_numeric = result_x
         else:
@@ -146,64 +135,107 @@ def generate_vectors(difficulty: int = 1) -> Dict[str, Any]:
             operation = "-"
 
             if use_word_problem:
-                context = random.choice([p for p in ADDITION_WORD_PROBLEMS if p["operation"] == "-"])
+                context = rng.choice([p for p in ADDITION_WORD_PROBLEMS if p["operation"] == "-"])
                 context_text = context["context"].format(x1=x1, y1=y1, x2=x2, y2=y2)
                 question = f"{context_text}\n\n$\\vec{{u}} = \\langle {x1}, {y1} \\rangle$, $\\vec{{v}} = \\langle {x2}, {y2} \\rangle$\n\n{context['question']} (Find the $y$-component.)"
             else:
                 question = f"If $\\vec{{u}} = \\langle {x1}, {y1} \\rangle$ and $\\vec{{v}} = \\langle {x2}, {y2} \\rangle$, find the $y$-component of $\\vec{{u}} - \\vec{{v}}$."
 
-            steps = [
-                "To subtract vectors, we subtract corresponding components (component-wise subtraction):",
-                "$\\vec{u} - \\vec{v} = \\langle x_1 - x_2, y_1 - y_2 \\rangle$",
-                "",
-                f"Calculate each component:",
-                f"$\\vec{{u}} - \\vec{{v}} = \\langle {x1} - ({x2}), {y1} - ({y2}) \\rangle$",
-                f"$\\vec{{u}} - \\vec{{v}} = \\langle {result_x}, {result_y} \\rangle$",
-                "",
-                f"The $y$-component of the difference is ${result_y}$.",
-                "",
-                f"**Final Answer:** ${result_y}$"
-            ]
+            steps = LazySteps(_difference_steps, x1, y1, x2, y2, result_x, result_y)
 
             answer_numeric = result_y
 
     else:
         # Hard: Dot product
-        x1 = random.randint(-4, 4)
-        y1 = random.randint(-4, 4)
-        x2 = random.randint(-4, 4)
-        y2 = random.randint(-4, 4)
-        use_word_problem = random.random() < 0.4
+        x1 = rng.randint(-4, 4)
+        y1 = rng.randint(-4, 4)
+        x2 = rng.randint(-4, 4)
+        y2 = rng.randint(-4, 4)
+        use_word_problem = rng.random() < 0.4
 
         dot_product = x1 * x2 + y1 * y2
 
         if use_word_problem:
-            context = random.choice(DOTPRODUCT_WORD_PROBLEMS)
+            context = rng.choice(DOTPRODUCT_WORD_PROBLEMS)
             context_text = context["context"].format(x1=x1, y1=y1, x2=x2, y2=y2)
             question = f"{context_text}\n\n$\\vec{{u}} = \\langle {x1}, {y1} \\rangle$, $\\vec{{v}} = \\langle {x2}, {y2} \\rangle$\n\n{context['question']}"
         else:
             question = f"Find the dot product of $\\vec{{u}} = \\langle {x1}, {y1} \\rangle$ and $\\vec{{v}} = \\langle {x2}, {y2} \\rangle$."
 
-        steps = [
-            "The dot product of two vectors $\\vec{u} = \\langle x_1, y_1 \\rangle$ and $\\vec{v} = \\langle x_2, y_2 \\rangle$ is:",
-            "$\\vec{u} \\cdot \\vec{v} = x_1 x_2 + y_1 y_2$",
-            "",
-            "The dot product measures how much two vectors point in the same direction.",
-            "",
-            f"Substitute the values:",
-            f"$\\vec{{u}} \\cdot \\vec{{v}} = ({x1})({x2}) + ({y1})({y2})$",
-            f"$\\vec{{u}} \\cdot \\vec{{v}} = {x1 * x2} + {y1 * y2}$",
-            f"$\\vec{{u}} \\cdot \\vec{{v}} = {dot_product}$",
-            "",
-            f"**Final Answer:** ${dot_product}$"
-        ]
+        steps = LazySteps(_dot_product_steps, x1, y1, x2, y2, dot_product)
 
         answer_numeric = dot_product
 
-    return {
-        "question": question,
-        "answer": str(answer_numeric),
-        "answer_numeric": answer_numeric,
-        "steps": steps,
-        "difficulty": difficulty,
-    }
+    return GeneratedQuestion(
+        question=question,
+        answer=str(answer_numeric),
+        answer_numeric=answer_numeric,
+        steps=steps,
+        difficulty=difficulty,
+    )
+
+
+def _magnitude_steps(x: int, y: int, magnitude: int) -> List[str]:
+    """Steps for the magnitude of a 2D vector."""
+    return [
+        "The magnitude (or length) of a vector $\\vec{v} = \\langle x, y \\rangle$ is:",
+        "$||\\vec{v}|| = \\sqrt{x^2 + y^2}$",
+        "",
+        f"Substitute the values:",
+        f"$||\\vec{{v}}|| = \\sqrt{{({x})^2 + ({y})^2}}$",
+        f"$||\\vec{{v}}|| = \\sqrt{{{x**2} + {y**2}}}$",
+        f"$||\\vec{{v}}|| = \\sqrt{{{x**2 + y**2}}}$",
+        f"$||\\vec{{v}}|| = {magnitude}$ units",
+        "",
+        f"**Final Answer:** ${magnitude}$ units"
+    ]
+
+
+def _sum_steps(x1: int, y1: int, x2: int, y2: int, result_x: int, result_y: int) -> List[str]:
+    """Steps for the x-component of u + v."""
+    return [
+        "To add vectors, we add corresponding components (component-wise addition):",
+        "$\\vec{u} + \\vec{v} = \\langle x_1 + x_2, y_1 + y_2 \\rangle$",
+        "",
+        f"Calculate each component:",
+        f"$\\vec{{u}} + \\vec{{v}} = \\langle {x1} + ({x2}), {y1} + ({y2}) \\rangle$",
+        f"$\\vec{{u}} + \\vec{{v}} = \\langle {result_x}, {result_y} \\rangle$",
+        "",
+        f"The $x$-component of the sum is ${result_x}$.",
+        "",
+        f"**Final Answer:** ${result_x}$"
+    ]
+
+
+def _difference_steps(x1: int, y1: int, x2: int, y2: int, result_x: int,
+                      result_y: int) -> List[str]:
+    """Steps for the y-component of u - v."""
+    return [
+        "To subtract vectors, we subtract corresponding components (component-wise subtraction):",
+        "$\\vec{u} - \\vec{v} = \\langle x_1 - x_2, y_1 - y_2 \\rangle$",
+        "",
+        f"Calculate each component:",
+        f"$\\vec{{u}} - \\vec{{v}} = \\langle {x1} - ({x2}), {y1} - ({y2}) \\rangle$",
+        f"$\\vec{{u}} - \\vec{{v}} = \\langle {result_x}, {result_y} \\rangle$",
+        "",
+        f"The $y$-component of the difference is ${result_y}$.",
+        "",
+        f"**Final Answer:** ${result_y}$"
+    ]
+
+
+def _dot_product_steps(x1: int, y1: int, x2: int, y2: int, dot_product: int) -> List[str]:
+    """Steps for the dot product of two 2D vectors."""
+    return [
+        "The dot product of two vectors $\\vec{u} = \\langle x_1, y_1 \\rangle$ and $\\vec{v} = \\langle x_2, y_2 \\rangle$ is:",
+        "$\\vec{u} \\cdot \\vec{v} = x_1 x_2 + y_1 y_2$",
+        "",
+        "The dot product measures how much two vectors point in the same direction.",
+        "",
+        f"Substitute the values:",
+        f"$\\vec{{u}} \\cdot \\vec{{v}} = ({x1})({x2}) + ({y1})({y2})$",
+        f"$\\vec{{u}} \\cdot \\vec{{v}} = {x1 * x2} + {y1 * y2}$",
+        f"$\\vec{{u}} \\cdot \\vec{{v}} = {dot_product}$",
+        "",
+        f"**Final Answer:** ${dot_product}$"
+    ]
@@ -4,9 +4,11 @@ from datetime import datetime
 from typing import Optional, List
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from app.models import Skill, UserMastery, QuestionTemplate, SkillPrerequisite
+from app.models import Skill, UserMastery
 from app.learning.mastery import get_recent_results
 from app.learning.spaced_repetition import is_due_for_review
+from app.services.skill_catalog import skill_catalog
+from app.services.template_index import template_cache
 import random
 
 
@@ -73,12 +75,7 @@ def get_adaptive_difficulty(user_id: int, skill_id: int, db: Session) -> int:
 def get_due_reviews(user_id: int, db: Session) -> List[int]:
     """Get list of skill IDs that are due for spaced repetition review."""
     # Get skills with available templates
-    skills_with_templates = (
-        db.query(QuestionTemplate.skill_id)
-        .distinct()
-        .all()
-    )
-    template_skill_ids = [skill_id for (skill_id,) in skills_with_templates]
+    template_skill_ids = list(template_cache.current.skill_ids)
 
     if not template_skill_ids:
         return []
@@ -110,50 +107,31 @@ def get_weak_prerequisites(user_id: int, db: Session, threshold: float = 50.0) -
     Returns:
         List of skill IDs that are weak prerequisites
     """
-    # Get skills with available templates
-    skills_with_templates = (
-        db.query(QuestionTemplate.skill_id)
-        .distinct()
-        .all()
-    )
-    template_skill_ids = [skill_id for (skill_id,) in skills_with_templates]
+    # Skills with available templates that are prerequisites for other skills
+    prerequisite_ids = skill_catalog.current.prerequisite_ids
+    candidate_ids = [skill_id for skill_id in template_cache.current.skill_ids if skill_id in prerequisite_ids]
 
-    if not template_skill_ids:
+    if not candidate_ids:
         return []
 
-    # Get all weak skills (mastery < threshold)
-    weak_skills = (
+    # Of those, the weak ones (mastery < threshold)
+    weak_prerequisites = (
         db.query(UserMastery.skill_id)
         .filter(
             UserMastery.user_id == user_id,
-            UserMastery.skill_id.in_(template_skill_ids),
+            UserMastery.skill_id.in_(candidate_ids),
             UserMastery.mastery_score < threshold,
         )
         .all()
     )
 
-    weak_skill_ids = [skill_id for (skill_id,) in weak_skills]
-
-    # Filter to only those that are prerequisites for other skills
-    prerequisites = (
-        db.query(SkillPrerequisite.prerequisite_id)
-        .filter(SkillPrerequisite.prerequisite_id.in_(weak_skill_ids))
-        .distinct()
-        .all()
-    )
-
-    return [prereq_id for (prereq_id,) in prerequisites]
+    return [skill_id for (skill_id,) in weak_prerequisites]
 
 
 def get_unpracticed_skills(user_id: int, db: Session) -> List[int]:
     """Get skills that have never been practiced (and have question templates)."""
     # Get skills with available templates
-    skills_with_templates = (
-        db.query(QuestionTemplate.skill_id)
-        .distinct()
-        .all()
-    )
-    template_skill_ids = [skill_id for (skill_id,) in skills_with_templates]
+    template_skill_ids = list(template_cache.current.skill_ids)
 
     if not template_skill_ids:
         return []
@@ -184,12 +162,7 @@ def weighted_random_skill(user_id: int, db: Session) -> Optional[int]:
         Skill ID or None if no skills available
     """
     # Get skills with available templates
-    skills_with_templates = (
-        db.query(QuestionTemplate.skill_id)
-        .distinct()
-        .all()
-    )
-    template_skill_ids = [skill_id for (skill_id,) in skills_with_templates]
+    template_skill_ids = list(template_cache.current.skill_ids)
 
     if not template_skill_ids:
         return None
@@ -1,9 +1,28 @@
 """Mastery score calculation algorithms."""
 
-from datetime import datetime, timedelta
-from typing import List
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import case, func, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.models import QuestionHistory
+from app.models import QuestionHistory, UserMastery
+from app.learning.spaced_repetition import calculate_next_review
+
+# Number of most recent attempts behind recent accuracy
+RECENT_WINDOW = 10
+RECENT_MASK = (1 << RECENT_WINDOW) - 1
+
+
+class MasteryCounts(NamedTuple):
+    """Counters of a user_mastery row after an update."""
+
+    id: int
+    total_attempts: int
+    correct_attempts: int
+    recent_results: Optional[int]
+    recent_count: Optional[int]
 
 
 def calculate_mastery(
@@ -31,22 +50,49 @@ def calculate_mastery(
             QuestionHistory.user_id == user_id,
             QuestionHistory.skill_id == skill_id,
         )
-        .order_by(QuestionHistory.created_at.desc())
+        .order_by(QuestionHistory.created_at.desc(), QuestionHistory.id.desc())
         .all()
     )
 
-    if not all_attempts:
+    total_correct = sum(1 for attempt in all_attempts if attempt.is_correct)
+    recent_results, recent_count = recent_window(attempt.is_correct for attempt in all_attempts)
+    return mastery_from_counts(len(all_attempts), total_correct, recent_results, recent_count, recent_weight)
+
+
+def mastery_from_counts(
+    total_attempts: int,
+    correct_attempts: int,
+    recent_results: int,
+    recent_count: int,
+    recent_weight: float = 0.7,
+) -> float:
+    """
+    Mastery score (0-100) from running totals and the recent-results window.
+
+    This is the calculation calculate_mastery does over the full history,
+    so UserMastery can be kept up to date in constant time per answer.
+
+    Args:
+        total_attempts: Attempts on the skill
+        correct_attempts: Correct attempts on the skill
+        recent_results: Bitmask of the last recent_count results, bit 0 the
+            most recent (1 = correct)
+        recent_count: Results held in the window (at most RECENT_WINDOW)
+        recent_weight: Weight given to recent attempts (0-1)
+
+    Returns:
+        Mastery score from 0 to 100
+    """
+    if not total_attempts:
         return 0.0
 
     # Calculate overall accuracy
-    total_correct = sum(1 for attempt in all_attempts if attempt.is_correct)
-    overall_accuracy = total_correct / len(all_attempts)
+    overall_accuracy = correct_attempts / total_attempts
 
     # Calculate recent accuracy (last 10 attempts)
-    recent_attempts = all_attempts[:10]
-    if recent_attempts:
-        recent_correct = sum(1 for attempt in recent_attempts if attempt.is_correct)
-        recent_accuracy = recent_correct / len(recent_attempts)
+    if recent_count:
+        recent_correct = bin(recent_results & RECENT_MASK).count("1")
+        recent_accuracy = recent_correct / recent_count
     else:
         recent_accuracy = overall_accuracy
 
@@ -58,6 +104,294 @@ def calculate_mastery(
     return min(mastery, 100.0)
 
 
+def recent_window(results_newest_first: Iterable[bool]) -> Tuple[int, int]:
+    """
+    Pack the most recent results into a (bitmask, count) window.
+
+    Args:
+        results_newest_first: Attempt results, most recent first (only the
+            first RECENT_WINDOW are read)
+
+    Returns:
+        (recent_results, recent_count) as stored on UserMastery
+    """
+    recent_results = 0
+    recent_count = 0
+    for is_correct in results_newest_first:
+        if recent_count == RECENT_WINDOW:
+            break
+        if is_correct:
+            recent_results |= 1 << recent_count
+        recent_count += 1
+    return recent_results, recent_count
+
+
+def shift_window(recent_results: int, recent_count: int, new_results: int, count: int) -> Tuple[int, int]:
+    """Push count new results (a window of their own, newest in bit 0) into a window."""
+    if count >= RECENT_WINDOW:
+        return new_results, RECENT_WINDOW
+    return ((recent_results << count) | new_results) & RECENT_MASK, min(recent_count + count, RECENT_WINDOW)
+
+
+def record_attempt(attempt: QuestionHistory, db: Session, practiced_at: Optional[datetime] = None) -> float:
+    """
+    Record an attempt and update the user's mastery of its skill in O(1).
+
+    Runs without committing, as three statements in the caller's transaction:
+
+    1. INSERT the question_history row
+    2. INSERT ... ON CONFLICT (user_id, skill_id) DO UPDATE on user_mastery,
+       which creates the row or bumps its totals and shifts the result into
+       the recent-results window atomically, RETURNING the new counters
+    3. UPDATE mastery_score and next_review, computed from those counters
+       with mastery_from_counts (identical to calculate_mastery)
+
+    Concurrent answers for the same skill cannot create duplicate mastery
+    rows or lose an increment: the upsert holds the row lock until commit.
+    Rows that predate the window (recent_results is NULL, see
+    backfill_mastery_window.py) load it once from history, which then adds
+    a fourth statement. On databases without ON CONFLICT support steps 2
+    and 3 become a SELECT ... FOR UPDATE and one INSERT or UPDATE.
+
+    Args:
+        attempt: New history row (its values are inserted; the object is
+            not added to the session)
+        db: Database session
+        practiced_at: Time of the attempt (defaults to now)
+
+    Returns:
+        The new mastery score
+    """
+    return record_attempts([attempt], db, practiced_at)[(attempt.user_id, attempt.skill_id)]
+
+
+def record_attempts(
+    attempts: Sequence[QuestionHistory],
+    db: Session,
+    practiced_at: Optional[datetime] = None,
+) -> Dict[Tuple[int, int], float]:
+    """
+    Record several attempts with one history insert and one mastery update per skill.
+
+    The batch form of record_attempt: all history rows go in as one bulk
+    (executemany) INSERT, then each touched (user_id, skill_id) gets one
+    upsert and one score UPDATE covering all of its attempts, in list order
+    (oldest first). Does not commit.
+
+    Returns:
+        New mastery score per (user_id, skill_id)
+    """
+    if not attempts:
+        return {}
+    practiced_at = practiced_at or datetime.utcnow()
+    history = QuestionHistory.__table__
+    # Every column but the id and server-side defaults (created_at)
+    columns = [column.key for column in history.columns if not column.primary_key and column.server_default is None]
+    db.execute(insert(history), [{key: getattr(attempt, key) for key in columns} for attempt in attempts])
+
+    results: Dict[Tuple[int, int], List[bool]] = {}
+    for attempt in attempts:
+        results.setdefault((attempt.user_id, attempt.skill_id), []).append(bool(attempt.is_correct))
+
+    return {
+        key: _update_mastery(key[0], key[1], skill_results, practiced_at, db)
+        for key, skill_results in results.items()
+    }
+
+
+def _update_mastery(user_id: int, skill_id: int, results: List[bool], practiced_at: datetime, db: Session) -> float:
+    """Upsert one mastery row with new results (oldest first) and rescore it."""
+    table = UserMastery.__table__
+    count = len(results)
+    correct = sum(results)
+    # New results as a window on their own (most recent in bit 0)
+    new_results, new_count = recent_window(reversed(results))
+
+    upsert_insert = _upsert_insert(db)
+    if upsert_insert is None:
+        return _update_mastery_portable(user_id, skill_id, count, correct, new_results, new_count, practiced_at, db)
+
+    window_missing = table.c.recent_results.is_(None)
+    if count >= RECENT_WINDOW:
+        shifted_results = new_results
+        shifted_count = RECENT_WINDOW
+    else:
+        # shift_window in portable SQL arithmetic
+        shifted_results = (table.c.recent_results * (1 << count) + new_results) % (RECENT_MASK + 1)
+        shifted_count = case(
+            (table.c.recent_count + count < RECENT_WINDOW, table.c.recent_count + count),
+            else_=RECENT_WINDOW,
+        )
+
+    new_row = upsert_insert(table).values(
+        user_id=user_id,
+        skill_id=skill_id,
+        mastery_score=0.0,
+        total_attempts=count,
+        correct_attempts=correct,
+        recent_results=new_results,
+        recent_count=new_count,
+        last_practiced=practiced_at,
+    )
+    upsert = new_row.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.skill_id],
+        set_={
+            "total_attempts": func.coalesce(table.c.total_attempts, 0) + count,
+            "correct_attempts": func.coalesce(table.c.correct_attempts, 0) + correct,
+            "recent_results": case((window_missing, None), else_=shifted_results),
+            "recent_count": case((window_missing, None), else_=shifted_count),
+            "last_practiced": new_row.excluded.last_practiced,
+        },
+    ).returning(
+        table.c.id, table.c.total_attempts, table.c.correct_attempts, table.c.recent_results, table.c.recent_count
+    )
+    row = db.execute(upsert).one()
+
+    recent_results, recent_count = _window_or_history(row, user_id, skill_id, db)
+    score = mastery_from_counts(row.total_attempts, row.correct_attempts, recent_results, recent_count)
+    db.execute(
+        update(table)
+        .where(table.c.id == row.id)
+        .values(
+            mastery_score=score,
+            next_review=calculate_next_review(score, practiced_at),
+            recent_results=recent_results,
+            recent_count=recent_count,
+        )
+    )
+    return score
+
+
+def _update_mastery_portable(
+    user_id: int,
+    skill_id: int,
+    count: int,
+    correct: int,
+    new_results: int,
+    new_count: int,
+    practiced_at: datetime,
+    db: Session,
+) -> float:
+    """
+    _update_mastery for dialects without INSERT ... ON CONFLICT.
+
+    Locks the row with SELECT ... FOR UPDATE and writes it back with one
+    UPDATE, or INSERTs it in a savepoint; if a concurrent answer inserted
+    it first, the unique key rejects the insert and the row is updated.
+    """
+    table = UserMastery.__table__
+    lock_row = (
+        select(
+            table.c.id, table.c.total_attempts, table.c.correct_attempts, table.c.recent_results, table.c.recent_count
+        )
+        .where(table.c.user_id == user_id, table.c.skill_id == skill_id)
+        .with_for_update()
+    )
+
+    row = db.execute(lock_row).one_or_none()
+    if row is None:
+        score = mastery_from_counts(count, correct, new_results, new_count)
+        try:
+            with db.begin_nested():
+                db.execute(
+                    insert(table).values(
+                        user_id=user_id,
+                        skill_id=skill_id,
+                        mastery_score=score,
+                        total_attempts=count,
+                        correct_attempts=correct,
+                        recent_results=new_results,
+                        recent_count=new_count,
+                        last_practiced=practiced_at,
+                        next_review=calculate_next_review(score, practiced_at),
+                    )
+                )
+            return score
+        except IntegrityError:
+            row = db.execute(lock_row).one()
+
+    if row.recent_results is None:
+        recent_results, recent_count = None, None
+    else:
+        recent_results, recent_count = shift_window(row.recent_results, row.recent_count, new_results, count)
+    counts = MasteryCounts(
+        row.id,
+        (row.total_attempts or 0) + count,
+        (row.correct_attempts or 0) + correct,
+        recent_results,
+        recent_count,
+    )
+    recent_results, recent_count = _window_or_history(counts, user_id, skill_id, db)
+    score = mastery_from_counts(counts.total_attempts, counts.correct_attempts, recent_results, recent_count)
+    db.execute(
+        update(table)
+        .where(table.c.id == row.id)
+        .values(
+            mastery_score=score,
+            next_review=calculate_next_review(score, practiced_at),
+            total_attempts=counts.total_attempts,
+            correct_attempts=counts.correct_attempts,
+            recent_results=recent_results,
+            recent_count=recent_count,
+            last_practiced=practiced_at,
+        )
+    )
+    return score
+
+
+def _window_or_history(counts, user_id: int, skill_id: int, db: Session) -> Tuple[int, int]:
+    """The row's updated window, loaded from history if the row predates windows."""
+    if counts.recent_results is not None:
+        return counts.recent_results, counts.recent_count
+    # History already includes the new attempts (inserted above)
+    return recent_window(get_recent_results(user_id, skill_id, db, limit=RECENT_WINDOW))
+
+
+def _upsert_insert(db: Session):
+    """The dialect's insert() construct supporting on_conflict_do_update, or None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    return None
+
+
+def check_mastery_schema(bind: Engine) -> None:
+    """
+    Make sure user_mastery has what record_attempts relies on.
+
+    Databases created before the upsert may lack the unique (user_id,
+    skill_id) key or the recent-results window columns; answers would then
+    fail with database errors, so refuse to start instead.
+
+    Raises:
+        RuntimeError: Naming the missing parts and the script that adds them
+    """
+    inspector = inspect(bind)
+    table = UserMastery.__tablename__
+    if not inspector.has_table(table):
+        return
+
+    problems = []
+    columns = {column["name"] for column in inspector.get_columns(table)}
+    missing = [name for name in ("recent_results", "recent_count") if name not in columns]
+    if missing:
+        problems.append(f"missing columns {', '.join(missing)}")
+
+    key = {"user_id", "skill_id"}
+    unique_keys = [set(constraint["column_names"]) for constraint in inspector.get_unique_constraints(table)]
+    unique_keys += [set(index["column_names"]) for index in inspector.get_indexes(table) if index.get("unique")]
+    if key not in unique_keys:
+        problems.append("no unique key on (user_id, skill_id)")
+
+    if problems:
+        raise RuntimeError(
+            f"{table} needs migrating ({'; '.join(problems)}). "
+            "Run `python dedupe_user_mastery.py` once, then start the API again."
+        )
+
+
 def get_recent_accuracy(
     user_id: int, skill_id: int, db: Session, limit: int = 10
 ) -> float:
@@ -68,7 +402,7 @@ def get_recent_accuracy(
             QuestionHistory.user_id == user_id,
             QuestionHistory.skill_id == skill_id,
         )
-        .order_by(QuestionHistory.created_at.desc())
+        .order_by(QuestionHistory.created_at.desc(), QuestionHistory.id.desc())
         .limit(limit)
         .all()
     )
@@ -90,7 +424,7 @@ def get_recent_results(
             QuestionHistory.user_id == user_id,
             QuestionHistory.skill_id == skill_id,
         )
-        .order_by(QuestionHistory.created_at.desc())
+        .order_by(QuestionHistory.created_at.desc(), QuestionHistory.id.desc())
         .limit(limit)
         .all()
     )
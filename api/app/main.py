@@ -2,8 +2,15 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import get_settings, engine, Base
-from app.routes import auth, questions, progress, skills, evaluation, admin, badges
+from app.database import get_settings, engine, Base, SessionLocal
+from app.generators import warm_up
+from app.learning.mastery import check_mastery_schema
+from app.routes import auth, questions, progress, skills, evaluation, admin, badges, quiz
+from app.services.history_writer import history_writer
+from app.services.next_questions import next_questions
+from app.services.question_pool import question_pool
+from app.services.skill_catalog import skill_catalog
+from app.services.template_index import template_cache
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -37,6 +44,63 @@ app.include_router(skills.router, prefix=settings.api_prefix)
 app.include_router(evaluation.router, prefix=settings.api_prefix)
 app.include_router(admin.router, prefix=settings.api_prefix)
 app.include_router(badges.router, prefix=settings.api_prefix)
+app.include_router(quiz.router, prefix=settings.api_prefix)
+
+
+@app.on_event("startup")
+def check_database_schema():
+    """Refuse to start on a database that still needs dedupe_user_mastery.py."""
+    check_mastery_schema(engine)
+
+
+@app.on_event("startup")
+def warm_up_generators():
+    """Import every generator module up front when warm-up is enabled."""
+    if settings.generator_warmup:
+        warm_up()
+
+
+@app.on_event("startup")
+def load_content_snapshots():
+    """Build the in-memory skill catalog and question template index."""
+    db = SessionLocal()
+    try:
+        skill_catalog.reload(db)
+        template_cache.reload(db)
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def start_question_pool():
+    """Register a pool for every template and start the refill worker."""
+    if not settings.question_pool_enabled:
+        return
+
+    question_pool.register(template_cache.current.keys)
+    # Templates added by a later reload, in this worker or published by another
+    template_cache.add_listener(lambda index: question_pool.register(index.keys))
+    question_pool.start()
+
+
+@app.on_event("startup")
+def start_next_question_prefetch():
+    """Start the worker that prepares users' next questions, when prefetch is enabled."""
+    next_questions.start(questions.select_next_question)
+
+
+@app.on_event("startup")
+def start_history_writer():
+    """Start the batched answer writer unless HISTORY_WRITE_MODE is sync."""
+    # An async answer returns before its mastery update commits; prepare the
+    # next question again once it has
+    history_writer.start(on_flush=next_questions.refresh if history_writer.mode == "async" else None)
+
+
+@app.on_event("shutdown")
+def drain_history_writer():
+    """Write every queued answer before the process exits."""
+    history_writer.stop()
 
 
 @app.get("/")
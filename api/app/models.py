@@ -1,6 +1,6 @@
 """SQLAlchemy database models."""
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON, LargeBinary, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -81,6 +81,8 @@ class UserMastery(Base):
     """User progress and mastery tracking."""
 
     __tablename__ = "user_mastery"
+    # One row per user and skill; answers upsert on this key
+    __table_args__ = (UniqueConstraint("user_id", "skill_id", name="uq_user_mastery_user_skill"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -90,12 +92,26 @@ class UserMastery(Base):
     next_review = Column(DateTime(timezone=True))
     total_attempts = Column(Integer, default=0)
     correct_attempts = Column(Integer, default=0)
+    # Last 10 results as a bitmask (bit 0 = most recent, 1 = correct) and
+    # how many it holds; NULL until backfilled (backfill_mastery_window.py)
+    recent_results = Column(Integer)
+    recent_count = Column(Integer)
 
     # Relationships
     user = relationship("User", back_populates="mastery")
     skill = relationship("Skill", back_populates="mastery")
 
 
+class UserSeenQuestions(Base):
+    """Approximate set of questions a user has already been shown."""
+
+    __tablename__ = "user_seen_questions"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    filter_data = Column(LargeBinary, nullable=False)  # Serialized RotatingBloomFilter
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 class QuestionHistory(Base):
     """Question attempt history."""
 
@@ -9,6 +9,17 @@ from datetime import datetime, timedelta
 from app.database import get_db
 from app.models import User, Evaluation, EvaluationSkillResult, QuestionHistory, Skill
 from app.auth import get_current_user
+from app.generators import latex
+from app.routes.evaluation import evaluation_sessions
+from app.routes.quiz import quiz_channels
+from app.services.active_questions import active_questions
+from app.services.history_writer import history_writer
+from app.services.next_questions import next_questions
+from app.services.question_pool import question_pool
+from app.services.seen_questions import seen_questions
+from app.services.skill_catalog import skill_catalog
+from app.services.template_index import template_cache
+from app.services.used_question_tokens import used_question_tokens
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -298,3 +309,101 @@ def get_skill_performance(
             for s in skill_stats
         ]
     }
+
+
+@router.get("/question-pool")
+def get_question_pool_metrics(admin: User = Depends(require_admin)):
+    """Get pre-generated question pool hit/miss and refill-lag metrics."""
+    return question_pool.metrics()
+
+
+@router.get("/question-dedup")
+def get_question_dedup_metrics(admin: User = Depends(require_admin)):
+    """Get how often repeated questions were skipped or served anyway."""
+    return seen_questions.metrics()
+
+
+@router.get("/latex-cache")
+def get_latex_cache_stats(admin: User = Depends(require_admin)):
+    """Get hit rates of the memoized LaTeX formatters."""
+    return latex.cache_stats()
+
+
+@router.get("/active-questions")
+def get_active_question_metrics(admin: User = Depends(require_admin)):
+    """Get hit/miss counts (and size, evictions and expirations in memory) of the unanswered-question store."""
+    return active_questions.metrics()
+
+
+@router.get("/used-question-tokens")
+def get_used_question_token_metrics(admin: User = Depends(require_admin)):
+    """Get counts of the answered-token record, including rejected replays."""
+    return used_question_tokens.metrics()
+
+
+@router.get("/next-questions")
+def get_next_question_metrics(admin: User = Depends(require_admin)):
+    """Get hit rate, served-question age and invalidations of the next-question prefetch cache."""
+    return next_questions.metrics()
+
+
+@router.get("/history-writer")
+def get_history_writer_metrics(admin: User = Depends(require_admin)):
+    """Get mode, batch sizes, flush times and queue depth of the answer writer."""
+    return history_writer.metrics()
+
+
+@router.get("/quiz-channels")
+def get_quiz_channel_metrics(admin: User = Depends(require_admin)):
+    """Get open WebSocket and event-stream quiz channels and message handling time."""
+    return quiz_channels.metrics()
+
+
+@router.get("/evaluation-sessions")
+def get_evaluation_session_metrics(admin: User = Depends(require_admin)):
+    """Get hit/miss and write counts of the evaluation session store."""
+    return evaluation_sessions.metrics()
+
+
+@router.get("/templates")
+def get_template_index_metrics(admin: User = Depends(require_admin)):
+    """Get version, size and build time of the in-memory template index."""
+    return template_cache.metrics()
+
+
+@router.post("/templates/reload")
+def reload_template_index(
+    admin: User = Depends(require_full_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Rebuild the template index from the database (run after seed_data.py or add_templates.py).
+
+    Reloads the worker process that handles the request and publishes a
+    new content version; the other workers reload within
+    CONTENT_VERSION_CHECK_SECONDS.
+    """
+    template_cache.publish(db)
+    return template_cache.metrics()
+
+
+@router.get("/skill-catalog")
+def get_skill_catalog_metrics(admin: User = Depends(require_admin)):
+    """Get version, size and build time of the in-memory skill catalog."""
+    return skill_catalog.metrics()
+
+
+@router.post("/skill-catalog/reload")
+def reload_skill_catalog(
+    admin: User = Depends(require_full_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Rebuild the skill catalog from the database (run after seed_data.py or editing skills).
+
+    Reloads the worker process that handles the request and publishes a
+    new content version; the other workers reload within
+    CONTENT_VERSION_CHECK_SECONDS.
+    """
+    skill_catalog.publish(db)
+    return skill_catalog.metrics()
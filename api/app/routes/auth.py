@@ -14,6 +14,7 @@ from app.utils.security import (
     verify_token_type,
 )
 from app.auth import get_current_user
+from app.services.next_questions import next_questions
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -65,6 +66,9 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
     access_token = create_access_token(data={"sub": user.username})
     refresh_token = create_refresh_token(data={"sub": user.username})
 
+    # A quiz session is starting: have the first question ready (if prefetch is enabled)
+    next_questions.request(user.id)
+
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
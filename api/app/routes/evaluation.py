@@ -6,53 +6,43 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import uuid
 import random
-import threading
-import time
 
 from app.database import get_db
-from app.models import User, Skill, QuestionTemplate, Evaluation, EvaluationSkillResult
+from app.models import User, Evaluation, EvaluationSkillResult
 from app.schemas import QuestionResponse, AnswerSubmit
 from app.auth import get_current_user
-from app.generators import get_generator
+from app.generators.question import QuestionMeta
+from app.generators.steps import render_steps
+from app.services.question_pool import question_pool
+from app.services.state import create_backend
+from app.services.skill_catalog import skill_catalog
+from app.services.template_index import template_cache
 from app.utils.answer_validation import answers_are_equivalent
 
 router = APIRouter(prefix="/evaluation", tags=["Evaluation"])
 
-# In-memory storage for evaluation sessions with TTL
-evaluation_sessions: Dict[str, Dict[str, Any]] = {}
+# Evaluation sessions with TTL, in the configured state backend (shared
+# between workers with STATE_BACKEND=sqlite or redis)
 SESSION_TTL_HOURS = 24  # Sessions expire after 24 hours
+COMPLETED_SESSION_TTL_HOURS = 1  # Completed sessions are kept for the report
+evaluation_sessions = create_backend("evaluation_sessions", ttl=timedelta(hours=SESSION_TTL_HOURS))
 
 
-def cleanup_expired_sessions():
-    """Remove expired sessions from memory."""
-    now = datetime.utcnow()
-    expired = []
-    for session_id, session in evaluation_sessions.items():
-        started_at = session.get("started_at")
-        if started_at and (now - started_at) > timedelta(hours=SESSION_TTL_HOURS):
-            expired.append(session_id)
-        # Also clean up completed sessions older than 1 hour
-        if session.get("completed") and started_at:
-            if (now - started_at) > timedelta(hours=1):
-                expired.append(session_id)
-
-    for session_id in expired:
-        evaluation_sessions.pop(session_id, None)
-
-
-def start_cleanup_thread():
-    """Start background thread to periodically clean up sessions."""
-    def cleanup_loop():
-        while True:
-            time.sleep(3600)  # Run every hour
-            cleanup_expired_sessions()
-
-    thread = threading.Thread(target=cleanup_loop, daemon=True)
-    thread.start()
+def save_session(session_id: str, session: Dict[str, Any]) -> None:
+    """
+    Write a session back after changing it.
 
+    Sessions expire SESSION_TTL_HOURS after they started; completed
+    sessions are kept COMPLETED_SESSION_TTL_HOURS for the report.
+    """
+    ttl = session["started_at"] + timedelta(hours=SESSION_TTL_HOURS) - datetime.utcnow()
+    if session["completed"]:
+        ttl = min(ttl, timedelta(hours=COMPLETED_SESSION_TTL_HOURS))
+    if ttl <= timedelta(0):
+        evaluation_sessions.delete(session_id)
+    else:
+        evaluation_sessions.set(session_id, session, ttl)
 
-# Start cleanup on module load
-start_cleanup_thread()
 
 # Difficulty levels (standardized to 3)
 LEVELS = {
@@ -93,30 +83,22 @@ def start_evaluation(
 
     Tests all skills starting at level 1, adapting based on performance.
     """
-    # Get all skills with templates, grouped by subject
-    skills = db.query(Skill).order_by(Skill.subject, Skill.id).all()
-
-    # Filter to skills with templates and organize by subject
+    # Skills with templates, grouped by subject (subjects in curriculum order)
+    catalog = skill_catalog.current
+    templates = template_cache.current
     skills_by_subject: Dict[str, list] = {}
     skill_list = []
 
-    for skill in skills:
-        has_template = db.query(QuestionTemplate).filter(
-            QuestionTemplate.skill_id == skill.id
-        ).first()
-        if has_template:
-            if skill.subject not in skills_by_subject:
-                skills_by_subject[skill.subject] = []
-            skills_by_subject[skill.subject].append({
-                "id": skill.id,
-                "name": skill.name,
-                "subject": skill.subject,
-            })
-            skill_list.append({
-                "id": skill.id,
-                "name": skill.name,
-                "subject": skill.subject,
-            })
+    for subject in catalog.subjects:
+        for skill in catalog.by_subject(subject):
+            if templates.has_templates(skill.id):
+                entry = {
+                    "id": skill.id,
+                    "name": skill.name,
+                    "subject": skill.subject,
+                }
+                skills_by_subject.setdefault(subject, []).append(entry)
+                skill_list.append(dict(entry))
 
     if not skill_list:
         raise HTTPException(
@@ -125,12 +107,7 @@ def start_evaluation(
         )
 
     # Randomize skill order within each subject, keep subjects in curriculum order
-    subject_order = ["Pre-Algebra", "Algebra Basics", "Algebra I", "Algebra II", "Trigonometry", "Precalculus"]
-    ordered_subjects = [s for s in subject_order if s in skills_by_subject]
-    # Add any subjects not in our predefined order
-    for s in skills_by_subject:
-        if s not in ordered_subjects:
-            ordered_subjects.append(s)
+    ordered_subjects = list(skills_by_subject)
 
     # Build evaluation queue: skills randomized within each subject
     evaluation_queue = []
@@ -157,7 +134,7 @@ def start_evaluation(
 
     # Create session
     session_id = str(uuid.uuid4())
-    evaluation_sessions[session_id] = {
+    session = {
         "user_id": current_user.id,
         "evaluation_queue": evaluation_queue,
         "current_skill_index": 0,
@@ -174,6 +151,7 @@ def start_evaluation(
         "subject_skills_completed": 0,
         "last_completed_subject": None,
     }
+    save_session(session_id, session)
 
     return {
         "session_id": session_id,
@@ -225,6 +203,7 @@ def get_next_evaluation_question(
     if not current_skill:
         # All skills completed
         session["completed"] = True
+        save_session(session_id, session)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Evaluation complete - no more skills to test",
@@ -242,48 +221,33 @@ def get_next_evaluation_question(
         session["subject_skills_completed"] = 0
 
     # Get template for this skill at current level
-    # Try exact level match first, fall back to any available
-    template = db.query(QuestionTemplate).filter(
-        QuestionTemplate.skill_id == skill_id,
-        QuestionTemplate.difficulty == current_level,
-    ).first()
-
-    if not template:
-        # Fall back to closest available difficulty
-        template = db.query(QuestionTemplate).filter(
-            QuestionTemplate.skill_id == skill_id,
-            QuestionTemplate.difficulty <= current_level,
-        ).order_by(QuestionTemplate.difficulty.desc()).first()
-
-    if not template:
-        # Last resort: any template
-        template = db.query(QuestionTemplate).filter(
-            QuestionTemplate.skill_id == skill_id
-        ).first()
+    # Try exact level match first, then the closest difficulty below, then any available
+    template = template_cache.current.resolve_at_or_below(skill_id, current_level)
 
     if not template:
         # Skip this skill if no template found
         skill_state["completed"] = True
         session["skills_completed"] += 1
         session["subject_skills_completed"] += 1
+        save_session(session_id, session)
         return get_next_evaluation_question(session_id, current_user, db)
 
-    # Generate question
-    generator = get_generator(template.template_type)
-    question_data = generator(current_level)
+    # Take a pre-generated question (generates inline if the pool is empty)
+    question_data = question_pool.take(template.template_type, current_level)
 
     question_id = str(uuid.uuid4())
 
     # Store active question
-    session["active_question"] = {
-        "question_id": question_id,
-        "skill_id": skill_id,
-        "skill_name": current_skill["name"],
-        "subject": current_skill["subject"],
-        "level": current_level,
-        "correct_answer": question_data["answer"],
-        "steps": question_data.get("steps", []),
-    }
+    session["active_question"] = QuestionMeta(
+        question_id=question_id,
+        skill_id=skill_id,
+        template_type=template.template_type,
+        difficulty=current_level,
+        seed=question_data.seed,
+        bank_index=question_data.bank_index,
+        template_id=template.id,
+    )
+    save_session(session_id, session)
 
     # Calculate progress
     total_skills = session["total_skills"]
@@ -302,7 +266,7 @@ def get_next_evaluation_question(
         "skill_id": skill_id,
         "skill_name": current_skill["name"],
         "subject": current_skill["subject"],
-        "question": question_data["question"],
+        "question": question_data.question,
         "difficulty": current_level,
         "template_id": template.id,
         # Progress info
@@ -344,18 +308,21 @@ def submit_evaluation_answer(
         )
 
     question = session.get("active_question")
-    if not question or question["question_id"] != answer_data.question_id:
+    if not question or question.question_id != answer_data.question_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Question not found or mismatched",
         )
 
-    skill_id = question["skill_id"]
+    skill_id = question.skill_id
     skill_state = session["skill_states"][skill_id]
     current_level = skill_state["current_level"]
 
-    # Validate answer
-    is_correct = answers_are_equivalent(answer_data.answer, question["correct_answer"])
+    # Look the question up again (bank record or seed), then validate the answer
+    question_data = question_pool.resolve(
+        question.template_type, question.difficulty, question.seed, question.bank_index
+    )
+    is_correct = answers_are_equivalent(answer_data.answer, question_data.answer)
 
     # Record attempt
     skill_state["attempts_at_level"] += 1
@@ -400,6 +367,7 @@ def submit_evaluation_answer(
     evaluation_complete = session["skills_completed"] >= session["total_skills"]
     if evaluation_complete:
         session["completed"] = True
+    save_session(session_id, session)
 
     # Calculate progress
     total_skills = session["total_skills"]
@@ -415,8 +383,8 @@ def submit_evaluation_answer(
 
     return {
         "is_correct": is_correct,
-        "correct_answer": question["correct_answer"],
-        "steps": question.get("steps"),
+        "correct_answer": question_data.answer,
+        "steps": render_steps(question_data),
         "skill_completed": skill_completed,
         "evaluation_complete": evaluation_complete,
         "advanced_level": advanced_level,
@@ -540,6 +508,7 @@ def get_evaluation_report(
         db.commit()
         saved_evaluation_id = evaluation.id
         session["saved_evaluation_id"] = saved_evaluation_id
+        save_session(session_id, session)
 
     # Generate recommendation
     recommendation = _generate_study_recommendation(study, developing, proficient, mastered)
@@ -3,16 +3,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List
+from typing import List, Tuple
 
 from app.database import get_db
-from app.models import User, Skill, UserMastery, QuestionHistory, SkillPrerequisite
+from app.models import User, UserMastery, QuestionHistory
 from app.schemas import MasteryResponse, ProgressSummary, WeakArea
 from app.auth import get_current_user
+from app.services.skill_catalog import SkillInfo, skill_catalog
 
 router = APIRouter(prefix="/progress", tags=["Progress"])
 
 
+def _with_skills(masteries: List[UserMastery]) -> List[Tuple[UserMastery, SkillInfo]]:
+    """Pair mastery rows with their catalog skill, dropping rows of unknown skills."""
+    catalog = skill_catalog.current
+    paired = []
+    for mastery in masteries:
+        skill = catalog.get(mastery.skill_id)
+        if skill is not None:
+            paired.append((mastery, skill))
+    return paired
+
+
 @router.get("/weak-areas", response_model=List[WeakArea])
 def get_weak_areas(
     current_user: User = Depends(get_current_user),
@@ -25,9 +37,8 @@ def get_weak_areas(
     for other skills.
     """
     # Get weak skills (mastery < 60)
-    weak_mastery = (
-        db.query(UserMastery, Skill)
-        .join(Skill, UserMastery.skill_id == Skill.id)
+    weak_mastery = _with_skills(
+        db.query(UserMastery)
         .filter(
             UserMastery.user_id == current_user.id,
             UserMastery.mastery_score < 60,
@@ -35,21 +46,12 @@ def get_weak_areas(
         .all()
     )
 
+    catalog = skill_catalog.current
     weak_areas = []
 
     for mastery, skill in weak_mastery:
         # Check if this skill is a prerequisite for others
-        dependent_skills = (
-            db.query(Skill.name)
-            .join(
-                SkillPrerequisite,
-                Skill.id == SkillPrerequisite.skill_id,
-            )
-            .filter(SkillPrerequisite.prerequisite_id == skill.id)
-            .all()
-        )
-
-        dependent_skill_names = [name for (name,) in dependent_skills]
+        dependent_skill_names = [dependent.name for dependent in catalog.dependents_of(skill.id)]
         is_prerequisite = len(dependent_skill_names) > 0
 
         weak_areas.append(
@@ -77,9 +79,8 @@ def get_next_reviews(
     """Get skills that are due for spaced repetition review."""
     from datetime import datetime
 
-    due_mastery = (
-        db.query(UserMastery, Skill)
-        .join(Skill, UserMastery.skill_id == Skill.id)
+    due_mastery = _with_skills(
+        db.query(UserMastery)
         .filter(
             UserMastery.user_id == current_user.id,
             UserMastery.next_review <= datetime.utcnow(),
@@ -119,9 +120,8 @@ def get_progress_summary(
 ):
     """Get overall progress summary for the user."""
     # Get all mastery records
-    mastery_records = (
-        db.query(UserMastery, Skill)
-        .join(Skill, UserMastery.skill_id == Skill.id)
+    mastery_records = _with_skills(
+        db.query(UserMastery)
         .filter(UserMastery.user_id == current_user.id)
         .all()
     )
@@ -196,7 +196,7 @@ def get_skill_progress(
     db: Session = Depends(get_db),
 ):
     """Get progress for a specific skill."""
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+    skill = skill_catalog.current.get(skill_id)
     if not skill:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
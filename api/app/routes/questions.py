@@ -1,25 +1,170 @@
 """Questions and quiz endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
 import uuid
 import json
 
-from app.database import get_db
-from app.models import User, Skill, QuestionTemplate, UserMastery, QuestionHistory
+from app.database import get_db, get_settings
+from app.models import User, QuestionHistory
 from app.schemas import QuestionResponse, AnswerSubmit, AnswerFeedback
 from app.auth import get_current_user
 from app.learning.adaptive import select_next_skill, get_adaptive_difficulty
-from app.learning.mastery import calculate_mastery
-from app.learning.spaced_repetition import calculate_next_review
-from app.generators import get_generator
+from app.generators.question import GeneratedQuestion, QuestionMeta
+from app.generators.steps import render_steps
+from app.services.active_questions import active_questions
+from app.services.history_writer import history_writer
+from app.services.next_questions import next_questions
+from app.services.question_pool import question_pool
+from app.services.seen_questions import seen_questions
+from app.services.skill_catalog import skill_catalog
+from app.services.template_index import TemplateRef, template_cache
+from app.services.used_question_tokens import used_question_tokens
 from app.utils.answer_validation import answers_are_equivalent
+from app.utils.question_tokens import (
+    InvalidQuestionToken,
+    answer_digest,
+    canonical_question_token,
+    decode_question_token,
+    encode_question_token,
+    is_question_token,
+)
 
 router = APIRouter(prefix="/questions", tags=["Questions"])
 
-# In-memory cache for active questions (in production, use Redis)
-active_questions = {}
+settings = get_settings()
+# Key for signed question tokens (falls back to the JWT key)
+QUESTION_TOKEN_SECRET = settings.question_token_secret or settings.jwt_secret_key
+QUESTION_TOKEN_MAX_AGE = timedelta(minutes=settings.active_question_ttl_minutes)
+# Most questions fetched or answered in one batch request
+QUESTION_BATCH_MAX = settings.question_batch_max
+
+
+class PreparedQuestion(NamedTuple):
+    """
+    A selected question that has no question ID yet.
+
+    serve_question issues the ID, so a question prepared in the background
+    and then invalidated leaves nothing behind in the active-question
+    store. question_data carries no steps, as slots may be pickled.
+    """
+
+    skill_id: int
+    skill_name: str
+    template: TemplateRef
+    difficulty: int
+    question_data: GeneratedQuestion
+
+
+def issue_question_id(
+    user_id: int,
+    skill_id: int,
+    template: TemplateRef,
+    difficulty: int,
+    question_data: GeneratedQuestion,
+) -> str:
+    """
+    Question ID a served question is answered under.
+
+    With question tokens enabled this is a signed token carrying everything
+    needed to grade the answer, so nothing is stored; otherwise a uuid4 key
+    into the active-question store.
+    """
+    if settings.question_tokens_enabled:
+        return encode_question_token(
+            user_id, skill_id, template.id, difficulty, question_data.seed,
+            question_data.answer, QUESTION_TOKEN_SECRET,
+        )
+
+    question_id = str(uuid.uuid4())
+    # Cache just enough to regenerate the question (for answer validation)
+    active_questions.put(QuestionMeta(
+        question_id=question_id,
+        skill_id=skill_id,
+        template_type=template.template_type,
+        difficulty=difficulty,
+        seed=question_data.seed,
+        bank_index=question_data.bank_index,
+        template_id=template.id,
+        created_at=datetime.utcnow(),
+    ))
+    return question_id
+
+
+def resolve_question_id(question_id: str, user_id: int, db: Session) -> Tuple[QuestionMeta, GeneratedQuestion]:
+    """
+    Look up a served question from its question ID (token or store key).
+
+    Returns:
+        (meta, question), with the full question (answer and steps) looked
+        up again from the bank record or seed
+
+    Raises:
+        HTTPException: 404 if the question is unknown, expired or its token invalid
+    """
+    return resolve_question_ids([question_id], user_id, db)[0]
+
+
+def resolve_question_ids(
+    question_ids: Sequence[str], user_id: int, db: Session
+) -> List[Tuple[QuestionMeta, GeneratedQuestion]]:
+    """
+    Batch form of resolve_question_id, in the order given.
+
+    Store keys are read from the active-question store in one batch.
+
+    Raises:
+        HTTPException: 404 if any question is unknown, expired or its token invalid
+    """
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Question not found or expired",
+    )
+
+    stored = active_questions.get_many([question_id for question_id in question_ids if not is_question_token(question_id)])
+
+    resolved = []
+    for question_id in question_ids:
+        if is_question_token(question_id):
+            resolved.append(_resolve_question_token(question_id, user_id, db, not_found))
+            continue
+        meta = stored.get(question_id)
+        if not meta:
+            raise not_found
+        question_data = question_pool.resolve(meta.template_type, meta.difficulty, meta.seed, meta.bank_index)
+        resolved.append((meta, question_data))
+    return resolved
+
+
+def _resolve_question_token(
+    question_id: str, user_id: int, db: Session, not_found: HTTPException
+) -> Tuple[QuestionMeta, GeneratedQuestion]:
+    """Verify a question token and regenerate the question it was issued for."""
+    try:
+        claims = decode_question_token(question_id, user_id, QUESTION_TOKEN_SECRET, QUESTION_TOKEN_MAX_AGE)
+    except InvalidQuestionToken:
+        raise not_found
+    template = template_cache.current.get(claims.template_id)
+    if template is None:
+        raise not_found
+
+    question_data = question_pool.resolve(template.template_type, claims.difficulty, claims.seed)
+    # A generator that changed since the token was issued would grade a different question
+    if answer_digest(question_data.answer, claims.seed, QUESTION_TOKEN_SECRET) != claims.answer_digest:
+        raise not_found
+
+    meta = QuestionMeta(
+        question_id=question_id,
+        skill_id=claims.skill_id,
+        template_type=template.template_type,
+        difficulty=claims.difficulty,
+        seed=claims.seed,
+        template_id=claims.template_id,
+        created_at=claims.issued_at,
+    )
+    return meta, question_data
 
 
 @router.get("/next", response_model=QuestionResponse)
@@ -35,13 +180,53 @@ def get_next_question(
     - Weak prerequisites
     - Unpracticed skills
     - Weighted random (favor low mastery)
+
+    With NEXT_QUESTION_PREFETCH enabled, the question prepared for the
+    user in the background is served from their slot when there is one.
+    """
+    user_id = current_user.id
+    prepared = next_questions.take(user_id)
+    if prepared is None:
+        prepared = select_next_question(user_id, db)
+    return serve_question(prepared, user_id, db)
+
+
+def serve_question(prepared: PreparedQuestion, user_id: int, db: Session) -> Dict[str, Any]:
+    """Issue a prepared question, record it as shown to the user, commit, and return it."""
+    question = issue_question(prepared, user_id)
+    seen_questions.served(user_id, [question["question"]], db)
+    db.commit()
+    return question
+
+
+def issue_question(prepared: PreparedQuestion, user_id: int) -> Dict[str, Any]:
+    """Give a prepared question its question ID; returns the response."""
+    question_id = issue_question_id(
+        user_id, prepared.skill_id, prepared.template, prepared.difficulty, prepared.question_data
+    )
+    return {
+        "question_id": question_id,
+        "skill_id": prepared.skill_id,
+        "skill_name": prepared.skill_name,
+        "question": prepared.question_data.question,
+        "difficulty": prepared.difficulty,
+        "template_id": prepared.template.id,
+    }
+
+
+def select_next_question(user_id: int, db: Session) -> PreparedQuestion:
+    """
+    Pick the next adaptive question for a user (see get_next_question).
+
+    Does not issue it or mark it seen; whoever serves it calls serve_question().
     """
     # Select next skill adaptively
-    skill_id = select_next_skill(current_user.id, db)
+    skill_id = select_next_skill(user_id, db)
+    catalog = skill_catalog.current
 
     if skill_id is None:
         # No skills available - return first skill as fallback
-        first_skill = db.query(Skill).first()
+        first_skill = catalog.first()
         if not first_skill:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -50,7 +235,7 @@ def get_next_question(
         skill_id = first_skill.id
 
     # Get the skill
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+    skill = catalog.get(skill_id)
     if not skill:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -58,25 +243,10 @@ def get_next_question(
         )
 
     # Get adaptive difficulty
-    difficulty = get_adaptive_difficulty(current_user.id, skill_id, db)
-
-    # Get a template for this skill
-    template = (
-        db.query(QuestionTemplate)
-        .filter(
-            QuestionTemplate.skill_id == skill_id,
-            QuestionTemplate.difficulty == difficulty,
-        )
-        .first()
-    )
+    difficulty = get_adaptive_difficulty(user_id, skill_id, db)
 
-    # Fallback to any template for this skill if exact difficulty not found
-    if not template:
-        template = (
-            db.query(QuestionTemplate)
-            .filter(QuestionTemplate.skill_id == skill_id)
-            .first()
-        )
+    # Get a template for this skill (any template if exact difficulty not found)
+    template = template_cache.current.resolve(skill_id, difficulty)
 
     if not template:
         raise HTTPException(
@@ -84,32 +254,21 @@ def get_next_question(
             detail=f"No question templates found for skill {skill_id}",
         )
 
-    # Generate question
-    generator = get_generator(template.template_type)
-    question_data = generator(difficulty)
-
-    # Create unique question ID
-    question_id = str(uuid.uuid4())
-
-    # Cache the question data (for answer validation)
-    active_questions[question_id] = {
-        "skill_id": skill_id,
-        "template_id": template.id,
-        "difficulty": difficulty,
-        "correct_answer": question_data["answer"],
-        "answer_numeric": question_data.get("answer_numeric"),
-        "steps": question_data.get("steps", []),
-        "created_at": datetime.utcnow(),
-    }
-
-    return {
-        "question_id": question_id,
-        "skill_id": skill_id,
-        "skill_name": skill.name,
-        "question": question_data["question"],
-        "difficulty": difficulty,
-        "template_id": template.id,
-    }
+    # Take a pre-generated question the user has not seen recently
+    question_data = seen_questions.take(user_id, template.template_type, difficulty, db)
+
+    return PreparedQuestion(
+        skill_id=skill_id,
+        skill_name=skill.name,
+        template=template,
+        difficulty=difficulty,
+        question_data=GeneratedQuestion(
+            question_data.question,
+            question_data.answer,
+            seed=question_data.seed,
+            bank_index=question_data.bank_index,
+        ),
+    )
 
 
 @router.post("/answer", response_model=AnswerFeedback)
@@ -118,88 +277,201 @@ def submit_answer(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Submit an answer and get feedback."""
-    # Get cached question
-    question = active_questions.get(answer_data.question_id)
-    if not question:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Question not found or expired",
-        )
-
-    # Validate answer (handles fractions, decimals, mixed numbers, etc.)
-    is_correct = answers_are_equivalent(answer_data.answer, question["correct_answer"])
-
-    # Record attempt in history
-    attempt = QuestionHistory(
-        user_id=current_user.id,
-        skill_id=question["skill_id"],
-        template_id=question["template_id"],
-        is_correct=is_correct,
-        time_taken_seconds=answer_data.time_taken_seconds,
-        difficulty=question["difficulty"],
-    )
-    db.add(attempt)
-
-    # Update or create mastery record
-    mastery = (
-        db.query(UserMastery)
-        .filter(
-            UserMastery.user_id == current_user.id,
-            UserMastery.skill_id == question["skill_id"],
-        )
-        .first()
-    )
-
-    if not mastery:
-        mastery = UserMastery(
-            user_id=current_user.id,
-            skill_id=question["skill_id"],
-            mastery_score=0.0,
-            total_attempts=0,
-            correct_attempts=0,
-        )
-        db.add(mastery)
-
-    # Update counts
-    mastery.total_attempts += 1
-    if is_correct:
-        mastery.correct_attempts += 1
-
-    mastery.last_practiced = datetime.utcnow()
+    """
+    Submit an answer and get feedback.
 
-    # Recalculate mastery score
-    db.commit()  # Commit to make the new attempt available
-    new_mastery_score = calculate_mastery(current_user.id, question["skill_id"], db)
-    mastery.mastery_score = new_mastery_score
+    The feedback includes the next question, unless NEXT_QUESTION_PREFETCH
+    is enabled: then the background worker prepares it and the client
+    fetches it from GET /questions/next.
+    """
+    user_id = current_user.id  # read before commit expires current_user
 
-    # Calculate next review time
-    mastery.next_review = calculate_next_review(new_mastery_score, mastery.last_practiced)
+    # Look the question up again (bank record or seed); steps are only rendered here
+    question, question_data = resolve_question_id(answer_data.question_id, user_id, db)
+    correct_answer = question_data.answer
 
-    db.commit()
+    # Validate answer (handles fractions, decimals, mixed numbers, etc.)
+    is_correct = answers_are_equivalent(answer_data.answer, correct_answer)
+
+    # One transaction, three statements, one commit: history INSERT, mastery
+    # upsert and mastery score UPDATE (see record_attempts). With
+    # HISTORY_WRITE_MODE group or async the history writer runs them in a
+    # batch with other answers instead, and db.commit() has nothing to write
+    record_answers(
+        [answer_data.question_id],
+        [QuestionHistory(
+            user_id=user_id,
+            skill_id=question.skill_id,
+            template_id=question.template_id,
+            is_correct=is_correct,
+            time_taken_seconds=answer_data.time_taken_seconds,
+            difficulty=question.difficulty,
+        )],
+        db,
+    )
 
     # Get skill info for explanation
-    skill = db.query(Skill).filter(Skill.id == question["skill_id"]).first()
+    explanation = skill_catalog.current.explanation(question.skill_id)
+
+    # Remove question from cache (tokens are not stored there)
+    if not is_question_token(answer_data.question_id):
+        active_questions.pop(answer_data.question_id)
 
-    # Remove question from cache
-    del active_questions[answer_data.question_id]
+    # The new mastery makes any question prepared for the user obsolete
+    next_questions.invalidate(user_id)
 
     # Get next question
-    try:
-        next_q = get_next_question(current_user, db)
-    except HTTPException:
+    if next_questions.enabled:
+        next_questions.request(user_id)
         next_q = None
+    else:
+        try:
+            next_q = get_next_question(current_user, db)
+        except HTTPException:
+            next_q = None
 
     return {
         "is_correct": is_correct,
         "user_answer": answer_data.answer,
-        "correct_answer": question["correct_answer"],
-        "explanation": skill.explanation if skill else None,
-        "steps": question.get("steps"),
+        "correct_answer": correct_answer,
+        "explanation": explanation,
+        "steps": render_steps(question_data),
         "next_question": next_q,
     }
 
 
+@router.get("/batch", response_model=List[QuestionResponse])
+def get_question_batch(
+    n: int = Query(10, ge=1, description="Number of questions"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get several adaptive questions in one request.
+
+    Each is chosen like GET /questions/next (a prepared question first, if
+    any), all against the user's current mastery. Answer them with POST
+    /questions/answers. At most QUESTION_BATCH_MAX questions.
+    """
+    _check_batch_size(n)
+    user_id = current_user.id
+
+    questions = []
+    prepared = next_questions.take(user_id)
+    while len(questions) < n:
+        if prepared is None:
+            prepared = select_next_question(user_id, db)
+        questions.append(issue_question(prepared, user_id))
+        # In memory only, so the rest of the batch skips it; written once below
+        seen_questions.served(user_id, [prepared.question_data.question], db)
+        prepared = None
+    db.commit()
+    return questions
+
+
+@router.post("/answers", response_model=List[AnswerFeedback])
+def submit_answer_batch(
+    answers: List[AnswerSubmit],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Submit several answers at once and get feedback for each, in order.
+
+    All history rows are written with one bulk insert and mastery is
+    updated once per skill touched, in a single transaction. If any
+    question is unknown or expired nothing is recorded. Feedback does not
+    include next questions; fetch them with GET /questions/batch.
+    """
+    _check_batch_size(len(answers))
+    user_id = current_user.id  # read before commit expires current_user
+    question_ids = [answer.question_id for answer in answers]
+    if len(set(map(canonical_question_token, question_ids))) != len(question_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each question can only be answered once per batch",
+        )
+
+    resolved = resolve_question_ids(question_ids, user_id, db)
+    correct = [
+        answers_are_equivalent(answer.answer, question_data.answer)
+        for answer, (_, question_data) in zip(answers, resolved)
+    ]
+
+    record_answers(
+        question_ids,
+        [
+            QuestionHistory(
+                user_id=user_id,
+                skill_id=question.skill_id,
+                template_id=question.template_id,
+                is_correct=is_correct,
+                time_taken_seconds=answer.time_taken_seconds,
+                difficulty=question.difficulty,
+            )
+            for answer, (question, _), is_correct in zip(answers, resolved, correct)
+        ],
+        db,
+    )
+
+    catalog = skill_catalog.current
+
+    active_questions.discard_many([question_id for question_id in question_ids if not is_question_token(question_id)])
+    next_questions.invalidate(user_id)
+    next_questions.request(user_id)
+
+    return [
+        {
+            "is_correct": is_correct,
+            "user_answer": answer.answer,
+            "correct_answer": question_data.answer,
+            "explanation": catalog.explanation(question.skill_id),
+            "steps": render_steps(question_data),
+            "next_question": None,
+        }
+        for answer, (question, question_data), is_correct in zip(answers, resolved, correct)
+    ]
+
+
+def record_answers(question_ids: Sequence[str], attempts: List[QuestionHistory], db: Session) -> None:
+    """
+    Record the attempts for answered questions and commit.
+
+    A question token can only be answered once: its tokens are claimed
+    first (released again if recording fails), so resubmitting an answer
+    or a batch is rejected instead of recorded twice.
+
+    Raises:
+        HTTPException: 409 if any token was already answered (nothing is recorded)
+    """
+    tokens = [question_id for question_id in question_ids if is_question_token(question_id)]
+    if not used_question_tokens.claim(tokens):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Question already answered",
+        )
+    try:
+        written = history_writer.record(attempts, db)
+        db.commit()
+    except Exception:
+        used_question_tokens.release(tokens)
+        raise
+    written.wait()
+
+
+def _check_batch_size(n: int) -> None:
+    if n < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A batch needs at least one question",
+        )
+    if n > QUESTION_BATCH_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {QUESTION_BATCH_MAX} questions per batch",
+        )
+
+
 @router.get("/practice/{skill_id}", response_model=QuestionResponse)
 def practice_specific_skill(
     skill_id: int,
@@ -207,7 +479,7 @@ def practice_specific_skill(
     db: Session = Depends(get_db),
 ):
     """Generate a question for a specific skill (for targeted practice)."""
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+    skill = skill_catalog.current.get(skill_id)
     if not skill:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -217,22 +489,8 @@ def practice_specific_skill(
     # Get adaptive difficulty for this skill
     difficulty = get_adaptive_difficulty(current_user.id, skill_id, db)
 
-    # Get a template
-    template = (
-        db.query(QuestionTemplate)
-        .filter(
-            QuestionTemplate.skill_id == skill_id,
-            QuestionTemplate.difficulty == difficulty,
-        )
-        .first()
-    )
-
-    if not template:
-        template = (
-            db.query(QuestionTemplate)
-            .filter(QuestionTemplate.skill_id == skill_id)
-            .first()
-        )
+    # Get a template (any template if exact difficulty not found)
+    template = template_cache.current.resolve(skill_id, difficulty)
 
     if not template:
         raise HTTPException(
@@ -240,27 +498,11 @@ def practice_specific_skill(
             detail=f"No templates found for skill {skill_id}",
         )
 
-    # Generate question
-    generator = get_generator(template.template_type)
-    question_data = generator(difficulty)
+    # Take a pre-generated question the user has not seen recently
+    question_data = seen_questions.take(current_user.id, template.template_type, difficulty, db)
 
-    question_id = str(uuid.uuid4())
-
-    active_questions[question_id] = {
-        "skill_id": skill_id,
-        "template_id": template.id,
-        "difficulty": difficulty,
-        "correct_answer": question_data["answer"],
-        "answer_numeric": question_data.get("answer_numeric"),
-        "steps": question_data.get("steps", []),
-        "created_at": datetime.utcnow(),
-    }
-
-    return {
-        "question_id": question_id,
-        "skill_id": skill_id,
-        "skill_name": skill.name,
-        "question": question_data["question"],
-        "difficulty": difficulty,
-        "template_id": template.id,
-    }
+    return serve_question(
+        PreparedQuestion(skill_id, skill.name, template, difficulty, question_data),
+        current_user.id,
+        db,
+    )
@@ -0,0 +1,329 @@
+"""Persistent quiz channel: WebSocket, with a server-sent events fallback."""
+
+import asyncio
+import json
+import logging
+import secrets
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.auth import authenticate_token
+from app.database import SessionLocal, get_settings
+from app.models import User
+from app.routes import questions
+from app.schemas import AnswerFeedback, AnswerSubmit, QuestionResponse
+from app.services.next_questions import next_questions
+from app.utils.security import decode_token
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/quiz", tags=["Quiz"])
+
+settings = get_settings()
+
+# Close code sent when the access token is invalid or expires mid-session
+WS_UNAUTHORIZED = 4401
+# Seconds between keep-alive comments on an idle event stream
+SSE_KEEPALIVE_SECONDS = 15
+
+optional_bearer = HTTPBearer(auto_error=False)
+
+
+class QuizChannel:
+    """
+    One client's quiz session.
+
+    The access token is checked and the user loaded once, when the channel
+    opens; after that each message runs the same code as the REST routes
+    (get_next_question, submit_answer, practice_specific_skill) with the
+    cached user. Messages from the client:
+
+    * {"type": "next"}
+    * {"type": "answer", "question_id": ..., "answer": ..., "time_taken_seconds": ...}
+    * {"type": "practice", "skill_id": ...}
+    * {"type": "ping"}
+
+    The server replies with "question", "feedback", "pong" or "error"
+    messages (an optional "ref" is echoed back on each reply). Feedback is
+    always followed by a pushed "question": the one prepared by the
+    next-question prefetch worker when it is ready in time, else one
+    selected inline.
+    """
+
+    def __init__(self, user: User, expires_at: Optional[float], transport: str):
+        self.id = secrets.token_urlsafe(24)
+        self.user = user
+        self.expires_at = expires_at
+        self.transport = transport
+        self.lock = asyncio.Lock()
+        self.outbox: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+    def ready(self) -> Dict[str, Any]:
+        return {"type": "ready", "channel_id": self.id, "user_id": self.user.id, "transport": self.transport}
+
+    async def handle(self, message: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Replies to one client message, in order."""
+        ref = message.get("ref") if isinstance(message, dict) else None
+        started = time.perf_counter()
+        try:
+            async for reply in self._dispatch(message):
+                yield _with_ref(reply, ref)
+        except HTTPException as exc:
+            yield _with_ref(_error(exc.status_code, exc.detail), ref)
+        except ValidationError as exc:
+            yield _with_ref(_error(status.HTTP_422_UNPROCESSABLE_ENTITY, exc.errors(include_url=False)), ref)
+        except Exception:
+            logger.exception("Quiz channel message failed for user %s", self.user.id)
+            yield _with_ref(_error(status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error"), ref)
+        finally:
+            quiz_channels.record_message(time.perf_counter() - started)
+
+    async def _dispatch(self, message: Any) -> AsyncIterator[Dict[str, Any]]:
+        if self.expired:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+        kind = message.get("type") if isinstance(message, dict) else None
+
+        if kind == "ping":
+            yield {"type": "pong"}
+        elif kind == "next":
+            yield _question(await self._call(questions.get_next_question))
+        elif kind == "practice":
+            skill_id = message.get("skill_id")
+            if not isinstance(skill_id, int):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="practice needs an integer skill_id")
+            yield _question(await self._call(questions.practice_specific_skill, skill_id))
+        elif kind == "answer":
+            answer = AnswerSubmit.model_validate(message)
+            feedback = await self._call(questions.submit_answer, answer)
+            yield {"type": "feedback", **AnswerFeedback.model_validate(feedback).model_dump(mode="json")}
+            next_question = feedback.get("next_question")
+            if next_question is None:
+                prepared = await run_in_threadpool(
+                    next_questions.take, self.user.id, settings.quiz_channel_next_wait_ms / 1000
+                )
+                if prepared is not None:
+                    next_question = await self._call(
+                        lambda user, db: questions.serve_question(prepared, user.id, db)
+                    )
+                else:
+                    next_question = await self._call(questions.get_next_question)
+            yield _question(next_question)
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown message type {kind!r}")
+
+    async def _call(self, route: Callable[..., Any], *args: Any) -> Any:
+        """Run a question route with the channel's user and a fresh session, off the event loop."""
+        def call():
+            db = SessionLocal()
+            try:
+                return route(*args, self.user, db)
+            finally:
+                db.close()
+
+        return await run_in_threadpool(call)
+
+
+class QuizChannelRegistry:
+    """Open channels (event-stream channels by id, for their POSTs) and message counts."""
+
+    def __init__(self):
+        self._streams: Dict[str, QuizChannel] = {}
+        self._lock = threading.Lock()
+        self._open = {"websocket": 0, "sse": 0}
+        self._opened = 0
+        self._rejected = 0
+        self._messages = 0
+        self._handle_time_total = 0.0
+
+    def opened(self, channel: QuizChannel) -> None:
+        with self._lock:
+            self._open[channel.transport] += 1
+            self._opened += 1
+            if channel.transport == "sse":
+                self._streams[channel.id] = channel
+
+    def closed(self, channel: QuizChannel) -> None:
+        with self._lock:
+            self._open[channel.transport] -= 1
+            self._streams.pop(channel.id, None)
+
+    def stream(self, channel_id: str) -> Optional[QuizChannel]:
+        return self._streams.get(channel_id)
+
+    def rejected(self) -> None:
+        with self._lock:
+            self._rejected += 1
+
+    def record_message(self, elapsed: float) -> None:
+        with self._lock:
+            self._messages += 1
+            self._handle_time_total += elapsed
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of open channels per transport and message handling time."""
+        with self._lock:
+            return {
+                "open_websocket": self._open["websocket"],
+                "open_sse": self._open["sse"],
+                "opened": self._opened,
+                "rejected": self._rejected,
+                "messages": self._messages,
+                "avg_message_ms": round(self._handle_time_total / self._messages * 1000, 2) if self._messages else 0.0,
+            }
+
+
+# Process-wide registry; event streams and their POSTs must reach the same worker
+quiz_channels = QuizChannelRegistry()
+
+
+async def open_channel(token: Optional[str], transport: str) -> QuizChannel:
+    """Authenticate once and open a channel; raises 401 like get_current_user."""
+    def authenticate():
+        db = SessionLocal()
+        try:
+            return authenticate_token(token or "", db)
+        finally:
+            db.close()
+
+    try:
+        user = await run_in_threadpool(authenticate)
+    except HTTPException:
+        quiz_channels.rejected()
+        raise
+    channel = QuizChannel(user, decode_token(token).get("exp"), transport)
+    quiz_channels.opened(channel)
+    # Have the first question ready, as logging in does
+    next_questions.request(user.id)
+    return channel
+
+
+@router.websocket("/ws")
+async def quiz_websocket(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """
+    Quiz channel over a WebSocket.
+
+    Authenticate with ?token=<access token>, or send {"type": "auth",
+    "token": ...} as the first message to keep the token out of URLs and
+    logs. The server answers with a "ready" message, then handles the
+    messages described on QuizChannel until either side closes.
+    """
+    await websocket.accept()
+    try:
+        if token is None:
+            first = _parse(await websocket.receive_text())
+            token = first.get("token") if isinstance(first, dict) and first.get("type") == "auth" else None
+        channel = await open_channel(token, "websocket")
+    except WebSocketDisconnect:
+        return
+    except HTTPException as exc:
+        await websocket.send_json(_error(exc.status_code, exc.detail))
+        await websocket.close(code=WS_UNAUTHORIZED)
+        return
+
+    try:
+        await websocket.send_json(channel.ready())
+        while True:
+            message = _parse(await websocket.receive_text())
+            async for reply in channel.handle(message):
+                await websocket.send_json(reply)
+            if channel.expired:
+                await websocket.close(code=WS_UNAUTHORIZED)
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        quiz_channels.closed(channel)
+
+
+@router.get("/events")
+async def quiz_events(
+    token: Optional[str] = Query(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer),
+):
+    """
+    Quiz channel over server-sent events, for clients that cannot open a WebSocket.
+
+    Authenticate with a Bearer header or ?token= (EventSource cannot send
+    headers). The first event is "ready" with a channel_id; send messages
+    with POST /quiz/events/{channel_id} and read the replies from this
+    stream. Each event is one JSON message in a data line.
+    """
+    channel = await open_channel(token or (credentials.credentials if credentials else None), "sse")
+
+    async def stream():
+        try:
+            yield _sse(channel.ready())
+            while True:
+                try:
+                    message = await asyncio.wait_for(channel.outbox.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield _sse(message)
+        finally:
+            quiz_channels.closed(channel)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/events/{channel_id}", status_code=status.HTTP_202_ACCEPTED)
+async def send_quiz_event(channel_id: str, message: Dict[str, Any] = Body(...)):
+    """
+    Send a message on an event-stream channel; replies arrive on the stream.
+
+    The unguessable channel_id stands in for the access token, so a message
+    costs no token decoding or user lookup.
+    """
+    channel = quiz_channels.stream(channel_id)
+    if channel is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown or closed channel; reconnect to /quiz/events",
+        )
+    # One message at a time per channel, so replies keep their order
+    async with channel.lock:
+        async for reply in channel.handle(message):
+            await channel.outbox.put(reply)
+        if channel.expired:
+            await channel.outbox.put(None)
+    return {"accepted": True}
+
+
+def _parse(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def _question(question: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "question", **QuestionResponse.model_validate(question).model_dump(mode="json")}
+
+
+def _error(status_code: int, detail: Any) -> Dict[str, Any]:
+    return {"type": "error", "status": status_code, "detail": detail}
+
+
+def _with_ref(reply: Dict[str, Any], ref: Any) -> Dict[str, Any]:
+    return {**reply, "ref": ref} if ref is not None else reply
+
+
+def _sse(message: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(message)}\n\n"
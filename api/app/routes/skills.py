@@ -1,13 +1,11 @@
 """Skills and content endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, status
 from typing import List, Dict
 
-from app.database import get_db
-from app.models import Skill
 from app.schemas import SkillResponse, SkillListResponse, ExplainerResponse
 from app.auth import get_current_user
+from app.services.skill_catalog import skill_catalog
 
 router = APIRouter(prefix="/skills", tags=["Skills"])
 
@@ -15,7 +13,6 @@ router = APIRouter(prefix="/skills", tags=["Skills"])
 @router.get("", response_model=SkillListResponse)
 def list_skills(
     subject: str = None,
-    db: Session = Depends(get_db),
 ):
     """
     List all available skills, optionally filtered by subject.
@@ -23,27 +20,25 @@ def list_skills(
     Query params:
     - subject: Filter by subject (e.g., "Algebra I", "Pre-Algebra")
     """
-    query = db.query(Skill)
+    catalog = skill_catalog.current
 
     if subject:
-        query = query.filter(Skill.subject == subject)
+        skills = catalog.by_subject(subject)
+    else:
+        skills = catalog.skills
 
-    skills = query.all()
-
-    return {"skills": skills, "total": len(skills)}
+    return {"skills": [skill._asdict() for skill in skills], "total": len(skills)}
 
 
 @router.get("/subjects", response_model=Dict[str, List[SkillResponse]])
-def get_skills_by_subject(db: Session = Depends(get_db)):
+def get_skills_by_subject():
     """Get all skills grouped by subject."""
-    skills = db.query(Skill).order_by(Skill.subject, Skill.name).all()
+    catalog = skill_catalog.current
 
+    # Subjects in curriculum order, skills by name within each
     grouped = {}
-    for skill in skills:
-        if skill.subject not in grouped:
-            grouped[skill.subject] = []
-
-        grouped[skill.subject].append(
+    for subject in catalog.subjects:
+        grouped[subject] = [
             SkillResponse(
                 id=skill.id,
                 slug=skill.slug,
@@ -54,7 +49,8 @@ def get_skills_by_subject(db: Session = Depends(get_db)):
                 difficulty_base=skill.difficulty_base,
                 explanation=None,  # Don't include full explanation in list
             )
-        )
+            for skill in sorted(catalog.by_subject(subject), key=lambda s: s.name)
+        ]
 
     return grouped
 
@@ -62,10 +58,9 @@ def get_skills_by_subject(db: Session = Depends(get_db)):
 @router.get("/{skill_id}", response_model=ExplainerResponse)
 def get_skill_explainer(
     skill_id: int,
-    db: Session = Depends(get_db),
 ):
     """Get detailed explanation and resources for a skill."""
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+    skill = skill_catalog.current.get(skill_id)
 
     if not skill:
         raise HTTPException(
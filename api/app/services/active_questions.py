@@ -0,0 +1,63 @@
+"""Bounded store for questions that have been served but not answered yet."""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence
+
+from app.database import get_settings
+from app.generators.question import QuestionMeta
+from app.services.state import StateBackend, create_backend
+
+
+class ActiveQuestionStore:
+    """
+    QuestionMeta records keyed by question_id, with a TTL (and a size cap in memory).
+
+    A question nobody answers would otherwise be kept forever, so entries
+    expire ttl after their created_at. Storage is a StateBackend: with the
+    memory backend the least recently used question is evicted once the
+    store holds capacity entries; with the sqlite or redis backend every
+    worker sees the same questions, so an answer can land on any worker.
+    """
+
+    def __init__(self, backend: StateBackend):
+        self.backend = backend
+        self.ttl = backend.ttl
+
+    def put(self, question: QuestionMeta) -> None:
+        """Store a served question under its question_id."""
+        ttl = self.ttl
+        if question.created_at is not None:
+            ttl -= datetime.utcnow() - question.created_at
+        self.backend.set(question.question_id, question, ttl)
+
+    def get(self, question_id: str) -> Optional[QuestionMeta]:
+        """The live question for question_id, or None if unknown or expired."""
+        return self.backend.get(question_id)
+
+    def get_many(self, question_ids: Sequence[str]) -> Dict[str, QuestionMeta]:
+        """Live questions for several question_ids in one backend read (unknown or expired ones left out)."""
+        return self.backend.get_many(question_ids)
+
+    def pop(self, question_id: str) -> Optional[QuestionMeta]:
+        """Remove and return a question (once it has been answered)."""
+        return self.backend.pop(question_id)
+
+    def discard_many(self, question_ids: Sequence[str]) -> None:
+        """Remove several answered questions in one backend write."""
+        self.backend.delete_many(question_ids)
+
+    def __contains__(self, question_id: object) -> bool:
+        return self.get(question_id) is not None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of backend hit/miss counts (plus size, evictions and expirations in memory)."""
+        return self.backend.metrics()
+
+
+# Process-wide store used by the question routes
+_settings = get_settings()
+active_questions = ActiveQuestionStore(create_backend(
+    "active_questions",
+    ttl=timedelta(minutes=_settings.active_question_ttl_minutes),
+    capacity=_settings.active_question_capacity,
+))
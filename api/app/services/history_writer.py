@@ -0,0 +1,310 @@
+"""Write-behind buffer that records answer attempts in batches."""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, get_settings
+from app.learning.mastery import record_attempts
+from app.models import QuestionHistory
+
+logger = logging.getLogger(__name__)
+
+MODES = ("sync", "group", "async")
+
+# Queued after the last entry by stop(); the worker flushes and exits on it
+_STOP = object()
+
+
+class PendingWrite:
+    """Handle for attempts handed to HistoryWriter.record."""
+
+    def __init__(self, attempts: Sequence[QuestionHistory], wait: bool, timeout: float = 10.0):
+        self.attempts = attempts
+        self.queued_at = time.perf_counter()
+        self._wait = wait
+        self._timeout = timeout
+        self._done = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def resolve(self, error: Optional[BaseException] = None) -> None:
+        self._error = error
+        self._done.set()
+
+    def wait(self) -> None:
+        """
+        Block until the attempts are committed (group mode only).
+
+        Raises:
+            TimeoutError: If the writer has not committed them within the timeout
+            Exception: Whatever writing them failed with
+        """
+        if not self._wait:
+            return
+        if not self._done.wait(self._timeout):
+            raise TimeoutError(f"Answer was not written within {self._timeout:.0f}s")
+        if self._error is not None:
+            raise self._error
+
+
+class HistoryWriter:
+    """
+    Records answer attempts (question_history rows and mastery) in one of three modes.
+
+    * sync: record_attempts runs in the caller's transaction; the answer
+      commits it, one commit (and fsync) per answer. The default.
+    * group: attempts go into a bounded queue; a background writer records
+      up to batch_size rows per transaction, flushing at most flush_ms
+      after the first row arrived. Each answer waits for its batch to
+      commit, so the response still means "stored", but concurrent
+      answers share one commit.
+    * async: as group, but answers return as soon as they are queued.
+      Up to one batch can be lost if the process dies, and the next
+      question may be picked before the answer's batch commits. On
+      PostgreSQL the batch commits with synchronous_commit off.
+
+    History rows and their mastery updates are always written in the same
+    transaction (record_attempts), so user_mastery never counts attempts
+    that question_history does not hold. When the queue is full, or while
+    the writer is not running (before start(), after stop(), or if its
+    thread died), attempts are recorded inline as in sync mode. stop()
+    drains the queue; a group-mode answer waits at most wait_seconds.
+    """
+
+    def __init__(
+        self,
+        mode: str = "sync",
+        batch_size: int = 200,
+        flush_ms: int = 20,
+        queue_size: int = 10_000,
+        wait_seconds: float = 10.0,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown HISTORY_WRITE_MODE {mode!r}; expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.wait_seconds = wait_seconds
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._on_flush: Optional[Callable[[Set[int]], None]] = None
+
+        # Metrics
+        self._inline = 0
+        self._overflow = 0
+        self._flushes = 0
+        self._entries = 0
+        self._rows = 0
+        self._max_batch = 0
+        self._failed_rows = 0
+        self._flush_time_total = 0.0
+        self._last_flush_time = 0.0
+        self._latency_total = 0.0
+
+    @property
+    def deferred(self) -> bool:
+        """Whether attempts are written by the background writer."""
+        return self.mode != "sync"
+
+    def record(self, attempts: Sequence[QuestionHistory], db: Session) -> PendingWrite:
+        """
+        Record attempts (oldest first) according to the mode.
+
+        Inline writes go into db's transaction, so commit db before calling
+        wait() on the result.
+        """
+        pending = PendingWrite(attempts, wait=self.mode == "group", timeout=self.wait_seconds)
+        if self.deferred:
+            # Under the lock, so nothing is queued behind stop()'s _STOP
+            with self._lock:
+                if self._running():
+                    try:
+                        self._queue.put_nowait(pending)
+                        return pending
+                    except queue.Full:
+                        self._overflow += 1
+
+        record_attempts(attempts, db)
+        with self._lock:
+            self._inline += 1
+        pending.resolve()
+        return pending
+
+    def start(self, on_flush: Optional[Callable[[Set[int]], None]] = None) -> None:
+        """
+        Start the background writer (idempotent; no-op in sync mode).
+
+        Args:
+            on_flush: Called with the user ids of every committed batch
+        """
+        self._on_flush = on_flush
+        if not self.deferred or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def _running(self) -> bool:
+        return not self._stopping and self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything queued so far and stop the writer; later answers are recorded inline."""
+        thread = self._thread
+        if thread is None:
+            return
+        with self._lock:
+            self._stopping = True
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("History writer did not drain within %.0fs; %d entries left", timeout, self._queue.qsize())
+        self._thread = None
+
+    def _run(self) -> None:
+        # One session for the writer's lifetime, so a flush never waits for a
+        # pooled connection behind the requests it is flushing for
+        db: Optional[Session] = None
+        try:
+            db = SessionLocal()
+            self._drain(db)
+        except Exception:
+            logger.exception("History writer stopped unexpectedly; recording answers inline from now on")
+        finally:
+            self._write_leftovers(db)
+            if db is not None:
+                db.close()
+
+    def _write_leftovers(self, db: Optional[Session]) -> None:
+        """Record (or fail) whatever is still queued once the writer loop has ended."""
+        leftovers: List[PendingWrite] = []
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not _STOP:
+                leftovers.append(entry)
+        if not leftovers:
+            return
+        if db is None:
+            error = RuntimeError("History writer could not open a database session")
+            logger.error("Could not write %d queued answers: %s", len(leftovers), error)
+            for entry in leftovers:
+                entry.resolve(error)
+            return
+        self._flush(leftovers, db)
+
+    def _drain(self, db: Session) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch: List[PendingWrite] = [first]
+            rows = len(first.attempts)
+            deadline = time.perf_counter() + self.flush_interval
+            while rows < self.batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+                rows += len(entry.attempts)
+            self._flush(batch, db)
+
+    def _flush(self, batch: List[PendingWrite], db: Session) -> None:
+        """Record a batch in one transaction; if that fails, entry by entry."""
+        started = time.perf_counter()
+        failed: Dict[int, BaseException] = {}
+        try:
+            self._begin(db)
+            record_attempts([attempt for entry in batch for attempt in entry.attempts], db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Writing a batch of %d answers failed; retrying them one by one", len(batch))
+            for position, entry in enumerate(batch):
+                try:
+                    self._begin(db)
+                    record_attempts(entry.attempts, db)
+                    db.commit()
+                except Exception as exc:
+                    db.rollback()
+                    failed[position] = exc
+
+        finished = time.perf_counter()
+        rows = sum(len(entry.attempts) for entry in batch)
+        with self._lock:
+            self._flushes += 1
+            self._entries += len(batch)
+            self._rows += rows
+            self._max_batch = max(self._max_batch, rows)
+            self._failed_rows += sum(len(batch[position].attempts) for position in failed)
+            self._last_flush_time = finished - started
+            self._flush_time_total += self._last_flush_time
+            self._latency_total += sum(finished - entry.queued_at for entry in batch)
+
+        for position, exc in failed.items():
+            logger.error("Could not write %d attempts: %s", len(batch[position].attempts), exc)
+        for position, entry in enumerate(batch):
+            entry.resolve(failed.get(position))
+
+        if self._on_flush is not None:
+            written = {
+                attempt.user_id
+                for position, entry in enumerate(batch)
+                if position not in failed
+                for attempt in entry.attempts
+            }
+            try:
+                self._on_flush(written)
+            except Exception:
+                logger.exception("History writer flush callback failed")
+
+    def _begin(self, db: Session) -> None:
+        # Nobody waits on an async batch, so it need not wait for the WAL flush either
+        if self.mode == "async" and db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SET LOCAL synchronous_commit TO OFF"))
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of batch sizes, flush times and queue depth."""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "batch_size": self.batch_size,
+                "flush_ms": round(self.flush_interval * 1000, 2),
+                "queued": self._queue.qsize(),
+                "inline_writes": self._inline,
+                "overflow_writes": self._overflow,
+                "flushes": self._flushes,
+                "rows_flushed": self._rows,
+                "avg_batch_rows": round(self._rows / self._flushes, 2) if self._flushes else 0.0,
+                "max_batch_rows": self._max_batch,
+                "failed_rows": self._failed_rows,
+                "avg_flush_ms": round(self._flush_time_total / self._flushes * 1000, 2) if self._flushes else 0.0,
+                "last_flush_ms": round(self._last_flush_time * 1000, 2),
+                "avg_queue_to_commit_ms": round(self._latency_total / self._entries * 1000, 2) if self._entries else 0.0,
+            }
+
+
+# Process-wide writer used by the answer routes
+_settings = get_settings()
+history_writer = HistoryWriter(
+    mode=_settings.history_write_mode,
+    batch_size=_settings.history_write_batch_size,
+    flush_ms=_settings.history_write_flush_ms,
+    queue_size=_settings.history_write_queue_size,
+    wait_seconds=_settings.history_write_wait_seconds,
+)
@@ -0,0 +1,229 @@
+"""Per-user next-question prefetch cache filled by a background worker."""
+
+import logging
+import queue
+import secrets
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, get_settings
+from app.services.state import StateBackend, create_backend
+
+logger = logging.getLogger(__name__)
+
+# Picks the next question for a user without issuing it: (user_id, db) -> prepared question
+Selector = Callable[[int, Session], Any]
+
+# How long a user's generation is kept after their last invalidation; it
+# must outlast any slot or selection started before that invalidation
+GENERATION_TTL = timedelta(hours=1)
+
+
+class NextQuestionCache:
+    """
+    One prepared next question per user, keyed by user_id, with a TTL.
+
+    With NEXT_QUESTION_PREFETCH enabled, logging in and answering a
+    question ask for the user's next question to be prepared. A background
+    worker runs the adaptive selection (select_next_skill, difficulty,
+    template, question) for each requested user and leaves the result in
+    their slot, so GET /questions/next only pops the slot and issues the
+    question ID; a question that is never served is never issued. On a
+    miss (not prepared yet, expired or invalidated) the route selects inline.
+
+    An answer changes the user's mastery, which the prepared choice was
+    based on, so it invalidates the slot before requesting a new one. Each
+    invalidation gives the user a new generation (a random token kept in
+    the backend next to the slot, so every process sees it). A slot holds
+    the generation its selection started under, and take discards it when
+    the user has been invalidated since, even if it was stored after the
+    invalidation or by another process.
+    """
+
+    def __init__(self, backend: StateBackend, enabled: bool = False, queue_size: int = 10_000):
+        self.backend = backend
+        self.enabled = enabled
+        self.ttl = backend.ttl
+
+        self._queue: "queue.Queue[int]" = queue.Queue(maxsize=queue_size)
+        self._pending: set = set()
+        self._preparing: set = set()
+        self._lock = threading.Lock()
+        # Notified whenever the worker finishes a user (see take's timeout)
+        self._finished = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._selector: Optional[Selector] = None
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._prepared = 0
+        self._invalidated = 0
+        self._discarded = 0
+        self._dropped = 0
+        self._errors = 0
+        self._served_age_total = 0.0
+        self._max_served_age = 0.0
+        self._last_prepare_time = 0.0
+
+    def request(self, user_id: int) -> None:
+        """Queue a user for the worker (no-op if disabled or already queued)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if user_id in self._pending:
+                return
+            self._pending.add(user_id)
+        try:
+            self._queue.put_nowait(user_id)
+        except queue.Full:
+            with self._lock:
+                self._pending.discard(user_id)
+                self._dropped += 1
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's prepared question and any selection already running for them."""
+        if not self.enabled:
+            return
+        self.backend.set(_generation_key(user_id), secrets.token_hex(8), max(GENERATION_TTL, self.ttl))
+        self.backend.delete(str(user_id))
+        with self._lock:
+            self._invalidated += 1
+
+    def refresh(self, user_ids: Iterable[int]) -> None:
+        """Invalidate and re-request users whose mastery changed after their answer was handled."""
+        for user_id in user_ids:
+            self.invalidate(user_id)
+            self.request(user_id)
+
+    def take(self, user_id: int, timeout: float = 0.0) -> Optional[Any]:
+        """
+        Empty a user's slot and return the question it held, if any.
+
+        Args:
+            user_id: User ID
+            timeout: Seconds to wait for a preparation this process's worker
+                has queued or is running for the user, if the slot is empty
+        """
+        if not self.enabled:
+            return None
+        entry = self.backend.pop(str(user_id))
+        deadline = time.monotonic() + timeout
+        while entry is None and timeout > 0:
+            with self._lock:
+                # Stored before the worker lets go of the user, so one more pop after it has suffices
+                busy = user_id in self._pending or user_id in self._preparing
+                remaining = deadline - time.monotonic()
+                if busy and remaining > 0:
+                    self._finished.wait(remaining)
+            entry = self.backend.pop(str(user_id))
+            if not busy or remaining <= 0:
+                break
+        if entry is not None and entry[1] != self.generation(user_id):
+            with self._lock:
+                self._discarded += 1
+            entry = None
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            prepared_at, _, question = entry
+            age = max(0.0, time.time() - prepared_at)
+            self._hits += 1
+            self._served_age_total += age
+            self._max_served_age = max(self._max_served_age, age)
+        return question
+
+    def generation(self, user_id: int) -> Optional[str]:
+        """A user's current generation (None until they are first invalidated)."""
+        return self.backend.get(_generation_key(user_id))
+
+    def prepare(self, user_id: int, db: Session) -> bool:
+        """
+        Select a user's next question into their slot.
+
+        Returns:
+            Whether it was stored (False if the user was invalidated meanwhile)
+        """
+        started = time.perf_counter()
+        generation = self.generation(user_id)
+        question = self._selector(user_id, db)
+        with self._lock:
+            self._last_prepare_time = time.perf_counter() - started
+        # Saves a write; take rechecks, as an invalidation can land right after this
+        if self.generation(user_id) != generation:
+            with self._lock:
+                self._discarded += 1
+            return False
+        self.backend.set(str(user_id), (time.time(), generation, question))
+        with self._lock:
+            self._prepared += 1
+        return True
+
+    def start(self, selector: Selector) -> None:
+        """Start the background worker (idempotent)."""
+        self._selector = selector
+        if not self.enabled or (self._thread is not None and self._thread.is_alive()):
+            return
+
+        def prepare_loop():
+            while True:
+                user_id = self._queue.get()
+                with self._lock:
+                    self._pending.discard(user_id)
+                    self._preparing.add(user_id)
+                db = SessionLocal()
+                try:
+                    self.prepare(user_id, db)
+                except Exception as exc:
+                    # HTTPException when there is nothing to select; the route reports it
+                    if getattr(exc, "status_code", None) is None:
+                        logger.exception("Preparing the next question for user %s failed", user_id)
+                    with self._lock:
+                        self._errors += 1
+                finally:
+                    db.close()
+                    with self._lock:
+                        self._preparing.discard(user_id)
+                        self._finished.notify_all()
+
+        self._thread = threading.Thread(target=prepare_loop, name="next-questions", daemon=True)
+        self._thread.start()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of hit/miss counts, served-question age and invalidations."""
+        with self._lock:
+            takes = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / takes, 4) if takes else 0.0,
+                "prepared": self._prepared,
+                "invalidated": self._invalidated,
+                "discarded_stale": self._discarded,
+                "dropped": self._dropped,
+                "errors": self._errors,
+                "queued": self._queue.qsize(),
+                "ttl_seconds": int(self.ttl.total_seconds()),
+                "avg_served_age_ms": round(self._served_age_total / self._hits * 1000, 2) if self._hits else 0.0,
+                "max_served_age_ms": round(self._max_served_age * 1000, 2),
+                "last_prepare_ms": round(self._last_prepare_time * 1000, 2),
+                "backend": self.backend.metrics(),
+            }
+
+
+def _generation_key(user_id: int) -> str:
+    return f"generation:{user_id}"
+
+
+# Process-wide cache used by the question and auth routes
+_settings = get_settings()
+next_questions = NextQuestionCache(
+    create_backend("next_questions", ttl=timedelta(seconds=_settings.next_question_prefetch_ttl_seconds)),
+    enabled=_settings.next_question_prefetch,
+)
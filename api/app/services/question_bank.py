@@ -0,0 +1,236 @@
+"""Memory-mapped question banks compiled offline by compile_question_bank.py."""
+
+import json
+import logging
+import mmap
+import os
+import random
+import struct
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.database import get_settings
+from app.generators import generate_batch, generate_question
+from app.generators.question import GeneratedQuestion
+from app.generators.rng import get_rng, new_seed
+from app.generators.steps import LazySteps, render_steps
+
+logger = logging.getLogger(__name__)
+
+BankKey = Tuple[str, int]
+
+# File layout (little-endian):
+#   header | per section: record texts, then its record table | directory (JSON)
+MAGIC = b"SBQB"
+VERSION = 2
+# magic, version, directory offset, directory length
+HEADER = struct.Struct("<4sIQQ")
+# seed (64-bit for packed vectorized seeds), text offset, question / answer / steps byte lengths
+RECORD = struct.Struct("<QQIII")
+
+
+class QuestionBank:
+    """
+    Read-only view of a compiled question bank.
+
+    The file is memory-mapped, so every worker process that opens the same
+    bank shares its pages through the OS page cache. Each record holds the
+    question text, the canonical answer, the seed it was generated from and
+    a pointer to its steps, which are only decoded when read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f"{path} is not a question bank")
+        magic, version, dir_offset, dir_length = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a question bank")
+        if version != VERSION:
+            raise ValueError(f"Unsupported question bank version {version} in {path}")
+
+        directory = json.loads(self._mm[dir_offset:dir_offset + dir_length])
+        self.created_at: Optional[str] = directory.get("created_at")
+        self._sections: Dict[BankKey, Tuple[int, int]] = {}
+        for name, section in directory["sections"].items():
+            template_type, difficulty = name.rsplit(":", 1)
+            self._sections[(template_type, int(difficulty))] = (section["offset"], section["count"])
+
+    def __contains__(self, key: object) -> bool:
+        section = self._sections.get(key)
+        return section is not None and section[1] > 0
+
+    def keys(self) -> List[BankKey]:
+        """(template_type, difficulty) pairs in the bank."""
+        return list(self._sections)
+
+    def count(self, template_type: str, difficulty: int) -> int:
+        """Number of questions stored for a template type and difficulty."""
+        section = self._sections.get((template_type, difficulty))
+        return section[1] if section else 0
+
+    def get(self, template_type: str, difficulty: int, index: int) -> GeneratedQuestion:
+        """
+        Read one question by its index within (template_type, difficulty).
+
+        Returns:
+            GeneratedQuestion like a generator's output, with its seed and
+            bank_index set
+        """
+        offset, count = self._sections[(template_type, difficulty)]
+        if not 0 <= index < count:
+            raise IndexError(f"Question index {index} out of range for {template_type}:{difficulty}")
+
+        seed, text_offset, question_len, answer_len, steps_len = RECORD.unpack_from(
+            self._mm, offset + index * RECORD.size
+        )
+        answer_offset = text_offset + question_len
+        steps_offset = answer_offset + answer_len
+        return GeneratedQuestion(
+            question=self._mm[text_offset:answer_offset].decode(),
+            answer=self._mm[answer_offset:steps_offset].decode(),
+            steps=LazySteps(self._read_steps, steps_offset, steps_len),
+            difficulty=difficulty,
+            seed=seed,
+            bank_index=index,
+        )
+
+    def sample(
+        self,
+        template_type: str,
+        difficulty: int,
+        rng: Optional[random.Random] = None,
+    ) -> GeneratedQuestion:
+        """Read a uniformly random question for a template type and difficulty."""
+        count = self.count(template_type, difficulty)
+        if not count:
+            raise KeyError((template_type, difficulty))
+        return self.get(template_type, difficulty, get_rng(rng).randrange(count))
+
+    def close(self) -> None:
+        """Unmap the bank file."""
+        self._mm.close()
+
+    def _read_steps(self, offset: int, length: int) -> List[str]:
+        return json.loads(self._mm[offset:offset + length])
+
+
+def compile_bank(
+    path: str,
+    keys: Iterable[BankKey],
+    count: int,
+    seed: Optional[int] = None,
+    progress: Optional[Callable[[BankKey, int, int], None]] = None,
+    vectorized: bool = False,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Generate questions and write them to a bank file.
+
+    The bank is written to a temporary file and moved into place at the
+    end, so processes still mapping an older bank at path keep reading it.
+
+    Args:
+        path: Output file
+        keys: (template_type, difficulty) pairs to generate
+        count: Questions to generate per pair
+        seed: Seed for the RNG that draws the question seeds
+        progress: Called as progress(key, stored, failed) after each pair
+        vectorized: Generate each pair as one vectorized batch where the
+            template type supports it (see generate_batch())
+
+    Returns:
+        Per-section stored/failed counts, keyed "template_type:difficulty"
+    """
+    if count < 0:
+        raise ValueError(f"Question count must be non-negative, got {count}")
+
+    rng = random.Random(seed)
+    sections: Dict[str, Dict[str, int]] = {}
+    summary: Dict[str, Dict[str, int]] = {}
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+        position = HEADER.size
+
+        for template_type, difficulty in keys:
+            table = bytearray()
+            failed = 0
+            for question in _bank_questions(template_type, difficulty, count, rng, vectorized):
+                if question is None:
+                    failed += 1
+                    continue
+
+                question_bytes = question.question.encode()
+                answer_bytes = str(question.answer).encode()
+                steps_bytes = json.dumps(render_steps(question), ensure_ascii=False).encode()
+                table += RECORD.pack(
+                    question.seed, position, len(question_bytes), len(answer_bytes), len(steps_bytes)
+                )
+                f.write(question_bytes)
+                f.write(answer_bytes)
+                f.write(steps_bytes)
+                position += len(question_bytes) + len(answer_bytes) + len(steps_bytes)
+
+            stored = len(table) // RECORD.size
+            name = f"{template_type}:{difficulty}"
+            sections[name] = {"offset": position, "count": stored}
+            summary[name] = {"stored": stored, "failed": failed}
+            f.write(table)
+            position += len(table)
+            if progress is not None:
+                progress((template_type, difficulty), stored, failed)
+
+        directory = json.dumps({
+            "created_at": datetime.utcnow().isoformat(),
+            "seed": seed,
+            "sections": sections,
+        }).encode()
+        f.write(directory)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, position, len(directory)))
+
+    os.replace(tmp_path, path)
+    return summary
+
+
+def _bank_questions(
+    template_type: str,
+    difficulty: int,
+    count: int,
+    rng: random.Random,
+    vectorized: bool,
+) -> Iterable[Optional[GeneratedQuestion]]:
+    """Questions for one bank section, with None for each one that failed to generate."""
+    from app.generators import vectorized as backend
+
+    if vectorized and backend.supports(template_type, difficulty):
+        try:
+            yield from generate_batch(template_type, difficulty, count, seed=new_seed(rng), vectorized=True)
+            return
+        except Exception:
+            logger.exception("Vectorized batch failed for %s:%s, generating one at a time", template_type, difficulty)
+
+    for _ in range(count):
+        try:
+            yield generate_question(template_type, difficulty, new_seed(rng))
+        except Exception:
+            yield None
+
+
+def load_question_bank(path: str) -> Optional[QuestionBank]:
+    """Open the bank at path, or return None if unset or unreadable."""
+    if not path:
+        return None
+    try:
+        return QuestionBank(path)
+    except (OSError, ValueError):
+        logger.exception("Could not open question bank %s, generating questions instead", path)
+        return None
+
+
+# Process-wide bank (None unless QUESTION_BANK_PATH points at a compiled bank)
+question_bank = load_question_bank(get_settings().question_bank_path)
@@ -0,0 +1,270 @@
+"""Pre-generated question pools refilled by a background worker."""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from app.database import get_settings
+from app.generators import generate_batch, generate_question
+from app.generators.question import GeneratedQuestion
+from app.services.question_bank import QuestionBank, question_bank
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, int]
+
+
+class QuestionPool:
+    """
+    Bounded rings of ready-made questions per (template_type, difficulty).
+
+    Requests take a question from the matching ring. When a ring runs low a
+    background worker tops it back up with generate_batch(), so the request
+    path only pays generator cost on a miss (empty ring).
+
+    Keys covered by a compiled QuestionBank are served straight from the
+    bank and never get a ring. With vectorized=True, refills use the
+    vectorized backend for the template types that have one.
+
+    Generators that raise are tolerated per key: when a batch fails the
+    refill retries one question at a time, and after max_failures failed
+    batches in a row the key is only refilled one at a time. A refill that
+    produces nothing backs the key off (refill_interval, doubling), and
+    after max_failures of those the key is no longer refilled; its
+    requests generate inline. Each of these logs one warning.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 50,
+        low_watermark: int = 10,
+        refill_interval: float = 5.0,
+        bank: Optional[QuestionBank] = None,
+        vectorized: bool = False,
+        max_failures: int = 3,
+    ):
+        self.capacity = capacity
+        self.low_watermark = low_watermark
+        self.refill_interval = refill_interval
+        self.bank = bank
+        self.vectorized = vectorized
+        self.max_failures = max_failures
+
+        self._rings: Dict[PoolKey, Deque[GeneratedQuestion]] = {}
+        self._low_since: Dict[PoolKey, float] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Consecutive failures per key: batches that raised, refills that produced nothing
+        self._batch_failures: Dict[PoolKey, int] = {}
+        self._empty_refills: Dict[PoolKey, int] = {}
+        self._retry_at: Dict[PoolKey, float] = {}
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._bank_hits = 0
+        self._generated = 0
+        self._refill_errors = 0
+        self._last_refill_lag = 0.0
+        self._max_refill_lag = 0.0
+
+    def register(self, keys: Iterable[PoolKey]) -> None:
+        """Create empty rings for the given keys so the worker fills them."""
+        with self._lock:
+            for key in keys:
+                if not self._in_bank(key):
+                    self._ensure_ring(key)
+        self._wakeup.set()
+
+    def take(self, template_type: str, difficulty: int) -> GeneratedQuestion:
+        """
+        Take a question from the pool, generating inline on a miss.
+
+        Args:
+            template_type: Registered generator name
+            difficulty: Difficulty level
+
+        Returns:
+            Compact GeneratedQuestion: the question text, its answer and the
+            seed it can be regenerated from, plus its bank_index when served
+            from the question bank
+        """
+        key = (template_type, difficulty)
+        if self._in_bank(key):
+            with self._lock:
+                self._bank_hits += 1
+            return self.bank.sample(template_type, difficulty).compact()
+
+        with self._lock:
+            ring = self._ensure_ring(key)
+            question = ring.popleft() if ring else None
+            if question is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+            if len(ring) < self.low_watermark:
+                self._low_since.setdefault(key, time.monotonic())
+                self._wakeup.set()
+
+        if question is None:
+            question = generate_question(template_type, difficulty).compact()
+        return question
+
+    def resolve(
+        self,
+        template_type: str,
+        difficulty: int,
+        seed: int,
+        bank_index: Optional[int] = None,
+    ) -> GeneratedQuestion:
+        """
+        Full question (answer and steps included) for a question handed out by take().
+
+        Reads the bank record when the question came from the bank and the
+        record still matches its seed; otherwise regenerates from the seed.
+        """
+        if bank_index is not None and self._in_bank((template_type, difficulty)):
+            try:
+                question = self.bank.get(template_type, difficulty, bank_index)
+            except IndexError:
+                question = None
+            if question is not None and question.seed == seed:
+                return question
+        return generate_question(template_type, difficulty, seed)
+
+    def refill(self) -> None:
+        """Top up every ring that is below its low watermark."""
+        now = time.monotonic()
+        with self._lock:
+            pending = [
+                (key, self.capacity - len(ring))
+                for key, ring in self._rings.items()
+                if len(ring) < self.low_watermark and self._retry_at.get(key, 0.0) <= now
+            ]
+
+        for key, missing in pending:
+            batch = self._generate(key, missing)
+            with self._lock:
+                self._record_refill(key, bool(batch))
+                self._rings[key].extend(batch)
+                self._generated += len(batch)
+                low_since = self._low_since.pop(key, None)
+                if low_since is not None:
+                    lag = time.monotonic() - low_since
+                    self._last_refill_lag = lag
+                    self._max_refill_lag = max(self._max_refill_lag, lag)
+
+    def start(self) -> None:
+        """Start the background refill worker (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def refill_loop():
+            while True:
+                self._wakeup.wait(self.refill_interval)
+                self._wakeup.clear()
+                self.refill()
+
+        self._thread = threading.Thread(target=refill_loop, name="question-pool", daemon=True)
+        self._thread.start()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of pool hit/miss counts, refill lag, failing keys and ring sizes."""
+        now = time.monotonic()
+        with self._lock:
+            requests = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / requests, 4) if requests else 0.0,
+                "bank_hits": self._bank_hits,
+                "bank": self.bank.path if self.bank is not None else None,
+                "generated": self._generated,
+                "refill_errors": self._refill_errors,
+                "one_at_a_time": sorted(
+                    f"{template_type}:{difficulty}"
+                    for (template_type, difficulty), failures in self._batch_failures.items()
+                    if failures >= self.max_failures
+                ),
+                # Seconds until the next refill attempt, or "disabled"
+                "backed_off": {
+                    f"{template_type}:{difficulty}": (
+                        "disabled" if retry_at == float("inf") else round(max(0.0, retry_at - now), 1)
+                    )
+                    for (template_type, difficulty), retry_at in self._retry_at.items()
+                },
+                "last_refill_lag_ms": round(self._last_refill_lag * 1000, 2),
+                "max_refill_lag_ms": round(self._max_refill_lag * 1000, 2),
+                "capacity": self.capacity,
+                "pools": {
+                    f"{template_type}:{difficulty}": len(ring)
+                    for (template_type, difficulty), ring in self._rings.items()
+                },
+            }
+
+    def _generate(self, key: PoolKey, n: int) -> List[GeneratedQuestion]:
+        """Generate n questions for key, skipping any the generator fails on."""
+        template_type, difficulty = key
+        if self._batch_failures.get(key, 0) < self.max_failures:
+            try:
+                batch = [q.compact() for q in generate_batch(template_type, difficulty, n, vectorized=self.vectorized)]
+            except Exception as exc:
+                with self._lock:
+                    failures = self._batch_failures[key] = self._batch_failures.get(key, 0) + 1
+                if failures == 1:
+                    logger.warning("Batch refill failed for %s (%s: %s); retrying one at a time", key, type(exc).__name__, exc)
+                elif failures == self.max_failures:
+                    logger.warning("Batch refill failed %d times in a row for %s; refilling it one at a time", failures, key)
+            else:
+                with self._lock:
+                    self._batch_failures.pop(key, None)
+                return batch
+
+        batch = []
+        for _ in range(n):
+            try:
+                batch.append(generate_question(template_type, difficulty).compact())
+            except Exception:
+                with self._lock:
+                    self._refill_errors += 1
+        return batch
+
+    def _record_refill(self, key: PoolKey, produced: bool) -> None:
+        """Reset or extend key's run of empty refills and schedule its next one (caller holds lock)."""
+        if produced:
+            self._empty_refills.pop(key, None)
+            self._retry_at.pop(key, None)
+            return
+        failures = self._empty_refills[key] = self._empty_refills.get(key, 0) + 1
+        if failures >= self.max_failures:
+            self._retry_at[key] = float("inf")
+            logger.warning("No questions generated for %s in %d refills; no longer refilling it", key, failures)
+        else:
+            self._retry_at[key] = time.monotonic() + self.refill_interval * 2 ** (failures - 1)
+
+    def _in_bank(self, key: PoolKey) -> bool:
+        """Whether the question bank can serve key."""
+        return self.bank is not None and key in self.bank
+
+    def _ensure_ring(self, key: PoolKey) -> Deque[GeneratedQuestion]:
+        """Return the ring for key, creating it if needed (caller holds lock)."""
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = deque(maxlen=self.capacity)
+            self._rings[key] = ring
+            self._low_since[key] = time.monotonic()
+        return ring
+
+
+# Process-wide pool used by the question routes
+_settings = get_settings()
+question_pool = QuestionPool(
+    capacity=_settings.question_pool_size,
+    low_watermark=_settings.question_pool_low_watermark,
+    bank=question_bank,
+    vectorized=_settings.question_pool_vectorized,
+    max_failures=_settings.question_pool_max_failures,
+)
@@ -0,0 +1,132 @@
+"""Per-user filters that keep recently shown questions from repeating."""
+
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import get_settings
+from app.generators.question import GeneratedQuestion
+from app.models import UserSeenQuestions
+from app.services.question_pool import question_pool
+from app.utils.bloom import RotatingBloomFilter, fingerprint
+
+# Session.info key of the filters a session has loaded, by user id
+_SESSION_FILTERS = "seen_question_filters"
+
+
+class SeenQuestions:
+    """
+    Picks questions a user has (probably) not been shown yet.
+
+    Each user has a RotatingBloomFilter of question-text fingerprints,
+    stored as a few KB in user_seen_questions. A question whose fingerprint
+    is already in the filter is skipped and another one taken from the pool,
+    up to max_attempts; small-domain generators can run out of new
+    questions, in which case the last one is served anyway. Questions are
+    added to the filter when a route serves them (served()), not when
+    they are selected.
+    """
+
+    def __init__(self, enabled: bool = True, max_attempts: int = 4):
+        self.enabled = enabled
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._picks = 0
+        self._repeats_skipped = 0
+        self._repeats_served = 0
+
+    def take(self, user_id: int, template_type: str, difficulty: int, db: Session) -> GeneratedQuestion:
+        """
+        Take a question from the pool that this user has not seen.
+
+        The question is not remembered here: prepared questions may never
+        be shown, so the route that serves one calls served().
+
+        Args:
+            user_id: User the question is for
+            template_type: Registered generator name
+            difficulty: Difficulty level
+            db: Database session (the filter is read once per session)
+
+        Returns:
+            Question as returned by QuestionPool.take()
+        """
+        if not self.enabled:
+            return question_pool.take(template_type, difficulty)
+
+        _, seen = self._load(user_id, db)
+
+        skipped = 0
+        repeated = True
+        for _ in range(self.max_attempts):
+            question = question_pool.take(template_type, difficulty)
+            if fingerprint(question.question) not in seen:
+                repeated = False
+                break
+            skipped += 1
+
+        with self._lock:
+            self._picks += 1
+            self._repeats_skipped += skipped
+            if repeated:
+                self._repeats_served += 1
+        return question
+
+    def served(self, user_id: int, questions: Iterable[str], db: Session) -> None:
+        """
+        Remember question texts shown to a user, in db's transaction.
+
+        The filter is kept per session and only serialized onto its row, so
+        however many questions a request serves, committing db writes the
+        row once. Later take() calls on the same session already skip them.
+        """
+        if not self.enabled:
+            return
+        row, seen = self._load(user_id, db)
+        for text in questions:
+            seen.add(fingerprint(text))
+        data = seen.to_bytes()
+        if row is not None:
+            row.filter_data = data
+            return
+
+        row = UserSeenQuestions(user_id=user_id, filter_data=data)
+        try:
+            # A savepoint, so a lost race does not roll back the caller's work
+            with db.begin_nested():
+                db.add(row)
+        except IntegrityError:
+            # Another request created this user's filter first; ours replaces it
+            row = db.get(UserSeenQuestions, user_id)
+            row.filter_data = data
+        db.info[_SESSION_FILTERS][user_id] = (row, seen)
+
+    def _load(self, user_id: int, db: Session) -> Tuple[Optional[UserSeenQuestions], RotatingBloomFilter]:
+        """The user's row (None if they have none yet) and filter, cached on the session."""
+        filters = db.info.setdefault(_SESSION_FILTERS, {})
+        if user_id not in filters:
+            row = db.get(UserSeenQuestions, user_id)
+            filters[user_id] = (row, RotatingBloomFilter.from_bytes(row.filter_data) if row else RotatingBloomFilter())
+        return filters[user_id]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of how often repeats were skipped or had to be served."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "picks": self._picks,
+                "repeats_skipped": self._repeats_skipped,
+                "repeats_served": self._repeats_served,
+                "repeat_rate": round(self._repeats_served / self._picks, 4) if self._picks else 0.0,
+            }
+
+
+_settings = get_settings()
+seen_questions = SeenQuestions(
+    enabled=_settings.question_dedup_enabled,
+    max_attempts=_settings.question_dedup_attempts,
+)
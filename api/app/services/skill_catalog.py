@@ -0,0 +1,117 @@
+"""In-memory catalog of skills and their prerequisites, read without database access."""
+
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models import Skill, SkillPrerequisite
+from app.services.snapshot import SnapshotCache, content_versions
+
+# Subjects in the order they are taught; others follow alphabetically
+CURRICULUM_ORDER = ("Pre-Algebra", "Algebra Basics", "Algebra I", "Algebra II", "Trigonometry", "Precalculus")
+
+
+class SkillInfo(NamedTuple):
+    """The columns of a Skill row."""
+
+    id: int
+    slug: str
+    name: str
+    subject: str
+    description: Optional[str]
+    khan_url: Optional[str]
+    youtube_id: Optional[str]
+    explanation: Optional[str]
+    difficulty_base: Optional[int]
+
+
+class SkillCatalog:
+    """
+    Immutable snapshot of the skills table and the prerequisite graph.
+
+    Lookups by id and slug are dict accesses, and skills come pre-grouped
+    by subject (subjects in CURRICULUM_ORDER, skills by id within each),
+    so routes and the adaptive engine never query skills per request.
+    A snapshot never changes; skill_catalog builds one at startup and
+    swaps in the next version on POST /admin/skill-catalog/reload, in
+    every worker.
+    """
+
+    def __init__(
+        self,
+        skills: Iterable[SkillInfo],
+        prerequisites: Iterable[Tuple[int, int]] = (),
+        version: int = 1,
+    ):
+        self.version = version
+        self.built_at = datetime.utcnow()
+
+        self.skills: Tuple[SkillInfo, ...] = tuple(sorted(skills, key=lambda s: s.id))
+        self._by_id: Dict[int, SkillInfo] = {skill.id: skill for skill in self.skills}
+        self._by_slug: Dict[str, SkillInfo] = {skill.slug: skill for skill in self.skills}
+
+        grouped: Dict[str, List[SkillInfo]] = {}
+        for skill in self.skills:
+            grouped.setdefault(skill.subject, []).append(skill)
+        known = [subject for subject in CURRICULUM_ORDER if subject in grouped]
+        others = sorted(subject for subject in grouped if subject not in CURRICULUM_ORDER)
+        self.subjects: Tuple[str, ...] = tuple(known + others)
+        self._by_subject: Dict[str, Tuple[SkillInfo, ...]] = {
+            subject: tuple(grouped[subject]) for subject in self.subjects
+        }
+
+        # prerequisite_id -> ids of the skills that depend on it
+        dependents: Dict[int, List[int]] = {}
+        for skill_id, prerequisite_id in sorted(prerequisites):
+            dependents.setdefault(prerequisite_id, []).append(skill_id)
+        self._dependents: Dict[int, Tuple[int, ...]] = {
+            prerequisite_id: tuple(skill_ids) for prerequisite_id, skill_ids in dependents.items()
+        }
+        self.prerequisite_ids: FrozenSet[int] = frozenset(self._dependents)
+
+    @classmethod
+    def load(cls, db: Session, version: int = 1) -> "SkillCatalog":
+        """Build a catalog from the skills and skill_prerequisites tables."""
+        rows = db.query(*(getattr(Skill, field) for field in SkillInfo._fields)).all()
+        prerequisites = db.query(SkillPrerequisite.skill_id, SkillPrerequisite.prerequisite_id).all()
+        return cls((SkillInfo(*row) for row in rows), [tuple(row) for row in prerequisites], version)
+
+    def get(self, skill_id: int) -> Optional[SkillInfo]:
+        """Skill by id."""
+        return self._by_id.get(skill_id)
+
+    def by_slug(self, slug: str) -> Optional[SkillInfo]:
+        """Skill by slug."""
+        return self._by_slug.get(slug)
+
+    def explanation(self, skill_id: int) -> Optional[str]:
+        """Explanation text of a skill (None if it has none or does not exist)."""
+        skill = self._by_id.get(skill_id)
+        return skill.explanation if skill else None
+
+    def first(self) -> Optional[SkillInfo]:
+        """Skill with the lowest id."""
+        return self.skills[0] if self.skills else None
+
+    def by_subject(self, subject: str) -> Tuple[SkillInfo, ...]:
+        """Skills of one subject, by id."""
+        return self._by_subject.get(subject, ())
+
+    def dependents_of(self, skill_id: int) -> List[SkillInfo]:
+        """Skills that list skill_id as a prerequisite."""
+        return [self._by_id[dependent] for dependent in self._dependents.get(skill_id, ()) if dependent in self._by_id]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "skills": len(self.skills),
+            "subjects": len(self.subjects),
+            "prerequisites": sum(len(skill_ids) for skill_ids in self._dependents.values()),
+        }
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+
+# Process-wide catalog used by the routes and the adaptive engine
+skill_catalog: SnapshotCache[SkillCatalog] = SnapshotCache("skill catalog", SkillCatalog.load, content_versions)
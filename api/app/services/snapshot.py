@@ -0,0 +1,139 @@
+"""Versioned, immutable snapshots of content tables, swapped atomically on reload."""
+
+import logging
+import secrets
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, get_settings
+from app.services.state import StateBackend, create_backend
+
+logger = logging.getLogger(__name__)
+
+# A snapshot has .version, .built_at and summary() -> dict
+S = TypeVar("S")
+
+# A published version outlives any deploy; if it still expires, every
+# worker reloads once and then agrees on "never published" again
+CONTENT_VERSION_TTL = timedelta(days=365)
+
+
+class SnapshotCache(Generic[S]):
+    """
+    Holds the current snapshot of a content table and swaps in a fresh one on reload.
+
+    Content (skills, question templates) only changes when seed_data.py or
+    add_templates.py run, so snapshots are built at startup and rebuilt on
+    an admin reload. Each worker process holds its own copy; publish()
+    stores a new content version in the shared state backend, and every
+    worker compares it with the version its snapshot was built for at most
+    once per check_interval seconds, reloading when they differ. Reloading
+    builds the next version completely before replacing the reference, so
+    a reader sees either the old snapshot or the new one, never a mix.
+    Readers should take .current once per request to stay on one version.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[Session, int], S],
+        versions: Optional[StateBackend] = None,
+        check_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self._loader = loader
+        self._versions = versions
+        if check_interval is None:
+            check_interval = get_settings().content_version_check_seconds
+        self.check_interval = check_interval
+        self._clock = clock
+        self._current: Optional[S] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[S], None]] = []
+        self._reloads = 0
+
+        # Shared version the current snapshot was built for, and when it was last compared
+        self._published: Optional[str] = None
+        self._checked_at = clock()
+
+    @property
+    def current(self) -> S:
+        """The current snapshot, loaded from the database on first use or after a publish."""
+        snapshot = self._current
+        if snapshot is None or self._outdated():
+            db = SessionLocal()
+            try:
+                snapshot = self.reload(db)
+            finally:
+                db.close()
+        return snapshot
+
+    def reload(self, db: Session) -> S:
+        """Build the next snapshot from the database and make it current."""
+        with self._lock:
+            # Read before loading: a publish that lands mid-load is picked up by the next check
+            published = self._read_published()
+            version = self._current.version + 1 if self._current is not None else 1
+            snapshot = self._loader(db, version)
+            self._current = snapshot
+            self._published = published
+            self._checked_at = self._clock()
+            self._reloads += 1
+        logger.info("Loaded %s v%d: %s", self.name, snapshot.version, snapshot.summary())
+        for listener in self._listeners:
+            listener(snapshot)
+        return snapshot
+
+    def publish(self, db: Session) -> S:
+        """Store a new shared content version, so every worker reloads, and reload this one now."""
+        if self._versions is not None:
+            self._versions.set(self.name, secrets.token_hex(8), CONTENT_VERSION_TTL)
+        return self.reload(db)
+
+    def add_listener(self, listener: Callable[[S], None]) -> None:
+        """Call listener with every snapshot this worker loads from now on."""
+        self._listeners.append(listener)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Version and build time of the current snapshot, plus its own summary."""
+        snapshot = self._current
+        metrics = {
+            "loaded": snapshot is not None,
+            "version": snapshot.version if snapshot is not None else 0,
+            "built_at": snapshot.built_at.isoformat() if snapshot is not None else None,
+            "reloads": self._reloads,
+            "published_version": self._published,
+            "check_interval_seconds": self.check_interval,
+        }
+        if snapshot is not None:
+            metrics.update(snapshot.summary())
+        return metrics
+
+    def _outdated(self) -> bool:
+        """Whether the shared version moved past this snapshot (checked once per interval)."""
+        if self._versions is None:
+            return False
+        now = self._clock()
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        return self._read_published() != self._published
+
+    def _read_published(self) -> Optional[str]:
+        if self._versions is None:
+            return None
+        try:
+            return self._versions.get(self.name)
+        except Exception:
+            # Keep serving the snapshot we have; the next check tries again
+            logger.warning("Could not read the published %s version", self.name, exc_info=True)
+            return self._published
+
+
+# Published content versions, shared by every worker's snapshot caches
+content_versions = create_backend("content_versions", ttl=CONTENT_VERSION_TTL, capacity=None)
@@ -0,0 +1,603 @@
+"""
+Key-value storage for request state that outlives a single request.
+
+Active practice questions and evaluation sessions are written by one
+request and read by the next, which may land on a different worker
+process. A StateBackend holds one namespace of that state, with a default
+TTL per entry, behind one of three implementations:
+
+* memory: a per-process LRU dict (single worker only)
+* sqlite: a WAL-mode SQLite file shared by the workers on one machine
+* redis: any server speaking the Redis protocol (MGET/SET PX NX/DEL/GETDEL)
+
+Reads and writes take batches (get_many, set_many, add_many, delete_many), each one
+a single statement or pipelined round trip, and the sqlite and redis
+backends reuse pooled connections. Values are stored as pickles outside
+the memory backend, so they must be picklable and the store must only be
+shared between trusted workers.
+"""
+
+import heapq
+import logging
+import pickle
+import queue
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+from app.database import get_settings
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("memory", "sqlite", "redis")
+
+
+class StateBackend:
+    """
+    One namespace of shared state with a default TTL.
+
+    Subclasses implement get_many, set_many, add_many, delete_many and pop;
+    the single-key helpers are built on those.
+    """
+
+    kind = "base"
+
+    def __init__(self, namespace: str, ttl: timedelta):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._round_trips = 0
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Live values for the given keys; missing or expired keys are left out."""
+        raise NotImplementedError
+
+    def set_many(self, items: Mapping[str, Any], ttl: Optional[timedelta] = None) -> None:
+        """Store several values, each expiring after ttl (the namespace default if omitted)."""
+        raise NotImplementedError
+
+    def add_many(self, items: Mapping[str, Any], ttl: Optional[timedelta] = None) -> Set[str]:
+        """
+        Store values only under keys that hold no live value (each key atomically).
+
+        Returns:
+            The keys that were stored
+        """
+        raise NotImplementedError
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        """Remove several keys (missing keys are ignored)."""
+        raise NotImplementedError
+
+    def pop(self, key: str) -> Optional[Any]:
+        """Remove a key and return its live value, if any."""
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> None:
+        self.set_many({key: value}, ttl)
+
+    def add(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> bool:
+        return key in self.add_many({key: value}, ttl)
+
+    def delete(self, key: str) -> None:
+        self.delete_many([key])
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of hit/miss, write and round-trip counts."""
+        with self._lock:
+            reads = self._hits + self._misses
+            return {
+                "backend": self.kind,
+                "namespace": self.namespace,
+                "ttl_seconds": int(self.ttl.total_seconds()),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / reads, 4) if reads else 0.0,
+                "writes": self._writes,
+                "round_trips": self._round_trips,
+            }
+
+    def _seconds(self, ttl: Optional[timedelta]) -> float:
+        return (ttl if ttl is not None else self.ttl).total_seconds()
+
+    def _count_reads(self, requested: int, found: int) -> None:
+        with self._lock:
+            self._hits += found
+            self._misses += requested - found
+            self._round_trips += 1
+
+    def _count_writes(self, written: int) -> None:
+        with self._lock:
+            self._writes += written
+            self._round_trips += 1
+
+
+class MemoryBackend(StateBackend):
+    """
+    Per-process dict with an optional size cap, LRU eviction and per-entry TTL.
+
+    Values are stored as-is (not copied). Expiry times sit in a heap, so
+    each write pops whatever has expired in O(log n); entries that were
+    deleted, evicted or rewritten leave stale heap items behind, which are
+    skipped when popped and compacted away if they pile up.
+    """
+
+    kind = "memory"
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: timedelta,
+        capacity: Optional[int] = 100_000,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(namespace, ttl)
+        self.capacity = capacity
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._expiry: List[Tuple[float, str]] = []
+
+        self._evictions = 0
+        self._expired = 0
+        self._expired_on_read = 0
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        now = self._clock()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    self._expired_on_read += 1
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = value
+        self._count_reads(len(keys), len(found))
+        return found
+
+    def set_many(self, items: Mapping[str, Any], ttl: Optional[timedelta] = None) -> None:
+        now = self._clock()
+        expires_at = now + self._seconds(ttl)
+        with self._lock:
+            self._expire(now)
+            for key, value in items.items():
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                self._entries[key] = (value, expires_at)
+                heapq.heappush(self._expiry, (expires_at, key))
+            self._evict()
+            if len(self._expiry) > 2 * max(self.capacity or 0, len(self._entries)):
+                self._expiry = [(expires, key) for key, (_, expires) in self._entries.items()]
+                heapq.heapify(self._expiry)
+        self._count_writes(len(items))
+
+    def add_many(self, items: Mapping[str, Any], ttl: Optional[timedelta] = None) -> Set[str]:
+        now = self._clock()
+        expires_at = now + self._seconds(ttl)
+        added = set()
+        with self._lock:
+            self._expire(now)
+            for key, value in items.items():
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] > now:
+                    continue
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+                heapq.heappush(self._expiry, (expires_at, key))
+                added.add(key)
+            self._evict()
+        self._count_writes(len(added))
+        return added
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        self._count_writes(len(keys))
+
+    def pop(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        self._count_writes(1)
+        if entry is None or entry[1] <= self._clock():
+            return None
+        return entry[0]
+
+    def expire(self) -> int:
+        """Drop every expired entry now; returns how many were dropped."""
+        with self._lock:
+            return self._expire(self._clock())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def metrics(self) -> Dict[str, Any]:
+        metrics = super().metrics()
+        with self._lock:
+            metrics.update({
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "evictions": self._evictions,
+                "expired": self._expired,
+                "expired_on_read": self._expired_on_read,
+            })
+        return metrics
+
+    def _evict(self) -> None:
+        """Drop least recently used entries over the capacity (caller holds lock)."""
+        if self.capacity is None:
+            return
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _expire(self, now: float) -> int:
+        """Pop expired entries off the expiry heap (caller holds lock)."""
+        expired = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            entry = self._entries.get(key)
+            # Skip heap items for keys already deleted, evicted or rewritten
+            if entry is not None and entry[1] == expires_at:
+                del self._entries[key]
+                expired += 1
+        self._expired += expired
+        return expired
+
+
+class ConnectionPool:
+    """
+    Bounded pool of reusable connections.
+
+    Connections are created on demand up to size; a connection that raised
+    while in use is closed instead of being returned to the pool.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 4, close: Callable[[Any], None] = lambda conn: conn.close()):
+        self._factory = factory
+        self._close = close
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.size = size
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._factory()
+            try:
+                yield conn
+            except BaseException:
+                self._close(conn)
+                raise
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+
+class SQLiteBackend(StateBackend):
+    """
+    State in a SQLite file in WAL mode, shared by workers on the same machine.
+
+    WAL lets readers proceed while one worker writes. Expired rows are
+    filtered out on read and purged every purge_every writes.
+    """
+
+    kind = "sqlite"
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS state ("
+        " namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL NOT NULL,"
+        " PRIMARY KEY (namespace, key)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS state_expires_at ON state (expires_at)",
+    )
+
+    def __init__(self, namespace: str, ttl: timedelta, path: str, pool_size: int = 4, purge_every: int = 1000):
+        super().__init__(namespace, ttl)
+        self.path = path
+        self.purge_every = purge_every
+        self._writes_since_purge = 0
+        self._pool = ConnectionPool(self._connect, pool_size)
+        with self._pool.connection() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT key, value FROM state WHERE namespace = ? AND key IN ({placeholders}) AND expires_at > ?",
+                (self.namespace, *keys, time.time()),
+            ).fetchall()
+        found = {key: pickle.loads(value) for key, value in rows}
+        self._count_reads(len(keys), len(found))
+        return found
+
+    def set_many(self, items: Mapping[str, Any], ttl: Optional[timedelta] = None) -> None:
+        if not items:
+            return
+        now = time.time()
+        expires_at = now + self._seconds(ttl)
+        rows = [
+            (self.namespace, key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires_at)
+            for key, value in items.items()
+        ]
+        with self._lock:
+            self._writes_since_purge += len(rows)
+            purge = self._writes_since_purge >= self.purge_every
+            if purge:
+                self._writes_since_purge = 0
+        with self._pool.connection() as conn, _transaction(conn):
+            conn.executemany("INSERT OR REPLACE INTO state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)", rows)
+            if purge:
+                conn.execute("DELETE FROM state WHERE expires_at <= ?", (now,))
+        self._count_writes(len(rows))
+
+    def add_many(self, items: Mapping[str, Any], ttl: Optional[timedelta] = None) -> Set[str]:
+        if not items:
+            return set()
+        now = time.time()
+        expires_at = now + self._seconds(ttl)
+        added = set()
+        # BEGIN IMMEDIATE holds the write lock, so the check and the insert cannot interleave
+        with self._pool.connection() as conn, _transaction(conn):
+            for key, value in items.items():
+                # Replaces an expired row for the key; a live one is left alone
+                cursor = conn.execute(
+                    "INSERT INTO state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at"
+                    " WHERE state.expires_at <= ?",
+                    (self.namespace, key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires_at, now),
+                )
+                if cursor.rowcount:
+                    added.add(key)
+        self._count_writes(len(added))
+        return added
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        if not keys:
+            return
+        with self._pool.connection() as conn, _transaction(conn):
+            conn.executemany("DELETE FROM state WHERE namespace = ? AND key = ?", [(self.namespace, key) for key in keys])
+        self._count_writes(len(keys))
+
+    def pop(self, key: str) -> Optional[Any]:
+        with self._pool.connection() as conn, _transaction(conn):
+            row = conn.execute(
+                "SELECT value, expires_at FROM state WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (self.namespace, key))
+        self._count_writes(1)
+        if row is None or row[1] <= time.time():
+            return None
+        return pickle.loads(row[0])
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    """BEGIN IMMEDIATE ... COMMIT on an autocommit connection, rolling back on error."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+class RedisConnection:
+    """
+    Minimal Redis protocol (RESP2) client connection.
+
+    Only what StateBackend needs: commands are sent as arrays of bulk
+    strings, several at a time when pipelined, and simple, error, integer,
+    bulk and array replies are parsed.
+    """
+
+    def __init__(self, host: str, port: int, db: int = 0, password: Optional[str] = None, timeout: float = 5.0):
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        setup = []
+        if password:
+            setup.append(("AUTH", password))
+        if db:
+            setup.append(("SELECT", str(db)))
+        if setup:
+            self.pipeline(setup)
+
+    def execute(self, *args: Any) -> Any:
+        return self.pipeline([args])[0]
+
+    def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """Send all commands in one write, then read one reply per command."""
+        self._sock.sendall(b"".join(_encode_command(command) for command in commands))
+        replies = [self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by Redis server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            return RedisError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected Redis reply {line!r}")
+
+
+def _encode_command(args: Iterable[Any]) -> bytes:
+    parts = []
+    count = 0
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        count += 1
+    return b"*%d\r\n" % count + b"".join(parts)
+
+
+class RedisBackend(StateBackend):
+    """
+    State on a Redis-protocol server, shared by any number of workers and hosts.
+
+    Keys are prefixed with the namespace and expire server-side (SET PX).
+    Batches use MGET, DEL with several keys, or a pipeline of SETs. pop is
+    atomic, so two workers never both receive a value: GETDEL, or GET and
+    DEL in a MULTI/EXEC transaction on servers older than Redis 6.2.
+    """
+
+    kind = "redis"
+
+    def __init__(self, namespace: str, ttl: timedelta, url: str, pool_size: int = 4):
+        super().__init__(namespace, ttl)
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Expected a redis:// URL, got {url!r}")
+        self._address = {
+            "host": parsed.hostname or "localhost",
+            "port": parsed.port or 6379,
+            "db": int(parsed.path.lstrip("/") or 0),
+            "password": unquote(parsed.password) if parsed.password else None,
+        }
+        self._pool = ConnectionPool(lambda: RedisConnection(**self._address), pool_size)
+        # Cleared on the first "unknown command" reply to GETDEL
+        self._getdel = True
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        if not keys:
+            return {}
+        with self._pool.connection() as conn:
+            values = conn.execute("MGET", *map(self._key, keys))
+        found = {key: pickle.loads(value) for key, value in zip(keys, values) if value is not None}
+        self._count_reads(len(keys), len(found))
+        return found
+
+    def set_many(self, items: Mapping[str, Any], ttl: Optional[timedelta] = None) -> None:
+        if not items:
+            return
+        milliseconds = max(1, int(self._seconds(ttl) * 1000))
+        commands = [
+            ("SET", self._key(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), "PX", milliseconds)
+            for key, value in items.items()
+        ]
+        with self._pool.connection() as conn:
+            conn.pipeline(commands)
+        self._count_writes(len(commands))
+
+    def add_many(self, items: Mapping[str, Any], ttl: Optional[timedelta] = None) -> Set[str]:
+        if not items:
+            return set()
+        milliseconds = max(1, int(self._seconds(ttl) * 1000))
+        keys = list(items)
+        commands = [
+            ("SET", self._key(key), pickle.dumps(items[key], pickle.HIGHEST_PROTOCOL), "PX", milliseconds, "NX")
+            for key in keys
+        ]
+        with self._pool.connection() as conn:
+            replies = conn.pipeline(commands)
+        # SET NX replies OK when it stored the value, nil when the key existed
+        added = {key for key, reply in zip(keys, replies) if reply is not None}
+        self._count_writes(len(added))
+        return added
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        if not keys:
+            return
+        with self._pool.connection() as conn:
+            conn.execute("DEL", *map(self._key, keys))
+        self._count_writes(len(keys))
+
+    def pop(self, key: str) -> Optional[Any]:
+        with self._pool.connection() as conn:
+            value = self._pop(conn, self._key(key))
+        self._count_writes(1)
+        return pickle.loads(value) if value is not None else None
+
+    def _pop(self, conn: RedisConnection, key: str) -> Optional[bytes]:
+        if self._getdel:
+            try:
+                return conn.execute("GETDEL", key)
+            except RedisError as exc:
+                if "unknown command" not in str(exc).lower():
+                    raise
+                logger.info("Redis server has no GETDEL; popping with MULTI/EXEC")
+                self._getdel = False
+        *_, (value, _) = conn.pipeline([("MULTI",), ("GET", key), ("DEL", key), ("EXEC",)])
+        return value
+
+
+def create_backend(namespace: str, ttl: timedelta, capacity: Optional[int] = 100_000) -> StateBackend:
+    """
+    Backend for one namespace, as configured by STATE_BACKEND.
+
+    Args:
+        namespace: Name that keeps this state apart from other namespaces
+        ttl: Default time to live of an entry
+        capacity: Entry cap for the memory backend, None for no cap (shared
+            backends rely on expiry and the server's own memory limits)
+    """
+    settings = get_settings()
+    backend = settings.state_backend
+    if backend == "memory":
+        return MemoryBackend(namespace, ttl, capacity)
+    if backend == "sqlite":
+        return SQLiteBackend(namespace, ttl, settings.state_sqlite_path, settings.state_pool_size)
+    if backend == "redis":
+        return RedisBackend(namespace, ttl, settings.state_redis_url, settings.state_pool_size)
+    raise ValueError(f"Unknown STATE_BACKEND {backend!r}; expected one of {', '.join(BACKENDS)}")
@@ -0,0 +1,99 @@
+"""In-memory index of question templates, resolved without database access."""
+
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models import QuestionTemplate
+from app.services.snapshot import SnapshotCache, content_versions
+
+
+class TemplateRef(NamedTuple):
+    """The fields of a QuestionTemplate row that serving a question needs."""
+
+    id: int
+    skill_id: int
+    template_type: str
+    difficulty: int
+
+
+class TemplateIndex:
+    """
+    Immutable snapshot of every question template.
+
+    Every fallback chain the routes use is precomputed, so a lookup is a
+    dict access:
+
+    * resolve: exact difficulty, else the skill's first template
+    * resolve_at_or_below: exact difficulty, else the highest difficulty
+      below it, else the skill's first template
+
+    "First" means lowest id, which is the row the old .first() queries
+    returned. A snapshot never changes; template_cache builds one at
+    startup and swaps in the next version on POST /admin/templates/reload,
+    in every worker.
+    """
+
+    def __init__(self, templates: Iterable[TemplateRef], version: int = 1):
+        self.version = version
+        self.built_at = datetime.utcnow()
+
+        by_skill: Dict[int, List[TemplateRef]] = {}
+        for template in sorted(templates, key=lambda t: t.id):
+            by_skill.setdefault(template.skill_id, []).append(template)
+
+        self._by_id: Dict[int, TemplateRef] = {}
+        self._exact: Dict[Tuple[int, int], TemplateRef] = {}
+        self._first: Dict[int, TemplateRef] = {}
+        # Per skill: sorted difficulties and the template serving each
+        self._levels: Dict[int, Tuple[Tuple[int, ...], Tuple[TemplateRef, ...]]] = {}
+        for skill_id, skill_templates in by_skill.items():
+            self._first[skill_id] = skill_templates[0]
+            for template in skill_templates:
+                self._by_id[template.id] = template
+                self._exact.setdefault((skill_id, template.difficulty), template)
+            difficulties = tuple(sorted({t.difficulty for t in skill_templates}))
+            self._levels[skill_id] = (difficulties, tuple(self._exact[(skill_id, d)] for d in difficulties))
+
+        self.skill_ids: Tuple[int, ...] = tuple(sorted(by_skill))
+        self.keys: Tuple[Tuple[str, int], ...] = tuple(sorted({(t.template_type, t.difficulty) for t in self._by_id.values()}))
+
+    @classmethod
+    def load(cls, db: Session, version: int = 1) -> "TemplateIndex":
+        """Build an index from the question_templates table."""
+        rows = db.query(
+            QuestionTemplate.id, QuestionTemplate.skill_id, QuestionTemplate.template_type, QuestionTemplate.difficulty
+        ).all()
+        return cls((TemplateRef(*row) for row in rows), version)
+
+    def get(self, template_id: int) -> Optional[TemplateRef]:
+        """Template by id."""
+        return self._by_id.get(template_id)
+
+    def resolve(self, skill_id: int, difficulty: int) -> Optional[TemplateRef]:
+        """Template at exactly difficulty, falling back to any template of the skill."""
+        return self._exact.get((skill_id, difficulty)) or self._first.get(skill_id)
+
+    def resolve_at_or_below(self, skill_id: int, level: int) -> Optional[TemplateRef]:
+        """Template at level, else the closest difficulty below it, else any template of the skill."""
+        levels = self._levels.get(skill_id)
+        if levels is None:
+            return None
+        difficulties, templates = levels
+        position = bisect_right(difficulties, level)
+        return templates[position - 1] if position else self._first[skill_id]
+
+    def has_templates(self, skill_id: int) -> bool:
+        return skill_id in self._first
+
+    def summary(self) -> Dict[str, Any]:
+        return {"templates": len(self._by_id), "skills": len(self.skill_ids)}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+# Process-wide index used by the question and evaluation routes
+template_cache: SnapshotCache[TemplateIndex] = SnapshotCache("template index", TemplateIndex.load, content_versions)
@@ -0,0 +1,72 @@
+"""Record of answered question tokens, so a signed token can only be answered once."""
+
+import hashlib
+import threading
+from datetime import timedelta
+from typing import Any, Dict, Sequence
+
+from app.database import get_settings
+from app.services.state import StateBackend, create_backend
+from app.utils.question_tokens import canonical_question_token
+
+
+class UsedQuestionTokens:
+    """
+    Question tokens that have been answered, kept until they would have expired anyway.
+
+    A signed token is valid for its whole lifetime, so without this record
+    the same answer (or a whole batch) could be resubmitted and recorded
+    again. Entries are short digests of the tokens in their canonical
+    spelling, so re-encoding a token does not make it new; with the sqlite
+    or redis backend every worker sees them, so a replay is caught on any
+    worker. The memory backend is not capped, as evicting a claim before
+    it expires would let its token be answered again.
+    """
+
+    def __init__(self, backend: StateBackend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._replays = 0
+
+    def claim(self, tokens: Sequence[str]) -> bool:
+        """
+        Mark tokens as answered, all or none.
+
+        Returns:
+            False, marking nothing, if any token was already answered
+        """
+        if not tokens:
+            return True
+        keys = [_key(token) for token in tokens]
+        added = self.backend.add_many(dict.fromkeys(keys, True))
+        if len(added) == len(set(keys)) == len(keys):
+            return True
+        self.backend.delete_many(list(added))
+        with self._lock:
+            self._replays += 1
+        return False
+
+    def release(self, tokens: Sequence[str]) -> None:
+        """Forget claimed tokens whose answers could not be recorded, so they can be resubmitted."""
+        self.backend.delete_many([_key(token) for token in tokens])
+
+    def metrics(self) -> Dict[str, Any]:
+        """Backend counts plus how many submissions were rejected as replays."""
+        metrics = self.backend.metrics()
+        with self._lock:
+            metrics["replays_rejected"] = self._replays
+        return metrics
+
+
+def _key(token: str) -> str:
+    return hashlib.sha256(canonical_question_token(token).encode()).hexdigest()[:32]
+
+
+# Process-wide record used by the answer routes; outlives the tokens'
+# maximum age by a minute, since issue times are rounded to the minute
+_settings = get_settings()
+used_question_tokens = UsedQuestionTokens(create_backend(
+    "used_question_tokens",
+    ttl=timedelta(minutes=_settings.active_question_ttl_minutes + 1),
+    capacity=None,
+))
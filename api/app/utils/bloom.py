@@ -0,0 +1,105 @@
+"""Compact probabilistic set membership for 64-bit fingerprints."""
+
+import hashlib
+import re
+import struct
+from typing import Iterator, Optional
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(text: str) -> int:
+    """64-bit fingerprint of a piece of text, ignoring whitespace differences."""
+    normalized = _WHITESPACE.sub(" ", text).strip()
+    return int.from_bytes(hashlib.blake2b(normalized.encode(), digest_size=8).digest(), "little")
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 64-bit fingerprints.
+
+    Membership checks can return false positives but never false
+    negatives. Adding and checking touch num_hashes bits, derived from the
+    fingerprint by double hashing.
+    """
+
+    __slots__ = ("num_bits", "num_hashes", "bits", "count")
+
+    def __init__(self, num_bits: int = 16384, num_hashes: int = 7, bits: Optional[bytes] = None, count: int = 0):
+        if num_bits <= 0 or num_bits % 8:
+            raise ValueError(f"num_bits must be a positive multiple of 8, got {num_bits}")
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray(num_bits // 8)
+        if len(self.bits) != num_bits // 8:
+            raise ValueError(f"Expected {num_bits // 8} bytes of filter data, got {len(self.bits)}")
+        self.count = count
+
+    def _positions(self, fp: int) -> Iterator[int]:
+        h1 = fp & 0xFFFFFFFF
+        h2 = (fp >> 32) | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, fp: int) -> None:
+        """Add a fingerprint."""
+        for position in self._positions(fp):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, fp: int) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(fp))
+
+
+class RotatingBloomFilter:
+    """
+    Two Bloom filter generations that together remember recent fingerprints.
+
+    Once the current generation holds capacity fingerprints it becomes the
+    previous one and a fresh generation starts, so the false-positive rate
+    stays bounded and old fingerprints are eventually forgotten.
+    """
+
+    # version, fingerprints in the current generation
+    HEADER = struct.Struct("<BI")
+    VERSION = 1
+
+    def __init__(self, capacity: int = 1000, num_bits: int = 16384, num_hashes: int = 7):
+        self.capacity = capacity
+        self.current = BloomFilter(num_bits, num_hashes)
+        self.previous = BloomFilter(num_bits, num_hashes)
+
+    def add(self, fp: int) -> None:
+        """Add a fingerprint, rotating generations when the current one is full."""
+        if self.current.count >= self.capacity:
+            self.previous = self.current
+            self.current = BloomFilter(self.previous.num_bits, self.previous.num_hashes)
+        self.current.add(fp)
+
+    def __contains__(self, fp: int) -> bool:
+        return fp in self.current or fp in self.previous
+
+    def to_bytes(self) -> bytes:
+        """Serialize both generations (a few KB with the default sizing)."""
+        return self.HEADER.pack(self.VERSION, self.current.count) + bytes(self.current.bits) + bytes(self.previous.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, capacity: int = 1000, num_bits: int = 16384, num_hashes: int = 7) -> "RotatingBloomFilter":
+        """
+        Load a filter written by to_bytes().
+
+        Data written with a different version or size is discarded and an
+        empty filter returned, since the filter only has to be approximate.
+        """
+        filters = cls(capacity, num_bits, num_hashes)
+        size = num_bits // 8
+        if len(data) != cls.HEADER.size + 2 * size:
+            return filters
+        version, count = cls.HEADER.unpack_from(data, 0)
+        if version != cls.VERSION:
+            return filters
+
+        offset = cls.HEADER.size
+        filters.current = BloomFilter(num_bits, num_hashes, data[offset:offset + size], count)
+        filters.previous = BloomFilter(num_bits, num_hashes, data[offset + size:], capacity)
+        return filters
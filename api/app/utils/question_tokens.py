@@ -0,0 +1,147 @@
+"""Stateless, HMAC-signed question tokens."""
+
+import base64
+import hashlib
+import hmac
+import re
+import struct
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+# Marks a question_id as a token rather than a uuid key into the active-question store
+TOKEN_PREFIX = "q1."
+
+# user_id, skill_id, template_id, difficulty, seed (64-bit for packed seeds),
+# issued at (minutes since the epoch), answer digest
+PAYLOAD = struct.Struct("<IIIBQIQ")
+SIGNATURE_BYTES = 16
+_NOT_BASE64 = re.compile(r"[^A-Za-z0-9_-]")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class InvalidQuestionToken(ValueError):
+    """Raised for a token that is malformed, forged, expired or for another user."""
+
+
+class QuestionClaims(NamedTuple):
+    """What a question token vouches for."""
+
+    user_id: int
+    skill_id: int
+    template_id: int
+    difficulty: int
+    seed: int
+    issued_at: datetime
+    answer_digest: int
+
+
+def is_question_token(question_id: str) -> bool:
+    """Whether a question_id is a signed token."""
+    return question_id.startswith(TOKEN_PREFIX)
+
+
+def answer_digest(answer: str, seed: int, secret: str) -> int:
+    """Keyed 64-bit hash of a canonical answer, salted with the question seed."""
+    message = struct.pack("<Q", seed) + str(answer).strip().encode()
+    digest = hmac.new(_key(secret, b"answer"), message, hashlib.sha256).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def encode_question_token(
+    user_id: int,
+    skill_id: int,
+    template_id: int,
+    difficulty: int,
+    seed: int,
+    answer: str,
+    secret: str,
+    issued_at: Optional[datetime] = None,
+) -> str:
+    """
+    Sign everything needed to grade a question into a URL-safe token.
+
+    The canonical answer itself is not included, only a salted keyed hash
+    of it, so the token does not give the answer away.
+    """
+    issued_at = issued_at or datetime.utcnow()
+    payload = PAYLOAD.pack(
+        user_id, skill_id, template_id, difficulty, seed,
+        int((issued_at - _EPOCH).total_seconds() // 60),
+        answer_digest(answer, seed, secret),
+    )
+    return TOKEN_PREFIX + _encode(payload + _sign(payload, secret))
+
+
+def canonical_question_token(token: str) -> str:
+    """
+    A token as encode_question_token spells it.
+
+    Lenient base64 decoding ignores the unused bits of the last character
+    and skips characters outside the alphabet, so one signed token has many
+    spellings. Anything keyed on a token (replay records, duplicate checks)
+    should use this form; ids that do not decode are returned unchanged.
+    """
+    if not is_question_token(token):
+        return token
+    try:
+        return TOKEN_PREFIX + _encode(_decode(token[len(TOKEN_PREFIX):]))
+    except ValueError:
+        return token
+
+
+def decode_question_token(
+    token: str,
+    user_id: int,
+    secret: str,
+    max_age: timedelta,
+    now: Optional[datetime] = None,
+) -> QuestionClaims:
+    """
+    Verify a token and return its claims.
+
+    Raises:
+        InvalidQuestionToken: If the token is malformed, its signature does
+            not match, it was issued to another user or it is older than max_age
+    """
+    if not is_question_token(token):
+        raise InvalidQuestionToken("Not a question token")
+    encoded = token[len(TOKEN_PREFIX):]
+    try:
+        raw = _decode(encoded)
+    except ValueError:
+        raise InvalidQuestionToken("Malformed question token")
+    # Only the canonical spelling verifies, so a token has exactly one valid form
+    if _encode(raw) != encoded or len(raw) != PAYLOAD.size + SIGNATURE_BYTES:
+        raise InvalidQuestionToken("Malformed question token")
+
+    payload, signature = raw[:PAYLOAD.size], raw[PAYLOAD.size:]
+    if not hmac.compare_digest(signature, _sign(payload, secret)):
+        raise InvalidQuestionToken("Bad question token signature")
+
+    token_user, skill_id, template_id, difficulty, seed, issued_minutes, digest = PAYLOAD.unpack(payload)
+    if token_user != user_id:
+        raise InvalidQuestionToken("Question token was issued to another user")
+    issued_at = _EPOCH + timedelta(minutes=issued_minutes)
+    if (now or datetime.utcnow()) - issued_at > max_age:
+        raise InvalidQuestionToken("Question token expired")
+    return QuestionClaims(token_user, skill_id, template_id, difficulty, seed, issued_at, digest)
+
+
+def _encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _decode(encoded: str) -> bytes:
+    """Lenient decode: characters outside the alphabet (padding included) are skipped."""
+    encoded = _NOT_BASE64.sub("", encoded)
+    return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+
+
+def _key(secret: str, purpose: bytes) -> bytes:
+    """Derive a per-purpose key so token signatures and answer hashes never share one."""
+    return hmac.new(secret.encode(), b"question-token:" + purpose, hashlib.sha256).digest()
+
+
+def _sign(payload: bytes, secret: str) -> bytes:
+    return hmac.new(_key(secret, b"signature"), payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
@@ -0,0 +1,130 @@
+"""Backfill the recent-results window on user_mastery from question history.
+
+Mastery scores are updated in O(1) per answer from running totals and a
+bitmask of the last 10 results kept on user_mastery. This script adds the
+recent_results / recent_count columns to an existing database if they are
+missing, then rebuilds totals, window and mastery_score for every mastery
+row from question_history in one ordered pass. Rows it has not reached yet
+still work: the answer route loads their window on first use.
+
+Usage:
+    python backfill_mastery_window.py
+    python backfill_mastery_window.py --only-missing --batch-size 500
+    python backfill_mastery_window.py --verify
+"""
+
+import argparse
+import sys
+import time
+from itertools import groupby
+
+from sqlalchemy import inspect, text
+
+from app.database import SessionLocal, engine
+from app.learning.mastery import calculate_mastery, mastery_from_counts, recent_window
+from app.models import QuestionHistory, UserMastery
+
+WINDOW_COLUMNS = ("recent_results", "recent_count")
+
+
+def add_window_columns():
+    """Add the window columns to user_mastery if it predates them; returns the columns added."""
+    existing = {column["name"] for column in inspect(engine).get_columns(UserMastery.__tablename__)}
+    added = [name for name in WINDOW_COLUMNS if name not in existing]
+    with engine.begin() as conn:
+        for name in added:
+            conn.execute(text(f"ALTER TABLE {UserMastery.__tablename__} ADD COLUMN {name} INTEGER"))
+    return added
+
+
+def backfill(db, only_missing=False, batch_size=1000):
+    """
+    Rebuild totals, window and score of mastery rows from history.
+
+    History is read once, ordered by (user, skill, newest first), so each
+    row costs one pass over its own attempts.
+
+    Returns:
+        Number of mastery rows updated
+    """
+    query = db.query(UserMastery)
+    if only_missing:
+        query = query.filter(UserMastery.recent_results.is_(None))
+    masteries = {(row.user_id, row.skill_id): row for row in query}
+    if not masteries:
+        return 0
+
+    history = (
+        db.query(QuestionHistory.user_id, QuestionHistory.skill_id, QuestionHistory.is_correct)
+        .order_by(
+            QuestionHistory.user_id,
+            QuestionHistory.skill_id,
+            QuestionHistory.created_at.desc(),
+            QuestionHistory.id.desc(),
+        )
+        .yield_per(batch_size)
+    )
+    counts = {}
+    for key, attempts in groupby(history, key=lambda row: (row.user_id, row.skill_id)):
+        if key not in masteries:
+            continue
+        results = [row.is_correct for row in attempts]
+        counts[key] = (len(results), sum(results), *recent_window(results))
+
+    updated = 0
+    for key, mastery in masteries.items():
+        total, correct, recent_results, recent_count = counts.get(key, (0, 0, 0, 0))
+        mastery.total_attempts = total
+        mastery.correct_attempts = correct
+        mastery.recent_results = recent_results
+        mastery.recent_count = recent_count
+        mastery.mastery_score = mastery_from_counts(total, correct, recent_results, recent_count)
+        updated += 1
+        if updated % batch_size == 0:
+            db.commit()
+    db.commit()
+    return updated
+
+
+def verify(db):
+    """Mastery rows whose stored score differs from calculate_mastery over full history."""
+    mismatched = []
+    for mastery in db.query(UserMastery):
+        expected = calculate_mastery(mastery.user_id, mastery.skill_id, db)
+        if mastery.mastery_score != expected:
+            mismatched.append((mastery.user_id, mastery.skill_id, mastery.mastery_score, expected))
+    return mismatched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill the mastery recent-results window.")
+    parser.add_argument("--only-missing", action="store_true", help="skip rows that already have a window")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per commit and history fetch")
+    parser.add_argument("--verify", action="store_true", help="compare every score with calculate_mastery afterwards")
+    args = parser.parse_args(argv)
+
+    added = add_window_columns()
+    if added:
+        print(f"Added columns: {', '.join(added)}")
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        updated = backfill(db, only_missing=args.only_missing, batch_size=args.batch_size)
+        print(f"✅ Backfilled {updated} mastery rows in {time.perf_counter() - started:.1f}s")
+
+        if args.verify:
+            mismatched = verify(db)
+            for user_id, skill_id, stored, expected in mismatched[:20]:
+                print(f"   user {user_id} skill {skill_id}: stored {stored}, expected {expected}")
+            if mismatched:
+                print(f"❌ {len(mismatched)} mastery scores differ from calculate_mastery")
+                return 1
+            print("✅ Every mastery score matches calculate_mastery")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Micro-benchmark every question generator at every seeded difficulty.
+
+For each (template_type, difficulty) in add_templates.SKILL_GENERATOR_MAP this
+records throughput, latency percentiles, memory per question (tracemalloc)
+and how many random draws a question takes. Generators that loop until
+their random parameters satisfy a constraint show up as a high or spiky
+draw count; a question that needs more than DRAW_LIMIT draws is counted
+as a stall rather than left to spin.
+
+Usage (from the api/ directory):
+    python -m benchmarks.generators --save benchmarks/baseline.json
+    python -m benchmarks.generators --compare benchmarks/baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from add_templates import SKILL_GENERATOR_MAP
+from app.generators import get_generator
+
+# Draws allowed for a single question before it is counted as stalled
+DRAW_LIMIT = 100_000
+
+# Metrics compared in --compare mode, and whether higher values are better
+COMPARED_METRICS = {
+    "ops_per_sec": True,
+    "p99_us": False,
+    "alloc_bytes": False,
+    "draws_mean": False,
+    "draws_max": False,
+    "stalls": False,
+}
+
+
+class DrawLimitExceeded(Exception):
+    """Raised when one question uses more than DRAW_LIMIT random draws."""
+
+
+class CountingRandom(random.Random):
+    """random.Random that counts the underlying draws it makes."""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.draws = 0
+        self.limit = None
+        super().__init__(seed)
+
+    def start_question(self) -> None:
+        """Arm the per-question draw limit."""
+        self.limit = self.draws + DRAW_LIMIT
+
+    def _count(self) -> None:
+        self.draws += 1
+        if self.limit is not None and self.draws > self.limit:
+            raise DrawLimitExceeded()
+
+    def random(self) -> float:
+        self._count()
+        return super().random()
+
+    def getrandbits(self, k: int) -> int:
+        self._count()
+        return super().getrandbits(k)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def benchmark_generator(template_type: str, difficulty: int, iterations: int, seed: int) -> Dict[str, Any]:
+    """
+    Benchmark one generator at one difficulty.
+
+    Args:
+        template_type: Registered generator name
+        difficulty: Difficulty level
+        iterations: Number of questions to time
+        seed: Seed for the benchmark RNG
+
+    Returns:
+        Dict of metrics for this (template_type, difficulty)
+    """
+    generator = get_generator(template_type)
+
+    # Warm up caches and the interpreter before timing
+    warmup_rng = random.Random(seed)
+    for _ in range(min(iterations, 100)):
+        try:
+            generator(difficulty, rng=warmup_rng)
+        except Exception:
+            pass
+
+    # Timing and draw counts
+    rng = CountingRandom(seed)
+    latencies = []
+    draws = []
+    errors = 0
+    stalls = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        before = rng.draws
+        rng.start_question()
+        t0 = time.perf_counter_ns()
+        try:
+            generator(difficulty, rng=rng)
+        except DrawLimitExceeded:
+            stalls += 1
+            continue
+        except Exception:
+            errors += 1
+            continue
+        latencies.append((time.perf_counter_ns() - t0) / 1000)
+        draws.append(rng.draws - before)
+    elapsed = time.perf_counter() - started
+
+    # Memory: a smaller tracemalloc pass, since tracing slows generation down
+    rng = CountingRandom(seed)
+    alloc = []
+    retained = []
+    kept = []
+    tracemalloc.start()
+    for _ in range(max(1, iterations // 10)):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        rng.start_question()
+        try:
+            kept.append(generator(difficulty, rng=rng))
+        except Exception:
+            continue
+        current, peak = tracemalloc.get_traced_memory()
+        alloc.append(peak - base)
+        retained.append(current - base)
+    tracemalloc.stop()
+    del kept
+
+    latencies.sort()
+    successes = len(latencies)
+    return {
+        "template_type": template_type,
+        "difficulty": difficulty,
+        "iterations": iterations,
+        "errors": errors,
+        "stalls": stalls,
+        "ops_per_sec": round(successes / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_us": round(_percentile(latencies, 50), 2),
+        "p99_us": round(_percentile(latencies, 99), 2),
+        "alloc_bytes": round(sum(alloc) / len(alloc)) if alloc else 0,
+        "retained_bytes": round(sum(retained) / len(retained)) if retained else 0,
+        "draws_mean": round(sum(draws) / successes, 2) if successes else 0.0,
+        "draws_max": max(draws) if draws else 0,
+    }
+
+
+def run_suite(iterations: int, seed: int, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Benchmark every mapped generator and difficulty."""
+    results = {}
+    for generator_type, difficulties in SKILL_GENERATOR_MAP.values():
+        if only and generator_type not in only:
+            continue
+        for difficulty in difficulties:
+            row = benchmark_generator(generator_type, difficulty, iterations, seed)
+            results[f"{generator_type}:{difficulty}"] = row
+            print(
+                f"{generator_type:32} d{difficulty}  {row['ops_per_sec']:>10.0f} ops/s  "
+                f"p50 {row['p50_us']:>7.1f}us  p99 {row['p99_us']:>7.1f}us  "
+                f"{row['alloc_bytes']:>7}B  draws {row['draws_mean']:.1f}/{row['draws_max']}"
+                + (f"  errors {row['errors']}" if row["errors"] else "")
+                + (f"  stalls {row['stalls']}" if row["stalls"] else "")
+            )
+
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "iterations": iterations,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    List metrics that regressed by more than threshold versus the baseline.
+
+    Args:
+        baseline: Previously saved suite output
+        current: Fresh suite output
+        threshold: Allowed relative change (0.2 = 20%)
+
+    Returns:
+        Human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for key, row in current["results"].items():
+        base_row = baseline["results"].get(key)
+        if not base_row:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base_row.get(metric), row.get(metric)
+            if new is None:
+                continue
+            if not old:
+                if metric == "stalls" and new:
+                    regressions.append(f"{key} {metric}: {old} -> {new}")
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -threshold) or (not higher_is_better and change > threshold):
+                regressions.append(f"{key} {metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark question generators.")
+    parser.add_argument("--iterations", type=int, default=2000, help="questions per generator/difficulty")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the benchmark RNG")
+    parser.add_argument("--only", nargs="*", help="limit to these template types")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative change flagged as a regression")
+    args = parser.parse_args(argv)
+
+    suite = run_suite(args.iterations, args.seed, args.only)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(suite, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, suite, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions above {args.threshold:.0%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Benchmark the memoized LaTeX formatters against plain string building.
+
+Two measurements:
+
+* formatters: each app.generators.latex formatter called on inputs drawn
+  from the ranges generators use, once with the LRU caches and once with
+  every cached formatter swapped for its undecorated function (__wrapped__),
+  which is the per-call string building generators did before.
+* generators: every generator that formats through app.generators.latex,
+  run the same two ways.
+
+Usage (from the api/ directory):
+    python -m benchmarks.latex
+    python -m benchmarks.latex --calls 200000 --iterations 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from contextlib import contextmanager
+from fractions import Fraction
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.generators import GENERATOR_PATHS, get_generator, latex
+
+
+def _sample_arguments(rng: random.Random) -> Dict[str, Callable[[], Tuple[Any, ...]]]:
+    """Argument factories per formatter, over generator-sized ranges."""
+    nonzero = [n for n in range(-12, 13) if n]
+
+    def small() -> int:
+        return rng.choice(nonzero)
+
+    return {
+        "format_term": lambda: (small(), rng.randint(0, 4)),
+        "format_signed": lambda: (rng.randint(-12, 12), rng.randint(0, 2)),
+        "format_operand": lambda: (rng.randint(-12, 12),),
+        "format_polynomial": lambda: (tuple(small() for _ in range(rng.randint(2, 5))),),
+        "format_quadratic": lambda: (small(), rng.randint(-12, 12), rng.randint(-12, 12)),
+        "format_linear_equation": lambda: (small(), small(), rng.randint(-40, 40)),
+        "format_frac": lambda: (rng.randint(1, 12), rng.randint(2, 12)),
+        "format_fraction": lambda: (Fraction(rng.randint(-12, 12), rng.randint(1, 12)),),
+        "format_mixed_number": lambda: (rng.randint(1, 9), rng.randint(1, 11), 12),
+        "format_radical": lambda: (rng.randint(2, 50), rng.randint(1, 9)),
+        "format_matrix": lambda: (((small(), small()), (small(), small())),),
+    }
+
+
+def benchmark_formatters(calls: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Time each formatter cached and uncached on the same argument stream.
+
+    The hit rate counts every cached lookup the formatter made, including
+    the cached atoms a composite formatter is built from.
+    """
+    rng = random.Random(seed)
+    factories = _sample_arguments(rng)
+    results = []
+    for name, factory in factories.items():
+        arguments = [factory() for _ in range(calls)]
+        with _uncached():
+            uncached = _time_calls(getattr(latex, name), arguments)
+        latex.clear_caches()
+        cached = _time_calls(getattr(latex, name), arguments)
+        results.append({
+            "name": name,
+            "uncached_ns": uncached / calls * 1e9,
+            "cached_ns": cached / calls * 1e9,
+            "speedup": uncached / cached,
+            "hit_rate": latex.cache_stats()["hit_rate"],
+        })
+    return results
+
+
+def _time_calls(function: Callable[..., str], arguments: List[Tuple[Any, ...]]) -> float:
+    start = time.perf_counter()
+    for args in arguments:
+        function(*args)
+    return time.perf_counter() - start
+
+
+def _latex_generators() -> List[str]:
+    """Template types whose generator module formats through app.generators.latex."""
+    template_types = []
+    for template_type, path in GENERATOR_PATHS.items():
+        module = import_module(f"app.generators.{path.split(':')[0]}")
+        if any(callable(value) and getattr(value, "__module__", None) == latex.__name__ for value in vars(module).values()):
+            template_types.append(template_type)
+    return template_types
+
+
+@contextmanager
+def _uncached() -> Iterator[None]:
+    """Swap every imported reference to a memoized formatter for its undecorated function."""
+    wrapped = {id(formatter): formatter for formatter in latex._FORMATTERS}
+    patched = []
+    for name, module in list(sys.modules.items()):
+        if module is None or not name.startswith("app.generators"):
+            continue
+        for attribute, value in list(vars(module).items()):
+            if id(value) in wrapped and wrapped[id(value)] is value:
+                patched.append((module, attribute, value))
+                setattr(module, attribute, value.__wrapped__)
+    try:
+        yield
+    finally:
+        for module, attribute, value in patched:
+            setattr(module, attribute, value)
+
+
+def _time_generator(template_type: str, iterations: int, seed: int) -> float:
+    generator = get_generator(template_type)
+    start = time.perf_counter()
+    for i in range(iterations):
+        generator(difficulty=i % 3 + 1, seed=seed + i)
+    return time.perf_counter() - start
+
+
+def benchmark_generators(iterations: int, seed: int) -> List[Dict[str, Any]]:
+    """Time each latex-using generator with and without the formatter caches."""
+    results = []
+    for template_type in _latex_generators():
+        _time_generator(template_type, 50, seed)  # warm imports
+        with _uncached():
+            uncached = _time_generator(template_type, iterations, seed)
+        latex.clear_caches()
+        cached = _time_generator(template_type, iterations, seed)
+        results.append({
+            "template_type": template_type,
+            "uncached_us": uncached / iterations * 1e6,
+            "cached_us": cached / iterations * 1e6,
+            "speedup": uncached / cached,
+            "hit_rate": latex.cache_stats()["hit_rate"],
+        })
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark memoized LaTeX formatters.")
+    parser.add_argument("--calls", type=int, default=100_000, help="calls per formatter")
+    parser.add_argument("--iterations", type=int, default=2000, help="questions per generator")
+    parser.add_argument("--seed", type=int, default=0, help="seed for inputs and generators")
+    args = parser.parse_args(argv)
+
+    print(f"{'formatter':<24} {'uncached ns':>12} {'cached ns':>10} {'speedup':>8} {'hit rate':>9}")
+    for row in benchmark_formatters(args.calls, args.seed):
+        print(
+            f"{row['name']:<24} {row['uncached_ns']:>12.0f} {row['cached_ns']:>10.0f} "
+            f"{row['speedup']:>7.2f}x {row['hit_rate']:>9.1%}"
+        )
+
+    print(f"\n{'generator':<28} {'uncached us':>12} {'cached us':>10} {'speedup':>8} {'hit rate':>9}")
+    for row in benchmark_generators(args.iterations, args.seed):
+        print(
+            f"{row['template_type']:<28} {row['uncached_us']:>12.1f} {row['cached_us']:>10.1f} "
+            f"{row['speedup']:>7.2f}x {row['hit_rate']:>9.1%}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Compile a memory-mapped question bank for the API to serve from.
+
+Pre-generates questions for every (template_type, difficulty) in
+add_templates.SKILL_GENERATOR_MAP. Point QUESTION_BANK_PATH at the output
+file and the API serves questions from it instead of calling generators.
+
+Usage:
+    python compile_question_bank.py question_bank.bin --count 1000000
+    python compile_question_bank.py question_bank.bin --only quadratic_equation --count 5000
+    python compile_question_bank.py question_bank.bin --vectorized
+"""
+
+import argparse
+import sys
+import time
+
+from add_templates import SKILL_GENERATOR_MAP
+from app.services.question_bank import compile_bank
+
+
+def bank_keys(only=None):
+    """(template_type, difficulty) pairs to compile, in map order."""
+    keys = []
+    for generator_type, difficulties in SKILL_GENERATOR_MAP.values():
+        if only and generator_type not in only:
+            continue
+        for difficulty in difficulties:
+            keys.append((generator_type, difficulty))
+    return keys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a question bank file.")
+    parser.add_argument("output", help="path of the bank file to write")
+    parser.add_argument("--count", type=int, default=100_000, help="questions per template type and difficulty")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible banks")
+    parser.add_argument("--only", nargs="*", help="limit to these template types")
+    parser.add_argument(
+        "--vectorized", action="store_true",
+        help="generate arithmetic types with NumPy-vectorized batches (plain questions only)",
+    )
+    args = parser.parse_args(argv)
+
+    keys = bank_keys(args.only)
+    if not keys:
+        print("❌ No matching template types")
+        return 1
+
+    started = time.perf_counter()
+
+    def report(key, stored, failed):
+        template_type, difficulty = key
+        line = f"   {template_type} d{difficulty}: {stored} questions"
+        if failed:
+            line += f" ({failed} failed)"
+        print(line)
+
+    print(f"Compiling {len(keys)} sections x {args.count} questions into {args.output}")
+    summary = compile_bank(
+        args.output, keys, args.count, seed=args.seed, progress=report, vectorized=args.vectorized
+    )
+
+    total = sum(section["stored"] for section in summary.values())
+    print(f"✅ Wrote {total} questions in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Merge duplicate user_mastery rows and add the unique (user_id, skill_id) key.
+
+Answers upsert user_mastery with INSERT ... ON CONFLICT (user_id, skill_id),
+which needs a unique key on those columns. Databases created before it may
+hold duplicate rows (from concurrent answers racing to create the row). For
+each duplicated (user_id, skill_id) this keeps the oldest row, deletes the
+rest and rebuilds the kept row from question_history, then creates the
+unique index. Safe to run more than once; the API refuses to start
+until it has run.
+
+Usage:
+    python dedupe_user_mastery.py
+"""
+
+import sys
+
+from sqlalchemy import func, text
+
+from app.database import SessionLocal, engine
+from app.models import UserMastery
+from backfill_mastery_window import add_window_columns, backfill
+
+UNIQUE_INDEX = "uq_user_mastery_user_skill"
+
+
+def merge_duplicates(db):
+    """Keep the oldest row per (user_id, skill_id); returns how many rows were deleted."""
+    duplicated = (
+        db.query(UserMastery.user_id, UserMastery.skill_id, func.min(UserMastery.id))
+        .group_by(UserMastery.user_id, UserMastery.skill_id)
+        .having(func.count(UserMastery.id) > 1)
+        .all()
+    )
+    deleted = 0
+    for user_id, skill_id, keep_id in duplicated:
+        deleted += (
+            db.query(UserMastery)
+            .filter(
+                UserMastery.user_id == user_id,
+                UserMastery.skill_id == skill_id,
+                UserMastery.id != keep_id,
+            )
+            .delete(synchronize_session=False)
+        )
+        # Counts were split across the duplicates; rebuild from history below
+        db.query(UserMastery).filter(UserMastery.id == keep_id).update(
+            {UserMastery.recent_results: None}, synchronize_session=False
+        )
+    db.commit()
+    return deleted
+
+
+def main():
+    add_window_columns()
+
+    db = SessionLocal()
+    try:
+        deleted = merge_duplicates(db)
+        rebuilt = backfill(db, only_missing=True)
+    finally:
+        db.close()
+    print(f"Deleted {deleted} duplicate mastery rows, rebuilt {rebuilt} rows from history")
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {UNIQUE_INDEX} "
+            f"ON {UserMastery.__tablename__} (user_id, skill_id)"
+        ))
+    print(f"✅ Unique key {UNIQUE_INDEX} in place")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
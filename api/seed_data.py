@@ -251,6 +251,8 @@ def seed_database():
             count = db.query(Skill).filter(Skill.subject == subject_name).count()
             if count > 0:
                 print(f"   - {subject_name}: {count} skills")
+        print("   Running API workers pick them up after POST /study/admin/skill-catalog/reload")
+        print("   and POST /study/admin/templates/reload (on any worker), or a restart")
 
     except Exception as e:
         print(f"❌ Error seeding database: {e}")
@@ -0,0 +1,42 @@
+"""Shared fixtures: a throwaway SQLite database with one user, skill and template."""
+
+import os
+import tempfile
+
+# Before app is imported: settings are read at import time, and tests must
+# never run against the database configured in .env
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='study-buddy-tests-')}/test.db"
+os.environ["JWT_SECRET_KEY"] = "test-secret"
+
+import pytest  # noqa: E402
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import QuestionHistory, QuestionTemplate, Skill, User  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """Session on freshly created tables holding user 1, skill 1 and template 1."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    session.add(User(id=1, username="student", first_name="Student", password_hash="x"))
+    session.add(Skill(id=1, slug="linear-equations", name="Linear Equations", subject="Algebra I"))
+    session.add(QuestionTemplate(id=1, skill_id=1, template_type="linear_equation", template_data={}, difficulty=1))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def make_attempt(is_correct=True, user_id=1, skill_id=1):
+    """A QuestionHistory row for user 1 on template 1, not added to any session."""
+    return QuestionHistory(
+        user_id=user_id,
+        skill_id=skill_id,
+        template_id=1,
+        is_correct=is_correct,
+        time_taken_seconds=5,
+        difficulty=1,
+    )
@@ -0,0 +1,148 @@
+"""In-process Redis stand-in for tests: a RESP2 server on a local port."""
+
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class FakeRedisServer:
+    """
+    Thread-backed server implementing the commands RedisBackend sends.
+
+    AUTH, SELECT, PING, GET, MGET, SET [PX] [NX], DEL, GETDEL, PTTL and
+    MULTI/EXEC, on one keyspace shared by every connection (SELECT is
+    accepted and ignored). Expiry follows clock, which tests may replace
+    to move time forward. With getdel=False the server answers GETDEL
+    like a server older than Redis 6.2.
+
+        with FakeRedisServer() as server:
+            backend = RedisBackend("ns", timedelta(minutes=5), server.url)
+    """
+
+    def __init__(self, getdel: bool = True, clock: Callable[[], float] = time.time):
+        self.getdel = getdel
+        self.clock = clock
+        self.commands: List[Tuple[str, ...]] = []
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            disable_nagle_algorithm = True
+
+            def handle(self):
+                queued: Optional[List[List[bytes]]] = None
+                while True:
+                    command = _read_command(self.rfile)
+                    if command is None:
+                        return
+                    name = command[0].decode().upper()
+                    server.commands.append((name, *(arg.decode(errors="replace") for arg in command[1:])))
+                    if name == "MULTI":
+                        queued = []
+                        reply: Any = "OK"
+                    elif name == "EXEC":
+                        with server._lock:
+                            reply = [server._run(*queued_command) for queued_command in queued or []]
+                        queued = None
+                    elif queued is not None:
+                        queued.append(command)
+                        reply = "QUEUED"
+                    else:
+                        with server._lock:
+                            reply = server._run(*command)
+                    self.wfile.write(_encode_reply(reply))
+                    self.wfile.flush()
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"redis://{host}:{port}/0"
+
+    def keys(self) -> List[str]:
+        """Live keys, decoded."""
+        with self._lock:
+            return sorted(key.decode() for key in self._data if self._live(key) is not None)
+
+    def __enter__(self) -> "FakeRedisServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self.clock():
+            del self._data[key]
+            return None
+        return value
+
+    def _run(self, name: bytes, *args: bytes) -> Any:
+        command = name.decode().upper()
+        if command in ("AUTH", "SELECT", "PING"):
+            return "OK" if command != "PING" else "PONG"
+        if command == "GET":
+            return self._live(args[0])
+        if command == "MGET":
+            return [self._live(key) for key in args]
+        if command == "SET":
+            options = [arg.upper() for arg in args[2:]]
+            if b"NX" in options and self._live(args[0]) is not None:
+                return None
+            expires_at = None
+            if b"PX" in options:
+                expires_at = self.clock() + int(args[2 + options.index(b"PX") + 1]) / 1000
+            self._data[args[0]] = (args[1], expires_at)
+            return "OK"
+        if command == "DEL":
+            deleted = sum(1 for key in args if self._live(key) is not None)
+            for key in args:
+                self._data.pop(key, None)
+            return deleted
+        if command == "GETDEL" and self.getdel:
+            value = self._live(args[0])
+            self._data.pop(args[0], None)
+            return value
+        if command == "PTTL":
+            if self._live(args[0]) is None:
+                return -2
+            expires_at = self._data[args[0]][1]
+            return -1 if expires_at is None else int((expires_at - self.clock()) * 1000)
+        return RuntimeError(f"ERR unknown command '{name.decode()}'")
+
+
+def _read_command(rfile) -> Optional[List[bytes]]:
+    line = rfile.readline()
+    if not line:
+        return None
+    assert line.startswith(b"*"), line
+    args = []
+    for _ in range(int(line[1:-2])):
+        length = int(rfile.readline()[1:-2])
+        args.append(rfile.read(length + 2)[:-2])
+    return args
+
+
+def _encode_reply(reply: Any) -> bytes:
+    if isinstance(reply, RuntimeError):
+        return b"-%s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(_encode_reply(item) for item in reply)
@@ -0,0 +1,64 @@
+"""HistoryWriter: inline fallback, bounded waits and draining on stop."""
+
+import threading
+
+import pytest
+
+from app.models import QuestionHistory, UserMastery
+from app.services.history_writer import HistoryWriter, PendingWrite
+from tests.conftest import make_attempt
+
+
+def test_sync_mode_writes_in_the_callers_transaction(db):
+    writer = HistoryWriter("sync")
+    writer.record([make_attempt(), make_attempt(False)], db).wait()
+    db.commit()
+
+    assert db.query(QuestionHistory).count() == 2
+    assert db.query(UserMastery).one().total_attempts == 2
+
+
+def test_dead_writer_thread_falls_back_to_inline_writes(db):
+    writer = HistoryWriter("group")
+    writer._thread = threading.Thread(target=lambda: None)
+    writer._thread.start()
+    writer._thread.join()
+
+    pending = writer.record([make_attempt()], db)
+    db.commit()
+    pending.wait()
+
+    assert db.query(QuestionHistory).count() == 1
+    assert writer.metrics()["inline_writes"] == 1
+
+
+def test_wait_is_bounded():
+    pending = PendingWrite([make_attempt()], wait=True, timeout=0.01)
+    with pytest.raises(TimeoutError):
+        pending.wait()
+
+
+def test_stop_drains_queue_and_later_answers_are_written_inline(db):
+    writer = HistoryWriter("async", batch_size=1000, flush_ms=60_000)
+    writer.start()
+    for _ in range(5):
+        writer.record([make_attempt()], db)
+    writer.stop()
+    db.expire_all()
+    assert db.query(QuestionHistory).count() == 5
+
+    writer.record([make_attempt()], db)
+    db.commit()
+    assert db.query(QuestionHistory).count() == 6
+    assert db.query(UserMastery).one().total_attempts == 6
+
+
+def test_group_mode_waits_for_the_batch_commit(db):
+    writer = HistoryWriter("group", flush_ms=5)
+    writer.start()
+    try:
+        writer.record([make_attempt(), make_attempt()], db).wait()
+        db.expire_all()
+        assert db.query(QuestionHistory).count() == 2
+    finally:
+        writer.stop()
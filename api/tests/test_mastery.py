@@ -0,0 +1,91 @@
+"""record_attempts: statements per answer, the portable fallback and the schema check."""
+
+import pytest
+from sqlalchemy import event, text
+
+from app.database import engine
+from app.learning import mastery
+from app.learning.mastery import calculate_mastery, check_mastery_schema, record_attempt, record_attempts
+from app.models import UserMastery
+from tests.conftest import make_attempt
+
+
+@pytest.fixture
+def statements():
+    """SQL statements executed on the engine while the test runs."""
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement.split(None, 1)[0].upper())
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(engine, "before_cursor_execute", count)
+
+
+def test_first_answer_on_a_skill_takes_three_statements(db, statements):
+    record_attempt(make_attempt(), db)
+
+    assert statements == ["INSERT", "INSERT", "UPDATE"]
+    db.commit()
+    assert db.query(UserMastery).one().total_attempts == 1
+
+
+def test_answer_on_an_existing_row_takes_three_statements(db, statements):
+    record_attempt(make_attempt(), db)
+    db.commit()
+    statements.clear()
+
+    record_attempt(make_attempt(False), db)
+
+    assert statements == ["INSERT", "INSERT", "UPDATE"]
+    db.commit()
+    row = db.query(UserMastery).one()
+    assert (row.total_attempts, row.correct_attempts) == (2, 1)
+    assert row.mastery_score == calculate_mastery(1, 1, db)
+
+
+def test_row_without_a_window_loads_it_from_history_once(db, statements):
+    record_attempts([make_attempt(), make_attempt(False)], db)
+    db.query(UserMastery).update({UserMastery.recent_results: None, UserMastery.recent_count: None})
+    db.commit()
+    statements.clear()
+
+    record_attempt(make_attempt(), db)
+
+    assert statements == ["INSERT", "INSERT", "SELECT", "UPDATE"]
+    db.commit()
+    row = db.query(UserMastery).one()
+    assert (row.recent_results, row.recent_count) == (0b101, 3)
+
+
+def test_portable_fallback_matches_calculate_mastery(db, monkeypatch):
+    monkeypatch.setattr(mastery, "_upsert_insert", lambda db: None)
+    results = [True, False, True, True, False] * 3
+
+    record_attempts([make_attempt(results[0])], db)
+    db.commit()
+    record_attempts([make_attempt(is_correct) for is_correct in results[1:]], db)
+    db.commit()
+
+    row = db.query(UserMastery).one()
+    assert (row.total_attempts, row.correct_attempts) == (len(results), sum(results))
+    assert row.mastery_score == calculate_mastery(1, 1, db)
+    assert row.next_review is not None
+
+
+def test_schema_check_names_the_migration(db):
+    check_mastery_schema(engine)
+
+    db.execute(text("DROP TABLE user_mastery"))
+    db.execute(text(
+        "CREATE TABLE user_mastery (id INTEGER PRIMARY KEY, user_id INTEGER, skill_id INTEGER, "
+        "mastery_score FLOAT, last_practiced DATETIME, next_review DATETIME, "
+        "total_attempts INTEGER, correct_attempts INTEGER)"
+    ))
+    db.commit()
+
+    with pytest.raises(RuntimeError, match="dedupe_user_mastery.py") as excinfo:
+        check_mastery_schema(engine)
+    assert "recent_results" in str(excinfo.value)
+    assert "unique key" in str(excinfo.value)
@@ -0,0 +1,79 @@
+"""NextQuestionCache: a prepared question is never served after its user was invalidated."""
+
+from datetime import timedelta
+
+from app.routes import questions
+from app.services.active_questions import ActiveQuestionStore
+from app.services.next_questions import NextQuestionCache
+from app.services.skill_catalog import skill_catalog
+from app.services.state import MemoryBackend
+from app.services.template_index import template_cache
+
+
+def make_cache(backend=None):
+    if backend is None:
+        backend = MemoryBackend("next_questions", timedelta(minutes=5))
+    cache = NextQuestionCache(backend, enabled=True)
+    cache._selector = lambda user_id, db: {"question_id": f"q{user_id}"}
+    return cache
+
+
+def test_a_prepared_question_is_taken_once():
+    cache = make_cache()
+
+    assert cache.prepare(1, db=None)
+    assert cache.take(1) == {"question_id": "q1"}
+    assert cache.take(1) is None
+    assert cache.metrics()["hits"] == 1
+
+
+def test_invalidating_during_selection_discards_the_result():
+    cache = make_cache()
+
+    def selector(user_id, db):
+        cache.invalidate(user_id)
+        return {"question_id": "stale"}
+
+    cache._selector = selector
+    assert not cache.prepare(1, db=None)
+    assert cache.take(1) is None
+    assert cache.metrics()["discarded_stale"] == 1
+
+
+def test_a_slot_stored_after_an_invalidation_is_not_served():
+    cache = make_cache()
+    stale = cache.generation(1)
+    cache.invalidate(1)
+    # What a selection that passed prepare's check just before the invalidation stores
+    cache.backend.set("1", (0.0, stale, {"question_id": "stale"}))
+
+    assert cache.take(1) is None
+    assert cache.metrics()["discarded_stale"] == 1
+
+
+def test_invalidations_reach_caches_sharing_the_backend():
+    backend = MemoryBackend("next_questions", timedelta(minutes=5))
+    worker, route = make_cache(backend), make_cache(backend)
+    assert worker.prepare(1, db=None)
+
+    route.invalidate(1)
+    backend.set("1", (0.0, None, {"question_id": "stale"}))
+
+    assert worker.take(1) is None
+    assert route.prepare(1, db=None)
+    assert worker.take(1) == {"question_id": "q1"}
+
+
+def test_a_prepared_question_is_only_issued_when_served(db, monkeypatch):
+    skill_catalog.reload(db)
+    template_cache.reload(db)
+    store = ActiveQuestionStore(MemoryBackend("active_questions", timedelta(minutes=5)))
+    monkeypatch.setattr(questions, "active_questions", store)
+    monkeypatch.setattr(questions.settings, "question_tokens_enabled", False)
+
+    prepared = questions.select_next_question(1, db)
+    assert store.metrics()["size"] == 0
+
+    served = questions.serve_question(prepared, 1, db)
+    assert served["question_id"] in store
+    assert served["question"] == prepared.question_data.question
@@ -0,0 +1,80 @@
+"""QuestionPool refills: keys whose generators keep failing back off instead of retrying every cycle."""
+
+import logging
+
+import pytest
+
+from app.generators.question import GeneratedQuestion
+from app.services import question_pool as pool_module
+from app.services.question_pool import QuestionPool
+
+KEY = ("broken", 3)
+
+
+def question(n=0):
+    return GeneratedQuestion(question=f"q{n}", answer="1", steps=[], difficulty=3, seed=n)
+
+
+def fail(*args, **kwargs):
+    raise ValueError("generator bug")
+
+
+@pytest.fixture
+def pool():
+    pool = QuestionPool(capacity=5, low_watermark=2, refill_interval=0.0, max_failures=3)
+    pool.register([KEY])
+    return pool
+
+
+def test_failing_batches_log_one_warning_then_go_one_at_a_time(pool, monkeypatch, caplog):
+    batches = []
+    monkeypatch.setattr(pool_module, "generate_batch", lambda *a, **k: batches.append(1) or fail())
+    monkeypatch.setattr(pool_module, "generate_question", lambda *a, **k: question())
+
+    with caplog.at_level(logging.WARNING):
+        for _ in range(5):
+            pool._rings[KEY].clear()
+            pool.refill()
+
+    assert len(batches) == 3
+    assert len(pool._rings[KEY]) == 5
+    assert [record.exc_info for record in caplog.records] == [None, None]
+    assert pool.metrics()["one_at_a_time"] == ["broken:3"]
+
+
+def test_key_that_generates_nothing_backs_off_then_is_disabled(pool, monkeypatch, caplog):
+    attempts = []
+    monkeypatch.setattr(pool_module, "generate_batch", fail)
+    monkeypatch.setattr(pool_module, "generate_question", lambda *a, **k: attempts.append(1) or fail())
+
+    pool.refill()
+    assert len(attempts) == 5
+    pool.refill_interval = 60.0
+    pool.refill()
+    assert len(attempts) == 10
+    pool.refill()  # backed off for 2 minutes
+    assert len(attempts) == 10
+
+    pool._retry_at[KEY] = 0.0
+    with caplog.at_level(logging.WARNING):
+        pool.refill()
+    assert pool.metrics()["backed_off"] == {"broken:3": "disabled"}
+    assert "no longer refilling" in caplog.text
+
+    pool._retry_at[KEY] = float("inf")
+    pool.refill()
+    assert len(attempts) == 15
+
+
+def test_success_resets_the_failure_count(pool, monkeypatch):
+    monkeypatch.setattr(pool_module, "generate_batch", fail)
+    monkeypatch.setattr(pool_module, "generate_question", fail)
+    pool.refill()
+    assert KEY in pool._retry_at
+
+    monkeypatch.setattr(pool_module, "generate_batch", lambda t, d, n, **k: [question(i) for i in range(n)])
+    pool._retry_at[KEY] = 0.0
+    pool.refill()
+
+    assert pool.metrics()["backed_off"] == {}
+    assert len(pool._rings[KEY]) == 5
@@ -0,0 +1,83 @@
+"""SeenQuestions: questions count as seen when served, written in the caller's transaction."""
+
+import itertools
+
+import pytest
+from sqlalchemy import event
+
+from app.database import SessionLocal, engine
+from app.generators.question import GeneratedQuestion
+from app.models import QuestionHistory, UserSeenQuestions
+from app.services import seen_questions as seen_module
+from app.services.seen_questions import SeenQuestions
+from app.utils.bloom import RotatingBloomFilter, fingerprint
+from tests.conftest import make_attempt
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """The question pool hands out "q0", "q1", ... in turn."""
+    counter = itertools.count()
+
+    def take(template_type, difficulty):
+        return GeneratedQuestion(question=f"q{next(counter)}", answer="1", steps=[], difficulty=difficulty)
+
+    monkeypatch.setattr(seen_module.question_pool, "take", take)
+
+
+def stored_filter(user_id=1):
+    db = SessionLocal()
+    try:
+        row = db.get(UserSeenQuestions, user_id)
+        return RotatingBloomFilter.from_bytes(row.filter_data) if row else None
+    finally:
+        db.close()
+
+
+def test_take_does_not_remember_the_question(db, pool):
+    seen = SeenQuestions()
+
+    assert seen.take(1, "linear_equation", 1, db).question == "q0"
+    db.commit()
+
+    assert stored_filter() is None
+
+
+def test_served_questions_are_skipped_and_written_once_on_commit(db, pool):
+    seen = SeenQuestions()
+    seen.served(1, ["q0"], db)
+    db.commit()
+
+    updates = []
+    listener = lambda conn, cursor, statement, *args: updates.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        batch = []
+        for _ in range(3):
+            question = seen.take(1, "linear_equation", 1, db).question
+            seen.served(1, [question], db)
+            batch.append(question)
+        db.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert batch == ["q1", "q2", "q3"]
+    assert [statement.split()[0] for statement in updates] == ["SELECT", "UPDATE"]
+    assert all(fingerprint(f"q{i}") in stored_filter() for i in range(4))
+
+
+def test_losing_the_race_to_create_the_filter_keeps_the_callers_work(db, pool):
+    seen = SeenQuestions()
+    seen.take(1, "linear_equation", 1, db)  # loads "no filter yet" into the session
+    other = SessionLocal()
+    SeenQuestions().served(1, ["other"], other)
+    other.commit()
+    other.close()
+
+    db.add(make_attempt())
+    db.flush()
+    seen.served(1, ["mine"], db)
+    db.commit()
+
+    assert fingerprint("mine") in stored_filter()
+    assert db.query(QuestionHistory).count() == 1
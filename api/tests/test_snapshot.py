@@ -0,0 +1,104 @@
+"""SnapshotCache: a publish in one worker reaches the caches of every other worker."""
+
+from datetime import datetime, timedelta
+
+from app.services.skill_catalog import skill_catalog
+from app.services.snapshot import SnapshotCache, content_versions
+from app.services.state import MemoryBackend
+from app.services.template_index import template_cache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Snapshot:
+    def __init__(self, version, content):
+        self.version = version
+        self.built_at = datetime.utcnow()
+        self.content = content
+
+    def summary(self):
+        return {"content": self.content}
+
+
+def make_workers(count=2):
+    """Caches as separate workers would hold them: one shared backend, one database."""
+    database = {"content": "v1"}
+    versions = MemoryBackend("content_versions", timedelta(days=1))
+    clock = Clock()
+    workers = [
+        SnapshotCache("test", lambda db, version: Snapshot(version, database["content"]), versions, 5.0, clock)
+        for _ in range(count)
+    ]
+    for worker in workers:
+        worker.reload(db=None)
+    return database, versions, clock, workers
+
+
+def test_a_publish_reaches_the_other_workers_after_the_check_interval():
+    database, versions, clock, (admin, other) = make_workers()
+    database["content"] = "v2"
+
+    assert admin.publish(db=None).content == "v2"
+    assert other.current.content == "v1"
+
+    clock.now += 5
+    assert other.current.content == "v2"
+    assert other.current.version == 2
+    assert other.metrics()["published_version"] == admin.metrics()["published_version"]
+
+
+def test_the_shared_version_is_read_once_per_interval():
+    _, versions, clock, (worker, _) = make_workers()
+    reads = versions.metrics()["hits"] + versions.metrics()["misses"]
+
+    for _ in range(100):
+        worker.current
+    clock.now += 5
+    for _ in range(100):
+        worker.current
+
+    assert versions.metrics()["hits"] + versions.metrics()["misses"] == reads + 1
+    assert worker.metrics()["reloads"] == 1
+
+
+def test_listeners_see_reloads_caused_by_a_publish_elsewhere():
+    database, _, clock, (admin, other) = make_workers()
+    loaded = []
+    other.add_listener(lambda snapshot: loaded.append(snapshot.content))
+
+    database["content"] = "v2"
+    admin.publish(db=None)
+    clock.now += 5
+    other.current
+
+    assert loaded == ["v2"]
+
+
+def test_an_unreadable_backend_keeps_the_current_snapshot():
+    database, versions, clock, (worker, _) = make_workers()
+
+    def fail(keys):
+        raise ConnectionError("state backend down")
+
+    versions.get_many = fail
+    database["content"] = "v2"
+    clock.now += 5
+
+    assert worker.current.content == "v1"
+
+
+def test_the_catalog_and_the_index_publish_separate_versions(db):
+    skill_catalog.reload(db)
+    template_cache.reload(db)
+    assert skill_catalog._versions is template_cache._versions is content_versions
+
+    skill_catalog.publish(db)
+
+    assert skill_catalog.metrics()["published_version"] is not None
+    assert template_cache.metrics()["published_version"] is None
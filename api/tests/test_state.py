@@ -0,0 +1,112 @@
+"""State backends: RedisBackend round trips against the in-process Redis stand-in, add_many everywhere."""
+
+from datetime import timedelta
+
+import pytest
+
+from app.services.state import MemoryBackend, RedisBackend, SQLiteBackend
+from tests.fake_redis import FakeRedisServer
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture(params=[True, False], ids=["getdel", "multi-exec"])
+def server(request, clock):
+    with FakeRedisServer(getdel=request.param, clock=clock) as server:
+        yield server
+
+
+@pytest.fixture
+def backend(server):
+    return RedisBackend("test", timedelta(minutes=5), server.url)
+
+
+def test_set_get_delete(backend, server):
+    backend.set("a", {"answer": 3})
+
+    assert backend.get("a") == {"answer": 3}
+    assert server.keys() == ["test:a"]
+    backend.delete("a")
+    assert backend.get("a") is None
+
+
+def test_batches(backend):
+    backend.set_many({"a": 1, "b": [2], "c": "three"})
+
+    assert backend.get_many(["a", "b", "c", "missing"]) == {"a": 1, "b": [2], "c": "three"}
+    backend.delete_many(["a", "c", "missing"])
+    assert backend.get_many(["a", "b", "c"]) == {"b": [2]}
+    assert backend.metrics()["hits"] == 4
+
+
+def test_pop_is_a_single_atomic_command(backend, server):
+    backend.set("a", 1)
+    server.commands.clear()
+
+    assert backend.pop("a") == 1
+    assert backend.pop("a") is None
+    assert backend.get("a") is None
+    sent = [command[0] for command in server.commands]
+    if server.getdel:
+        assert sent == ["GETDEL", "GETDEL", "MGET"]
+    else:
+        # The first unknown-command reply switches the backend to MULTI/EXEC for good
+        assert sent == ["GETDEL"] + ["MULTI", "GET", "DEL", "EXEC"] * 2 + ["MGET"]
+
+
+def test_entries_expire_after_their_ttl(backend, server, clock):
+    backend.set("default", 1)
+    backend.set("short", 2, ttl=timedelta(seconds=10))
+    assert backend.get("short") == 2
+
+    clock.now += 11
+    assert backend.get_many(["default", "short"]) == {"default": 1}
+    assert backend.pop("short") is None
+
+    clock.now += 5 * 60
+    assert backend.get("default") is None
+    assert server.keys() == []
+
+
+def test_add_only_stores_absent_or_expired_keys(backend, clock):
+    backend.set("taken", 1)
+    backend.set("stale", 2, ttl=timedelta(seconds=1))
+    clock.now += 2
+
+    assert backend.add_many({"taken": 10, "stale": 20, "new": 30}) == {"stale", "new"}
+    assert backend.get_many(["taken", "stale", "new"]) == {"taken": 1, "stale": 20, "new": 30}
+    assert backend.add("new", 40) is False
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_add_on_local_backends(kind, tmp_path):
+    if kind == "memory":
+        local = MemoryBackend("test", timedelta(minutes=5))
+    else:
+        local = SQLiteBackend("test", timedelta(minutes=5), str(tmp_path / "state.db"))
+    local.set("taken", 1)
+    local.set("stale", 2, ttl=timedelta(seconds=-1))
+
+    assert local.add_many({"taken": 10, "stale": 20, "new": 30}) == {"stale", "new"}
+    assert local.get_many(["taken", "stale", "new"]) == {"taken": 1, "stale": 20, "new": 30}
+    assert local.add("new", 40) is False
+
+
+def test_uncapped_memory_backend_never_evicts():
+    backend = MemoryBackend("test", timedelta(minutes=5), capacity=None)
+    backend.set_many({str(n): n for n in range(1000)})
+    backend.add_many({"extra": True})
+
+    assert len(backend) == 1001
+    assert backend.metrics()["evictions"] == 0
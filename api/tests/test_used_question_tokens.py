@@ -0,0 +1,96 @@
+"""UsedQuestionTokens: a question token is answered at most once."""
+
+import base64
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.routes import questions
+from app.services.state import MemoryBackend
+from app.services.used_question_tokens import UsedQuestionTokens
+from app.utils.question_tokens import (
+    TOKEN_PREFIX,
+    InvalidQuestionToken,
+    canonical_question_token,
+    decode_question_token,
+    encode_question_token,
+)
+from tests.conftest import make_attempt
+
+SECRET = "test-secret"
+
+
+def make_tokens():
+    return UsedQuestionTokens(MemoryBackend("used_question_tokens", timedelta(minutes=5)))
+
+
+def respell(token):
+    """The same signed bytes with different unused bits in the last base64 character."""
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    return token[:-1] + alphabet[alphabet.index(token[-1]) ^ 1]
+
+
+@pytest.fixture
+def token():
+    return encode_question_token(1, 1, 1, 1, seed=42, answer="7", secret=SECRET)
+
+
+def test_a_token_can_be_claimed_once():
+    tokens = make_tokens()
+
+    assert tokens.claim(["q1.a"])
+    assert not tokens.claim(["q1.a"])
+    assert tokens.metrics()["replays_rejected"] == 1
+
+
+def test_a_replayed_batch_claims_nothing():
+    tokens = make_tokens()
+    assert tokens.claim(["q1.a"])
+
+    assert not tokens.claim(["q1.b", "q1.a"])
+    assert tokens.claim(["q1.b"])
+
+
+def test_duplicates_within_a_batch_are_rejected():
+    tokens = make_tokens()
+
+    assert not tokens.claim(["q1.a", "q1.a"])
+    assert tokens.claim(["q1.a"])
+
+
+def test_released_tokens_can_be_claimed_again():
+    tokens = make_tokens()
+    tokens.claim(["q1.a", "q1.b"])
+
+    tokens.release(["q1.a", "q1.b"])
+
+    assert tokens.claim(["q1.a", "q1.b"])
+
+
+def test_respelled_tokens_do_not_verify(token):
+    variants = [respell(token), token[:10] + "!" + token[10:], token + "=="]
+
+    for variant in variants:
+        assert canonical_question_token(variant) == token
+        with pytest.raises(InvalidQuestionToken):
+            decode_question_token(variant, 1, SECRET, timedelta(minutes=5))
+    assert decode_question_token(token, 1, SECRET, timedelta(minutes=5)).seed == 42
+
+
+def test_a_respelled_token_is_a_replay(token):
+    tokens = make_tokens()
+    assert tokens.claim([token])
+
+    assert not tokens.claim([respell(token)])
+    raw = base64.urlsafe_b64decode(token[len(TOKEN_PREFIX):] + "===")
+    assert not tokens.claim([TOKEN_PREFIX + base64.urlsafe_b64encode(raw).decode()])
+
+
+def test_answering_a_respelled_token_again_is_rejected(db, monkeypatch, token):
+    monkeypatch.setattr(questions, "used_question_tokens", make_tokens())
+    questions.record_answers([token], [make_attempt()], db)
+
+    with pytest.raises(HTTPException) as rejected:
+        questions.record_answers([respell(token)], [make_attempt()], db)
+    assert rejected.value.status_code == 409
@@ -15,6 +15,16 @@ export const questionsAPI = {
     return api.post<AnswerFeedback>('/questions/answer', answerData);
   },
 
+  /** Fetch several adaptive questions in one round trip. */
+  async getBatch(n: number): Promise<Question[]> {
+    return api.get<Question[]>(`/questions/batch?n=${n}`);
+  },
+
+  /** Submit several answers in one round trip; feedback comes back in the same order. */
+  async submitAnswers(answers: AnswerSubmit[]): Promise<AnswerFeedback[]> {
+    return api.post<AnswerFeedback[]>('/questions/answers', answers);
+  },
+
   async getSkills(): Promise<Skill[]> {
     return api.get<Skill[]>('/skills');
   },
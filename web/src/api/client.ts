@@ -2,7 +2,7 @@
  * API Client for Study Buddy backend
  */
 
-const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8001/study';
+export const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8001/study';
 
 class APIClient {
   private getAuthHeader(): Record<string, string> {
@@ -14,6 +14,16 @@ export const questionsAPI = {
     return api.post<AnswerFeedback>('/questions/answer', data);
   },
 
+  /** Fetch several adaptive questions in one round trip. */
+  async getBatch(n: number): Promise<Question[]> {
+    return api.get<Question[]>(`/questions/batch?n=${n}`);
+  },
+
+  /** Submit several answers in one round trip; feedback comes back in the same order. */
+  async submitAnswers(data: AnswerSubmit[]): Promise<AnswerFeedback[]> {
+    return api.post<AnswerFeedback[]>('/questions/answers', data);
+  },
+
   async practiceSkill(skillId: number): Promise<Question> {
     return api.get<Question>(`/questions/practice/${skillId}`);
   },
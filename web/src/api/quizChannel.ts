@@ -0,0 +1,115 @@
+/**
+ * Persistent quiz channel: one authenticated connection for a whole quiz session.
+ *
+ * Uses a WebSocket (/quiz/ws) and falls back to server-sent events
+ * (/quiz/events plus POSTs) when the WebSocket cannot be opened. After
+ * every answer the server sends feedback and then pushes the next question.
+ */
+
+import { API_BASE_URL } from './client';
+import type { Question, AnswerSubmit, AnswerFeedback } from '../types';
+
+export type QuizChannelMessage =
+  | { type: 'ready'; channel_id: string; user_id: number; transport: 'websocket' | 'sse' }
+  | ({ type: 'question' } & Question)
+  | ({ type: 'feedback' } & AnswerFeedback)
+  | { type: 'error'; status: number; detail: unknown }
+  | { type: 'pong' };
+
+export class QuizChannel {
+  private socket: WebSocket | null = null;
+  private events: EventSource | null = null;
+  private channelId: string | null = null;
+  private onMessage: (message: QuizChannelMessage) => void;
+
+  constructor(onMessage: (message: QuizChannelMessage) => void) {
+    this.onMessage = onMessage;
+  }
+
+  /** Open the channel; resolves once the server has authenticated it. */
+  async connect(): Promise<void> {
+    const token = localStorage.getItem('access_token') ?? '';
+    try {
+      await this.openWebSocket(token);
+    } catch {
+      await this.openEventStream(token);
+    }
+  }
+
+  next(): void {
+    this.send({ type: 'next' });
+  }
+
+  answer(data: AnswerSubmit): void {
+    this.send({ type: 'answer', ...data });
+  }
+
+  practice(skillId: number): void {
+    this.send({ type: 'practice', skill_id: skillId });
+  }
+
+  close(): void {
+    this.socket?.close();
+    this.events?.close();
+    this.socket = null;
+    this.events = null;
+  }
+
+  private send(message: Record<string, unknown>): void {
+    if (this.socket) {
+      this.socket.send(JSON.stringify(message));
+    } else if (this.channelId) {
+      fetch(`${API_BASE_URL}/quiz/events/${this.channelId}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(message),
+      });
+    }
+  }
+
+  private openWebSocket(token: string): Promise<void> {
+    return new Promise((resolve, reject) => {
+      const socket = new WebSocket(`${API_BASE_URL.replace(/^http/, 'ws')}/quiz/ws`);
+      let ready = false;
+      // Authenticate in the first message so the token stays out of the URL
+      socket.onopen = () => socket.send(JSON.stringify({ type: 'auth', token }));
+      socket.onerror = () => {
+        if (!ready) reject(new Error('WebSocket unavailable'));
+      };
+      socket.onclose = () => {
+        if (!ready) reject(new Error('WebSocket closed before it was ready'));
+      };
+      socket.onmessage = (event) => {
+        const message = JSON.parse(event.data) as QuizChannelMessage;
+        if (!ready && message.type === 'ready') {
+          ready = true;
+          this.socket = socket;
+          resolve();
+        }
+        this.onMessage(message);
+      };
+    });
+  }
+
+  private openEventStream(token: string): Promise<void> {
+    return new Promise((resolve, reject) => {
+      // EventSource cannot send headers, so the token goes in the query string
+      const events = new EventSource(`${API_BASE_URL}/quiz/events?token=${encodeURIComponent(token)}`);
+      events.onerror = () => {
+        if (!this.channelId) {
+          events.close();
+          reject(new Error('Quiz channel unavailable'));
+        }
+      };
+      events.onmessage = (event) => {
+        const message = JSON.parse(event.data) as QuizChannelMessage;
+        if (message.type === 'ready') {
+          this.channelId = message.channel_id;
+          this.events = events;
+          resolve();
+        }
+        this.onMessage(message);
+      };
+    });
+  }
+}